@@ -13,7 +13,7 @@ from __future__ import annotations
 import asyncio
 import json
 from datetime import datetime, timezone
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional, Union
 
 from fastapi import (
     APIRouter,
@@ -32,8 +32,9 @@ from sse_starlette.sse import EventSourceResponse
 
 from ...core.database import get_async_db
 from ...core.logging import get_logger
+from ...core.progress_hub import progress_hub
 from ...core.redis_pubsub import redis_progress_pubsub
-from ...core.constants import TERMINAL_STATUSES, SSE_KEEPALIVE_INTERVAL
+from ...core.constants import SSE_KEEPALIVE_INTERVAL
 from ...models.job import Job
 from ...models.user import User
 from ...models.enums import JobStatus
@@ -53,7 +54,7 @@ async def progress_event_generator(
     last_event_id: Optional[int] = None,
     filter_types: Optional[str] = None,
     milestones_only: bool = False
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[Union[dict, bytes], None]:
     """
     Generate SSE events for job progress.
     
@@ -66,7 +67,8 @@ async def progress_event_generator(
         milestones_only: Only send milestone events
         
     Yields:
-        SSE event dictionaries
+        SSE event dictionaries, or pre-encoded event bytes for progress
+        frames shared through the progress hub
     """
     # Parse filter types
     event_filter = None
@@ -76,6 +78,11 @@ async def progress_event_generator(
         except ValueError as e:
             logger.warning(f"Invalid filter types: {e}", exc_info=True)
     
+    def wanted(progress: ProgressMessageV2) -> bool:
+        if milestones_only and not progress.milestone:
+            return False
+        return not event_filter or progress.event_type in event_filter
+    
     # Check job access
     result = await db.execute(
         select(Job).where(Job.id == job_id)
@@ -99,8 +106,8 @@ async def progress_event_generator(
         }
         return
     
-    # Send initial status event
-    current_event_id = last_event_id + 1 if last_event_id else 1
+    # Send initial status event; it repeats the resume point so a client
+    # reconnecting right after it does not skip the next progress event
     initial_event = {
         "event": "status",
         "data": json.dumps({
@@ -109,135 +116,89 @@ async def progress_event_generator(
             "progress": job.progress,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }),
-        "id": str(current_event_id)
+        "id": str(last_event_id or 0)
     }
     yield initial_event
-    current_event_id += 1
     
-    # CRITICAL FIX: Fetch and send missed events BEFORE subscribing to new events
-    if last_event_id is not None:
-        try:
-            # Get missed events from cache
-            missed_events = await redis_progress_pubsub.get_missed_events(job_id, last_event_id)
-            
-            # Send missed events to client, applying filters
-            for event_json in missed_events:
-                try:
-                    progress_data = json.loads(event_json)
-                    progress = ProgressMessageV2(**progress_data)
+    # Subscribe to the progress hub first so nothing published while the
+    # missed events are fetched is lost; replayed event ids are skipped below
+    subscription = await progress_hub.subscribe(job_id, transport="sse", accept=wanted)
+    try:
+        last_sent_event_id = last_event_id or 0
+        
+        if last_event_id is not None:
+            try:
+                # Replay the job's progress stream after last_event_id
+                missed_events = await redis_progress_pubsub.get_missed_events(job_id, last_event_id)
+                
+                # Send missed events to client, applying filters
+                for progress in missed_events:
+                    last_sent_event_id = max(last_sent_event_id, progress.event_id)
                     
                     # Apply the same filters as for new events
-                    if milestones_only and not progress.milestone:
-                        continue
-                    
-                    if event_filter and progress.event_type not in event_filter:
+                    if not wanted(progress):
                         continue
                     
                     # Send the missed event to the client
-                    sse_event = {
+                    yield {
                         "event": "progress",
                         "data": progress.model_dump_json(),
                         "id": str(progress.event_id)
                     }
-                    yield sse_event
-                    
-                    # Update current event ID
-                    if progress.event_id:
-                        current_event_id = max(current_event_id, progress.event_id + 1)
-                    
-                except (json.JSONDecodeError, ValueError) as e:
-                    logger.warning(f"Failed to parse missed event: {e}", exc_info=True)
-                    
-        except Exception as e:
-            logger.warning(f"Failed to fetch missed events: {e}", exc_info=True)
-    
-    # Subscribe to Redis pub/sub for new events (no last_event_id needed anymore)
-    try:
-        async with redis_progress_pubsub.subscribe_to_job(job_id) as pubsub:
-            
-            # Send keepalive at configured interval
-            last_keepalive = asyncio.get_running_loop().time()
-            keepalive_interval = SSE_KEEPALIVE_INTERVAL
-            
-            while True:
-                try:
-                    # Check for progress message (no need for nested wait_for)
-                    message = await pubsub.get_message(
-                        ignore_subscribe_messages=True,
-                        timeout=1.0
-                    )
-                    
-                    if message and message["type"] == "message":
-                        try:
-                            # Parse progress message
-                            progress_data = json.loads(message["data"])
-                            progress = ProgressMessageV2(**progress_data)
-                            
-                            # Apply filters
-                            if milestones_only and not progress.milestone:
-                                continue
-                            
-                            if event_filter and progress.event_type not in event_filter:
-                                continue
-                            
-                            # Send SSE event
-                            sse_event = {
-                                "event": "progress",
-                                "data": progress.model_dump_json(),
-                                "id": str(progress.event_id)
-                            }
-                            yield sse_event
-                            
-                            # Check if job is complete
-                            if progress.status in TERMINAL_STATUSES:
-                                # Send final event
-                                final_event = {
-                                    "event": "complete",
-                                    "data": json.dumps({
-                                        "job_id": job_id,
-                                        "status": progress.status,
-                                        "timestamp": datetime.now(timezone.utc).isoformat()
-                                    }),
-                                    "id": str(progress.event_id + 1)
-                                }
-                                yield final_event
-                                break
-                        
-                        except (json.JSONDecodeError, ValueError) as e:
-                            logger.warning(f"Failed to parse progress message: {e}", exc_info=True)
-                    
-                    # Send keepalive if needed
-                    current_time = asyncio.get_running_loop().time()
-                    if current_time - last_keepalive > keepalive_interval:
-                        keepalive_event = {
-                            "event": "keepalive",
-                            "data": json.dumps({"timestamp": datetime.now(timezone.utc).isoformat()}),
-                            "retry": 1000  # Retry after 1 second
-                        }
-                        yield keepalive_event
-                        last_keepalive = current_time
                 
-                except asyncio.CancelledError:
-                    logger.info(f"SSE stream cancelled for job {job_id}")
-                    break
-                
-                except Exception as e:
-                    logger.error(f"SSE stream error: {e}", exc_info=True)
-                    error_event = {
-                        "event": "error",
-                        "data": json.dumps({"error": str(e)}),
-                        "retry": 5000  # Retry after 5 seconds
-                    }
-                    yield error_event
+            except Exception as e:
+                logger.warning(f"Failed to fetch missed events: {e}", exc_info=True)
+        
+        while True:
+            # Wait for the next frame; send a keepalive when the stream is idle
+            frame = await subscription.get(timeout=SSE_KEEPALIVE_INTERVAL)
+            
+            if frame is None:
+                if subscription.closed:
                     break
+                yield {
+                    "event": "keepalive",
+                    "data": json.dumps({"timestamp": datetime.now(timezone.utc).isoformat()}),
+                    "retry": 1000  # Retry after 1 second
+                }
+                continue
+            
+            if frame.event_id <= last_sent_event_id and not frame.terminal:
+                # Already sent from the resumption cache
+                continue
+            
+            # Terminal frames skip the hub filter, so check it here
+            if frame.event_id > last_sent_event_id and wanted(frame.progress):
+                yield frame.sse_bytes
+            
+            # Check if job is complete
+            if frame.terminal:
+                # Send final event
+                yield {
+                    "event": "complete",
+                    "data": json.dumps({
+                        "job_id": job_id,
+                        "status": frame.progress.status,
+                        "timestamp": datetime.now(timezone.utc).isoformat()
+                    }),
+                    "id": str(frame.event_id)
+                }
+                break
+    
+    except asyncio.CancelledError:
+        logger.info(f"SSE stream cancelled for job {job_id}")
+        raise
     
     except Exception as e:
-        logger.error(f"Failed to subscribe to Redis: {e}", exc_info=True)
+        logger.error(f"SSE stream error: {e}", exc_info=True)
         yield {
             "event": "error",
-            "data": json.dumps({"error": "Streaming service unavailable"}),
-            "retry": 10000  # Retry after 10 seconds
+            "data": json.dumps({"error": str(e)}),
+            "retry": 5000  # Retry after 5 seconds
         }
+    
+    finally:
+        subscription.close()
 
 
 @router.get("/{job_id}/progress/stream")
@@ -361,21 +322,13 @@ async def get_job_progress_snapshot(
     # Include recent events if requested
     if include_recent:
         try:
-            # Get recent events from Redis cache using public method
+            # Get recent events from the job's progress stream
             events = await redis_progress_pubsub.get_recent_events_from_cache(
                 job_id,
                 count=10
             )
             
-            recent_events = []
-            for event_json in events:
-                try:
-                    event_data = json.loads(event_json)
-                    recent_events.append(event_data)
-                except json.JSONDecodeError:
-                    logger.debug(f"Failed to parse event JSON: {event_json[:100]}...")
-            
-            response["recent_events"] = recent_events
+            response["recent_events"] = [event.model_dump(mode="json") for event in events]
         except Exception as e:
             logger.warning(f"Failed to get recent events: {e}", exc_info=True)
             response["recent_events"] = []
@@ -14,7 +14,7 @@ from __future__ import annotations
 import asyncio
 import json
 from datetime import datetime, timezone
-from typing import Dict, Optional, Set
+from typing import Dict, Optional, Set, Tuple
 from uuid import uuid4
 
 from fastapi import (
@@ -33,12 +33,10 @@ from sqlalchemy import select
 
 from ...core.database import get_async_db
 from ...core.logging import get_logger
-from ...core.redis_pubsub import redis_progress_pubsub, RedisProgressPubSub
-from ...core.constants import TERMINAL_STATUSES
+from ...core.progress_hub import ProgressSubscription, progress_hub
 from ...models.job import Job
 from ...models.user import User
 from ...models.enums import JobStatus
-from ...schemas.progress import ProgressMessageV2, ProgressSubscription
 from ...middleware.jwt_middleware import get_current_user
 from ...services.jwt_service import jwt_service
 from ...middleware.correlation_middleware import get_correlation_id
@@ -47,108 +45,22 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["websocket"])
 
-# Centralized Redis listener for scalability
-class CentralizedRedisListener:
-    """
-    Centralized Redis pub/sub listener that dispatches to multiple WebSocket clients.
-    Uses a single Redis subscription per job instead of one per connection.
-    """
-    
-    def __init__(self):
-        self.job_listeners: Dict[int, asyncio.Task] = {}
-        self.lock = asyncio.Lock()
-        
-    async def start_job_listener(self, job_id: int, manager: 'ConnectionManager') -> None:
-        """Start a centralized listener for a specific job if not already running."""
-        async with self.lock:
-            if job_id in self.job_listeners:
-                # Listener already running for this job
-                return
-            
-            # Create a new listener task for this job
-            task = asyncio.create_task(self._job_listener(job_id, manager))
-            self.job_listeners[job_id] = task
-            logger.info(f"Started centralized Redis listener for job {job_id}")
-    
-    async def stop_job_listener(self, job_id: int) -> None:
-        """Stop the listener for a specific job if no more connections need it."""
-        async with self.lock:
-            if job_id in self.job_listeners:
-                task = self.job_listeners[job_id]
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                del self.job_listeners[job_id]
-                logger.info(f"Stopped centralized Redis listener for job {job_id}")
-    
-    async def _job_listener(self, job_id: int, manager: 'ConnectionManager') -> None:
-        """Listen to Redis pub/sub for a specific job and dispatch to all subscribed connections."""
-        try:
-            async with redis_progress_pubsub.subscribe_to_job(job_id) as pubsub:
-                while True:
-                    try:
-                        message = await pubsub.get_message(
-                            ignore_subscribe_messages=True,
-                            timeout=1.0
-                        )
-                        
-                        if message and message["type"] == "message":
-                            try:
-                                # Parse progress message
-                                progress_data = json.loads(message["data"])
-                                progress = ProgressMessageV2(**progress_data)
-                                
-                                # Get all connections subscribed to this job
-                                connection_ids = manager.job_connections.get(job_id, set()).copy()
-                                
-                                if connection_ids:
-                                    # Send to all subscribed connections concurrently
-                                    await asyncio.gather(*[
-                                        manager.send_to_connection(
-                                            conn_id,
-                                            {
-                                                "type": "progress",
-                                                **progress.model_dump()
-                                            }
-                                        )
-                                        for conn_id in connection_ids
-                                    ], return_exceptions=True)
-                                
-                                # Check if job is complete
-                                if progress.status in TERMINAL_STATUSES:
-                                    logger.info(f"Job {job_id} finished with status {progress.status}")
-                                    break
-                                    
-                            except (json.JSONDecodeError, ValueError) as e:
-                                logger.warning(f"Failed to parse progress message: {e}", exc_info=True)
-                    
-                    except asyncio.CancelledError:
-                        break
-                    except Exception as e:
-                        logger.error(f"Redis listener error for job {job_id}: {e}", exc_info=True)
-                        await asyncio.sleep(1)  # Brief pause before retry
-                        
-        except Exception as e:
-            logger.error(f"Fatal error in job listener for job {job_id}: {e}", exc_info=True)
-        finally:
-            # Clean up when listener exits
-            async with self.lock:
-                if job_id in self.job_listeners:
-                    del self.job_listeners[job_id]
-
-# Singleton instance of centralized listener
-centralized_listener = CentralizedRedisListener()
-
 # WebSocket connection tracking
 class ConnectionManager:
-    """Manager for WebSocket connections."""
+    """
+    Manager for WebSocket connections.
+
+    Progress comes from the process-wide progress hub (one blocking XREAD
+    over the progress streams of every watched job). Each (connection, job)
+    pair gets a hub subscription and a sender task, so a slow socket only
+    backs up its own bounded queue.
+    """
     
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_jobs: Dict[str, Set[int]] = {}
         self.job_connections: Dict[int, Set[str]] = {}
+        self.job_senders: Dict[Tuple[str, int], asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket, connection_id: str) -> None:
         """Accept and register WebSocket connection."""
@@ -159,7 +71,7 @@ class ConnectionManager:
     
     async def disconnect(self, connection_id: str) -> None:
         """Remove WebSocket connection and clean up resources."""
-        # Clean up job subscriptions and stop listeners if needed
+        # Clean up job subscriptions
         if connection_id in self.connection_jobs:
             # Unsubscribe from all jobs for this connection
             for job_id in list(self.connection_jobs[connection_id]):
@@ -173,29 +85,52 @@ class ConnectionManager:
         logger.info(f"WebSocket disconnected: {connection_id}")
     
     async def subscribe_to_job(self, connection_id: str, job_id: int) -> None:
-        """Subscribe connection to job updates and start centralized listener if needed."""
-        if connection_id in self.connection_jobs:
+        """Subscribe connection to job updates from the progress hub."""
+        if connection_id in self.connection_jobs and job_id not in self.connection_jobs[connection_id]:
             self.connection_jobs[connection_id].add(job_id)
             if job_id not in self.job_connections:
                 self.job_connections[job_id] = set()
             self.job_connections[job_id].add(connection_id)
             logger.debug(f"Connection {connection_id} subscribed to job {job_id}")
             
-            # Start centralized listener for this job if not already running
-            await centralized_listener.start_job_listener(job_id, self)
+            subscription = await progress_hub.subscribe(job_id, transport="websocket")
+            if job_id not in self.connection_jobs.get(connection_id, ()):
+                # Unsubscribed or disconnected while the hub was starting to watch the job
+                subscription.close()
+                return
+            self.job_senders[(connection_id, job_id)] = asyncio.create_task(
+                self._forward_progress(connection_id, subscription)
+            )
     
     async def unsubscribe_from_job(self, connection_id: str, job_id: int) -> None:
-        """Unsubscribe connection from job updates and stop listener if no more connections."""
+        """Unsubscribe connection from job updates."""
         if connection_id in self.connection_jobs:
             self.connection_jobs[connection_id].discard(job_id)
         if job_id in self.job_connections:
             self.job_connections[job_id].discard(connection_id)
             if not self.job_connections[job_id]:
                 del self.job_connections[job_id]
-                # Stop centralized listener if no more connections for this job
-                await centralized_listener.stop_job_listener(job_id)
+        
+        sender = self.job_senders.pop((connection_id, job_id), None)
+        if sender is not None:
+            sender.cancel()
+            try:
+                await sender
+            except asyncio.CancelledError:
+                pass
         logger.debug(f"Connection {connection_id} unsubscribed from job {job_id}")
     
+    async def _forward_progress(self, connection_id: str, subscription: ProgressSubscription) -> None:
+        """Send a job's pre-encoded progress frames to one connection until the job finishes."""
+        try:
+            async for frame in subscription:
+                if not await self.send_text_to_connection(connection_id, frame.websocket_text):
+                    break
+                if frame.terminal:
+                    logger.info(f"Job {subscription.job_id} finished with status {frame.progress.status}")
+        finally:
+            subscription.close()
+    
     async def send_to_connection(
         self,
         connection_id: str,
@@ -212,6 +147,21 @@ class ConnectionManager:
                 return False
         return False
     
+    async def send_text_to_connection(
+        self,
+        connection_id: str,
+        text: str
+    ) -> bool:
+        """Send an already-encoded JSON message to specific connection."""
+        if connection_id in self.active_connections:
+            try:
+                await self.active_connections[connection_id].send_text(text)
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to send to connection {connection_id}: {e}", exc_info=True)
+                return False
+        return False
+    
     async def broadcast_to_job(
         self,
         job_id: int,
@@ -321,7 +271,6 @@ async def websocket_job_progress(
     """
     connection_id = str(uuid4())
     user = None
-    pubsub_task = None
     
     try:
         # Authenticate user
@@ -344,7 +293,7 @@ async def websocket_job_progress(
         
         # Accept connection
         await manager.connect(websocket, connection_id)
-        await manager.subscribe_to_job(connection_id, job_id)  # Now async with centralized listener
+        await manager.subscribe_to_job(connection_id, job_id)
         
         # Send initial connection message
         await websocket.send_json({
@@ -356,7 +305,7 @@ async def websocket_job_progress(
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
         
-        # No need for per-connection Redis listener anymore - centralized listener handles it
+        # Progress is pushed by the connection's hub subscription
         
         # Handle incoming WebSocket messages
         while True:
@@ -441,5 +390,6 @@ async def get_connection_stats(
             job_id: manager.get_job_subscriber_count(job_id)
             for job_id in manager.job_connections.keys()
         },
+        "progress_hub": progress_hub.get_stats(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
\ No newline at end of file
@@ -25,6 +25,7 @@ from ...models.version_control import (
     Branch,
     CheckoutResult,
     CommitDiff,
+    CommitDiffPage,
     CommitInfo,
     ConflictResolutionStrategy,
     MergeResult,
@@ -83,6 +84,14 @@ class DiffRequest(BaseModel):
     to_commit: str = Field(description="Target commit hash")
 
 
+class DiffPageRequest(BaseModel):
+    """Request to calculate one page of a diff."""
+    from_commit: str = Field(description="Source commit hash")
+    to_commit: str = Field(description="Target commit hash")
+    cursor: Optional[str] = Field(default=None, description="next_cursor of the previous page")
+    limit: int = Field(default=100, ge=1, le=1000, description="Maximum object differences per page")
+
+
 class RollbackRequest(BaseModel):
     """Request to rollback to a commit."""
     commit_hash: str = Field(description="Commit hash to rollback to")
@@ -323,14 +332,17 @@ async def checkout_commit(
 async def get_history(
     repo_id: str,
     branch: Optional[str] = Query(default=None, description="Branch name"),
-    limit: int = Query(default=100, description="Maximum commits to return"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Maximum commits to return"),
+    cursor: Optional[str] = Query(default=None, description="Commit to start from, for the next page"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get commit history for a repository.
     
-    Returns the commit history for the specified branch or HEAD.
+    Returns the first-parent commit history for the specified branch or
+    HEAD. For the next page pass the first parent of the last commit as
+    ``cursor``.
     """
     correlation_id = get_correlation_id()
     
@@ -348,9 +360,10 @@ async def get_history(
         )
         
         # Get commit history
-        history = await vcs.get_commit_history(
+        history = await vcs.get_history(
             branch=branch,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
         
         return history
@@ -394,6 +407,44 @@ async def diff_commits(
         return diff
 
 
+@router.post("/{repo_id}/diff/page", response_model=CommitDiffPage)
+@handle_vcs_errors(operation="diff_commits")
+async def diff_commits_page(
+    repo_id: str,
+    request: DiffPageRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Calculate one page of the diff between two commits.
+    
+    Changes are ordered by object name. Pass the returned next_cursor to
+    get the following page; it is null on the last page.
+    """
+    correlation_id = get_correlation_id()
+    
+    with create_span("api_diff_commits_page", correlation_id=correlation_id) as span:
+        span.set_attribute("user.id", current_user.id)
+        span.set_attribute("repository.id", repo_id)
+        span.set_attribute("from.commit", request.from_commit)
+        span.set_attribute("to.commit", request.to_commit)
+        
+        # Get repository and VCS instance from registry
+        db_repo, vcs = await _registry.get_repository(
+            db=db,
+            repository_id=repo_id,
+            user=current_user,
+            check_access=True
+        )
+        
+        return await vcs.diff_commits_page(
+            from_commit=request.from_commit,
+            to_commit=request.to_commit,
+            cursor=request.cursor,
+            limit=request.limit
+        )
+
+
 @router.post("/{repo_id}/rollback", response_model=Dict[str, Any])
 @handle_vcs_errors(operation="rollback_to_commit")
 async def rollback_to_commit(
@@ -24,7 +24,9 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import concurrent.futures
 import hashlib
+import itertools
 import json
 import os
 import platform
@@ -35,6 +37,7 @@ import sys
 import threading
 import time
 import unicodedata
+import weakref
 from collections import OrderedDict
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta, timezone
@@ -156,7 +159,8 @@ class CacheConfig(BaseModel):
     
     # L1 cache settings
     l1_max_size: int = Field(default=5000, description="L1 LRU cache max entries")
-    l1_memory_limit_mb: int = Field(default=512, description="L1 memory limit in MB")
+    l1_memory_limit_mb: float = Field(default=512, description="L1 memory limit in MB")
+    l1_admission_enabled: bool = Field(default=True, description="TinyLFU admission filter for L1 inserts")
     
     # Stampede control
     lock_timeout_seconds: int = Field(default=120, description="Singleflight lock timeout")
@@ -174,6 +178,7 @@ class CacheConfig(BaseModel):
             redis_pool_size=getattr(settings, "REDIS_POOL_SIZE", 10),
             compression_enabled=getattr(settings, "CACHE_COMPRESSION_ENABLED", True),
             l1_max_size=getattr(settings, "CACHE_L1_MAX_SIZE", 5000),
+            l1_admission_enabled=getattr(settings, "CACHE_L1_ADMISSION_ENABLED", True),
             enable_cache_metrics=getattr(settings, "CACHE_METRICS_ENABLED", True),
         )
 
@@ -372,147 +377,290 @@ class CacheKeyGenerator:
 
 
 class InFlightCoalescer:
-    """Coalesce concurrent identical requests per worker."""
+    """
+    Coalesce concurrent identical requests per worker.
+    
+    Followers wait on a ``concurrent.futures.Future`` so coalescing also works
+    across threads and event loops: Celery tasks reach the cache through
+    ``async_to_sync``, which runs every call on a fresh loop.
+    """
     
     def __init__(self):
-        self._requests: dict[str, asyncio.Future] = {}
-        self._lock = asyncio.Lock()
+        self._requests: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
     
     async def coalesce(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
         """Coalesce concurrent requests for the same key."""
-        # Check if request already exists (follower path)
-        async with self._lock:
-            if key in self._requests:
-                # Wait for existing request
-                future = self._requests[key]
-                logger.debug("Coalescing request", key=key)
-                metrics.mgf_cache_coalesced_total.inc()
-        
-        # If we found an existing future, await it outside the lock
-        if 'future' in locals():
-            try:
-                return await future
-            except Exception:
-                # Re-raise exception from the original request
-                raise
-        
-        # Leader path: create new future and execute
-        async with self._lock:
-            # Double-check pattern in case another task became leader
-            if key in self._requests:
-                future = self._requests[key]
-                logger.debug("Coalescing request (race condition)", key=key)
-                metrics.mgf_cache_coalesced_total.inc()
-        
-        # If we found a future after double-check, await it outside the lock
-        if 'future' in locals():
-            try:
-                return await future
-            except Exception:
-                raise
+        with self._lock:
+            future = self._requests.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._requests[key] = future
         
-        # We are the leader - create future and register it
-        future = asyncio.Future()
-        async with self._lock:
-            self._requests[key] = future
+        if not leader:
+            # Follower path: the leader's result or exception is re-raised here
+            logger.debug("Coalescing request", key=key)
+            metrics.mgf_cache_coalesced_total.inc()
+            return await asyncio.wrap_future(future)
         
         try:
             # Execute function (outside of lock)
             result = await func()
             future.set_result(result)
             return result
-        except Exception as e:
+        except BaseException as e:
             future.set_exception(e)
             raise
         finally:
-            # Clean up - only remove if it's our future
-            async with self._lock:
+            with self._lock:
                 if self._requests.get(key) is future:
                     self._requests.pop(key, None)
 
 
+# L1 size estimation bounds: containers are sampled, never fully walked
+_SIZE_SAMPLE_ITEMS = 16
+_SIZE_MAX_DEPTH = 3
+_SIZE_UNKNOWN_ITEM = 16
+_SIZE_SCALAR_TYPES = frozenset({type(None), bool, int, float, Decimal})
+
+
+def _estimate_size(value: Any, depth: int = 0) -> int:
+    """
+    Cheap, bounded estimate of a value's serialized size for L1 accounting.
+    
+    Strings and buffers count their length and scalars a fixed 8 bytes.
+    Containers are sampled (at most ``_SIZE_SAMPLE_ITEMS`` items,
+    ``_SIZE_MAX_DEPTH`` levels) and the sample is extrapolated, so large
+    geometry results cost O(1) instead of a full ``json.dumps``.
+    """
+    kind = type(value)
+    if kind is str or kind is bytes or kind is bytearray:
+        return len(value)
+    if kind in _SIZE_SCALAR_TYPES:
+        return 8
+    if kind is dict:
+        count = len(value)
+        if count == 0 or depth >= _SIZE_MAX_DEPTH:
+            return 2 + count * _SIZE_UNKNOWN_ITEM
+        total = 0
+        for sampled, (item_key, item) in enumerate(value.items(), 1):
+            total += _estimate_size(item_key, depth + 1) + _estimate_size(item, depth + 1) + 2
+            if sampled == _SIZE_SAMPLE_ITEMS:
+                break
+        return 2 + total * count // sampled
+    if kind is list or kind is tuple:
+        count = len(value)
+        if count == 0 or depth >= _SIZE_MAX_DEPTH:
+            return 2 + count * _SIZE_UNKNOWN_ITEM
+        total = 0
+        for sampled, item in enumerate(value, 1):
+            total += _estimate_size(item, depth + 1) + 1
+            if sampled == _SIZE_SAMPLE_ITEMS:
+                break
+        return 2 + total * count // sampled
+    # Subclasses and less common types take the slower path
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    if isinstance(value, BaseModel):
+        return _estimate_size(dict(value), depth)
+    if isinstance(value, dict):
+        return _estimate_size(dict(value), depth)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        sample = list(itertools.islice(value, _SIZE_SAMPLE_ITEMS))
+        if not sample or depth >= _SIZE_MAX_DEPTH:
+            return 2 + len(value) * _SIZE_UNKNOWN_ITEM
+        total = sum(_estimate_size(item, depth + 1) + 1 for item in sample)
+        return 2 + total * len(value) // len(sample)
+    return sys.getsizeof(value, 64)
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of key popularity for TinyLFU admission.
+    
+    Four rows of saturating 8-bit counters (capped at 15) indexed by hashes
+    derived from one ``hash(key)``. After ``10 * width`` increments every
+    counter is halved, so the sketch tracks recent rather than lifetime
+    popularity. All operations are O(1) except the amortized reset.
+    """
+    
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+    _MAX_COUNT = 15
+    _HALVE = bytes(i >> 1 for i in range(256))
+    
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self._sample_size = 10 * width
+        self._additions = 0
+    
+    def _indexes(self, key: str) -> list[int]:
+        h = hash(key)
+        mask = self._mask
+        return [((h * seed) >> 17) & mask for seed in self._SEEDS]
+    
+    def increment(self, key: str):
+        """Record one access to ``key``."""
+        added = False
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._reset()
+    
+    def frequency(self, key: str) -> int:
+        """Estimated recent access count of ``key``."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+    
+    def _reset(self):
+        self._rows = [row.translate(self._HALVE) for row in self._rows]
+        self._additions //= 2
+
+
 class L1Cache:
-    """In-process LRU cache (L1)."""
+    """
+    In-process LRU cache (L1) with per-entry TTL and TinyLFU admission.
+    
+    Entries live in an ``OrderedDict`` in recency order, so get, set and
+    eviction are O(1). A ``FrequencySketch`` records every lookup and write;
+    when an insert would evict, the newcomer is admitted only if it is at
+    least as popular as the entries it would displace, so one-off large
+    blobs cannot flush hot geometry results.
+    """
     
     def __init__(self, config: CacheConfig):
         self.config = config
-        self._cache: dict[str, tuple[Any, float, int]] = {}  # key -> (value, timestamp, size_bytes)
-        self._access_order: list[str] = []
+        self._cache: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()  # key -> (value, expires_at, size_bytes)
         self._total_size_bytes = 0
         self._lock = threading.RLock()
-        self._max_memory_bytes = config.l1_memory_limit_mb * 1024 * 1024
+        self._max_memory_bytes = int(config.l1_memory_limit_mb * 1024 * 1024)
+        self._sketch = FrequencySketch(config.l1_max_size) if config.l1_admission_enabled else None
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    @property
+    def total_size_bytes(self) -> int:
+        """Estimated bytes held by live and not-yet-reaped entries."""
+        return self._total_size_bytes
     
     def get(self, key: str) -> Any | None:
         """Get value from L1 cache."""
         with self._lock:
-            if key not in self._cache:
+            if self._sketch is not None:
+                self._sketch.increment(key)
+            
+            entry = self._cache.get(key)
+            if entry is None:
                 return None
             
-            value, timestamp, size_bytes = self._cache[key]
+            value, expires_at, size_bytes = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                self._total_size_bytes -= size_bytes
+                return None
             
             # Move to end (most recently used)
-            self._access_order.remove(key)
-            self._access_order.append(key)
+            self._cache.move_to_end(key)
             
             metrics.mgf_cache_hits_total.labels(cache="l1").inc()
             return value
     
-    def set(self, key: str, value: Any, size_bytes: int | None = None) -> bool:
-        """Set value in L1 cache."""
+    def set(
+        self,
+        key: str,
+        value: Any,
+        size_bytes: int | None = None,
+        ttl: float | None = None
+    ) -> bool:
+        """
+        Set value in L1 cache.
+        
+        Returns False when the value is larger than the whole L1 budget or
+        the admission filter rejects it in favour of hotter entries.
+        """
         if size_bytes is None:
-            # Estimate size
-            try:
-                size_bytes = len(json.dumps(value, default=str))
-            except (TypeError, OverflowError, ValueError) as e:
-                logger.debug(f"Failed to estimate size for L1 cache: {e}")
-                size_bytes = 1000  # Default estimate
+            size_bytes = _estimate_size(value)
+        if ttl is None:
+            ttl = self.config.ttl_default
+        
+        if size_bytes > self._max_memory_bytes:
+            self.delete(key)
+            return False
         
         with self._lock:
-            # Check if we need to evict
-            while (
-                (len(self._cache) >= self.config.l1_max_size or
-                 self._total_size_bytes + size_bytes > self._max_memory_bytes) and
-                self._access_order
-            ):
-                # Evict least recently used
-                evict_key = self._access_order.pop(0)
-                if evict_key in self._cache:
-                    _, _, evict_size = self._cache[evict_key]
-                    del self._cache[evict_key]
-                    self._total_size_bytes -= evict_size
-                    metrics.mgf_cache_evictions_total.labels(cache="l1").inc()
+            sketch = self._sketch
+            if sketch is not None:
+                sketch.increment(key)
+            
+            old = self._cache.pop(key, None)
+            if old is not None:
+                # Updating an admitted key never needs an admission decision
+                self._total_size_bytes -= old[2]
             
-            # Add new entry
-            if key in self._cache:
-                # Update existing
-                _, _, old_size = self._cache[key]
-                self._total_size_bytes -= old_size
-                self._access_order.remove(key)
+            victims = self._select_victims(size_bytes)
+            if victims and old is None and sketch is not None:
+                candidate_frequency = sketch.frequency(key)
+                if any(sketch.frequency(victim) > candidate_frequency for victim in victims):
+                    metrics.mgf_cache_admission_rejected_total.labels(cache="l1").inc()
+                    return False
             
-            self._cache[key] = (value, time.time(), size_bytes)
-            self._access_order.append(key)
+            for victim in victims:
+                _, _, evict_size = self._cache.pop(victim)
+                self._total_size_bytes -= evict_size
+                metrics.mgf_cache_evictions_total.labels(cache="l1").inc()
+            
+            self._cache[key] = (value, time.monotonic() + ttl, size_bytes)
             self._total_size_bytes += size_bytes
             
             return True
     
+    def _select_victims(self, size_bytes: int) -> list[str]:
+        """LRU-first keys that must go to fit an entry of ``size_bytes``."""
+        excess_entries = len(self._cache) + 1 - self.config.l1_max_size
+        excess_bytes = self._total_size_bytes + size_bytes - self._max_memory_bytes
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return []
+        
+        now = time.monotonic()
+        victims = []
+        expired = []
+        for victim, (_, expires_at, victim_size) in self._cache.items():
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            # Expired entries are free to drop and never block admission
+            (expired if expires_at <= now else victims).append(victim)
+            excess_entries -= 1
+            excess_bytes -= victim_size
+        
+        for victim in expired:
+            _, _, expired_size = self._cache.pop(victim)
+            self._total_size_bytes -= expired_size
+        return victims
+    
     def delete(self, key: str) -> bool:
         """Delete value from L1 cache."""
         with self._lock:
-            if key not in self._cache:
+            entry = self._cache.pop(key, None)
+            if entry is None:
                 return False
             
-            _, _, size_bytes = self._cache[key]
-            del self._cache[key]
-            self._access_order.remove(key)
-            self._total_size_bytes -= size_bytes
-            
+            self._total_size_bytes -= entry[2]
             return True
     
     def clear(self):
         """Clear L1 cache."""
         with self._lock:
             self._cache.clear()
-            self._access_order.clear()
             self._total_size_bytes = 0
 
 
@@ -522,7 +670,7 @@ class RedisCache:
     def __init__(self, config: CacheConfig):
         self.config = config
         self._pool = None
-        self._async_pool = None
+        self._async_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
         self._compressor = None
         
         # Initialize compressor
@@ -547,14 +695,19 @@ class RedisCache:
     
     @property
     def async_pool(self) -> redis_async.ConnectionPool:
-        """Get or create async Redis connection pool."""
-        if self._async_pool is None:
-            self._async_pool = redis_async.ConnectionPool.from_url(
+        """Get or create the async Redis connection pool of the running loop."""
+        # Async connections belong to the loop that opened them, and workers
+        # call in through async_to_sync on a new loop each time
+        loop = asyncio.get_running_loop()
+        pool = self._async_pools.get(loop)
+        if pool is None:
+            pool = redis_async.ConnectionPool.from_url(
                 self.config.redis_url,
                 max_connections=self.config.redis_pool_size,
                 decode_responses=self.config.redis_decode_responses
             )
-        return self._async_pool
+            self._async_pools[loop] = pool
+        return pool
     
     def _compress(self, data: bytes) -> tuple[bytes, bool]:
         """Compress data if above threshold."""
@@ -713,8 +866,10 @@ class RedisCache:
                 )
                 return result is not None
         except redis_async.RedisError as e:
+            # Fail open: with Redis unreachable nobody can publish a value to
+            # wait for, so callers compute instead of polling until timeout
             logger.error("Lock acquisition failed", key=key, error=str(e))
-            return False
+            return True
     
     async def release_lock(self, key: str):
         """Release singleflight lock."""
@@ -776,8 +931,12 @@ class RedisCache:
         """Close Redis connection pools."""
         if self._pool:
             self._pool.disconnect()
-        if self._async_pool:
-            await self._async_pool.disconnect()
+        # Pools of other loops cannot be awaited from here; dropping them
+        # closes their sockets with the loop
+        pool = self._async_pools.pop(asyncio.get_running_loop(), None)
+        self._async_pools.clear()
+        if pool:
+            await pool.disconnect()
 
 
 class CacheManager:
@@ -889,7 +1048,7 @@ class CacheManager:
             value = await self.l2_cache.get(cache_key)
             if value is not None:
                 # Populate L1
-                self.l1_cache.set(cache_key, value)
+                self.l1_cache.set(cache_key, value, ttl=self.get_ttl(flow_type))
                 span.set_attribute("cache.hit", True)
                 span.set_attribute("cache.tier", "l2")
                 return value
@@ -920,7 +1079,7 @@ class CacheManager:
                 ttl = self.get_ttl(flow_type)
             
             # Set in L1
-            self.l1_cache.set(cache_key, value)
+            self.l1_cache.set(cache_key, value, ttl=ttl)
             
             # Set in L2
             success = await self.l2_cache.set(cache_key, value, ttl)
@@ -933,6 +1092,18 @@ class CacheManager:
             span.set_attribute("cache.set_success", success)
             return success
     
+    async def delete(
+        self,
+        flow_type: CacheFlowType,
+        canonical_data: str,
+        artifact_type: str = "data"
+    ) -> bool:
+        """Drop a value and its stale copy from both tiers."""
+        cache_key = self.key_generator.generate_key(flow_type, canonical_data, artifact_type)
+        self.l1_cache.delete(cache_key)
+        await self.l2_cache.delete(f"{cache_key}:stale")
+        return await self.l2_cache.delete(cache_key)
+    
     async def get_or_compute(
         self,
         flow_type: CacheFlowType,
@@ -1118,6 +1289,12 @@ if not hasattr(metrics, 'mgf_cache_hits_total'):
         ['cache']
     )
     
+    metrics.mgf_cache_admission_rejected_total = Counter(
+        'mgf_cache_admission_rejected_total',
+        'Total number of inserts rejected by the admission filter',
+        ['cache']
+    )
+    
     metrics.mgf_cache_stale_served_total = Counter(
         'mgf_cache_stale_served_total',
         'Total number of stale values served'
@@ -38,8 +38,6 @@ FORMAT_MAP = {
 }
 
 # WebSocket and SSE configuration
-PROGRESS_CHANNEL_PREFIX = "job:progress:"
-PROGRESS_ALL_CHANNEL = "job:progress:*"
 PROGRESS_CACHE_TTL = 3600  # 1 hour in seconds
 PROGRESS_CACHE_MAX_EVENTS = 1000  # Maximum events to cache per job
 
@@ -50,6 +48,11 @@ MILESTONE_BYPASS_THROTTLE = True  # Milestone events bypass throttling
 # SSE keepalive configuration
 SSE_KEEPALIVE_INTERVAL = 30.0  # Send keepalive every 30 seconds
 
+# Progress hub fan-out: frames queued per WebSocket/SSE subscriber before the oldest are dropped
+PROGRESS_SUBSCRIBER_QUEUE_SIZE = 32
+# Longest a progress hub XREAD blocks before it re-reads its watched job streams
+PROGRESS_STREAM_BLOCK_MS = 5000
+
 # WebSocket retry configuration
 WS_RETRY_AFTER_ERROR = 5000  # Retry after 5 seconds on error
 WS_RETRY_AFTER_DISCONNECT = 1000  # Retry after 1 second on disconnect
@@ -165,13 +168,13 @@ __all__ = [
     # Existing constants (restored)
     "TERMINAL_STATUSES",
     "FORMAT_MAP",
-    "PROGRESS_CHANNEL_PREFIX",
-    "PROGRESS_ALL_CHANNEL",
     "PROGRESS_CACHE_TTL",
     "PROGRESS_CACHE_MAX_EVENTS",
     "THROTTLE_INTERVAL_MS",
     "MILESTONE_BYPASS_THROTTLE",
     "SSE_KEEPALIVE_INTERVAL",
+    "PROGRESS_SUBSCRIBER_QUEUE_SIZE",
+    "PROGRESS_STREAM_BLOCK_MS",
     "WS_RETRY_AFTER_ERROR",
     "WS_RETRY_AFTER_DISCONNECT",
     # Task 7.17 Model Generation Observability constants
@@ -135,7 +135,25 @@ class UltraEnterpriseEnvironment(BaseSettings):
     
     REDIS_CONNECTION_POOL_SIZE: int = Field(default=50, description="Redis connection pool")
     REDIS_CONNECTION_TIMEOUT: int = Field(default=5, description="Redis connection timeout")
-    
+
+    # Worker progress publisher (Task 7.16)
+    PROGRESS_PUBLISH_FLUSH_INTERVAL_MS: int = Field(default=100, description="Max wait before buffered worker progress is published")
+    PROGRESS_PUBLISH_MAX_PENDING: int = Field(default=1024, description="Buffered worker progress messages before non-milestone updates are dropped")
+
+    # L1 geometry cache (Task 7.13)
+    CACHE_L1_MAX_SIZE: int = Field(default=5000, description="Max entries in the in-process L1 cache")
+    CACHE_L1_ADMISSION_ENABLED: bool = Field(default=True, description="Reject L1 inserts less popular than the entries they would evict")
+
+    # Model result cache (Task 7.13)
+    MODEL_RESULT_CACHE_ENABLED: bool = Field(default=True, description="Link artefacts of identical earlier model jobs instead of rebuilding")
+    MODEL_RESULT_CACHE_TTL_SECONDS: int = Field(default=86400, description="How long a built model result can be reused")
+
+    # License entitlement cache (Task 4.3)
+    LICENSE_ENTITLEMENT_CACHE_ENABLED: bool = Field(default=True, description="Cache license entitlements in LicenseGuardMiddleware")
+    LICENSE_ENTITLEMENT_LOCAL_TTL_SECONDS: float = Field(default=30.0, description="In-process entitlement cache TTL")
+    LICENSE_ENTITLEMENT_REDIS_TTL_SECONDS: int = Field(default=300, description="Shared Redis entitlement cache TTL")
+    LICENSE_ENTITLEMENT_MAX_ENTRIES: int = Field(default=10000, description="Maximum in-process entitlement cache entries")
+
     # ===================================================================
     # JWT & AUTHENTICATION CONFIGURATION (Tasks 3.1, 3.2, 3.3)
     # ===================================================================
@@ -319,6 +337,13 @@ class UltraEnterpriseEnvironment(BaseSettings):
     AUDIT_LOG_ENABLED: bool = Field(default=True, description="Enable audit logging")
     AUDIT_LOG_RETENTION_DAYS: int = Field(default=2555, description="Audit log retention")
     AUDIT_HASH_CHAIN_ENABLED: bool = Field(default=True, description="Enable audit hash chain")
+    AUDIT_CHAIN_BATCH_SIZE: int = Field(default=500, description="Max audit entries per batched chain append")
+    AUDIT_CHAIN_FLUSH_INTERVAL_MS: int = Field(default=50, description="Max wait before a partial audit batch is written")
+    AUDIT_CHAIN_MAX_PENDING: int = Field(default=10000, description="Buffered audit entries before new entries are rejected")
+    AUDIT_CHAIN_VERIFY_CHUNK_SIZE: int = Field(default=5000, description="Audit entries per parallel verification chunk")
+    AUDIT_CHAIN_VERIFY_WORKERS: int = Field(default=4, description="Processes used for audit chain verification")
+    AUDIT_CHAIN_VERIFY_PARALLEL_MIN_ENTRIES: int = Field(default=50000, description="Audit entries in a range before verification uses worker processes")
+    AUDIT_CHAIN_CHECKPOINT_INTERVAL: int = Field(default=100000, description="Entries between audit chain verification checkpoints")
     AUDIT_REAL_TIME_MONITORING: bool = Field(
         default=True,
         description="Enable real-time security monitoring"
@@ -432,6 +457,27 @@ class UltraEnterpriseEnvironment(BaseSettings):
         description="Fail-closed security policy: block uploads if ClamAV daemon is unreachable"
     )
     
+    CLAMAV_SESSION_IDLE_TIMEOUT: float = Field(
+        default=20.0,
+        description="Seconds an idle pooled clamd session is reused; keep below clamd's IdleTimeout"
+    )
+    
+    # Single-pass upload ingest: one object read feeds SHA-256, format sniffing and ClamAV
+    UPLOAD_SINGLE_PASS_INGEST: bool = Field(
+        default=True,
+        description="Verify, sniff and scan finalized uploads from a single object read"
+    )
+    
+    UPLOAD_INGEST_CHUNK_SIZE: int = Field(
+        default=1024 * 1024,
+        description="Chunk size in bytes for the single-pass upload ingest read"
+    )
+    
+    UPLOAD_INGEST_QUEUE_DEPTH: int = Field(
+        default=8,
+        description="Chunks buffered per ingest consumer before the object read waits"
+    )
+    
     # ===================================================================
     # BACKUP & DISASTER RECOVERY CONFIGURATION (Task 7.26)
     # ===================================================================
@@ -456,6 +502,16 @@ class UltraEnterpriseEnvironment(BaseSettings):
         description="Enable backup compression"
     )
 
+    BACKUP_CHUNK_STORE_DIR: str = Field(
+        default="",
+        description="Persistent directory for deduplicated incremental backup chunks (segment files and SQLite index); empty keeps chunks in memory, lost on restart"
+    )
+
+    BACKUP_CHUNK_SEGMENT_MB: int = Field(
+        default=256,
+        description="Size at which the active backup chunk segment file is sealed and a new one started"
+    )
+
     # ===================================================================
     # FREECAD & APPLICATION SPECIFIC
     # ===================================================================
@@ -466,6 +522,21 @@ class UltraEnterpriseEnvironment(BaseSettings):
     FREECAD_CIRCUIT_BREAKER_THRESHOLD: int = Field(default=5, description="Number of failures before circuit opens")
     FREECAD_CIRCUIT_BREAKER_RECOVERY_TIMEOUT: int = Field(default=60, description="Seconds to wait before attempting recovery")
     FREECAD_MAX_WORKERS: int = Field(default=4, description="Maximum concurrent FreeCAD operations")
+    FREECAD_WORKER_POOL_ENABLED: bool = Field(default=False, description="Run FreeCAD jobs in a pool of warm, pre-imported freecadcmd workers")
+    FREECAD_WORKER_POOL_SIZE: int = Field(default=4, description="Number of warm FreeCAD worker processes")
+    FREECAD_WORKER_MAX_JOBS: int = Field(default=50, description="Recycle a warm FreeCAD worker after this many jobs")
+    FREECAD_WORKER_MAX_RSS_MB: int = Field(default=1536, description="Recycle a warm FreeCAD worker when its RSS exceeds this many MB")
+    FREECAD_WORKER_STARTUP_TIMEOUT_SECONDS: int = Field(default=60, description="Seconds to wait for a FreeCAD worker to import FreeCAD and become ready")
+    FREECAD_WORKER_PRELOAD_MODULES: str = Field(default="Part,Mesh,Import", description="Comma-separated modules imported by each warm worker at start-up")
+    
+    # Batch processing (Task 7.23)
+    BATCH_RESULT_LOG_DIR: str = Field(default="/tmp/batch_results", description="Directory for streamed batch result logs (JSONL) used for lazy aggregation and resume")
+    BATCH_PROGRESS_FLUSH_INTERVAL_SECONDS: float = Field(default=1.0, description="How often aggregated batch progress counters are flushed to Redis and checkpointed")
+    WORKFLOW_STATE_DIR: str = Field(default="/tmp/workflow_state", description="Directory for workflow execution checkpoints used to pause and resume across restarts")
+    
+    # Startup
+    LAZY_ROUTERS_ENABLED: bool = Field(default=True, description="Import heavy routers on the first request under their prefix instead of at startup")
+    LAZY_ROUTERS_WARMUP: bool = Field(default=True, description="Load the pending lazy routers in the background once startup has completed")
     
     # ===================================================================
     # RABBITMQ & CELERY CONFIGURATION
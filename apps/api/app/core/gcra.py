@@ -0,0 +1,358 @@
+"""
+GCRA rate limiting engine backed by Redis (Task 3.9).
+
+The generic cell rate algorithm keeps a single "theoretical arrival time"
+(TAT) string per key instead of one sorted-set member per request, so memory
+per key is constant regardless of traffic. The Lua script is registered once and
+invoked through EVALSHA (redis-py reloads it on NOSCRIPT), and several limits
+- e.g. IP, user and route - are checked atomically in one round-trip: the
+request is admitted only if every limit admits it, and nothing is charged
+otherwise.
+
+Optionally, a limit can lease a few extra tokens with the Redis call. The
+leased tokens are already charged to the shared TAT and are handed out from
+process memory until they run out or expire, so clearly-under-limit traffic
+skips Redis without ever exceeding the global limit by more than one lease.
+
+The script derives a companion key from each TAT key, so it targets a single
+Redis instance or primary, as the rest of the platform does.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# KEYS: the TAT key of every limit. ARGV: now (ms), apply (1/0), then per
+# key limit, period (ms) and requested lease; every request costs one token. Replies six integers per
+# key: allowed, remaining, retry_after_ms, reset_after_ms, denied, leased.
+# Rejections are counted in a "<key>:denied" companion that expires with the
+# TAT, so the admit path touches a single string key.
+GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local apply = ARGV[2] == '1'
+local eps = 0.001
+local n = #KEYS
+local tats, new_tats, intervals, periods, remaining, retry, lease = {}, {}, {}, {}, {}, {}, {}
+local admitted = true
+
+for i = 1, n do
+    local base = 3 + (i - 1) * 3
+    local limit = tonumber(ARGV[base])
+    local period = tonumber(ARGV[base + 1])
+    local interval = period / limit
+    local tat = tonumber(redis.call('GET', KEYS[i])) or now
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + interval
+    local allow_at = new_tat - period
+    tats[i], new_tats[i], intervals[i], periods[i] = tat, new_tat, interval, period
+    if allow_at - now > eps then
+        admitted = false
+        remaining[i] = 0
+        retry[i] = allow_at - now
+    else
+        local left = math.floor((now - allow_at) / interval + eps)
+        local wanted = tonumber(ARGV[base + 2])
+        remaining[i] = left
+        retry[i] = 0
+        -- Lease only while clearly under the limit, so leases never starve
+        -- other processes of the last few tokens
+        if wanted > 0 and left >= 2 * wanted then
+            lease[i] = wanted
+        else
+            lease[i] = 0
+        end
+    end
+end
+
+local reply = {}
+for i = 1, n do
+    local tat, left, leased, denied, allowed = tats[i], remaining[i], 0, 0, 1
+    if retry[i] > 0 then
+        allowed = 0
+        if apply then
+            local ttl = math.max(1, math.ceil(tat - now))
+            denied = redis.call('INCR', KEYS[i] .. ':denied')
+            redis.call('PEXPIRE', KEYS[i] .. ':denied', ttl)
+        else
+            denied = tonumber(redis.call('GET', KEYS[i] .. ':denied')) or 0
+        end
+    elseif admitted and apply then
+        leased = lease[i]
+        tat = new_tats[i] + leased * intervals[i]
+        left = left - leased
+        redis.call('SET', KEYS[i], tat, 'PX', math.max(1, math.ceil(tat - now)))
+    else
+        -- Nothing was charged: report the state before this request
+        left = math.floor((now - tat + periods[i]) / intervals[i] + eps)
+    end
+    reply[#reply + 1] = allowed
+    reply[#reply + 1] = left
+    reply[#reply + 1] = math.ceil(retry[i])
+    reply[#reply + 1] = math.ceil(tat - now)
+    reply[#reply + 1] = denied
+    reply[#reply + 1] = leased
+end
+return reply
+"""
+
+_REPLY_WIDTH = 6
+
+# Lease bookkeeping is swept of expired entries once it grows past this
+_LEASE_SWEEP_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class GCRALimit:
+    """One limit to enforce: at most ``limit`` requests per ``period_seconds``.
+
+    ``lease`` is the number of extra tokens to reserve for local admission
+    when Redis admits a request; 0 sends every request to Redis.
+    """
+    key: str
+    limit: int
+    period_seconds: float
+    lease: int = 0
+
+    @property
+    def interval_ms(self) -> float:
+        return self.period_seconds * 1000.0 / self.limit
+
+
+@dataclass(frozen=True)
+class GCRADecision:
+    """Outcome of one limit for one request."""
+    key: str
+    allowed: bool
+    remaining: int
+    retry_after_ms: int
+    reset_after_ms: int
+    denied: int = 0
+    local: bool = False
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds until the request would be admitted, rounded up."""
+        return math.ceil(self.retry_after_ms / 1000)
+
+    @property
+    def reset_after(self) -> int:
+        """Seconds until the limit is fully replenished, rounded up."""
+        return math.ceil(self.reset_after_ms / 1000)
+
+
+@dataclass
+class _Lease:
+    tokens: int
+    remaining: int
+    reset_at_ms: float
+    expires_at: float
+
+
+class LocalLeases:
+    """Per-process token leases handed out without contacting Redis.
+
+    Limits of a request that hold a live lease are admitted from it; only the
+    others go to Redis, which may grant them new leases. If Redis rejects the
+    request the locally taken tokens are refunded.
+    """
+
+    def __init__(self):
+        self._leases: Dict[str, _Lease] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._leases)
+
+    def take(self, limits: Sequence[GCRALimit], now_ms: float) -> Dict[str, GCRADecision]:
+        """Consume one leased token where available, keyed by limit key."""
+        now = time.monotonic()
+        taken: Dict[str, GCRADecision] = {}
+        with self._lock:
+            for limit in limits:
+                lease = self._leases.get(limit.key)
+                if lease is None or lease.tokens <= 0 or lease.expires_at <= now:
+                    continue
+                lease.tokens -= 1
+                taken[limit.key] = GCRADecision(
+                    key=limit.key,
+                    allowed=True,
+                    remaining=lease.remaining + lease.tokens,
+                    retry_after_ms=0,
+                    reset_after_ms=max(0, math.ceil(lease.reset_at_ms - now_ms)),
+                    local=True,
+                )
+        return taken
+
+    def refund(self, keys: Iterable[str]) -> None:
+        """Return tokens taken for a request that Redis rejected."""
+        with self._lock:
+            for key in keys:
+                lease = self._leases.get(key)
+                if lease is not None:
+                    lease.tokens += 1
+
+    def grant(self, limit: GCRALimit, decision: GCRADecision, tokens: int, now_ms: float) -> None:
+        """Record ``tokens`` reserved by Redis for ``limit``."""
+        now = time.monotonic()
+        # Leased tokens stand for the next ``tokens`` emission intervals;
+        # expiring them after that bounds any overshoot to one lease
+        expires_at = now + tokens * limit.interval_ms / 1000.0
+        with self._lock:
+            if len(self._leases) >= _LEASE_SWEEP_SIZE:
+                self._leases = {key: lease for key, lease in self._leases.items() if lease.expires_at > now}
+            lease = self._leases.get(limit.key)
+            if lease is not None and lease.expires_at > now:
+                # A concurrent request was granted a lease too: keep both
+                tokens += lease.tokens
+                expires_at = max(expires_at, lease.expires_at)
+            self._leases[limit.key] = _Lease(
+                tokens=tokens,
+                remaining=decision.remaining,
+                reset_at_ms=now_ms + decision.reset_after_ms,
+                expires_at=expires_at,
+            )
+
+    def discard(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._leases.pop(key, None)
+
+
+class _GCRAEngine:
+    """Argument building and reply parsing shared by the sync and async engines."""
+
+    def __init__(self, redis_client: Any, key_prefix: str = "gcra", local_leases: bool = True):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.leases: Optional[LocalLeases] = LocalLeases() if local_leases else None
+        self._script = redis_client.register_script(GCRA_LUA)
+
+    def full_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _stored_keys(self, keys: Sequence[str]) -> List[str]:
+        full_keys = [self.full_key(key) for key in keys]
+        return full_keys + [f"{key}:denied" for key in full_keys]
+
+    def _take_local(self, limits: Sequence[GCRALimit], now_ms: float):
+        """Split ``limits`` into locally admitted decisions and those for Redis."""
+        if self.leases is None:
+            return {}, list(limits)
+        local = self.leases.take([limit for limit in limits if limit.lease > 0], now_ms)
+        return local, [limit for limit in limits if limit.key not in local]
+
+    def _merge(
+        self,
+        limits: Sequence[GCRALimit],
+        local: Dict[str, GCRADecision],
+        remote: Sequence[GCRADecision],
+    ) -> List[GCRADecision]:
+        if local and not all(decision.allowed for decision in remote):
+            self.leases.refund(local)
+        by_key = dict(local)
+        by_key.update((decision.key, decision) for decision in remote)
+        return [by_key[limit.key] for limit in limits]
+
+    def _script_args(self, limits: Sequence[GCRALimit], now_ms: float, apply: bool):
+        keys = [self.full_key(limit.key) for limit in limits]
+        args: List[Any] = [repr(now_ms), 1 if apply else 0]
+        for limit in limits:
+            lease = limit.lease if self.leases is not None and apply else 0
+            args.extend((limit.limit, repr(limit.period_seconds * 1000.0), lease))
+        return keys, args
+
+    def _parse(self, limits: Sequence[GCRALimit], reply: Sequence[Any], now_ms: float) -> List[GCRADecision]:
+        decisions = []
+        for index, limit in enumerate(limits):
+            allowed, remaining, retry_after, reset_after, denied, leased = (
+                int(value) for value in reply[index * _REPLY_WIDTH:(index + 1) * _REPLY_WIDTH]
+            )
+            decision = GCRADecision(
+                key=limit.key,
+                allowed=bool(allowed),
+                remaining=max(0, remaining),
+                retry_after_ms=max(0, retry_after),
+                reset_after_ms=max(0, reset_after),
+                denied=denied,
+            )
+            if leased > 0 and self.leases is not None:
+                self.leases.grant(limit, decision, leased, now_ms)
+                decision = GCRADecision(
+                    key=decision.key,
+                    allowed=True,
+                    remaining=decision.remaining + leased,
+                    retry_after_ms=0,
+                    reset_after_ms=decision.reset_after_ms,
+                )
+            decisions.append(decision)
+        return decisions
+
+
+class GCRARateLimiter(_GCRAEngine):
+    """GCRA limiter for a synchronous redis-py client."""
+
+    def check(self, limits: Sequence[GCRALimit], now: Optional[float] = None) -> List[GCRADecision]:
+        """Admit one request against every limit atomically.
+
+        Returns one decision per limit; the request is admitted only if all
+        of them allow it, and no limit is charged when any of them denies.
+        """
+        now_ms = (time.time() if now is None else now) * 1000.0
+        local, pending = self._take_local(limits, now_ms)
+        remote: List[GCRADecision] = []
+        if pending:
+            keys, args = self._script_args(pending, now_ms, apply=True)
+            remote = self._parse(pending, self._script(keys=keys, args=args), now_ms)
+        return self._merge(limits, local, remote)
+
+    def peek(self, limits: Sequence[GCRALimit], now: Optional[float] = None) -> List[GCRADecision]:
+        """Report what ``check`` would decide, without charging anything."""
+        now_ms = (time.time() if now is None else now) * 1000.0
+        keys, args = self._script_args(limits, now_ms, apply=False)
+        return self._parse(limits, self._script(keys=keys, args=args), now_ms)
+
+    def reset(self, keys: Sequence[str]) -> None:
+        if self.leases is not None:
+            self.leases.discard(keys)
+        self.redis_client.delete(*self._stored_keys(keys))
+
+
+class AsyncGCRARateLimiter(_GCRAEngine):
+    """GCRA limiter for a ``redis.asyncio`` client."""
+
+    async def check(self, limits: Sequence[GCRALimit], now: Optional[float] = None) -> List[GCRADecision]:
+        """Admit one request against every limit atomically (see GCRARateLimiter.check)."""
+        now_ms = (time.time() if now is None else now) * 1000.0
+        local, pending = self._take_local(limits, now_ms)
+        remote: List[GCRADecision] = []
+        if pending:
+            keys, args = self._script_args(pending, now_ms, apply=True)
+            remote = self._parse(pending, await self._script(keys=keys, args=args), now_ms)
+        return self._merge(limits, local, remote)
+
+    async def peek(self, limits: Sequence[GCRALimit], now: Optional[float] = None) -> List[GCRADecision]:
+        """Report what ``check`` would decide, without charging anything."""
+        now_ms = (time.time() if now is None else now) * 1000.0
+        keys, args = self._script_args(limits, now_ms, apply=False)
+        return self._parse(limits, await self._script(keys=keys, args=args), now_ms)
+
+    async def reset(self, keys: Sequence[str]) -> None:
+        if self.leases is not None:
+            self.leases.discard(keys)
+        await self.redis_client.delete(*self._stored_keys(keys))
+
+
+__all__ = [
+    "GCRA_LUA",
+    "GCRALimit",
+    "GCRADecision",
+    "LocalLeases",
+    "GCRARateLimiter",
+    "AsyncGCRARateLimiter",
+]
@@ -0,0 +1,45 @@
+"""
+Deferred loading of heavy modules.
+
+Cold start of API pods and Celery worker processes is dominated by imports
+a request or task may never need: reportlab, cairosvg, qrcode, numpy,
+boto3. ``lazy_module(name)`` returns a module proxy that imports the real
+module on first attribute access; it is bound to the usual name
+(``np = lazy_module("numpy")``) so call sites do not change.
+
+Routers are deferred the same way by ``app.core.lazy_routers``.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __getattr__(self, name: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        # Later lookups find the attributes directly, without __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """The module if it is already imported, otherwise a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def module_available(name: str) -> bool:
+    """Whether name can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
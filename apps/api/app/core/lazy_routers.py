@@ -0,0 +1,198 @@
+"""
+Deferred loading of API routers.
+
+Router modules pull whole service layers in with them. Instead of
+importing them when the application is built:
+
+- ``include_lazy_router(app, module, prefix)`` adds a placeholder route
+  that imports the router module and mounts its routes in its place on
+  the first request under ``prefix``
+- ``warm_lazy_routers`` mounts the remaining ones in the background after
+  startup
+- ``install_lazy_openapi`` loads them all before the OpenAPI schema is
+  generated
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LazyRouter(BaseRoute):
+    """
+    Placeholder for a router whose module is imported on first use.
+
+    Matches every request under its prefix. Handling one imports the module,
+    replaces the placeholder with the router's routes at the same position
+    in the routing table, and routes the request again.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        module: str,
+        prefix: str,
+        attribute: str = "router",
+        optional: bool = False,
+        include_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.application = app
+        self.module = module
+        self.prefix = prefix.rstrip("/")
+        self.attribute = attribute
+        self.optional = optional
+        self.include_kwargs = include_kwargs or {}
+        self.loaded = False
+
+    def __repr__(self) -> str:
+        return f"LazyRouter(module={self.module!r}, prefix={self.prefix!r})"
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        # The placeholder is gone from the routing table now
+        await self.application.router(scope, receive, send)
+
+    def load(self):
+        """Import the router module and mount its routes; safe to call repeatedly."""
+        if self.loaded:
+            return
+        try:
+            module = importlib.import_module(self.module)
+        except Exception as e:
+            if not self.optional:
+                raise
+            logger.warning("Optional router unavailable", extra={
+                'operation': 'lazy_router_unavailable',
+                'router_module': self.module,
+                'error_type': type(e).__name__
+            })
+            self._replace_with([])
+            return
+        self._mount(getattr(module, self.attribute))
+
+    def _mount(self, router):
+        routes = self.application.router.routes
+        before = len(routes)
+        self.application.include_router(router, **self.include_kwargs)
+        added = routes[before:]
+        del routes[before:]
+
+        outside = [
+            getattr(route, "path", "") for route in added
+            if not getattr(route, "path", "").startswith(self.prefix)
+        ]
+        if outside:
+            # Reachable only once the router is loaded
+            logger.warning("Lazy router has routes outside its prefix", extra={
+                'operation': 'lazy_router_prefix_mismatch',
+                'router_module': self.module,
+                'prefix': self.prefix,
+                'paths': outside[:5]
+            })
+        self._replace_with(added)
+        logger.debug("Lazy router mounted", extra={
+            'operation': 'lazy_router_mounted',
+            'router_module': self.module,
+            'routes': len(added)
+        })
+
+    def _replace_with(self, new_routes: List[BaseRoute]):
+        routes = self.application.router.routes
+        if self in routes:
+            index = routes.index(self)
+            routes[index:index + 1] = new_routes
+        self.application.openapi_schema = None
+        self.loaded = True
+
+
+def include_lazy_router(
+    app: FastAPI,
+    module: str,
+    prefix: str,
+    *,
+    attribute: str = "router",
+    optional: bool = False,
+    eager: bool = False,
+    **include_kwargs: Any,
+) -> LazyRouter:
+    """
+    Include the router ``module.attribute`` when the first request under
+    prefix arrives, or right away when eager is set.
+
+    optional routers that fail to import are dropped with a warning, like
+    a guarded import at startup would.
+    """
+    placeholder = LazyRouter(app, module, prefix, attribute, optional, include_kwargs)
+    app.router.routes.append(placeholder)
+    if eager:
+        placeholder.load()
+    return placeholder
+
+
+def pending_lazy_routers(app: FastAPI) -> List[LazyRouter]:
+    return [route for route in app.router.routes if isinstance(route, LazyRouter)]
+
+
+def load_lazy_routers(app: FastAPI):
+    """Mount every pending lazy router now."""
+    for placeholder in pending_lazy_routers(app):
+        placeholder.load()
+
+
+async def warm_lazy_routers(app: FastAPI):
+    """
+    Mount the pending lazy routers in the background.
+
+    Modules are imported in a worker thread so the event loop keeps serving
+    requests; mounting happens on the loop, where the routing table is read.
+    """
+    for placeholder in pending_lazy_routers(app):
+        try:
+            await asyncio.to_thread(importlib.import_module, placeholder.module)
+        except Exception:
+            # load() below reports the failure (or drops an optional router)
+            pass
+        try:
+            placeholder.load()
+        except Exception as e:
+            logger.error("Failed to warm lazy router", exc_info=True, extra={
+                'operation': 'lazy_router_warm_failed',
+                'router_module': placeholder.module,
+                'error_type': type(e).__name__
+            })
+    logger.info("Lazy routers warmed", extra={
+        'operation': 'lazy_routers_warmed',
+        'pending': len(pending_lazy_routers(app))
+    })
+
+
+def install_lazy_openapi(app: FastAPI):
+    """Make OpenAPI schema generation load the pending lazy routers first."""
+    generate = app.openapi
+
+    def openapi() -> Dict[str, Any]:
+        if app.openapi_schema is None:
+            load_lazy_routers(app)
+        return generate()
+
+    app.openapi = openapi
@@ -303,6 +303,13 @@ freecad_model_generation_duration = Histogram(
     registry=REGISTRY
 )
 
+model_result_cache_requests_total = Counter(
+    'model_result_cache_requests_total',
+    'Model generation jobs by result cache outcome (hit rate = hit / (hit + miss))',
+    ['type', 'result'],  # result: hit, miss, bypass
+    registry=REGISTRY
+)
+
 fem_simulations_total = Counter(
     'fem_simulations_total',
     'Total number of FEM simulations',
@@ -409,6 +416,44 @@ http_request_duration_seconds = Histogram(
     registry=REGISTRY
 )
 
+security_pipeline_layer_duration_seconds = Histogram(
+    'security_pipeline_layer_duration_seconds',
+    'Time spent in each layer of the security middleware pipeline',
+    ['layer', 'phase'],  # phase: request, response
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.25, float('inf')),
+    registry=REGISTRY
+)
+
+# Progress fan-out hub (one progress stream reader per process)
+progress_hub_subscribers = Gauge(
+    'progress_hub_subscribers',
+    'Progress stream subscribers attached to the fan-out hub',
+    ['transport'],  # websocket, sse
+    registry=REGISTRY
+)
+
+progress_hub_messages_total = Counter(
+    'progress_hub_messages_total',
+    'Progress messages received by the fan-out hub',
+    ['outcome'],  # dispatched, no_subscribers, invalid
+    registry=REGISTRY
+)
+
+progress_hub_dropped_total = Counter(
+    'progress_hub_dropped_total',
+    'Progress frames dropped from a full subscriber queue',
+    ['transport'],
+    registry=REGISTRY
+)
+
+progress_hub_delivery_lag_seconds = Histogram(
+    'progress_hub_delivery_lag_seconds',
+    'Time between the hub receiving a progress message and a subscriber taking it',
+    ['transport'],
+    buckets=FAST_OPERATION_BUCKETS,
+    registry=REGISTRY
+)
+
 freecad_error_recovery_total = Counter(
     'freecad_error_recovery_total',
     'Total number of FreeCAD error recovery attempts',
@@ -890,6 +935,7 @@ __all__ = [
     # Task 7.4: New model flow and FEM metrics
     'freecad_model_generations_total',
     'freecad_model_generation_duration',
+    'model_result_cache_requests_total',
     'fem_simulations_total',
     'fem_simulation_duration',
     'fem_mesh_elements_total',
@@ -901,6 +947,11 @@ __all__ = [
     'error_count_total',
     'http_requests_total',
     'http_request_duration_seconds',
+    'security_pipeline_layer_duration_seconds',
+    'progress_hub_subscribers',
+    'progress_hub_messages_total',
+    'progress_hub_dropped_total',
+    'progress_hub_delivery_lag_seconds',
     'freecad_error_recovery_total',
     'pii_masking_operations_total',
     # Task 7.17: FreeCAD 1.1.0/OCCT 7.8.x metrics
@@ -0,0 +1,353 @@
+"""
+Progress fan-out hub for WebSocket and SSE clients.
+
+One hub per process follows the progress streams of the jobs its WebSocket
+and SSE subscribers watch, with a single blocking XREAD over all of them
+(one cursor per job), and serves every subscriber from it:
+
+- only watched jobs are read; a job's cursor starts at its newest entry
+  when its first subscriber arrives, and the read is woken to include it
+- each entry is validated into ProgressMessageV2 once, and the WebSocket
+  text frame and SSE event bytes are encoded once, on first use, and shared
+  by all subscribers
+- each subscriber has its own bounded queue, so a slow socket only delays
+  itself; when the queue is full the oldest non-milestone frame is dropped
+  so the consumer catches up to the latest progress without losing phase
+  boundaries, and the terminal frame is always delivered
+
+The listener starts with the first subscription and retries with backoff;
+cursors survive reconnects, so nothing appended meanwhile is skipped.
+Subscriber counts, drops and delivery lag go to Prometheus (progress_hub_*
+metrics) and get_stats().
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from functools import cached_property
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from pydantic import ValidationError
+from sse_starlette.sse import ServerSentEvent
+
+from . import metrics
+from .constants import PROGRESS_STREAM_BLOCK_MS, PROGRESS_SUBSCRIBER_QUEUE_SIZE, TERMINAL_STATUSES
+from .logging import get_logger
+from .redis_pubsub import RedisProgressPubSub, decode_progress_entry, redis_progress_pubsub
+from ..schemas.progress import ProgressMessageV2
+
+logger = get_logger(__name__)
+
+TRANSPORTS = ("websocket", "sse")
+
+
+class ProgressFrame:
+    """A decoded progress message with its wire encodings, shared by all subscribers."""
+
+    def __init__(self, job_id: int, progress: ProgressMessageV2, received_at: float):
+        self.job_id = job_id
+        self.progress = progress
+        self.received_at = received_at
+
+    @property
+    def event_id(self) -> int:
+        return self.progress.event_id
+
+    @property
+    def terminal(self) -> bool:
+        return self.progress.status in TERMINAL_STATUSES
+
+    @cached_property
+    def json(self) -> str:
+        return self.progress.model_dump_json()
+
+    @cached_property
+    def websocket_text(self) -> str:
+        """``{"type": "progress", ...ProgressMessageV2}`` as sent to WebSocket clients."""
+        return '{"type":"progress",' + self.json[1:]
+
+    @cached_property
+    def sse_bytes(self) -> bytes:
+        """The ``progress`` SSE event, ready for EventSourceResponse."""
+        return ServerSentEvent(data=self.json, event="progress", id=str(self.event_id)).encode()
+
+
+class ProgressSubscription:
+    """
+    One subscriber's view of a job's progress stream.
+
+    Iterate with ``async for`` or call get(); the stream ends after the
+    terminal frame or when the subscription is closed.
+    """
+
+    def __init__(
+        self,
+        hub: "ProgressHub",
+        job_id: int,
+        transport: str,
+        max_queue: int,
+        accept: Optional[Callable[[ProgressMessageV2], bool]] = None
+    ):
+        self.hub = hub
+        self.job_id = job_id
+        self.transport = transport
+        self.max_queue = max_queue
+        self.accept = accept
+        self.dropped = 0
+        self.delivered = 0
+        self._frames: Deque[ProgressFrame] = deque()
+        self._ready = asyncio.Event()
+        self._finished = False
+        self._closed = False
+        self._dropped_metric = metrics.progress_hub_dropped_total.labels(transport=transport)
+        self._lag_metric = metrics.progress_hub_delivery_lag_seconds.labels(transport=transport)
+
+    @property
+    def closed(self) -> bool:
+        """True once the stream has ended; get() will only return queued frames."""
+        return self._closed or self._finished
+
+    @property
+    def pending(self) -> int:
+        return len(self._frames)
+
+    def lag(self, now: float) -> float:
+        """Age of the oldest undelivered frame."""
+        return now - self._frames[0].received_at if self._frames else 0.0
+
+    def _offer(self, frame: ProgressFrame) -> None:
+        if self.closed:
+            return
+        if self.accept is not None and not frame.terminal and not self.accept(frame.progress):
+            return
+        if len(self._frames) >= self.max_queue:
+            self._drop_one()
+        self._frames.append(frame)
+        if frame.terminal:
+            self._finished = True
+        self._ready.set()
+
+    def _drop_one(self) -> None:
+        for index, queued in enumerate(self._frames):
+            if not queued.progress.milestone:
+                del self._frames[index]
+                break
+        else:
+            self._frames.popleft()
+        self.dropped += 1
+        self._dropped_metric.inc()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ProgressFrame]:
+        """Next frame; None on timeout or once the stream has ended and drained."""
+        while not self._frames:
+            if self.closed:
+                return None
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        frame = self._frames.popleft()
+        self.delivered += 1
+        self._lag_metric.observe(asyncio.get_running_loop().time() - frame.received_at)
+        return frame
+
+    def __aiter__(self) -> "ProgressSubscription":
+        return self
+
+    async def __anext__(self) -> ProgressFrame:
+        frame = await self.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._ready.set()
+            self.hub._remove(self)
+
+    async def __aenter__(self) -> "ProgressSubscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+
+class ProgressHub:
+    """Per-process fan-out of Redis job progress streams to WebSocket and SSE subscribers."""
+
+    def __init__(
+        self,
+        source: Optional[RedisProgressPubSub] = None,
+        queue_size: int = PROGRESS_SUBSCRIBER_QUEUE_SIZE,
+        block_ms: int = PROGRESS_STREAM_BLOCK_MS
+    ):
+        self.source = source or redis_progress_pubsub
+        self.queue_size = queue_size
+        self.block_ms = block_ms
+        self._subscriptions: Dict[int, Set[ProgressSubscription]] = {}
+        # job_id -> ID of the last stream entry read for it
+        self._cursors: Dict[int, str] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._connected = False
+        self._stats = {"received": 0, "dispatched": 0, "no_subscribers": 0, "invalid": 0, "reconnects": 0}
+        self._message_metrics = {
+            outcome: metrics.progress_hub_messages_total.labels(outcome=outcome)
+            for outcome in ("dispatched", "no_subscribers", "invalid")
+        }
+        self._subscriber_metrics = {
+            transport: metrics.progress_hub_subscribers.labels(transport=transport)
+            for transport in TRANSPORTS
+        }
+
+    async def subscribe(
+        self,
+        job_id: int,
+        transport: str,
+        accept: Optional[Callable[[ProgressMessageV2], bool]] = None
+    ) -> ProgressSubscription:
+        """
+        Start receiving a job's progress frames.
+
+        Every entry appended to the job's stream after this returns is
+        delivered, so a replay fetched afterwards (get_missed_events) overlaps
+        the live frames instead of leaving a gap. accept filters non-terminal
+        frames before they are queued. Close the subscription (or use it as an
+        async context manager) when done.
+        """
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown progress transport: {transport}")
+
+        subscription = ProgressSubscription(self, job_id, transport, self.queue_size, accept)
+        self._subscriptions.setdefault(job_id, set()).add(subscription)
+        self._subscriber_metrics[transport].inc()
+        self.start()
+        await self._watch(job_id)
+        return subscription
+
+    async def _watch(self, job_id: int) -> None:
+        """Start reading a newly watched job's stream from its newest entry."""
+        if job_id in self._cursors:
+            return
+        try:
+            cursor = await self.source.latest_progress_id(job_id)
+            if job_id in self._subscriptions:
+                # A concurrent subscriber may have set an earlier cursor first
+                if self._cursors.setdefault(job_id, cursor) == cursor:
+                    await self.source.wake_progress_reader()
+        except Exception as e:
+            # The listener resolves the cursor itself once Redis is back
+            logger.warning("progress_hub_watch_failed", job_id=job_id, error=str(e))
+
+    def _remove(self, subscription: ProgressSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.job_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.job_id]
+            self._cursors.pop(subscription.job_id, None)
+        self._subscriber_metrics[subscription.transport].dec()
+
+    def start(self) -> None:
+        """Start the Redis listener if it is not running."""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the listener and end every subscription."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                while True:
+                    for job_id in [job_id for job_id in self._subscriptions if job_id not in self._cursors]:
+                        cursor = await self.source.latest_progress_id(job_id)
+                        if job_id in self._subscriptions:
+                            self._cursors.setdefault(job_id, cursor)
+                    entries = await self.source.read_progress(dict(self._cursors), self.block_ms)
+                    self._connected = True
+                    backoff = 1.0
+                    for job_id, stream_id, data in entries:
+                        self.dispatch(job_id, stream_id, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("progress_hub_listener_disconnected", error=str(e), retry_in_seconds=backoff)
+            finally:
+                self._connected = False
+            self._stats["reconnects"] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def dispatch(self, job_id: int, stream_id: str, data: Any) -> int:
+        """Fan one stream entry out to the job's subscribers; returns how many got it."""
+        self._stats["received"] += 1
+        subscriptions = self._subscriptions.get(job_id)
+        if not subscriptions:
+            # Unsubscribed while the read was in flight
+            self._count("no_subscribers")
+            return 0
+        self._cursors[job_id] = stream_id
+
+        try:
+            progress = decode_progress_entry(stream_id, data)
+        except ValidationError as e:
+            self._count("invalid")
+            logger.warning("progress_hub_invalid_message", job_id=job_id, stream_id=stream_id, error=str(e))
+            return 0
+
+        frame = ProgressFrame(job_id, progress, asyncio.get_running_loop().time())
+        for subscription in list(subscriptions):
+            subscription._offer(frame)
+        self._count("dispatched")
+        return len(subscriptions)
+
+    def _count(self, outcome: str) -> None:
+        self._stats[outcome] += 1
+        self._message_metrics[outcome].inc()
+
+    def subscriber_count(self, job_id: Optional[int] = None) -> int:
+        if job_id is not None:
+            return len(self._subscriptions.get(job_id, ()))
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = asyncio.get_running_loop().time()
+        subscribers = {transport: 0 for transport in TRANSPORTS}
+        pending = 0
+        max_lag = 0.0
+        dropped = 0
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscribers[subscription.transport] += 1
+                pending += subscription.pending
+                dropped += subscription.dropped
+                max_lag = max(max_lag, subscription.lag(now))
+        return {
+            **self._stats,
+            "listening": self._connected,
+            "jobs": len(self._subscriptions),
+            "subscribers": subscribers,
+            "pending_frames": pending,
+            "dropped_frames": dropped,
+            "max_lag_seconds": round(max_lag, 6),
+        }
+
+
+# Global instance
+progress_hub = ProgressHub()
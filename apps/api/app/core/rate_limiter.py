@@ -2,8 +2,9 @@
 Ultra-Enterprise Rate Limiter for API Protection
 
 Implements rate limiting with:
-- Token bucket algorithm
-- Redis-backed storage for distributed systems
+- GCRA (generic cell rate algorithm) with one key per limit in Redis
+- Batched multi-limit checks in a single EVALSHA round-trip
+- Optional local token leases that skip Redis well under the limit
 - In-memory fallback for development
 - Per-user and per-IP limiting
 """
@@ -14,20 +15,39 @@ import os
 import time
 import threading
 from collections import defaultdict
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 import structlog
 import redis
 from redis.exceptions import RedisError
 
+from .gcra import GCRALimit, GCRARateLimiter
+
 logger = structlog.get_logger(__name__)
 
+# Limiters built from the same REDIS_URL share one client, so their checks
+# can be batched into one script call
+_shared_redis_clients: Dict[str, redis.Redis] = {}
+
+
+def _redis_from_env() -> redis.Redis:
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    client = _shared_redis_clients.get(redis_url)
+    if client is None:
+        client = redis.from_url(redis_url, decode_responses=True)
+        # Test connection
+        client.ping()
+        _shared_redis_clients[redis_url] = client
+    return client
+
 
 class RateLimiter:
     """
-    Rate limiter using sliding window log algorithm for Redis and fixed window for in-memory.
+    Rate limiter using GCRA for Redis and fixed window for in-memory.
     
     Supports both Redis (production) and in-memory (development) backends.
+    Redis keeps a single string key per limit holding its theoretical arrival
+    time, so memory does not grow with the request count inside the window.
     Note: In-memory implementation uses fixed window which may allow 2x requests at boundary.
     """
     
@@ -37,6 +57,7 @@ class RateLimiter:
         window_seconds: int = 60,
         redis_client: Optional[redis.Redis] = None,
         key_prefix: str = "rate_limit",
+        local_lease_fraction: float = 0.0,
     ):
         """
         Initialize rate limiter.
@@ -46,11 +67,16 @@ class RateLimiter:
             window_seconds: Time window in seconds
             redis_client: Optional Redis client for distributed limiting
             key_prefix: Prefix for Redis keys
+            local_lease_fraction: Share of ``max_requests`` a process may lease
+                from Redis and admit locally while well under the limit
+                (0 disables leasing; leases of fewer than 2 tokens are skipped)
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
         self.redis_client = redis_client
         self.key_prefix = key_prefix
+        lease = int(max_requests * local_lease_fraction)
+        self.local_lease = lease if lease >= 2 else 0
         
         # In-memory storage for fallback
         self._memory_storage: Dict[str, Tuple[int, float]] = defaultdict(
@@ -63,10 +89,7 @@ class RateLimiter:
         # Try to get Redis client from environment if not provided
         if not self.redis_client:
             try:
-                redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-                self.redis_client = redis.from_url(redis_url, decode_responses=True)
-                # Test connection
-                self.redis_client.ping()
+                self.redis_client = _redis_from_env()
                 logger.info(
                     "Rate limiter initialized with Redis",
                     max_requests=max_requests,
@@ -78,6 +101,10 @@ class RateLimiter:
                     error=str(e),
                 )
                 self.redis_client = None
+        
+        self._gcra: Optional[GCRARateLimiter] = (
+            GCRARateLimiter(self.redis_client, key_prefix="gcra") if self.redis_client else None
+        )
     
     def check_rate_limit(self, key: str) -> bool:
         """
@@ -123,54 +150,25 @@ class RateLimiter:
     
     # Redis-based implementation
     
+    def _limit(self, key: str) -> GCRALimit:
+        return GCRALimit(
+            key=f"{self.key_prefix}:{key}",
+            limit=self.max_requests,
+            period_seconds=self.window_seconds,
+            lease=self.local_lease,
+        )
+    
     def _check_redis(self, key: str) -> bool:
-        """Check rate limit using Redis with atomic operations."""
+        """Check rate limit with one EVALSHA of the GCRA script (or a local lease)."""
         try:
-            full_key = f"{self.key_prefix}:{key}"
-            current_time = time.time()
-            min_time = current_time - self.window_seconds
-            
-            # Use Lua script for atomic rate limiting
-            lua_script = """
-            local key = KEYS[1]
-            local min_time = tonumber(ARGV[1])
-            local current_time = tonumber(ARGV[2])
-            local max_requests = tonumber(ARGV[3])
-            local window_seconds = tonumber(ARGV[4])
-            
-            -- Remove old entries
-            redis.call('zremrangebyscore', key, 0, min_time)
-            
-            -- Count current requests
-            local current_count = redis.call('zcard', key)
+            decision = self._gcra.check([self._limit(key)])[0]
             
-            -- Check if under limit
-            if current_count < max_requests then
-                -- Add new request
-                redis.call('zadd', key, current_time, tostring(current_time))
-                redis.call('expire', key, window_seconds + 1)
-                return 1
-            else
-                return 0
-            end
-            """
-            
-            # Execute Lua script atomically
-            allowed = self.redis_client.eval(
-                lua_script,
-                1,  # Number of keys
-                full_key,
-                min_time,
-                current_time,
-                self.max_requests,
-                self.window_seconds
-            )
-            
-            if allowed:
+            if decision.allowed:
                 logger.debug(
                     "Rate limit check passed (Redis)",
                     key=key,
                     max=self.max_requests,
+                    local=decision.local,
                 )
                 return True
             else:
@@ -190,31 +188,15 @@ class RateLimiter:
             return self._check_memory(key)
     
     def _get_remaining_redis(self, key: str) -> Tuple[int, int]:
-        """Get remaining requests from Redis."""
+        """Get remaining requests from Redis without charging a request."""
         try:
-            full_key = f"{self.key_prefix}:{key}"
-            current_time = time.time()
-            min_time = current_time - self.window_seconds
+            decision = self._gcra.peek([self._limit(key)])[0]
             
-            # Remove old entries and count current
-            pipe = self.redis_client.pipeline()
-            pipe.zremrangebyscore(full_key, 0, min_time)
-            pipe.zcard(full_key)
-            pipe.zrange(full_key, 0, 0, withscores=True)
-            results = pipe.execute()
-            
-            current_count = results[1]
-            oldest_entry = results[2]
-            
-            remaining = max(0, self.max_requests - current_count)
-            
-            if oldest_entry:
-                oldest_time = oldest_entry[0][1]
-                reset_time = int(oldest_time + self.window_seconds - current_time)
-            else:
-                reset_time = 0
-            
-            return remaining, max(0, reset_time)
+            # Exhausted: seconds until the next request is admitted;
+            # otherwise seconds until the full quota is back
+            if decision.remaining == 0:
+                return 0, decision.retry_after
+            return decision.remaining, decision.reset_after
             
         except RedisError:
             return self._get_remaining_memory(key)
@@ -222,8 +204,7 @@ class RateLimiter:
     def _reset_redis(self, key: str) -> None:
         """Reset rate limit in Redis."""
         try:
-            full_key = f"{self.key_prefix}:{key}"
-            self.redis_client.delete(full_key)
+            self._gcra.reset([f"{self.key_prefix}:{key}"])
             logger.info("Rate limit reset (Redis)", key=key)
         except RedisError:
             self._reset_memory(key)
@@ -290,6 +271,47 @@ class RateLimiter:
                 logger.info("Rate limit reset (Memory)", key=key)
 
 
+def check_rate_limits(checks: Sequence[Tuple[RateLimiter, str]]) -> Optional[Tuple[RateLimiter, str]]:
+    """
+    Check several limiters for one request in a single Redis round-trip.
+    
+    The request is charged against every limiter only if all of them admit
+    it. Limiters without Redis, or on different Redis clients, are checked
+    one by one as before.
+    
+    Args:
+        checks: ``(limiter, key)`` pairs, e.g. per-user and global limits
+        
+    Returns:
+        The first ``(limiter, key)`` pair that rejected the request, or None
+    """
+    engine = checks[0][0]._gcra if checks else None
+    if engine is None or any(limiter.redis_client is not engine.redis_client for limiter, _ in checks):
+        for limiter, key in checks:
+            if not limiter.check_rate_limit(key):
+                return limiter, key
+        return None
+    
+    try:
+        decisions = engine.check([limiter._limit(key) for limiter, key in checks])
+    except RedisError as e:
+        logger.error("Redis error in batched rate limit check, falling back", error=str(e))
+        for limiter, key in checks:
+            if not limiter._check_memory(key):
+                return limiter, key
+        return None
+    
+    for (limiter, key), decision in zip(checks, decisions):
+        if not decision.allowed:
+            logger.warning(
+                "Rate limit exceeded (Redis)",
+                key=key,
+                max=limiter.max_requests,
+            )
+            return limiter, key
+    return None
+
+
 # Global rate limiters for common use cases
 api_rate_limiter = RateLimiter(
     max_requests=100,
@@ -312,6 +334,7 @@ download_rate_limiter = RateLimiter(
 
 __all__ = [
     "RateLimiter",
+    "check_rate_limits",
     "api_rate_limiter",
     "upload_rate_limiter",
     "download_rate_limiter",
@@ -3,25 +3,29 @@ Task 7.16: Redis Pub/Sub Integration for Real-time Progress
 
 This module provides Redis pub/sub functionality for:
 - Publishing progress updates from workers
-- Subscribing to job progress channels
+- Following job progress streams
 - Message serialization and deserialization
 - Connection pooling and error handling
 - Throttling and deduplication
+
+Progress is stored in one Redis Stream per job (``job:progress:stream:<id>``).
+Publishing, caching for SSE resumption and replay are the same XADD: the
+stream is trimmed to PROGRESS_CACHE_MAX_EVENTS and expires with the cache
+TTL, readers follow it with blocking XREAD and resume with XRANGE. Event IDs
+are derived from the stream entry IDs Redis assigns, so they are ordered
+the same way for every producer process.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import time
-from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, List, Optional, Set
-from uuid import UUID
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 import redis.asyncio as redis_async
 import redis
-from redis.asyncio.client import PubSub
 
 from ..core.environment import environment as settings
 from ..core.logging import get_logger
@@ -29,13 +33,47 @@ from ..schemas.progress import ProgressMessageV2
 
 logger = get_logger(__name__)
 
+# Stream entry IDs are "<ms>-<seq>"; event IDs pack them into one integer
+# (ms * EVENT_ID_SEQUENCE_RANGE + seq) that SSE Last-Event-ID and JavaScript
+# clients can carry. Throttling keeps a job far below 1000 entries per ms.
+EVENT_ID_SEQUENCE_RANGE = 1000
+
+
+def stream_id_to_event_id(stream_id: str) -> int:
+    """Event ID for a progress stream entry ID."""
+    ms, _, seq = stream_id.partition("-")
+    return int(ms) * EVENT_ID_SEQUENCE_RANGE + int(seq or 0)
+
+
+def event_id_to_stream_id(event_id: int) -> str:
+    """Progress stream entry ID for an event ID."""
+    ms, seq = divmod(event_id, EVENT_ID_SEQUENCE_RANGE)
+    return f"{ms}-{seq}"
+
+
+def decode_progress_entry(stream_id: str, data: Any) -> ProgressMessageV2:
+    """
+    Decode a progress stream entry, taking its event ID from the entry ID.
+
+    Raises:
+        ValidationError: If the entry is not a valid ProgressMessageV2
+    """
+    progress = ProgressMessageV2.model_validate_json(data)
+    return progress.model_copy(update={"event_id": stream_id_to_event_id(stream_id)})
+
 
 class RedisProgressPubSub:
     """Redis pub/sub manager for progress updates."""
     
-    # Channel patterns
-    PROGRESS_CHANNEL_PREFIX = "job:progress:"
-    PROGRESS_ALL_CHANNEL = "job:progress:*"
+    # Per-job progress streams (also the SSE resumption cache)
+    PROGRESS_STREAM_PREFIX = "job:progress:stream:"
+    PROGRESS_CACHE_TTL_SECONDS = 3600
+    PROGRESS_CACHE_MAX_EVENTS = 1000
+    
+    # Written to interrupt this process's blocking stream read
+    PROGRESS_WAKE_PREFIX = "job:progress:wake:"
+    PROGRESS_WAKE_TTL_SECONDS = 60
+    PROGRESS_READ_COUNT = 100
     
     # Throttling configuration
     THROTTLE_INTERVAL_MS = 500  # Max 1 update per 500ms per job
@@ -50,9 +88,9 @@ class RedisProgressPubSub:
         """
         self.redis_url = redis_url or settings.REDIS_URL
         self._redis_client: Optional[redis_async.Redis] = None
-        self._pubsub_clients: Dict[int, PubSub] = {}
         self._last_publish_times: Dict[int, float] = {}
-        self._event_counters: Dict[int, int] = {}
+        self._wake_key = f"{self.PROGRESS_WAKE_PREFIX}{uuid4().hex}"
+        self._wake_cursor = "0-0"
         
     async def connect(self) -> None:
         """Establish Redis connection."""
@@ -78,21 +116,34 @@ class RedisProgressPubSub:
     
     async def disconnect(self) -> None:
         """Close Redis connections."""
-        # Close all pubsub clients
-        for client in self._pubsub_clients.values():
-            await client.close()
-        self._pubsub_clients.clear()
-        
-        # Close main client
         if self._redis_client:
             await self._redis_client.close()
             self._redis_client = None
         
         logger.info("Redis pub/sub connections closed")
     
-    def _get_channel_name(self, job_id: int) -> str:
-        """Get channel name for a job."""
-        return f"{self.PROGRESS_CHANNEL_PREFIX}{job_id}"
+    @classmethod
+    def get_stream_key(cls, job_id: int) -> str:
+        """Get progress stream key for a job."""
+        return f"{cls.PROGRESS_STREAM_PREFIX}{job_id}"
+    
+    @classmethod
+    def queue_progress_append(cls, pipe: Any, job_id: int, messages: List[str]) -> None:
+        """
+        Queue XADDs of serialized progress messages on a pipeline.
+        
+        Works with both redis and redis.asyncio pipelines; the pipeline
+        result holds one stream entry ID per message, then the EXPIRE reply.
+        """
+        stream_key = cls.get_stream_key(job_id)
+        for message in messages:
+            pipe.xadd(
+                stream_key,
+                {"data": message},
+                maxlen=cls.PROGRESS_CACHE_MAX_EVENTS,
+                approximate=True
+            )
+        pipe.expire(stream_key, cls.PROGRESS_CACHE_TTL_SECONDS)
     
     def _should_throttle(self, job_id: int, is_milestone: bool) -> bool:
         """
@@ -117,11 +168,6 @@ class RedisProgressPubSub:
         self._last_publish_times[job_id] = now
         return False
     
-    def _get_next_event_id(self, job_id: int) -> int:
-        """Get next monotonic event ID for a job."""
-        self._event_counters[job_id] = self._event_counters.get(job_id, 0) + 1
-        return self._event_counters[job_id]
-    
     async def publish_progress(
         self,
         job_id: int,
@@ -129,7 +175,7 @@ class RedisProgressPubSub:
         force: bool = False
     ) -> bool:
         """
-        Publish progress update to Redis channel.
+        Publish progress update to the job's progress stream.
         
         Args:
             job_id: Job ID
@@ -137,7 +183,7 @@ class RedisProgressPubSub:
             force: Force publish even if throttled
             
         Returns:
-            True if published, False if throttled
+            True if published, False if throttled or failed
         """
         if not self._redis_client:
             await self.connect()
@@ -147,99 +193,149 @@ class RedisProgressPubSub:
             logger.debug(f"Progress update throttled for job {job_id}")
             return False
         
-        # Set event ID if not set
-        if progress.event_id is None:
-            progress.event_id = self._get_next_event_id(job_id)
+        return await self.append_progress(job_id, progress) is not None
+    
+    async def append_progress(
+        self,
+        job_id: int,
+        progress: ProgressMessageV2
+    ) -> Optional[int]:
+        """
+        Append a progress message to the job's stream without throttling.
+        
+        One round trip (XADD with MAXLEN trimming and EXPIRE, pipelined).
+        Sets progress.event_id from the entry ID Redis assigned.
+        
+        Args:
+            job_id: Job ID
+            progress: Progress message
+            
+        Returns:
+            The event ID, or None if the append failed
+        """
+        if not self._redis_client:
+            await self.connect()
         
         # Ensure job_id matches
         progress.job_id = job_id
         
         try:
-            # Serialize message
-            message = progress.model_dump_json()
-            
-            # Publish to channel
-            channel = self._get_channel_name(job_id)
-            subscribers = await self._redis_client.publish(channel, message)
+            pipe = self._redis_client.pipeline(transaction=False)
+            self.queue_progress_append(pipe, job_id, [progress.model_dump_json()])
+            stream_id, _ = await pipe.execute()
+            progress.event_id = stream_id_to_event_id(stream_id)
             
             logger.debug(
-                f"Published progress to {channel}: event_id={progress.event_id}, "
-                f"type={progress.event_type}, subscribers={subscribers}"
+                f"Appended progress to {self.get_stream_key(job_id)}: "
+                f"event_id={progress.event_id}, type={progress.event_type}"
             )
             
-            # Also publish to wildcard channel for monitoring
-            await self._redis_client.publish(self.PROGRESS_ALL_CHANNEL, message)
-            
-            return True
+            return progress.event_id
             
         except Exception as e:
             logger.error(f"Failed to publish progress for job {job_id}: {e}", exc_info=True)
-            return False
+            return None
     
-    @asynccontextmanager
-    async def subscribe_to_job(
+    async def latest_progress_id(self, job_id: int) -> str:
+        """
+        Entry ID of the newest event in a job's stream ("0-0" if empty).
+        
+        Reading the stream after this ID yields only events appended later.
+        """
+        if not self._redis_client:
+            await self.connect()
+        
+        entries = await self._redis_client.xrevrange(self.get_stream_key(job_id), count=1)
+        return entries[0][0] if entries else "0-0"
+    
+    async def read_progress(
         self,
-        job_id: int
-    ) -> AsyncGenerator[PubSub, None]:
+        cursors: Dict[int, str],
+        block_ms: int
+    ) -> List[Tuple[int, str, Any]]:
         """
-        Subscribe to job progress updates.
+        Blocking read of the events appended to several job streams.
+        
+        One XREAD over every job stream after its cursor plus this
+        instance's wake stream, so wake_progress_reader() can end the wait
+        early when the set of jobs changes.
         
         Args:
-            job_id: Job ID to subscribe to
+            cursors: Job ID -> entry ID to read after
+            block_ms: Longest time to wait for new events
             
-        Yields:
-            PubSub client for receiving messages
+        Returns:
+            (job_id, entry_id, data) tuples in stream order per job; empty
+            on timeout or wake-up
         """
         if not self._redis_client:
             await self.connect()
         
-        pubsub = self._redis_client.pubsub()
-        channel = self._get_channel_name(job_id)
+        streams = {self.get_stream_key(job_id): cursor for job_id, cursor in cursors.items()}
+        streams[self._wake_key] = self._wake_cursor
+        response = await self._redis_client.xread(streams, count=self.PROGRESS_READ_COUNT, block=block_ms)
         
-        try:
-            # Subscribe to channel
-            await pubsub.subscribe(channel)
-            logger.info(f"Subscribed to progress channel: {channel}")
-            
-            # Store client for cleanup
-            self._pubsub_clients[job_id] = pubsub
-            
-            yield pubsub
-            
-        finally:
-            # Unsubscribe and cleanup
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-            self._pubsub_clients.pop(job_id, None)
-            logger.info(f"Unsubscribed from progress channel: {channel}")
+        entries = []
+        for stream_key, stream_entries in response or ():
+            if stream_key == self._wake_key:
+                self._wake_cursor = stream_entries[-1][0]
+                continue
+            job_id = int(stream_key[len(self.PROGRESS_STREAM_PREFIX):])
+            entries.extend(
+                (job_id, stream_id, fields.get("data"))
+                for stream_id, fields in stream_entries
+            )
+        return entries
+    
+    async def wake_progress_reader(self) -> None:
+        """Return a read_progress() blocked in this process."""
+        if not self._redis_client:
+            await self.connect()
+        
+        pipe = self._redis_client.pipeline(transaction=False)
+        pipe.xadd(self._wake_key, {"wake": "1"}, maxlen=1, approximate=False)
+        pipe.expire(self._wake_key, self.PROGRESS_WAKE_TTL_SECONDS)
+        await pipe.execute()
+    
+    def _decode_entries(self, job_id: int, entries: List[Tuple[str, Dict[str, Any]]]) -> List[ProgressMessageV2]:
+        """Decode stream entries, skipping (and logging) invalid ones."""
+        events = []
+        for stream_id, fields in entries:
+            try:
+                events.append(decode_progress_entry(stream_id, fields.get("data")))
+            except ValueError as e:
+                logger.warning(f"Skipping invalid progress entry {stream_id} for job {job_id}: {e}")
+        return events
     
     async def get_missed_events(
         self,
         job_id: int,
         last_event_id: int
-    ) -> List[str]:
+    ) -> List[ProgressMessageV2]:
         """
-        Get missed events from cache for SSE resumption.
+        Get missed events from the job's stream for SSE resumption.
         
         Args:
             job_id: Job ID
             last_event_id: Last received event ID
             
         Returns:
-            List of missed event JSON strings
+            Events after last_event_id, oldest first
         """
-        # Get cached events from Redis sorted set
-        cache_key = f"job:progress:cache:{job_id}"
+        if not self._redis_client:
+            await self.connect()
+        
         events = []
         
         try:
-            # Get events with ID > last_event_id
-            events = await self._redis_client.zrangebyscore(
-                cache_key,
-                min=last_event_id + 1,
-                max="+inf",
-                withscores=False
+            # Entries after last_event_id (XRANGE bounds are inclusive)
+            entries = await self._redis_client.xrange(
+                self.get_stream_key(job_id),
+                min=event_id_to_stream_id(last_event_id + 1),
+                max="+",
+                count=self.PROGRESS_CACHE_MAX_EVENTS
             )
+            events = self._decode_entries(job_id, entries)
             
             logger.info(
                 f"Retrieved {len(events)} missed events for job {job_id} "
@@ -251,107 +347,51 @@ class RedisProgressPubSub:
         
         return events
     
-    
     async def cache_progress_event(
         self,
         job_id: int,
-        progress: ProgressMessageV2,
-        ttl_seconds: int = 3600
+        progress: ProgressMessageV2
     ) -> None:
         """
-        Cache progress event for SSE resumption.
+        Store a progress event for SSE resumption without throttling.
+        
+        The job's stream is both the live feed and the resumption cache, so
+        this is append_progress(); prefer publish_progress().
         
         Args:
             job_id: Job ID
             progress: Progress message
-            ttl_seconds: Cache TTL in seconds
         """
-        if not self._redis_client:
-            await self.connect()
-        
-        cache_key = f"job:progress:cache:{job_id}"
-        
-        try:
-            # Add to sorted set with event_id as score
-            await self._redis_client.zadd(
-                cache_key,
-                {progress.model_dump_json(): progress.event_id}
-            )
-            
-            # Set TTL on the cache
-            await self._redis_client.expire(cache_key, ttl_seconds)
-            
-            # Trim to keep only last 1000 events
-            await self._redis_client.zremrangebyrank(cache_key, 0, -1001)
-            
-        except Exception as e:
-            logger.warning(f"Failed to cache progress event: {e}", exc_info=True)
-    
-    async def get_active_subscriptions(self) -> Set[int]:
-        """Get set of job IDs with active subscriptions."""
-        return set(self._pubsub_clients.keys())
+        await self.append_progress(job_id, progress)
     
     async def get_recent_events_from_cache(
         self,
         job_id: int,
         count: int = 10
-    ) -> List[str]:
+    ) -> List[ProgressMessageV2]:
         """
-        Get recent events from cache.
+        Get recent events from the job's stream.
         
         Args:
             job_id: Job ID
             count: Number of recent events to retrieve
             
         Returns:
-            List of recent event JSON strings in reverse order (newest first)
+            Recent events in reverse order (newest first)
         """
         if not self._redis_client:
             await self.connect()
         
-        cache_key = f"job:progress:cache:{job_id}"
         events = []
         
         try:
-            # Get most recent events (reverse order)
-            events = await self._redis_client.zrevrange(
-                cache_key,
-                0,
-                count - 1,
-                withscores=False
-            )
+            entries = await self._redis_client.xrevrange(self.get_stream_key(job_id), count=count)
+            events = self._decode_entries(job_id, entries)
         except Exception as e:
             logger.warning(f"Failed to get recent events from cache: {e}", exc_info=True)
         
         return events
     
-    async def broadcast_system_message(self, message: Dict[str, Any]) -> int:
-        """
-        Broadcast system message to all job channels.
-        
-        Args:
-            message: System message to broadcast
-            
-        Returns:
-            Number of channels reached
-        """
-        if not self._redis_client:
-            await self.connect()
-        
-        channels_reached = 0
-        
-        for job_id in self._pubsub_clients.keys():
-            channel = self._get_channel_name(job_id)
-            try:
-                await self._redis_client.publish(
-                    channel,
-                    json.dumps({"system": True, **message})
-                )
-                channels_reached += 1
-            except Exception as e:
-                logger.warning(f"Failed to broadcast to {channel}: {e}", exc_info=True)
-        
-        return channels_reached
 
 
 # Global instance
@@ -5,9 +5,27 @@ Implements banking-level security controls and CSP nonce generation.
 
 from __future__ import annotations
 
+import re
 import secrets
 import string
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .threat_scanner import ThreatCategory, ThreatMatch, ThreatScanner
+
+# Literal XSS markers checked on every request by XSSDetectionMiddleware
+REQUEST_XSS_PATTERNS = (
+    "<script", "</script>", "javascript:", "onload=", "onerror=",
+    "onclick=", "onmouseover=", "alert(", "confirm(", "prompt(",
+    "eval(", "setTimeout(", "setInterval("
+)
+
+request_threat_scanner = ThreatScanner([
+    ThreatCategory(
+        name="XSS",
+        patterns=tuple(re.escape(pattern) for pattern in REQUEST_XSS_PATTERNS),
+        triggers=REQUEST_XSS_PATTERNS,
+    ),
+])
 
 
 class SecurityManager:
@@ -129,22 +147,32 @@ class SecurityManager:
         Returns:
             True if request appears suspicious
         """
-        # Common XSS patterns
-        xss_patterns = [
-            "<script", "</script>", "javascript:", "onload=", "onerror=",
-            "onclick=", "onmouseover=", "alert(", "confirm(", "prompt(",
-            "eval(", "setTimeout(", "setInterval("
-        ]
-        
-        # Check for XSS patterns in common fields
-        for field_name, field_value in request_data.items():
-            if isinstance(field_value, str):
-                value_lower = field_value.lower()
-                for pattern in xss_patterns:
-                    if pattern in value_lower:
-                        return True
+        return SecurityManager.scan_request_fields(request_data.items()) is not None
+    
+    @staticmethod
+    def scan_request_fields(fields: Iterable[Tuple[str, Any]]) -> Optional[ThreatMatch]:
+        """Scan request fields for XSS markers, stopping at the first hit.
+        
+        Args:
+            fields: ``(field_name, value)`` pairs; non-string values are skipped
+            
+        Returns:
+            The first threat found, or None if every field is clean
+        """
+        return request_threat_scanner.scan_fields(fields)
+    
+    @staticmethod
+    def scan_request_json(body_text: str, max_chars: Optional[int] = None) -> Optional[ThreatMatch]:
+        """Scan the strings of a JSON request body for XSS markers.
         
-        return False
+        Args:
+            body_text: Raw JSON body; non-JSON text is scanned as a whole
+            max_chars: Optional cap on the scanned length of each string
+            
+        Returns:
+            The first threat found, or None if the body is clean
+        """
+        return request_threat_scanner.scan_json(body_text, max_chars=max_chars)
     
     @staticmethod
     def sanitize_html_input(input_text: str) -> str:
@@ -0,0 +1,127 @@
+"""
+Import-time profile of the API and worker entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+and reports the wall time, the slowest modules and the cumulative time per
+top-level package, so cold-start regressions can be traced to the import
+that caused them:
+
+    python -m app.core.startup_profile app.main app.core.celery_app --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# apps/api, the directory the app package is imported from
+API_ROOT = Path(__file__).resolve().parents[2]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    wall_seconds: float
+    records: List[ImportRecord] = field(default_factory=list)
+
+    @property
+    def modules(self) -> List[str]:
+        return [record.module for record in self.records]
+
+    def imported(self, module: str) -> bool:
+        """Whether module, or any of its submodules, was imported."""
+        return any(name == module or name.startswith(module + ".") for name in self.modules)
+
+    def slowest(self, top: int = 20) -> List[ImportRecord]:
+        return sorted(self.records, key=lambda r: r.self_us, reverse=True)[:top]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time in microseconds per top-level package."""
+        totals: Dict[str, int] = {}
+        for record in self.records:
+            package = record.module.split(".", 1)[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the stderr of ``python -X importtime``."""
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def profile_imports(
+    target: str,
+    python: str = sys.executable,
+    env: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+) -> ImportProfile:
+    """
+    Import target in a fresh interpreter and profile it.
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    run_env = dict(os.environ)
+    run_env.update(env or {})
+    run_env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(API_ROOT), run_env.get("PYTHONPATH")]))
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        cwd=API_ROOT, env=run_env, capture_output=True, text=True, timeout=timeout,
+    )
+    wall_seconds = time.perf_counter() - started
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"import {target} failed: " + "\n".join(errors[-10:]))
+    return ImportProfile(target, wall_seconds, parse_importtime(result.stderr))
+
+
+def format_profile(profile: ImportProfile, top: int = 20) -> str:
+    lines = [f"{profile.target}: {profile.wall_seconds:.2f}s wall, {len(profile.records)} modules"]
+    lines.append("  slowest modules (self time):")
+    for record in profile.slowest(top):
+        lines.append(f"    {record.self_us / 1000:9.1f} ms  {record.module}")
+    lines.append("  by package:")
+    for package, total_us in list(profile.by_package().items())[:top]:
+        lines.append(f"    {total_us / 1000:9.1f} ms  {package}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile cold-start imports")
+    parser.add_argument("targets", nargs="*", default=["app.main", "app.core.celery_app"])
+    parser.add_argument("--top", type=int, default=20, help="Rows per section")
+    args = parser.parse_args(argv)
+
+    for target in args.targets:
+        print(format_profile(profile_imports(target), args.top))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
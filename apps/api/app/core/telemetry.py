@@ -121,7 +121,8 @@ def create_span(
     operation_type: str = "operation",
     job_id: Optional[str] = None,
     idempotency_key: Optional[str] = None,
-    attributes: Optional[Dict[str, Any]] = None
+    attributes: Optional[Dict[str, Any]] = None,
+    correlation_id: Optional[str] = None
 ):
     """
     Create a span with job orchestration context.
@@ -132,10 +133,11 @@ def create_span(
         job_id: Job ID for linking spans
         idempotency_key: Idempotency key if applicable
         attributes: Additional span attributes
+        correlation_id: Request correlation ID if applicable
     """
     if not _tracer:
-        # Return no-op context manager if tracer not initialized
-        yield None
+        # No-op span if tracer not initialized, so callers can still set attributes
+        yield trace.INVALID_SPAN
         return
     
     with _tracer.start_as_current_span(name) as span:
@@ -157,6 +159,9 @@ def create_span(
                 span.set_attribute("job.idempotency_key", idempotency_key)
                 bind_request_context(idempotency_key=idempotency_key)
             
+            if correlation_id:
+                span.set_attribute("correlation.id", correlation_id)
+            
             # Set custom attributes
             if attributes:
                 span.set_attributes(attributes)
@@ -0,0 +1,201 @@
+"""
+Single-pass threat scanner for request and input validation (Task 3.10).
+
+All patterns of a rule set are compiled into one alternation with a named
+group per pattern, behind a literal prefilter: substring checks for the
+trigger literals every pattern needs. Benign strings, which almost never contain a
+trigger, exit after one cheap scan; strings with a trigger take one pass of
+the combined expression. Only hostile input is examined pattern by pattern.
+
+JSON bodies are walked string token by string token straight from the raw
+text, without building the decoded object or a flattened field dict.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class ThreatCategory:
+    """A named group of threat patterns and the literals that gate them.
+
+    Every pattern must contain at least one of ``triggers`` whenever it
+    matches; text without any trigger, or shorter than ``min_length``, is
+    never checked against the patterns.
+    """
+    name: str
+    patterns: tuple[str, ...]
+    triggers: tuple[str, ...]
+    dotall: bool = False
+    min_length: int = 0
+
+
+@dataclass(frozen=True)
+class ThreatMatch:
+    """First threat found in a scanned value."""
+    category: str
+    pattern: str
+    offset: int
+    matched: str
+    field: Optional[str] = None
+
+
+def _has_trigger(lowered: str, triggers: tuple[str, ...]) -> bool:
+    # Substring checks run in C and beat a regex alternation of literals
+    for trigger in triggers:
+        if trigger in lowered:
+            return True
+    return False
+
+
+class ThreatScanner:
+    """Scan text against several threat categories in one combined pass."""
+
+    def __init__(self, categories: Iterable[ThreatCategory]):
+        self.categories = tuple(categories)
+        self._by_name = {category.name: category for category in self.categories}
+        self._min_length = min((category.min_length for category in self.categories), default=0)
+        self._category_triggers = {
+            category.name: tuple({trigger.lower() for trigger in category.triggers})
+            for category in self.categories
+        }
+        self._triggers = tuple({trigger for triggers in self._category_triggers.values() for trigger in triggers})
+
+        alternatives = []
+        self._groups: dict[str, tuple[ThreatCategory, str]] = {}
+        self._category_patterns: dict[str, re.Pattern] = {}
+        for category_index, category in enumerate(self.categories):
+            bodies = [f"(?s:{pattern})" if category.dotall else pattern for pattern in category.patterns]
+            self._category_patterns[category.name] = re.compile("|".join(bodies), re.IGNORECASE)
+            for pattern_index, (pattern, body) in enumerate(zip(category.patterns, bodies)):
+                group = f"c{category_index}p{pattern_index}"
+                self._groups[group] = (category, pattern)
+                alternatives.append(f"(?P<{group}>{body})")
+        self._combined = re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def _gate_open(self, category: ThreatCategory, text: str, lowered: str) -> bool:
+        return len(text) >= category.min_length and _has_trigger(lowered, self._category_triggers[category.name])
+
+    def _prefilter(self, text: str) -> Optional[str]:
+        """Lowered ``text`` if it could match at all, else None."""
+        if len(text) < self._min_length:
+            return None
+        lowered = text.lower()
+        return lowered if _has_trigger(lowered, self._triggers) else None
+
+    def first_match(self, text: str, field: Optional[str] = None) -> Optional[ThreatMatch]:
+        """Return the leftmost threat in ``text``, or None if it is clean."""
+        lowered = self._prefilter(text)
+        if lowered is None:
+            return None
+
+        gates: dict[str, bool] = {}
+        for match in self._combined.finditer(text):
+            category, pattern = self._groups[match.lastgroup]
+            if category.name not in gates:
+                gates[category.name] = self._gate_open(category, text, lowered)
+            if gates[category.name]:
+                return ThreatMatch(category.name, pattern, match.start(), match.group(), field)
+        return None
+
+    def matched_categories(self, text: str) -> set[str]:
+        """Names of every category with at least one match in ``text``."""
+        lowered = self._prefilter(text)
+        if lowered is None:
+            return set()
+
+        found: set[str] = set()
+        hit = False
+        for match in self._combined.finditer(text):
+            hit = True
+            category, _ = self._groups[match.lastgroup]
+            if category.name not in found and self._gate_open(category, text, lowered):
+                found.add(category.name)
+        if not hit:
+            return found
+
+        # The combined scan reports one alternative per position, so a match
+        # can hide an overlapping one from another category. Hostile input is
+        # rare; re-check the remaining categories one by one.
+        for category in self.categories:
+            if (category.name not in found and self._gate_open(category, text, lowered)
+                    and self._category_patterns[category.name].search(text) is not None):
+                found.add(category.name)
+        return found
+
+    def matches_category(self, text: str, name: str) -> bool:
+        """Whether ``text`` matches any pattern of one category."""
+        category = self._by_name[name]
+        return (
+            self._gate_open(category, text, text.lower())
+            and self._category_patterns[name].search(text) is not None
+        )
+
+    def scan_fields(self, fields: Iterable[tuple[str, Any]]) -> Optional[ThreatMatch]:
+        """Scan ``(field, value)`` pairs and stop at the first threat."""
+        for field, value in fields:
+            if isinstance(value, str):
+                match = self.first_match(value, field)
+                if match is not None:
+                    return match
+        return None
+
+    def scan_json(
+        self,
+        text: str,
+        prefix: str = "body_",
+        max_chars: Optional[int] = None
+    ) -> Optional[ThreatMatch]:
+        """Scan every string of a JSON document and stop at the first threat.
+
+        A trigger inside any string token also appears in the raw text unless
+        it is escaped, so a body with neither a trigger nor a backslash is
+        clean after one prefilter pass and is never tokenised.
+        """
+        if "\\" not in text and self._prefilter(text) is None:
+            return None
+        return self.scan_fields(iter_json_fields(text, prefix, max_chars))
+
+
+# A JSON string token: quote, then runs of plain characters and escapes
+_JSON_STRING = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+_JSON_KEY_FOLLOWS = re.compile(r"\s*:")
+
+
+def iter_json_fields(
+    text: str,
+    prefix: str = "body_",
+    max_chars: Optional[int] = None
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(field, value)`` for every string in a JSON document.
+
+    Object keys are yielded as ``<prefix>key`` fields and string values under
+    the name of their nearest key. Numbers, booleans and nulls cannot carry
+    an injection and are skipped. Escapes are decoded only for tokens that
+    contain a backslash, so ``\\u003cscript`` is seen as ``<script``. Text
+    that is not a JSON container is yielded whole as ``<prefix>content``.
+    """
+    stripped = text.lstrip()
+    if not stripped or stripped[0] not in '{["':
+        yield f"{prefix}content", text[:max_chars]
+        return
+
+    field = f"{prefix}content"
+    for match in _JSON_STRING.finditer(text):
+        value = match.group(1)
+        if "\\" in value:
+            try:
+                value = json.loads(match.group(0))
+            except ValueError:
+                pass
+        if max_chars is not None:
+            value = value[:max_chars]
+        if _JSON_KEY_FOLLOWS.match(text, match.end()):
+            field = f"{prefix}{value}"
+            yield f"{prefix}key", value
+        else:
+            yield field, value
@@ -11,13 +11,217 @@ This module provides helper functions for:
 
 import hashlib
 import json
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ..core.environment import environment as settings
 from ..models import AuditLog
-from ..models.validators import AuditChainValidator
+from ..services.audit_chain_writer import PendingAuditEntry, append_to_chain
+
+
+# (rows, expected prev hash of the first row, position of the first row)
+ChainChunk = Tuple[List[tuple], Optional[str], int]
+
+
+# Shared verification pool, created on first parallel verification and shut
+# down at application shutdown. Spawned, not forked: the API process runs the
+# AuditChainWriter thread, and forking a threaded process can deadlock.
+_verify_executor: Optional[ProcessPoolExecutor] = None
+_verify_executor_workers = 0
+_verify_executor_lock = threading.Lock()
+
+
+def get_verify_executor(workers: int) -> ProcessPoolExecutor:
+    """Shared spawn-based process pool for chain verification with ``workers`` processes."""
+    global _verify_executor, _verify_executor_workers
+    with _verify_executor_lock:
+        if _verify_executor is not None and _verify_executor_workers != workers:
+            _verify_executor.shutdown(wait=True)
+            _verify_executor = None
+        if _verify_executor is None:
+            _verify_executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+            _verify_executor_workers = workers
+        return _verify_executor
+
+
+def shutdown_verify_executor() -> None:
+    """Shut down the shared verification pool during application shutdown."""
+    global _verify_executor
+    with _verify_executor_lock:
+        if _verify_executor is not None:
+            _verify_executor.shutdown(wait=True)
+            _verify_executor = None
+
+
+def verify_in_chunks(
+    chunks: Iterable[ChainChunk],
+    verify_chunk: Callable[[List[tuple], Optional[str], int], Dict[str, Any]],
+    workers: int = 1,
+    min_parallel_entries: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run ``verify_chunk`` over consecutive chain chunks and yield results in order.
+    
+    Every row stores its own prev hash, so chunks verify independently: the
+    expected prev hash at a chunk boundary is simply the stored hash of the
+    previous chunk's last row. Ranges of at least ``min_parallel_entries``
+    rows (and more than one chunk) are hashed in the shared process pool
+    (canonical JSON holds the GIL) while the next chunks are being read;
+    smaller ranges are verified in-process, where spawning workers would
+    cost more than it saves.
+    
+    Args:
+        chunks: Chunks in chain order
+        verify_chunk: Picklable module-level function (or partial)
+        workers: Number of processes
+        min_parallel_entries: Rows needed before the pool is used
+            (defaults to AUDIT_CHAIN_VERIFY_PARALLEL_MIN_ENTRIES)
+        
+    Yields:
+        Per-chunk results in chain order
+    """
+    if min_parallel_entries is None:
+        min_parallel_entries = settings.AUDIT_CHAIN_VERIFY_PARALLEL_MIN_ENTRIES
+    chunk_iter = iter(chunks)
+    
+    # Read ahead until the range is known to be large enough for the pool
+    head: List[ChainChunk] = []
+    rows = 0
+    if workers > 1:
+        for chunk in chunk_iter:
+            head.append(chunk)
+            rows += len(chunk[0])
+            if rows >= min_parallel_entries and len(head) > 1:
+                break
+    
+    if workers <= 1 or rows < min_parallel_entries or len(head) < 2:
+        for chunk in head:
+            yield verify_chunk(*chunk)
+        for chunk in chunk_iter:
+            yield verify_chunk(*chunk)
+        return
+    
+    executor = get_verify_executor(workers)
+    pending = deque(executor.submit(verify_chunk, *chunk) for chunk in head)
+    for chunk in chunk_iter:
+        # Bound the rows held in memory
+        while len(pending) >= workers * 2:
+            yield pending.popleft().result()
+        pending.append(executor.submit(verify_chunk, *chunk))
+    while pending:
+        yield pending.popleft().result()
+
+
+def verify_audit_chain_chunk(
+    rows: List[tuple],
+    expected_prev: Optional[str],
+    position: int,
+    checkpoint_interval: int = 0
+) -> Dict[str, Any]:
+    """
+    Verify (id, prev_chain_hash, chain_hash, payload) rows of the global chain.
+    
+    Returns:
+        Chunk result with violations, breaks and checkpoint hashes
+    """
+    integrity_violations = []
+    chain_breaks = []
+    checkpoints = []
+    verified_count = 0
+    
+    for i, (entry_id, prev_hash, chain_hash, payload) in enumerate(rows):
+        if expected_prev is not None and prev_hash != expected_prev:
+            chain_breaks.append({
+                "entry_id": entry_id,
+                "expected_prev_hash": expected_prev,
+                "actual_prev_hash": prev_hash,
+                "position": position + i
+            })
+        
+        expected_hash = AuditLog.compute_chain_hash(prev_hash or "", payload)
+        if chain_hash != expected_hash:
+            integrity_violations.append({
+                "entry_id": entry_id,
+                "expected_hash": expected_hash,
+                "actual_hash": chain_hash,
+                "position": position + i
+            })
+        else:
+            verified_count += 1
+        
+        if checkpoint_interval and (position + i + 1) % checkpoint_interval == 0:
+            checkpoints.append({"entry_id": entry_id, "chain_hash": chain_hash, "position": position + i})
+        expected_prev = chain_hash
+    
+    return {
+        "verified_count": verified_count,
+        "total_checked": len(rows),
+        "integrity_violations": integrity_violations,
+        "chain_breaks": chain_breaks,
+        "checkpoints": checkpoints,
+        "first_id": rows[0][0],
+        "last_id": rows[-1][0],
+        "last_hash": rows[-1][2]
+    }
+
+
+def merge_chunk_results(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine per-chunk results into one report.
+    
+    Checkpoints are only kept up to the first problem, so every reported
+    checkpoint marks a prefix of the chain that verified cleanly; the last
+    one can seed the next incremental verification.
+    """
+    report = {
+        "verified_count": 0,
+        "total_checked": 0,
+        "integrity_violations": [],
+        "chain_breaks": [],
+        "checkpoints": [],
+        "chunks": 0,
+        "start_id": None,
+        "end_id": None,
+        "last_hash": None
+    }
+    clean = True
+    for result in results:
+        report["chunks"] += 1
+        report["verified_count"] += result["verified_count"]
+        report["total_checked"] += result["total_checked"]
+        report["integrity_violations"].extend(result["integrity_violations"])
+        report["chain_breaks"].extend(result["chain_breaks"])
+        if report["start_id"] is None:
+            report["start_id"] = result["first_id"]
+        report["end_id"] = result["last_id"]
+        report["last_hash"] = result["last_hash"]
+        
+        problems = [p["position"] for p in result["integrity_violations"] + result["chain_breaks"]]
+        if clean:
+            first_problem = min(problems) if problems else None
+            report["checkpoints"].extend(
+                c for c in result["checkpoints"]
+                if first_problem is None or c["position"] < first_problem
+            )
+            clean = first_problem is None
+    
+    if clean and report["end_id"] is not None:
+        last = report["checkpoints"][-1] if report["checkpoints"] else None
+        if last is None or last["entry_id"] != report["end_id"]:
+            report["checkpoints"].append({
+                "entry_id": report["end_id"],
+                "chain_hash": report["last_hash"],
+                "position": report["total_checked"] - 1
+            })
+    return report
 
 
 class AuditChainHelper:
@@ -57,10 +261,6 @@ class AuditChainHelper:
         Raises:
             ValueError: If audit entry creation fails validation
         """
-        # Get previous hash for chain integrity
-        prev_entry = db.query(AuditLog).order_by(AuditLog.id.desc()).first()
-        prev_hash = prev_entry.chain_hash if prev_entry else None
-        
         # Build canonical payload
         payload = {
             "action": action,
@@ -81,111 +281,135 @@ class AuditChainHelper:
         if metadata:
             payload["metadata"] = metadata
         
-        # Generate cryptographic hash for chain
-        chain_hash = AuditChainValidator.generate_chain_hash(payload, prev_hash)
-        
-        # Create audit log entry
-        audit_log = AuditLog(
+        # Chain position and hash are assigned by the shared appender
+        entry = PendingAuditEntry(
             event_type=action,
             scope_type=scope_type or "system",
-            scope_id=scope_id or "global", 
+            scope_id=scope_id or "global",
             actor_user_id=user_id,
-            payload=payload,
-            chain_hash=chain_hash,
-            prev_chain_hash=prev_hash,
-            created_at=datetime.now(timezone.utc)
+            payload=payload
         )
-        
-        # Add to session (validation will happen automatically)
-        db.add(audit_log)
-        
-        return audit_log
+        return append_to_chain(db, [entry])[0]
     
     @staticmethod
     def verify_chain_integrity(
         db: Session, 
         start_id: Optional[int] = None,
         end_id: Optional[int] = None,
-        limit: int = 1000
+        limit: Optional[int] = 1000,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        checkpoint: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Verify audit chain integrity for a range of entries.
         
+        Entries are read in keyset-paginated chunks and hashed in parallel;
+        only the chunk columns needed for hashing are loaded.
+        
         Args:
             db: Database session
             start_id: Starting audit log ID (optional)
             end_id: Ending audit log ID (optional)
-            limit: Maximum number of entries to verify
+            limit: Maximum number of entries to verify (None for no limit)
+            chunk_size: Entries per verification chunk
+            workers: Verification processes (1 verifies inline)
+            checkpoint: ``{"entry_id", "chain_hash"}`` from an earlier clean
+                report; verification resumes after it instead of at start_id
             
         Returns:
-            Verification report with integrity status and details
+            Verification report with integrity status, details and
+            checkpoint hashes for incremental re-verification
         """
-        query = db.query(AuditLog).order_by(AuditLog.id)
-        
-        if start_id:
-            query = query.filter(AuditLog.id >= start_id)
-        if end_id:
-            query = query.filter(AuditLog.id <= end_id)
+        chunk_size = chunk_size or settings.AUDIT_CHAIN_VERIFY_CHUNK_SIZE
+        workers = workers or settings.AUDIT_CHAIN_VERIFY_WORKERS
         
-        entries = query.limit(limit).all()
+        if checkpoint:
+            after_id = checkpoint["entry_id"]
+            expected_prev = checkpoint["chain_hash"]
+        else:
+            after_id = start_id - 1 if start_id else 0
+            expected_prev = None
+            if after_id > 0:
+                expected_prev = db.execute(
+                    select(AuditLog.chain_hash)
+                    .where(AuditLog.id <= after_id)
+                    .order_by(AuditLog.id.desc())
+                    .limit(1)
+                ).scalar()
+            expected_prev = expected_prev or AuditLog.get_genesis_hash()
+        
+        chunks = AuditChainHelper._iter_chain_chunks(db, after_id, end_id, limit, chunk_size, expected_prev)
+        verify_chunk = partial(
+            verify_audit_chain_chunk,
+            checkpoint_interval=settings.AUDIT_CHAIN_CHECKPOINT_INTERVAL
+        )
+        report = merge_chunk_results(verify_in_chunks(chunks, verify_chunk, workers))
         
-        if not entries:
+        if not report["total_checked"]:
             return {
                 "status": "no_entries",
                 "verified_count": 0,
+                "total_checked": 0,
                 "integrity_violations": [],
-                "chain_breaks": []
+                "chain_breaks": [],
+                "checkpoints": []
             }
         
-        integrity_violations = []
-        chain_breaks = []
-        verified_count = 0
-        
-        for i, entry in enumerate(entries):
-            # Get expected previous hash
-            expected_prev_hash = entries[i-1].chain_hash if i > 0 else None
-            
-            # Check chain linkage
-            if entry.prev_chain_hash != expected_prev_hash:
-                chain_breaks.append({
-                    "entry_id": entry.id,
-                    "expected_prev_hash": expected_prev_hash,
-                    "actual_prev_hash": entry.prev_chain_hash,
-                    "position": i
-                })
-            
-            # Verify hash integrity
-            expected_hash = AuditChainValidator.generate_chain_hash(
-                entry.payload, 
-                entry.prev_chain_hash
-            )
-            
-            if entry.chain_hash != expected_hash:
-                integrity_violations.append({
-                    "entry_id": entry.id,
-                    "expected_hash": expected_hash,
-                    "actual_hash": entry.chain_hash,
-                    "position": i
-                })
-            else:
-                verified_count += 1
-        
         # Determine overall status
-        if integrity_violations or chain_breaks:
+        if report["integrity_violations"] or report["chain_breaks"]:
             status = "violations_detected"
         else:
             status = "integrity_verified"
         
         return {
             "status": status,
-            "verified_count": verified_count,
-            "total_checked": len(entries),
-            "integrity_violations": integrity_violations,
-            "chain_breaks": chain_breaks,
-            "start_id": entries[0].id if entries else None,
-            "end_id": entries[-1].id if entries else None
+            "verified_count": report["verified_count"],
+            "total_checked": report["total_checked"],
+            "integrity_violations": report["integrity_violations"],
+            "chain_breaks": report["chain_breaks"],
+            "start_id": report["start_id"],
+            "end_id": report["end_id"],
+            "checkpoints": report["checkpoints"],
+            "chunks": report["chunks"]
         }
     
+    @staticmethod
+    def _iter_chain_chunks(
+        db: Session,
+        after_id: int,
+        end_id: Optional[int],
+        limit: Optional[int],
+        chunk_size: int,
+        expected_prev: str
+    ) -> Iterator[ChainChunk]:
+        """Read (id, prev_chain_hash, chain_hash, payload) rows in id order, chunk by chunk."""
+        position = 0
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            query = (
+                select(AuditLog.id, AuditLog.prev_chain_hash, AuditLog.chain_hash, AuditLog.payload)
+                .where(AuditLog.id > after_id)
+                .order_by(AuditLog.id)
+                .limit(size)
+            )
+            if end_id:
+                query = query.where(AuditLog.id <= end_id)
+            rows = [tuple(row) for row in db.execute(query).all()]
+            if not rows:
+                return
+            
+            yield rows, expected_prev, position
+            
+            after_id = rows[-1][0]
+            expected_prev = rows[-1][2]
+            position += len(rows)
+            if remaining is not None:
+                remaining -= len(rows)
+            if len(rows) < size:
+                return
+    
     @staticmethod
     def audit_user_action(
         db: Session,
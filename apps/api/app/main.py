@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -10,46 +12,27 @@ logger = get_logger(__name__)
 from .instrumentation import setup_metrics, setup_tracing, setup_celery_instrumentation
 from .sentry_setup import setup_sentry
 from .logging_setup import setup_logging
-from .middleware import SecurityHeadersMiddleware, CORSMiddlewareStrict
-from .middleware.headers import XSSDetectionMiddleware
-from .middleware.limiter import RateLimitMiddleware
-from .middleware.csrf_middleware import CSRFProtectionMiddleware
-from .middleware.dev_mode_middleware import (
-    DevModeMiddleware, 
-    ProductionHardeningMiddleware, 
-    EnvironmentValidationMiddleware
-)
-from .middleware.license_middleware import LicenseGuardMiddleware
+from .middleware.security_pipeline import SecurityPipelineMiddleware
+from .services.license_entitlement_cache import license_entitlement_cache
+from .services.audit_chain_writer import audit_chain_writer
 from .services.rate_limiting_service import rate_limiting_service
 from .services.environment_service import environment_service
 from .core.environment import environment
+from .core.lazy_routers import include_lazy_router, install_lazy_openapi, warm_lazy_routers
 from .routers import auth as auth_router
 from .routers import auth_jwt as auth_jwt_router
 from .routers import auth_enterprise as auth_enterprise_router
 from .routers import oidc_auth as oidc_auth_router
 from .routers import magic_link_auth as magic_link_auth_router
-from .routers import mfa as mfa_router  # Task 3.7: MFA TOTP router
 from .routers import health as health_router
-from .routers import freecad as freecad_router
-from .routers import assemblies as assemblies_router
-from .routers import cam as cam_router
 # from .routers.cad import cam2 as cam2_router  # Temporarily disabled
-from .routers import jobs as jobs_router
-from .routers import admin_dlq as admin_dlq_router
 from .routers import admin_unmask as admin_unmask_router
-from .routers import designs as designs_router  # Re-enabled with RBAC protection
 from .routers import designs_v1 as designs_v1_router  # Task 7.1: Design API v1 with discriminated unions
 from .routers import admin_users as admin_users_router  # New admin router
 from .routers import me as me_router  # New user profile router
 from .routers import security as security_router  # Security endpoints (Task 3.10)
 from .routers import environment as environment_router  # Environment endpoints (Task 3.12)
 from .routers import license as license_router  # License management endpoints (Task 3.14)
-from .routers import invoices as invoices_router  # Invoice PDF endpoints (Task 4.5)
-from .routers import payments as payments_router  # Payment provider abstraction endpoints (Task 4.6)
-from .routers import files as files_router  # File upload/download endpoints (Task 5.3)
-from .routers import artefacts as artefacts_router  # Artefact persistence endpoints (Task 5.7)
-from .routers import upload_normalization as upload_normalization_router  # Upload normalization endpoints (Task 7.7)
-from .routers import batch_processing as batch_processing_router  # Task 7.23: Batch processing and automation
 # Task 7.16: Real-time progress updates
 from .api.v1 import websocket as websocket_router
 from .api.v1 import sse as sse_router
@@ -61,12 +44,6 @@ from .api.v1 import sse as sse_router
 # from .routers import reports as reports_router
 # from .routers import setups as setups_router
 # from .routers import fixtures as fixtures_router
-try:
-    from .routers import sim as sim_router  # type: ignore
-    _sim_available = True
-except Exception:
-    sim_router = None  # type: ignore
-    _sim_available = False
 from .events import router as events_router
 from .settings import app_settings as appset
 
@@ -144,6 +121,23 @@ async def lifespan(app: FastAPI):
         })
         # Continue without rate limiting - service will fail-open
     
+    try:
+        # Listen for license entitlement invalidations from other workers
+        await license_entitlement_cache.start()
+        logger.info("License entitlement cache listener started", extra={
+            'operation': 'license_entitlement_cache_startup'
+        })
+    except Exception as e:
+        logger.error("Failed to start license entitlement cache listener", exc_info=True, extra={
+            'operation': 'license_entitlement_cache_startup_failed',
+            'error_type': type(e).__name__
+        })
+        # Local TTL still bounds staleness without the listener
+    
+    if environment.LAZY_ROUTERS_WARMUP:
+        # Mount the lazy routers in the background so the first requests don't pay for the imports
+        app.state.lazy_router_warmup = asyncio.create_task(warm_lazy_routers(app))
+    
     logger.info("Application startup completed", extra={
         'operation': 'application_startup_complete'
     })
@@ -184,6 +178,54 @@ async def lifespan(app: FastAPI):
             'error_type': type(e).__name__
         })
     
+    try:
+        await license_entitlement_cache.stop()
+        logger.info("License entitlement cache closed successfully", extra={
+            'operation': 'license_entitlement_cache_shutdown'
+        })
+    except Exception as e:
+        logger.error("Failed to close license entitlement cache", exc_info=True, extra={
+            'operation': 'license_entitlement_cache_shutdown_failed',
+            'error_type': type(e).__name__
+        })
+    
+    try:
+        # End WebSocket/SSE progress streams and stop the progress stream reader
+        from .core.progress_hub import progress_hub
+        await progress_hub.stop()
+        logger.info("Progress hub stopped successfully", extra={
+            'operation': 'progress_hub_shutdown'
+        })
+    except Exception as e:
+        logger.error("Failed to stop progress hub", exc_info=True, extra={
+            'operation': 'progress_hub_shutdown_failed',
+            'error_type': type(e).__name__
+        })
+
+    try:
+        # Write buffered audit entries before the process exits
+        await asyncio.to_thread(audit_chain_writer.close)
+        logger.info("Audit chain writer closed successfully", extra={
+            'operation': 'audit_chain_writer_shutdown'
+        })
+    except Exception as e:
+        logger.error("Failed to close audit chain writer", exc_info=True, extra={
+            'operation': 'audit_chain_writer_shutdown_failed',
+            'error_type': type(e).__name__
+        })
+    
+    try:
+        from .helpers.audit_chain import shutdown_verify_executor
+        await asyncio.to_thread(shutdown_verify_executor)
+        logger.info("Audit chain verification pool shut down successfully", extra={
+            'operation': 'audit_verify_executor_shutdown'
+        })
+    except Exception as e:
+        logger.error("Failed to shut down audit chain verification pool", exc_info=True, extra={
+            'operation': 'audit_verify_executor_shutdown_failed',
+            'error_type': type(e).__name__
+        })
+    
     logger.info("Application shutdown completed", extra={
         'operation': 'application_shutdown_complete'
     })
@@ -195,35 +237,34 @@ app = FastAPI(
     lifespan=lifespan
 )
 # Ultra enterprise security middleware stack (Tasks 3.8, 3.9, 3.10, 3.12, 4.3)
-# Order is critical for security and proper functioning
-app.add_middleware(EnvironmentValidationMiddleware)    # Environment validation (Task 3.12)
-app.add_middleware(ProductionHardeningMiddleware)      # Production security hardening (Task 3.12)
-app.add_middleware(DevModeMiddleware)                  # Development mode features (Task 3.12)
-app.add_middleware(LicenseGuardMiddleware)             # License enforcement (Task 4.3)
-app.add_middleware(SecurityHeadersMiddleware)          # CSP and security headers (Task 3.10)
-app.add_middleware(XSSDetectionMiddleware)             # XSS detection and prevention (Task 3.10)
-app.add_middleware(CSRFProtectionMiddleware)           # CSRF double-submit protection (Task 3.8)
-app.add_middleware(CORSMiddlewareStrict)               # Strict CORS enforcement (Task 3.10)
-app.add_middleware(RateLimitMiddleware)                # Rate limiting (Task 3.9)
+# One pure-ASGI pipeline; layers run outermost first: rate limiting, strict CORS,
+# CSRF, XSS detection, security headers, license guard, dev mode, production
+# hardening, environment validation. The middleware stack is built at startup,
+# after all routers below are included, so their plans are compiled up front.
+app.add_middleware(SecurityPipelineMiddleware, routes=app.routes)
 
 setup_metrics(app)
 setup_celery_instrumentation()
 
+# Routers that pull in heavy dependencies are imported on the first request
+# under their prefix (or by the warm-up after startup); eager when disabled.
+_eager_routers = not environment.LAZY_ROUTERS_ENABLED
+
 app.include_router(health_router.router)
 app.include_router(auth_router.router)
 app.include_router(auth_jwt_router.router)
 app.include_router(auth_enterprise_router.router)
 app.include_router(oidc_auth_router.router)
 app.include_router(magic_link_auth_router.router)
-app.include_router(mfa_router.router)  # Task 3.7: MFA TOTP endpoints
-app.include_router(freecad_router.router)
-app.include_router(assemblies_router.router)
-app.include_router(cam_router.router)
+include_lazy_router(app, "app.routers.mfa", "/api/v1/auth/mfa", eager=_eager_routers)  # Task 3.7: MFA TOTP endpoints
+include_lazy_router(app, "app.routers.freecad", "/api/v1/freecad", eager=_eager_routers)
+include_lazy_router(app, "app.routers.assemblies", "/api/v1/assemblies", eager=_eager_routers)
+include_lazy_router(app, "app.routers.cam", "/api/v1/cam", eager=_eager_routers)
 # app.include_router(cam2_router)  # Temporarily disabled
-app.include_router(jobs_router.router)
-app.include_router(admin_dlq_router.router)
+include_lazy_router(app, "app.routers.jobs", "/api/v1/jobs", eager=_eager_routers)
+include_lazy_router(app, "app.routers.admin_dlq", "/api/v1/admin/dlq", eager=_eager_routers)
 app.include_router(admin_unmask_router.router)
-app.include_router(designs_router.router)  # Re-enabled with RBAC protection
+include_lazy_router(app, "app.routers.designs", "/api/v1/designs", eager=_eager_routers)  # Re-enabled with RBAC protection
 app.include_router(designs_v1_router.router)  # Task 7.1: Design API v1 with guards
 app.include_router(admin_users_router.router)  # New admin router with RBAC
 app.include_router(me_router.router)  # New user profile router with RBAC
@@ -231,17 +272,16 @@ app.include_router(security_router.router)  # Security endpoints (Task 3.10)
 app.include_router(environment_router.router)  # Environment endpoints (Task 3.12)
 app.include_router(environment_router.health_router)  # Public health endpoint (Task 3.12)
 app.include_router(license_router.router)  # License management endpoints (Task 3.14)
-app.include_router(invoices_router.router)  # Invoice PDF endpoints (Task 4.5)
-app.include_router(payments_router.router)  # Payment provider abstraction endpoints (Task 4.6)
-app.include_router(files_router.router)  # File upload/download endpoints (Task 5.3)
-app.include_router(artefacts_router.router)  # Artefact persistence endpoints (Task 5.7)
-app.include_router(upload_normalization_router.router)  # Upload normalization endpoints (Task 7.7)
-app.include_router(batch_processing_router.router)  # Task 7.23: Batch processing and automation
+include_lazy_router(app, "app.routers.invoices", "/api/v1/invoices", eager=_eager_routers)  # Invoice PDF endpoints (Task 4.5)
+include_lazy_router(app, "app.routers.payments", "/payments", eager=_eager_routers)  # Payment provider abstraction endpoints (Task 4.6)
+include_lazy_router(app, "app.routers.files", "/files", eager=_eager_routers)  # File upload/download endpoints (Task 5.3)
+include_lazy_router(app, "app.routers.artefacts", "/artefacts", eager=_eager_routers)  # Artefact persistence endpoints (Task 5.7)
+include_lazy_router(app, "app.routers.upload_normalization", "/api/v1/normalize", eager=_eager_routers)  # Upload normalization endpoints (Task 7.7)
+include_lazy_router(app, "app.routers.batch_processing", "/api/v2", eager=_eager_routers)  # Task 7.23: Batch processing and automation
 # Task 7.16: Real-time progress updates via WebSocket and SSE
 app.include_router(websocket_router.router)  # WebSocket endpoints for real-time progress
 app.include_router(sse_router.router)  # SSE endpoints for real-time progress
-if _sim_available and sim_router is not None:
-    app.include_router(sim_router.router)
+include_lazy_router(app, "app.routers.sim", "/api/v1/sim", optional=True, eager=_eager_routers)
 app.include_router(events_router)
 # Legacy routers disabled - not part of Task Master ERD
 # app.include_router(projects_router.router)
@@ -252,6 +292,9 @@ app.include_router(events_router)
 # app.include_router(setups_router.router)
 # app.include_router(fixtures_router.router)
 
+# OpenAPI schema generation loads the pending lazy routers first
+install_lazy_openapi(app)
+
 
 @app.get("/", include_in_schema=False)
 def root():
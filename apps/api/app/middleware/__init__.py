@@ -1,3 +1,2 @@
 from .headers import SecurityHeadersMiddleware, CORSMiddlewareStrict  # re-export
 from .license_middleware import LicenseGuardMiddleware  # Task 4.3: License enforcement
-
@@ -89,22 +89,25 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
             'docker-compose',
         }
     
-    async def dispatch(self, request: Request, call_next: Callable) -> StarletteResponse:
+    def applies_to(self, path: str) -> bool:
+        """Whether requests to this path are subject to CSRF protection."""
+        return not self._is_path_exempt(path)
+    
+    async def check_request(self, request: Request) -> Optional[StarletteResponse]:
         """
-        Process request through CSRF protection middleware.
+        Validate the request's CSRF token.
         
         Args:
             request: Incoming HTTP request
-            call_next: Next middleware or route handler
             
         Returns:
-            HTTP response
+            Error response if the request is rejected, None otherwise
         """
         start_time = time.time()
         
         # Skip CSRF protection for exempt paths
         if self._is_path_exempt(request.url.path):
-            return await call_next(request)
+            return None
         
         # Skip CSRF protection for exempt user agents
         user_agent = request.headers.get('User-Agent', '').lower()
@@ -114,7 +117,7 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
                 'method': request.method,
                 'user_agent': user_agent[:50]
             })
-            return await call_next(request)
+            return None
         
         # Task 3.12: Dev-mode localhost bypass (DEVELOPMENT ONLY)
         if (environment.is_development and 
@@ -130,7 +133,12 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
                 'environment': str(environment.ENV),
                 'warning': 'CSRF bypass active for localhost in development mode only'
             })
-            return await call_next(request)
+            return None
+        
+        # Safe methods and API-only clients pass without a token, so they
+        # do not need a database session either
+        if not csrf_service.is_protection_required(request, self.require_auth_for_csrf):
+            return None
         
         # Get database connection for logging
         db = None
@@ -192,7 +200,7 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
             if db:
                 db.commit()
             
-            return await call_next(request)
+            return None
             
         except Exception as e:
             logger.error("CSRF middleware error", exc_info=True, extra={
@@ -227,6 +235,22 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
                 except Exception:
                     pass
     
+    async def dispatch(self, request: Request, call_next: Callable) -> StarletteResponse:
+        """
+        Process request through CSRF protection middleware.
+        
+        Args:
+            request: Incoming HTTP request
+            call_next: Next middleware or route handler
+            
+        Returns:
+            HTTP response
+        """
+        response = await self.check_request(request)
+        if response is not None:
+            return response
+        return await call_next(request)
+    
     def _is_path_exempt(self, path: str) -> bool:
         """
         Check if path is exempt from CSRF protection.
@@ -16,6 +16,7 @@ from urllib.parse import urlparse
 
 from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
@@ -63,8 +64,15 @@ class DevModeMiddleware(BaseHTTPMiddleware):
                 }
             )
     
-    async def dispatch(self, request: Request, call_next):
-        """Apply development mode features with strict production safeguards."""
+    def applies_to(self, path: str) -> bool:
+        """Active in dev mode, and in production only to refuse a leaked dev mode."""
+        return (
+            (environment.is_production and environment.DEV_MODE)
+            or (environment.is_development and environment.is_dev_mode)
+        )
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """Refuse dev mode in production and apply the dev-mode request relaxations."""
         
         # CRITICAL SECURITY CHECK: Never allow dev features in production
         if environment.is_production and environment.DEV_MODE:
@@ -84,28 +92,38 @@ class DevModeMiddleware(BaseHTTPMiddleware):
         
         # Only apply dev features in development environment with dev mode enabled
         if not (environment.is_development and environment.is_dev_mode):
-            return await call_next(request)
+            return None
         
         # Store request start time for dev annotations
-        request_start_time = time.time()
-        request.state.dev_request_start = request_start_time
+        request.state.dev_request_start = time.time()
         
         # Apply dev-mode CSRF bypass for localhost
         if self.enable_csrf_localhost_bypass and self._is_localhost_request(request):
             self._apply_csrf_localhost_bypass(request)
         
+        return None
+    
+    def finalize_headers(self, request: Request, headers: MutableHeaders) -> None:
+        """Add dev-mode headers."""
+        headers["X-Dev-Mode"] = "true"
+        headers["X-Environment"] = str(environment.ENV)
+        headers["X-Security-Level"] = "development-relaxed"
+    
+    async def dispatch(self, request: Request, call_next):
+        """Apply development mode features with strict production safeguards."""
+        await self.check_request(request)
+        
+        if not (environment.is_development and environment.is_dev_mode):
+            return await call_next(request)
+        
         # Process the request
         response = await call_next(request)
         
         # Add development annotations to response
         if self.enable_response_annotations and isinstance(response, JSONResponse):
-            response = await self._add_dev_annotations(request, response, request_start_time)
-        
-        # Add dev-mode headers
-        response.headers["X-Dev-Mode"] = "true"
-        response.headers["X-Environment"] = str(environment.ENV)
-        response.headers["X-Security-Level"] = "development-relaxed"
+            response = await self._add_dev_annotations(request, response, request.state.dev_request_start)
         
+        self.finalize_headers(request, response.headers)
         return response
     
     def _is_localhost_request(self, request: Request) -> bool:
@@ -273,12 +291,16 @@ class ProductionHardeningMiddleware(BaseHTTPMiddleware):
                 }
             )
     
-    async def dispatch(self, request: Request, call_next):
-        """Apply production hardening security controls."""
+    def applies_to(self, path: str) -> bool:
+        """Hardening applies only in production."""
+        return environment.is_production
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """Redirect plain HTTP and hide debug endpoints."""
         
         # Only apply hardening in production
         if not environment.is_production:
-            return await call_next(request)
+            return None
         
         # HTTPS Enforcement
         if environment.should_force_https and self._is_http_request(request):
@@ -288,15 +310,34 @@ class ProductionHardeningMiddleware(BaseHTTPMiddleware):
         if environment.PROD_DISABLE_DEBUG_ENDPOINTS and self._is_debug_endpoint(request):
             return self._reject_debug_endpoint(request)
         
+        return None
+    
+    def handle_error(self, request: Request, error: Exception) -> Optional[Response]:
+        """Masked response for an unhandled error, or None to let it propagate."""
+        if environment.should_mask_errors:
+            return self._mask_error_response(request, error)
+        return None
+    
+    async def dispatch(self, request: Request, call_next):
+        """Apply production hardening security controls."""
+        
+        # Only apply hardening in production
+        if not environment.is_production:
+            return await call_next(request)
+        
+        rejection = await self.check_request(request)
+        if rejection is not None:
+            return rejection
+        
         # Process the request
         try:
             response = await call_next(request)
         except Exception as e:
             # Apply error masking in production
-            if environment.should_mask_errors:
-                return self._mask_error_response(request, e)
-            else:
+            masked = self.handle_error(request, e)
+            if masked is None:
                 raise
+            return masked
         
         # Apply production security headers
         response = self._add_production_headers(response)
@@ -407,6 +448,11 @@ class ProductionHardeningMiddleware(BaseHTTPMiddleware):
     
     def _add_production_headers(self, response: Response) -> Response:
         """Add production-specific security headers."""
+        self.finalize_headers(None, response.headers)
+        return response
+    
+    def finalize_headers(self, request: Optional[Request], headers: MutableHeaders) -> None:
+        """Replace development headers with production security headers."""
         
         # Remove any development headers
         dev_headers_to_remove = [
@@ -416,14 +462,13 @@ class ProductionHardeningMiddleware(BaseHTTPMiddleware):
         ]
         
         for header in dev_headers_to_remove:
-            response.headers.pop(header, None)
+            if header in headers:
+                del headers[header]
         
         # Add production security headers
-        response.headers['X-Production-Mode'] = 'true'
-        response.headers['X-Security-Level'] = 'ultra-enterprise-banking'
-        response.headers['X-KVKV-Compliant'] = 'true'
-        
-        return response
+        headers['X-Production-Mode'] = 'true'
+        headers['X-Security-Level'] = 'ultra-enterprise-banking'
+        headers['X-KVKV-Compliant'] = 'true'
     
     def _get_client_ip(self, request: Request) -> Optional[str]:
         """Extract client IP address from request."""
@@ -459,12 +504,21 @@ class EnvironmentValidationMiddleware(BaseHTTPMiddleware):
         # Perform initial validation
         self._validate_runtime_environment()
     
-    async def dispatch(self, request: Request, call_next):
-        """Validate environment configuration for each request."""
-        
-        # Check for critical security misconfigurations
+    def applies_to(self, path: str) -> bool:
+        """Only a misconfigured environment has requests to reject."""
+        return self._has_critical_misconfigurations()
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """Reject the request if the environment is critically misconfigured."""
         if self._has_critical_misconfigurations():
             return self._reject_misconfigured_request(request)
+        return None
+    
+    async def dispatch(self, request: Request, call_next):
+        """Validate environment configuration for each request."""
+        rejection = await self.check_request(request)
+        if rejection is not None:
+            return rejection
         
         return await call_next(request)
     
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import json
-from typing import Dict, Optional
+from typing import Iterator, Optional, Tuple
+from urllib.parse import parse_qsl
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.responses import Response, JSONResponse
 
 from ..core.security import security_manager
+from ..core.threat_scanner import ThreatMatch
 from ..core.logging import get_logger
 from ..models.security_event import SecurityEvent
 from ..settings import app_settings as appset
@@ -30,22 +32,22 @@ class EnterpriseSecurityHeadersMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.csp_report_endpoint = csp_report_endpoint
     
-    async def dispatch(self, request: Request, call_next):
-        """Apply ultra enterprise security headers to all responses."""
-        
-        # Generate unique nonce for this request
-        nonce = security_manager.generate_csp_nonce()
-        
+    def applies_to(self, path: str) -> bool:
+        """Security headers are added to every response."""
+        return True
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """Generate the request's CSP nonce."""
         # Store nonce in request state for use in templates
-        request.state.csp_nonce = nonce
-        
-        # Process the request
-        response: Response = await call_next(request)
-        
+        request.state.csp_nonce = security_manager.generate_csp_nonce()
+        return None
+    
+    def finalize_headers(self, request: Request, response_headers: MutableHeaders) -> None:
+        """Add the security headers the response does not already set."""
         # Apply security headers only if CSP is enabled
         if appset.security_csp_enabled:
             headers = security_manager.get_enterprise_security_headers(
-                nonce=nonce,
+                nonce=request.state.csp_nonce,
                 environment=appset.security_environment,
                 hsts_enabled=appset.security_hsts_enabled
             )
@@ -55,14 +57,10 @@ class EnterpriseSecurityHeadersMiddleware(BaseHTTPMiddleware):
                 csp_policy = headers.get("Content-Security-Policy", "")
                 if csp_policy:
                     headers["Content-Security-Policy"] = f"{csp_policy}; report-uri {appset.security_csp_report_uri}"
-            
-            # Apply all security headers
-            for header_name, header_value in headers.items():
-                response.headers.setdefault(header_name, header_value)
         
         # Apply basic security headers even if CSP is disabled
         else:
-            basic_headers = {
+            headers = {
                 "X-Content-Type-Options": "nosniff",
                 "X-Frame-Options": "DENY",
                 "Referrer-Policy": "no-referrer",
@@ -70,11 +68,16 @@ class EnterpriseSecurityHeadersMiddleware(BaseHTTPMiddleware):
             }
             
             if appset.security_hsts_enabled and appset.security_environment != "development":
-                basic_headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-            
-            for header_name, header_value in basic_headers.items():
-                response.headers.setdefault(header_name, header_value)
+                headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
         
+        for header_name, header_value in headers.items():
+            response_headers.setdefault(header_name, header_value)
+    
+    async def dispatch(self, request: Request, call_next):
+        """Apply ultra enterprise security headers to all responses."""
+        await self.check_request(request)
+        response: Response = await call_next(request)
+        self.finalize_headers(request, response.headers)
         return response
 
 
@@ -85,113 +88,102 @@ class XSSDetectionMiddleware(BaseHTTPMiddleware):
     Integrates with security event logging system.
     """
     
-    async def dispatch(self, request: Request, call_next):
-        """Detect XSS attempts in request data."""
+    # Per-field cap on scanned body text, to bound the cost of huge payloads
+    MAX_BODY_FIELD_CHARS = 1000
+    
+    def applies_to(self, path: str) -> bool:
+        """Requests are scanned only while XSS detection is enabled."""
+        return appset.security_xss_detection_enabled
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """Reject the request if it carries an XSS marker."""
         
         # Skip XSS detection if disabled
         if not appset.security_xss_detection_enabled:
-            return await call_next(request)
+            return None
         
-        # Extract request data for analysis
-        request_data = await self._extract_request_data(request)
+        # Scan request data, stopping at the first suspicious field
+        threat = await self._scan_request(request)
+        if threat is None:
+            return None
         
-        # Check for suspicious patterns
-        if security_manager.is_suspicious_request(request_data):
-            # Log security event
-            await self._log_xss_attempt(request, request_data)
-            
-            # Return security error in Turkish
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "detail": "Güvenlik: Şüpheli içerik tespit edildi. İstek reddedildi.",
-                    "error_code": "XSS_ATTEMPT_DETECTED",
-                    "message": "Request contains potentially malicious content"
-                },
-                headers={
-                    "X-Content-Type-Options": "nosniff",
-                    "X-Frame-Options": "DENY"
-                }
-            )
+        # Log security event
+        await self._log_xss_attempt(request, threat)
         
+        # Return security error in Turkish
+        return JSONResponse(
+            status_code=400,
+            content={
+                "detail": "Güvenlik: Şüpheli içerik tespit edildi. İstek reddedildi.",
+                "error_code": "XSS_ATTEMPT_DETECTED",
+                "message": "Request contains potentially malicious content"
+            },
+            headers={
+                "X-Content-Type-Options": "nosniff",
+                "X-Frame-Options": "DENY"
+            }
+        )
+    
+    async def dispatch(self, request: Request, call_next):
+        """Detect XSS attempts in request data."""
+        response = await self.check_request(request)
+        if response is not None:
+            return response
         return await call_next(request)
     
-    async def _extract_request_data(self, request: Request) -> Dict:
-        """Extract request data for XSS analysis."""
-        data = {}
-        
+    async def _scan_request(self, request: Request) -> Optional[ThreatMatch]:
+        """Scan query, path, selected headers and body for XSS markers."""
         try:
-            # Query parameters
-            data.update(dict(request.query_params))
-            
-            # Path parameters
-            if hasattr(request, 'path_params'):
-                data.update(request.path_params)
-            
-            # Headers (selected safe ones)
-            safe_headers = ['user-agent', 'referer', 'x-forwarded-for']
-            for header in safe_headers:
-                if header in request.headers:
-                    data[f"header_{header}"] = request.headers[header]
-            
-            # For POST requests, read body safely without consuming it
-            if request.method in ["POST", "PUT", "PATCH"]:
-                content_type = request.headers.get("content-type", "")
-                if "application/json" in content_type:
-                    try:
-                        # Read body safely
-                        body = await request.body()
-                        if body:
-                            # Decode and parse JSON for XSS analysis
-                            body_text = body.decode('utf-8')
-                            
-                            # Parse JSON to extract field values for analysis
-                            try:
-                                body_json = json.loads(body_text)
-                                if isinstance(body_json, dict):
-                                    for key, value in body_json.items():
-                                        data[f"body_{key}"] = str(value)[:1000]  # Limit to prevent DOS
-                                else:
-                                    data["body_content"] = str(body_json)[:1000]
-                            except json.JSONDecodeError:
-                                # Not valid JSON, analyze as plain text
-                                data["body_content"] = body_text[:1000]
-                            
-                            # Important: Recreate request with body for downstream handlers
-                            async def receive():
-                                return {"type": "http.request", "body": body}
-                            
-                            # Replace request's receive method
-                            request._receive = receive
-                            
-                    except Exception as e:
-                        logger.warning(f"Error reading request body for XSS analysis: {e}")
-                elif "application/x-www-form-urlencoded" in content_type:
-                    try:
-                        # Handle form data
-                        body = await request.body()
-                        if body:
-                            from urllib.parse import parse_qs
-                            body_text = body.decode('utf-8')
-                            form_data = parse_qs(body_text)
-                            for key, values in form_data.items():
-                                if values:
-                                    data[f"form_{key}"] = str(values[0])[:1000]
-                            
-                            # Recreate request with body
-                            async def receive():
-                                return {"type": "http.request", "body": body}
-                            request._receive = receive
-                            
-                    except Exception as e:
-                        logger.warning(f"Error reading form data for XSS analysis: {e}")
-        
+            threat = security_manager.scan_request_fields(self._iter_request_fields(request))
+            if threat is None and request.method in ["POST", "PUT", "PATCH"]:
+                threat = await self._scan_body(request)
+            return threat
         except Exception as e:
             logger.warning(f"Error extracting request data for XSS analysis: {e}")
+            return None
+    
+    def _iter_request_fields(self, request: Request) -> Iterator[Tuple[str, str]]:
+        """Yield query parameters, path parameters and selected headers."""
+        yield from request.query_params.multi_items()
+        
+        if hasattr(request, 'path_params'):
+            yield from request.path_params.items()
         
-        return data
+        # Headers (selected safe ones)
+        for header in ('user-agent', 'referer', 'x-forwarded-for'):
+            if header in request.headers:
+                yield f"header_{header}", request.headers[header]
     
-    async def _log_xss_attempt(self, request: Request, request_data: Dict):
+    async def _scan_body(self, request: Request) -> Optional[ThreatMatch]:
+        """Read the body once and scan its string fields without parsing it."""
+        content_type = request.headers.get("content-type", "")
+        is_json = "application/json" in content_type
+        if not is_json and "application/x-www-form-urlencoded" not in content_type:
+            return None
+        
+        try:
+            body = await request.body()
+        except Exception as e:
+            logger.warning(f"Error reading request body for XSS analysis: {e}")
+            return None
+        if not body:
+            return None
+        
+        # Important: Recreate request with body for downstream handlers
+        async def receive():
+            return {"type": "http.request", "body": body}
+        
+        request._receive = receive
+        
+        body_text = body.decode('utf-8')
+        if is_json:
+            return security_manager.scan_request_json(body_text, max_chars=self.MAX_BODY_FIELD_CHARS)
+        return security_manager.scan_request_fields(
+            (f"form_{key}", value[:self.MAX_BODY_FIELD_CHARS])
+            for key, value in parse_qsl(body_text, keep_blank_values=True)
+        )
+    
+    async def _log_xss_attempt(self, request: Request, threat: ThreatMatch):
         """Log XSS attempt as security event."""
         try:
             # Extract client information
@@ -206,7 +198,9 @@ class XSSDetectionMiddleware(BaseHTTPMiddleware):
                     'user_agent': user_agent,
                     'path': str(request.url.path),
                     'method': request.method,
-                    'suspicious_data': str(request_data)[:500]  # Limit size
+                    'threat_category': threat.category,
+                    'suspicious_field': threat.field,
+                    'suspicious_data': threat.matched[:500]  # Limit size
                 }
             )
             
@@ -219,7 +213,11 @@ SecurityHeadersMiddleware = EnterpriseSecurityHeadersMiddleware
 
 
 class CORSMiddlewareStrict(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+    def applies_to(self, path: str) -> bool:
+        return True
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """Reject disallowed origins and answer preflight requests."""
         origin = request.headers.get("origin")
         allowed = (not appset.cors_allowed_origins) or (origin in appset.cors_allowed_origins)
         if origin and not allowed:
@@ -236,11 +234,20 @@ class CORSMiddlewareStrict(BaseHTTPMiddleware):
             resp.headers["Access-Control-Allow-Credentials"] = "false"
             resp.headers["Access-Control-Max-Age"] = "600"
             return resp
-        response: Response = await call_next(request)
-        if origin and allowed:
-            response.headers["Access-Control-Allow-Origin"] = origin
-        response.headers["Vary"] = "Origin"
-        response.headers["Access-Control-Allow-Credentials"] = "false"
+        return None
+    
+    def finalize_headers(self, request: Request, headers: MutableHeaders) -> None:
+        # Disallowed origins never reach this point
+        origin = request.headers.get("origin")
+        if origin:
+            headers["Access-Control-Allow-Origin"] = origin
+        headers["Vary"] = "Origin"
+        headers["Access-Control-Allow-Credentials"] = "false"
+    
+    async def dispatch(self, request: Request, call_next):
+        response = await self.check_request(request)
+        if response is not None:
+            return response
+        response = await call_next(request)
+        self.finalize_headers(request, response.headers)
         return response
-
-
@@ -25,9 +25,15 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
 
-from ..db import get_db, db_session
+from ..db import get_db, db_session, AsyncSessionLocal
+from ..core.environment import environment as settings
 from ..middleware.jwt_middleware import _authenticate_user, jwt_bearer_scheme
 from ..services.license_service import LicenseService
+from ..services.license_entitlement_cache import (
+    LicenseEntitlement,
+    LicenseEntitlementCache,
+    license_entitlement_cache,
+)
 from ..services.session_service import SessionService
 from ..services.audit_service import audit_service
 from ..services.pii_masking_service import pii_masking_service, MaskingLevel
@@ -254,8 +260,17 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
     session revocation when licenses expire.
     """
     
-    def __init__(self, app, excluded_paths: Optional[list] = None):
+    def __init__(
+        self,
+        app,
+        excluded_paths: Optional[list] = None,
+        entitlement_cache: Optional[LicenseEntitlementCache] = None
+    ):
         super().__init__(app)
+        # Entitlements are served from the shared cache; None disables caching
+        if entitlement_cache is None and settings.LICENSE_ENTITLEMENT_CACHE_ENABLED:
+            entitlement_cache = license_entitlement_cache
+        self.entitlement_cache = entitlement_cache
         # Default excluded paths - these should not require license checks
         self.excluded_paths = excluded_paths or [
             "/api/v1/auth",
@@ -271,7 +286,8 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
             "License Guard Middleware initialized",
             extra={
                 "operation": "license_guard_init",
-                "excluded_paths": self.excluded_paths
+                "excluded_paths": self.excluded_paths,
+                "entitlement_cache": self.entitlement_cache is not None
             }
         )
     
@@ -492,6 +508,19 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
                 _license_expiry_processed.discard(tracking_key)
             return False
     
+    async def _get_entitlement(self, user_id: int) -> LicenseEntitlement:
+        """Return the user's entitlement from the cache, or load it directly if caching is disabled."""
+        if self.entitlement_cache is None:
+            return await self._load_entitlement(user_id)
+        return await self.entitlement_cache.get(user_id, self._load_entitlement)
+    
+    @staticmethod
+    async def _load_entitlement(user_id: int) -> LicenseEntitlement:
+        """Load the active license with an async query (cache miss path)."""
+        async with AsyncSessionLocal() as db:
+            license = await LicenseService.get_active_license_async(db, user_id)
+        return LicenseEntitlement.from_license(user_id, license)
+    
     async def _check_license_and_enforce(
         self, 
         request: Request, 
@@ -513,102 +542,103 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
         client_ip, user_agent = self._get_client_info(request)
         
         try:
-            # Use dedicated context manager for database session
-            with get_db_session_for_middleware() as db:
-                try:
-                    # Get user's active license with proper error handling
-                    license = LicenseService.get_active_license(db, user_id)
-                except Exception as e:
-                    # Handle license service errors
-                    logger.error(
-                        "Error retrieving license",
-                        exc_info=True,
-                        extra={
-                            "operation": "license_guard_get_license_error",
-                            "user_id": user_id,
-                            "error_type": type(e).__name__,
-                            "request_id": request_id
-                        }
-                    )
-                    raise
-                
-                if not license:
-                    # No active license found
-                    logger.warning(
-                        "Access denied - no active license",
-                        extra={
-                            "operation": "license_guard_no_license",
-                            "user_id": user_id,
-                            "request_id": request_id,
-                            "path": str(request.url.path)
-                        }
-                    )
-                    
-                    return JSONResponse(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        content={
-                            "error": "LIC_EXPIRED",
-                            "message": "No active license found",
-                            "message_tr": "Aktif lisans bulunamadı",
-                            "detail": {
-                                "code": "LIC_EXPIRED",
-                                "reason": "no_active_license",
-                                "user_id": user_id,
-                                "timestamp": datetime.now(timezone.utc).isoformat()
-                            }
-                        }
-                    )
+            try:
+                # Cached entitlement; async database query only on a miss
+                entitlement = await self._get_entitlement(user_id)
+            except Exception as e:
+                # Handle license service errors
+                logger.error(
+                    "Error retrieving license",
+                    exc_info=True,
+                    extra={
+                        "operation": "license_guard_get_license_error",
+                        "user_id": user_id,
+                        "error_type": type(e).__name__,
+                        "request_id": request_id
+                    }
+                )
+                raise
+            
+            if not entitlement.has_license:
+                # No active license found
+                logger.warning(
+                    "Access denied - no active license",
+                    extra={
+                        "operation": "license_guard_no_license",
+                        "user_id": user_id,
+                        "request_id": request_id,
+                        "path": str(request.url.path)
+                    }
+                )
                 
-                # Check if license is expired (additional safety check)
-                now = datetime.now(timezone.utc)
-                if license.ends_at <= now:
-                    # License is expired - revoke sessions and deny access
-                    logger.warning(
-                        "Access denied - license expired",
-                        extra={
-                            "operation": "license_guard_expired",
+                return JSONResponse(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    content={
+                        "error": "LIC_EXPIRED",
+                        "message": "No active license found",
+                        "message_tr": "Aktif lisans bulunamadı",
+                        "detail": {
+                            "code": "LIC_EXPIRED",
+                            "reason": "no_active_license",
                             "user_id": user_id,
-                            "license_id": str(license.id),
-                            "expired_at": license.ends_at.isoformat(),
-                            "request_id": request_id,
-                            "path": str(request.url.path)
-                        }
-                    )
-                    
-                    # Trigger session revocation with license_id
-                    await self._revoke_user_sessions_on_expiry(
-                        db, user_id, license.id, client_ip, user_agent, request_id
-                    )
-                    
-                    return JSONResponse(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        content={
-                            "error": "LIC_EXPIRED",
-                            "message": "License has expired",
-                            "message_tr": "Lisansın süresi dolmuş",
-                            "detail": {
-                                "code": "LIC_EXPIRED",
-                                "reason": "license_expired", 
-                                "expired_at": license.ends_at.isoformat(),
-                                "user_id": user_id,
-                                "timestamp": now.isoformat()
-                            }
+                            "timestamp": datetime.now(timezone.utc).isoformat()
                         }
-                    )
-                
-                # License is valid - log successful check
-                logger.debug(
-                    "License check passed",
+                    }
+                )
+            
+            # Expiry is evaluated locally against the cached ends_at
+            now = datetime.now(timezone.utc)
+            if not entitlement.is_valid(now):
+                # License is expired - revoke sessions and deny access
+                logger.warning(
+                    "Access denied - license expired",
                     extra={
-                        "operation": "license_guard_valid",
+                        "operation": "license_guard_expired",
                         "user_id": user_id,
-                        "license_id": str(license.id),
-                        "expires_at": license.ends_at.isoformat(),
-                        "request_id": request_id
+                        "license_id": str(entitlement.license_id),
+                        "expired_at": entitlement.ends_at.isoformat(),
+                        "request_id": request_id,
+                        "path": str(request.url.path)
                     }
                 )
                 
-                return None  # License is valid, allow request to proceed
+                # Trigger session revocation with license_id; the database is
+                # only needed the first time per (user, license)
+                if not is_license_expiry_processed(user_id, entitlement.license_id):
+                    with get_db_session_for_middleware() as db:
+                        await self._revoke_user_sessions_on_expiry(
+                            db, user_id, entitlement.license_id, client_ip, user_agent, request_id
+                        )
+                
+                return JSONResponse(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    content={
+                        "error": "LIC_EXPIRED",
+                        "message": "License has expired",
+                        "message_tr": "Lisansın süresi dolmuş",
+                        "detail": {
+                            "code": "LIC_EXPIRED",
+                            "reason": "license_expired", 
+                            "expired_at": entitlement.ends_at.isoformat(),
+                            "user_id": user_id,
+                            "timestamp": now.isoformat()
+                        }
+                    }
+                )
+            
+            # License is valid - log successful check
+            logger.debug(
+                "License check passed",
+                extra={
+                    "operation": "license_guard_valid",
+                    "user_id": user_id,
+                    "license_id": str(entitlement.license_id),
+                    "expires_at": entitlement.ends_at.isoformat(),
+                    "request_id": request_id
+                }
+            )
+            
+            return None  # License is valid, allow request to proceed
                 
         except (SQLAlchemyError, OperationalError) as e:
             # Database error - fail closed (deny access)
@@ -666,8 +696,17 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
                 }
             )
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Main middleware dispatch method."""
+    def applies_to(self, path: str) -> bool:
+        """Whether requests to this path are subject to license checks."""
+        return not self._is_path_excluded(path)
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        """
+        Enforce the license for the request's user.
+        
+        Returns an error response when the request must be rejected, or None
+        when it may proceed.
+        """
         request_id = str(uuid.uuid4())
         path = str(request.url.path)
         
@@ -681,7 +720,7 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
                     "request_id": request_id
                 }
             )
-            return await call_next(request)
+            return None
         
         try:
             # Extract current user from request
@@ -697,20 +736,13 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
                         "request_id": request_id
                     }
                 )
-                return await call_next(request)
+                return None
             
-            # Check license for authenticated user
-            license_response = await self._check_license_and_enforce(
+            # Check license for authenticated user; a response means it failed
+            return await self._check_license_and_enforce(
                 request, current_user_id, request_id
             )
             
-            if license_response:
-                # License check failed - return error response
-                return license_response
-            
-            # License is valid - proceed with request
-            return await call_next(request)
-            
         except Exception as e:
             # Unexpected error in middleware - fail closed
             logger.error(
@@ -737,6 +769,16 @@ class LicenseGuardMiddleware(BaseHTTPMiddleware):
                     }
                 }
             )
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """Main middleware dispatch method."""
+        license_response = await self.check_request(request)
+        if license_response is not None:
+            # License check failed - return error response
+            return license_response
+        
+        # License is valid - proceed with request
+        return await call_next(request)
 
 
 # Utility function to clear processed users (for testing or admin purposes)
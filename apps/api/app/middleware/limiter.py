@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 import time
 from collections import defaultdict, deque
-from typing import Deque, Dict, Tuple
+from typing import Deque, Dict, Optional, Tuple
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -27,27 +27,28 @@ def _parse_rule(rule: str) -> Tuple[int, float]:
     return n, window
 
 
+def _rule_for_path(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """(bucket key, rule) of the limit that applies to path, or (None, None)."""
+    # Hedef yollar
+    if path.startswith("/api/v1/assemblies"):
+        return "assemblies", appset.rate_limit_rules.get("assemblies")
+    if path.startswith("/api/v1/cam/gcode"):
+        return "cam", appset.rate_limit_rules.get("cam")
+    if path.startswith("/api/v1/sim/") or path == "/api/v1/sim" or path.startswith("/api/v1/simulate"):
+        return "simulate", appset.rate_limit_rules.get("simulate")
+    if path.startswith("/api/v1/designs"):
+        return "designs", appset.rate_limit_rules.get("designs") or "30/m"
+    return None, None
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        key = None
-        # Hedef yollar
-        if path.startswith("/api/v1/assemblies"):
-            rule = appset.rate_limit_rules.get("assemblies")
-            key = "assemblies"
-        elif path.startswith("/api/v1/cam/gcode"):
-            rule = appset.rate_limit_rules.get("cam")
-            key = "cam"
-        elif path.startswith("/api/v1/sim/") or path == "/api/v1/sim" or path.startswith("/api/v1/simulate"):
-            rule = appset.rate_limit_rules.get("simulate")
-            key = "simulate"
-        elif path.startswith("/api/v1/designs"):
-            rule = appset.rate_limit_rules.get("designs") or "30/m"
-            key = "designs"
-        else:
-            rule = None
+    def applies_to(self, path: str) -> bool:
+        return bool(_rule_for_path(path)[1])
+    
+    async def check_request(self, request: Request) -> Optional[Response]:
+        key, rule = _rule_for_path(request.url.path)
         if not rule:
-            return await call_next(request)
+            return None
         limit, window = _parse_rule(rule)
         now = time.time()
         # Kimlik: IP + route; dev’de header’dan user_id varsa ekleyelim
@@ -61,6 +62,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if len(dq) >= limit:
             return Response(status_code=429, content="Hız sınırı aşıldı, lütfen sonra tekrar deneyin.")
         dq.append(now)
+        return None
+    
+    async def dispatch(self, request: Request, call_next):
+        response = await self.check_request(request)
+        if response is not None:
+            return response
         return await call_next(request)
-
-
@@ -0,0 +1,219 @@
+"""
+Security middleware pipeline (Tasks 3.8, 3.9, 3.10, 3.12, 4.3)
+
+Runs the security layers as one pure-ASGI middleware instead of a stack of
+BaseHTTPMiddleware instances, each of which adds a task and a response
+stream to every request.
+
+The layers keep their logic in their middleware classes and take part
+through these hooks:
+
+- ``applies_to(path)``: whether the layer has anything to do for a path,
+  decided from configuration when the path's plan is compiled
+- ``check_request(request)``: returns a response to short-circuit the
+  request, or None to let it through
+- ``finalize_headers(request, headers)``: adjusts the response headers
+- ``handle_error(request, error)``: optional response for an error raised
+  by the application
+
+A plan is the ordered list of layers that apply to a path. Plans for
+routes without path parameters are compiled when the pipeline is built
+(at application startup); other paths are compiled on first use and
+memoized. All layers of a request share one Request object, so headers
+are parsed once, and a body read by a layer is buffered once and replayed
+to the application.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.logging import get_logger
+from ..core.metrics import security_pipeline_layer_duration_seconds
+from .csrf_middleware import CSRFProtectionMiddleware
+from .dev_mode_middleware import (
+    DevModeMiddleware,
+    EnvironmentValidationMiddleware,
+    ProductionHardeningMiddleware,
+)
+from .headers import CORSMiddlewareStrict, SecurityHeadersMiddleware, XSSDetectionMiddleware
+from .license_middleware import LicenseGuardMiddleware
+from .limiter import RateLimitMiddleware
+
+logger = get_logger(__name__)
+
+# Outermost first, matching the order the layers were stacked in before
+DEFAULT_LAYERS: Tuple[Tuple[str, type], ...] = (
+    ("rate_limit", RateLimitMiddleware),
+    ("cors", CORSMiddlewareStrict),
+    ("csrf", CSRFProtectionMiddleware),
+    ("xss", XSSDetectionMiddleware),
+    ("security_headers", SecurityHeadersMiddleware),
+    ("license", LicenseGuardMiddleware),
+    ("dev_mode", DevModeMiddleware),
+    ("production_hardening", ProductionHardeningMiddleware),
+    ("environment_validation", EnvironmentValidationMiddleware),
+)
+
+
+class PipelineLayer:
+    """A security layer with its hooks and timing histograms resolved once."""
+
+    __slots__ = ("name", "impl", "check", "finalize", "handle_error", "request_timer", "response_timer")
+
+    def __init__(self, name: str, impl: Any):
+        self.name = name
+        self.impl = impl
+        self.check = getattr(impl, "check_request", None)
+        self.finalize = getattr(impl, "finalize_headers", None)
+        self.handle_error = getattr(impl, "handle_error", None)
+        self.request_timer = security_pipeline_layer_duration_seconds.labels(layer=name, phase="request")
+        self.response_timer = security_pipeline_layer_duration_seconds.labels(layer=name, phase="response")
+
+    def applies_to(self, path: str) -> bool:
+        applies_to = getattr(self.impl, "applies_to", None)
+        return True if applies_to is None else bool(applies_to(path))
+
+
+class _SharedReceive:
+    """Records the messages layers read from receive and replays them to the app."""
+
+    __slots__ = ("_receive", "_buffered")
+
+    def __init__(self, receive: Receive):
+        self._receive = receive
+        self._buffered: List[Message] = []
+
+    async def read(self) -> Message:
+        message = await self._receive()
+        self._buffered.append(message)
+        return message
+
+    async def replay(self) -> Message:
+        if self._buffered:
+            return self._buffered.pop(0)
+        return await self._receive()
+
+
+class SecurityPipelineMiddleware:
+    """
+    Pure-ASGI middleware running the security layers from per-path plans.
+
+    Request hooks run outermost first. When a layer returns a response, the
+    layers inside it are skipped and the response headers are finalized by
+    the layers outside it, as they would have been by nested middleware.
+    """
+
+    MAX_PLANS = 4096
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Optional[Iterable[Any]] = None,
+        layers: Optional[Sequence[Tuple[str, Any]]] = None,
+        max_plans: int = MAX_PLANS,
+    ):
+        """
+        Args:
+            app: ASGI application
+            routes: Application routes whose plans are compiled up front
+            layers: (name, layer) pairs, outermost first; defaults to DEFAULT_LAYERS
+            max_plans: Maximum number of memoized plans
+        """
+        self.app = app
+        if layers is None:
+            layers = [(name, layer_cls(None)) for name, layer_cls in DEFAULT_LAYERS]
+        self.layers = [PipelineLayer(name, impl) for name, impl in layers]
+        self.max_plans = max_plans
+        self._plans: Dict[str, Tuple[PipelineLayer, ...]] = {}
+
+        static_paths = [
+            route.path for route in routes or ()
+            if isinstance(getattr(route, "path", None), str) and "{" not in route.path
+        ]
+        for path in static_paths:
+            self.plan_for(path)
+        logger.info(
+            "Security pipeline compiled",
+            extra={
+                "operation": "security_pipeline_compiled",
+                "layers": [layer.name for layer in self.layers],
+                "plans": len(self._plans),
+            }
+        )
+
+    def plan_for(self, path: str) -> Tuple[PipelineLayer, ...]:
+        """The layers that apply to path, outermost first."""
+        plan = self._plans.get(path)
+        if plan is None:
+            plan = tuple(layer for layer in self.layers if layer.applies_to(path))
+            if len(self._plans) < self.max_plans:
+                self._plans[path] = plan
+        return plan
+
+    def layer_names(self, path: str) -> List[str]:
+        return [layer.name for layer in self.plan_for(path)]
+
+    def reset(self):
+        """Drop compiled plans, e.g. after configuration changes."""
+        self._plans.clear()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        plan = self.plan_for(scope["path"])
+        if not plan:
+            await self.app(scope, receive, send)
+            return
+
+        shared = _SharedReceive(receive)
+        request = Request(scope, shared.read)
+        # Layers whose request hooks have passed finalize the response
+        passed = 0
+        response_started = False
+
+        async def send_finalized(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                headers = MutableHeaders(scope=message)
+                for layer in reversed(plan[:passed]):
+                    if layer.finalize is not None:
+                        started = time.perf_counter()
+                        layer.finalize(request, headers)
+                        layer.response_timer.observe(time.perf_counter() - started)
+            await send(message)
+
+        for index, layer in enumerate(plan):
+            if layer.check is None:
+                continue
+            started = time.perf_counter()
+            response = await layer.check(request)
+            layer.request_timer.observe(time.perf_counter() - started)
+            if response is not None:
+                passed = index
+                await response(scope, shared.replay, send_finalized)
+                return
+
+        passed = len(plan)
+        try:
+            await self.app(scope, shared.replay, send_finalized)
+        except Exception as e:
+            if response_started:
+                raise
+            # The innermost layer that handles errors answers for the app
+            for index in range(len(plan) - 1, -1, -1):
+                handle_error = plan[index].handle_error
+                response = handle_error(request, e) if handle_error is not None else None
+                if response is not None:
+                    passed = index
+                    await response(scope, shared.replay, send_finalized)
+                    return
+            raise
@@ -256,6 +256,17 @@ class CommitDiff(BaseModel):
     stats: Dict[str, int] = Field(default_factory=dict, description="Diff statistics")
 
 
+class CommitDiffPage(BaseModel):
+    """One page of differences between two commits, ordered by object name."""
+    model_config = ConfigDict(validate_assignment=True)
+    
+    from_commit: str = Field(description="Source commit hash")
+    to_commit: str = Field(description="Target commit hash")
+    object_diffs: List[ObjectDiff] = Field(default_factory=list, description="Object differences")
+    stats: Dict[str, int] = Field(default_factory=dict, description="Statistics of this page")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor of the next page, None on the last page")
+
+
 class MergeConflict(BaseModel):
     """Merge conflict information."""
     model_config = ConfigDict(validate_assignment=True)
@@ -6,13 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
 import io
-import qrcode
-from cairosvg import svg2png
 
 from ..storage import upload_and_sign, presigned_url, get_s3_client
 from ..metrics import report_build_duration_seconds
@@ -42,6 +36,14 @@ def build_shop_package_pdf(project_id: int, out_pdf_path: str) -> Dict:
     # Basit PDF iskeleti; görsel/tablolar için sonraki iterasyon
     from time import perf_counter
 
+    # PDF/QR/SVG kütüphaneleri yalnızca paket üretilirken yüklenir
+    import qrcode
+    from cairosvg import svg2png
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
     t0 = perf_counter()
     p = Path(out_pdf_path)
     p.parent.mkdir(parents=True, exist_ok=True)
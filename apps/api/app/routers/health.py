@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Response, status, Request, Depends
 import redis
-import boto3
 
 from ..config import settings
+from ..core.lazy_loading import lazy_module
 from ..db import check_db, check_redis, get_redis
 from ..schemas import HealthStatus
 
+boto3 = lazy_module("boto3")
+
 try:
     import structlog
     from ..services.s3 import get_s3_service
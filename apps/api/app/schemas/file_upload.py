@@ -14,7 +14,7 @@ import os
 import re
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Final
+from typing import Any, Dict, List, Optional, Final
 
 from pydantic import BaseModel, Field, HttpUrl, validator, conint, constr
 
@@ -88,7 +88,7 @@ class UploadInitRequest(BaseModel):
         description=f"File size in bytes (max {MAX_UPLOAD_SIZE // (1024*1024)}MB)"
     )
     
-    sha256: constr(regex=SHA256_PATTERN, to_lower=True) = Field(
+    sha256: constr(pattern=SHA256_PATTERN, to_lower=True) = Field(
         ...,
         description="SHA256 hash of file content (lowercase hex)"
     )
@@ -98,7 +98,7 @@ class UploadInitRequest(BaseModel):
         description="MIME content type"
     )
     
-    job_id: constr(regex="^[a-zA-Z0-9][a-zA-Z0-9_-]{0,98}[a-zA-Z0-9]$") = Field(
+    job_id: constr(pattern="^[a-zA-Z0-9][a-zA-Z0-9_-]{0,98}[a-zA-Z0-9]$") = Field(
         ...,
         description="Associated job ID"
     )
@@ -211,7 +211,7 @@ class UploadInitResponse(BaseModel):
         description="Unique upload session ID"
     )
     
-    conditions: Dict[str, any] = Field(
+    conditions: Dict[str, Any] = Field(
         default_factory=dict,
         description="Upload conditions and constraints"
     )
@@ -364,7 +364,7 @@ class FileDownloadResponse(BaseModel):
         description="URL expiry in seconds"
     )
     
-    file_info: Dict[str, any] = Field(
+    file_info: Dict[str, Any] = Field(
         ...,
         description="File metadata"
     )
@@ -418,7 +418,7 @@ class UploadError(BaseModel):
         description="Error message in Turkish"
     )
     
-    details: Optional[Dict[str, any]] = Field(
+    details: Optional[Dict[str, Any]] = Field(
         None,
         description="Additional error details"
     )
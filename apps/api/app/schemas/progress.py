@@ -117,7 +117,7 @@ class ProgressMessageV2(BaseModel):
     
     # Core fields (always present)
     job_id: int = Field(..., description="Job ID being processed")
-    event_id: int = Field(..., description="Monotonic event ID per job")
+    event_id: Optional[int] = Field(None, description="Event ID per job, derived from its progress stream entry ID")
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     # Schema and version info
@@ -232,8 +232,9 @@ class ProgressMessageV2(BaseModel):
         if self.progress_pct is None and self.items_done is not None and self.items_total:
             self.progress_pct = min(100, int((self.items_done / self.items_total) * 100))
         
-        # Set milestone for important phase transitions
-        if self.phase in [Phase.START, Phase.END]:
+        # Set milestone for important phase transitions (only when it changes:
+        # with validate_assignment every assignment re-runs this validator)
+        if self.phase in [Phase.START, Phase.END] and not self.milestone:
             self.milestone = True
         
         # Set operation_group based on event_type if not set
@@ -0,0 +1,361 @@
+"""
+Audit Hash-Chain Writer (Task 3.11)
+
+The single place where audit entries get their position in the hash chain.
+
+- ``append_to_chain`` appends entries inside the caller's transaction. The
+  first append of a transaction takes a PostgreSQL transaction-scoped
+  advisory lock and reads the chain tip once; later appends in the same
+  transaction reuse the cached tip, so concurrent writers can no longer
+  fork the chain and repeated appends cost no extra queries.
+- ``AuditChainWriter`` buffers fire-and-forget entries (logins, job events)
+  and writes them in batches from one background thread: one lock, one tip
+  read and one bulk insert per batch. Submitting never blocks (it is called
+  from the event loop); when the buffer is full the entry is rejected and
+  its Future fails with AuditQueueFullError.
+
+Job entries (``job_event`` set) also extend their per-job chain, stored as
+``prev_hash``/``chain_hash`` in the entry's ``data``, in the same pass.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import Session
+
+from ..core.environment import environment as settings
+from ..core.logging import get_logger
+from ..models.audit_log import AuditLog
+
+logger = get_logger(__name__)
+
+# Stable across processes (Python's hash() is not), positive int32
+AUDIT_CHAIN_LOCK_ID = int.from_bytes(hashlib.md5(b"audit_logs_chain").digest()[:4], byteorder="big") & 0x7FFFFFFF
+
+JOB_CHAIN_FIELDS = ("chain_hash", "prev_hash")
+
+_SESSION_STATE_KEY = "audit_chain_state"
+_SESSION_LISTENING_KEY = "audit_chain_listening"
+
+
+@dataclass
+class PendingAuditEntry:
+    """Masked, canonical audit entry waiting for its position in the chain."""
+
+    event_type: str
+    scope_type: str
+    payload: Optional[Dict[str, Any]]
+    scope_id: Optional[int] = None
+    actor_user_id: Optional[int] = None
+    correlation_id: Optional[str] = None
+    session_id: Optional[str] = None
+    resource: Optional[str] = None
+    ip_masked: Optional[str] = None
+    ua_masked: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    classification: Any = None
+    # Short job event type (see JOB_EVENT_TYPES); extends the per-job chain
+    job_event: Optional[str] = None
+
+    def to_model(self, prev_hash: str) -> AuditLog:
+        return AuditLog(
+            event_type=self.event_type,
+            scope_type=self.scope_type,
+            scope_id=self.scope_id,
+            actor_user_id=self.actor_user_id,
+            correlation_id=self.correlation_id,
+            session_id=self.session_id,
+            resource=self.resource,
+            ip_masked=self.ip_masked,
+            ua_masked=self.ua_masked,
+            payload=self.payload,
+            prev_chain_hash=prev_hash,
+            chain_hash=AuditLog.compute_chain_hash(prev_hash, self.payload),
+            created_at=self.created_at
+        )
+
+
+def job_chain_data(payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the dict holding a job entry's chain fields (``data``, or the payload itself for old rows)."""
+    if not payload:
+        return {}
+    data = payload.get("data")
+    if isinstance(data, dict) and "chain_hash" in data:
+        return data
+    return payload
+
+
+@dataclass
+class _ChainState:
+    tip: str
+    job_tips: Dict[int, str] = field(default_factory=dict)
+
+
+def _drop_state(session: Session, *args):
+    session.info.pop(_SESSION_STATE_KEY, None)
+
+
+def _chain_state(db: Session) -> _ChainState:
+    """Lock the chain for this transaction and return the cached tip."""
+    state = db.info.get(_SESSION_STATE_KEY)
+    if state is not None:
+        return state
+
+    if not db.info.get(_SESSION_LISTENING_KEY):
+        # The lock ends with the transaction, and so does the cached tip
+        event.listen(db, "after_commit", _drop_state)
+        event.listen(db, "after_soft_rollback", _drop_state)
+        db.info[_SESSION_LISTENING_KEY] = True
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": AUDIT_CHAIN_LOCK_ID})
+
+    tip = db.execute(
+        select(AuditLog.chain_hash).order_by(AuditLog.id.desc()).limit(1)
+    ).scalar()
+    state = _ChainState(tip=tip or AuditLog.get_genesis_hash())
+    db.info[_SESSION_STATE_KEY] = state
+    return state
+
+
+def _read_job_tips(db: Session, job_ids: Iterable[int]) -> Dict[int, str]:
+    """Latest job-chain hash per job, one query for all jobs in a batch."""
+    job_ids = list(job_ids)
+    latest = (
+        select(func.max(AuditLog.id))
+        .where(AuditLog.scope_type == "job", AuditLog.scope_id.in_(job_ids))
+        .group_by(AuditLog.scope_id)
+    )
+    rows = db.execute(
+        select(AuditLog.scope_id, AuditLog.payload).where(AuditLog.id.in_(latest))
+    ).all()
+    tips = {job_id: AuditLog.get_genesis_hash() for job_id in job_ids}
+    for job_id, payload in rows:
+        tips[job_id] = job_chain_data(payload).get("chain_hash") or AuditLog.get_genesis_hash()
+    return tips
+
+
+def _assign_job_chain(entry: PendingAuditEntry, job_tips: Dict[int, str]) -> None:
+    from .job_audit_service import JobAuditService
+
+    data = entry.payload.setdefault("data", {})
+    clean = {k: v for k, v in data.items() if k not in JOB_CHAIN_FIELDS}
+    prev_hash = job_tips[entry.scope_id]
+    chain_hash = JobAuditService.compute_job_chain_hash(
+        prev_hash=prev_hash,
+        job_id=entry.scope_id,
+        event_type=entry.job_event,
+        payload=clean
+    )
+    data["prev_hash"] = prev_hash
+    data["chain_hash"] = chain_hash
+    job_tips[entry.scope_id] = chain_hash
+
+
+def append_to_chain(db: Session, entries: List[PendingAuditEntry]) -> List[AuditLog]:
+    """
+    Append entries to the audit chain in the caller's transaction.
+
+    The caller commits. Entries are chained in list order and flushed in
+    one bulk insert.
+    """
+    if not entries:
+        return []
+    state = _chain_state(db)
+    try:
+        missing = {
+            e.scope_id for e in entries
+            if e.job_event and e.scope_id is not None and e.scope_id not in state.job_tips
+        }
+        if missing:
+            state.job_tips.update(_read_job_tips(db, missing))
+
+        rows = []
+        for entry in entries:
+            if entry.job_event and entry.scope_id is not None:
+                _assign_job_chain(entry, state.job_tips)
+            row = entry.to_model(state.tip)
+            state.tip = row.chain_hash
+            rows.append(row)
+
+        db.add_all(rows)
+        db.flush()
+        return rows
+    except Exception:
+        # The cached tip may now be ahead of what is in the database
+        _drop_state(db)
+        raise
+
+
+class AuditQueueFullError(RuntimeError):
+    """The chain writer's buffer is full; the entry was not queued."""
+
+
+class AuditChainWriter:
+    """
+    Buffers audit entries and appends them in batches from one thread.
+
+    ``submit`` returns a Future resolved with the new audit log id. A batch
+    that fails is retried entry by entry so one bad entry does not take
+    the rest of the batch with it. Entries submitted while ``max_pending``
+    entries are buffered are rejected rather than waited for.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or settings.AUDIT_CHAIN_BATCH_SIZE
+        self.flush_interval_seconds = (
+            flush_interval_seconds if flush_interval_seconds is not None
+            else settings.AUDIT_CHAIN_FLUSH_INTERVAL_MS / 1000
+        )
+        self._queue: "queue.Queue[Optional[Tuple[PendingAuditEntry, Future]]]" = queue.Queue(
+            maxsize=max_pending or settings.AUDIT_CHAIN_MAX_PENDING
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._stats = {"submitted": 0, "written": 0, "failed": 0, "rejected": 0, "batches": 0}
+
+    def submit(self, entry: PendingAuditEntry) -> Future:
+        """Queue an entry without blocking; the Future fails if the buffer is full."""
+        if self._closed:
+            raise RuntimeError("AuditChainWriter is closed")
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((entry, future))
+        except queue.Full:
+            self._stats["rejected"] += 1
+            logger.error(
+                "audit_chain_queue_full",
+                event_type=entry.event_type,
+                pending=self._queue.qsize()
+            )
+            future.set_exception(AuditQueueFullError("Audit chain writer buffer is full"))
+            return future
+        self._stats["submitted"] += 1
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is written (or failed)."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Write what is buffered and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "pending": self._queue.qsize()}
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-chain-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _open_session(self) -> Session:
+        if self._session_factory is not None:
+            return self._session_factory()
+        from ..core.database import SessionLocal
+        return SessionLocal()
+
+    def _write_batch(self, batch: List[Tuple[PendingAuditEntry, Future]]):
+        try:
+            ids = self._commit([entry for entry, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                self._stats["failed"] += 1
+                logger.error(
+                    "audit_chain_write_failed",
+                    event_type=batch[0][0].event_type,
+                    error_type=type(e).__name__,
+                    error=str(e)
+                )
+                batch[0][1].set_exception(e)
+                return
+            logger.warning("audit_chain_batch_failed", size=len(batch), error=str(e))
+            for item in batch:
+                self._write_batch([item])
+            return
+
+        self._stats["batches"] += 1
+        self._stats["written"] += len(ids)
+        for (_, future), audit_id in zip(batch, ids):
+            future.set_result(audit_id)
+
+    def _commit(self, entries: List[PendingAuditEntry]) -> List[int]:
+        db = self._open_session()
+        try:
+            rows = append_to_chain(db, entries)
+            ids = [row.id for row in rows]
+            db.commit()
+            return ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Process-wide writer; the thread starts on first submit
+audit_chain_writer = AuditChainWriter()
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import hashlib
 import json
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Union
 
@@ -28,6 +29,11 @@ from ..helpers.audit_chain import AuditChainHelper, AuditChainJSONHelper
 from ..middleware.correlation_middleware import get_correlation_id, get_session_id
 from ..models.audit_log import AuditLog
 from ..models.user import User
+from ..services.audit_chain_writer import (
+    PendingAuditEntry,
+    append_to_chain,
+    audit_chain_writer,
+)
 from ..services.pii_masking_service import (
     DataClassification, 
     MaskingLevel, 
@@ -47,6 +53,108 @@ class AuditService:
         self.default_classification = DataClassification.PERSONAL
         self.max_payload_size = 10 * 1024  # 10KB max payload
         
+    def prepare_audit_entry(
+        self,
+        event_type: str,
+        user_id: Optional[int] = None,
+        scope_type: str = "system",
+        scope_id: Optional[int] = None,
+        resource: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        classification: DataClassification = DataClassification.PERSONAL,
+        correlation_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> PendingAuditEntry:
+        """Mask and canonicalize an audit entry before it is appended to the chain.
+        
+        Args:
+            event_type: Type of event being audited
+            user_id: ID of user performing action
+            scope_type: Audit scope type (user, job, financial, etc.)
+            scope_id: Audit scope identifier
+            resource: Resource being accessed/modified
+            ip_address: Client IP address (will be masked)
+            user_agent: Client user agent (will be masked)
+            payload: Additional audit data
+            classification: Data classification for masking level
+            correlation_id: Request correlation ID
+            session_id: User session ID
+            
+        Returns:
+            Entry ready for append_to_chain or the batched writer
+        """
+        # Use correlation context if not provided
+        correlation_id = correlation_id or get_correlation_id()
+        session_id = session_id or get_session_id()
+        
+        # Validate and prepare payload
+        if payload and len(json.dumps(payload)) > self.max_payload_size:
+            # Truncate large payloads but preserve metadata
+            payload = {
+                "truncated": True,
+                "original_size": len(json.dumps(payload)),
+                "metadata": payload.get("metadata", {}),
+                "summary": str(payload)[:500] + "..." if len(str(payload)) > 500 else str(payload)
+            }
+        
+        # Apply PII masking to sensitive data
+        masked_ip = None
+        masked_ua = None
+        masked_payload = payload
+        
+        if self.enable_masking:
+            if ip_address:
+                masked_ip = pii_masking_service.mask_ip_address(
+                    ip_address, 
+                    MaskingLevel.MEDIUM
+                )
+            
+            if user_agent:
+                masked_ua = pii_masking_service.mask_user_agent(
+                    user_agent,
+                    MaskingLevel.LIGHT
+                )
+            
+            if payload:
+                masked_payload = pii_masking_service.create_masked_metadata(
+                    payload,
+                    classification,
+                    preserve_keys=["timestamp", "event_id", "version"]
+                )
+        
+        # Prepare canonical payload for hash calculation
+        canonical_payload = {
+            "event_type": event_type,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "scope_type": scope_type,
+            "scope_id": scope_id,
+            "user_id": user_id,
+            "correlation_id": correlation_id,
+            "session_id": session_id,
+            "resource": resource,
+            "data": masked_payload
+        }
+        
+        # Remove None values for canonical representation
+        canonical_payload = {k: v for k, v in canonical_payload.items() if v is not None}
+        
+        return PendingAuditEntry(
+            event_type=event_type,
+            scope_type=scope_type,
+            scope_id=scope_id,
+            actor_user_id=user_id,
+            correlation_id=correlation_id,
+            session_id=session_id,
+            resource=resource,
+            ip_masked=masked_ip,
+            ua_masked=masked_ua,
+            payload=canonical_payload,
+            created_at=datetime.now(timezone.utc),
+            classification=classification
+        )
+    
     async def create_audit_entry(
         self,
         db: Session,
@@ -64,6 +172,10 @@ class AuditService:
     ) -> AuditLog:
         """Create comprehensive audit log entry with hash-chain integrity.
         
+        The entry is appended in the caller's transaction; the chain is
+        locked until that transaction ends. Use enqueue_audit_entry for
+        events that do not need to commit with the caller's changes.
+        
         Args:
             db: Database session
             event_type: Type of event being audited
@@ -86,98 +198,20 @@ class AuditService:
             ValueError: If audit data is invalid
         """
         try:
-            # Use correlation context if not provided
-            correlation_id = correlation_id or get_correlation_id()
-            session_id = session_id or get_session_id()
-            
-            # Validate and prepare payload
-            if payload and len(json.dumps(payload)) > self.max_payload_size:
-                # Truncate large payloads but preserve metadata
-                payload = {
-                    "truncated": True,
-                    "original_size": len(json.dumps(payload)),
-                    "metadata": payload.get("metadata", {}),
-                    "summary": str(payload)[:500] + "..." if len(str(payload)) > 500 else str(payload)
-                }
-            
-            # Apply PII masking to sensitive data
-            masked_ip = None
-            masked_ua = None
-            masked_payload = payload
-            
-            if self.enable_masking:
-                if ip_address:
-                    masked_ip = pii_masking_service.mask_ip_address(
-                        ip_address, 
-                        MaskingLevel.MEDIUM
-                    )
-                
-                if user_agent:
-                    masked_ua = pii_masking_service.mask_user_agent(
-                        user_agent,
-                        MaskingLevel.LIGHT
-                    )
-                
-                if payload:
-                    masked_payload = pii_masking_service.create_masked_metadata(
-                        payload,
-                        classification,
-                        preserve_keys=["timestamp", "event_id", "version"]
-                    )
-            
-            # Get previous audit entry for hash chain
-            prev_entry = db.query(AuditLog).order_by(desc(AuditLog.id)).first()
-            prev_hash = prev_entry.chain_hash if prev_entry else AuditLog.get_genesis_hash()
-            
-            # Prepare canonical payload for hash calculation
-            canonical_payload = {
-                "event_type": event_type,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "scope_type": scope_type,
-                "scope_id": scope_id,
-                "user_id": user_id,
-                "correlation_id": correlation_id,
-                "session_id": session_id,
-                "resource": resource,
-                "data": masked_payload
-            }
-            
-            # Remove None values for canonical representation
-            canonical_payload = {k: v for k, v in canonical_payload.items() if v is not None}
-            
-            # Compute hash chain
-            chain_hash = AuditLog.compute_chain_hash(prev_hash, canonical_payload)
-            
-            # Create audit log entry
-            audit_entry = AuditLog(
+            entry = self.prepare_audit_entry(
                 event_type=event_type,
+                user_id=user_id,
                 scope_type=scope_type,
                 scope_id=scope_id,
-                actor_user_id=user_id,
-                correlation_id=correlation_id,
-                session_id=session_id,
                 resource=resource,
-                ip_masked=masked_ip,
-                ua_masked=masked_ua,
-                payload=canonical_payload,
-                prev_chain_hash=prev_hash,
-                chain_hash=chain_hash,
-                created_at=datetime.now(timezone.utc)
-            )
-            
-            # Add to database
-            db.add(audit_entry)
-            db.flush()  # Get ID without committing
-            
-            # Log audit creation for monitoring
-            self._log_audit_creation(
-                audit_entry.id,
-                event_type,
-                classification,
-                correlation_id
+                ip_address=ip_address,
+                user_agent=user_agent,
+                payload=payload,
+                classification=classification,
+                correlation_id=correlation_id,
+                session_id=session_id
             )
-            
-            return audit_entry
+            return self.append_audit_entries(db, [entry])[0]
             
         except SQLAlchemyError as e:
             logger.error(
@@ -198,6 +232,44 @@ class AuditService:
             )
             raise ValueError(f"Failed to create audit entry: {str(e)}")
     
+    def append_audit_entries(
+        self,
+        db: Session,
+        entries: List[PendingAuditEntry]
+    ) -> List[AuditLog]:
+        """Append prepared entries to the hash chain with one bulk insert.
+        
+        Args:
+            db: Database session (caller commits)
+            entries: Entries from prepare_audit_entry, in chain order
+            
+        Returns:
+            Created audit log entries
+        """
+        audit_entries = append_to_chain(db, entries)
+        for audit_entry, entry in zip(audit_entries, entries):
+            # Log audit creation for monitoring
+            self._log_audit_creation(
+                audit_entry.id,
+                audit_entry.event_type,
+                entry.classification or self.default_classification,
+                audit_entry.correlation_id
+            )
+        return audit_entries
+    
+    def enqueue_audit_entry(self, event_type: str, **kwargs) -> Future:
+        """Queue an audit entry for the batched chain writer.
+        
+        For high-volume events (logins, job transitions) whose audit record
+        does not have to commit atomically with the caller's transaction.
+        Accepts the same arguments as prepare_audit_entry.
+        
+        Returns:
+            Future resolved with the audit log ID once written
+        """
+        entry = self.prepare_audit_entry(event_type=event_type, **kwargs)
+        return audit_chain_writer.submit(entry)
+    
     async def get_audit_logs(
         self,
         db: Session,
@@ -314,7 +386,9 @@ class AuditService:
         db: Session,
         start_id: Optional[int] = None,
         end_id: Optional[int] = None,
-        limit: int = 1000
+        limit: Optional[int] = 1000,
+        workers: Optional[int] = None,
+        checkpoint: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Verify audit chain integrity for a range of entries.
         
@@ -322,14 +396,16 @@ class AuditService:
             db: Database session
             start_id: Starting audit log ID
             end_id: Ending audit log ID
-            limit: Maximum entries to verify
+            limit: Maximum entries to verify (None for the whole range)
+            workers: Verification processes
+            checkpoint: Checkpoint from an earlier report to resume after
             
         Returns:
             Verification report with integrity status
         """
         try:
             verification_result = AuditChainHelper.verify_chain_integrity(
-                db, start_id, end_id, limit
+                db, start_id, end_id, limit, workers=workers, checkpoint=checkpoint
             )
             
             # Log verification result
@@ -339,7 +415,8 @@ class AuditService:
                 verified_count=verification_result["verified_count"],
                 total_checked=verification_result["total_checked"],
                 violations_count=len(verification_result["integrity_violations"]),
-                breaks_count=len(verification_result["chain_breaks"])
+                breaks_count=len(verification_result["chain_breaks"]),
+                checkpoints_count=len(verification_result["checkpoints"])
             )
             
             return verification_result
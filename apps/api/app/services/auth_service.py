@@ -757,9 +757,9 @@ class AuthService:
                 }
             )
             
-            # Also create audit entry for authentication events
-            await audit_service.create_audit_entry(
-                db=db,
+            # Also create audit entry for authentication events; login bursts
+            # go through the batched chain writer instead of this transaction
+            audit_service.enqueue_audit_entry(
                 event_type=f"auth_{event_type.lower()}",
                 user_id=user_id,
                 scope_type="authentication",
@@ -0,0 +1,523 @@
+"""
+Persistent Chunk Store for Incremental Backups (Task 7.26).
+
+Deduplicated backup chunks are packed into append-only segment files
+instead of being kept in memory:
+
+- ``segments/seg-<id>.dat``: raw chunk bytes, appended back to back. A new
+  segment is started once the active one reaches ``segment_size``.
+- ``chunks.db``: SQLite index of chunk id (SHA-256) -> segment, offset,
+  size, CRC-32 and reference count, plus the recipe (snapshot metadata)
+  of every snapshot so chains survive a restart.
+
+Writes are batched: the chunk bytes of a batch are appended and fsync'd
+first, then the index rows and reference counts are committed in one
+transaction. A segment tail written by a batch that never committed is
+truncated when the store is opened again.
+
+Chunks whose reference count drops to zero leave dead bytes behind;
+``compact`` copies the live chunks of mostly-dead sealed segments into the
+active segment and deletes the old files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SEGMENT_SIZE = 256 * 1024 * 1024
+
+# Stay well below SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    crc INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS chunks_segment ON chunks (segment);
+CREATE TABLE IF NOT EXISTS segments (
+    segment INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    live_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_id TEXT NOT NULL UNIQUE,
+    source_id TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class ChunkInfo:
+    """Information about a data chunk."""
+    chunk_id: str               # Unique chunk identifier (hash)
+    offset: int                 # Offset in original data
+    size: int                   # Chunk size in bytes
+    checksum: str              # Content checksum
+    ref_count: int = 1         # Reference count for deduplication
+
+
+class ChunkStoreError(Exception):
+    """Raised when the chunk store cannot be opened, read or updated."""
+    pass
+
+
+def _chunks(items: Sequence[str], size: int = _IN_CHUNK) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SegmentChunkStore:
+    """
+    On-disk chunk store: segment files plus a SQLite index.
+
+    Thread-safe: one connection and one segment writer guarded by a lock;
+    the backup manager calls it from worker threads.
+    """
+
+    def __init__(self, root: Path, segment_size: int = DEFAULT_SEGMENT_SIZE, fsync: bool = True):
+        self.root = Path(root)
+        self.segments_path = self.root / "segments"
+        self.db_path = self.root / "chunks.db"
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._readers: Dict[int, int] = {}
+        self._writer = None
+        self._active: Optional[int] = None
+        self._active_size = 0
+
+    # Lifecycle
+
+    def open(self):
+        """Open (and create) the store, dropping uncommitted segment tails."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            try:
+                self.segments_path.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    str(self.db_path),
+                    timeout=30,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error) as e:
+                raise ChunkStoreError(f"Failed to open chunk store {self.root}: {e}")
+            self._conn = conn
+            self._recover(conn)
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for fd in self._readers.values():
+                os.close(fd)
+            self._readers.clear()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._active = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.open()
+        return self._conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; takes the database write lock up front."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _recover(self, conn: sqlite3.Connection):
+        for segment, size in conn.execute("SELECT segment, size FROM segments").fetchall():
+            path = self._segment_path(segment)
+            if not path.exists():
+                logger.error("Backup chunk segment missing", segment=segment, path=str(path))
+                continue
+            actual = path.stat().st_size
+            if actual > size:
+                # Written by a batch whose index transaction never committed
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+                logger.warning(
+                    "Truncated uncommitted backup segment tail",
+                    segment=segment,
+                    dropped_bytes=actual - size,
+                )
+        row = conn.execute("SELECT segment, size FROM segments ORDER BY segment DESC LIMIT 1").fetchone()
+        if row is not None and row[1] < self.segment_size:
+            self._active, self._active_size = row
+
+    # Segment files
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.segments_path / f"seg-{segment:08d}.dat"
+
+    def _reader(self, segment: int) -> int:
+        fd = self._readers.get(segment)
+        if fd is None:
+            try:
+                fd = os.open(self._segment_path(segment), os.O_RDONLY)
+            except OSError as e:
+                raise ChunkStoreError(f"Backup segment {segment} unreadable: {e}")
+            self._readers[segment] = fd
+        return fd
+
+    def _append(self, conn: sqlite3.Connection, data: bytes) -> Tuple[int, int]:
+        """Append data to the active segment; returns (segment, offset)."""
+        if self._active is None or (self._active_size and self._active_size + len(data) > self.segment_size):
+            if self._active is not None:
+                conn.execute(
+                    "UPDATE segments SET size = ? WHERE segment = ?",
+                    (self._active_size, self._active),
+                )
+            self._seal()
+            row = conn.execute("SELECT COALESCE(MAX(segment), 0) + 1 FROM segments").fetchone()
+            self._active, self._active_size = row[0], 0
+            conn.execute(
+                "INSERT INTO segments (segment, size, live_bytes) VALUES (?, 0, 0)",
+                (self._active,),
+            )
+        if self._writer is None:
+            self._writer = open(self._segment_path(self._active), "ab")
+            self._writer.seek(0, os.SEEK_END)
+            self._writer.truncate(self._active_size)
+        offset = self._active_size
+        self._writer.write(data)
+        self._active_size += len(data)
+        return self._active, offset
+
+    def _sync(self):
+        if self._writer is not None:
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+
+    def _seal(self):
+        if self._writer is not None:
+            self._sync()
+            self._writer.close()
+            self._writer = None
+
+    # Chunks
+
+    def put_chunks(self, pieces: Iterable[Tuple[int, bytes]]) -> List[ChunkInfo]:
+        """
+        Store a batch of (offset, data) chunks, deduplicating by SHA-256.
+
+        Every piece takes one reference, including repeats within the batch.
+        """
+        hashed = [(offset, data, hashlib.sha256(data).hexdigest()) for offset, data in pieces]
+        if not hashed:
+            return []
+
+        with self._lock:
+            conn = self._connection()
+            known: Dict[str, List[Any]] = {}
+            ids = list({chunk_id for _, _, chunk_id in hashed})
+            for batch in _chunks(ids):
+                rows = conn.execute(
+                    f"SELECT chunk_id, size, crc, ref_count FROM chunks "
+                    f"WHERE chunk_id IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for chunk_id, size, crc, ref_count in rows:
+                    known[chunk_id] = [size, crc, ref_count, False]
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                new_rows = []
+                live: Counter = Counter()
+                infos = []
+                for offset, data, chunk_id in hashed:
+                    entry = known.get(chunk_id)
+                    if entry is None:
+                        segment, segment_offset = self._append(conn, data)
+                        crc = zlib.crc32(data)
+                        entry = known[chunk_id] = [len(data), crc, 0, True]
+                        new_rows.append([chunk_id, segment, segment_offset, len(data), crc])
+                        live[segment] += len(data)
+                    entry[2] += 1
+                    infos.append(ChunkInfo(
+                        chunk_id=chunk_id,
+                        offset=offset,
+                        size=entry[0],
+                        checksum=f"{entry[1]:08x}",
+                        ref_count=entry[2],
+                    ))
+
+                # Chunk bytes are durable before the index points at them
+                self._sync()
+                conn.executemany(
+                    "INSERT INTO chunks (chunk_id, segment, offset, size, crc, ref_count) VALUES (?, ?, ?, ?, ?, ?)",
+                    [row + [known[row[0]][2]] for row in new_rows],
+                )
+                conn.executemany(
+                    "UPDATE chunks SET ref_count = ? WHERE chunk_id = ?",
+                    [(entry[2], chunk_id) for chunk_id, entry in known.items() if not entry[3]],
+                )
+                for segment, added in live.items():
+                    conn.execute(
+                        "UPDATE segments SET live_bytes = live_bytes + ? WHERE segment = ?",
+                        (added, segment),
+                    )
+                if self._active is not None:
+                    conn.execute(
+                        "UPDATE segments SET size = ? WHERE segment = ?",
+                        (self._active_size, self._active),
+                    )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._discard_uncommitted(conn)
+                raise
+            conn.execute("COMMIT")
+            return infos
+
+    def _discard_uncommitted(self, conn: sqlite3.Connection):
+        """Forget appends of a rolled-back batch; the next write truncates them."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._active = None
+        self._recover(conn)
+
+    def read_chunks(self, chunk_ids: Sequence[str]) -> Iterator[bytes]:
+        """Yield chunk contents in order; raises ChunkStoreError for missing or corrupt chunks."""
+        # Small batches bound memory; the lock is not held while yielding
+        for batch in _chunks(list(chunk_ids), 64):
+            with self._lock:
+                conn = self._connection()
+                unique = list(set(batch))
+                locations = {
+                    row[0]: row[1:]
+                    for row in conn.execute(
+                        f"SELECT chunk_id, segment, offset, size, crc FROM chunks "
+                        f"WHERE chunk_id IN ({','.join('?' * len(unique))})",
+                        unique,
+                    )
+                }
+                contents = []
+                for chunk_id in batch:
+                    location = locations.get(chunk_id)
+                    if location is None:
+                        raise ChunkStoreError(f"Chunk not found: {chunk_id}")
+                    segment, offset, size, crc = location
+                    data = os.pread(self._reader(segment), size, offset)
+                    if len(data) != size or zlib.crc32(data) != crc:
+                        raise ChunkStoreError(f"Chunk corrupt: {chunk_id} in segment {segment}")
+                    contents.append(data)
+            yield from contents
+
+    def read_chunk(self, chunk_id: str) -> Optional[bytes]:
+        try:
+            return next(self.read_chunks([chunk_id]))
+        except ChunkStoreError:
+            return None
+
+    def missing(self, chunk_ids: Iterable[str]) -> List[str]:
+        """Chunk ids (of the given ones) that are not in the store."""
+        ids = list(dict.fromkeys(chunk_ids))
+        present = set()
+        with self._lock:
+            conn = self._connection()
+            for batch in _chunks(ids):
+                present.update(
+                    row[0] for row in conn.execute(
+                        f"SELECT chunk_id FROM chunks WHERE chunk_id IN ({','.join('?' * len(batch))})",
+                        batch,
+                    )
+                )
+        return [chunk_id for chunk_id in ids if chunk_id not in present]
+
+    def add_references(self, chunk_ids: Iterable[str]):
+        """Take one more reference on each listed chunk (repeats count)."""
+        counts = Counter(chunk_ids)
+        with self._transaction() as conn:
+            for chunk_id, count in counts.items():
+                cursor = conn.execute(
+                    "UPDATE chunks SET ref_count = ref_count + ? WHERE chunk_id = ?",
+                    (count, chunk_id),
+                )
+                if cursor.rowcount != 1:
+                    raise ChunkStoreError(f"Chunk not found: {chunk_id}")
+
+    def release(self, chunk_ids: Iterable[str]) -> int:
+        """Drop one reference per listed chunk; returns the number of chunks freed."""
+        with self._transaction() as conn:
+            return self._release(conn, chunk_ids)
+
+    def _release(self, conn: sqlite3.Connection, chunk_ids: Iterable[str]) -> int:
+        counts = Counter(chunk_ids)
+        conn.executemany(
+            "UPDATE chunks SET ref_count = ref_count - ? WHERE chunk_id = ?",
+            [(count, chunk_id) for chunk_id, count in counts.items()],
+        )
+        freed = 0
+        dead_bytes: Counter = Counter()
+        for batch in _chunks(list(counts)):
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT segment, size FROM chunks WHERE ref_count <= 0 AND chunk_id IN ({placeholders})",
+                batch,
+            ).fetchall()
+            for segment, size in rows:
+                dead_bytes[segment] += size
+            conn.execute(f"DELETE FROM chunks WHERE ref_count <= 0 AND chunk_id IN ({placeholders})", batch)
+            freed += len(rows)
+        for segment, size in dead_bytes.items():
+            conn.execute(
+                "UPDATE segments SET live_bytes = live_bytes - ? WHERE segment = ?",
+                (size, segment),
+            )
+        return freed
+
+    def compact(self, min_live_ratio: float = 0.5) -> int:
+        """
+        Rewrite sealed segments whose live bytes fell below min_live_ratio.
+
+        Returns:
+            Bytes of segment files reclaimed
+        """
+        reclaimed = 0
+        with self._lock:
+            conn = self._connection()
+            candidates = [
+                (segment, size)
+                for segment, size, live in conn.execute("SELECT segment, size, live_bytes FROM segments")
+                if segment != self._active and size > 0 and live < size * min_live_ratio
+            ]
+            for segment, size in candidates:
+                rows = conn.execute(
+                    "SELECT chunk_id, offset, size, crc FROM chunks WHERE segment = ? ORDER BY offset",
+                    (segment,),
+                ).fetchall()
+                fd = self._reader(segment)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    moved = []
+                    for chunk_id, offset, chunk_size, crc in rows:
+                        data = os.pread(fd, chunk_size, offset)
+                        if zlib.crc32(data) != crc:
+                            raise ChunkStoreError(f"Chunk corrupt: {chunk_id} in segment {segment}")
+                        new_segment, new_offset = self._append(conn, data)
+                        moved.append((new_segment, new_offset, chunk_id))
+                        conn.execute(
+                            "UPDATE segments SET live_bytes = live_bytes + ? WHERE segment = ?",
+                            (chunk_size, new_segment),
+                        )
+                    self._sync()
+                    conn.executemany("UPDATE chunks SET segment = ?, offset = ? WHERE chunk_id = ?", moved)
+                    conn.execute(
+                        "UPDATE segments SET size = ? WHERE segment = ?",
+                        (self._active_size, self._active),
+                    )
+                    conn.execute("DELETE FROM segments WHERE segment = ?", (segment,))
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    self._discard_uncommitted(conn)
+                    raise
+                conn.execute("COMMIT")
+
+                os.close(self._readers.pop(segment))
+                self._segment_path(segment).unlink(missing_ok=True)
+                reclaimed += size - sum(row[2] for row in rows)
+                logger.info("Backup segment compacted", segment=segment, live_chunks=len(rows))
+        return reclaimed
+
+    # Snapshot recipes
+
+    def save_snapshot(self, snapshot_id: str, source_id: str, payload: str):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO snapshots (snapshot_id, source_id, payload) VALUES (?, ?, ?) "
+                "ON CONFLICT (snapshot_id) DO UPDATE SET payload = excluded.payload",
+                (snapshot_id, source_id, payload),
+            )
+
+    def load_snapshot(self, snapshot_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT payload FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def iter_snapshots(self) -> List[Tuple[str, str, str]]:
+        """(source_id, snapshot_id, payload) of every snapshot, oldest first."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT source_id, snapshot_id, payload FROM snapshots ORDER BY seq"
+            ).fetchall()
+
+    def drop_snapshot(self, snapshot_id: str, chunk_ids: Iterable[str]) -> int:
+        """Delete a snapshot recipe and release its chunks in one transaction."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM snapshots WHERE snapshot_id = ?", (snapshot_id,))
+            return self._release(conn, chunk_ids)
+
+    # Statistics
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get chunk store statistics."""
+        with self._lock:
+            conn = self._connection()
+            total_chunks, total_size, total_refs = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(ref_count), 0) FROM chunks"
+            ).fetchone()
+            segments, segment_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM segments"
+            ).fetchone()
+
+        return {
+            "total_chunks": total_chunks,
+            "total_size_bytes": total_size,
+            "total_references": total_refs,
+            "average_chunk_size": total_size / total_chunks if total_chunks > 0 else 0,
+            "dedup_ratio": total_refs / total_chunks if total_chunks > 0 else 1.0,
+            "segments": segments,
+            "segment_bytes": segment_bytes,
+        }
+
+
+__all__ = [
+    "DEFAULT_SEGMENT_SIZE",
+    "ChunkInfo",
+    "ChunkStoreError",
+    "SegmentChunkStore",
+]
@@ -8,6 +8,8 @@ Provides parallel batch processing with:
 - Result aggregation and reporting
 - Error recovery and retry logic
 - Resource management and throttling
+- Streaming mode with a bounded in-flight window, an on-disk result log
+  and resume from the last checkpoint
 """
 
 from __future__ import annotations
@@ -24,7 +26,10 @@ from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Generic
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Generic, Iterable,
+    Iterator, List, Optional, Tuple, TypeVar, Union
+)
 
 import redis.asyncio as aioredis
 from pydantic import BaseModel, Field, field_validator
@@ -116,8 +121,8 @@ class ProgressTracker:
         self.redis = redis_client
         self._local_progress: Dict[str, Dict[str, Any]] = {}
     
-    async def init_batch(self, batch_id: str, total_items: int) -> None:
-        """Initialize batch progress."""
+    async def init_batch(self, batch_id: str, total_items: Optional[int]) -> None:
+        """Initialize batch progress; ``total_items`` is None for streams."""
         progress_data = {
             "batch_id": batch_id,
             "total": total_items,
@@ -133,11 +138,13 @@ class ProgressTracker:
         if self.redis:
             try:
                 # Use JSON serialization for all values to properly handle None as null
-                await self.redis.hset(
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hset(
                     f"batch:progress:{batch_id}",
                     mapping={k: json.dumps(v) for k, v in progress_data.items()}
                 )
-                await self.redis.expire(f"batch:progress:{batch_id}", 86400)  # 24 hours
+                pipe.expire(f"batch:progress:{batch_id}", 86400)  # 24 hours
+                await pipe.execute()
             except Exception as e:
                 logger.warning(f"Redis bağlantı hatası, yerel takip kullanılıyor: {e}")
                 self._local_progress[batch_id] = progress_data
@@ -152,38 +159,44 @@ class ProgressTracker:
         failed: int = 0,
         skipped: int = 0,
         current_item: Optional[str] = None,
-        status: Optional[BatchStatus] = None
+        status: Optional[BatchStatus] = None,
+        fields: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Update batch progress."""
+        """Update batch progress in one pipelined round-trip.
+        
+        ``fields`` are extra values stored as-is, e.g. checkpoint details.
+        """
         if self.redis:
             try:
-                updates = {}
-                if processed > 0:
-                    await self.redis.hincrby(f"batch:progress:{batch_id}", "processed", processed)
-                if successful > 0:
-                    await self.redis.hincrby(f"batch:progress:{batch_id}", "successful", successful)
-                if failed > 0:
-                    await self.redis.hincrby(f"batch:progress:{batch_id}", "failed", failed)
-                if skipped > 0:
-                    await self.redis.hincrby(f"batch:progress:{batch_id}", "skipped", skipped)
+                key = f"batch:progress:{batch_id}"
+                pipe = self.redis.pipeline(transaction=False)
+                for name, delta in (
+                    ("processed", processed),
+                    ("successful", successful),
+                    ("failed", failed),
+                    ("skipped", skipped),
+                ):
+                    if delta > 0:
+                        pipe.hincrby(key, name, delta)
+                
+                updates = {k: json.dumps(v) for k, v in (fields or {}).items()}
                 if current_item is not None:
                     updates["current_item"] = json.dumps(current_item)
                 if status is not None:
                     updates["status"] = json.dumps(status.value)
-                
                 if updates:
-                    await self.redis.hset(
-                        f"batch:progress:{batch_id}",
-                        mapping=updates
-                    )
+                    pipe.hset(key, mapping=updates)
+                
+                if len(pipe):
+                    await pipe.execute()
             except Exception as e:
                 logger.warning(f"Redis güncelleme hatası: {e}")
                 self._update_local_progress(
-                    batch_id, processed, successful, failed, skipped, current_item, status
+                    batch_id, processed, successful, failed, skipped, current_item, status, fields
                 )
         else:
             self._update_local_progress(
-                batch_id, processed, successful, failed, skipped, current_item, status
+                batch_id, processed, successful, failed, skipped, current_item, status, fields
             )
     
     def _update_local_progress(
@@ -194,11 +207,13 @@ class ProgressTracker:
         failed: int,
         skipped: int,
         current_item: Optional[str],
-        status: Optional[BatchStatus]
+        status: Optional[BatchStatus],
+        fields: Optional[Dict[str, Any]] = None
     ) -> None:
         """Update local progress tracking."""
         if batch_id in self._local_progress:
             progress = self._local_progress[batch_id]
+            progress.update(fields or {})
             progress["processed"] += processed
             progress["successful"] += successful
             progress["failed"] += failed
@@ -239,9 +254,208 @@ class ProgressTracker:
         return self._local_progress.get(batch_id)
 
 
+class ProgressAccumulator:
+    """Sum per-item progress locally and flush it to the tracker periodically.
+    
+    Replaces two tracker calls per item with one call per flush interval;
+    readers of the progress hash see counters at most one interval old.
+    """
+    
+    def __init__(
+        self,
+        tracker: ProgressTracker,
+        batch_id: str,
+        enabled: bool = True,
+        flush_interval_s: Optional[float] = None
+    ):
+        self.tracker = tracker
+        self.batch_id = batch_id
+        self.enabled = enabled
+        self.flush_interval_s = (
+            settings.BATCH_PROGRESS_FLUSH_INTERVAL_SECONDS
+            if flush_interval_s is None else flush_interval_s
+        )
+        self.successful = 0
+        self.failed = 0
+        self.current_item: Optional[str] = None
+        self._last_flush = time.monotonic()
+    
+    @property
+    def due(self) -> bool:
+        """Whether the flush interval has elapsed."""
+        return time.monotonic() - self._last_flush >= self.flush_interval_s
+    
+    def record(self, item_id: str, successful: bool) -> None:
+        """Count one finished item."""
+        if successful:
+            self.successful += 1
+        else:
+            self.failed += 1
+        self.current_item = item_id
+    
+    async def maybe_flush(self) -> None:
+        """Flush if the interval has elapsed."""
+        if self.due:
+            await self.flush()
+    
+    async def flush(
+        self,
+        status: Optional[BatchStatus] = None,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Write the pending counters, status and fields in one update."""
+        self._last_flush = time.monotonic()
+        successful, failed, current_item = self.successful, self.failed, self.current_item
+        self.successful = self.failed = 0
+        self.current_item = None
+        if not self.enabled:
+            return
+        if successful or failed or current_item or status or fields:
+            await self.tracker.update_progress(
+                self.batch_id,
+                processed=successful + failed,
+                successful=successful,
+                failed=failed,
+                current_item=current_item,
+                status=status,
+                fields=fields
+            )
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise result values the json module cannot encode natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class ResultLogState:
+    """Stream positions and outcome counts already recorded in a result log.
+    
+    Positions are kept as a low watermark (every position below it is
+    recorded) plus the recorded positions above it. Items complete roughly
+    in order, so the set stays about as small as the in-flight window.
+    """
+    
+    def __init__(self):
+        self.watermark = 0
+        self.successful = 0
+        self.failed = 0
+        self._above: set = set()
+    
+    @property
+    def processed(self) -> int:
+        return self.successful + self.failed
+    
+    def __contains__(self, seq: int) -> bool:
+        return seq < self.watermark or seq in self._above
+    
+    def add(self, seq: int, successful: bool) -> None:
+        """Record the outcome of the item at stream position ``seq``."""
+        if seq in self:
+            return
+        if successful:
+            self.successful += 1
+        else:
+            self.failed += 1
+        self._above.add(seq)
+        while self.watermark in self._above:
+            self._above.remove(self.watermark)
+            self.watermark += 1
+
+
+class ResultLog:
+    """Append-only JSONL log of item outcomes for one batch.
+    
+    One line per finished item, in completion order::
+    
+        {"seq": 17, "id": "...", "ok": true, "result": ...}
+        {"seq": 18, "id": "...", "ok": false, "error": "..."}
+    
+    ``seq`` is the item's position in the input stream, which is what a
+    resumed batch uses to skip finished items.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+    
+    @classmethod
+    def for_batch(cls, batch_id: str, directory: Optional[Union[str, Path]] = None) -> ResultLog:
+        """Log at ``<directory>/<batch_id>.jsonl`` (default BATCH_RESULT_LOG_DIR)."""
+        return cls(Path(directory or settings.BATCH_RESULT_LOG_DIR) / f"{batch_id}.jsonl")
+    
+    def open(self) -> ResultLogState:
+        """Open for appending and return what earlier runs already logged.
+        
+        A last line torn by a crash mid-write is cut off, so appends start
+        on a clean line and that item simply runs again.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        state = ResultLogState()
+        if self.path.exists():
+            valid_bytes = 0
+            for record, size in self._scan(self.path):
+                state.add(record["seq"], record["ok"])
+                valid_bytes += size
+            if valid_bytes != self.path.stat().st_size:
+                logger.warning(f"Sonuç kaydında yarım satır kesildi: {self.path}")
+                os.truncate(self.path, valid_bytes)
+        self.count = state.processed
+        self._file = self.path.open("a", encoding="utf-8")
+        return state
+    
+    def append(self, seq: int, item_id: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Buffer one outcome; it is durable after the next ``sync``."""
+        record: Dict[str, Any] = {"seq": seq, "id": item_id, "ok": error is None}
+        if error is None:
+            record["result"] = result
+        else:
+            record["error"] = error
+        self._file.write(json.dumps(record, default=_json_default) + "\n")
+        self.count += 1
+    
+    async def sync(self) -> None:
+        """Flush buffered lines and fsync them off the event loop."""
+        self._file.flush()
+        await asyncio.to_thread(os.fsync, self._file.fileno())
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    @staticmethod
+    def _scan(path: Path) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """Yield ``(record, line size)`` up to the first torn or invalid line."""
+        with path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return
+                yield record, len(line)
+    
+    @classmethod
+    def iter_records(cls, path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the complete records of a log file."""
+        for record, _ in cls._scan(Path(path)):
+            yield record
+
+
 class ResultAggregator:
     """Aggregate batch processing results."""
     
+    # Error messages kept in a BatchResult built from a result log
+    MAX_LOG_ERRORS = 1000
+    
     def aggregate(
         self,
         results: List[Any],
@@ -276,6 +490,51 @@ class ResultAggregator:
             start_time=datetime.now(UTC),
             end_time=datetime.now(UTC)
         )
+    
+    def aggregate_log(
+        self,
+        log_path: Union[str, Path],
+        batch_id: str,
+        start_time: Optional[datetime] = None
+    ) -> BatchResult:
+        """Summarise a result log in one streaming pass.
+        
+        Results stay on disk and are read back with ``iter_results``; the
+        log path is in ``metadata["result_log"]``. Errors are keyed by
+        stream position and capped at ``MAX_LOG_ERRORS``.
+        """
+        successful = 0
+        failed = 0
+        errors = {}
+        
+        for record in ResultLog.iter_records(log_path):
+            if record["ok"]:
+                successful += 1
+            else:
+                failed += 1
+                if len(errors) < self.MAX_LOG_ERRORS:
+                    errors[str(record["seq"])] = record["error"]
+        
+        processed = successful + failed
+        return BatchResult(
+            batch_id=batch_id,
+            status=BatchStatus.COMPLETED if successful > 0 else BatchStatus.FAILED,
+            total_items=processed,
+            processed_items=processed,
+            successful_items=successful,
+            failed_items=failed,
+            skipped_items=0,
+            errors=errors,
+            start_time=start_time or datetime.now(UTC),
+            end_time=datetime.now(UTC),
+            metadata={"result_log": str(log_path), "errors_truncated": failed > len(errors)}
+        )
+    
+    def iter_results(self, log_path: Union[str, Path]) -> Iterator[Any]:
+        """Lazily yield successful results from a result log, in completion order."""
+        for record in ResultLog.iter_records(log_path):
+            if record["ok"]:
+                yield record["result"]
 
 
 class ResourceMonitor:
@@ -307,6 +566,27 @@ class ResourceMonitor:
             return 50.0
 
 
+async def _numbered(
+    items: Union[AsyncIterable[BatchItem[T]], Iterable[BatchItem[T]]],
+    skip: Optional[ResultLogState] = None
+) -> AsyncIterator[Tuple[int, BatchItem[T]]]:
+    """Yield ``(stream position, item)``, leaving out positions in ``skip``."""
+    if hasattr(items, "__aiter__"):
+        seq = 0
+        async for item in items:
+            if skip is None or seq not in skip:
+                yield seq, item
+            seq += 1
+    else:
+        for seq, item in enumerate(items):
+            if skip is None or seq not in skip:
+                yield seq, item
+
+
+# Called as (stream position, item, result or exception) when an item finishes
+ItemCallback = Callable[[int, BatchItem, Any], Awaitable[None]]
+
+
 class BatchProcessingEngine:
     """Enterprise-grade batch processing engine."""
     
@@ -331,7 +611,6 @@ class BatchProcessingEngine:
         self.chunk_size = chunk_size
         self._process_pool: Optional[ProcessPoolExecutor] = None
         self._thread_pool: Optional[ThreadPoolExecutor] = None
-        self._semaphores: Dict[str, asyncio.Semaphore] = {}
         self._shutdown_event = asyncio.Event()
     
     def __enter__(self):
@@ -376,7 +655,6 @@ class BatchProcessingEngine:
                 self._thread_pool = None
                 logger.info("Thread pool executor kapatıldı")
             
-            self._semaphores.clear()
             self._shutdown_event.set()
             
         except Exception as e:
@@ -534,6 +812,198 @@ class BatchProcessingEngine:
                     duration_ms=(time.perf_counter() - start_time) * 1000
                 )
     
+    async def process_stream(
+        self,
+        items: Union[AsyncIterable[BatchItem[T]], Iterable[BatchItem[T]]],
+        operation: Callable[[T], R],
+        options: Optional[BatchOptions] = None,
+        batch_id: Optional[str] = None,
+        result_dir: Optional[Union[str, Path]] = None
+    ) -> BatchResult[R]:
+        """
+        Process a stream of items with a bounded in-flight window.
+        
+        Items are pulled from ``items`` only when one of ``max_workers``
+        slots is free, so memory does not grow with the stream length.
+        Outcomes go to a JSONL result log instead of ``BatchResult.results``;
+        the log path is in ``metadata["result_log"]`` and
+        ``ResultAggregator.iter_results`` reads it back lazily. Progress is
+        flushed and the log fsynced together every
+        BATCH_PROGRESS_FLUSH_INTERVAL_SECONDS.
+        
+        Passing the ``batch_id`` of an interrupted batch resumes it: items
+        already in its log are skipped by stream position, so the stream
+        must yield the same items in the same order. Items finished after
+        the last checkpoint may run again.
+        
+        Args:
+            items: Items to process, sync or async iterable
+            operation: Function to apply to each item
+            options: Batch processing options; strategy and priority_queue
+                do not apply to streams
+            batch_id: Batch to create or resume
+            result_dir: Result log directory (default BATCH_RESULT_LOG_DIR)
+            
+        Returns:
+            Batch result with counts and errors, without results
+        """
+        with create_span("batch_process_stream") as span:
+            batch_id = batch_id or str(uuid.uuid4())
+            options = options or BatchOptions()
+            window = options.max_workers or self.max_workers
+            
+            log = ResultLog.for_batch(batch_id, result_dir)
+            done = log.open()
+            
+            span.set_attribute("batch_id", batch_id)
+            span.set_attribute("window", window)
+            span.set_attribute("resumed_items", done.processed)
+            
+            progress = ProgressAccumulator(
+                self.progress_tracker, batch_id, enabled=options.track_progress
+            )
+            if options.track_progress:
+                await self.progress_tracker.init_batch(batch_id, None)
+                await self.progress_tracker.update_progress(
+                    batch_id,
+                    processed=done.processed,
+                    successful=done.successful,
+                    failed=done.failed,
+                    status=BatchStatus.RUNNING,
+                    fields={"result_log": str(log.path), "checkpoint": done.processed}
+                )
+            if done.processed:
+                logger.info(f"Toplu işlem devam ediyor: {batch_id}, tamamlanan: {done.processed}")
+            
+            async def on_done(seq: int, item: BatchItem[T], outcome: Any) -> None:
+                if isinstance(outcome, Exception):
+                    error = str(outcome)
+                elif isinstance(outcome, dict) and "error" in outcome:
+                    error = str(outcome["error"])
+                else:
+                    error = None
+                log.append(
+                    seq, item.id,
+                    result=outcome if error is None and options.save_results else None,
+                    error=error
+                )
+                progress.record(item.id, successful=error is None)
+                if progress.due:
+                    await log.sync()
+                    await progress.flush(fields={"checkpoint": log.count})
+            
+            start_time = time.perf_counter()
+            started_at = datetime.now(UTC)
+            batch_error: Optional[Exception] = None
+            
+            try:
+                await self._run_windowed(
+                    _numbered(items, done), operation, options, window, on_done
+                )
+            except Exception as e:
+                logger.error(f"Toplu işlem hatası {batch_id}: {e}")
+                batch_error = e
+            finally:
+                await log.sync()
+                log.close()
+            
+            batch_result = self.result_aggregator.aggregate_log(log.path, batch_id, started_at)
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            batch_result.duration_ms = duration_ms
+            batch_result.metadata["resumed_items"] = done.processed
+            if batch_error is not None:
+                batch_result.status = BatchStatus.FAILED
+                batch_result.errors["batch_error"] = str(batch_error)
+            
+            await progress.flush(
+                status=batch_result.status,
+                fields={"checkpoint": log.count, "total": batch_result.total_items}
+            )
+            
+            batch_counter.labels(
+                operation="batch_process_stream",
+                status="success" if batch_result.status == BatchStatus.COMPLETED else "error"
+            ).inc()
+            batch_duration_histogram.labels(
+                operation="batch_process_stream"
+            ).observe(duration_ms)
+            
+            logger.info(
+                f"Toplu işlem tamamlandı: {batch_id}, "
+                f"Başarılı: {batch_result.successful_items}/{batch_result.total_items}, "
+                f"Süre: {duration_ms:.2f}ms"
+            )
+            
+            return batch_result
+    
+    async def _run_windowed(
+        self,
+        items: AsyncIterator[Tuple[int, BatchItem[T]]],
+        operation: Callable[[T], R],
+        options: BatchOptions,
+        window: int,
+        on_done: ItemCallback
+    ) -> None:
+        """
+        Run items with at most ``window`` in flight.
+        
+        The source is advanced only when a slot frees up, so a slow
+        operation holds the producer back instead of piling up coroutines.
+        ``on_done`` receives each outcome in completion order; failures are
+        passed as exceptions and, unless ``continue_on_error``, re-raised
+        after the callback, cancelling the items still in flight.
+        """
+        pending: Dict[asyncio.Task, Tuple[int, BatchItem[T]]] = {}
+        source = items.__aiter__()
+        try:
+            while True:
+                # Free a slot before pulling, so at most ``window`` items
+                # have been taken from the source and not yet finished
+                while len(pending) >= window:
+                    await self._reap(pending, options, on_done)
+                try:
+                    seq, item = await source.__anext__()
+                except StopAsyncIteration:
+                    break
+                task = asyncio.ensure_future(asyncio.wait_for(
+                    self._process_single_item(item, operation, options),
+                    timeout=options.timeout_per_item_s
+                ))
+                pending[task] = (seq, item)
+            
+            while pending:
+                await self._reap(pending, options, on_done)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def _reap(
+        self,
+        pending: Dict[asyncio.Task, Tuple[int, BatchItem[T]]],
+        options: BatchOptions,
+        on_done: ItemCallback
+    ) -> None:
+        """Wait for at least one in-flight item and hand over its outcome."""
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            seq, item = pending.pop(task)
+            try:
+                outcome = task.result()
+            except asyncio.TimeoutError:
+                error_msg = f"Zaman aşımı: {item.id}"
+                logger.error(error_msg)
+                outcome = Exception(error_msg)
+            except Exception as e:
+                logger.error(f"İşlem hatası {item.id}: {e}")
+                outcome = e
+            
+            await on_done(seq, item, outcome)
+            
+            if isinstance(outcome, Exception) and not options.continue_on_error:
+                raise outcome
+    
     async def _process_sequential(
         self,
         batch_id: str,
@@ -543,14 +1013,12 @@ class BatchProcessingEngine:
     ) -> List[R]:
         """Process items sequentially."""
         results = []
+        progress = ProgressAccumulator(
+            self.progress_tracker, batch_id, enabled=options.track_progress
+        )
         
         for i, item in enumerate(items):
             try:
-                if options.track_progress:
-                    await self.progress_tracker.update_progress(
-                        batch_id, current_item=item.id
-                    )
-                
                 # Process with timeout
                 result = await asyncio.wait_for(
                     self._process_single_item(item, operation, options),
@@ -558,21 +1026,13 @@ class BatchProcessingEngine:
                 )
                 
                 results.append(result)
-                
-                if options.track_progress:
-                    await self.progress_tracker.update_progress(
-                        batch_id, processed=1, successful=1
-                    )
+                progress.record(item.id, successful=True)
                 
             except asyncio.TimeoutError:
                 error_msg = f"Zaman aşımı: {item.id}"
                 logger.error(error_msg)
                 results.append(Exception(error_msg))
-                
-                if options.track_progress:
-                    await self.progress_tracker.update_progress(
-                        batch_id, processed=1, failed=1
-                    )
+                progress.record(item.id, successful=False)
                 
                 if not options.continue_on_error:
                     break
@@ -580,15 +1040,14 @@ class BatchProcessingEngine:
             except Exception as e:
                 logger.error(f"İşlem hatası {item.id}: {e}")
                 results.append(e)
-                
-                if options.track_progress:
-                    await self.progress_tracker.update_progress(
-                        batch_id, processed=1, failed=1
-                    )
+                progress.record(item.id, successful=False)
                 
                 if not options.continue_on_error:
                     break
+            
+            await progress.maybe_flush()
         
+        await progress.flush()
         return results
     
     async def _process_parallel(
@@ -599,64 +1058,21 @@ class BatchProcessingEngine:
         options: BatchOptions,
         max_workers: int
     ) -> List[R]:
-        """Process items in parallel."""
-        # Create semaphore for this batch
-        if batch_id not in self._semaphores:
-            self._semaphores[batch_id] = asyncio.Semaphore(max_workers)
-        
-        semaphore = self._semaphores[batch_id]
-        
-        async def process_with_semaphore(item: BatchItem[T]) -> R:
-            async with semaphore:
-                try:
-                    if options.track_progress:
-                        await self.progress_tracker.update_progress(
-                            batch_id, current_item=item.id
-                        )
-                    
-                    result = await asyncio.wait_for(
-                        self._process_single_item(item, operation, options),
-                        timeout=options.timeout_per_item_s
-                    )
-                    
-                    if options.track_progress:
-                        await self.progress_tracker.update_progress(
-                            batch_id, processed=1, successful=1
-                        )
-                    
-                    return result
-                    
-                except asyncio.TimeoutError:
-                    error_msg = f"Zaman aşımı: {item.id}"
-                    logger.error(error_msg)
-                    
-                    if options.track_progress:
-                        await self.progress_tracker.update_progress(
-                            batch_id, processed=1, failed=1
-                        )
-                    
-                    if options.continue_on_error:
-                        return Exception(error_msg)
-                    raise
-                    
-                except Exception as e:
-                    logger.error(f"İşlem hatası {item.id}: {e}")
-                    
-                    if options.track_progress:
-                        await self.progress_tracker.update_progress(
-                            batch_id, processed=1, failed=1
-                        )
-                    
-                    if options.continue_on_error:
-                        return e
-                    raise
+        """Process items in parallel through a bounded window, keeping input order."""
+        results: List[Any] = [None] * len(items)
+        progress = ProgressAccumulator(
+            self.progress_tracker, batch_id, enabled=options.track_progress
+        )
         
-        # Process all items in parallel
-        tasks = [process_with_semaphore(item) for item in items]
-        results = await asyncio.gather(*tasks, return_exceptions=options.continue_on_error)
+        async def on_done(seq: int, item: BatchItem[T], outcome: Any) -> None:
+            results[seq] = outcome
+            progress.record(item.id, successful=not isinstance(outcome, Exception))
+            await progress.maybe_flush()
         
-        # Clean up semaphore
-        del self._semaphores[batch_id]
+        try:
+            await self._run_windowed(_numbered(items), operation, options, max_workers, on_done)
+        finally:
+            await progress.flush()
         
         return results
     
@@ -678,10 +1094,6 @@ class BatchProcessingEngine:
                 batch_id, chunk, operation, options, max_workers
             )
             results.extend(chunk_results)
-            
-            # Brief pause between chunks to avoid overwhelming the system
-            if i + chunk_size < len(items):
-                await asyncio.sleep(0.1)
         
         return results
     
@@ -765,6 +1177,4 @@ class BatchProcessingEngine:
         
         if self._thread_pool:
             self._thread_pool.shutdown(wait=False)
-            self._thread_pool = None
-        
-        self._semaphores.clear()
\ No newline at end of file
+            self._thread_pool = None
\ No newline at end of file
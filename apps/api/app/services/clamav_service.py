@@ -14,11 +14,14 @@ from __future__ import annotations
 
 import asyncio
 import socket
+import struct
 import threading
-from contextlib import asynccontextmanager
+import time
+from contextlib import asynccontextmanager, contextmanager
 from datetime import UTC, datetime
+from enum import Enum
 from io import BytesIO
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import clamd
 import structlog
@@ -26,11 +29,20 @@ from minio import Minio
 from minio.error import S3Error
 from sqlalchemy.orm import Session
 
-from app.models.security_event import SecurityEvent, SecurityEventType, SeverityLevel
+from app.models.enums import SecuritySeverity
+from app.models.security_event import SecurityEvent
 from app.schemas.file_upload import UploadErrorCode
 
 logger = structlog.get_logger(__name__)
 
+
+class SecurityEventType(str, Enum):
+    """Security event types recorded by the malware scanner (SecurityEvent.type)."""
+
+    MALWARE_DETECTED = "MALWARE_DETECTED"
+    MALWARE_SCAN_FAILURE = "MALWARE_SCAN_FAILURE"
+
+
 # EICAR test string for testing purposes
 EICAR_TEST_STRING = (
     "X5O!P%@AP[4\\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
@@ -180,6 +192,190 @@ class ClamAVRateLimiter:
             }
 
 
+class ClamdSession:
+    """
+    A clamd connection in IDSESSION mode, reused for consecutive INSTREAM scans.
+
+    Saves the connect per scan and lets the caller send chunks as they arrive
+    instead of handing clamd a file-like object to drain.
+    """
+
+    def __init__(
+        self,
+        unix_socket: str | None,
+        host: str,
+        port: int,
+        timeout_connect: float,
+        timeout_scan: float,
+    ):
+        self.unix_socket = unix_socket
+        self.host = host
+        self.port = port
+        self.timeout_connect = timeout_connect
+        self.timeout_scan = timeout_scan
+        self._sock: socket.socket | None = None
+        self._last_used = 0.0
+        self.scans = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self._last_used
+
+    def alive(self) -> bool:
+        """Whether clamd still has the session open, without blocking."""
+        if self._sock is None:
+            return False
+        try:
+            self._sock.setblocking(False)
+            # Readable with no data means clamd closed its end
+            return self._sock.recv(1, socket.MSG_PEEK) != b""
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        finally:
+            if self._sock is not None:
+                self._sock.settimeout(self.timeout_scan)
+
+    def connect(self) -> None:
+        if self.unix_socket:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout_connect)
+            sock.connect(self.unix_socket)
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout_connect)
+        sock.settimeout(self.timeout_scan)
+        sock.sendall(b"zIDSESSION\0")
+        self._sock = sock
+        self._last_used = time.monotonic()
+
+    def scan(self, chunks: Iterable[bytes]) -> Tuple[str, str | None]:
+        """
+        INSTREAM the chunks and return clamd's verdict.
+
+        Returns:
+            ("OK", None), ("FOUND", virus_name) or ("ERROR", message)
+        """
+        sock = self._sock
+        if sock is None:
+            raise clamd.ConnectionError("ClamAV session is not connected")
+        try:
+            sock.sendall(b"zINSTREAM\0")
+            for chunk in chunks:
+                if chunk:
+                    sock.sendall(struct.pack("!L", len(chunk)))
+                    sock.sendall(chunk)
+            sock.sendall(struct.pack("!L", 0))
+        except (BrokenPipeError, ConnectionResetError):
+            # clamd closes the stream early when StreamMaxLength is exceeded;
+            # its reply explains why
+            pass
+        reply = self._read_reply()
+        self._last_used = time.monotonic()
+        self.scans += 1
+        return self._parse_reply(reply)
+
+    def _read_reply(self) -> str:
+        data = bytearray()
+        while not data.endswith(b"\0"):
+            part = self._sock.recv(4096)
+            if not part:
+                raise clamd.ConnectionError("ClamAV closed the session")
+            data += part
+        return data[:-1].decode("utf-8", "replace")
+
+    @staticmethod
+    def _parse_reply(reply: str) -> Tuple[str, str | None]:
+        # IDSESSION replies are "<id>: stream: OK", "<id>: stream: <name> FOUND"
+        # or "<id>: <message> ERROR"
+        _, _, message = reply.partition(": ")
+        if message.startswith("stream: "):
+            message = message[len("stream: "):]
+        if message == "OK":
+            return "OK", None
+        if message.endswith(" FOUND"):
+            return "FOUND", message[:-len(" FOUND")]
+        return "ERROR", message.removesuffix(" ERROR")
+
+    def close(self) -> None:
+        if self._sock is None:
+            return
+        try:
+            self._sock.sendall(b"zEND\0")
+        except OSError:
+            pass
+        finally:
+            self._sock.close()
+            self._sock = None
+
+
+class ClamdSessionPool:
+    """Idle clamd sessions for one daemon, at most max_sessions in use at a time."""
+
+    def __init__(
+        self,
+        unix_socket: str | None,
+        host: str,
+        port: int,
+        timeout_connect: float,
+        timeout_scan: float,
+        max_sessions: int,
+        idle_timeout: float,
+    ):
+        self._session_args = (unix_socket, host, port, timeout_connect, timeout_scan)
+        self.idle_timeout = idle_timeout
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._idle: List[ClamdSession] = []
+        self._lock = threading.Lock()
+        self.connects = 0
+
+    @contextmanager
+    def session(self) -> Iterator[ClamdSession]:
+        """
+        A connected session, returned to the pool afterwards unless the scan
+        failed. Sessions idle for longer than idle_timeout are replaced, since
+        clamd drops them after its own IdleTimeout.
+
+        Raises:
+            OSError: If clamd cannot be reached
+        """
+        with self._slots:
+            session = None
+            with self._lock:
+                while self._idle and session is None:
+                    candidate = self._idle.pop()
+                    if candidate.idle_seconds() < self.idle_timeout and candidate.alive():
+                        session = candidate
+                    else:
+                        candidate.close()
+            if session is None:
+                session = ClamdSession(*self._session_args)
+                session.connect()
+                self.connects += 1
+
+            try:
+                yield session
+            except BaseException:
+                session.close()
+                raise
+            with self._lock:
+                self._idle.append(session)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._idle:
+                session.close()
+            self._idle.clear()
+
+
+# Sessions outlive ClamAVService instances, which are created per request
+_session_pools: Dict[Tuple[Any, ...], ClamdSessionPool] = {}
+_session_pools_lock = threading.Lock()
+
+
 class ClamAVService:
     """
     Ultra-Enterprise ClamAV service for Task 5.6.
@@ -205,6 +401,7 @@ class ClamAVService:
         fail_closed: bool = True,
         db: Session | None = None,
         minio_client: Minio | None = None,
+        session_idle_timeout: float = 20.0,
     ):
         """
         Initialize ClamAV service.
@@ -220,6 +417,7 @@ class ClamAVService:
             fail_closed: Fail-closed security policy (block uploads if daemon unreachable)
             db: Database session for audit logging
             minio_client: MinIO client for streaming
+            session_idle_timeout: Seconds an idle pooled clamd session is reused for
         """
         self.host = host
         self.port = port  
@@ -230,6 +428,8 @@ class ClamAVService:
         self.fail_closed = fail_closed
         self.db = db
         self.minio_client = minio_client
+        self.max_concurrent_scans = max_concurrent_scans
+        self.session_idle_timeout = session_idle_timeout
         
         # Initialize rate limiter
         self.rate_limiter = ClamAVRateLimiter(max_concurrent_scans)
@@ -282,7 +482,7 @@ class ClamAVService:
         event_type: SecurityEventType,
         description: str,
         details: dict | None = None,
-        severity: SeverityLevel = SeverityLevel.HIGH,
+        severity: SecuritySeverity = SecuritySeverity.HIGH,
     ) -> None:
         """Log security event to database and structured logs."""
         try:
@@ -298,13 +498,15 @@ class ClamAVService:
             # Database logging (if available)
             if self.db:
                 security_event = SecurityEvent(
-                    event_type=event_type,
-                    description=description,
-                    details=details or {},
-                    severity=severity,
-                    source_ip="system",  # Internal scan
-                    user_agent="ClamAV-Service/1.0",
-                    occurred_at=datetime.now(UTC),
+                    type=event_type.value,
+                    resource="clamav",  # Internal scan
+                    ua_masked="ClamAV-Service/1.0",
+                    event_metadata={
+                        "description": description,
+                        "details": details or {},
+                        "severity": severity.value,
+                    },
+                    created_at=datetime.now(UTC),
                 )
                 self.db.add(security_event)
                 self.db.commit()
@@ -466,7 +668,7 @@ class ClamAVService:
                     "port": self.port,
                     "unix_socket": self.unix_socket,
                 },
-                severity=SeverityLevel.HIGH,
+                severity=SecuritySeverity.HIGH,
             )
             raise ClamAVError(
                 code="SCAN_UNAVAILABLE",
@@ -583,7 +785,7 @@ class ClamAVService:
                                 "file_size": stat.size,
                                 "mime_type": mime_type,
                             },
-                            severity=SeverityLevel.CRITICAL,
+                            severity=SecuritySeverity.CRITICAL,
                         )
                     
                     return ClamAVScanResult(
@@ -609,7 +811,7 @@ class ClamAVService:
                             "timeout_ms": self.timeout_scan * 1000,
                             "scan_time_ms": scan_time_ms,
                         },
-                        severity=SeverityLevel.MEDIUM,
+                        severity=SecuritySeverity.MEDIUM,
                     )
                     raise ClamAVError(
                         code="SCAN_TIMEOUT",
@@ -629,7 +831,7 @@ class ClamAVService:
                             "host": self.host,
                             "port": self.port,
                         },
-                        severity=SeverityLevel.HIGH,
+                        severity=SecuritySeverity.HIGH,
                     )
                     raise ClamAVError(
                         code="CLAMD_CONNECTION_ERROR",
@@ -650,7 +852,7 @@ class ClamAVService:
                             "error_type": type(e).__name__,
                             "scan_time_ms": scan_time_ms,
                         },
-                        severity=SeverityLevel.HIGH,
+                        severity=SecuritySeverity.HIGH,
                     )
                     raise ClamAVError(
                         code="SCAN_ERROR",
@@ -744,6 +946,184 @@ class ClamAVService:
             )
             return future.result()
 
+    def _session_pool(self) -> ClamdSessionPool:
+        key = (
+            self.unix_socket, self.host, self.port, self.timeout_connect,
+            self.timeout_scan, self.max_concurrent_scans, self.session_idle_timeout,
+        )
+        with _session_pools_lock:
+            pool = _session_pools.get(key)
+            if pool is None:
+                pool = ClamdSessionPool(
+                    self.unix_socket, self.host, self.port, self.timeout_connect,
+                    self.timeout_scan, self.max_concurrent_scans, self.session_idle_timeout,
+                )
+                _session_pools[key] = pool
+            return pool
+
+    def skipped_scan_result(
+        self,
+        object_key: str,
+        size: int,
+        mime_type: str | None = None,
+        file_type: str | None = None,
+        max_size_bytes: int = 100 * 1024 * 1024,
+    ) -> ClamAVScanResult | None:
+        """
+        The result for an object the scan policy skips, or None if it must be
+        scanned. Same policy as scan_object_stream.
+        """
+        if not self._should_scan_file(object_key, mime_type, file_type):
+            return ClamAVScanResult(
+                is_clean=True,
+                scan_time_ms=0.0,
+                scan_metadata={"scan_skipped": True, "reason": "policy"},
+            )
+        if size > max_size_bytes:
+            logger.warning(
+                "Object too large for ClamAV scanning",
+                object_key=object_key,
+                size=size,
+                max_size=max_size_bytes,
+            )
+            return ClamAVScanResult(
+                is_clean=True,  # Assume clean for oversized files
+                scan_time_ms=0.0,
+                scan_metadata={
+                    "scan_skipped": True,
+                    "reason": "oversized",
+                    "size": size,
+                    "max_size": max_size_bytes,
+                },
+            )
+        return None
+
+    def scan_chunks(
+        self,
+        chunks: Iterable[bytes],
+        object_key: str,
+        size: int,
+        mime_type: str | None = None,
+        file_type: str | None = None,
+    ) -> ClamAVScanResult:
+        """
+        Scan data that arrives in chunks over a pooled clamd session.
+
+        Used by the upload ingest pipeline, which reads the object once and
+        feeds the same chunks to the hasher and to this scan. Check
+        skipped_scan_result first; this method always scans.
+
+        Raises:
+            ClamAVError: SCAN_UNAVAILABLE (fail closed) or
+                CLAMD_CONNECTION_ERROR if clamd cannot be reached,
+                SCAN_TIMEOUT, or SCAN_ERROR if clamd rejects the stream
+        """
+        pool = self._session_pool()
+        scan_start_time = datetime.now(UTC)
+        try:
+            with pool.session() as session:
+                status, detail = session.scan(chunks)
+        except socket.timeout:
+            scan_time_ms = (datetime.now(UTC) - scan_start_time).total_seconds() * 1000
+            self._log_security_event(
+                event_type=SecurityEventType.MALWARE_SCAN_FAILURE,
+                description=f"ClamAV scan timeout after {scan_time_ms:.0f}ms",
+                details={
+                    "object_key": object_key,
+                    "timeout_ms": self.timeout_scan * 1000,
+                    "scan_time_ms": scan_time_ms,
+                },
+                severity=SecuritySeverity.MEDIUM,
+            )
+            raise ClamAVError(
+                code="SCAN_TIMEOUT",
+                message=f"Scan timeout after {self.timeout_scan}s",
+                turkish_message=f"{self.timeout_scan}s sonra tarama zaman aşımı",
+                details={"timeout_seconds": self.timeout_scan},
+                status_code=408,
+            )
+        except (OSError, clamd.ConnectionError) as e:
+            self._log_security_event(
+                event_type=SecurityEventType.MALWARE_SCAN_FAILURE,
+                description=f"ClamAV connection error: {str(e)}",
+                details={
+                    "object_key": object_key,
+                    "connection_error": str(e),
+                    "host": self.host,
+                    "port": self.port,
+                    "unix_socket": self.unix_socket,
+                    "fail_closed": self.fail_closed,
+                },
+                severity=SecuritySeverity.HIGH,
+            )
+            if self.fail_closed:
+                raise ClamAVError(
+                    code="SCAN_UNAVAILABLE",
+                    message="Malware scanning unavailable",
+                    turkish_message="Kötü amaçlı yazılım taraması kullanılamıyor",
+                    details={"object_key": object_key, "daemon_status": "unreachable"},
+                    status_code=503,
+                )
+            raise ClamAVError(
+                code="CLAMD_CONNECTION_ERROR",
+                message=f"ClamAV daemon connection failed: {str(e)}",
+                turkish_message=f"ClamAV daemon bağlantısı başarısız: {str(e)}",
+                details={"connection_error": str(e)},
+                status_code=503,
+            )
+
+        scan_time_ms = (datetime.now(UTC) - scan_start_time).total_seconds() * 1000
+        if status == "ERROR":
+            self._log_security_event(
+                event_type=SecurityEventType.MALWARE_SCAN_FAILURE,
+                description=f"ClamAV scan error: {detail}",
+                details={"object_key": object_key, "error": detail, "scan_time_ms": scan_time_ms},
+                severity=SecuritySeverity.HIGH,
+            )
+            raise ClamAVError(
+                code="SCAN_ERROR",
+                message=f"Scan failed: {detail}",
+                turkish_message=f"Tarama başarısız: {detail}",
+                details={"error": detail},
+                status_code=500,
+            )
+
+        is_clean = status == "OK"
+        logger.info(
+            "ClamAV scan completed",
+            object_key=object_key,
+            is_clean=is_clean,
+            virus_name=detail,
+            scan_time_ms=scan_time_ms,
+            bytes_scanned=size,
+        )
+        if not is_clean:
+            self._log_security_event(
+                event_type=SecurityEventType.MALWARE_DETECTED,
+                description=f"Malware detected in uploaded file: {detail}",
+                details={
+                    "object_key": object_key,
+                    "virus_name": detail,
+                    "scan_time_ms": scan_time_ms,
+                    "file_size": size,
+                    "mime_type": mime_type,
+                },
+                severity=SecuritySeverity.CRITICAL,
+            )
+
+        return ClamAVScanResult(
+            is_clean=is_clean,
+            scan_time_ms=scan_time_ms,
+            virus_name=detail if not is_clean else None,
+            scan_metadata={
+                "bytes_scanned": size,
+                "object_size": size,
+                "mime_type": mime_type,
+                "file_type": file_type,
+                "scan_method": "instream_session",
+            },
+        )
+
     def scan_eicar_test(self) -> ClamAVScanResult:
         """
         Test ClamAV functionality using EICAR test string.
@@ -890,11 +1270,14 @@ def get_clamav_service(
         fail_closed=fail_closed if fail_closed is not None else environment.CLAMAV_FAIL_CLOSED,
         db=db,
         minio_client=minio_client,
+        session_idle_timeout=environment.CLAMAV_SESSION_IDLE_TIMEOUT,
     )
 
 
 __all__ = [
     "ClamAVService",
+    "ClamdSession",
+    "ClamdSessionPool",
     "ClamAVError", 
     "ClamAVScanResult",
     "get_clamav_service",
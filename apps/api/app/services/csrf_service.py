@@ -443,6 +443,15 @@ class CSRFService:
                 }
             }
     
+    def is_protection_required(self, request: Request, require_auth: bool = True) -> bool:
+        """
+        Whether validate_csrf_token would check a token for this request.
+        
+        Lets callers skip opening a database session for requests that pass
+        without one (safe methods, API-only and non-browser clients).
+        """
+        return self._is_csrf_protection_required(request, require_auth)
+    
     def _is_csrf_protection_required(self, request: Request, require_auth: bool) -> bool:
         """
         Determine if CSRF protection is required for this request.
@@ -62,6 +62,11 @@ from app.services.clamav_service import (
     ClamAVService,
     get_clamav_service,
 )
+from app.services.upload_ingest_service import (
+    IngestVerdict,
+    UploadIngestService,
+    get_upload_ingest_service,
+)
 from app.services.artefact_service import ArtefactService
 from app.schemas.artefact import ArtefactCreate, ArtefactType
 
@@ -106,6 +111,7 @@ class FileService:
         validation_service: FileValidationService | None = None,
         sha256_service: SHA256StreamingService | None = None,
         clamav_service: ClamAVService | None = None,
+        ingest_service: UploadIngestService | None = None,
     ):
         """
         Initialize file service.
@@ -117,6 +123,9 @@ class FileService:
             validation_service: File validation service
             sha256_service: SHA256 streaming service
             clamav_service: ClamAV malware scanning service
+            ingest_service: Single-pass ingest; when set, finalize hashes, sniffs
+                and scans the object from one read instead of using
+                sha256_service and clamav_service separately
         """
         self.client = client or get_minio_client()
         self.config = config or get_minio_config()
@@ -125,6 +134,7 @@ class FileService:
         self.validation_service = validation_service or get_file_validation_service()
         self.sha256_service = sha256_service or get_sha256_streaming_service(self.client)
         self.clamav_service = clamav_service or get_clamav_service(db=db, minio_client=self.client)
+        self.ingest_service = ingest_service
 
         logger.info("File service initialized with validation, SHA256 streaming, and ClamAV scanning")
 
@@ -582,14 +592,32 @@ class FileService:
                 upload_id=request.upload_id,
             )
 
+            # Extract file type for ClamAV policy decisions
+            file_type_str = session.metadata.get("type", "temp")
+            ingest: IngestVerdict | None = None
+
             try:
-                # Use SHA256 streaming service for memory-efficient verification
-                is_hash_valid, actual_sha256, hash_metadata, first_chunk = self.sha256_service.verify_object_hash(
-                    bucket_name=bucket_name,
-                    object_name=object_name,
-                    expected_sha256=session.expected_sha256,
-                    expected_size=session.expected_size,
-                )
+                if self.ingest_service is not None:
+                    # One read of the object feeds the hash, the format sniffer and the malware scan
+                    ingest = self.ingest_service.ingest_object(
+                        bucket_name=bucket_name,
+                        object_name=object_name,
+                        size=actual_size,
+                        expected_sha256=session.expected_sha256,
+                        version_id=version_id,
+                        mime_type=session.mime_type,
+                        file_type=file_type_str,
+                        max_scan_bytes=100 * 1024 * 1024,  # 100MB limit
+                    )
+                    is_hash_valid, actual_sha256, hash_metadata, first_chunk = ingest.hash_result()
+                else:
+                    # Use SHA256 streaming service for memory-efficient verification
+                    is_hash_valid, actual_sha256, hash_metadata, first_chunk = self.sha256_service.verify_object_hash(
+                        bucket_name=bucket_name,
+                        object_name=object_name,
+                        expected_sha256=session.expected_sha256,
+                        expected_size=session.expected_size,
+                    )
 
                 # Log the verification metadata
                 logger.info(
@@ -734,18 +762,19 @@ class FileService:
             )
 
             try:
-                # Extract file type for ClamAV policy decisions
-                file_type_str = session.metadata.get("type", "temp")
-                
-                # Perform synchronous malware scan (converted from async)
-                # Note: The clamav_service provides a synchronous interface that handles the async internally
-                scan_result = self.clamav_service.scan_object_sync(
-                    bucket_name=bucket_name,
-                    object_name=object_name,
-                    mime_type=session.mime_type,
-                    file_type=file_type_str,
-                    max_size_bytes=100 * 1024 * 1024,  # 100MB limit
-                )
+                if ingest is not None:
+                    # Scanned during the ingest read; raises the scan's ClamAVError, if any
+                    scan_result = ingest.scan_result()
+                else:
+                    # Perform synchronous malware scan (converted from async)
+                    # Note: The clamav_service provides a synchronous interface that handles the async internally
+                    scan_result = self.clamav_service.scan_object_sync(
+                        bucket_name=bucket_name,
+                        object_name=object_name,
+                        mime_type=session.mime_type,
+                        file_type=file_type_str,
+                        max_size_bytes=100 * 1024 * 1024,  # 100MB limit
+                    )
 
                 logger.info(
                     "ClamAV scan completed",
@@ -910,6 +939,11 @@ class FileService:
                             "etag": etag,
                             "clamav_clean": True,  # File passed malware scan
                             "finalized_at": datetime.now(UTC).isoformat(),
+                            # Sniffed during the ingest read, so normalization need not guess
+                            **({
+                                "detected_format": ingest.sniff.format,
+                                "detected_units": ingest.sniff.units,
+                            } if ingest is not None else {}),
                         }
                     )
                     
@@ -1373,7 +1407,15 @@ def get_file_service(db: Session | None = None) -> FileService:
     Returns:
         FileService: Configured file service
     """
-    return FileService(db=db)
+    from app.core.environment import environment
+
+    service = FileService(db=db)
+    if environment.UPLOAD_SINGLE_PASS_INGEST:
+        service.ingest_service = get_upload_ingest_service(
+            client=service.client,
+            clamav_service=service.clamav_service,
+        )
+    return service
 
 
 __all__ = [
@@ -0,0 +1,117 @@
+"""
+Canonical Binary STL Writer for Task 7.9
+
+Array-based replacement for sorting facets through FreeCAD objects:
+- Facet coordinates are pulled from ``Mesh.Topology`` into one (N, 3, 3) array
+- Facets are ordered by their rounded coordinates with a vectorized ``lexsort``
+- Binary STL is written straight from a packed record array
+
+Identical triangles in any input order produce byte-identical files.
+"""
+
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+# Fixed header; must not start with b"solid" or readers treat the file as ASCII
+STL_HEADER = b"FreeCAD deterministic binary STL".ljust(80, b" ")
+
+# Decimal places of the facet sort key
+FACET_SORT_DECIMALS = 6
+
+# 50-byte binary STL facet record: normal, three vertices, attribute byte count
+STL_FACET_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+
+
+def mesh_triangles(mesh: Any) -> np.ndarray:
+    """
+    Facet coordinates of a FreeCAD mesh as an (N, 3, 3) float64 array.
+
+    Reads ``mesh.Topology`` once: a point list plus per-facet point indices.
+    """
+    points, facets = mesh.Topology
+    coords = np.fromiter(
+        itertools.chain.from_iterable((p[0], p[1], p[2]) for p in points),
+        dtype=np.float64,
+        count=len(points) * 3
+    ).reshape(-1, 3)
+    indices = np.fromiter(
+        itertools.chain.from_iterable(facets),
+        dtype=np.int64,
+        count=len(facets) * 3
+    ).reshape(-1, 3)
+    return coords[indices]
+
+
+def canonical_facet_order(triangles: np.ndarray, decimals: int = FACET_SORT_DECIMALS) -> np.ndarray:
+    """
+    Permutation sorting facets by their 9 rounded coordinates.
+
+    Vertex 0 x is the primary key, vertex 2 z the last; ties keep input
+    order. Facets are sorted on the primary key, then only the runs that
+    still tie are re-sorted on the next key, so typical meshes cost about
+    one full sort instead of nine.
+    """
+    keys = np.round(triangles.reshape(-1, 9), decimals)
+    order = np.argsort(keys[:, 0], kind="stable")
+    if len(order) < 2:
+        return order
+
+    # same[i]: facets at sorted positions i and i+1 agree on every key so far
+    same = keys[order[1:], 0] == keys[order[:-1], 0]
+    for column in range(1, 9):
+        if not same.any():
+            break
+        tied = np.zeros(len(order), dtype=bool)
+        tied[1:] |= same
+        tied[:-1] |= same
+        positions = np.flatnonzero(tied)
+        # Tied runs are contiguous; number them in order
+        run_starts = np.ones(len(positions), dtype=bool)
+        run_starts[1:] = ~same[positions[1:] - 1]
+        runs = np.cumsum(run_starts)
+
+        members = order[positions]
+        # lexsort treats the last key as primary
+        order[positions] = members[np.lexsort((keys[members, column], runs))]
+        same &= keys[order[1:], column] == keys[order[:-1], column]
+    return order
+
+
+def facet_normals(triangles: np.ndarray) -> np.ndarray:
+    """Unit facet normals (right-hand rule); zero for degenerate facets."""
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+def write_binary_stl(path: Union[str, Path], triangles: np.ndarray) -> int:
+    """
+    Write facets in the given order as binary STL.
+
+    Returns:
+        Number of facets written
+    """
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    records = np.zeros(len(triangles), dtype=STL_FACET_DTYPE)
+    records["normal"] = facet_normals(triangles)
+    records["vertices"] = triangles
+
+    with open(path, "wb") as f:
+        f.write(STL_HEADER + np.uint32(len(records)).astype("<u4").tobytes())
+        records.tofile(f)
+    return len(records)
+
+
+def write_canonical_stl(path: Union[str, Path], triangles: np.ndarray) -> int:
+    """Sort facets canonically and write them as binary STL."""
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    return write_binary_stl(path, triangles[canonical_facet_order(triangles)])
@@ -2,22 +2,29 @@
 Collision Detection for Task 7.6
 
 Provides collision detection functionality:
-- AABB (Axis-Aligned Bounding Box) broad phase with BVH
-- BRepAlgoAPI narrow phase for accurate collision
+- AABB (Axis-Aligned Bounding Box) broad phase with vectorized sweep-and-prune
+- BRepAlgoAPI narrow phase for accurate collision, fanned out to a process pool
 - Collision volume and contact point calculation
 """
 
 from __future__ import annotations
 
-import math
-from typing import Any, Dict, List, Optional, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from ...core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Candidate pairs materialized per sweep block; bounds broad-phase memory
+SWEEP_BLOCK_PAIRS = 250_000
+
+# Pairs per narrow-phase task sent to a worker process
+NARROW_PHASE_CHUNK_SIZE = 64
 
 class AABB(BaseModel):
     """Axis-aligned bounding box."""
@@ -47,95 +54,184 @@ class CollisionPair(BaseModel):
     contact_points: List[List[float]] = Field(default_factory=list, description="Contact points")
 
 
-class BVHNode:
-    """Bounding Volume Hierarchy node for spatial partitioning."""
+def aabb_row(bound_box: Any, offset: Optional[Sequence[float]] = None) -> List[float]:
+    """Flatten a FreeCAD BoundBox to [xmin, ymin, zmin, xmax, ymax, zmax], optionally translated."""
+    dx, dy, dz = offset if offset is not None else (0.0, 0.0, 0.0)
+    return [
+        bound_box.XMin + dx, bound_box.YMin + dy, bound_box.ZMin + dz,
+        bound_box.XMax + dx, bound_box.YMax + dy, bound_box.ZMax + dz
+    ]
+
+
+def aabb_array(shapes) -> np.ndarray:
+    """Stack shape bounding boxes into an (N, 6) float array."""
+    return np.array([aabb_row(shape.BoundBox) for shape in shapes], dtype=np.float64).reshape(-1, 6)
+
+
+def overlapping_indices(query: Sequence[float], boxes: np.ndarray) -> np.ndarray:
+    """Indices of the rows in ``boxes`` whose AABB overlaps ``query`` (touching counts)."""
+    query = np.asarray(query, dtype=np.float64)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    hit = np.all((boxes[:, :3] <= query[3:]) & (boxes[:, 3:] >= query[:3]), axis=1)
+    return np.flatnonzero(hit)
+
+
+def sweep_and_prune(boxes: np.ndarray, margin: float = 0.0) -> np.ndarray:
+    """
+    Sort-and-sweep broad phase over an (N, 6) AABB array.
     
-    def __init__(self, objects: List[Tuple[str, Any, AABB]]):
-        """
-        Initialize BVH node.
-        
-        Args:
-            objects: List of (id, shape, aabb) tuples
-        """
-        self.objects = objects
-        self.aabb = self._compute_aabb(objects)
-        self.left = None
-        self.right = None
-        
-        # Split if more than threshold objects
-        if len(objects) > 2:
-            self._split()
+    Boxes are sorted by their minimum along the axis with the longest
+    overall extent; each box's sweep interval ends at the first box that
+    starts past its maximum (one ``searchsorted``). Candidates inside the
+    interval are then tested on all three axes in bulk.
     
-    def _compute_aabb(self, objects: List[Tuple[str, Any, AABB]]) -> AABB:
-        """Compute combined AABB for all objects."""
-        if not objects:
-            return AABB(min_point=[0, 0, 0], max_point=[0, 0, 0])
-        
-        min_pt = list(objects[0][2].min_point)
-        max_pt = list(objects[0][2].max_point)
+    Args:
+        boxes: Rows of [xmin, ymin, zmin, xmax, ymax, zmax]
+        margin: Expand every box by this much before testing
+    
+    Returns:
+        (M, 2) array of overlapping index pairs, i < j, sorted
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    n = len(boxes)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.intp)
+    
+    mins = boxes[:, :3] - margin
+    maxs = boxes[:, 3:] + margin
+    axis = int(np.argmax(maxs.max(axis=0) - mins.min(axis=0)))
+    
+    order = np.argsort(mins[:, axis], kind="stable")
+    sorted_mins = mins[order]
+    sorted_maxs = maxs[order]
+    
+    # Boxes i+1 .. ends[i]-1 start before box i ends along the sweep axis
+    ends = np.searchsorted(sorted_mins[:, axis], sorted_maxs[:, axis], side="right")
+    counts = np.maximum(ends - np.arange(1, n + 1), 0)
+    cumulative = np.cumsum(counts)
+    
+    found = []
+    start = 0
+    while start < n:
+        budget = (cumulative[start - 1] if start else 0) + SWEEP_BLOCK_PAIRS
+        stop = min(max(int(np.searchsorted(cumulative, budget, side="right")), start + 1), n)
+        block_counts = counts[start:stop]
+        total = int(block_counts.sum())
+        if total:
+            i = np.repeat(np.arange(start, stop), block_counts)
+            j = i + 1 + np.arange(total) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+            hit = np.all(
+                (sorted_mins[i] <= sorted_maxs[j]) & (sorted_mins[j] <= sorted_maxs[i]),
+                axis=1
+            )
+            if hit.any():
+                found.append(np.stack([order[i[hit]], order[j[hit]]], axis=1))
+        start = stop
+    
+    if not found:
+        return np.empty((0, 2), dtype=np.intp)
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def _brute_force_pairs(boxes: np.ndarray) -> np.ndarray:
+    """All overlapping index pairs by testing every pair; for small inputs."""
+    i, j = np.triu_indices(len(boxes), k=1)
+    hit = np.all((boxes[i, :3] <= boxes[j, 3:]) & (boxes[j, :3] <= boxes[i, 3:]), axis=1)
+    return np.stack([i[hit], j[hit]], axis=1)
+
+
+def _check_shape_pair(
+    id_a: str, shape_a: Any,
+    id_b: str, shape_b: Any,
+    collision_threshold: float
+) -> Optional[CollisionPair]:
+    """Boolean-intersection check for one pair; shared by in-process and pooled narrow phase."""
+    try:
+        # Compute intersection using BRepAlgoAPI_Common
+        intersection = shape_a.common(shape_b)
+        
+        if intersection.isNull():
+            return None
         
-        for _, _, aabb in objects[1:]:
-            for i in range(3):
-                min_pt[i] = min(min_pt[i], aabb.min_point[i])
-                max_pt[i] = max(max_pt[i], aabb.max_point[i])
+        # Check volume
+        volume = intersection.Volume
+        if volume < collision_threshold:
+            return None
         
-        return AABB(min_point=min_pt, max_point=max_pt)
-    
-    def _split(self):
-        """Split node into two children."""
-        # Find longest axis
-        extent = [
-            self.aabb.max_point[i] - self.aabb.min_point[i]
-            for i in range(3)
-        ]
-        split_axis = extent.index(max(extent))
+        # Get contact information
+        bbox = intersection.BoundBox
+        contact_bbox = AABB(
+            min_point=[bbox.XMin, bbox.YMin, bbox.ZMin],
+            max_point=[bbox.XMax, bbox.YMax, bbox.ZMax]
+        )
         
-        # Sort objects by center along split axis
-        sorted_objects = sorted(
-            self.objects,
-            key=lambda obj: (obj[2].min_point[split_axis] + obj[2].max_point[split_axis]) / 2
+        # Sample contact points (simplified)
+        contact_points = []
+        if intersection.Vertexes:
+            for vertex in intersection.Vertexes[:10]:  # Limit to 10 points
+                contact_points.append([
+                    vertex.Point.x,
+                    vertex.Point.y,
+                    vertex.Point.z
+                ])
+        
+        return CollisionPair(
+            object_a=id_a,
+            object_b=id_b,
+            collision_volume=volume,
+            contact_bbox=contact_bbox,
+            contact_points=contact_points
         )
         
-        # Split the sorted objects for recursion
-        # Note: We're guaranteed to have > 2 objects here due to check at line 66
-        mid = len(sorted_objects) // 2
-        self.left = BVHNode(sorted_objects[:mid])
-        self.right = BVHNode(sorted_objects[mid:])
-        self.objects = []  # Clear objects in internal nodes
+    except Exception as e:
+        logger.debug(f"Narrow phase collision check failed: {e}")
+        return None
+
+
+def _narrow_phase_task(
+    breps: Dict[str, str],
+    pairs: List[Tuple[str, str]],
+    collision_threshold: float
+) -> List[CollisionPair]:
+    """Worker-process entry point: rebuild shapes from BREP and check a chunk of pairs."""
+    import Part
     
-    def get_potential_collisions(self, query_aabb: AABB) -> List[Tuple[str, Any, AABB]]:
-        """Get objects that potentially collide with query AABB."""
-        if not self.aabb.overlaps(query_aabb):
-            return []
-        
-        # Leaf node: return objects
-        if not self.left and not self.right:
-            return [
-                obj for obj in self.objects
-                if obj[2].overlaps(query_aabb)
-            ]
-        
-        # Internal node: recurse
-        results = []
-        if self.left:
-            results.extend(self.left.get_potential_collisions(query_aabb))
-        if self.right:
-            results.extend(self.right.get_potential_collisions(query_aabb))
-        
-        return results
+    shapes = {}
+    for obj_id, brep in breps.items():
+        shape = Part.Shape()
+        shape.importBrepFromString(brep)
+        shapes[obj_id] = shape
+    
+    collisions = []
+    for id_a, id_b in pairs:
+        collision = _check_shape_pair(id_a, shapes[id_a], id_b, shapes[id_b], collision_threshold)
+        if collision:
+            collisions.append(collision)
+    return collisions
 
 
 class CollisionDetector:
     """Detect collisions between FreeCAD shapes."""
     
-    def __init__(self, collision_threshold: float = 1e-6):
+    def __init__(
+        self,
+        collision_threshold: float = 1e-6,
+        narrow_phase_workers: Optional[int] = None,
+        parallel_threshold: int = 256
+    ):
         """
         Initialize collision detector.
         
         Args:
             collision_threshold: Minimum volume for collision (mm³)
+            narrow_phase_workers: Worker processes for the narrow phase
+                (default: CPU count, capped at 8; 1 disables the pool)
+            parallel_threshold: Minimum candidate pairs before using the pool
         """
         self.collision_threshold = collision_threshold
+        self.narrow_phase_workers = narrow_phase_workers or min(os.cpu_count() or 1, 8)
+        self.parallel_threshold = parallel_threshold
         self._freecad_available = self._check_freecad()
     
     def _check_freecad(self) -> bool:
@@ -151,14 +247,16 @@ class CollisionDetector:
     def detect_collisions(
         self,
         shapes: List[Tuple[str, Any]],
-        use_bvh: bool = True
+        use_broad_phase: bool = True,
+        involving: Optional[str] = None
     ) -> List[CollisionPair]:
         """
         Detect collisions between shapes.
         
         Args:
             shapes: List of (id, shape) tuples
-            use_bvh: Whether to use BVH for broad phase
+            use_broad_phase: Whether to use sweep-and-prune for broad phase
+            involving: Only report collisions involving this object ID
         
         Returns:
             List of collision pairs
@@ -167,94 +265,81 @@ class CollisionDetector:
             logger.error("FreeCAD required for collision detection")
             return []
         
-        import Part
-        
-        collisions = []
-        
-        # Compute AABBs for all shapes
-        shape_data = []
-        for obj_id, shape in shapes:
-            if shape and not shape.isNull():
-                aabb = self._compute_aabb(shape)
-                shape_data.append((obj_id, shape, aabb))
-        
-        if not shape_data:
+        shape_data = [
+            (obj_id, shape) for obj_id, shape in shapes
+            if shape and not shape.isNull()
+        ]
+        if len(shape_data) < 2:
             return []
         
-        if use_bvh and len(shape_data) > 10:
-            # Use BVH for broad phase when many objects
-            collisions = self._detect_with_bvh(shape_data)
+        boxes = aabb_array(shape for _, shape in shape_data)
+        if use_broad_phase and len(shape_data) > 10:
+            pairs = sweep_and_prune(boxes)
         else:
             # Brute force for small numbers
-            collisions = self._detect_brute_force(shape_data)
+            pairs = _brute_force_pairs(boxes)
         
-        return collisions
-    
-    def _compute_aabb(self, shape: Any) -> AABB:
-        """Compute AABB for a shape."""
-        bbox = shape.BoundBox
-        return AABB(
-            min_point=[bbox.XMin, bbox.YMin, bbox.ZMin],
-            max_point=[bbox.XMax, bbox.YMax, bbox.ZMax]
-        )
+        if involving is not None:
+            ids = np.array([obj_id == involving for obj_id, _ in shape_data])
+            pairs = pairs[ids[pairs[:, 0]] | ids[pairs[:, 1]]]
+        
+        return self._run_narrow_phase(shape_data, pairs)
     
-    def _detect_with_bvh(self, shape_data: List[Tuple[str, Any, AABB]]) -> List[CollisionPair]:
-        """Detect collisions using BVH acceleration."""
-        # Build BVH
-        bvh = BVHNode(shape_data)
+    def _run_narrow_phase(
+        self,
+        shape_data: List[Tuple[str, Any]],
+        pairs: np.ndarray
+    ) -> List[CollisionPair]:
+        """Run the narrow phase on candidate index pairs, in parallel when worthwhile."""
+        if len(pairs) >= self.parallel_threshold and self.narrow_phase_workers > 1:
+            try:
+                return self._run_narrow_phase_parallel(shape_data, pairs)
+            except Exception as e:
+                logger.warning(f"Parallel narrow phase failed, checking pairs in-process: {e}")
         
         collisions = []
-        checked_pairs = set()
-        
-        # Check each object against BVH
-        for i, (id_a, shape_a, aabb_a) in enumerate(shape_data):
-            # Get potential collisions from BVH
-            candidates = bvh.get_potential_collisions(aabb_a)
-            
-            for id_b, shape_b, aabb_b in candidates:
-                if id_a == id_b:
-                    continue
-                
-                # Skip if already checked
-                pair_key = tuple(sorted([id_a, id_b]))
-                if pair_key in checked_pairs:
-                    continue
-                checked_pairs.add(pair_key)
-                
-                # Narrow phase collision check
-                collision = self._check_narrow_phase(
-                    id_a, shape_a,
-                    id_b, shape_b
-                )
-                
-                if collision:
-                    collisions.append(collision)
-        
+        for i, j in pairs.tolist():
+            id_a, shape_a = shape_data[i]
+            id_b, shape_b = shape_data[j]
+            collision = self._check_narrow_phase(id_a, shape_a, id_b, shape_b)
+            if collision:
+                collisions.append(collision)
         return collisions
     
-    def _detect_brute_force(self, shape_data: List[Tuple[str, Any, AABB]]) -> List[CollisionPair]:
-        """Detect collisions using brute force O(n²) approach."""
-        collisions = []
+    def _run_narrow_phase_parallel(
+        self,
+        shape_data: List[Tuple[str, Any]],
+        pairs: np.ndarray
+    ) -> List[CollisionPair]:
+        """
+        Fan candidate pairs out to worker processes.
         
-        for i in range(len(shape_data)):
-            id_a, shape_a, aabb_a = shape_data[i]
-            
-            for j in range(i + 1, len(shape_data)):
-                id_b, shape_b, aabb_b = shape_data[j]
-                
-                # Broad phase: check AABB overlap
-                if not aabb_a.overlaps(aabb_b):
-                    continue
-                
-                # Narrow phase: accurate collision check
-                collision = self._check_narrow_phase(
-                    id_a, shape_a,
-                    id_b, shape_b
-                )
-                
-                if collision:
-                    collisions.append(collision)
+        Shapes cross the process boundary as BREP strings; each shape is
+        serialized once and sent only with the chunks that reference it.
+        """
+        breps: Dict[int, str] = {}
+        tasks = []
+        for start in range(0, len(pairs), NARROW_PHASE_CHUNK_SIZE):
+            chunk = pairs[start:start + NARROW_PHASE_CHUNK_SIZE].tolist()
+            chunk_breps = {}
+            for index in {index for pair in chunk for index in pair}:
+                if index not in breps:
+                    breps[index] = shape_data[index][1].exportBrepToString()
+                chunk_breps[shape_data[index][0]] = breps[index]
+            tasks.append((
+                chunk_breps,
+                [(shape_data[i][0], shape_data[j][0]) for i, j in chunk]
+            ))
         
+        collisions = []
+        with ProcessPoolExecutor(max_workers=min(self.narrow_phase_workers, len(tasks))) as pool:
+            futures = [
+                pool.submit(_narrow_phase_task, chunk_breps, id_pairs, self.collision_threshold)
+                for chunk_breps, id_pairs in tasks
+            ]
+            # Collect in submission order so results are deterministic
+            for future in futures:
+                collisions.extend(future.result())
         return collisions
     
     def _check_narrow_phase(
@@ -274,44 +359,7 @@ class CollisionDetector:
         Returns:
             CollisionPair if collision detected, None otherwise
         """
-        try:
-            import Part
-            
-            # Compute intersection using BRepAlgoAPI_Common
-            intersection = shape_a.common(shape_b)
-            
-            if intersection.isNull():
-                return None
-            
-            # Check volume
-            volume = intersection.Volume
-            if volume < self.collision_threshold:
-                return None
-            
-            # Get contact information
-            contact_bbox = self._compute_aabb(intersection)
-            
-            # Sample contact points (simplified)
-            contact_points = []
-            if intersection.Vertexes:
-                for vertex in intersection.Vertexes[:10]:  # Limit to 10 points
-                    contact_points.append([
-                        vertex.Point.x,
-                        vertex.Point.y,
-                        vertex.Point.z
-                    ])
-            
-            return CollisionPair(
-                object_a=id_a,
-                object_b=id_b,
-                collision_volume=volume,
-                contact_bbox=contact_bbox,
-                contact_points=contact_points
-            )
-            
-        except Exception as e:
-            logger.debug(f"Narrow phase collision check failed: {e}")
-            return None
+        return _check_shape_pair(id_a, shape_a, id_b, shape_b, self.collision_threshold)
     
     def check_clearance(
         self,
@@ -44,6 +44,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from ...core.logging import get_logger
 from ...core.metrics import freecad_operation_duration_seconds
 from ...core.telemetry import create_span
+from .step_canonicalizer import canonicalize_step_file
 
 # Import metrics extractor for Task 7.10
 try:
@@ -630,11 +631,11 @@ class UnifiedDeterministicExporter:
         # We post-process for full determinism
         shape.exportStep(str(path))
         
-        # Post-process for determinism
-        self._canonicalize_step_file(path)
-        
-        # Compute hash
-        file_hash = self._compute_file_hash(path)
+        # Post-process for determinism; the canonicalizing pass also hashes
+        file_hash = self._canonicalize_step_file(path)
+        if file_hash is None:
+            self._hash_cache.pop(str(path), None)
+            file_hash = self._compute_file_hash(path)
         
         # Store metadata
         self.metadata.hash_values["STEP"] = file_hash
@@ -653,75 +654,73 @@ class UnifiedDeterministicExporter:
             "deterministic": True
         }
     
-    def _canonicalize_step_file(self, path: Path):
+    def _canonicalize_step_file(self, path: Path) -> Optional[str]:
         """
         Canonicalize STEP file for determinism.
         
-        Removes timestamps, GUIDs, usernames, and ensures consistent formatting.
+        Removes timestamps, GUIDs, usernames, and ensures consistent formatting
+        in the HEADER section. The file is streamed once: the DATA section is
+        copied through a fixed-size buffer while structure is validated and
+        the SHA-256 is computed.
+        
+        Returns:
+            SHA-256 of the canonical file, or None if it was left unchanged
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Split into header and data sections
-            header_match = re.search(r'(HEADER;.*?ENDSEC;)', content, re.DOTALL)
-            if not header_match:
-                logger.warning("Could not identify HEADER section in STEP file")
-                return
-            
-            header_section = header_match.group(1)
-            header_start, header_end = header_match.span()
-            
-            # Clean header section
-            cleaned_header = header_section
-            
-            # Replace all timestamps with fixed date
-            cleaned_header = self.STEP_TIMESTAMP_PATTERN.sub(
-                f"'{self.source_date.isoformat()}'",
-                cleaned_header
-            )
-            
-            # Replace GUIDs with deterministic values
-            cleaned_header = self.STEP_GUID_PATTERN.sub(
-                "'00000000-0000-0000-0000-000000000000'",
-                cleaned_header
-            )
-            
-            # Replace usernames/emails
-            cleaned_header = self.STEP_USERNAME_PATTERN.sub(
-                "'deterministic@export'",
-                cleaned_header
-            )
-            
-            # Specific patterns for FILE_NAME and FILE_DESCRIPTION
-            cleaned_header = re.sub(
-                r"(FILE_NAME\s*\([^,]+,\s*)('[^']+')(\s*,)",
-                rf"\1'{self.source_date.isoformat()}'\3",
-                cleaned_header
-            )
-            cleaned_header = re.sub(
-                r"(FILE_DESCRIPTION\s*\([^,]+,\s*)('[^']+')(\s*\))",
-                rf"\1'1'\3",  # Fixed version number
-                cleaned_header
-            )
-            
-            # Canonicalize floating point numbers in header
-            cleaned_header = self._canonicalize_floats(cleaned_header)
-            
-            # Reconstruct file
-            content = content[:header_start] + cleaned_header + content[header_end:]
-            
-            # Validate structure
-            if not self._validate_step_structure(content):
-                logger.warning("STEP validation failed after canonicalization")
-                return
-            
-            # Write back
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        
+            result = canonicalize_step_file(path, self._canonicalize_step_header)
         except Exception as e:
             logger.warning(f"Could not canonicalize STEP file: {e}")
+            return None
+        
+        if result is None:
+            logger.warning("Could not identify HEADER section in STEP file")
+            return None
+        
+        if not result.valid:
+            for marker in result.missing_markers:
+                logger.warning(f"STEP file missing required marker: {marker}")
+            logger.warning("STEP validation failed after canonicalization")
+            return None
+        
+        self._hash_cache[str(path)] = result.sha256
+        return result.sha256
+    
+    def _canonicalize_step_header(self, header_section: str) -> str:
+        """Clean the HEADER; ... ENDSEC; section of a STEP file."""
+        cleaned_header = header_section
+        
+        # Replace all timestamps with fixed date
+        cleaned_header = self.STEP_TIMESTAMP_PATTERN.sub(
+            f"'{self.source_date.isoformat()}'",
+            cleaned_header
+        )
+        
+        # Replace GUIDs with deterministic values
+        cleaned_header = self.STEP_GUID_PATTERN.sub(
+            "'00000000-0000-0000-0000-000000000000'",
+            cleaned_header
+        )
+        
+        # Replace usernames/emails
+        cleaned_header = self.STEP_USERNAME_PATTERN.sub(
+            "'deterministic@export'",
+            cleaned_header
+        )
+        
+        # Specific patterns for FILE_NAME and FILE_DESCRIPTION
+        cleaned_header = re.sub(
+            r"(FILE_NAME\s*\([^,]+,\s*)('[^']+')(\s*,)",
+            rf"\1'{self.source_date.isoformat()}'\3",
+            cleaned_header
+        )
+        cleaned_header = re.sub(
+            r"(FILE_DESCRIPTION\s*\([^,]+,\s*)('[^']+')(\s*\))",
+            rf"\1'1'\3",  # Fixed version number
+            cleaned_header
+        )
+        
+        # Canonicalize floating point numbers in header
+        return self._canonicalize_floats(cleaned_header)
     
     def _canonicalize_floats(self, text: str) -> str:
         """Canonicalize floating point representation."""
@@ -741,23 +740,6 @@ class UnifiedDeterministicExporter:
         float_pattern = re.compile(r'-?\d+\.?\d*(?:[eE][+-]?\d+)?')
         return float_pattern.sub(float_replacer, text)
     
-    def _validate_step_structure(self, content: str) -> bool:
-        """Validate STEP file structure."""
-        required_markers = [
-            'ISO-10303-21',
-            'HEADER',
-            'ENDSEC',
-            'DATA',
-            'END-ISO-10303-21'
-        ]
-        
-        for marker in required_markers:
-            if marker not in content:
-                logger.warning(f"STEP file missing required marker: {marker}")
-                return False
-        
-        return True
-    
     def _export_stl_unified(self, document: Any, base_path: Path) -> Dict[str, Any]:
         """
         Export STL with fixed mesh parameters for determinism.
@@ -795,12 +777,9 @@ class UnifiedDeterministicExporter:
             Relative=False  # Use absolute values
         )
         
-        # Sort mesh facets for deterministic ordering
-        if self._numpy_available:
-            self._sort_mesh_facets(mesh)
-        
-        # Write binary STL (more compact and consistent)
-        mesh.write(str(path), "STL")
+        # Write binary STL (more compact and consistent) with facets in
+        # canonical order, straight from a coordinate array
+        self._write_canonical_stl(mesh, path)
         
         # Compute hash
         file_hash = self._compute_file_hash(path)
@@ -825,57 +804,26 @@ class UnifiedDeterministicExporter:
             "deterministic": True
         }
     
-    def _sort_mesh_facets(self, mesh):
+    def _write_canonical_stl(self, mesh, path: Path):
         """
-        Sort mesh facets for deterministic ordering.
+        Write the mesh as binary STL with facets in canonical order.
         
-        Reconstructs the mesh with facets sorted by their vertex coordinates
-        to ensure consistent STL output regardless of creation method.
+        Facets are sorted by their vertex coordinates so the output does not
+        depend on tessellation order. Falls back to FreeCAD's writer (valid,
+        but not order-canonical) when numpy or the mesh topology is unavailable.
         """
-        try:
-            import FreeCAD
-            import Mesh as MeshModule
-            
-            # Extract all facets with their points
-            facet_data = []
-            for i in range(mesh.CountFacets):
-                facet = mesh.Facets[i]
-                points = facet.Points
-                
-                # Create sortable tuple of all 9 coordinates (3 points x 3 coords)
-                # This ensures deterministic ordering based on spatial position
-                sort_key = (
-                    round(points[0][0], 6), round(points[0][1], 6), round(points[0][2], 6),
-                    round(points[1][0], 6), round(points[1][1], 6), round(points[1][2], 6),
-                    round(points[2][0], 6), round(points[2][1], 6), round(points[2][2], 6)
-                )
+        if self._numpy_available:
+            try:
+                from .canonical_stl import mesh_triangles, write_canonical_stl
                 
-                # Store both the sort key and the actual points
-                facet_data.append((sort_key, points))
-            
-            # Sort facets by their spatial coordinates
-            facet_data.sort(key=lambda x: x[0])
-            
-            # Create a new mesh with sorted facets
-            new_mesh = MeshModule.Mesh()
-            for _, points in facet_data:
-                # Add each facet to the new mesh using FreeCAD Vectors
-                new_mesh.addFacet(
-                    FreeCAD.Vector(points[0][0], points[0][1], points[0][2]),
-                    FreeCAD.Vector(points[1][0], points[1][1], points[1][2]),
-                    FreeCAD.Vector(points[2][0], points[2][1], points[2][2])
-                )
-            
-            # Replace the original mesh's internal structure with sorted one
-            # This modifies the mesh in-place to maintain any document references
-            mesh.clear()
-            mesh.addMesh(new_mesh)
-            
-            logger.debug(f"Successfully sorted {mesh.CountFacets} mesh facets for deterministic output")
-            
-        except Exception as e:
-            # Log but don't fail - unsorted mesh is still valid, just not deterministic
-            logger.warning(f"Could not sort mesh facets for deterministic output: {e}")
+                facet_count = write_canonical_stl(path, mesh_triangles(mesh))
+                logger.debug(f"Wrote {facet_count} canonically sorted mesh facets")
+                return
+            except Exception as e:
+                # Log but don't fail - unsorted mesh is still valid, just not deterministic
+                logger.warning(f"Could not write canonical STL, using FreeCAD writer: {e}")
+        
+        mesh.write(str(path), "STL")
     
     def _export_glb_unified(self, document: Any, base_path: Path) -> Dict[str, Any]:
         """
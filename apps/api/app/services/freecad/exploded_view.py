@@ -365,7 +365,7 @@ class ExplodedViewGenerator:
         component_lookup: Optional[Dict[str, Any]] = None
     ) -> List[float]:
         """
-        Adjust position to avoid collisions with other exploded components using BVH-based collision detection.
+        Adjust position to avoid collisions with other exploded components using AABB-filtered collision detection.
         
         Args:
             comp_id: Component identifier
@@ -379,7 +379,7 @@ class ExplodedViewGenerator:
         Returns:
             Adjusted position to avoid collisions
         """
-        from .collision import CollisionDetector
+        from .collision import CollisionDetector, aabb_row, overlapping_indices
         
         if not hasattr(obj, 'Shape') or not obj.Shape:
             return exploded_pos
@@ -393,8 +393,26 @@ class ExplodedViewGenerator:
             # Initialize collision detector
             detector = CollisionDetector()
             
-            # Build list of transformed shapes for collision detection
             import FreeCAD
+            
+            # Broad phase on translated bounding boxes: only components whose
+            # exploded AABB overlaps the proposed one need a shape copy
+            # Since ExplodedComponent doesn't have a 'shape' attribute, retrieve the shape from the original component
+            placed = []
+            for other in already_exploded:
+                # Use O(1) lookup instead of O(N) linear search
+                orig_obj = component_lookup.get(other.component_id)
+                if orig_obj and hasattr(orig_obj, 'Shape') and orig_obj.Shape:
+                    placed.append((other, orig_obj))
+            
+            candidates = overlapping_indices(
+                aabb_row(obj.Shape.BoundBox, exploded_pos),
+                [aabb_row(orig_obj.Shape.BoundBox, other.exploded_position) for other, orig_obj in placed]
+            )
+            if len(candidates) == 0:
+                return exploded_pos
+            
+            # Build list of transformed shapes for collision detection
             shapes = []
             
             # Add current object transformed to proposed position
@@ -406,23 +424,19 @@ class ExplodedViewGenerator:
             current_shape.transformShape(current_placement.toMatrix())
             shapes.append((comp_id, current_shape))
             
-            # Add already exploded components transformed to their positions
-            # Since ExplodedComponent doesn't have a 'shape' attribute, retrieve the shape from the original component
-            for other in already_exploded:
-                # Use O(1) lookup instead of O(N) linear search
-                orig_obj = component_lookup.get(other.component_id)
-                if orig_obj and hasattr(orig_obj, 'Shape') and orig_obj.Shape:
-                    # Transform shape to exploded position
-                    transformed_shape = orig_obj.Shape.copy()
-                    placement = FreeCAD.Placement(
-                        FreeCAD.Vector(other.exploded_position[0], other.exploded_position[1], other.exploded_position[2]),
-                        FreeCAD.Rotation()
-                    )
-                    transformed_shape.transformShape(placement.toMatrix())
-                    shapes.append((other.component_id, transformed_shape))
+            # Add overlapping exploded components transformed to their positions
+            for index in candidates:
+                other, orig_obj = placed[index]
+                transformed_shape = orig_obj.Shape.copy()
+                placement = FreeCAD.Placement(
+                    FreeCAD.Vector(other.exploded_position[0], other.exploded_position[1], other.exploded_position[2]),
+                    FreeCAD.Rotation()
+                )
+                transformed_shape.transformShape(placement.toMatrix())
+                shapes.append((other.component_id, transformed_shape))
             
-            # Detect collisions using BVH-based detector with transformed shapes
-            collisions = detector.detect_collisions(shapes)
+            # Detect collisions between the current component and its candidates
+            collisions = detector.detect_collisions(shapes, involving=comp_id)
             
             # If collisions detected with current component, adjust position
             current_collisions = [c for c in collisions if comp_id in [c.object_a, c.object_b]]
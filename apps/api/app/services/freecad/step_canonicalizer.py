@@ -0,0 +1,148 @@
+"""
+Streaming STEP Canonicalization for Task 7.9
+
+Rewrites only the HEADER section of a STEP file and copies everything after
+it through a fixed-size buffer. Structure validation and the SHA-256 of the
+output happen in the same pass, so the source is read exactly once and is
+never held in memory as a whole.
+
+The canonical file is written next to the source and swapped in atomically;
+if validation fails the source is left untouched.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+STEP_REQUIRED_MARKERS = (b"ISO-10303-21", b"HEADER", b"ENDSEC", b"DATA", b"END-ISO-10303-21")
+
+# Copy buffer for the DATA section
+STEP_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Give up looking for the end of the HEADER section after this many bytes
+MAX_STEP_HEADER_BYTES = 1024 * 1024
+
+
+@dataclass
+class StepCanonicalizationResult:
+    """Outcome of one streaming pass."""
+    sha256: str
+    size: int
+    missing_markers: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.missing_markers
+
+
+class _MarkerScanner:
+    """Finds required markers in a byte stream, including across chunk boundaries."""
+
+    def __init__(self, markers=STEP_REQUIRED_MARKERS):
+        self.pending = list(markers)
+        self._overlap = max(len(m) for m in markers) - 1
+        self._tail = b""
+
+    def feed(self, chunk) -> None:
+        if not self.pending:
+            return
+        head = bytes(chunk[:self._overlap])
+        joined = self._tail + head
+        self.pending = [
+            m for m in self.pending
+            if m not in joined and chunk.find(m) == -1
+        ]
+        self._tail = (self._tail + bytes(chunk[-self._overlap:]))[-self._overlap:]
+
+
+def _read_through_header(src, buffer_size: int) -> Optional[tuple]:
+    """
+    Read until the first ``ENDSEC;`` after ``HEADER;``.
+
+    Returns (buffer, header_start, header_end), or None if the section was
+    not found within MAX_STEP_HEADER_BYTES.
+    """
+    buffer = bytearray()
+    while len(buffer) <= MAX_STEP_HEADER_BYTES:
+        chunk = src.read(buffer_size)
+        if not chunk:
+            break
+        buffer += chunk
+        start = buffer.find(b"HEADER;")
+        if start == -1:
+            continue
+        end = buffer.find(b"ENDSEC;", start)
+        if end != -1:
+            return buffer, start, end + len(b"ENDSEC;")
+    return None
+
+
+def canonicalize_step_file(
+    path: Path,
+    clean_header: Callable[[str], str],
+    buffer_size: int = STEP_COPY_BUFFER_SIZE
+) -> Optional[StepCanonicalizationResult]:
+    """
+    Canonicalize a STEP file in one streaming pass.
+
+    Args:
+        path: STEP file, replaced in place on success
+        clean_header: Rewrites the ``HEADER; ... ENDSEC;`` text
+        buffer_size: Copy buffer size for the rest of the file
+
+    Returns:
+        Hash, size and missing markers of the canonical output, or None if
+        no HEADER section was found (the file is left untouched)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".canonical.tmp")
+
+    with open(path, "rb") as src:
+        found = _read_through_header(src, buffer_size)
+        if found is None:
+            return None
+        buffer, header_start, header_end = found
+        cleaned = clean_header(buffer[header_start:header_end].decode("utf-8")).encode("utf-8")
+
+        sha256 = hashlib.sha256()
+        scanner = _MarkerScanner()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as dst:
+                for piece in (buffer[:header_start], cleaned, buffer[header_end:]):
+                    dst.write(piece)
+                    sha256.update(piece)
+                    scanner.feed(piece)
+                    size += len(piece)
+                # Only the copy buffer stays alive for the rest of the file
+                del buffer, found
+
+                copy_buffer = bytearray(buffer_size)
+                view = memoryview(copy_buffer)
+                while True:
+                    n = src.readinto(copy_buffer)
+                    if not n:
+                        break
+                    chunk = view[:n]
+                    dst.write(chunk)
+                    sha256.update(chunk)
+                    scanner.feed(copy_buffer if n == buffer_size else copy_buffer[:n])
+                    size += n
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    result = StepCanonicalizationResult(
+        sha256=sha256.hexdigest(),
+        size=size,
+        missing_markers=[m.decode("ascii") for m in scanner.pending]
+    )
+    if result.valid:
+        os.replace(tmp_path, path)
+    else:
+        tmp_path.unlink(missing_ok=True)
+    return result
@@ -11,6 +11,7 @@ Features:
 - Temporary file cleanup with context managers
 - Structured error handling with error codes
 - Process pool for parallel operations
+- Optional warm worker pool (pre-imported freecadcmd processes)
 - Health checks and readiness probes
 - Metrics collection
 - Input sanitization and validation
@@ -54,6 +55,13 @@ from ..services.license_service import LicenseService
 from ..models.license import License
 from ..core import metrics
 from .freecad_document_manager import FreeCADDocumentManager, document_manager, DocumentException, DocumentErrorCode
+from .freecad_worker_pool import (
+    FreeCADWorker,
+    FreeCADWorkerPool,
+    WorkerCrashedError,
+    WorkerPoolError,
+    WorkerTimeoutError,
+)
 from .freecad_rules_engine import (
     FreeCADRulesEngine,
     freecad_rules_engine,
@@ -459,6 +467,13 @@ class UltraEnterpriseFreeCADService:
         )
         self._process_lock = threading.Lock()
         
+        # Warm worker pool is created lazily on first use when enabled
+        self.enable_worker_pool = getattr(settings, 'FREECAD_WORKER_POOL_ENABLED', False)
+        self._worker_pool: Optional[FreeCADWorkerPool] = None
+        self._worker_pool_lock = threading.Lock()
+        # freecadcmd path -> validated version, so --version is not spawned per job
+        self._validated_versions: Dict[str, str] = {}
+        
         # Configuration for document lifecycle (can be disabled for testing or legacy mode)
         self.enable_document_lifecycle = getattr(settings, 'FREECAD_ENABLE_DOCUMENT_LIFECYCLE', True)
         self.require_document_lifecycle = getattr(settings, 'FREECAD_REQUIRE_DOCUMENT_LIFECYCLE', False)
@@ -716,7 +731,12 @@ class UltraEnterpriseFreeCADService:
                     "FreeCADCmd çalıştırılabilir dosyası bulunamadı"
                 )
             
-            version_valid, version = self.validate_freecad_version(freecad_path)
+            version = self._validated_versions.get(freecad_path)
+            version_valid = version is not None
+            if not version_valid:
+                version_valid, version = self.validate_freecad_version(freecad_path)
+                if version_valid and version:
+                    self._validated_versions[freecad_path] = version
             if not version_valid:
                 raise FreeCADException(
                     f"FreeCAD version {version} is not supported. Requires 1.1.0 or higher.",
@@ -1001,14 +1021,15 @@ class UltraEnterpriseFreeCADService:
         ]
         
         # Create environment with restrictions
-        env = os.environ.copy()
-        env.update({
+        job_env = {
             'FREECAD_USER_HOME': str(temp_dir),
             'FREECAD_USER_DATA': str(temp_dir / 'data'),
             'FREECAD_USER_TEMP': str(temp_dir / 'tmp'),
             'PYTHONDONTWRITEBYTECODE': '1',
             'FREECAD_HEADLESS': '1'
-        })
+        }
+        env = os.environ.copy()
+        env.update(job_env)
         
         # Execute subprocess
         start_time = time.time()
@@ -1018,68 +1039,79 @@ class UltraEnterpriseFreeCADService:
         stdout, stderr = None, None
         
         try:
-            # Start process with resource limits
-            if platform.system() == 'Windows':
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=temp_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    env=env,
-                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+            if self.enable_worker_pool:
+                exit_code, stdout, stderr, monitor = self._execute_in_worker_pool(
+                    freecad_path=freecad_path,
+                    script_file=script_file,
+                    params_file=params_file,
+                    temp_dir=temp_dir,
+                    job_env=job_env,
+                    resource_limits=resource_limits,
+                    correlation_id=correlation_id
                 )
             else:
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=temp_dir,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    env=env,
-                    preexec_fn=os.setsid
-                )
+                # Start process with resource limits
+                if platform.system() == 'Windows':
+                    process = subprocess.Popen(
+                        cmd,
+                        cwd=temp_dir,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        env=env,
+                        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+                    )
+                else:
+                    process = subprocess.Popen(
+                        cmd,
+                        cwd=temp_dir,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        env=env,
+                        preexec_fn=os.setsid
+                    )
             
-            # Start monitoring
-            monitor = ProcessMonitor(process.pid, resource_limits)
-            monitor.start_monitoring()
+                # Start monitoring
+                monitor = ProcessMonitor(process.pid, resource_limits)
+                monitor.start_monitoring()
             
-            # Register active process
-            process_key = f"{correlation_id}_{process.pid}"
-            with self._process_lock:
-                self.active_processes[process_key] = monitor
+                # Register active process
+                process_key = f"{correlation_id}_{process.pid}"
+                with self._process_lock:
+                    self.active_processes[process_key] = monitor
             
-            try:
-                # Wait for completion with timeout
-                stdout, stderr = process.communicate(timeout=resource_limits.max_execution_time_seconds)
-                exit_code = process.returncode
+                try:
+                    # Wait for completion with timeout
+                    stdout, stderr = process.communicate(timeout=resource_limits.max_execution_time_seconds)
+                    exit_code = process.returncode
                 
-            except subprocess.TimeoutExpired:
-                logger.warning("freecad_process_timeout", 
-                             pid=process.pid,
-                             timeout_seconds=resource_limits.max_execution_time_seconds,
-                             correlation_id=correlation_id)
+                except subprocess.TimeoutExpired:
+                    logger.warning("freecad_process_timeout", 
+                                 pid=process.pid,
+                                 timeout_seconds=resource_limits.max_execution_time_seconds,
+                                 correlation_id=correlation_id)
                 
-                # Terminate process tree
-                self._terminate_process_tree(process.pid)
+                    # Terminate process tree
+                    self._terminate_process_tree(process.pid)
                 
-                raise FreeCADException(
-                    f"FreeCAD operation exceeded timeout of {resource_limits.max_execution_time_seconds} seconds",
-                    FreeCADErrorCode.TIMEOUT_EXCEEDED,
-                    f"FreeCAD işlemi {resource_limits.max_execution_time_seconds} saniye zaman aşımını aştı"
-                )
+                    raise FreeCADException(
+                        f"FreeCAD operation exceeded timeout of {resource_limits.max_execution_time_seconds} seconds",
+                        FreeCADErrorCode.TIMEOUT_EXCEEDED,
+                        f"FreeCAD işlemi {resource_limits.max_execution_time_seconds} saniye zaman aşımını aştı"
+                    )
             
-            finally:
-                # Stop monitoring and cleanup
-                if monitor:
-                    monitor.stop_monitoring()
-                    monitor.metrics.exit_code = process.returncode if process else None
-                    monitor.metrics.stdout_lines = len(stdout.splitlines()) if stdout else 0
-                    monitor.metrics.stderr_lines = len(stderr.splitlines()) if stderr else 0
+                finally:
+                    # Stop monitoring and cleanup
+                    if monitor:
+                        monitor.stop_monitoring()
+                        monitor.metrics.exit_code = process.returncode if process else None
+                        monitor.metrics.stdout_lines = len(stdout.splitlines()) if stdout else 0
+                        monitor.metrics.stderr_lines = len(stderr.splitlines()) if stderr else 0
                 
-                # Unregister process
-                with self._process_lock:
-                    self.active_processes.pop(process_key, None)
+                    # Unregister process
+                    with self._process_lock:
+                        self.active_processes.pop(process_key, None)
             
             # Check for errors
             if exit_code != 0:
@@ -1150,6 +1182,107 @@ class UltraEnterpriseFreeCADService:
             if process and process.poll() is None:
                 self._terminate_process_tree(process.pid)
     
+    def _get_worker_pool(self, freecad_path: str) -> FreeCADWorkerPool:
+        """Return the warm worker pool, creating it on first use."""
+        with self._worker_pool_lock:
+            if self._worker_pool is None or self._worker_pool.freecad_path != freecad_path:
+                if self._worker_pool is not None:
+                    self._worker_pool.shutdown()
+                preload = [
+                    m.strip() for m in
+                    getattr(settings, 'FREECAD_WORKER_PRELOAD_MODULES', '').split(',')
+                    if m.strip()
+                ]
+                self._worker_pool = FreeCADWorkerPool(
+                    freecad_path=freecad_path,
+                    size=settings.FREECAD_WORKER_POOL_SIZE,
+                    max_jobs_per_worker=settings.FREECAD_WORKER_MAX_JOBS,
+                    max_rss_mb=settings.FREECAD_WORKER_MAX_RSS_MB,
+                    startup_timeout=settings.FREECAD_WORKER_STARTUP_TIMEOUT_SECONDS,
+                    preload_modules=preload
+                )
+                logger.info("freecad_worker_pool_created",
+                          freecad_path=freecad_path,
+                          size=settings.FREECAD_WORKER_POOL_SIZE)
+            return self._worker_pool
+    
+    def _execute_in_worker_pool(
+        self,
+        freecad_path: str,
+        script_file: Path,
+        params_file: Path,
+        temp_dir: Path,
+        job_env: Dict[str, str],
+        resource_limits: ResourceLimits,
+        correlation_id: str
+    ) -> Tuple[int, str, str, ProcessMonitor]:
+        """
+        Run the job script in a warm worker instead of a fresh freecadcmd.
+        
+        Returns (exit_code, stdout, stderr, monitor) exactly like the cold
+        path so the caller's error handling and output collection are shared.
+        A worker that crashes (including a ProcessMonitor memory kill) is
+        reported as a non-zero exit code and replaced by the pool.
+        """
+        pool = self._get_worker_pool(freecad_path)
+        state: Dict[str, Any] = {}
+        
+        def attach_monitor(worker: FreeCADWorker) -> None:
+            # Same per-job memory enforcement as the cold path, on the worker PID
+            monitor = ProcessMonitor(worker.pid, resource_limits)
+            monitor.start_monitoring()
+            process_key = f"{correlation_id}_{worker.pid}"
+            with self._process_lock:
+                self.active_processes[process_key] = monitor
+            state["monitor"] = monitor
+            state["process_key"] = process_key
+        
+        exit_code = DEFAULT_ERROR_EXIT_CODE
+        stdout, stderr = "", ""
+        try:
+            result = pool.run_script(
+                script_path=script_file,
+                argv=[str(params_file), str(temp_dir)],
+                cwd=temp_dir,
+                timeout=resource_limits.max_execution_time_seconds,
+                env=job_env,
+                on_start=attach_monitor
+            )
+            exit_code, stdout, stderr = result.exit_code, result.stdout, result.stderr
+        except WorkerTimeoutError:
+            logger.warning("freecad_worker_timeout",
+                         timeout_seconds=resource_limits.max_execution_time_seconds,
+                         correlation_id=correlation_id)
+            raise FreeCADException(
+                f"FreeCAD operation exceeded timeout of {resource_limits.max_execution_time_seconds} seconds",
+                FreeCADErrorCode.TIMEOUT_EXCEEDED,
+                f"FreeCAD işlemi {resource_limits.max_execution_time_seconds} saniye zaman aşımını aştı"
+            )
+        except WorkerCrashedError as e:
+            logger.error("freecad_worker_crashed",
+                       exit_code=e.exit_code,
+                       stderr=e.stderr_tail[-1000:],
+                       correlation_id=correlation_id)
+            exit_code = e.exit_code if e.exit_code else DEFAULT_ERROR_EXIT_CODE
+            stderr = e.stderr_tail
+        except WorkerPoolError as e:
+            raise FreeCADException(
+                f"FreeCAD worker pool unavailable: {e}",
+                FreeCADErrorCode.RESOURCE_EXHAUSTED,
+                f"FreeCAD çalışan havuzu kullanılamıyor: {e}"
+            ) from e
+        finally:
+            monitor = state.get("monitor")
+            if monitor:
+                monitor.stop_monitoring()
+                monitor.metrics.exit_code = exit_code
+                monitor.metrics.stdout_lines = len(stdout.splitlines()) if stdout else 0
+                monitor.metrics.stderr_lines = len(stderr.splitlines()) if stderr else 0
+                with self._process_lock:
+                    self.active_processes.pop(state["process_key"], None)
+        
+        return exit_code, stdout, stderr, state["monitor"]
+    
     def _terminate_process_tree(self, pid: int):
         """Terminate process and all its children."""
         try:
@@ -1795,6 +1928,12 @@ print(json.dumps(result))
                     logger.error("process_shutdown_error", 
                                process_key=process_key, error=str(e))
         
+        # Stop warm FreeCAD workers
+        with self._worker_pool_lock:
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+                self._worker_pool = None
+        
         logger.info("freecad_service_shutdown_completed")
 
 
@@ -0,0 +1,634 @@
+"""
+Warm FreeCAD Worker Pool
+
+Every cold ``freecadcmd -c script.py`` invocation pays FreeCAD's multi-second
+import and module initialisation cost. For small parametric jobs that start-up
+dominates end-to-end latency. This module keeps a pool of long-lived FreeCAD
+processes that have already imported FreeCAD (and the commonly used
+workbenches) and execute job scripts on request.
+
+Features:
+- Length-prefixed JSON protocol over the worker's stdin/stdout pipes
+- Document, cwd, argv, environment and module state reset between jobs
+- Worker recycling after N jobs or when RSS grows beyond a threshold
+- Per-job timeout: a hung worker is killed and replaced, never reused
+- Crash detection: a worker that dies mid-job is reported and replaced
+- PID exposed per job so ``ProcessMonitor`` keeps enforcing memory limits
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import queue
+import shutil
+import signal
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+import psutil
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 4-byte big-endian length prefix followed by a UTF-8 JSON payload
+_FRAME_HEADER = struct.Struct(">I")
+_MAX_FRAME_BYTES = 64 * 1024 * 1024
+_STDERR_TAIL_LINES = 200
+
+# Bootstrap executed once per worker by freecadcmd. It imports FreeCAD up
+# front, then serves jobs until stdin is closed. The protocol uses private
+# duplicates of fd 0/1; the real fd 1 is pointed at stderr so that C-level
+# console output from FreeCAD can never corrupt a frame.
+WORKER_BOOTSTRAP_SCRIPT = r'''
+import contextlib
+import gc
+import io
+import json
+import os
+import struct
+import sys
+import time
+import traceback
+
+_HEADER = struct.Struct(">I")
+_proto_in = os.fdopen(os.dup(0), "rb", buffering=0)
+_proto_out = os.fdopen(os.dup(1), "wb", buffering=0)
+_devnull = os.open(os.devnull, os.O_RDONLY)
+os.dup2(_devnull, 0)
+os.dup2(2, 1)
+
+try:
+    import FreeCAD
+except ImportError:
+    FreeCAD = None
+
+for _name in filter(None, os.environ.get("FREECAD_WORKER_PRELOAD", "").split(",")):
+    try:
+        __import__(_name.strip())
+    except Exception as _exc:
+        sys.stderr.write("preload failed for %s: %s\n" % (_name, _exc))
+
+
+def _read_exact(size):
+    buf = b""
+    while len(buf) < size:
+        chunk = _proto_in.read(size - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+
+def _recv():
+    header = _read_exact(_HEADER.size)
+    if header is None:
+        return None
+    payload = _read_exact(_HEADER.unpack(header)[0])
+    return None if payload is None else json.loads(payload.decode("utf-8"))
+
+
+def _send(message):
+    payload = json.dumps(message).encode("utf-8")
+    _proto_out.write(_HEADER.pack(len(payload)) + payload)
+    _proto_out.flush()
+
+
+def _close_documents():
+    if FreeCAD is None:
+        return
+    for doc_name in list(FreeCAD.listDocuments().keys()):
+        try:
+            FreeCAD.closeDocument(doc_name)
+        except Exception:
+            pass
+
+
+_base_cwd = os.getcwd()
+_base_argv = list(sys.argv)
+_base_environ = dict(os.environ)
+_base_modules = set(sys.modules)
+
+
+def _reset_state():
+    _close_documents()
+    os.chdir(_base_cwd)
+    sys.argv = list(_base_argv)
+    os.environ.clear()
+    os.environ.update(_base_environ)
+    for module_name in set(sys.modules) - _base_modules:
+        sys.modules.pop(module_name, None)
+    gc.collect()
+
+
+def _run_job(request):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    started = time.monotonic()
+    try:
+        os.environ.update(request.get("env") or {})
+        os.chdir(request["cwd"])
+        sys.argv = [request["script_path"]] + list(request.get("argv") or [])
+        with open(request["script_path"], "r", encoding="utf-8") as f:
+            code = compile(f.read(), request["script_path"], "exec")
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exec(code, {"__name__": "__main__", "__file__": request["script_path"]})
+            except SystemExit as exc:
+                if exc.code is None:
+                    exit_code = 0
+                elif isinstance(exc.code, int):
+                    exit_code = exc.code
+                else:
+                    stderr.write(str(exc.code) + "\n")
+                    exit_code = 1
+    except BaseException:
+        stderr.write(traceback.format_exc())
+        exit_code = 1
+    finally:
+        _reset_state()
+    return {
+        "type": "result",
+        "job_id": request.get("job_id"),
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "elapsed_ms": int((time.monotonic() - started) * 1000),
+    }
+
+
+_send({"type": "ready", "pid": os.getpid()})
+while True:
+    _request = _recv()
+    if _request is None or _request.get("type") == "shutdown":
+        break
+    _send(_run_job(_request))
+'''
+
+
+class WorkerPoolError(Exception):
+    """Base error for worker pool failures."""
+
+
+class WorkerStartupError(WorkerPoolError):
+    """Worker process failed to come up within the startup timeout."""
+
+
+class WorkerTimeoutError(WorkerPoolError):
+    """Job exceeded its timeout; the worker has been killed."""
+
+
+class WorkerCrashedError(WorkerPoolError):
+    """Worker process exited while running a job."""
+
+    def __init__(self, message: str, exit_code: Optional[int], stderr_tail: str):
+        super().__init__(message)
+        self.exit_code = exit_code
+        self.stderr_tail = stderr_tail
+
+
+@dataclass
+class WorkerJobResult:
+    """Result of one script executed in a warm worker."""
+    exit_code: int
+    stdout: str
+    stderr: str
+    elapsed_ms: int
+    worker_pid: int
+    rss_mb: float
+
+
+@dataclass
+class WorkerPoolStats:
+    """Lifetime counters for a worker pool."""
+    spawned: int = 0
+    recycled: int = 0
+    crashed: int = 0
+    timed_out: int = 0
+    jobs_completed: int = 0
+    recycle_reasons: Dict[str, int] = field(default_factory=dict)
+
+
+class FreeCADWorker:
+    """A single long-lived freecadcmd process speaking the frame protocol."""
+
+    def __init__(self, freecad_path: str, bootstrap_path: Path, home_dir: Path,
+                 env: Optional[Dict[str, str]] = None):
+        self.freecad_path = freecad_path
+        self.bootstrap_path = bootstrap_path
+        self.home_dir = home_dir
+        self.env = env or {}
+        self.process: Optional[subprocess.Popen] = None
+        self.jobs_completed = 0
+        self._responses: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._stderr_tail: Deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        self._write_lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, startup_timeout: float) -> None:
+        """Spawn the process and wait until FreeCAD is imported and ready."""
+        env = os.environ.copy()
+        env.update({
+            'FREECAD_USER_HOME': str(self.home_dir),
+            'FREECAD_USER_DATA': str(self.home_dir / 'data'),
+            'FREECAD_USER_TEMP': str(self.home_dir / 'tmp'),
+            'PYTHONDONTWRITEBYTECODE': '1',
+            'FREECAD_HEADLESS': '1',
+        })
+        env.update(self.env)
+
+        popen_kwargs: Dict[str, Any] = {
+            "cwd": str(self.home_dir),
+            "stdin": subprocess.PIPE,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.PIPE,
+            "env": env,
+        }
+        if platform.system() == 'Windows':
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs["preexec_fn"] = os.setsid
+
+        self.process = subprocess.Popen(
+            [self.freecad_path, "-c", str(self.bootstrap_path)],
+            **popen_kwargs
+        )
+        threading.Thread(target=self._read_frames, daemon=True).start()
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+
+        try:
+            ready = self._responses.get(timeout=startup_timeout)
+        except queue.Empty:
+            self.kill()
+            raise WorkerStartupError(
+                f"FreeCAD worker did not become ready within {startup_timeout}s"
+            )
+        if not ready or ready.get("type") != "ready":
+            self.kill()
+            raise WorkerStartupError(
+                f"FreeCAD worker exited during startup: {self.stderr_tail()[-500:]}"
+            )
+
+    def run(self, script_path: Path, argv: List[str], cwd: Path,
+            env: Optional[Dict[str, str]], timeout: float) -> WorkerJobResult:
+        """Run one script; raises on timeout or crash."""
+        if not self.is_alive():
+            raise WorkerCrashedError("FreeCAD worker is not running", self._returncode(), self.stderr_tail())
+
+        request = {
+            "type": "job",
+            "script_path": str(script_path),
+            "argv": [str(a) for a in argv],
+            "cwd": str(cwd),
+            "env": env or {},
+        }
+        payload = json.dumps(request).encode("utf-8")
+        try:
+            with self._write_lock:
+                self.process.stdin.write(_FRAME_HEADER.pack(len(payload)) + payload)
+                self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerCrashedError(
+                f"FreeCAD worker pipe closed: {e}", self._returncode(), self.stderr_tail()
+            ) from e
+
+        try:
+            response = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise WorkerTimeoutError(f"FreeCAD job exceeded timeout of {timeout} seconds")
+
+        if response is None:
+            # Reader hit EOF: the worker died (OOM kill, segfault, ProcessMonitor)
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.kill()
+            raise WorkerCrashedError(
+                "FreeCAD worker exited while running a job",
+                self._returncode(),
+                self.stderr_tail(),
+            )
+
+        self.jobs_completed += 1
+        return WorkerJobResult(
+            exit_code=int(response.get("exit_code", 1)),
+            stdout=response.get("stdout", ""),
+            stderr=response.get("stderr", ""),
+            elapsed_ms=int(response.get("elapsed_ms", 0)),
+            worker_pid=self.pid or 0,
+            rss_mb=self.rss_mb(),
+        )
+
+    def rss_mb(self) -> float:
+        """Current resident set size of the worker in MB (0 if gone)."""
+        try:
+            return psutil.Process(self.pid).memory_info().rss / (1024 * 1024)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, TypeError, ValueError):
+            return 0.0
+
+    def stderr_tail(self) -> str:
+        return "".join(self._stderr_tail)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit cleanly, killing it if it does not."""
+        if not self.is_alive():
+            return
+        try:
+            payload = json.dumps({"type": "shutdown"}).encode("utf-8")
+            with self._write_lock:
+                self.process.stdin.write(_FRAME_HEADER.pack(len(payload)) + payload)
+                self.process.stdin.flush()
+                self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except Exception:
+            self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker and its whole process group."""
+        if not self.process or self.process.poll() is not None:
+            return
+        try:
+            if platform.system() == 'Windows':
+                subprocess.run(
+                    ["taskkill", "/T", "/F", "/PID", str(self.process.pid)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=10
+                )
+            else:
+                os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        except Exception as e:
+            logger.error("freecad_worker_kill_failed", pid=self.process.pid, error=str(e))
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def _returncode(self) -> Optional[int]:
+        return self.process.poll() if self.process else None
+
+    def _read_frames(self) -> None:
+        stream = self.process.stdout
+        try:
+            while True:
+                header = stream.read(_FRAME_HEADER.size)
+                if len(header) < _FRAME_HEADER.size:
+                    break
+                (size,) = _FRAME_HEADER.unpack(header)
+                if size > _MAX_FRAME_BYTES:
+                    logger.error("freecad_worker_frame_too_large", pid=self.pid, size=size)
+                    break
+                payload = stream.read(size)
+                if len(payload) < size:
+                    break
+                self._responses.put(json.loads(payload.decode("utf-8")))
+        except Exception as e:
+            logger.warning("freecad_worker_reader_stopped", pid=self.pid, error=str(e))
+        finally:
+            self._responses.put(None)
+
+    def _drain_stderr(self) -> None:
+        try:
+            for line in iter(self.process.stderr.readline, b""):
+                self._stderr_tail.append(line.decode("utf-8", errors="replace"))
+        except Exception:
+            pass
+
+
+class FreeCADWorkerPool:
+    """
+    Bounded pool of warm FreeCAD workers.
+
+    Workers are spawned lazily up to ``size`` and handed out one job at a
+    time. After each job a worker is recycled when it has served
+    ``max_jobs_per_worker`` jobs or its RSS exceeds ``max_rss_mb``; workers
+    that timed out or crashed are always discarded.
+    """
+
+    def __init__(
+        self,
+        freecad_path: str,
+        size: int = 4,
+        max_jobs_per_worker: int = 50,
+        max_rss_mb: float = 1536.0,
+        startup_timeout: float = 60.0,
+        acquire_timeout: Optional[float] = None,
+        preload_modules: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+    ):
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+        self.freecad_path = freecad_path
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.startup_timeout = startup_timeout
+        self.acquire_timeout = acquire_timeout
+        self.stats = WorkerPoolStats()
+
+        self._env = dict(env or {})
+        if preload_modules:
+            self._env['FREECAD_WORKER_PRELOAD'] = ",".join(preload_modules)
+
+        self._base_dir = Path(tempfile.mkdtemp(prefix="freecad_pool_"))
+        self._bootstrap_path = self._base_dir / "worker_bootstrap.py"
+        self._bootstrap_path.write_text(WORKER_BOOTSTRAP_SCRIPT, encoding="utf-8")
+
+        self._idle: Deque[FreeCADWorker] = deque()
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def lease(self) -> Iterator[FreeCADWorker]:
+        """Borrow a warm worker for a single job."""
+        worker = self._acquire()
+        healthy = False
+        try:
+            yield worker
+            healthy = True
+        finally:
+            self._release(worker, healthy)
+
+    def run_script(
+        self,
+        script_path: Path,
+        argv: List[str],
+        cwd: Path,
+        timeout: float,
+        env: Optional[Dict[str, str]] = None,
+        on_start: Optional[Callable[[FreeCADWorker], None]] = None,
+    ) -> WorkerJobResult:
+        """
+        Execute ``script_path`` in a warm worker.
+
+        ``on_start`` is invoked with the leased worker right before the job is
+        sent, which is where callers attach per-job resource monitoring.
+        """
+        with self.lease() as worker:
+            if on_start:
+                on_start(worker)
+            try:
+                return worker.run(script_path, argv, cwd, env, timeout)
+            except WorkerTimeoutError:
+                with self._cond:
+                    self.stats.timed_out += 1
+                raise
+            except WorkerCrashedError:
+                with self._cond:
+                    self.stats.crashed += 1
+                raise
+
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """Pre-spawn workers so the first jobs do not pay the start-up cost."""
+        target = min(count or self.size, self.size)
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or self._total >= target:
+                    break
+                self._total += 1
+            try:
+                worker = self._spawn()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(worker)
+                self._cond.notify()
+            started += 1
+        return started
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; leased workers are stopped on release."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.shutdown()
+            shutil.rmtree(worker.home_dir, ignore_errors=True)
+        self._remove_base_dir_if_unused()
+
+    def _remove_base_dir_if_unused(self) -> None:
+        """Delete the pool's temp dir once it is shut down and no worker is leased."""
+        with self._cond:
+            if not self._closed or self._total:
+                return
+        shutil.rmtree(self._base_dir, ignore_errors=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool state for health checks and metrics."""
+        with self._cond:
+            return {
+                "size": self.size,
+                "workers": self._total,
+                "idle": len(self._idle),
+                "busy": self._total - len(self._idle),
+                "spawned": self.stats.spawned,
+                "recycled": self.stats.recycled,
+                "crashed": self.stats.crashed,
+                "timed_out": self.stats.timed_out,
+                "jobs_completed": self.stats.jobs_completed,
+                "recycle_reasons": dict(self.stats.recycle_reasons),
+            }
+
+    def _acquire(self) -> FreeCADWorker:
+        deadline = (
+            time.monotonic() + self.acquire_timeout if self.acquire_timeout is not None else None
+        )
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise WorkerPoolError("FreeCAD worker pool is shut down")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.is_alive():
+                        return worker
+                    # Died while idle (e.g. OOM killer); replace it
+                    self._total -= 1
+                    self.stats.crashed += 1
+                if self._total < self.size:
+                    self._total += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise WorkerPoolError("Timed out waiting for an idle FreeCAD worker")
+                self._cond.wait(timeout=remaining)
+
+        try:
+            return self._spawn()
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: FreeCADWorker, healthy: bool) -> None:
+        reason = None
+        if not healthy or not worker.is_alive():
+            reason = "failed"
+        elif worker.jobs_completed >= self.max_jobs_per_worker:
+            reason = "max_jobs"
+        elif self.max_rss_mb and worker.rss_mb() > self.max_rss_mb:
+            reason = "max_rss"
+
+        with self._cond:
+            if healthy:
+                self.stats.jobs_completed += 1
+            if reason is None and not self._closed:
+                self._idle.append(worker)
+                self._cond.notify()
+                return
+            self._total -= 1
+            if reason and reason != "failed":
+                self.stats.recycled += 1
+                self.stats.recycle_reasons[reason] = self.stats.recycle_reasons.get(reason, 0) + 1
+            self._cond.notify()
+
+        if reason:
+            logger.info("freecad_worker_recycled",
+                        pid=worker.pid,
+                        reason=reason,
+                        jobs_completed=worker.jobs_completed)
+        if reason == "failed":
+            worker.kill()
+        else:
+            worker.shutdown()
+        shutil.rmtree(worker.home_dir, ignore_errors=True)
+        self._remove_base_dir_if_unused()
+
+    def _spawn(self) -> FreeCADWorker:
+        home_dir = Path(tempfile.mkdtemp(prefix="worker_", dir=self._base_dir))
+        worker = FreeCADWorker(self.freecad_path, self._bootstrap_path, home_dir, self._env)
+        started = time.monotonic()
+        worker.start(self.startup_timeout)
+        with self._cond:
+            self.stats.spawned += 1
+        logger.info("freecad_worker_spawned",
+                    pid=worker.pid,
+                    startup_ms=int((time.monotonic() - started) * 1000))
+        return worker
@@ -26,6 +26,8 @@ from ..models.validation_models import (
     ValidationSeverity
 )
 from ..utils.freecad_utils import get_shape_from_document
+from .geometry_cache import wall_thickness_cache
+from .wall_thickness_engine import WallThicknessEngine, WallThicknessResult
 
 logger = get_logger(__name__)
 
@@ -83,108 +85,41 @@ class TopologyCheck:
 
 
 class WallThicknessAnalyzer:
-    """Analyzer for wall thickness using ray casting."""
+    """Analyzer for wall thickness using batched ray casting on a tessellation."""
     
-    def __init__(self, resolution: int = 20):
-        """Initialize with reasonable resolution (20x20x20 = 8K points instead of 100x100x100 = 1M points)."""
-        self.resolution = resolution
+    def __init__(self, mesh_tolerance: Optional[float] = None, sample_spacing: Optional[float] = None):
+        """
+        Initialize the analyzer.
+        
+        The shape is tessellated once and rays are cast from every surface sample
+        along the inverted normal, instead of sectioning the B-rep per grid point.
+        """
+        self.mesh_tolerance = mesh_tolerance
+        self.sample_spacing = sample_spacing
     
     def analyze(self, shape: Any) -> Dict[Tuple[float, float, float], float]:
         """Analyze wall thickness across the shape."""
-        thickness_map = {}
+        result = self.analyze_faces(shape)
+        return result.as_point_map() if result is not None else {}
+    
+    def analyze_faces(self, shape: Any) -> Optional[WallThicknessResult]:
+        """Per-sample thickness with face indices, cached per shape."""
+        if not hasattr(shape, 'BoundBox'):
+            return None
         
         try:
-            # Get bounding box
-            bbox = shape.BoundBox if hasattr(shape, 'BoundBox') else None
-            if not bbox:
-                return thickness_map
-            
-            # Create sampling grid with adaptive resolution based on size
-            # Use lower resolution for larger models to avoid excessive computation
-            max_dim = max(bbox.XLength, bbox.YLength, bbox.ZLength)
-            if max_dim > 1000:  # Large model (> 1m)
-                effective_resolution = min(self.resolution, 10)
-            elif max_dim > 500:  # Medium model (> 500mm)
-                effective_resolution = min(self.resolution, 15)
-            else:  # Small model
-                effective_resolution = self.resolution
-            
-            x_samples = effective_resolution
-            y_samples = effective_resolution
-            z_samples = effective_resolution
-            
-            x_step = bbox.XLength / x_samples if x_samples > 0 else 1
-            y_step = bbox.YLength / y_samples if y_samples > 0 else 1
-            z_step = bbox.ZLength / z_samples if z_samples > 0 else 1
-            
-            # Sample points and cast rays
-            for i in range(x_samples):
-                for j in range(y_samples):
-                    for k in range(z_samples):
-                        x = bbox.XMin + i * x_step
-                        y = bbox.YMin + j * y_step
-                        z = bbox.ZMin + k * z_step
-                        
-                        # Cast ray in multiple directions
-                        thickness = self._measure_thickness_at_point(
-                            shape, (x, y, z)
-                        )
-                        if thickness > 0:
-                            thickness_map[(x, y, z)] = thickness
-            
+            engine = WallThicknessEngine(
+                mesh_tolerance=self.mesh_tolerance,
+                sample_spacing=self.sample_spacing
+            )
+            return wall_thickness_cache.get_or_compute_analysis(
+                shape,
+                engine.analyze,
+                key=(self.mesh_tolerance, self.sample_spacing)
+            )
         except Exception as e:
             logger.warning(f"Wall thickness analysis error: {e}")
-        
-        return thickness_map
-    
-    def _measure_thickness_at_point(
-        self, 
-        shape: Any, 
-        point: Tuple[float, float, float]
-    ) -> float:
-        """Measure wall thickness at a specific point using ray casting."""
-        try:
-            import Part
-            import FreeCAD
-            
-            # Create point object
-            fc_point = FreeCAD.Vector(point[0], point[1], point[2])
-            
-            # Check if point is inside shape
-            if not shape.isInside(fc_point, 0.01, True):
-                return 0.0
-            
-            # Cast rays in multiple directions to find minimum thickness
-            directions = [
-                FreeCAD.Vector(1, 0, 0),   # +X
-                FreeCAD.Vector(-1, 0, 0),  # -X
-                FreeCAD.Vector(0, 1, 0),   # +Y
-                FreeCAD.Vector(0, -1, 0),  # -Y
-                FreeCAD.Vector(0, 0, 1),   # +Z
-                FreeCAD.Vector(0, 0, -1),  # -Z
-            ]
-            
-            min_thickness = float('inf')
-            
-            for direction in directions:
-                # Create ray line
-                ray_line = Part.LineSegment(fc_point, fc_point + direction * 10000)
-                
-                # Find intersections with shape
-                intersections = shape.section(ray_line.toShape())
-                
-                if intersections and hasattr(intersections, 'Vertexes'):
-                    # Calculate distances to intersection points
-                    for vertex in intersections.Vertexes:
-                        distance = fc_point.distanceToPoint(vertex.Point)
-                        if distance > 0.001:  # Ignore self-intersection
-                            min_thickness = min(min_thickness, distance)
-            
-            return min_thickness if min_thickness != float('inf') else 0.0
-            
-        except Exception as e:
-            logger.warning(f"Thickness measurement error at {point}: {e}")
-            return 0.0
+            return None
 
 
 class GeometricValidator:
@@ -603,22 +538,25 @@ class GeometricValidator:
         """Detect walls thinner than minimum thickness."""
         try:
             # Analyze wall thickness
-            thickness_map = self.wall_analyzer.analyze(shape)
+            result = self.wall_analyzer.analyze_faces(shape)
+            if result is None:
+                return
             
-            thin_sections = []
-            for location, thickness in thickness_map.items():
-                if thickness < tolerances.min_wall_thickness:
-                    thin_sections.append(ThinWallSection(
-                        face_id=0,  # Would be actual face ID
-                        location=location,
-                        thickness=thickness,
-                        min_required=tolerances.min_wall_thickness,
-                        area=1.0  # Would calculate actual area
-                    ))
+            thin_sections = [
+                ThinWallSection(
+                    face_id=region["face_id"],
+                    location=region["location"],
+                    thickness=region["thickness"],
+                    min_required=tolerances.min_wall_thickness,
+                    area=region["area"]
+                )
+                for region in result.thin_regions(tolerances.min_wall_thickness)
+            ]
             
             if thin_sections:
                 validation.thin_walls = [
                     {
+                        "face_id": s.face_id,
                         "location": {"x": s.location[0], "y": s.location[1], "z": s.location[2]},
                         "thickness": s.thickness,
                         "min_required": s.min_required,
@@ -19,6 +19,7 @@ logger = get_logger(__name__)
 # Cache configuration constants
 GEOMETRY_CACHE_SIZE = 128  # Number of cached geometry results
 THICKNESS_CACHE_SIZE = 256  # Number of cached thickness measurements
+THICKNESS_ANALYSIS_CACHE_SIZE = 32  # Number of cached whole-shape thickness analyses
 INTERSECTION_CACHE_SIZE = 512  # Number of cached intersection results
 DEFAULT_CACHE_TTL = 3600  # Cache TTL in seconds (1 hour)
 
@@ -281,12 +282,19 @@ class WallThicknessCache:
     """
     Specialized cache for wall thickness analysis.
     
-    Caches thickness measurements to avoid repeated ray casting.
+    Caches thickness measurements to avoid repeated ray casting, either per
+    point or as one whole-shape analysis.
     """
     
-    def __init__(self, cache_size: int = THICKNESS_CACHE_SIZE):
+    def __init__(
+        self,
+        cache_size: int = THICKNESS_CACHE_SIZE,
+        analysis_cache_size: int = THICKNESS_ANALYSIS_CACHE_SIZE
+    ):
         self._cache = OrderedDict()
         self._max_size = cache_size
+        self._analysis_cache = OrderedDict()
+        self._max_analysis_size = analysis_cache_size
     
     def get_or_compute(
         self,
@@ -329,9 +337,42 @@ class WallThicknessCache:
         
         return thickness
     
+    def get_or_compute_analysis(
+        self,
+        shape: Any,
+        compute_func: Any,
+        key: Any = None
+    ) -> Any:
+        """
+        Get a cached whole-shape thickness analysis or compute it.
+        
+        Args:
+            shape: FreeCAD shape object
+            compute_func: Function taking the shape and returning the analysis
+            key: Analysis settings that change the result (tolerances, spacing)
+        
+        Returns:
+            Result of compute_func for this shape and key
+        """
+        cache_key = f"{geometry_hash(shape)}_{key!r}"
+        
+        if cache_key in self._analysis_cache:
+            logger.debug(f"Wall thickness analysis cache hit for {cache_key}")
+            self._analysis_cache.move_to_end(cache_key)
+            return self._analysis_cache[cache_key]
+        
+        result = compute_func(shape)
+        
+        if len(self._analysis_cache) >= self._max_analysis_size:
+            self._analysis_cache.popitem(last=False)
+        self._analysis_cache[cache_key] = result
+        
+        return result
+    
     def clear(self):
         """Clear the cache."""
         self._cache.clear()
+        self._analysis_cache.clear()
 
 
 class FaceIntersectionCache:
@@ -5,11 +5,13 @@ Delta calculation, block-level deduplication, and efficient storage.
 Implements content-defined chunking (CDC) for optimal deduplication.
 
 Features:
-- Content-defined chunking with Rabin fingerprinting
+- Content-defined chunking with FastCDC (vectorized gear hash) or Rabin
+  fingerprinting, streamed from files instead of whole in-memory buffers
 - Block-level deduplication with content hashing
 - Delta encoding for incremental changes
 - Snapshot chain management
-- Efficient storage with reference counting
+- Efficient storage with reference counting, persisted in segment files
+  with a SQLite index (backup_chunk_store.py)
 - Backup verification and consistency checks
 - Turkish localization for all messages
 """
@@ -19,27 +21,41 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import os
+import queue
 import struct
+import threading
 import time
 import uuid
 from collections import defaultdict
-from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import aiofiles
 from pydantic import BaseModel, Field
 
 from ..core.environment import environment as settings
+from ..core.lazy_loading import lazy_module
 from ..core.logging import get_logger
 from ..core.telemetry import create_span
 from ..core import metrics
 from ..middleware.correlation_middleware import get_correlation_id
 from ..services.profiling_state_manager import state_manager
+from .backup_chunk_store import ChunkInfo, ChunkStoreError, SegmentChunkStore
+
+np = lazy_module("numpy")
 
 logger = get_logger(__name__)
 
+# Backup sources: in-memory data, a file path or a binary file object
+BackupSource = Union[bytes, bytearray, memoryview, str, os.PathLike, BinaryIO]
+
+# Source bytes read per step while streaming
+READ_BLOCK_SIZE = 4 * 1024 * 1024
+# Chunks handed to the chunk store per index transaction (by size)
+STORE_BATCH_BYTES = 16 * 1024 * 1024
+
 
 class ChunkingAlgorithm(str, Enum):
     """Chunking algorithms for deduplication."""
@@ -65,19 +81,9 @@ class BackupType(str, Enum):
     SYNTHETIC = "synthetic"      # Constructed from incrementals
 
 
-@dataclass
-class ChunkInfo:
-    """Information about a data chunk."""
-    chunk_id: str               # Unique chunk identifier (hash)
-    offset: int                 # Offset in original data
-    size: int                   # Chunk size in bytes
-    checksum: str              # Content checksum
-    ref_count: int = 1         # Reference count for deduplication
-
-
 class ChunkingConfig(BaseModel):
     """Configuration for chunking."""
-    algorithm: ChunkingAlgorithm = Field(default=ChunkingAlgorithm.RABIN)
+    algorithm: ChunkingAlgorithm = Field(default=ChunkingAlgorithm.FASTCDC)
     target_chunk_size: int = Field(default=64 * 1024, description="Target chunk size in bytes (64KB)")
     min_chunk_size: int = Field(default=16 * 1024, description="Minimum chunk size (16KB)")
     max_chunk_size: int = Field(default=256 * 1024, description="Maximum chunk size (256KB)")
@@ -116,65 +122,117 @@ class BackupSnapshot(BaseModel):
 
 
 class ChunkStore:
-    """Storage for deduplicated chunks."""
+    """
+    In-memory storage for deduplicated chunks.
+
+    Same interface as SegmentChunkStore, which the manager uses once
+    BACKUP_CHUNK_STORE_DIR is set; this one is lost on restart and holds
+    every chunk in RAM.
+    """
 
     def __init__(self):
         self.chunks: Dict[str, bytes] = {}  # chunk_id -> data
         self.chunk_info: Dict[str, ChunkInfo] = {}  # chunk_id -> info
         self.ref_counts: Dict[str, int] = defaultdict(int)  # chunk_id -> count
-        self._lock = asyncio.Lock()
+        self._lock = threading.RLock()
 
-    async def add_chunk(self, data: bytes, offset: int) -> ChunkInfo:
-        """Add chunk to store with deduplication."""
+    def put_chunks(self, pieces: Iterable[Tuple[int, bytes]]) -> List[ChunkInfo]:
+        """Store a batch of (offset, data) chunks with deduplication."""
+        with self._lock:
+            return [self._put(data, offset) for offset, data in pieces]
+
+    def _put(self, data: bytes, offset: int) -> ChunkInfo:
         chunk_id = hashlib.sha256(data).hexdigest()
 
-        async with self._lock:
-            if chunk_id in self.chunks:
-                # Chunk exists, increment reference count
-                self.ref_counts[chunk_id] += 1
-                info = self.chunk_info[chunk_id]
-                info.ref_count = self.ref_counts[chunk_id]
-                logger.debug("Chunk deduplicated", chunk_id=chunk_id[:8], ref_count=info.ref_count)
-                return info
-
-            # New chunk
-            checksum = hashlib.md5(data).hexdigest()
-            info = ChunkInfo(
-                chunk_id=chunk_id,
-                offset=offset,
-                size=len(data),
-                checksum=checksum,
-                ref_count=1
-            )
+        if chunk_id in self.chunks:
+            # Chunk exists, increment reference count
+            self.ref_counts[chunk_id] += 1
+            info = self.chunk_info[chunk_id]
+            info.ref_count = self.ref_counts[chunk_id]
+            logger.debug("Chunk deduplicated", chunk_id=chunk_id[:8], ref_count=info.ref_count)
+            return ChunkInfo(chunk_id, offset, info.size, info.checksum, info.ref_count)
+
+        # New chunk
+        checksum = hashlib.md5(data).hexdigest()
+        info = ChunkInfo(
+            chunk_id=chunk_id,
+            offset=offset,
+            size=len(data),
+            checksum=checksum,
+            ref_count=1
+        )
 
-            self.chunks[chunk_id] = data
-            self.chunk_info[chunk_id] = info
-            self.ref_counts[chunk_id] = 1
+        self.chunks[chunk_id] = bytes(data)
+        self.chunk_info[chunk_id] = info
+        self.ref_counts[chunk_id] = 1
 
-            logger.debug("New chunk stored", chunk_id=chunk_id[:8], size=len(data))
-            return info
+        logger.debug("New chunk stored", chunk_id=chunk_id[:8], size=len(data))
+        return ChunkInfo(chunk_id, offset, info.size, checksum, 1)
+
+    async def add_chunk(self, data: bytes, offset: int) -> ChunkInfo:
+        """Add chunk to store with deduplication."""
+        return self.put_chunks([(offset, data)])[0]
 
     async def get_chunk(self, chunk_id: str) -> Optional[bytes]:
         """Get chunk data by ID."""
         return self.chunks.get(chunk_id)
 
+    def read_chunks(self, chunk_ids: Iterable[str]) -> Iterator[bytes]:
+        for chunk_id in chunk_ids:
+            data = self.chunks.get(chunk_id)
+            if data is None:
+                raise ChunkStoreError(f"Chunk not found: {chunk_id}")
+            yield data
+
+    def missing(self, chunk_ids: Iterable[str]) -> List[str]:
+        return [chunk_id for chunk_id in dict.fromkeys(chunk_ids) if chunk_id not in self.chunks]
+
+    def add_references(self, chunk_ids: Iterable[str]):
+        with self._lock:
+            for chunk_id in chunk_ids:
+                if chunk_id not in self.chunks:
+                    raise ChunkStoreError(f"Chunk not found: {chunk_id}")
+                self.ref_counts[chunk_id] += 1
+                self.chunk_info[chunk_id].ref_count = self.ref_counts[chunk_id]
+
+    def release(self, chunk_ids: Iterable[str]) -> int:
+        """Drop one reference per listed chunk; returns the number of chunks freed."""
+        freed = 0
+        with self._lock:
+            for chunk_id in chunk_ids:
+                if chunk_id not in self.ref_counts:
+                    continue
+
+                self.ref_counts[chunk_id] -= 1
+
+                if self.ref_counts[chunk_id] <= 0:
+                    # No more references, remove chunk
+                    self.chunks.pop(chunk_id, None)
+                    self.chunk_info.pop(chunk_id, None)
+                    del self.ref_counts[chunk_id]
+                    logger.debug("Chunk removed", chunk_id=chunk_id[:8])
+                    freed += 1
+                else:
+                    self.chunk_info[chunk_id].ref_count = self.ref_counts[chunk_id]
+        return freed
+
     async def remove_chunk(self, chunk_id: str) -> bool:
         """Remove chunk if no references remain."""
-        async with self._lock:
-            if chunk_id not in self.ref_counts:
-                return False
+        return self.release([chunk_id]) == 1
 
-            self.ref_counts[chunk_id] -= 1
+    # Snapshot recipes only live in the manager (and Redis) for this store
 
-            if self.ref_counts[chunk_id] <= 0:
-                # No more references, remove chunk
-                self.chunks.pop(chunk_id, None)
-                self.chunk_info.pop(chunk_id, None)
-                del self.ref_counts[chunk_id]
-                logger.debug("Chunk removed", chunk_id=chunk_id[:8])
-                return True
+    def save_snapshot(self, snapshot_id: str, source_id: str, payload: str):
+        pass
 
-            return False
+    def load_snapshot(self, snapshot_id: str) -> Optional[str]:
+        return None
+
+    def iter_snapshots(self) -> List[Tuple[str, str, str]]:
+        return []
+
+    def drop_snapshot(self, snapshot_id: str, chunk_ids: Iterable[str]) -> int:
+        return self.release(chunk_ids)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get chunk store statistics."""
@@ -191,8 +249,187 @@ class ChunkStore:
         }
 
 
+def iter_source_blocks(source: BackupSource, block_size: int = READ_BLOCK_SIZE) -> Iterator[bytes]:
+    """Read a backup source in blocks: bytes-like data, a file path or a binary file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), block_size):
+            yield bytes(view[start:start + block_size])
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter_source_blocks(f, block_size)
+        return
+
+    while True:
+        block = source.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+# Gear table for FastCDC: fixed forever, since cut points (and therefore
+# deduplication against existing chunks) depend on it
+GEAR_TABLE: Tuple[int, ...] = tuple(
+    int.from_bytes(hashlib.sha256(b"fastcdc-gear" + bytes([i])).digest()[:4], "little")
+    for i in range(256)
+)
+
+
+class FastCDCChunker:
+    """
+    FastCDC content-defined chunking with a 32-bit gear rolling hash.
+
+    The gear hash at byte i is sum(GEAR[b[i-k]] << k) over the last 32
+    bytes, so a whole block is hashed with five NumPy shift-and-add passes
+    instead of a Python loop per byte. Normalized chunking cuts with a
+    stricter mask below the target size and a looser one above it, which
+    keeps chunk sizes close to the target.
+
+    A cut point depends only on the bytes of its own chunk, so chunks are
+    identical however the source is split into read blocks.
+    """
+
+    HASH_WINDOW = 32
+    # Hash arrays of this many positions stay in cache
+    HASH_BLOCK = 64 * 1024
+
+    def __init__(self, config: ChunkingConfig, read_size: int = READ_BLOCK_SIZE):
+        if config.min_chunk_size < self.HASH_WINDOW:
+            raise ValueError(f"min_chunk_size must be at least {self.HASH_WINDOW} bytes")
+        if not config.min_chunk_size <= config.target_chunk_size <= config.max_chunk_size:
+            raise ValueError("Chunk sizes must satisfy min <= target <= max")
+
+        self.config = config
+        self.min_size = config.min_chunk_size
+        self.target_size = config.target_chunk_size
+        self.max_size = config.max_chunk_size
+        self.read_size = read_size
+
+        bits = self.target_size.bit_length() - 1
+        # Top-bit masks: (h & mask) == 0 is h < 2 ** (32 - mask_bits)
+        self.small_threshold = 1 << max(0, 32 - (bits + 2))
+        self.large_threshold = 1 << min(32, 32 - (bits - 2))
+        self._gear = None
+
+    def chunk(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """Split data into content-defined chunks."""
+        return list(self.iter_chunks(data))
+
+    def iter_chunks(self, source: BackupSource) -> Iterator[Tuple[int, bytes]]:
+        """Stream (offset, chunk) pairs from a source without loading it whole."""
+        empty = np.empty(0, dtype=np.int64)
+        buf = b""
+        base = 0
+        small = large = empty
+
+        for block in iter_source_blocks(source, self.read_size):
+            begin = len(buf)
+            buf = buf + block if buf else bytes(block)
+            new_small, new_large = self._candidates(buf, begin)
+            small = np.concatenate((small, new_small))
+            large = np.concatenate((large, new_large))
+
+            start = 0
+            while True:
+                end = self._cut(start, len(buf), small, large, final=False)
+                if end is None:
+                    break
+                yield base + start, buf[start:end]
+                start = end
+
+            if start:
+                # Keep only the undecided tail (shorter than max_chunk_size)
+                buf = buf[start:]
+                base += start
+                small = small[small > start] - start
+                large = large[large > start] - start
+
+        start = 0
+        while start < len(buf):
+            end = self._cut(start, len(buf), small, large, final=True)
+            yield base + start, buf[start:end]
+            start = end
+
+    def _gear_hashes(self, data) -> Any:
+        if self._gear is None:
+            self._gear = np.array(GEAR_TABLE, dtype=np.uint32)
+        hashes = self._gear.take(data)
+        span = 1
+        while span < self.HASH_WINDOW:
+            hashes[span:] += hashes[:-span] << np.uint32(span)
+            span *= 2
+        return hashes
+
+    def _candidates(self, buf: bytes, begin: int) -> Tuple[Any, Any]:
+        """
+        Chunk ends allowed by the small and large masks, for hashes of
+        positions begin.. of buf. An end is the position after the byte
+        whose hash matched.
+        """
+        data = np.frombuffer(buf, dtype=np.uint8)
+        small, large = [], []
+        for pos in range(begin, len(data), self.HASH_BLOCK):
+            context = min(self.HASH_WINDOW - 1, pos)
+            hashes = self._gear_hashes(data[pos - context:pos + self.HASH_BLOCK])[context:]
+            # The small threshold is lower, so its matches are a subset
+            hits = np.flatnonzero(hashes < self.large_threshold)
+            large.append(hits + (pos + 1))
+            small.append(hits[hashes[hits] < self.small_threshold] + (pos + 1))
+        if not large:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(small), np.concatenate(large)
+
+    def _cut(self, start: int, available: int, small, large, final: bool) -> Optional[int]:
+        """End of the chunk starting at start, or None if more data is needed."""
+        normal = start + self.target_size
+        i = small.searchsorted(start + self.min_size)
+        if i < len(small) and small[i] < normal:
+            return int(small[i])
+        if available < normal:
+            return available if final else None
+
+        limit = start + self.max_size
+        i = large.searchsorted(normal)
+        if i < len(large) and large[i] < limit:
+            return int(large[i])
+        if available < limit:
+            return available if final else None
+        return limit
+
+
+class FixedSizeChunker:
+    """Fixed-size chunking, streamed."""
+
+    def __init__(self, chunk_size: int, read_size: int = READ_BLOCK_SIZE):
+        self.chunk_size = chunk_size
+        self.read_size = max(read_size - read_size % chunk_size, chunk_size)
+
+    def chunk(self, data: bytes) -> List[Tuple[int, bytes]]:
+        return list(self.iter_chunks(data))
+
+    def iter_chunks(self, source: BackupSource) -> Iterator[Tuple[int, bytes]]:
+        offset = 0
+        pending = b""
+        for block in iter_source_blocks(source, self.read_size):
+            pending += block
+            cut = len(pending) - len(pending) % self.chunk_size
+            for start in range(0, cut, self.chunk_size):
+                yield offset + start, pending[start:start + self.chunk_size]
+            offset += cut
+            pending = pending[cut:]
+        if pending:
+            yield offset, pending
+
+
 class RabinChunker:
-    """Rabin fingerprint-based content-defined chunking."""
+    """
+    Rabin fingerprint-based content-defined chunking.
+
+    Rolls the hash one byte at a time in Python (a few MB/s) and needs the
+    whole source in memory; FastCDCChunker is the default.
+    """
 
     def __init__(self, config: ChunkingConfig):
         self.config = config
@@ -230,6 +467,9 @@ class RabinChunker:
 
         return chunks
 
+    def iter_chunks(self, source: BackupSource) -> Iterator[Tuple[int, bytes]]:
+        return iter(self.chunk(b"".join(iter_source_blocks(source))))
+
     def _find_boundary(self, data: bytes, min_size: int) -> int:
         """Find chunk boundary using Rabin fingerprint."""
         if len(data) < min_size:
@@ -335,18 +575,26 @@ class SimpleDelta:
 class IncrementalBackupManager:
     """Manages incremental backups with deduplication."""
 
-    def __init__(self, config: Optional[IncrementalBackupConfig] = None):
+    def __init__(
+        self,
+        config: Optional[IncrementalBackupConfig] = None,
+        chunk_store: Optional[Any] = None
+    ):
         self.config = config or IncrementalBackupConfig()
-        self.chunk_store = ChunkStore()
+        self.chunk_store = chunk_store if chunk_store is not None else _default_chunk_store()
         self.snapshots: Dict[str, BackupSnapshot] = {}
         self.snapshot_chains: Dict[str, List[str]] = defaultdict(list)  # source_id -> snapshot_ids
+        self._recipes_loaded = False
 
         # Initialize chunker
-        if self.config.chunking_config.algorithm == ChunkingAlgorithm.RABIN:
-            self.chunker = RabinChunker(self.config.chunking_config)
+        chunking = self.config.chunking_config
+        if chunking.algorithm == ChunkingAlgorithm.FASTCDC:
+            self.chunker = FastCDCChunker(chunking)
+        elif chunking.algorithm == ChunkingAlgorithm.RABIN:
+            self.chunker = RabinChunker(chunking)
         else:
             # Fallback to fixed-size chunking
-            self.chunker = None
+            self.chunker = FixedSizeChunker(chunking.target_chunk_size)
 
         # Initialize delta encoder
         if self.config.delta_algorithm == DeltaAlgorithm.SIMPLE:
@@ -356,16 +604,21 @@ class IncrementalBackupManager:
 
     async def create_backup(
         self,
-        data: bytes,
+        data: BackupSource,
         source_id: str,
         force_full: bool = False
     ) -> BackupSnapshot:
-        """Create incremental or full backup."""
+        """
+        Create incremental or full backup.
+
+        ``data`` may be bytes or, for large sources, a file path or binary
+        file object; it is streamed through the chunker into the chunk store.
+        """
         correlation_id = get_correlation_id()
 
         with create_span("incremental_backup_create", correlation_id=correlation_id) as span:
             span.set_attribute("source_id", source_id)
-            span.set_attribute("data_size", len(data))
+            await self._load_recipes()
 
             # Determine backup type
             chain = self.snapshot_chains.get(source_id, [])
@@ -387,42 +640,45 @@ class IncrementalBackupManager:
                 snapshot_id=snapshot_id,
                 parent_id=parent_id,
                 backup_type=backup_type,
-                source_id=source_id,
-                total_size=len(data)
+                source_id=source_id
             )
 
             # Chunk data
             if self.config.enable_deduplication:
                 chunks = await self._chunk_and_store(data)
-                snapshot.chunks = [c.chunk_id for c in chunks]
+            else:
+                # Fixed-size pieces of the largest chunk size, so huge
+                # sources are never held as one chunk
+                chunks = await self._chunk_and_store(
+                    data, FixedSizeChunker(self.config.chunking_config.max_chunk_size)
+                )
 
-                # Build chunk map
-                for chunk in chunks:
-                    snapshot.chunk_map[chunk.offset] = chunk.chunk_id
+            total_size = sum(c.size for c in chunks)
+            snapshot.total_size = total_size
+            snapshot.chunks = [c.chunk_id for c in chunks]
+            snapshot.chunk_map = {c.offset: c.chunk_id for c in chunks}
+            span.set_attribute("data_size", total_size)
 
+            if self.config.enable_deduplication:
                 # Calculate deduplication stats
                 unique_size = sum(c.size for c in chunks if c.ref_count == 1)
                 snapshot.unique_size = unique_size
-                snapshot.dedup_ratio = 1 - (unique_size / len(data)) if len(data) > 0 else 0
-
+                snapshot.dedup_ratio = 1 - (unique_size / total_size) if total_size > 0 else 0
             else:
-                # Store as single chunk without dedup
-                chunk = await self.chunk_store.add_chunk(data, 0)
-                snapshot.chunks = [chunk.chunk_id]
-                snapshot.unique_size = len(data)
+                snapshot.unique_size = total_size
 
             # Store snapshot
             self.snapshots[snapshot_id] = snapshot
             self.snapshot_chains[source_id].append(snapshot_id)
 
-            # Store in Redis for persistence
+            # Store recipe with the chunks and in Redis
             await self._persist_snapshot(snapshot)
 
             logger.info(
                 "Artımlı yedekleme oluşturuldu",
                 snapshot_id=snapshot_id,
                 type=backup_type.value,
-                size=len(data),
+                size=total_size,
                 unique_size=snapshot.unique_size,
                 dedup_ratio=f"{snapshot.dedup_ratio:.2%}"
             )
@@ -442,21 +698,10 @@ class IncrementalBackupManager:
         with create_span("incremental_backup_restore", correlation_id=correlation_id) as span:
             span.set_attribute("snapshot_id", snapshot_id)
 
-            snapshot = self.snapshots.get(snapshot_id)
-            if not snapshot:
-                # Try loading from Redis
-                snapshot = await self._load_snapshot(snapshot_id)
-                if not snapshot:
-                    raise ValueError(f"Anlık görüntü bulunamadı: {snapshot_id}")
+            snapshot = await self._get_snapshot(snapshot_id)
 
             # Reconstruct data from chunks
-            data_parts = []
-            for chunk_id in snapshot.chunks:
-                chunk_data = await self.chunk_store.get_chunk(chunk_id)
-                if not chunk_data:
-                    raise ValueError(f"Chunk bulunamadı: {chunk_id}")
-                data_parts.append(chunk_data)
-
+            data_parts = await asyncio.to_thread(lambda: list(self._read_snapshot(snapshot)))
             restored_data = b''.join(data_parts)
 
             logger.info(
@@ -469,12 +714,50 @@ class IncrementalBackupManager:
 
             return restored_data
 
+    async def restore_snapshot_to(
+        self,
+        snapshot_id: str,
+        target: Union[str, os.PathLike, BinaryIO]
+    ) -> int:
+        """
+        Restore a snapshot into a file path or binary file object, one chunk
+        at a time.
+
+        Returns:
+            Number of bytes written
+        """
+        correlation_id = get_correlation_id()
+
+        with create_span("incremental_backup_restore", correlation_id=correlation_id) as span:
+            span.set_attribute("snapshot_id", snapshot_id)
+
+            snapshot = await self._get_snapshot(snapshot_id)
+            written = await asyncio.to_thread(self._write_snapshot, snapshot, target)
+
+            logger.info(
+                "Anlık görüntü geri yüklendi",
+                snapshot_id=snapshot_id,
+                size=written
+            )
+
+            metrics.incremental_backup_restored.inc()
+
+            return written
+
     async def create_synthetic_full(self, source_id: str) -> BackupSnapshot:
-        """Create synthetic full backup from incremental chain."""
+        """
+        Create synthetic full backup from incremental chain.
+
+        Every snapshot's chunk list describes its complete source data, so
+        the state after the chain is the recipe of its last incremental: the
+        synthetic full takes new references on those chunks instead of
+        restoring, re-chunking and storing the data again.
+        """
         correlation_id = get_correlation_id()
 
         with create_span("synthetic_full_create", correlation_id=correlation_id) as span:
             span.set_attribute("source_id", source_id)
+            await self._load_recipes()
 
             chain = self.snapshot_chains.get(source_id, [])
             if not chain:
@@ -490,78 +773,167 @@ class IncrementalBackupManager:
             if not full_snapshot_id:
                 raise ValueError(f"Tam yedekleme bulunamadı: {source_id}")
 
-            # Restore from full and apply incrementals
-            current_data = await self.restore_snapshot(full_snapshot_id)
-
-            # Apply each incremental in sequence
+            # Latest state: the full backup, then each incremental in sequence
+            latest = self.snapshots[full_snapshot_id]
             start_idx = chain.index(full_snapshot_id) + 1
             for snap_id in chain[start_idx:]:
                 snap = self.snapshots.get(snap_id)
                 if snap and snap.backup_type == BackupType.INCREMENTAL:
-                    # Apply incremental delta to current data
-                    incremental_data = await self.restore_snapshot(snap_id)
-
-                    # Apply delta if we have parent data
-                    if snap.parent_id and self.config.delta_algorithm == DeltaAlgorithm.SIMPLE:
-                        # Create delta between current and incremental
-                        delta = self.delta_encoder.create_delta(current_data, incremental_data)
-                        # Apply the delta to get the new state
-                        current_data = self.delta_encoder.apply_delta(current_data, delta)
-                    else:
-                        # Fallback: use incremental data directly
-                        current_data = incremental_data
-
-            # Create new full backup from reconstructed data with UUID
+                    latest = snap
+
+            # Create new full backup from the latest recipe with UUID
             synthetic_id = f"synthetic_{source_id}_{uuid.uuid4().hex}"
             synthetic_snapshot = BackupSnapshot(
                 snapshot_id=synthetic_id,
                 backup_type=BackupType.SYNTHETIC,
                 source_id=source_id,
-                total_size=len(current_data)
+                total_size=latest.total_size,
+                chunks=list(latest.chunks),
+                chunk_map=dict(latest.chunk_map),
+                metadata={"based_on": latest.snapshot_id}
             )
 
-            # Store as new full backup
-            chunks = await self._chunk_and_store(current_data)
-            synthetic_snapshot.chunks = [c.chunk_id for c in chunks]
+            try:
+                await asyncio.to_thread(self.chunk_store.add_references, synthetic_snapshot.chunks)
+            except ChunkStoreError as e:
+                raise ValueError(f"Chunk bulunamadı: {e}") from e
 
             self.snapshots[synthetic_id] = synthetic_snapshot
+            await self._persist_snapshot(synthetic_snapshot)
 
             logger.info(
                 "Sentetik tam yedekleme oluşturuldu",
                 snapshot_id=synthetic_id,
                 source_id=source_id,
-                size=len(current_data)
+                size=synthetic_snapshot.total_size
             )
 
             return synthetic_snapshot
 
-    async def _chunk_and_store(self, data: bytes) -> List[ChunkInfo]:
-        """Chunk data and store with deduplication."""
-        chunks = []
+    async def delete_snapshot(self, snapshot_id: str) -> int:
+        """
+        Delete a snapshot and release its chunks.
 
-        if self.chunker:
-            # Content-defined chunking
-            chunk_list = self.chunker.chunk(data)
-        else:
-            # Fixed-size chunking
-            chunk_size = self.config.chunking_config.target_chunk_size
-            chunk_list = [
-                (i, data[i:i + chunk_size])
-                for i in range(0, len(data), chunk_size)
-            ]
+        Other snapshots keep their own references, so any snapshot of a
+        chain can be deleted.
 
-        # Store chunks in parallel
-        tasks = []
-        for offset, chunk_data in chunk_list:
-            tasks.append(self.chunk_store.add_chunk(chunk_data, offset))
+        Returns:
+            Number of chunks freed
+        """
+        await self._load_recipes()
 
-        chunks = await asyncio.gather(*tasks)
+        snapshot = self.snapshots.pop(snapshot_id, None)
+        if not snapshot:
+            raise ValueError(f"Anlık görüntü bulunamadı: {snapshot_id}")
 
-        return chunks
+        chain = self.snapshot_chains.get(snapshot.source_id, [])
+        if snapshot_id in chain:
+            chain.remove(snapshot_id)
+
+        freed = await asyncio.to_thread(self.chunk_store.drop_snapshot, snapshot_id, snapshot.chunks)
+
+        logger.info("Anlık görüntü silindi", snapshot_id=snapshot_id, freed_chunks=freed)
+        return freed
+
+    async def _chunk_and_store(self, data: BackupSource, chunker: Optional[Any] = None) -> List[ChunkInfo]:
+        """Chunk data and store with deduplication."""
+        return await asyncio.to_thread(self._ingest, data, chunker or self.chunker)
+
+    def _ingest(self, data: BackupSource, chunker: Any) -> List[ChunkInfo]:
+        """
+        Stream chunks into the store in batches.
+
+        Chunking runs on this thread while the previous batch is hashed and
+        written on another, with at most two batches in flight.
+        """
+        batches: "queue.Queue[Optional[List[Tuple[int, bytes]]]]" = queue.Queue(maxsize=2)
+        infos: List[ChunkInfo] = []
+        failure: List[BaseException] = []
+
+        def store_batches():
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if failure:
+                    continue
+                try:
+                    infos.extend(self.chunk_store.put_chunks(batch))
+                except BaseException as e:
+                    failure.append(e)
+
+        writer = threading.Thread(target=store_batches, name="backup-chunk-writer", daemon=True)
+        writer.start()
+        try:
+            batch: List[Tuple[int, bytes]] = []
+            batch_bytes = 0
+            for offset, chunk in chunker.iter_chunks(data):
+                batch.append((offset, chunk))
+                batch_bytes += len(chunk)
+                if batch_bytes >= STORE_BATCH_BYTES:
+                    batches.put(batch)
+                    batch, batch_bytes = [], 0
+                    if failure:
+                        break
+            if batch and not failure:
+                batches.put(batch)
+        finally:
+            batches.put(None)
+            writer.join()
+
+        if failure:
+            raise failure[0]
+        return infos
+
+    def _read_snapshot(self, snapshot: BackupSnapshot) -> Iterator[bytes]:
+        try:
+            yield from self.chunk_store.read_chunks(snapshot.chunks)
+        except ChunkStoreError as e:
+            raise ValueError(f"Chunk bulunamadı: {e}") from e
+
+    def _write_snapshot(self, snapshot: BackupSnapshot, target: Union[str, os.PathLike, BinaryIO]) -> int:
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "wb") as f:
+                return self._write_snapshot(snapshot, f)
+
+        written = 0
+        for chunk in self._read_snapshot(snapshot):
+            target.write(chunk)
+            written += len(chunk)
+        return written
+
+    async def _get_snapshot(self, snapshot_id: str) -> BackupSnapshot:
+        snapshot = self.snapshots.get(snapshot_id)
+        if not snapshot:
+            # Try loading from the chunk store or Redis
+            snapshot = await self._load_snapshot(snapshot_id)
+            if not snapshot:
+                raise ValueError(f"Anlık görüntü bulunamadı: {snapshot_id}")
+        return snapshot
+
+    async def _load_recipes(self):
+        """Rebuild snapshots and chains from the chunk store after a restart."""
+        if self._recipes_loaded:
+            return
+        records = await asyncio.to_thread(self.chunk_store.iter_snapshots)
+        for source_id, snapshot_id, payload in records:
+            if snapshot_id in self.snapshots:
+                continue
+            snapshot = BackupSnapshot.model_validate_json(payload)
+            self.snapshots[snapshot_id] = snapshot
+            if snapshot.backup_type != BackupType.SYNTHETIC:
+                self.snapshot_chains[source_id].append(snapshot_id)
+        self._recipes_loaded = True
 
     async def _persist_snapshot(self, snapshot: BackupSnapshot):
-        """Persist snapshot metadata to Redis."""
-        key = f"snapshot:{snapshot.snapshot_id}"
+        """Persist snapshot metadata with the chunk store and to Redis."""
+        await asyncio.to_thread(
+            self.chunk_store.save_snapshot,
+            snapshot.snapshot_id,
+            snapshot.source_id,
+            snapshot.model_dump_json()
+        )
+
         data = snapshot.model_dump()
 
         await state_manager.add_memory_snapshot({
@@ -577,6 +949,10 @@ class IncrementalBackupManager:
         Uses direct Redis key access for enterprise-grade performance,
         avoiding inefficient list scanning of up to 100 records.
         """
+        payload = await asyncio.to_thread(self.chunk_store.load_snapshot, snapshot_id)
+        if payload:
+            return BackupSnapshot.model_validate_json(payload)
+
         # Use optimized direct key lookup
         snap_data = await asyncio.to_thread(
             state_manager.get_snapshot_by_id,
@@ -618,10 +994,10 @@ class IncrementalBackupManager:
                 continue
 
             # Verify all chunks exist
-            for chunk_id in snapshot.chunks:
-                if not await self.chunk_store.get_chunk(chunk_id):
-                    results["errors"].append(f"Chunk eksik: {chunk_id} in {snapshot_id}")
-                    results["valid"] = False
+            missing = await asyncio.to_thread(self.chunk_store.missing, snapshot.chunks)
+            for chunk_id in missing:
+                results["errors"].append(f"Chunk eksik: {chunk_id} in {snapshot_id}")
+                results["valid"] = False
 
         return results
 
@@ -647,6 +1023,16 @@ class IncrementalBackupManager:
         return dict(counts)
 
 
+def _default_chunk_store() -> Any:
+    """Segment files under BACKUP_CHUNK_STORE_DIR, or memory when it is unset."""
+    root = settings.BACKUP_CHUNK_STORE_DIR
+    if not root:
+        logger.warning("BACKUP_CHUNK_STORE_DIR unset, backup chunks are kept in memory and lost on restart")
+        return ChunkStore()
+    # Opened on first use, so importing this module touches no files
+    return SegmentChunkStore(root, segment_size=settings.BACKUP_CHUNK_SEGMENT_MB * 1024 * 1024)
+
+
 # Global incremental backup manager
 incremental_manager = IncrementalBackupManager()
 
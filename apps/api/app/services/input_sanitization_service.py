@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 from ..core.logging import get_logger
+from ..core.threat_scanner import ThreatCategory, ThreatScanner
 from ..models.security_event import SecurityEvent
 from ..settings import app_settings as appset
 
@@ -77,6 +78,9 @@ class InputSanitizationService:
         r'behavior\s*:',
     ]
     
+    # Literals at least one of which every XSS pattern needs
+    XSS_TRIGGERS = ['<', '=', ':', '&#', '(', '@import']
+    
     # SQL injection patterns - more specific to avoid false positives
     SQL_INJECTION_PATTERNS = [
         # Union-based injections
@@ -113,6 +117,9 @@ class InputSanitizationService:
         r'"\s*and\s+\d+\s*=\s*\d+\s*--',
     ]
     
+    # Only inputs that could realistically contain SQL injection are checked
+    SQL_INJECTION_TRIGGERS = ['select', 'union', 'insert', 'update', 'delete', 'drop', "'", '"']
+    
     # Path traversal patterns
     PATH_TRAVERSAL_PATTERNS = [
         r'\.\./+',
@@ -124,6 +131,9 @@ class InputSanitizationService:
         r'\.\.%5c',
     ]
     
+    # Literals at least one of which every path traversal pattern needs
+    PATH_TRAVERSAL_TRIGGERS = ['..', '~/', '%2e']
+    
     # Command injection patterns - more specific to avoid false positives
     COMMAND_INJECTION_PATTERNS = [
         # Shell command chains with dangerous commands
@@ -148,6 +158,9 @@ class InputSanitizationService:
         r'>>\s*/var/log',
     ]
     
+    # Only inputs with shell operators or command-like patterns are checked
+    COMMAND_INJECTION_TRIGGERS = [';', '|', '&', '`', '$', '>', '<', 'rm ', 'del ', 'cat ', 'ls ']
+    
     def __init__(self):
         """Initialize the input sanitization service."""
         self.compiled_xss_patterns = [re.compile(pattern, re.IGNORECASE | re.DOTALL) 
@@ -158,6 +171,56 @@ class InputSanitizationService:
                                       for pattern in self.PATH_TRAVERSAL_PATTERNS]
         self.compiled_cmd_patterns = [re.compile(pattern, re.IGNORECASE) 
                                      for pattern in self.COMMAND_INJECTION_PATTERNS]
+        # One combined pass over all categories; per-pattern lists are only
+        # used to itemise the threats once the scanner reports a match
+        self.threat_scanner = ThreatScanner([
+            ThreatCategory("XSS", tuple(self.XSS_PATTERNS), tuple(self.XSS_TRIGGERS), dotall=True),
+            ThreatCategory("SQL_INJECTION", tuple(self.SQL_INJECTION_PATTERNS),
+                           tuple(self.SQL_INJECTION_TRIGGERS), min_length=6),
+            ThreatCategory("PATH_TRAVERSAL", tuple(self.PATH_TRAVERSAL_PATTERNS),
+                           tuple(self.PATH_TRAVERSAL_TRIGGERS)),
+            ThreatCategory("COMMAND_INJECTION", tuple(self.COMMAND_INJECTION_PATTERNS),
+                           tuple(self.COMMAND_INJECTION_TRIGGERS), min_length=4),
+        ])
+    
+    @staticmethod
+    def _collect_threats(threat_type: str, patterns: List[re.Pattern], text: str) -> List[Dict[str, Any]]:
+        """Itemise the patterns of one category that match ``text``."""
+        threats = []
+        for pattern in patterns:
+            matches = pattern.findall(text)
+            if matches:
+                threats.append({
+                    "type": threat_type,
+                    "pattern": pattern.pattern,
+                    "matches": matches[:5]  # Limit to first 5 matches
+                })
+        return threats
+    
+    def _category_threats(self, threat_type: str, input_text: str) -> List[Dict[str, Any]]:
+        """Threats of one category in ``input_text``; assumes the category matched."""
+        if threat_type == "XSS":
+            return self._collect_threats(threat_type, self.compiled_xss_patterns, input_text.lower())
+        if threat_type == "SQL_INJECTION":
+            return self._collect_threats(threat_type, self.compiled_sql_patterns, input_text.lower())
+        if threat_type == "PATH_TRAVERSAL":
+            return self._collect_threats(threat_type, self.compiled_path_patterns, input_text)
+        return self._collect_threats(threat_type, self.compiled_cmd_patterns, input_text)
+    
+    def _validate_category(self, threat_type: str, input_text: str) -> Dict[str, Any]:
+        """Validate input against one threat category."""
+        if not isinstance(input_text, str):
+            return {"is_safe": True, "threats": []}
+        
+        threats = []
+        if self.threat_scanner.matches_category(input_text, threat_type):
+            threats = self._category_threats(threat_type, input_text)
+        
+        return {
+            "is_safe": len(threats) == 0,
+            "threats": threats,
+            "input_length": len(input_text)
+        }
     
     def sanitize_html(self, input_text: str) -> str:
         """Sanitize HTML content by escaping dangerous characters.
@@ -217,25 +280,7 @@ class InputSanitizationService:
         Returns:
             Dictionary with validation results
         """
-        if not isinstance(input_text, str):
-            return {"is_safe": True, "threats": []}
-        
-        threats = []
-        
-        for pattern in self.compiled_xss_patterns:
-            matches = pattern.findall(input_text.lower())
-            if matches:
-                threats.append({
-                    "type": "XSS",
-                    "pattern": pattern.pattern,
-                    "matches": matches[:5]  # Limit to first 5 matches
-                })
-        
-        return {
-            "is_safe": len(threats) == 0,
-            "threats": threats,
-            "input_length": len(input_text)
-        }
+        return self._validate_category("XSS", input_text)
     
     def validate_against_sql_injection(self, input_text: str) -> Dict[str, Any]:
         """Validate input against SQL injection patterns.
@@ -246,29 +291,7 @@ class InputSanitizationService:
         Returns:
             Dictionary with validation results
         """
-        if not isinstance(input_text, str):
-            return {"is_safe": True, "threats": []}
-        
-        threats = []
-        
-        # Only check inputs that could realistically contain SQL injection
-        # Minimum length and must contain SQL-like patterns
-        if len(input_text) > 5 and any(keyword in input_text.lower() 
-                                      for keyword in ['select', 'union', 'insert', 'update', 'delete', 'drop', "'", '"']):
-            for pattern in self.compiled_sql_patterns:
-                matches = pattern.findall(input_text.lower())
-                if matches:
-                    threats.append({
-                        "type": "SQL_INJECTION",
-                        "pattern": pattern.pattern,
-                        "matches": matches[:5]
-                    })
-        
-        return {
-            "is_safe": len(threats) == 0,
-            "threats": threats,
-            "input_length": len(input_text)
-        }
+        return self._validate_category("SQL_INJECTION", input_text)
     
     def validate_against_path_traversal(self, input_text: str) -> Dict[str, Any]:
         """Validate input against path traversal patterns.
@@ -279,25 +302,7 @@ class InputSanitizationService:
         Returns:
             Dictionary with validation results
         """
-        if not isinstance(input_text, str):
-            return {"is_safe": True, "threats": []}
-        
-        threats = []
-        
-        for pattern in self.compiled_path_patterns:
-            matches = pattern.findall(input_text)
-            if matches:
-                threats.append({
-                    "type": "PATH_TRAVERSAL",
-                    "pattern": pattern.pattern,
-                    "matches": matches[:5]
-                })
-        
-        return {
-            "is_safe": len(threats) == 0,
-            "threats": threats,
-            "input_length": len(input_text)
-        }
+        return self._validate_category("PATH_TRAVERSAL", input_text)
     
     def validate_against_command_injection(self, input_text: str) -> Dict[str, Any]:
         """Validate input against command injection patterns.
@@ -308,29 +313,7 @@ class InputSanitizationService:
         Returns:
             Dictionary with validation results
         """
-        if not isinstance(input_text, str):
-            return {"is_safe": True, "threats": []}
-        
-        threats = []
-        
-        # Only check inputs that could realistically contain command injection
-        # Must contain shell operators or command-like patterns
-        if len(input_text) > 3 and any(operator in input_text 
-                                      for operator in [';', '|', '&', '`', '$', '>', '<', 'rm ', 'del ', 'cat ', 'ls ']):
-            for pattern in self.compiled_cmd_patterns:
-                matches = pattern.findall(input_text)
-                if matches:
-                    threats.append({
-                        "type": "COMMAND_INJECTION",
-                        "pattern": pattern.pattern,
-                        "matches": matches[:5]
-                    })
-        
-        return {
-            "is_safe": len(threats) == 0,
-            "threats": threats,
-            "input_length": len(input_text)
-        }
+        return self._validate_category("COMMAND_INJECTION", input_text)
     
     def comprehensive_validate(self, input_text: str) -> Dict[str, Any]:
         """Perform comprehensive security validation on input.
@@ -349,26 +332,16 @@ class InputSanitizationService:
                 "validation_summary": "Non-string input converted to string"
             }
         
-        # Perform all validations
-        xss_result = self.validate_against_xss(input_text)
-        sql_result = self.validate_against_sql_injection(input_text)
-        path_result = self.validate_against_path_traversal(input_text)
-        cmd_result = self.validate_against_command_injection(input_text)
-        
-        # Collect all threats
+        # One scan decides which categories matched; only those are itemised
+        matched = self.threat_scanner.matched_categories(input_text)
         all_threats = []
-        all_threats.extend(xss_result.get("threats", []))
-        all_threats.extend(sql_result.get("threats", []))
-        all_threats.extend(path_result.get("threats", []))
-        all_threats.extend(cmd_result.get("threats", []))
+        for category in self.threat_scanner.categories:
+            if category.name in matched:
+                all_threats.extend(self._category_threats(category.name, input_text))
         
         # Determine overall safety
-        is_safe = (
-            xss_result["is_safe"] and 
-            sql_result["is_safe"] and 
-            path_result["is_safe"] and 
-            cmd_result["is_safe"]
-        )
+        unsafe = {threat["type"] for threat in all_threats}
+        is_safe = not unsafe
         
         # Sanitize input regardless of threats (for safe storage)
         sanitized = self.sanitize_text_input(input_text, strict=True)
@@ -378,10 +351,10 @@ class InputSanitizationService:
             "sanitized": sanitized,
             "threats": all_threats,
             "validation_details": {
-                "xss": xss_result["is_safe"],
-                "sql_injection": sql_result["is_safe"],
-                "path_traversal": path_result["is_safe"],
-                "command_injection": cmd_result["is_safe"]
+                "xss": "XSS" not in unsafe,
+                "sql_injection": "SQL_INJECTION" not in unsafe,
+                "path_traversal": "PATH_TRAVERSAL" not in unsafe,
+                "command_injection": "COMMAND_INJECTION" not in unsafe
             },
             "input_length": len(input_text),
             "sanitized_length": len(sanitized)
@@ -19,13 +19,18 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import desc
+from functools import partial
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ..core.environment import environment as settings
 from ..core.logging import get_logger
+from ..helpers.audit_chain import verify_in_chunks
 from ..models.audit_log import AuditLog
 from ..models.enums import JobStatus
 from ..models.job import Job
+from ..services.audit_chain_writer import JOB_CHAIN_FIELDS, job_chain_data
 from ..services.audit_service import audit_service
 
 logger = get_logger(__name__)
@@ -504,40 +509,9 @@ class JobAuditService:
             Created audit log entry
         """
         try:
-            # Get the previous audit entry for this job
-            prev_job_audit = (
-                db.query(AuditLog)
-                .filter(
-                    AuditLog.scope_type == "job",
-                    AuditLog.scope_id == job_id
-                )
-                .order_by(desc(AuditLog.id))
-                .first()
-            )
-            
-            # Determine previous hash
-            if prev_job_audit:
-                # chain_hash is stored in the payload JSON, not as a direct attribute
-                prev_hash = prev_job_audit.payload.get("chain_hash", "0" * 64)
-            else:
-                # First entry for this job - use genesis hash
-                prev_hash = "0" * 64
-            
-            # Compute chain hash for this entry
-            chain_hash = JobAuditService.compute_job_chain_hash(
-                prev_hash=prev_hash,
-                job_id=job_id,
-                event_type=event_type,
-                payload=payload
-            )
-            
-            # Add chain hash to payload for verification
-            payload["chain_hash"] = chain_hash
-            payload["prev_hash"] = prev_hash
-            
-            # Create audit entry using the main audit service
-            audit_entry = await audit_service.create_audit_entry(
-                db=db,
+            # The chain appender extends both the global chain and this
+            # job's chain, reading the job's tip once per transaction
+            entry = audit_service.prepare_audit_entry(
                 event_type=JOB_EVENT_TYPES.get(event_type, f"job_{event_type}"),
                 user_id=actor_id,
                 scope_type="job",
@@ -545,6 +519,9 @@ class JobAuditService:
                 resource=f"job/{job_id}",
                 payload=payload
             )
+            entry.job_event = event_type
+            audit_entry = audit_service.append_audit_entries(db, [entry])[0]
+            chain_hash = job_chain_data(audit_entry.payload)["chain_hash"]
             
             # Log the audit creation
             logger.info(
@@ -682,31 +659,37 @@ class JobAuditService:
     @staticmethod
     async def verify_job_audit_chain(
         db: Session,
-        job_id: int
+        job_id: int,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Verify the audit chain integrity for a specific job.
         
+        Entries are read in chunks; each entry stores its own prev_hash, so
+        chunks are verified independently and in parallel for long chains.
+        
         Args:
             db: Database session
             job_id: Job ID to verify
+            chunk_size: Entries per verification chunk
+            workers: Verification processes
             
         Returns:
             Verification result with details
         """
         try:
-            # Get all audit entries for this job
-            audit_entries = (
-                db.query(AuditLog)
-                .filter(
-                    AuditLog.scope_type == "job",
-                    AuditLog.scope_id == job_id
-                )
-                .order_by(AuditLog.id)
-                .all()
-            )
+            chunk_size = chunk_size or settings.AUDIT_CHAIN_VERIFY_CHUNK_SIZE
+            chunks = JobAuditService._iter_job_chain_chunks(db, job_id, chunk_size)
+            verify_chunk = partial(_verify_job_chain_chunk, job_id=job_id)
+            
+            entries_checked = 0
+            violations = []
+            for result in verify_in_chunks(chunks, verify_chunk, workers or settings.AUDIT_CHAIN_VERIFY_WORKERS):
+                entries_checked += result["entries_checked"]
+                violations.extend(result["violations"])
             
-            if not audit_entries:
+            if not entries_checked:
                 return {
                     "valid": True,
                     "job_id": job_id,
@@ -714,60 +697,10 @@ class JobAuditService:
                     "message": "No audit entries found for job"
                 }
             
-            violations = []
-            prev_hash = "0" * 64  # Genesis hash
-            
-            for i, entry in enumerate(audit_entries):
-                # Extract stored hashes from payload
-                stored_prev_hash = entry.payload.get("prev_hash")
-                stored_chain_hash = entry.payload.get("chain_hash")
-                
-                # Check if prev_hash matches expected
-                if stored_prev_hash != prev_hash:
-                    violations.append({
-                        "entry_id": entry.id,
-                        "position": i,
-                        "error": "prev_hash mismatch",
-                        "expected": prev_hash,
-                        "actual": stored_prev_hash
-                    })
-                
-                # Recompute chain hash
-                clean_payload = {
-                    k: v for k, v in entry.payload.items()
-                    if k not in ["chain_hash", "prev_hash"]
-                }
-                
-                # Use reverse mapping to get short event type safely with robust regex fallback
-                short_event_type = JOB_EVENT_TYPE_REVERSE_MAP.get(
-                    entry.event_type,
-                    re.match(r"^job_(.+)$", entry.event_type).group(1) if re.match(r"^job_(.+)$", entry.event_type) else entry.event_type  # Robust fallback
-                )
-                
-                expected_hash = JobAuditService.compute_job_chain_hash(
-                    prev_hash=prev_hash,
-                    job_id=job_id,
-                    event_type=short_event_type,
-                    payload=clean_payload
-                )
-                
-                # Check if chain_hash is correct
-                if stored_chain_hash != expected_hash:
-                    violations.append({
-                        "entry_id": entry.id,
-                        "position": i,
-                        "error": "chain_hash mismatch",
-                        "expected": expected_hash,
-                        "actual": stored_chain_hash
-                    })
-                
-                # Update prev_hash for next iteration
-                prev_hash = stored_chain_hash or expected_hash
-            
             return {
                 "valid": len(violations) == 0,
                 "job_id": job_id,
-                "entries_checked": len(audit_entries),
+                "entries_checked": entries_checked,
                 "violations": violations,
                 "message": "Chain integrity valid" if not violations else f"Found {len(violations)} violations"
             }
@@ -784,6 +717,95 @@ class JobAuditService:
                 "error": str(e),
                 "message": "Verification failed with error"
             }
+    
+    @staticmethod
+    def _iter_job_chain_chunks(db: Session, job_id: int, chunk_size: int):
+        """Read (id, event_type, payload) rows of one job's chain in id order."""
+        after_id = 0
+        expected_prev = "0" * 64  # Genesis hash
+        position = 0
+        while True:
+            rows = [
+                tuple(row) for row in db.execute(
+                    select(AuditLog.id, AuditLog.event_type, AuditLog.payload)
+                    .where(
+                        AuditLog.scope_type == "job",
+                        AuditLog.scope_id == job_id,
+                        AuditLog.id > after_id
+                    )
+                    .order_by(AuditLog.id)
+                    .limit(chunk_size)
+                ).all()
+            ]
+            if not rows:
+                return
+            
+            yield rows, expected_prev, position
+            
+            after_id = rows[-1][0]
+            # A missing stored hash was already reported for that entry
+            expected_prev = job_chain_data(rows[-1][2]).get("chain_hash")
+            position += len(rows)
+            if len(rows) < chunk_size:
+                return
+
+
+def _short_job_event_type(event_type: str) -> str:
+    """Map a stored event type back to its JOB_EVENT_TYPES key."""
+    if event_type in JOB_EVENT_TYPE_REVERSE_MAP:
+        return JOB_EVENT_TYPE_REVERSE_MAP[event_type]
+    match = re.match(r"^job_(.+)$", event_type)
+    return match.group(1) if match else event_type
+
+
+def _verify_job_chain_chunk(
+    rows: List[tuple],
+    expected_prev: Optional[str],
+    position: int,
+    job_id: int
+) -> Dict[str, Any]:
+    """Verify (id, event_type, payload) rows of a job chain (process-pool safe)."""
+    violations = []
+    prev_hash = expected_prev
+    
+    for i, (entry_id, event_type, payload) in enumerate(rows):
+        data = job_chain_data(payload)
+        stored_prev_hash = data.get("prev_hash")
+        stored_chain_hash = data.get("chain_hash")
+        
+        # Check if prev_hash matches expected
+        if prev_hash is not None and stored_prev_hash != prev_hash:
+            violations.append({
+                "entry_id": entry_id,
+                "position": position + i,
+                "error": "prev_hash mismatch",
+                "expected": prev_hash,
+                "actual": stored_prev_hash
+            })
+        
+        # Recompute chain hash
+        clean_payload = {k: v for k, v in data.items() if k not in JOB_CHAIN_FIELDS}
+        expected_hash = JobAuditService.compute_job_chain_hash(
+            prev_hash=prev_hash if prev_hash is not None else (stored_prev_hash or "0" * 64),
+            job_id=job_id,
+            event_type=_short_job_event_type(event_type),
+            payload=clean_payload
+        )
+        
+        # Check if chain_hash is correct
+        if stored_chain_hash != expected_hash:
+            violations.append({
+                "entry_id": entry_id,
+                "position": position + i,
+                "error": "chain_hash mismatch",
+                "expected": expected_hash,
+                "actual": stored_chain_hash
+            })
+        
+        # Update prev_hash for next iteration
+        prev_hash = stored_chain_hash or expected_hash
+    
+    return {"entries_checked": len(rows), "violations": violations}
 
 
 def _summarize_output(output_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
@@ -0,0 +1,437 @@
+"""
+License Entitlement Cache (Task 4.3)
+
+Caches "which license does this user hold and until when" so the license
+guard does not query the database on every authenticated request.
+
+Layers:
+1. In-process LRU with a short TTL
+2. Redis copy shared by all API workers (``license:entitlement:{user_id}``)
+3. Async database query, only on a miss (single-flight per user)
+
+Expiry is evaluated locally against the cached ``ends_at``, so an entry
+never has to be refreshed just because time has passed. License changes
+(assign/extend/cancel) invalidate the entry after the database commit: the
+Redis copy is deleted, a per-user epoch is bumped and the user id is
+published on ``license:entitlement:invalidate`` so every worker drops its
+local copy. The epoch makes a slow refill that raced with an invalidation
+unreadable instead of resurrecting stale data; the local TTL bounds
+staleness if a pub/sub message is ever missed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import redis
+import redis.asyncio as redis_async
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.environment import environment as settings
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+INVALIDATION_CHANNEL = "license:entitlement:invalidate"
+KEY_PREFIX = "license:entitlement:"
+EPOCH_KEY_PREFIX = "license:entitlement:epoch:"
+
+# Redis is an optimisation: after an error, skip it for this long
+REDIS_RETRY_SECONDS = 30.0
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.5
+
+_SESSION_INFO_KEY = "license_entitlement_invalidations"
+_SESSION_LISTENING_KEY = "license_entitlement_listening"
+
+
+@dataclass(frozen=True)
+class LicenseEntitlement:
+    """Cached license state of a user; license_id None means no active license."""
+
+    user_id: int
+    license_id: Optional[Any] = None
+    ends_at: Optional[datetime] = None
+
+    @classmethod
+    def from_license(cls, user_id: int, license: Optional[Any]) -> "LicenseEntitlement":
+        if license is None:
+            return cls(user_id=user_id)
+        return cls(user_id=user_id, license_id=license.id, ends_at=license.ends_at)
+
+    @property
+    def has_license(self) -> bool:
+        return self.license_id is not None and self.ends_at is not None
+
+    def is_valid(self, now: Optional[datetime] = None) -> bool:
+        """True if the user holds a license that has not reached ends_at."""
+        if not self.has_license:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return self.ends_at > now
+
+    def to_json(self, epoch: int) -> str:
+        return json.dumps({
+            "license_id": self.license_id if isinstance(self.license_id, int) or self.license_id is None
+            else str(self.license_id),
+            "ends_at": self.ends_at.isoformat() if self.ends_at else None,
+            "epoch": epoch,
+        })
+
+    @classmethod
+    def from_json(cls, user_id: int, raw: str) -> Tuple["LicenseEntitlement", int]:
+        data = json.loads(raw)
+        ends_at = datetime.fromisoformat(data["ends_at"]) if data.get("ends_at") else None
+        if ends_at is not None and ends_at.tzinfo is None:
+            ends_at = ends_at.replace(tzinfo=timezone.utc)
+        return cls(user_id=user_id, license_id=data.get("license_id"), ends_at=ends_at), int(data.get("epoch", 0))
+
+
+EntitlementLoader = Callable[[int], Awaitable[LicenseEntitlement]]
+
+
+class LicenseEntitlementCache:
+    """
+    Two-level entitlement cache with pub/sub invalidation.
+
+    Thread-safe for the local layer: invalidations also arrive from sync
+    request handlers running in the thread pool.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        local_ttl_seconds: Optional[float] = None,
+        redis_ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        use_redis: bool = True,
+    ):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.local_ttl_seconds = (
+            local_ttl_seconds if local_ttl_seconds is not None
+            else settings.LICENSE_ENTITLEMENT_LOCAL_TTL_SECONDS
+        )
+        self.redis_ttl_seconds = redis_ttl_seconds or settings.LICENSE_ENTITLEMENT_REDIS_TTL_SECONDS
+        self.max_entries = max_entries or settings.LICENSE_ENTITLEMENT_MAX_ENTRIES
+        self.use_redis = use_redis
+
+        # user_id -> (entitlement, monotonic expiry)
+        self._local: "OrderedDict[int, Tuple[LicenseEntitlement, float]]" = OrderedDict()
+        # Bumped on every local invalidation; a load only fills the cache
+        # if no invalidation for that user happened while it ran
+        self._local_versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+        self._redis: Optional[redis_async.Redis] = None
+        self._sync_redis: Optional[redis.Redis] = None
+        self._redis_down_until = 0.0
+        self._listener_task: Optional[asyncio.Task] = None
+
+        self._stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "invalidations": 0,
+            "redis_errors": 0,
+        }
+
+    # Lookup
+
+    async def get(self, user_id: int, loader: EntitlementLoader) -> LicenseEntitlement:
+        """Return the user's entitlement, loading it through ``loader`` on a miss."""
+        entitlement = self._get_local(user_id)
+        if entitlement is not None:
+            self._stats["local_hits"] += 1
+            return entitlement
+
+        # One load per user at a time; concurrent requests share it
+        pending = self._inflight.get(user_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            entitlement = await self._fetch(user_id, loader)
+            future.set_result(entitlement)
+            return entitlement
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(user_id, None)
+
+    async def _fetch(self, user_id: int, loader: EntitlementLoader) -> LicenseEntitlement:
+        version = self._local_version(user_id)
+
+        cached, epoch = await self._get_redis(user_id)
+        if cached is not None:
+            self._stats["redis_hits"] += 1
+            self._set_local(user_id, cached, version)
+            return cached
+
+        self._stats["misses"] += 1
+        self._stats["loads"] += 1
+        entitlement = await loader(user_id)
+        self._set_local(user_id, entitlement, version)
+        if epoch is not None:
+            await self._set_redis(user_id, entitlement, epoch)
+        return entitlement
+
+    def _get_local(self, user_id: int) -> Optional[LicenseEntitlement]:
+        with self._lock:
+            item = self._local.get(user_id)
+            if item is None:
+                return None
+            entitlement, expires = item
+            if expires <= time.monotonic():
+                del self._local[user_id]
+                return None
+            self._local.move_to_end(user_id)
+            return entitlement
+
+    def _set_local(self, user_id: int, entitlement: LicenseEntitlement, version: int):
+        if self.local_ttl_seconds <= 0:
+            return
+        with self._lock:
+            if self._local_versions.get(user_id, 0) != version:
+                # Invalidated while loading: the result may already be stale
+                return
+            self._local[user_id] = (entitlement, time.monotonic() + self.local_ttl_seconds)
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _local_version(self, user_id: int) -> int:
+        with self._lock:
+            return self._local_versions.get(user_id, 0)
+
+    # Invalidation
+
+    def invalidate_local(self, user_ids: Iterable[int]):
+        """Drop local entries (called for pub/sub messages and local writes)."""
+        with self._lock:
+            for user_id in user_ids:
+                self._local.pop(user_id, None)
+                self._local_versions[user_id] = self._local_versions.get(user_id, 0) + 1
+                self._stats["invalidations"] += 1
+            if len(self._local_versions) > self.max_entries * 2:
+                # Versions only matter while a load is in flight
+                self._local_versions = {
+                    uid: v for uid, v in self._local_versions.items() if uid in self._inflight
+                }
+
+    def publish_invalidation(self, user_ids: Iterable[int]):
+        """
+        Invalidate users everywhere (sync; used from license_service commits).
+
+        Bumps each user's epoch, deletes the Redis copy and publishes the ids
+        so other workers drop their local entries.
+        """
+        user_ids = sorted({int(u) for u in user_ids if u is not None})
+        if not user_ids:
+            return
+        self.invalidate_local(user_ids)
+        client = self._get_sync_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.incr(f"{EPOCH_KEY_PREFIX}{user_id}")
+                pipe.delete(f"{KEY_PREFIX}{user_id}")
+            pipe.publish(INVALIDATION_CHANNEL, json.dumps(user_ids))
+            pipe.execute()
+        except redis.RedisError as e:
+            self._redis_failed("publish_invalidation", e)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._local_versions.clear()
+
+    # Redis layer
+
+    def _redis_available(self) -> bool:
+        return self.use_redis and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, operation: str, error: Exception):
+        self._stats["redis_errors"] += 1
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning(
+            "license_entitlement_redis_unavailable",
+            operation=operation,
+            error=str(error),
+            retry_in_seconds=REDIS_RETRY_SECONDS
+        )
+
+    def _get_async_redis(self) -> Optional[redis_async.Redis]:
+        if not self._redis_available():
+            return None
+        if self._redis is None:
+            self._redis = redis_async.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+            )
+        return self._redis
+
+    def _get_sync_redis(self) -> Optional[redis.Redis]:
+        if not self._redis_available():
+            return None
+        if self._sync_redis is None:
+            self._sync_redis = redis.Redis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+            )
+        return self._sync_redis
+
+    async def _get_redis(self, user_id: int) -> Tuple[Optional[LicenseEntitlement], Optional[int]]:
+        """
+        Read the shared copy and the user's current epoch in one round-trip.
+
+        Returns:
+            (entitlement or None, current epoch or None if Redis is unusable)
+        """
+        client = self._get_async_redis()
+        if client is None:
+            return None, None
+        try:
+            raw, epoch_raw = await client.mget(f"{KEY_PREFIX}{user_id}", f"{EPOCH_KEY_PREFIX}{user_id}")
+        except (redis.RedisError, OSError) as e:
+            self._redis_failed("get", e)
+            return None, None
+        epoch = int(epoch_raw or 0)
+        if raw is None:
+            return None, epoch
+        try:
+            entitlement, stored_epoch = LicenseEntitlement.from_json(user_id, raw)
+        except (ValueError, KeyError, TypeError):
+            return None, epoch
+        if stored_epoch != epoch:
+            # Written by a load that raced with an invalidation
+            return None, epoch
+        return entitlement, epoch
+
+    async def _set_redis(self, user_id: int, entitlement: LicenseEntitlement, epoch: int):
+        client = self._get_async_redis()
+        if client is None:
+            return
+        try:
+            await client.set(
+                f"{KEY_PREFIX}{user_id}", entitlement.to_json(epoch), ex=self.redis_ttl_seconds
+            )
+        except (redis.RedisError, OSError) as e:
+            self._redis_failed("set", e)
+
+    # Pub/sub listener
+
+    async def start(self):
+        """Start listening for invalidations from other workers."""
+        if self.use_redis and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the listener and close Redis connections."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+        if self._sync_redis is not None:
+            self._sync_redis.close()
+            self._sync_redis = None
+
+    async def _listen(self):
+        backoff = 1.0
+        while True:
+            client = redis_async.from_url(self.redis_url, decode_responses=True)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before (re)subscribing may have missed messages
+                self.clear_local()
+                backoff = 1.0
+                logger.info("license_entitlement_listener_subscribed", channel=INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        user_ids = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    self.invalidate_local(user_ids)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "license_entitlement_listener_disconnected",
+                    error=str(e),
+                    retry_in_seconds=backoff
+                )
+            finally:
+                try:
+                    await pubsub.close()
+                    await client.close()
+                except Exception:
+                    pass
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._local)
+        return {**self._stats, "local_entries": size, "listening": self._listener_task is not None}
+
+
+def _publish_session_invalidations(session: Session):
+    user_ids = session.info.pop(_SESSION_INFO_KEY, None)
+    if user_ids:
+        license_entitlement_cache.publish_invalidation(user_ids)
+
+
+def _discard_session_invalidations(session: Session, previous_transaction):
+    # A savepoint rollback leaves the outer transaction's changes pending
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def invalidate_entitlement_on_commit(db: Any, user_id: int):
+    """
+    Invalidate a user's cached entitlement once the transaction commits.
+
+    Publishing before the commit would let another worker reload the old
+    row and cache it again. Sessions that are not SQLAlchemy sessions (e.g.
+    test doubles) invalidate immediately.
+    """
+    if not isinstance(db, Session):
+        license_entitlement_cache.publish_invalidation([user_id])
+        return
+    if not db.info.get(_SESSION_LISTENING_KEY):
+        event.listen(db, "after_commit", _publish_session_invalidations)
+        event.listen(db, "after_soft_rollback", _discard_session_invalidations)
+        db.info[_SESSION_LISTENING_KEY] = True
+    db.info.setdefault(_SESSION_INFO_KEY, set()).add(user_id)
+
+
+# Process-wide cache shared by the license guard and license_service
+license_entitlement_cache = LicenseEntitlementCache()
@@ -14,7 +14,8 @@ import time
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.license import License
 from ..models.license_audit import LicenseAudit
@@ -27,6 +28,7 @@ def create_financial_span(name: str, **kwargs):
     return create_span(name, operation_type="financial", **kwargs)
 from ..middleware.correlation_middleware import get_correlation_id, get_session_id
 from ..services.audit_service import audit_service
+from .license_entitlement_cache import invalidate_entitlement_on_commit
 from ..config import settings
 from .. import metrics
 
@@ -341,6 +343,7 @@ class LicenseService:
                     compliance="KVKV_GDPR"
                 )
                 
+                invalidate_entitlement_on_commit(db, user_id)
                 return license
                 
             except Exception as e:
@@ -482,6 +485,7 @@ class LicenseService:
             }
         )
         
+        invalidate_entitlement_on_commit(db, license.user_id)
         return license
     
     @staticmethod
@@ -575,6 +579,7 @@ class LicenseService:
             }
         )
         
+        invalidate_entitlement_on_commit(db, license.user_id)
         return license
     
     @staticmethod
@@ -675,6 +680,30 @@ class LicenseService:
             )
         ).first()
     
+    @staticmethod
+    async def get_active_license_async(db: AsyncSession, user_id: int) -> Optional[License]:
+        """Async variant of get_active_license for request-path callers.
+        
+        Args:
+            db: Async database session
+            user_id: User ID
+            
+        Returns:
+            Active License or None
+        """
+        
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(License).where(
+                and_(
+                    License.user_id == user_id,
+                    License.status == 'active',
+                    License.ends_at > now
+                )
+            ).limit(1)
+        )
+        return result.scalars().first()
+    
     @staticmethod
     def validate_license_integrity(db: Session, license_id: int) -> bool:
         """Validate the integrity of a license and its audit trail.
@@ -1572,8 +1572,21 @@ class ManufacturingValidator:
         min_thickness: float
     ) -> bool:
         """Check if walls meet minimum thickness for printing."""
-        # Simplified check
-        return True
+        try:
+            from app.services.geometric_validator import WallThicknessAnalyzer
+            
+            result = WallThicknessAnalyzer().analyze_faces(shape)
+            if result is None or result.min_thickness is None:
+                return True  # Could not measure, assume OK
+            
+            return result.min_thickness >= min_thickness
+            
+        except ImportError:
+            logger.warning("Could not import WallThicknessAnalyzer, skipping print wall check")
+            return True
+        except Exception as e:
+            logger.warning(f"Error checking wall thickness for printing: {e}")
+            return True
     
     def _estimate_print_time(
         self,
@@ -1841,15 +1854,15 @@ class ManufacturingValidator:
             if len(shape.Solids) == 0:
                 return True  # Not a solid
             
-            # Use the WallThicknessAnalyzer with reasonable resolution
-            analyzer = WallThicknessAnalyzer(resolution=20)
-            thickness_map = analyzer.analyze(shape)
+            # Shares the cached analysis with the thin wall and printing checks
+            analyzer = WallThicknessAnalyzer()
+            result = analyzer.analyze_faces(shape)
             
-            if not thickness_map:
+            if result is None or result.min_thickness is None:
                 return True  # Could not measure, assume OK
             
             # Get all thickness values
-            thicknesses = list(thickness_map.values())
+            thicknesses = result.thickness[result.measured].tolist()
             
             # Filter out invalid measurements (0 or very large values)
             if hasattr(shape, 'BoundBox'):
@@ -21,7 +21,6 @@ from datetime import datetime, timezone, timedelta
 from typing import List, Optional, Tuple, Dict, Any
 
 import pyotp
-import qrcode
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -31,11 +30,14 @@ from ..models.user import User
 from ..models.mfa_backup_code import MFABackupCode
 from ..models.audit_log import AuditLog
 from ..models.security_event import SecurityEvent
+from ..core.lazy_loading import lazy_module
 from ..core.logging import get_logger
 from ..config import settings
 
 logger = get_logger(__name__)
 
+qrcode = lazy_module("qrcode")
+
 
 class MFAError(Exception):
     """MFA operation error with error codes."""
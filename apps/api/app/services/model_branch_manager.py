@@ -508,6 +508,40 @@ class ModelBranchManager:
             )
             raise BranchManagerError(f"Failed to create tag: {str(e)}")
     
+    async def delete_tag(
+        self,
+        tag_name: str,
+    ) -> bool:
+        """
+        Delete a tag and its metadata.
+        
+        Args:
+            tag_name: Tag name
+            
+        Returns:
+            Success status
+        """
+        try:
+            if not await self.tag_exists(tag_name):
+                raise ValueError(f"Tag {tag_name} does not exist")
+            
+            await self._delete_ref(f"tags/{tag_name}")
+            (self.tags_path / f"{tag_name}.json").unlink(missing_ok=True)
+            
+            self._tags.pop(tag_name, None)
+            
+            logger.info("tag_deleted", tag_name=tag_name)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(
+                "tag_deletion_failed",
+                error=str(e),
+                tag_name=tag_name
+            )
+            raise BranchManagerError(f"Failed to delete tag: {str(e)}")
+    
     async def tag_exists(
         self,
         tag_name: str,
@@ -521,17 +555,37 @@ class ModelBranchManager:
         commit_hash: str,
     ) -> List[str]:
         """Get all tags pointing to a commit."""
-        tags = []
+        tags = await self.get_tags_for_commits([commit_hash])
+        return tags.get(commit_hash, [])
+    
+    async def get_tags_for_commits(
+        self,
+        commit_hashes: List[str],
+    ) -> Dict[str, List[str]]:
+        """
+        Get the tags pointing to each of a batch of commits.
+        
+        Answered from the object store's tag index; without an object store
+        the tags directory is scanned once for the whole batch.
+        
+        Returns:
+            Sorted tag names per commit; commits without tags are left out
+        """
+        if self.object_store:
+            return await self.object_store.get_tags_for_commits(commit_hashes)
+        
+        wanted = set(commit_hashes)
+        tags: Dict[str, List[str]] = {}
         
         # Ensure tags directory exists
         self.tags_path.mkdir(parents=True, exist_ok=True)
         
         # Check all tags
-        for tag_file in self.tags_path.iterdir():
+        for tag_file in sorted(self.tags_path.iterdir()):
             if tag_file.suffix == "":  # Skip .json files
                 target = tag_file.read_text().strip()
-                if target == commit_hash:
-                    tags.append(tag_file.name)
+                if target in wanted:
+                    tags.setdefault(target, []).append(tag_file.name)
         
         return tags
     
@@ -697,6 +751,20 @@ class ModelBranchManager:
         temp_path = ref_path.with_suffix('.tmp')
         temp_path.write_text(value)
         temp_path.replace(ref_path)
+        
+        # Keep the commit -> tags index in step with every tag write
+        if ref_name.startswith("tags/") and self.object_store:
+            await self.object_store.index_tag(ref_name[len("tags/"):], value)
+    
+    async def _delete_ref(
+        self,
+        ref_name: str,
+    ):
+        """Delete reference file."""
+        (self.refs_path / ref_name).unlink(missing_ok=True)
+        
+        if ref_name.startswith("tags/") and self.object_store:
+            await self.object_store.index_tag(ref_name[len("tags/"):], None)
     
     def _validate_branch_name(self, name: str) -> bool:
         """Validate branch name."""
@@ -763,35 +831,15 @@ class ModelBranchManager:
         """
         Check if ancestor_commit is an ancestor of descendant_commit.
         
-        This follows the commit parent chain to see if we can reach
-        the ancestor from the descendant.
+        Uses the commit-graph index through the commit manager instead of
+        loading every commit on the way.
         """
         try:
             # Commit manager is required for this operation
             if not self.commit_manager:
                 raise ValueError("Commit manager is required for branch operations")
             
-            # Start from descendant and walk back through parents
-            visited = set()
-            to_check = [descendant_commit]
-            
-            while to_check:
-                current = to_check.pop(0)
-                
-                if current in visited:
-                    continue
-                visited.add(current)
-                
-                # Found the ancestor
-                if current == ancestor_commit:
-                    return True
-                
-                # Get commit and add parents to check
-                commit = await self.commit_manager.get_commit(current)
-                if commit and commit.parents:
-                    to_check.extend(commit.parents)
-            
-            return False
+            return await self.commit_manager.is_ancestor(ancestor_commit, descendant_commit)
             
         except Exception as e:
             logger.debug(
@@ -800,4 +848,4 @@ class ModelBranchManager:
                 descendant=descendant_commit[:8],
                 error=str(e)
             )
-            return False
\ No newline at end of file
+            return False
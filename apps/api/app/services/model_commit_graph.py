@@ -0,0 +1,622 @@
+"""
+Commit Graph and Reachability Index for FreeCAD Model Version Control (Task 7.22).
+
+Persisted SQLite index next to the object store that records every object,
+its type and its outgoing edges:
+
+- commit -> parent commits (ordered, first parent first)
+- commit -> root tree
+- tree -> entries (blobs and sub-trees)
+
+Commits also carry a generation number (1 for root commits, otherwise one
+more than the highest parent generation). Ancestry and merge-base queries
+use it to stop walking as soon as a commit is too old to matter.
+
+Tags are indexed by target commit, so the tags of a page of history come
+from one query instead of a scan of the tags directory per commit. The
+index remembers which state of the tag refs it was built from, so the
+object store can rebuild it when tags change outside the branch manager.
+
+The index also holds the state of an incremental mark-sweep collector so a
+GC cycle can be split across runs (and survive restarts):
+
+- ``gc_grey``: frontier of objects reached but not yet scanned
+- ``gc_marked``: objects known to be reachable in the current cycle
+- ``gc_epoch``: highest object sequence number when the cycle started;
+  objects written later are never swept by that cycle
+
+Objects written or re-referenced while a cycle is running have their
+children (or themselves) pushed onto the frontier, so the sweep never
+removes something a concurrent writer just started using.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+EDGE_PARENT = 0
+EDGE_TREE = 1
+EDGE_ENTRY = 2
+
+# Stay well below SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+# (destination hash, edge kind, position)
+Edge = Tuple[str, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    hash TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    generation INTEGER
+);
+CREATE TABLE IF NOT EXISTS edges (
+    src TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    dst TEXT NOT NULL,
+    PRIMARY KEY (src, kind, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gc_grey (hash TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gc_marked (hash TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tags (
+    name TEXT PRIMARY KEY,
+    target TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_target ON tags (target);
+"""
+
+
+class CommitGraphError(Exception):
+    """Raised when the commit graph index cannot be opened or updated."""
+    pass
+
+
+def object_edges(obj_type: str, data: Any) -> List[Edge]:
+    """
+    Extract outgoing edges of a commit or tree.
+
+    ``data`` may be a pydantic model (Commit/Tree) or the plain dict stored
+    in the object payload.
+    """
+    def get(source: Any, key: str) -> Any:
+        if isinstance(source, dict):
+            return source.get(key)
+        return getattr(source, key, None)
+
+    edges: List[Edge] = []
+    if obj_type == "commit":
+        for position, parent in enumerate(get(data, "parents") or []):
+            edges.append((parent, EDGE_PARENT, position))
+        tree = get(data, "tree")
+        if tree:
+            edges.append((tree, EDGE_TREE, 0))
+    elif obj_type == "tree":
+        for position, entry in enumerate(get(data, "entries") or []):
+            entry_hash = get(entry, "hash")
+            if entry_hash:
+                edges.append((entry_hash, EDGE_ENTRY, position))
+    return edges
+
+
+def _chunks(items: Sequence[str], size: int = _IN_CHUNK) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CommitGraph:
+    """
+    SQLite-backed object graph of a ModelObjectStore.
+
+    Thread-safe: one connection guarded by a lock, since the store calls it
+    from worker threads as well as from the event loop.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def open(self):
+        """Open (and create) the index database."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    str(self.db_path),
+                    timeout=30,
+                    isolation_level=None,
+                    check_same_thread=False,
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                raise CommitGraphError(f"Failed to open commit graph {self.db_path}: {e}")
+            self._conn = conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; takes the database write lock up front."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise CommitGraphError("Commit graph is not open")
+        return self._conn
+
+    # Metadata
+
+    def _get_meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: Optional[str]):
+        if value is None:
+            conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+        else:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def is_complete(self) -> bool:
+        """True once every object in the store has been indexed."""
+        with self._lock:
+            return self._get_meta(self._connection(), "complete") == "1"
+
+    def mark_complete(self):
+        with self._transaction() as conn:
+            self._set_meta(conn, "complete", "1")
+
+    # Updates
+
+    def add_object(self, obj_hash: str, obj_type: str, edges: Sequence[Edge] = ()) -> bool:
+        """
+        Index a newly written object.
+
+        Returns:
+            True if the object was added, False if it was already indexed
+        """
+        with self._transaction() as conn:
+            generation = None
+            if obj_type == "commit":
+                generation = self._commit_generation(conn, edges)
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO objects (hash, type, generation) VALUES (?, ?, ?)",
+                (obj_hash, obj_type, generation),
+            )
+            added = cursor.rowcount == 1
+            if added and edges:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO edges (src, kind, position, dst) VALUES (?, ?, ?, ?)",
+                    [(obj_hash, kind, position, dst) for dst, kind, position in edges],
+                )
+            if self._get_meta(conn, "gc_epoch") is not None:
+                # Write barrier: whatever a new object points at survives
+                # the running cycle
+                self._grey(conn, [dst for dst, _, _ in edges] if added else [obj_hash])
+            return added
+
+    def add_many(self, records: Iterable[Tuple[str, str, Sequence[Edge]]]) -> int:
+        """Bulk-index (hash, type, edges) records, e.g. when backfilling."""
+        added = 0
+        with self._transaction() as conn:
+            for obj_hash, obj_type, edges in records:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO objects (hash, type) VALUES (?, ?)",
+                    (obj_hash, obj_type),
+                )
+                if cursor.rowcount != 1:
+                    continue
+                added += 1
+                if edges:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO edges (src, kind, position, dst) VALUES (?, ?, ?, ?)",
+                        [(obj_hash, kind, position, dst) for dst, kind, position in edges],
+                    )
+            self._recompute_generations(conn)
+        return added
+
+    def touch(self, obj_hash: str) -> bool:
+        """
+        Check whether an object is indexed, protecting it from a running GC.
+
+        Writers call this instead of a plain existence check before reusing
+        an existing object, so a concurrent sweep cannot remove it.
+        """
+        with self._lock:
+            conn = self._connection()
+            present = conn.execute(
+                "SELECT 1 FROM objects WHERE hash = ?", (obj_hash,)
+            ).fetchone() is not None
+            if not present or self._get_meta(conn, "gc_epoch") is None:
+                return present
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM objects WHERE hash = ?", (obj_hash,)).fetchone() is None:
+                # Swept in between: caller must write it again
+                return False
+            self._grey(conn, [obj_hash])
+            return True
+
+    def _commit_generation(self, conn: sqlite3.Connection, edges: Sequence[Edge]) -> Optional[int]:
+        parents = [dst for dst, kind, _ in edges if kind == EDGE_PARENT]
+        if not parents:
+            return 1
+        highest = 0
+        for parent in parents:
+            row = conn.execute("SELECT generation FROM objects WHERE hash = ?", (parent,)).fetchone()
+            if row is None or row[0] is None:
+                # Parent unknown: generation unknown, ancestry walks won't prune here
+                return None
+            highest = max(highest, row[0])
+        return highest + 1
+
+    def _recompute_generations(self, conn: sqlite3.Connection):
+        """Fill in missing commit generations (objects may arrive in any order)."""
+        commits = {
+            row[0]: row[1]
+            for row in conn.execute("SELECT hash, generation FROM objects WHERE type = 'commit'")
+        }
+        pending = [h for h, gen in commits.items() if gen is None]
+        if not pending:
+            return
+        parents: dict = {}
+        for src, dst in conn.execute(
+            "SELECT src, dst FROM edges WHERE kind = ? ORDER BY src, position", (EDGE_PARENT,)
+        ):
+            parents.setdefault(src, []).append(dst)
+
+        generations = {h: gen for h, gen in commits.items() if gen is not None}
+        unresolvable = set()
+        for start in pending:
+            stack = [start]
+            while stack:
+                current = stack[-1]
+                if current in generations or current in unresolvable:
+                    stack.pop()
+                    continue
+                todo = [p for p in parents.get(current, ()) if p not in generations and p not in unresolvable]
+                missing = [p for p in todo if p not in commits]
+                if missing:
+                    unresolvable.add(current)
+                    stack.pop()
+                    continue
+                if todo:
+                    stack.extend(todo)
+                    continue
+                parent_gens = [generations.get(p) for p in parents.get(current, ())]
+                if any(g is None for g in parent_gens):
+                    unresolvable.add(current)
+                else:
+                    generations[current] = max(parent_gens, default=0) + 1
+                stack.pop()
+        conn.executemany(
+            "UPDATE objects SET generation = ? WHERE hash = ?",
+            [(generations[h], h) for h in pending if h in generations],
+        )
+
+    # Queries
+
+    def contains(self, obj_hash: str) -> bool:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT 1 FROM objects WHERE hash = ?", (obj_hash,)
+            ).fetchone() is not None
+
+    def object_type(self, obj_hash: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT type FROM objects WHERE hash = ?", (obj_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    def all_hashes(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._connection().execute("SELECT hash FROM objects")]
+
+    def generation(self, commit_hash: str) -> Optional[int]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT generation FROM objects WHERE hash = ?", (commit_hash,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def parents(self, commit_hash: str) -> List[str]:
+        with self._lock:
+            return [
+                row[0] for row in self._connection().execute(
+                    "SELECT dst FROM edges WHERE src = ? AND kind = ? ORDER BY position",
+                    (commit_hash, EDGE_PARENT),
+                )
+            ]
+
+    def first_parent_chain(self, commit_hash: str, limit: int) -> List[str]:
+        """Hashes along the first-parent chain, starting at ``commit_hash``."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self._connection().execute(
+                """
+                WITH RECURSIVE chain(hash, depth) AS (
+                    SELECT ?, 0
+                    UNION ALL
+                    SELECT e.dst, chain.depth + 1
+                    FROM edges e JOIN chain ON e.src = chain.hash
+                    WHERE e.kind = ? AND e.position = 0 AND chain.depth + 1 < ?
+                )
+                SELECT hash FROM chain ORDER BY depth
+                """,
+                (commit_hash, EDGE_PARENT, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """True if ``ancestor`` is reachable from ``descendant`` via parents."""
+        if ancestor == descendant:
+            return True
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT generation FROM objects WHERE hash = ?", (ancestor,)
+            ).fetchone()
+            if row is None:
+                return False
+            target_generation = row[0]
+
+            visited = {descendant}
+            stack = [descendant]
+            while stack:
+                current = stack.pop()
+                for parent, generation in conn.execute(
+                    "SELECT e.dst, o.generation FROM edges e "
+                    "LEFT JOIN objects o ON o.hash = e.dst "
+                    "WHERE e.src = ? AND e.kind = ?",
+                    (current, EDGE_PARENT),
+                ):
+                    if parent == ancestor:
+                        return True
+                    if parent in visited:
+                        continue
+                    visited.add(parent)
+                    # Everything behind an older commit is older still
+                    if (target_generation is not None and generation is not None
+                            and generation <= target_generation):
+                        continue
+                    stack.append(parent)
+        return False
+
+    def merge_base(self, one: str, two: str) -> Optional[str]:
+        """
+        Best common ancestor of two commits, following all parents.
+
+        Walks both histories together, highest generation first, and
+        returns the first commit reached from both sides. A commit's
+        children all have higher generations, so when it is popped every
+        path to it has been walked, and no other common ancestor descends
+        from the one returned. Only commits newer than the merge base (and
+        the frontier) are visited.
+        """
+        if one == two:
+            return one
+        with self._lock:
+            conn = self._connection()
+
+            def generation(commit_hash: str) -> int:
+                row = conn.execute(
+                    "SELECT generation FROM objects WHERE hash = ?", (commit_hash,)
+                ).fetchone()
+                return (row[0] or 0) if row else 0
+
+            # Bit 1: reachable from ``one``, bit 2: reachable from ``two``
+            reached = {one: 1, two: 2}
+            queue = [(-generation(one), one), (-generation(two), two)]
+            heapq.heapify(queue)
+            while queue:
+                _, current = heapq.heappop(queue)
+                sides = reached[current]
+                if sides == 3:
+                    return current
+                for parent, parent_generation in conn.execute(
+                    "SELECT e.dst, o.generation FROM edges e "
+                    "LEFT JOIN objects o ON o.hash = e.dst "
+                    "WHERE e.src = ? AND e.kind = ?",
+                    (current, EDGE_PARENT),
+                ):
+                    known = reached.get(parent)
+                    if known is None:
+                        reached[parent] = sides
+                        heapq.heappush(queue, (-(parent_generation or 0), parent))
+                    else:
+                        reached[parent] = known | sides
+        return None
+
+    # Tags
+
+    def set_tag(self, name: str, target: str):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tags (name, target) VALUES (?, ?)", (name, target)
+            )
+
+    def remove_tag(self, name: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM tags WHERE name = ?", (name,))
+
+    def replace_tags(self, tags: Iterable[Tuple[str, str]], source_state: Optional[str] = None):
+        """
+        Replace the whole tag index, e.g. when backfilling from refs.
+
+        ``source_state`` identifies the state of the refs the tags were read
+        from; it is returned by ``tags_source_state`` until the next replace.
+        """
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM tags")
+            conn.executemany("INSERT OR REPLACE INTO tags (name, target) VALUES (?, ?)", tags)
+            self._set_meta(conn, "tags_indexed", "1")
+            self._set_meta(conn, "tags_source_state", source_state)
+
+    @property
+    def tags_source_state(self) -> Optional[str]:
+        with self._lock:
+            return self._get_meta(self._connection(), "tags_source_state")
+
+    def tags_for(self, commit_hashes: Sequence[str]) -> Dict[str, List[str]]:
+        """Tag names per commit, sorted; commits without tags are left out."""
+        result: Dict[str, List[str]] = {}
+        unique = list(dict.fromkeys(commit_hashes))
+        with self._lock:
+            conn = self._connection()
+            for chunk in _chunks(unique):
+                placeholders = ",".join("?" * len(chunk))
+                for name, target in conn.execute(
+                    f"SELECT name, target FROM tags WHERE target IN ({placeholders}) ORDER BY name",
+                    chunk,
+                ):
+                    result.setdefault(target, []).append(name)
+        return result
+
+    # Incremental mark-sweep
+
+    @property
+    def gc_active(self) -> bool:
+        with self._lock:
+            return self._get_meta(self._connection(), "gc_epoch") is not None
+
+    def gc_begin(self, roots: Sequence[str]):
+        """Start a GC cycle from the given root commits."""
+        with self._transaction() as conn:
+            epoch = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM objects").fetchone()[0]
+            conn.execute("DELETE FROM gc_grey")
+            conn.execute("DELETE FROM gc_marked")
+            self._set_meta(conn, "gc_epoch", str(epoch))
+            self._grey(conn, roots)
+
+    def gc_add_roots(self, roots: Sequence[str]) -> int:
+        """Grey roots not marked yet (refs can move during a cycle)."""
+        with self._transaction() as conn:
+            return self._grey(conn, roots)
+
+    def gc_mark_step(self, limit: int) -> int:
+        """
+        Scan up to ``limit`` frontier objects.
+
+        Returns:
+            Number of objects scanned; 0 once marking is complete
+        """
+        with self._transaction() as conn:
+            batch = [
+                row[0] for row in conn.execute("SELECT hash FROM gc_grey LIMIT ?", (limit,))
+            ]
+            if not batch:
+                return 0
+            conn.executemany(
+                "INSERT OR IGNORE INTO gc_marked (hash) VALUES (?)", [(h,) for h in batch]
+            )
+            children: List[str] = []
+            for chunk in _chunks(batch):
+                placeholders = ",".join("?" * len(chunk))
+                children.extend(
+                    row[0] for row in conn.execute(
+                        f"SELECT dst FROM edges WHERE src IN ({placeholders})", chunk
+                    )
+                )
+            conn.executemany("DELETE FROM gc_grey WHERE hash = ?", [(h,) for h in batch])
+            self._grey(conn, children)
+            return len(batch)
+
+    def gc_sweep_batch(
+        self,
+        limit: int,
+        remove: Callable[[List[Tuple[str, str]]], int],
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Remove up to ``limit`` unmarked objects that predate the cycle.
+
+        ``remove`` deletes the (hash, type) objects from storage and returns
+        how many of them could only be dropped later (packed objects); that
+        sets the ``compact_pending`` flag. It runs while the index write
+        lock is held so writers cannot revive an object halfway through.
+
+        Returns:
+            Removed (hash, type) pairs, [] when the sweep is done, or None
+            if new objects were greyed and marking has to continue first
+        """
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM gc_grey LIMIT 1").fetchone() is not None:
+                return None
+            epoch = int(self._get_meta(conn, "gc_epoch") or 0)
+            victims = conn.execute(
+                "SELECT hash, type FROM objects "
+                "WHERE seq <= ? AND hash NOT IN (SELECT hash FROM gc_marked) LIMIT ?",
+                (epoch, limit),
+            ).fetchall()
+            if not victims:
+                return []
+            if remove(victims):
+                self._set_meta(conn, "compact_pending", "1")
+            conn.executemany("DELETE FROM objects WHERE hash = ?", [(h,) for h, _ in victims])
+            conn.executemany("DELETE FROM edges WHERE src = ?", [(h,) for h, _ in victims])
+            return victims
+
+    def gc_finish(self):
+        """End the current cycle and drop its mark state."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM gc_grey")
+            conn.execute("DELETE FROM gc_marked")
+            self._set_meta(conn, "gc_epoch", None)
+
+    def get_flag(self, key: str) -> bool:
+        with self._lock:
+            return self._get_meta(self._connection(), key) == "1"
+
+    def set_flag(self, key: str, value: bool):
+        with self._transaction() as conn:
+            self._set_meta(conn, key, "1" if value else None)
+
+    def _grey(self, conn: sqlite3.Connection, hashes: Iterable[str]) -> int:
+        """Add unmarked hashes to the GC frontier; returns how many were new."""
+        added = 0
+        for obj_hash in set(hashes):
+            if conn.execute("SELECT 1 FROM gc_marked WHERE hash = ?", (obj_hash,)).fetchone():
+                continue
+            added += conn.execute(
+                "INSERT OR IGNORE INTO gc_grey (hash) VALUES (?)", (obj_hash,)
+            ).rowcount
+        return added
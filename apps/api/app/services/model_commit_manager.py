@@ -338,6 +338,33 @@ class ModelCommitManager:
                 )
                 raise CommitManagerError(f"Failed to build tree: {str(e)}")
     
+    async def get_commit(
+        self,
+        commit_hash: str,
+    ) -> Optional[Commit]:
+        """Get commit object by hash."""
+        return await self.object_store.get_commit(commit_hash)
+    
+    async def is_ancestor(
+        self,
+        ancestor_hash: str,
+        descendant_hash: str,
+    ) -> bool:
+        """
+        Check if a commit is an ancestor of (or equal to) another commit.
+        
+        Answered from the object store's commit-graph index; generation
+        numbers stop the walk at commits older than the candidate ancestor.
+        
+        Args:
+            ancestor_hash: Candidate ancestor commit hash
+            descendant_hash: Descendant commit hash
+            
+        Returns:
+            True if ancestor_hash is reachable from descendant_hash
+        """
+        return await self.object_store.is_ancestor(ancestor_hash, descendant_hash)
+    
     async def get_commit_tree(
         self,
         commit_hash: str,
@@ -445,24 +472,15 @@ class ModelCommitManager:
             List of commits in history
         """
         history = []
-        visited = set()
-        current = commit_hash
         
-        while current and len(history) < limit:
-            # Avoid cycles
-            if current in visited:
-                break
-            visited.add(current)
-            
-            # Get commit
+        # First-parent chain comes from the commit-graph index in one query
+        chain = await self.object_store.get_first_parent_chain(commit_hash, limit)
+        
+        for current in chain:
             commit = await self.object_store.get_commit(current)
             if not commit:
                 break
-            
             history.append(commit)
-            
-            # Move to first parent
-            current = commit.parents[0] if commit.parents else None
         
         return history
     
@@ -8,7 +8,10 @@ geometry, properties, and parametric expressions.
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, List, Optional, Set, Tuple
+import bisect
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple, Union
 
 import structlog
 
@@ -18,6 +21,7 @@ from app.middleware.correlation_middleware import get_correlation_id
 from app.models.version_control import (
     ChangeType,
     CommitDiff,
+    CommitDiffPage,
     DiffType,
     FreeCADObjectData,
     ObjectDiff,
@@ -43,19 +47,30 @@ class ModelDiffer:
     - Property-level diffing
     - Geometric shape comparison
     - Expression change tracking
-    - Tree-level diffing
+    - Tree-level diffing with concurrent object loading
+    - Paginated tree diffs
     - Diff statistics
     """
     
-    def __init__(self, object_store: Optional['ModelObjectStore'] = None):
+    # shape_data fingerprints of the stored geometry; shapes whose present
+    # fingerprints all match are not compared in detail
+    SHAPE_HASH_KEYS = ("shape_hash", "topology_hash")
+    
+    def __init__(
+        self,
+        object_store: Optional['ModelObjectStore'] = None,
+        max_concurrency: int = 16,
+    ):
         """Initialize model differ.
         
         Args:
             object_store: Optional object store for loading objects during detailed diff
+            max_concurrency: Modified entries loaded at the same time during a tree diff
         """
         # Tolerance for floating point comparisons
         self.tolerance = 1e-6
         self.object_store = object_store
+        self.max_concurrency = max(1, max_concurrency)
         
         logger.info("model_differ_initialized")
     
@@ -101,7 +116,8 @@ class ModelDiffer:
         diff.property_changes = self._diff_properties(obj1, obj2)
         
         # Compare shapes if applicable
-        if obj1.shape_data and obj2.shape_data:
+        if (obj1.shape_data and obj2.shape_data
+                and not self._same_shape_hash(obj1.shape_data, obj2.shape_data)):
             diff.shape_diff = self._diff_shapes(obj1.shape_data, obj2.shape_data)
         
         # Compare expressions
@@ -166,6 +182,23 @@ class ModelDiffer:
         
         return changes
     
+    def _same_shape_hash(
+        self,
+        shape1: Dict[str, Any],
+        shape2: Dict[str, Any],
+    ) -> bool:
+        """Check if stored geometry fingerprints show identical shapes."""
+        compared = False
+        for key in self.SHAPE_HASH_KEYS:
+            hash1 = shape1.get(key)
+            hash2 = shape2.get(key)
+            if hash1 is None or hash2 is None:
+                continue
+            if hash1 != hash2:
+                return False
+            compared = True
+        return compared
+    
     def _diff_shapes(
         self,
         shape1: Dict[str, Any],
@@ -270,88 +303,11 @@ class ModelDiffer:
         with create_span("diff_trees", correlation_id=correlation_id) as span:
             try:
                 object_diffs = []
-                stats = {
-                    "added": 0,
-                    "modified": 0,
-                    "deleted": 0,
-                    "renamed": 0
-                }
-                
-                # Build entry maps
-                entries1 = {e.name: e for e in tree1.entries} if tree1 else {}
-                entries2 = {e.name: e for e in tree2.entries} if tree2 else {}
+                stats = self._empty_stats()
                 
-                # Get all unique entry names
-                all_names = set(entries1.keys()) | set(entries2.keys())
-                
-                for name in all_names:
-                    entry1 = entries1.get(name)
-                    entry2 = entries2.get(name)
-                    
-                    if entry1 and entry2:
-                        if entry1.hash != entry2.hash:
-                            # Object modified - load and compute detailed diff
-                            try:
-                                # Load both objects for detailed comparison
-                                obj1 = await self.object_store.get_object(entry1.hash) if self.object_store else None
-                                obj2 = await self.object_store.get_object(entry2.hash) if self.object_store else None
-                                
-                                if obj1 and obj2:
-                                    # Compute detailed diff between objects
-                                    detailed_diff = await self.diff_objects(obj1, obj2)
-                                    # Only add to diffs if there are actual changes
-                                    if detailed_diff.diff_type != DiffType.UNCHANGED:
-                                        object_diffs.append(detailed_diff)
-                                        stats["modified"] += 1
-                                else:
-                                    # Fallback to basic diff if objects can't be loaded
-                                    diff = ObjectDiff(
-                                        object_id=name,
-                                        diff_type=DiffType.MODIFIED,
-                                        property_changes=[],
-                                        shape_diff=None,
-                                        expression_changes={}
-                                    )
-                                    object_diffs.append(diff)
-                                    stats["modified"] += 1
-                            except Exception as e:
-                                logger.warning(
-                                    "failed_to_compute_detailed_diff",
-                                    object_id=name,
-                                    error=str(e)
-                                )
-                                # Fallback to basic diff on error
-                                diff = ObjectDiff(
-                                    object_id=name,
-                                    diff_type=DiffType.MODIFIED,
-                                    property_changes=[],
-                                    shape_diff=None,
-                                    expression_changes={}
-                                )
-                                object_diffs.append(diff)
-                                stats["modified"] += 1
-                    elif entry2:
-                        # Object added
-                        diff = ObjectDiff(
-                            object_id=name,
-                            diff_type=DiffType.ADDED,
-                            property_changes=[],
-                            shape_diff=None,
-                            expression_changes={}
-                        )
-                        object_diffs.append(diff)
-                        stats["added"] += 1
-                    else:
-                        # Object deleted
-                        diff = ObjectDiff(
-                            object_id=name,
-                            diff_type=DiffType.DELETED,
-                            property_changes=[],
-                            shape_diff=None,
-                            expression_changes={}
-                        )
-                        object_diffs.append(diff)
-                        stats["deleted"] += 1
+                async for _, diff in self.iter_tree_diff(tree1, tree2):
+                    object_diffs.append(diff)
+                    stats[diff.diff_type.value] += 1
                 
                 # Detect renames (simplified - would use similarity detection)
                 # For now, skip rename detection
@@ -380,6 +336,178 @@ class ModelDiffer:
                 )
                 raise ModelDifferError(f"Failed to diff trees: {str(e)}")
     
+    async def diff_trees_page(
+        self,
+        tree1: Tree,
+        tree2: Tree,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> CommitDiffPage:
+        """
+        Calculate one page of differences between two trees.
+        
+        Only the entries up to the end of the page are loaded, so the first
+        page of a large diff returns without diffing the whole tree.
+        
+        Args:
+            tree1: First tree
+            tree2: Second tree
+            cursor: ``next_cursor`` of the previous page, None for the first
+            limit: Maximum number of object differences in the page
+            
+        Returns:
+            CommitDiffPage with this page's differences and statistics
+        """
+        correlation_id = get_correlation_id()
+        
+        with create_span("diff_trees_page", correlation_id=correlation_id) as span:
+            span.set_attribute("page.limit", limit)
+            try:
+                object_diffs = []
+                stats = self._empty_stats()
+                last_name = None
+                next_cursor = None
+                
+                async with aclosing(self.iter_tree_diff(tree1, tree2, after=cursor)) as changes:
+                    async for name, diff in changes:
+                        if len(object_diffs) == limit:
+                            next_cursor = last_name
+                            break
+                        object_diffs.append(diff)
+                        stats[diff.diff_type.value] += 1
+                        last_name = name
+                
+                return CommitDiffPage(
+                    from_commit=tree1.calculate_hash() if tree1 else "null",
+                    to_commit=tree2.calculate_hash() if tree2 else "null",
+                    object_diffs=object_diffs,
+                    stats=stats,
+                    next_cursor=next_cursor
+                )
+                
+            except Exception as e:
+                logger.error(
+                    "tree_diff_page_failed",
+                    error=str(e),
+                    correlation_id=correlation_id
+                )
+                raise ModelDifferError(f"Failed to diff trees: {str(e)}")
+    
+    async def iter_tree_diff(
+        self,
+        tree1: Optional[Tree],
+        tree2: Optional[Tree],
+        after: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, ObjectDiff]]:
+        """
+        Yield ``(entry name, diff)`` for each changed entry, in name order.
+        
+        Both versions of a modified entry are loaded together, up to
+        ``max_concurrency`` entries at a time and at most twice that many
+        ahead of the consumer. Entries whose detailed diff finds no change
+        are not yielded.
+        
+        Args:
+            tree1: First tree
+            tree2: Second tree
+            after: Only diff entries whose name sorts after this one
+        """
+        entries1 = {e.name: e for e in tree1.entries} if tree1 else {}
+        entries2 = {e.name: e for e in tree2.entries} if tree2 else {}
+        names = sorted(set(entries1.keys()) | set(entries2.keys()))
+        if after is not None:
+            names = names[bisect.bisect_right(names, after):]
+        
+        limiter = asyncio.Semaphore(self.max_concurrency)
+        lookahead = 2 * self.max_concurrency
+        pending: Deque[Tuple[str, Union[ObjectDiff, asyncio.Task]]] = deque()
+        remaining = iter(names)
+        exhausted = False
+        
+        try:
+            while True:
+                while not exhausted and len(pending) < lookahead:
+                    name = next(remaining, None)
+                    if name is None:
+                        exhausted = True
+                        break
+                    entry1 = entries1.get(name)
+                    entry2 = entries2.get(name)
+                    
+                    if entry1 and entry2:
+                        if entry1.hash == entry2.hash:
+                            continue
+                        if self.object_store:
+                            # Object modified - load and compute detailed diff
+                            pending.append((name, asyncio.ensure_future(
+                                self._diff_entry(name, entry1.hash, entry2.hash, limiter)
+                            )))
+                        else:
+                            pending.append((name, self._basic_diff(name, DiffType.MODIFIED)))
+                    elif entry2:
+                        pending.append((name, self._basic_diff(name, DiffType.ADDED)))
+                    else:
+                        pending.append((name, self._basic_diff(name, DiffType.DELETED)))
+                
+                if not pending:
+                    return
+                
+                name, item = pending.popleft()
+                diff = await item if isinstance(item, asyncio.Task) else item
+                # Only report entries with actual changes
+                if diff.diff_type != DiffType.UNCHANGED:
+                    yield name, diff
+        finally:
+            for _, item in pending:
+                if isinstance(item, asyncio.Task):
+                    item.cancel()
+    
+    async def _diff_entry(
+        self,
+        name: str,
+        hash1: str,
+        hash2: str,
+        limiter: asyncio.Semaphore,
+    ) -> ObjectDiff:
+        """Load both versions of a modified entry concurrently and diff them."""
+        try:
+            async with limiter:
+                obj1, obj2 = await asyncio.gather(
+                    self.object_store.get_freecad_object(hash1),
+                    self.object_store.get_freecad_object(hash2),
+                )
+            if obj1 and obj2:
+                return await self.diff_objects(obj1, obj2)
+        except Exception as e:
+            logger.warning(
+                "failed_to_compute_detailed_diff",
+                object_id=name,
+                error=str(e)
+            )
+        
+        # Fallback to basic diff if objects can't be loaded
+        return self._basic_diff(name, DiffType.MODIFIED)
+    
+    @staticmethod
+    def _basic_diff(object_id: str, diff_type: DiffType) -> ObjectDiff:
+        """Diff entry without property, shape or expression details."""
+        return ObjectDiff(
+            object_id=object_id,
+            diff_type=diff_type,
+            property_changes=[],
+            shape_diff=None,
+            expression_changes={}
+        )
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            "added": 0,
+            "modified": 0,
+            "deleted": 0,
+            "renamed": 0
+        }
+    
     def format_diff(
         self,
         diff: ObjectDiff,
@@ -0,0 +1,493 @@
+"""
+Pack Files for FreeCAD Model Version Control (Task 7.22).
+
+Loose objects are one gzip file per object version. This module implements
+a Git-style pack format so a repository can consolidate them into a few
+large files:
+
+- ``pack-<sha>.pack``: header, concatenated zlib-compressed entries and a
+  SHA-256 trailer. An entry is either a full object or a delta against a
+  base object stored in the same pack.
+- ``pack-<sha>.idx``: 256-entry fan-out table, sorted raw object hashes and
+  pack offsets. Lookups binary-search the fan-out bucket of an mmap'd index,
+  and entries are decompressed straight out of the mmap'd pack.
+
+Deltas use zlib with the base object as preset dictionary (``zdict``): the
+target compresses to back-references into its base, which gives delta
+encoding at C speed for object-sized payloads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PACK_MAGIC = b"MPCK"
+INDEX_MAGIC = b"\xffMOI"
+PACK_VERSION = 1
+INDEX_VERSION = 1
+
+ENTRY_FULL = 1
+ENTRY_DELTA = 2
+
+HASH_SIZE = 32
+DELTA_ALGORITHM = "zlib-zdict"
+# zlib only uses the last 32 KiB of a preset dictionary
+ZDICT_WINDOW = 32 * 1024
+
+# Entry header: type (1 byte) + payload length (4 bytes)
+_ENTRY_HEADER = struct.Struct(">BI")
+_PACK_HEADER = struct.Struct(">4sII")
+_INDEX_HEADER = struct.Struct(">4sI")
+_FANOUT = struct.Struct(">256I")
+_OFFSET = struct.Struct(">Q")
+
+
+class PackError(Exception):
+    """Raised for malformed or corrupt pack/index files."""
+    pass
+
+
+def encode_delta(base: bytes, target: bytes, level: int = 9) -> bytes:
+    """Encode ``target`` as a delta against ``base``."""
+    compressor = zlib.compressobj(level, zdict=base[-ZDICT_WINDOW:])
+    return compressor.compress(target) + compressor.flush()
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Reconstruct the target object from ``base`` and its delta."""
+    decompressor = zlib.decompressobj(zdict=base[-ZDICT_WINDOW:])
+    return decompressor.decompress(delta) + decompressor.flush()
+
+
+@dataclass
+class PackInput:
+    """Object offered to the pack writer."""
+    obj_hash: str
+    data: bytes
+    # Objects with the same delta key (e.g. FreeCAD object name) are
+    # considered as delta bases for each other
+    delta_key: Optional[str] = None
+
+
+@dataclass
+class PackWriteResult:
+    """Outcome of writing one pack."""
+    pack_path: Path
+    index_path: Path
+    object_count: int
+    delta_count: int
+    raw_bytes: int
+    pack_bytes: int
+
+
+def write_pack(
+    objects: Iterable[PackInput],
+    pack_dir: Path,
+    window: int = 10,
+    max_depth: int = 10,
+    min_saving_ratio: float = 0.5,
+) -> Optional[PackWriteResult]:
+    """
+    Write objects into a new pack + index pair.
+
+    Objects sharing a ``delta_key`` keep the order they are given in, which
+    callers make newest first: the latest version stays a full object and
+    older versions become deltas against their neighbours, as in Git. Each
+    object is delta-encoded against the best of the previous ``window``
+    candidates when that saves at least ``min_saving_ratio`` over storing it
+    whole, and delta chains never exceed ``max_depth``.
+    """
+    pack_dir.mkdir(parents=True, exist_ok=True)
+
+    unique: Dict[str, PackInput] = {}
+    for item in objects:
+        unique.setdefault(item.obj_hash, item)
+    if not unique:
+        return None
+
+    groups: Dict[Optional[str], List[PackInput]] = {}
+    for item in unique.values():
+        groups.setdefault(item.delta_key, []).append(item)
+
+    tmp_pack = pack_dir / f"tmp_pack_{os.getpid()}_{id(unique)}"
+    offsets: Dict[bytes, int] = {}
+    delta_count = 0
+    raw_bytes = 0
+    hasher = hashlib.sha256()
+
+    try:
+        with open(tmp_pack, "wb") as f:
+            def emit(chunk: bytes) -> None:
+                hasher.update(chunk)
+                f.write(chunk)
+
+            position = _PACK_HEADER.size
+            emit(_PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(unique)))
+
+            for key, members in groups.items():
+                # Sliding window of (item, chain depth) delta candidates
+                recent: List[Tuple[PackInput, int]] = []
+                for item in members:
+                    raw_bytes += len(item.data)
+                    full = zlib.compress(item.data, 6)
+                    best: Optional[Tuple[bytes, PackInput, int]] = None
+                    if key is not None:
+                        for candidate, depth in recent:
+                            if depth >= max_depth:
+                                continue
+                            delta = encode_delta(candidate.data, item.data)
+                            if best is None or len(delta) < len(best[0]):
+                                best = (delta, candidate, depth)
+
+                    raw_hash = bytes.fromhex(item.obj_hash)
+                    offsets[raw_hash] = position
+                    if best is not None and len(best[0]) + HASH_SIZE <= len(full) * min_saving_ratio:
+                        delta, base, base_depth = best
+                        record = (
+                            _ENTRY_HEADER.pack(ENTRY_DELTA, len(delta))
+                            + bytes.fromhex(base.obj_hash)
+                            + delta
+                        )
+                        depth = base_depth + 1
+                        delta_count += 1
+                    else:
+                        record = _ENTRY_HEADER.pack(ENTRY_FULL, len(full)) + full
+                        depth = 0
+                    emit(record)
+                    position += len(record)
+
+                    if key is not None:
+                        recent.append((item, depth))
+                        if len(recent) > window:
+                            recent.pop(0)
+
+            checksum = hasher.digest()
+            f.write(checksum)
+            f.flush()
+            os.fsync(f.fileno())
+
+        pack_name = f"pack-{checksum.hex()}"
+        pack_path = pack_dir / f"{pack_name}.pack"
+        index_path = pack_dir / f"{pack_name}.idx"
+        os.replace(tmp_pack, pack_path)
+        _write_index(index_path, offsets, checksum)
+    except Exception:
+        try:
+            tmp_pack.unlink()
+        except OSError:
+            pass
+        raise
+
+    return PackWriteResult(
+        pack_path=pack_path,
+        index_path=index_path,
+        object_count=len(unique),
+        delta_count=delta_count,
+        raw_bytes=raw_bytes,
+        pack_bytes=pack_path.stat().st_size + index_path.stat().st_size,
+    )
+
+
+def _write_index(index_path: Path, offsets: Dict[bytes, int], pack_checksum: bytes) -> None:
+    """Write a sorted, fan-out index for a pack."""
+    hashes = sorted(offsets)
+    fanout = [0] * 256
+    for raw in hashes:
+        fanout[raw[0]] += 1
+    running = 0
+    for i in range(256):
+        running += fanout[i]
+        fanout[i] = running
+
+    body = b"".join([
+        _INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION),
+        _FANOUT.pack(*fanout),
+        b"".join(hashes),
+        b"".join(_OFFSET.pack(offsets[raw]) for raw in hashes),
+        pack_checksum,
+    ])
+    body += hashlib.sha256(body).digest()
+
+    tmp_path = index_path.with_suffix(".idx.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, index_path)
+
+
+class PackReader:
+    """
+    Read-only access to one pack through mmap'd pack and index files.
+
+    Object payloads are decompressed directly from the mapped pack; only the
+    decompressed result is materialised.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self.pack_path = self.index_path.with_suffix(".pack")
+        self._index_file = open(self.index_path, "rb")
+        self._pack_file = open(self.pack_path, "rb")
+        try:
+            self._idx = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._pack = mmap.mmap(self._pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._parse_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_index(self) -> None:
+        magic, version = _INDEX_HEADER.unpack_from(self._idx, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise PackError(f"Unsupported pack index: {self.index_path.name}")
+        pack_magic, pack_version, pack_count = _PACK_HEADER.unpack_from(self._pack, 0)
+        if pack_magic != PACK_MAGIC or pack_version != PACK_VERSION:
+            raise PackError(f"Unsupported pack file: {self.pack_path.name}")
+
+        self._fanout = _FANOUT.unpack_from(self._idx, _INDEX_HEADER.size)
+        self.count = self._fanout[255]
+        if self.count != pack_count:
+            raise PackError(f"Pack/index object count mismatch: {self.pack_path.name}")
+        self._hashes_start = _INDEX_HEADER.size + _FANOUT.size
+        self._offsets_start = self._hashes_start + self.count * HASH_SIZE
+        expected_size = self._offsets_start + self.count * _OFFSET.size + 2 * HASH_SIZE
+        if len(self._idx) != expected_size:
+            raise PackError(f"Truncated pack index: {self.index_path.name}")
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._pack) + len(self._idx)
+
+    def _hash_at(self, position: int) -> bytes:
+        start = self._hashes_start + position * HASH_SIZE
+        return self._idx[start:start + HASH_SIZE]
+
+    def find_offset(self, obj_hash: str) -> Optional[int]:
+        """Binary search the fan-out bucket for ``obj_hash``."""
+        try:
+            raw = bytes.fromhex(obj_hash)
+        except ValueError:
+            return None
+        if len(raw) != HASH_SIZE:
+            return None
+        lo = self._fanout[raw[0] - 1] if raw[0] else 0
+        hi = self._fanout[raw[0]]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._hash_at(mid)
+            if current < raw:
+                lo = mid + 1
+            elif current > raw:
+                hi = mid
+            else:
+                return _OFFSET.unpack_from(self._idx, self._offsets_start + mid * _OFFSET.size)[0]
+        return None
+
+    def __contains__(self, obj_hash: str) -> bool:
+        return self.find_offset(obj_hash) is not None
+
+    def read(self, obj_hash: str, max_depth: int = 64) -> Optional[bytes]:
+        """Return the decompressed object, resolving delta chains."""
+        offset = self.find_offset(obj_hash)
+        if offset is None:
+            return None
+        return self._read_at(offset, max_depth)
+
+    def _read_at(self, offset: int, depth_left: int) -> bytes:
+        entry_type, length = _ENTRY_HEADER.unpack_from(self._pack, offset)
+        start = offset + _ENTRY_HEADER.size
+        view = memoryview(self._pack)
+        try:
+            if entry_type == ENTRY_FULL:
+                return zlib.decompress(view[start:start + length])
+            if entry_type == ENTRY_DELTA:
+                if depth_left <= 0:
+                    raise PackError("Delta chain too deep")
+                base_hash = self._pack[start:start + HASH_SIZE].hex()
+                base_offset = self.find_offset(base_hash)
+                if base_offset is None:
+                    raise PackError(f"Missing delta base {base_hash[:8]}")
+                base = self._read_at(base_offset, depth_left - 1)
+                payload = view[start + HASH_SIZE:start + HASH_SIZE + length]
+                return apply_delta(base, payload)
+            raise PackError(f"Unknown pack entry type {entry_type}")
+        finally:
+            view.release()
+
+    def entry_info(self, obj_hash: str) -> Optional[Tuple[int, Optional[str], int]]:
+        """Return (entry type, base hash or None, stored length) for an object."""
+        offset = self.find_offset(obj_hash)
+        if offset is None:
+            return None
+        entry_type, length = _ENTRY_HEADER.unpack_from(self._pack, offset)
+        start = offset + _ENTRY_HEADER.size
+        base = self._pack[start:start + HASH_SIZE].hex() if entry_type == ENTRY_DELTA else None
+        return entry_type, base, length
+
+    def iter_hashes(self) -> Iterator[str]:
+        """Object hashes in index (sorted) order."""
+        for position in range(self.count):
+            yield self._hash_at(position).hex()
+
+    def iter_hashes_by_offset(self) -> List[str]:
+        """Object hashes in pack order, which preserves the writer's ordering."""
+        entries = [
+            (_OFFSET.unpack_from(self._idx, self._offsets_start + i * _OFFSET.size)[0], i)
+            for i in range(self.count)
+        ]
+        entries.sort()
+        return [self._hash_at(i).hex() for _, i in entries]
+
+    def verify(self) -> bool:
+        """Check pack and index checksums."""
+        body_end = len(self._pack) - HASH_SIZE
+        if hashlib.sha256(self._pack[:body_end]).digest() != self._pack[body_end:]:
+            return False
+        idx_end = len(self._idx) - HASH_SIZE
+        if hashlib.sha256(self._idx[:idx_end]).digest() != self._idx[idx_end:]:
+            return False
+        return self._idx[idx_end - HASH_SIZE:idx_end] == self._pack[body_end:]
+
+    def close(self) -> None:
+        for attr in ("_idx", "_pack"):
+            mapped = getattr(self, attr, None)
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except (BufferError, ValueError):
+                    pass
+        self._index_file.close()
+        self._pack_file.close()
+
+
+class PackSet:
+    """
+    All packs of a store, searched newest first.
+
+    Thread-safe: packing runs in a worker thread while lookups happen on the
+    event loop, so the reader list is only swapped under a lock.
+    """
+
+    def __init__(self, pack_dir: Path):
+        self.pack_dir = Path(pack_dir)
+        self._readers: List[PackReader] = []
+        self._loaded_names: Tuple[str, ...] = ()
+        self._scanned_mtime_ns: Optional[int] = None
+        self._lock = threading.RLock()
+
+    @property
+    def readers(self) -> List[PackReader]:
+        with self._lock:
+            return list(self._readers)
+
+    def _dir_mtime_ns(self) -> Optional[int]:
+        try:
+            return self.pack_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Re-scan only if the pack directory changed since the last scan.
+
+        Packs are renamed into place, which updates the directory mtime, so
+        one stat() replaces the glob on lookups that miss.
+        """
+        if self._dir_mtime_ns() == self._scanned_mtime_ns:
+            return False
+        return self.refresh()
+
+    def refresh(self) -> bool:
+        """Re-scan the pack directory; returns True if the pack set changed."""
+        with self._lock:
+            self._scanned_mtime_ns = self._dir_mtime_ns()
+            if not self.pack_dir.exists():
+                names: Tuple[str, ...] = ()
+            else:
+                index_files = sorted(
+                    self.pack_dir.glob("pack-*.idx"),
+                    key=lambda p: p.stat().st_mtime,
+                    reverse=True,
+                )
+                names = tuple(p.name for p in index_files)
+            if names == self._loaded_names:
+                return False
+
+            current = {r.index_path.name: r for r in self._readers}
+            readers = []
+            for name in names:
+                reader = current.pop(name, None)
+                if reader is None:
+                    try:
+                        reader = PackReader(self.pack_dir / name)
+                    except (OSError, PackError, ValueError, struct.error) as e:
+                        logger.warning("pack_open_failed", pack=name, error=str(e))
+                        continue
+                readers.append(reader)
+            for stale in current.values():
+                stale.close()
+            self._readers = readers
+            self._loaded_names = names
+            return True
+
+    def read(self, obj_hash: str) -> Optional[bytes]:
+        with self._lock:
+            for reader in self._readers:
+                data = reader.read(obj_hash)
+                if data is not None:
+                    return data
+        return None
+
+    def contains(self, obj_hash: str) -> bool:
+        with self._lock:
+            return any(obj_hash in reader for reader in self._readers)
+
+    def iter_hashes(self) -> Iterator[str]:
+        with self._lock:
+            readers = list(self._readers)
+            seen = set()
+            hashes = []
+            for reader in readers:
+                for obj_hash in reader.iter_hashes():
+                    if obj_hash not in seen:
+                        seen.add(obj_hash)
+                        hashes.append(obj_hash)
+        return iter(hashes)
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(reader.size_bytes for reader in self._readers)
+
+    def remove(self, readers: List[PackReader]) -> None:
+        """Close and delete the given packs."""
+        with self._lock:
+            doomed = {r.index_path for r in readers}
+            for reader in readers:
+                reader.close()
+                for path in (reader.pack_path, reader.index_path):
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+            self._readers = [r for r in self._readers if r.index_path not in doomed]
+            self._loaded_names = tuple(r.index_path.name for r in self._readers)
+
+    def close(self) -> None:
+        with self._lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers = []
+            self._loaded_names = ()
@@ -13,6 +13,7 @@ import hashlib
 import json
 import os
 import shutil
+import threading
 from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
@@ -34,6 +35,14 @@ from app.models.version_control import (
     TreeEntry,
     VERSION_CONTROL_TR,
 )
+from app.services.model_commit_graph import CommitGraph, object_edges
+from app.services.model_object_pack import (
+    DELTA_ALGORITHM,
+    ENTRY_DELTA,
+    PackInput,
+    PackSet,
+    write_pack,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -50,11 +59,20 @@ class ModelObjectStore:
     Features:
     - SHA-256 based content addressing
     - Automatic compression with gzip
-    - Delta compression for similar objects
-    - Garbage collection for unreachable objects
+    - Pack files with mmap'd, binary-searchable fan-out indexes
+    - Delta compression between versions of the same FreeCAD object
+    - Persisted commit-graph/reachability index with generation numbers
+    - Incremental, resumable mark-sweep garbage collection
     - Object caching for performance
     """
     
+    # Consolidate everything into one pack once this many packs exist
+    MAX_PACKS_BEFORE_REPACK = 8
+    
+    # Objects scanned per GC mark step / removed per sweep batch
+    GC_MARK_BATCH = 5000
+    GC_SWEEP_BATCH = 1000
+    
     def __init__(self, store_path: Path):
         """
         Initialize object store.
@@ -71,8 +89,14 @@ class ModelObjectStore:
         self._cache: OrderedDict[str, Any] = OrderedDict()
         self._cache_size_limit = 100
         
-        # Delta compression index
-        self._delta_index: Dict[str, DeltaCompression] = {}
+        # Pack files (loaded lazily, refreshed when another instance repacks)
+        self._packs = PackSet(self.pack_path)
+        self._packs_loaded = False
+        
+        # Object graph index (opened lazily, backfilled on first use)
+        self._graph = CommitGraph(self.store_path / "commit-graph.db")
+        self._graph_lock = threading.Lock()
+        self._graph_ready = False
         
         # Statistics
         self._stats = StorageStats(
@@ -155,8 +179,16 @@ class ModelObjectStore:
                 # Calculate hash
                 obj_hash = self.hash_object(obj)
                 
-                # Check if already exists
-                if await self._object_exists(obj_hash):
+                # Serialize object with type information
+                serialized = self._serialize_object(obj, obj_type)
+                edges = object_edges(obj_type.value, obj)
+                
+                # Existence check, compression, atomic write and index
+                # update happen in a single worker-thread hop
+                compressed_size = await asyncio.to_thread(
+                    self._persist_object, obj_hash, obj_type, serialized, edges
+                )
+                if compressed_size is None:
                     logger.debug(
                         "object_already_exists",
                         obj_hash=obj_hash[:8],
@@ -164,27 +196,13 @@ class ModelObjectStore:
                     )
                     return obj_hash
                 
-                # Serialize object with type information
-                serialized = self._serialize_object(obj, obj_type)
-                
-                # Compress
-                compressed = await asyncio.to_thread(gzip.compress, serialized)
-                
-                # Store in content-addressable format
-                path = self._get_object_path(obj_hash)
-                
-                # Write atomically
-                temp_path = path.with_suffix('.tmp')
-                await asyncio.to_thread(self._write_file, temp_path, compressed)
-                await asyncio.to_thread(os.replace, str(temp_path), str(path))
-                
                 # Update cache
                 self._update_cache(obj_hash, obj)
                 
                 # Update statistics
                 self._stats.total_objects += 1
                 self._stats.total_size_bytes += len(serialized)
-                self._stats.compressed_size_bytes += len(compressed)
+                self._stats.compressed_size_bytes += compressed_size
                 self._stats.compression_ratio = (
                     self._stats.compressed_size_bytes / self._stats.total_size_bytes
                     if self._stats.total_size_bytes > 0 else 1.0
@@ -195,7 +213,7 @@ class ModelObjectStore:
                     obj_hash=obj_hash[:8],
                     obj_type=obj_type.value,
                     size=len(serialized),
-                    compressed_size=len(compressed),
+                    compressed_size=compressed_size,
                     correlation_id=correlation_id,
                     message=VERSION_CONTROL_TR['object_stored'].format(hash=obj_hash[:8])
                 )
@@ -244,23 +262,27 @@ class ModelObjectStore:
                     )
                     return self._cache[obj_hash]
                 
-                # Check if object exists
+                # Loose objects first, then packs
                 path = self._get_object_path(obj_hash)
-                if not path.exists():
-                    # Check delta compressed objects
-                    if obj_hash in self._delta_index:
-                        return await self._restore_from_delta(obj_hash)
-                    
-                    logger.debug(
-                        "object_not_found",
-                        obj_hash=obj_hash[:8],
-                        correlation_id=correlation_id
-                    )
-                    return None
-                
-                # Read and decompress
-                compressed = await asyncio.to_thread(self._read_file, path)
-                serialized = await asyncio.to_thread(gzip.decompress, compressed)
+                serialized = None
+                if path.exists():
+                    try:
+                        compressed = await asyncio.to_thread(self._read_file, path)
+                        serialized = await asyncio.to_thread(gzip.decompress, compressed)
+                    except FileNotFoundError:
+                        # Packed (and removed) between the check and the read
+                        pass
+                if serialized is None:
+                    # Packed objects are decompressed straight from the mmap
+                    # (inflate and delta chains run off the event loop)
+                    serialized = await asyncio.to_thread(self._read_packed, obj_hash)
+                    if serialized is None:
+                        logger.debug(
+                            "object_not_found",
+                            obj_hash=obj_hash[:8],
+                            correlation_id=correlation_id
+                        )
+                        return None
                 
                 # Deserialize
                 obj = self._deserialize_object(serialized, obj_type)
@@ -329,22 +351,57 @@ class ModelObjectStore:
         return obj
     
     async def list_objects(self) -> List[str]:
-        """List all object hashes in the store."""
-        objects = []
-        
-        # Scan object directories
-        for subdir in self.objects_path.iterdir():
-            if subdir.is_dir():
-                for obj_file in subdir.iterdir():
-                    if obj_file.is_file() and not obj_file.name.endswith('.tmp'):
-                        # Reconstruct hash from path
-                        obj_hash = subdir.name + obj_file.name
-                        objects.append(obj_hash)
-        
-        # Add delta compressed objects
-        objects.extend(self._delta_index.keys())
+        """List all object hashes in the store (loose and packed)."""
+        return await asyncio.to_thread(self._list_indexed_objects)
+    
+    async def is_ancestor(self, ancestor_hash: str, descendant_hash: str) -> bool:
+        """Check if a commit is reachable from another through parent links."""
+        return await asyncio.to_thread(self._is_ancestor_sync, ancestor_hash, descendant_hash)
+    
+    async def get_first_parent_chain(self, commit_hash: str, limit: int) -> List[str]:
+        """Commit hashes along the first-parent chain, starting at commit_hash."""
+        return await asyncio.to_thread(self._first_parent_chain_sync, commit_hash, limit)
+    
+    async def get_merge_base(self, commit1: str, commit2: str) -> Optional[str]:
+        """Best common ancestor of two commits, following all parents."""
+        return await asyncio.to_thread(self._merge_base_sync, commit1, commit2)
+    
+    async def index_tag(self, tag_name: str, commit_hash: Optional[str]) -> None:
+        """Record a tag's target in the index; None removes the tag."""
+        await asyncio.to_thread(self._index_tag_sync, tag_name, commit_hash)
+    
+    async def get_tags_for_commits(self, commit_hashes: List[str]) -> Dict[str, List[str]]:
+        """
+        Tag names per commit for a batch of commits, from the index.
         
-        return objects
+        The index is rebuilt first if tag refs were added, deleted or moved
+        without going through index_tag.
+        """
+        return await asyncio.to_thread(self._tags_for_commits_sync, commit_hashes)
+    
+    def get_generation(self, commit_hash: str) -> Optional[int]:
+        """Generation number of an indexed commit (1 for root commits)."""
+        self._ensure_graph()
+        return self._graph.generation(commit_hash)
+    
+    def get_delta_info(self, obj_hash: str) -> Optional[DeltaCompression]:
+        """Return delta compression details for a packed, deltified object."""
+        self._ensure_packs_loaded()
+        for reader in self._packs.readers:
+            info = reader.entry_info(obj_hash)
+            if info is None:
+                continue
+            entry_type, base_hash, stored_length = info
+            if entry_type != ENTRY_DELTA:
+                return None
+            data = reader.read(obj_hash) or b""
+            return DeltaCompression(
+                base_hash=base_hash,
+                delta_size=stored_length,
+                compression_ratio=stored_length / len(data) if data else 1.0,
+                algorithm=DELTA_ALGORITHM
+            )
+        return None
     
     async def optimize_storage(self) -> Dict[str, Any]:
         """
@@ -357,18 +414,16 @@ class ModelObjectStore:
         
         with create_span("optimize_storage", correlation_id=correlation_id) as span:
             try:
-                initial_size = self._stats.compressed_size_bytes
-                
-                # Delta compression
-                delta_count = await self._apply_delta_compression()
+                initial_size = await asyncio.to_thread(self._disk_usage)
                 
-                # Garbage collection
+                # Garbage collection first so dead objects are not packed
                 gc_count = await self._garbage_collect()
                 
-                # Pack loose objects
-                pack_count = await self._pack_objects()
+                # Pack loose objects with delta compression
+                pack_count, delta_count = await self._pack_objects()
                 
-                final_size = self._stats.compressed_size_bytes
+                final_size = await asyncio.to_thread(self._disk_usage)
+                self._stats.compressed_size_bytes = final_size
                 saved_bytes = initial_size - final_size
                 
                 stats = {
@@ -407,7 +462,10 @@ class ModelObjectStore:
     async def cleanup(self):
         """Cleanup resources."""
         self._cache.clear()
-        self._delta_index.clear()
+        self._packs.close()
+        self._packs_loaded = False
+        self._graph.close()
+        self._graph_ready = False
         logger.info("object_store_cleanup_complete")
     
     # Private helper methods
@@ -419,14 +477,34 @@ class ModelObjectStore:
         filename = obj_hash[2:]
         return self.objects_path / subdir / filename
     
-    async def _object_exists(self, obj_hash: str) -> bool:
-        """Check if object exists."""
-        if obj_hash in self._cache:
-            return True
-        if obj_hash in self._delta_index:
-            return True
+    def _persist_object(
+        self,
+        obj_hash: str,
+        obj_type: ObjectType,
+        serialized: bytes,
+        edges: List[Tuple[str, int, int]],
+    ) -> Optional[int]:
+        """
+        Write a new loose object and index it.
+        
+        Returns:
+            Compressed size, or None if the object already exists
+        """
+        self._ensure_graph()
+        # touch() also protects a reused object from a running GC sweep
+        if self._graph.touch(obj_hash):
+            return None
+        
+        compressed = gzip.compress(serialized)
         path = self._get_object_path(obj_hash)
-        return path.exists()
+        
+        # Write atomically, then index (an unindexed file is rewritten later)
+        temp_path = path.with_suffix('.tmp')
+        self._write_file(temp_path, compressed)
+        os.replace(str(temp_path), str(path))
+        self._graph.add_object(obj_hash, obj_type.value, edges)
+        
+        return len(compressed)
     
     def _serialize_object(self, obj: Any, obj_type: Optional[ObjectType] = None) -> bytes:
         """Serialize object deterministically with type information."""
@@ -505,125 +583,75 @@ class ModelObjectStore:
         with open(path, 'rb') as f:
             return f.read()
     
-    async def _apply_delta_compression(self) -> int:
-        """Apply delta compression to similar objects."""
-        # Simplified implementation - would use xdelta3 or similar
-        # in production for actual delta compression
-        return 0
-    
-    async def _garbage_collect(self) -> int:
-        """Remove unreachable objects."""
-        try:
-            # Collect all reachable objects
-            reachable = set()
+    async def _garbage_collect(self, budget: Optional[int] = None) -> int:
+        """
+        Remove unreachable objects with an incremental mark-sweep.
+        
+        Reachability comes from the commit-graph index, so no object is read
+        or parsed. Marking and sweeping run in batches in worker threads and
+        the cycle state is persisted in the index: a run that stops after
+        ``budget`` objects (or is interrupted) is resumed by the next one.
+        Unreachable packed objects are dropped at the next repack.
+        
+        Args:
+            budget: Maximum objects to scan or remove in this run
+                (None runs the cycle to completion)
             
-            # Start from all refs (branches and tags)
-            refs_to_check = []
+        Returns:
+            Number of objects removed in this run
+        """
+        removed_count = 0
+        processed = 0
+        finished = False
+        try:
+            await asyncio.to_thread(self._ensure_graph)
+            if not self._graph.gc_active:
+                roots = await asyncio.to_thread(self._read_roots)
+                await asyncio.to_thread(self._graph.gc_begin, roots)
+                logger.debug("gc_cycle_started", roots=len(roots))
             
-            # Check HEAD reference first (critical for detached HEAD state)
-            head_file = self.refs_path / "HEAD"
-            if head_file.exists():
-                head_content = await asyncio.to_thread(head_file.read_text)
-                head_content = head_content.strip()
+            while budget is None or processed < budget:
+                remaining = None if budget is None else budget - processed
                 
-                # HEAD can point to a branch (ref: refs/heads/branch) or directly to a commit
-                if head_content.startswith("ref:"):
-                    # Points to a branch
-                    ref_path = head_content[4:].strip()
-                    actual_ref_file = self.refs_path.parent / ref_path
-                    if actual_ref_file.exists():
-                        commit_hash = await asyncio.to_thread(actual_ref_file.read_text)
-                        refs_to_check.append(commit_hash.strip())
-                        logger.debug("gc_adding_head_branch_ref", ref=ref_path, commit=commit_hash.strip()[:8])
-                else:
-                    # Detached HEAD - points directly to a commit
-                    refs_to_check.append(head_content)
-                    logger.debug("gc_adding_detached_head", commit=head_content[:8])
-            
-            # Check branch heads
-            heads_path = self.refs_path / "heads"
-            if heads_path.exists():
-                for ref_file in heads_path.iterdir():
-                    if ref_file.is_file():
-                        commit_hash = await asyncio.to_thread(ref_file.read_text)
-                        refs_to_check.append(commit_hash.strip())
-            
-            # Check tags
-            tags_path = self.refs_path / "tags"
-            if tags_path.exists():
-                for ref_file in tags_path.iterdir():
-                    if ref_file.is_file():
-                        commit_hash = await asyncio.to_thread(ref_file.read_text)
-                        refs_to_check.append(commit_hash.strip())
-            
-            # Walk commit graph to find all reachable objects
-            visited = set()
-            while refs_to_check:
-                obj_hash = refs_to_check.pop()
-                if obj_hash in visited:
+                scanned = await asyncio.to_thread(
+                    self._graph.gc_mark_step,
+                    self.GC_MARK_BATCH if remaining is None else min(self.GC_MARK_BATCH, remaining)
+                )
+                if scanned:
+                    processed += scanned
                     continue
-                visited.add(obj_hash)
-                reachable.add(obj_hash)
                 
-                # Get raw object to check its type
-                path = self._get_object_path(obj_hash)
-                if path.exists():
-                    compressed = await asyncio.to_thread(self._read_file, path)
-                    serialized = await asyncio.to_thread(gzip.decompress, compressed)
-                    raw_obj = json.loads(serialized.decode('utf-8'))
-                    
-                    # Check if it has type wrapper
-                    if isinstance(raw_obj, dict) and "type" in raw_obj and "data" in raw_obj:
-                        obj_type = raw_obj["type"]
-                        obj_data = raw_obj["data"]
-                    else:
-                        # Legacy format - try to infer type from structure
-                        obj_data = raw_obj
-                        if "tree" in obj_data and "parents" in obj_data:
-                            obj_type = "commit"
-                        elif "entries" in obj_data:
-                            obj_type = "tree"
-                        else:
-                            obj_type = "blob"
-                    
-                    # If it's a commit, add tree and parents
-                    if obj_type == "commit":
-                        if "tree" in obj_data:
-                            refs_to_check.append(obj_data["tree"])
-                            reachable.add(obj_data["tree"])
-                        if "parents" in obj_data:
-                            for parent in obj_data["parents"]:
-                                refs_to_check.append(parent)
-                    # If it's a tree, add all entries
-                    elif obj_type == "tree":
-                        if "entries" in obj_data:
-                            for entry in obj_data["entries"]:
-                                if "hash" in entry:
-                                    reachable.add(entry["hash"])
-            
-            # Find and remove unreachable objects
-            removed_count = 0
-            if self.objects_path.exists():
-                for obj_dir in self.objects_path.iterdir():
-                    if obj_dir.is_dir() and len(obj_dir.name) == 2:
-                        for obj_file in obj_dir.iterdir():
-                            full_hash = obj_dir.name + obj_file.name
-                            if full_hash not in reachable:
-                                await asyncio.to_thread(obj_file.unlink)
-                                removed_count += 1
-                                
-                                # Clear from cache if present
-                                if full_hash in self._cache:
-                                    del self._cache[full_hash]
+                # Marking is done; refs may have moved since the cycle began
+                roots = await asyncio.to_thread(self._read_roots)
+                if await asyncio.to_thread(self._graph.gc_add_roots, roots):
+                    continue
+                
+                victims = await asyncio.to_thread(
+                    self._graph.gc_sweep_batch,
+                    self.GC_SWEEP_BATCH if remaining is None else min(self.GC_SWEEP_BATCH, remaining),
+                    self._remove_objects_sync
+                )
+                if victims is None:
+                    # A writer referenced existing objects meanwhile
+                    continue
+                if not victims:
+                    finished = True
+                    break
+                
+                processed += len(victims)
+                removed_count += len(victims)
+                for obj_hash, _ in victims:
+                    self._cache.pop(obj_hash, None)
             
-            # Update statistics
-            self._stats.gc_runs += 1
+            if finished:
+                await asyncio.to_thread(self._graph.gc_finish)
+                self._stats.gc_runs += 1
             self._stats.objects_removed += removed_count
             
             logger.info(
-                "garbage_collection_complete",
+                "garbage_collection_complete" if finished else "garbage_collection_paused",
                 removed_count=removed_count,
-                reachable_count=len(reachable),
+                processed=processed,
                 message=VERSION_CONTROL_TR['garbage_collected']
             )
             
@@ -632,28 +660,333 @@ class ModelObjectStore:
         except Exception as e:
             logger.error(
                 "garbage_collection_failed",
-                error=str(e)
+                error=str(e),
+                removed_count=removed_count
             )
-            return 0
+            return removed_count
+    
+    async def _pack_objects(self) -> Tuple[int, int]:
+        """
+        Pack loose objects into a new pack file.
+        
+        Versions of the same FreeCAD object are delta-encoded against each
+        other. Once MAX_PACKS_BEFORE_REPACK packs exist, all packs are
+        consolidated into one so lookups stay a handful of binary searches.
+        Packs holding objects that GC found unreachable are rewritten
+        without them.
+        
+        Returns:
+            (objects packed, objects stored as deltas)
+        """
+        return await asyncio.to_thread(self._pack_objects_sync)
     
-    async def _pack_objects(self) -> int:
-        """Pack loose objects into pack files."""
-        # Would combine multiple loose objects into
-        # pack files for efficiency
-        return 0
+    def _pack_objects_sync(self) -> Tuple[int, int]:
+        self._ensure_graph()
+        self._ensure_packs_loaded()
+        loose_files = self._list_loose_files()
+        old_readers = self._packs.readers
+        prune = bool(old_readers) and self._graph.get_flag("compact_pending")
+        full_repack = prune or len(old_readers) + 1 > self.MAX_PACKS_BEFORE_REPACK
+        if not loose_files and not full_repack:
+            return 0, 0
+        # Packed objects GC removed from the index are not carried over
+        live = set(self._graph.all_hashes()) if prune else None
+        
+        # Newest first, so the latest version of an object stays whole and
+        # older versions are stored as deltas against it
+        loose_files.sort(key=lambda item: item[1].stat().st_mtime_ns, reverse=True)
+        inputs: Dict[str, PackInput] = {}
+        for obj_hash, path in loose_files:
+            try:
+                data = gzip.decompress(self._read_file(path))
+            except (OSError, EOFError, gzip.BadGzipFile) as e:
+                logger.warning("pack_skip_unreadable_object", obj_hash=obj_hash[:8], error=str(e))
+                continue
+            inputs[obj_hash] = PackInput(obj_hash, data, self._delta_key(data))
+        if full_repack:
+            # Older packs hold older objects: append them newest pack first
+            for reader in old_readers:
+                for obj_hash in reader.iter_hashes_by_offset():
+                    if obj_hash not in inputs and (live is None or obj_hash in live):
+                        data = reader.read(obj_hash)
+                        if data is not None:
+                            inputs[obj_hash] = PackInput(obj_hash, data, self._delta_key(data))
+        
+        result = write_pack(inputs.values(), self.pack_path)
+        if result is None:
+            if full_repack:
+                # Nothing left alive in the old packs
+                self._packs.remove(old_readers)
+                self._graph.set_flag("compact_pending", False)
+            return 0, 0
+        
+        # The new pack is durable; loose copies (and superseded packs) can go
+        self._packs.refresh()
+        for _, path in loose_files:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        if full_repack:
+            self._packs.remove(old_readers)
+            self._graph.set_flag("compact_pending", False)
+        
+        self._stats.delta_compressed_objects = result.delta_count if full_repack else (
+            self._stats.delta_compressed_objects + result.delta_count
+        )
+        
+        logger.info(
+            "objects_packed",
+            pack=result.pack_path.name,
+            objects=result.object_count,
+            deltas=result.delta_count,
+            raw_bytes=result.raw_bytes,
+            pack_bytes=result.pack_bytes,
+            full_repack=full_repack,
+            pruned=prune
+        )
+        return result.object_count, result.delta_count
     
-    async def _restore_from_delta(self, obj_hash: str) -> Optional[Any]:
-        """Restore object from delta compression."""
-        if obj_hash not in self._delta_index:
+    def _delta_key(self, serialized: bytes) -> Optional[str]:
+        """Group blobs by FreeCAD object name so versions delta against each other."""
+        try:
+            raw_obj = json.loads(serialized.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        if not isinstance(raw_obj, dict):
             return None
+        obj_type = raw_obj.get("type")
+        data = raw_obj.get("data")
+        if obj_type == ObjectType.BLOB.value and isinstance(data, dict) and data.get("name"):
+            return f"blob:{data.get('type_id', '')}:{data['name']}"
+        if obj_type == ObjectType.TREE.value:
+            return "tree"
+        return None
+    
+    def _list_loose_files(self) -> List[Tuple[str, Path]]:
+        """List (hash, path) for all loose objects."""
+        loose = []
+        if not self.objects_path.exists():
+            return loose
+        for subdir in self.objects_path.iterdir():
+            if not subdir.is_dir() or len(subdir.name) != 2:
+                continue
+            for obj_file in subdir.iterdir():
+                if obj_file.is_file() and not obj_file.name.endswith('.tmp'):
+                    loose.append((subdir.name + obj_file.name, obj_file))
+        return loose
+    
+    def _disk_usage(self) -> int:
+        """Bytes used by loose objects and packs."""
+        total = sum(path.stat().st_size for _, path in self._list_loose_files())
+        if self.pack_path.exists():
+            total += sum(p.stat().st_size for p in self.pack_path.iterdir() if p.is_file())
+        return total
+    
+    def _ensure_packs_loaded(self):
+        if not self._packs_loaded:
+            self._packs.refresh()
+            self._packs_loaded = True
+    
+    def _read_packed(self, obj_hash: str, probe_only: bool = False) -> Optional[bytes]:
+        """Read a packed object; on a miss, rescans packs if the pack directory changed."""
+        self._ensure_packs_loaded()
+        for attempt in range(2):
+            if probe_only:
+                if self._packs.contains(obj_hash):
+                    return b""
+            else:
+                data = self._packs.read(obj_hash)
+                if data is not None:
+                    return data
+            # Another store instance may have packed the object meanwhile
+            if attempt == 0 and not self._packs.refresh_if_changed():
+                break
+        return None
+    
+    def _read_raw_object(self, obj_hash: str) -> Optional[bytes]:
+        """Read the serialized bytes of a loose or packed object."""
+        path = self._get_object_path(obj_hash)
+        try:
+            return gzip.decompress(self._read_file(path))
+        except FileNotFoundError:
+            return self._read_packed(obj_hash)
+    
+    def _ensure_graph(self):
+        """Open the commit-graph index, backfilling it for pre-existing stores."""
+        if self._graph_ready:
+            return
+        with self._graph_lock:
+            if self._graph_ready:
+                return
+            self._graph.open()
+            if not self._graph.is_complete:
+                self._backfill_graph()
+            if not self._graph.get_flag("tags_indexed"):
+                self._backfill_tags()
+            self._graph_ready = True
+    
+    def _backfill_graph(self):
+        """Index objects written before the commit graph existed."""
+        records = []
+        for obj_hash, path in self._list_loose_files():
+            try:
+                serialized = gzip.decompress(self._read_file(path))
+            except (OSError, EOFError, gzip.BadGzipFile) as e:
+                logger.warning("commit_graph_skip_unreadable_object", obj_hash=obj_hash[:8], error=str(e))
+                continue
+            records.append(self._index_record(obj_hash, serialized))
+        self._ensure_packs_loaded()
+        for obj_hash in self._packs.iter_hashes():
+            serialized = self._packs.read(obj_hash)
+            if serialized is not None:
+                records.append(self._index_record(obj_hash, serialized))
+        
+        added = self._graph.add_many(records)
+        self._graph.mark_complete()
+        logger.info("commit_graph_backfilled", objects=added, store_path=str(self.store_path))
+    
+    def _backfill_tags(self, state: Optional[str] = None):
+        """Index the tag refs on disk, replacing whatever the index held."""
+        if state is None:
+            # Taken before the scan, so a change during it triggers another
+            state = self._tags_dir_state()
+        tags = []
+        tags_dir = self.refs_path / "tags"
+        if tags_dir.exists():
+            for ref_file in tags_dir.rglob("*"):
+                # Tags keep their metadata in <tag>.json next to the ref
+                if not ref_file.is_file() or ref_file.name.endswith(('.json', '.tmp')):
+                    continue
+                commit_hash = self._read_ref(ref_file)
+                if commit_hash:
+                    tags.append((ref_file.relative_to(tags_dir).as_posix(), commit_hash))
+        self._graph.replace_tags(tags, state)
+        logger.info("tag_index_backfilled", tags=len(tags), store_path=str(self.store_path))
+    
+    def _tags_dir_state(self) -> str:
+        """
+        Count and newest mtime of the directories under refs/tags.
+        
+        Adding, deleting or atomically replacing a tag ref (as _write_ref
+        does) changes its directory's mtime, so this changes whenever a tag
+        appears, disappears or moves.
+        """
+        tags_dir = self.refs_path / "tags"
+        mtimes = []
+        for root, _, _ in os.walk(tags_dir):
+            try:
+                mtimes.append(os.stat(root).st_mtime_ns)
+            except FileNotFoundError:
+                continue
+        return f"{len(mtimes)}:{max(mtimes, default=0)}"
+    
+    def _sync_tags(self):
+        """Rebuild the tag index if tag refs changed since it was built."""
+        state = self._tags_dir_state()
+        if state != self._graph.tags_source_state:
+            self._backfill_tags(state)
+    
+    def _index_record(self, obj_hash: str, serialized: bytes) -> Tuple[str, str, List[Tuple[str, int, int]]]:
+        """(hash, type, edges) of a serialized object, for the commit graph."""
+        try:
+            raw_obj = json.loads(serialized.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return obj_hash, ObjectType.BLOB.value, []
+        
+        if isinstance(raw_obj, dict) and "type" in raw_obj and "data" in raw_obj:
+            obj_type = raw_obj["type"]
+            obj_data = raw_obj["data"]
+        else:
+            # Legacy format - infer type from structure
+            obj_data = raw_obj
+            if isinstance(obj_data, dict) and "tree" in obj_data and "parents" in obj_data:
+                obj_type = ObjectType.COMMIT.value
+            elif isinstance(obj_data, dict) and "entries" in obj_data:
+                obj_type = ObjectType.TREE.value
+            else:
+                obj_type = ObjectType.BLOB.value
+        return obj_hash, obj_type, object_edges(obj_type, obj_data)
+    
+    def _list_indexed_objects(self) -> List[str]:
+        self._ensure_graph()
+        return self._graph.all_hashes()
+    
+    def _is_ancestor_sync(self, ancestor_hash: str, descendant_hash: str) -> bool:
+        self._ensure_graph()
+        return self._graph.is_ancestor(ancestor_hash, descendant_hash)
+    
+    def _first_parent_chain_sync(self, commit_hash: str, limit: int) -> List[str]:
+        self._ensure_graph()
+        return self._graph.first_parent_chain(commit_hash, limit)
+    
+    def _merge_base_sync(self, commit1: str, commit2: str) -> Optional[str]:
+        self._ensure_graph()
+        return self._graph.merge_base(commit1, commit2)
+    
+    def _index_tag_sync(self, tag_name: str, commit_hash: Optional[str]):
+        self._ensure_graph()
+        if commit_hash is None:
+            self._graph.remove_tag(tag_name)
+        else:
+            self._graph.set_tag(tag_name, commit_hash)
+    
+    def _tags_for_commits_sync(self, commit_hashes: List[str]) -> Dict[str, List[str]]:
+        self._ensure_graph()
+        self._sync_tags()
+        return self._graph.tags_for(commit_hashes)
+    
+    def _read_roots(self) -> List[str]:
+        """Commit hashes referenced by HEAD, branches and tags (GC roots)."""
+        roots = []
         
-        delta_info = self._delta_index[obj_hash]
+        # HEAD can point to a branch (ref: refs/heads/branch) or, when
+        # detached, directly to a commit
+        head_file = self.refs_path / "HEAD"
+        head_content = self._read_ref(head_file)
+        if head_content:
+            if head_content.startswith("ref:"):
+                branch_ref = self._read_ref(self.refs_path.parent / head_content[4:].strip())
+                if branch_ref:
+                    roots.append(branch_ref)
+            else:
+                roots.append(head_content)
+        
+        for ref_dir in (self.refs_path / "heads", self.refs_path / "tags"):
+            if not ref_dir.exists():
+                continue
+            for ref_file in ref_dir.rglob("*"):
+                # Tags keep their metadata in <tag>.json next to the ref
+                if not ref_file.is_file() or ref_file.name.endswith(('.json', '.tmp')):
+                    continue
+                commit_hash = self._read_ref(ref_file)
+                if commit_hash:
+                    roots.append(commit_hash)
         
-        # Get base object
-        base = await self.get_object(delta_info.base_hash)
-        if not base:
+        return roots
+    
+    def _read_ref(self, path: Path) -> Optional[str]:
+        try:
+            return path.read_text().strip() or None
+        except (FileNotFoundError, NotADirectoryError):
             return None
+    
+    def _remove_objects_sync(self, victims: List[Tuple[str, str]]) -> int:
+        """
+        Delete a batch of unreachable objects.
         
-        # Apply delta (simplified - would use actual delta algorithm)
-        # For now just return base
-        return base
\ No newline at end of file
+        Loose files are unlinked right away; packed objects stay readable
+        until the next repack rewrites their pack.
+        
+        Returns:
+            Number of objects whose removal is deferred to the repack
+        """
+        self._ensure_packs_loaded()
+        deferred = 0
+        for obj_hash, _ in victims:
+            try:
+                self._get_object_path(obj_hash).unlink()
+            except FileNotFoundError:
+                if self._packs.contains(obj_hash):
+                    deferred += 1
+        return deferred
@@ -29,6 +29,7 @@ from app.models.version_control import (
     CheckoutResult,
     Commit,
     CommitDiff,
+    CommitDiffPage,
     CommitInfo,
     ConflictResolutionStrategy,
     MergeResult,
@@ -544,13 +545,20 @@ class ModelVersionControl:
         self,
         branch: Optional[str] = None,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[CommitInfo]:
         """
-        Get commit history for a branch.
+        Get commit history for a branch, following first parents.
+        
+        The commit chain and the tags of the whole page come from the
+        commit-graph index, so a page costs ``limit`` commit loads however
+        long the history is.
         
         Args:
             branch: Branch name (uses current branch if not specified)
             limit: Maximum number of commits to return
+            cursor: Commit to start from instead of the branch head; pass
+                the first parent of the last commit of the previous page
             
         Returns:
             List of commit information
@@ -569,22 +577,21 @@ class ModelVersionControl:
                 if not branch:
                     return []
                 
-                head = await self.branch_manager.get_branch_head(branch)
+                head = cursor or await self.branch_manager.get_branch_head(branch)
                 if not head:
                     return []
                 
-                # Walk commit history
-                history = []
-                current = head
+                chain = await self.object_store.get_first_parent_chain(head, limit)
+                commits, tags = await asyncio.gather(
+                    asyncio.gather(*(self.object_store.get_commit(h) for h in chain)),
+                    self.branch_manager.get_tags_for_commits(chain),
+                )
                 
-                while current and len(history) < limit:
-                    commit = await self.object_store.get_commit(current)
+                history = []
+                for current, commit in zip(chain, commits):
                     if not commit:
                         break
                     
-                    # Get associated tags
-                    tags = await self.branch_manager.get_tags_for_commit(current)
-                    
                     history.append(CommitInfo(
                         hash=commit.hash or current,
                         author=commit.author,
@@ -592,11 +599,8 @@ class ModelVersionControl:
                         message=commit.message,
                         parents=commit.parents,
                         branch=branch,
-                        tags=tags
+                        tags=tags.get(current, [])
                     ))
-                    
-                    # Move to first parent
-                    current = commit.parents[0] if commit.parents else None
                 
                 logger.info(
                     "history_retrieved",
@@ -643,16 +647,7 @@ class ModelVersionControl:
             span.set_attribute("to.commit", to_commit[:8])
             
             try:
-                # Get commit objects
-                from_obj = await self.object_store.get_commit(from_commit)
-                to_obj = await self.object_store.get_commit(to_commit)
-                
-                if not from_obj or not to_obj:
-                    raise ValueError("Commit(s) not found")
-                
-                # Get trees
-                from_tree = await self.object_store.get_tree(from_obj.tree)
-                to_tree = await self.object_store.get_tree(to_obj.tree)
+                from_tree, to_tree = await self._get_commit_trees(from_commit, to_commit)
                 
                 # Calculate diff
                 diff = await self.differ.diff_trees(from_tree, to_tree)
@@ -682,6 +677,84 @@ class ModelVersionControl:
                     turkish_message=f"Farklar hesaplanamadı: {str(e)}"
                 )
     
+    async def diff_commits_page(
+        self,
+        from_commit: str,
+        to_commit: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> CommitDiffPage:
+        """
+        Calculate one page of differences between two commits.
+        
+        Args:
+            from_commit: Source commit hash
+            to_commit: Target commit hash
+            cursor: ``next_cursor`` of the previous page, None for the first
+            limit: Maximum number of object differences in the page
+            
+        Returns:
+            CommitDiffPage ordered by object name
+        """
+        correlation_id = get_correlation_id()
+        
+        with create_span("mvc_diff_commits_page", correlation_id=correlation_id) as span:
+            span.set_attribute("from.commit", from_commit[:8])
+            span.set_attribute("to.commit", to_commit[:8])
+            span.set_attribute("page.limit", limit)
+            
+            try:
+                from_tree, to_tree = await self._get_commit_trees(from_commit, to_commit)
+                
+                page = await self.differ.diff_trees_page(
+                    from_tree, to_tree, cursor=cursor, limit=limit
+                )
+                
+                logger.info(
+                    "diff_page_calculated",
+                    from_commit=from_commit[:8],
+                    to_commit=to_commit[:8],
+                    changes=len(page.object_diffs),
+                    has_more=page.next_cursor is not None,
+                    correlation_id=correlation_id,
+                    message=VERSION_CONTROL_TR['diff_calculated']
+                )
+                
+                return page
+                
+            except Exception as e:
+                logger.error(
+                    "diff_failed",
+                    error=str(e),
+                    from_commit=from_commit,
+                    to_commit=to_commit,
+                    correlation_id=correlation_id
+                )
+                raise ModelVersionControlError(
+                    code="DIFF_FAILED",
+                    message=f"Failed to calculate diff: {str(e)}",
+                    turkish_message=f"Farklar hesaplanamadı: {str(e)}"
+                )
+    
+    async def _get_commit_trees(
+        self,
+        from_commit: str,
+        to_commit: str,
+    ) -> Tuple[Optional[Tree], Optional[Tree]]:
+        """Load the trees of two commits, both commits and trees concurrently."""
+        from_obj, to_obj = await asyncio.gather(
+            self.object_store.get_commit(from_commit),
+            self.object_store.get_commit(to_commit),
+        )
+        
+        if not from_obj or not to_obj:
+            raise ValueError("Commit(s) not found")
+        
+        return await asyncio.gather(
+            self.object_store.get_tree(from_obj.tree),
+            self.object_store.get_tree(to_obj.tree),
+        )
+    
     async def rollback_to_commit(
         self,
         commit_hash: str,
@@ -792,34 +865,8 @@ class ModelVersionControl:
         commit1: str,
         commit2: str,
     ) -> Optional[str]:
-        """Find common ancestor of two commits."""
-        # Build ancestry sets
-        ancestors1 = set()
-        ancestors2 = set()
-        
-        # Walk back from commit1
-        current = commit1
-        while current:
-            ancestors1.add(current)
-            commit = await self.object_store.get_commit(current)
-            if commit and commit.parents:
-                current = commit.parents[0]
-            else:
-                break
-        
-        # Walk back from commit2, checking for common ancestor
-        current = commit2
-        while current:
-            if current in ancestors1:
-                return current
-            ancestors2.add(current)
-            commit = await self.object_store.get_commit(current)
-            if commit and commit.parents:
-                current = commit.parents[0]
-            else:
-                break
-        
-        return None
+        """Find the merge base of two commits through all parents."""
+        return await self.object_store.get_merge_base(commit1, commit2)
     
     async def _three_way_merge(
         self,
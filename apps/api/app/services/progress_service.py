@@ -130,8 +130,7 @@ class ProgressService:
                 **kwargs
             )
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -203,8 +202,7 @@ class ProgressService:
             if constraints_total and constraints_total > 0:
                 progress.progress_pct = min(100, int((constraints_resolved or 0) / constraints_total * 100))
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -279,8 +277,7 @@ class ProgressService:
             if objects_total and objects_total > 0:
                 progress.progress_pct = min(100, int((objects_done or 0) / objects_total * 100))
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -348,8 +345,7 @@ class ProgressService:
             elif edges_total and edges_total > 0:
                 progress.progress_pct = min(100, int((edges_done or 0) / edges_total * 100))
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -432,8 +428,7 @@ class ProgressService:
             if total_items > 0:
                 progress.progress_pct = min(100, int(done_items / total_items * 100))
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -493,8 +488,7 @@ class ProgressService:
             if bytes_total and bytes_total > 0:
                 progress.progress_pct = min(100, int((bytes_written or 0) / bytes_total * 100))
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -542,8 +536,7 @@ class ProgressService:
                 **kwargs
             )
             
-            # Cache and publish
-            await self.pubsub.cache_progress_event(job_id, progress)
+            # Append to the job's progress stream
             success = await self.pubsub.publish_progress(job_id, progress)
             
             # Update metrics
@@ -2,6 +2,9 @@
 Ultra Enterprise Rate Limiting Service for Task 3.9
 
 This service implements banking-level rate limiting with Redis backend using fastapi-limiter.
+Checks run on the GCRA engine (core.gcra): one Redis string key per policy key
+holding its theoretical arrival time, one EVALSHA per request for any number
+of policies.
 Provides granular rate limiting policies with IP + user composite keying,
 brute force detection, and comprehensive security event logging.
 
@@ -28,6 +31,7 @@ from fastapi_limiter.depends import RateLimiter
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
+from ..core.gcra import AsyncGCRARateLimiter, GCRALimit
 from ..core.redis_config import get_async_redis_client, get_redis_url
 from ..models.security_event import SecurityEvent
 from ..models.user import User
@@ -57,6 +61,7 @@ class RateLimitPolicy:
     key_type: str  # "ip", "user", "ip_user", "session"
     burst_threshold: Optional[int] = None  # For burst detection
     description: str = ""
+    local_lease: int = 0  # Tokens a process may admit without Redis while well under the limit
 
 
 @dataclass
@@ -130,12 +135,14 @@ class EnterpriseRateLimitingService:
             requests=100, 
             window_seconds=60, 
             key_type="ip",
-            description="Genel API"
+            description="Genel API",
+            local_lease=5
         )
     }
     
     def __init__(self):
         self.redis_client = None  # Will be initialized in async initialize()
+        self._gcra: Optional[AsyncGCRARateLimiter] = None
         self._brute_force_threshold = 20  # Suspicious activity threshold
         self._brute_force_window = 300  # 5 minutes
         
@@ -257,6 +264,12 @@ class EnterpriseRateLimitingService:
             # Fallback to IP-based limiting
             return f"{policy_type.value}:fallback:{client_ip}"
     
+    def _gcra_engine(self) -> AsyncGCRARateLimiter:
+        """GCRA engine bound to the current Redis client (script registered once)."""
+        if self._gcra is None or self._gcra.redis_client is not self.redis_client:
+            self._gcra = AsyncGCRARateLimiter(self.redis_client, key_prefix="gcra")
+        return self._gcra
+    
     async def check_rate_limit(
         self,
         request: Request,
@@ -270,40 +283,73 @@ class EnterpriseRateLimitingService:
         
         Also performs brute force detection and security logging.
         """
-        policy = self.POLICIES[policy_type]
-        key = self.generate_rate_limit_key(request, policy_type, user, session_id)
+        results = await self.check_rate_limits(request, [policy_type], db, user, session_id)
+        return results[0]
+    
+    async def check_rate_limits(
+        self,
+        request: Request,
+        policy_types: List[RateLimitType],
+        db: Session,
+        user: Optional[AuthenticatedUser] = None,
+        session_id: Optional[str] = None
+    ) -> List[RateLimitResult]:
+        """
+        Check several policies for one request in a single Redis round-trip.
+        
+        The request is charged against every policy only if all of them admit
+        it. Returns one result per policy, in order; brute force detection and
+        security logging run for each policy that rejected the request.
+        """
+        policies = [self.POLICIES[policy_type] for policy_type in policy_types]
+        keys = [
+            self.generate_rate_limit_key(request, policy_type, user, session_id)
+            for policy_type in policy_types
+        ]
+        current_time = int(time.time())
         
         try:
-            # Check current rate limit status
-            current_time = int(time.time())
-            window_start = current_time - policy.window_seconds
-            
-            # Use Redis pipeline for atomic operations
-            pipe = self.redis_client.pipeline()
-            
-            # Remove old entries outside window
-            pipe.zremrangebyscore(key, 0, window_start)
-            
-            # Count current requests in window
-            pipe.zcard(key)
-            
-            # Add current request
-            pipe.zadd(key, {str(current_time): current_time})
-            
-            # Set expiration
-            pipe.expire(key, policy.window_seconds)
-            
-            # Execute pipeline
-            results = pipe.execute()
-            current_count = results[1] + 1  # Add the new request
-            
-            # Calculate remaining and reset time
-            remaining = max(0, policy.requests - current_count)
-            reset_time = current_time + policy.window_seconds
-            retry_after = policy.window_seconds if current_count > policy.requests else 0
+            decisions = await self._gcra_engine().check([
+                GCRALimit(
+                    key=key,
+                    limit=policy.requests,
+                    period_seconds=policy.window_seconds,
+                    lease=policy.local_lease,
+                )
+                for key, policy in zip(keys, policies)
+            ])
+        except Exception as e:
+            logger.error("Rate limit check failed", extra={
+                'operation': 'rate_limit_check',
+                'policy_types': [policy_type.value for policy_type in policy_types],
+                'error': str(e),
+                'client_ip': self.get_client_ip(request)
+            })
             
-            # Check if limit exceeded
-            allowed = current_count <= policy.requests
+            # Fail open for availability (but log the failure)
+            return [
+                RateLimitResult(
+                    allowed=True,
+                    remaining=policy.requests,
+                    reset_time=current_time + policy.window_seconds,
+                    retry_after=0,
+                    limit=policy.requests,
+                    window=policy.window_seconds,
+                    key=key,
+                    policy_type=policy_type
+                )
+                for policy_type, policy, key in zip(policy_types, policies, keys)
+            ]
+        
+        allowed = all(decision.allowed for decision in decisions)
+        results = []
+        for policy_type, policy, key, decision in zip(policy_types, policies, keys, decisions):
+            if decision.allowed:
+                current_count = policy.requests - decision.remaining
+            else:
+                # GCRA keeps no per-request log: a rejected key has admitted
+                # its full quota plus every request denied since
+                current_count = policy.requests + decision.denied
             
             # Log rate limit check
             logger.debug("Rate limit check", extra={
@@ -313,12 +359,13 @@ class EnterpriseRateLimitingService:
                 'current_count': current_count,
                 'limit': policy.requests,
                 'allowed': allowed,
+                'local': decision.local,
                 'client_ip': self.get_client_ip(request),
                 'user_id': user.user_id if user else None
             })
             
             # Brute force detection
-            if not allowed:
+            if not decision.allowed:
                 await self._check_brute_force_pattern(
                     request, policy_type, db, user, current_count
                 )
@@ -328,36 +375,18 @@ class EnterpriseRateLimitingService:
                     request, policy_type, db, user, current_count
                 )
             
-            return RateLimitResult(
+            results.append(RateLimitResult(
                 allowed=allowed,
-                remaining=remaining,
-                reset_time=reset_time,
-                retry_after=retry_after,
-                limit=policy.requests,
-                window=policy.window_seconds,
-                key=key,
-                policy_type=policy_type
-            )
-            
-        except Exception as e:
-            logger.error("Rate limit check failed", extra={
-                'operation': 'rate_limit_check',
-                'policy_type': policy_type.value,
-                'error': str(e),
-                'client_ip': self.get_client_ip(request)
-            })
-            
-            # Fail open for availability (but log the failure)
-            return RateLimitResult(
-                allowed=True,
-                remaining=policy.requests,
-                reset_time=current_time + policy.window_seconds,
-                retry_after=0,
+                remaining=decision.remaining,
+                reset_time=current_time + decision.reset_after,
+                retry_after=decision.retry_after,
                 limit=policy.requests,
                 window=policy.window_seconds,
                 key=key,
                 policy_type=policy_type
-            )
+            ))
+        
+        return results
     
     async def _check_brute_force_pattern(
         self,
@@ -0,0 +1,577 @@
+"""
+Single-pass upload ingest for finalized uploads.
+
+Finalizing an upload used to read the object from MinIO once to verify its
+SHA-256 (SHA256StreamingService) and again to scan it (ClamAVService),
+and normalization sniffed the format and units from its own copy. This
+pipeline opens one GET stream and fans every chunk out to:
+
+- the SHA-256 hasher, on its own thread (hashlib releases the GIL)
+- the format/units sniffer, which only keeps the head of the object
+- a pooled clamd session that INSTREAMs the chunks as they arrive
+
+Each threaded consumer has a bounded queue, so at most
+queue_depth * chunk_size bytes per consumer are buffered and the read waits
+for the slowest consumer. A dropped connection resumes the read at the
+current offset instead of starting over. The result is one IngestVerdict.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import structlog
+from minio import Minio
+from minio.error import S3Error
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from app.core.minio_config import get_minio_client
+from app.services.clamav_service import ClamAVError, ClamAVScanResult, ClamAVService
+from app.services.sha256_service import (
+    MAX_RETRIES,
+    READ_TIMEOUT,
+    RETRY_DELAY,
+    SHA256StreamingError,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Bytes kept for sniffing; format headers and DXF $INSUNITS sit well inside it
+SNIFF_HEAD_SIZE = 64 * 1024
+# Bytes passed to FileValidationService for magic byte checks, as before
+MAGIC_SAMPLE_SIZE = 1024
+
+# Values match upload_normalization_service.FileFormat / Units
+EXTENSION_FORMATS: Dict[str, str] = {
+    "step": "step",
+    "stp": "step",
+    "iges": "iges",
+    "igs": "iges",
+    "stl": "stl",
+    "dxf": "dxf",
+    "ifc": "ifc",
+    "obj": "obj",
+    "brep": "brep",
+    "brp": "brep",
+    "fcstd": "fcstd",
+}
+
+DXF_INSUNITS = {1: "inch", 2: "ft", 4: "mm", 5: "cm", 6: "m"}
+
+_IFC_SCHEMA = re.compile(rb"FILE_SCHEMA\s*\(\s*\(\s*'IFC", re.IGNORECASE)
+_DXF_START = re.compile(rb"0\r?\n\s*SECTION")
+_OBJ_VERTEX = re.compile(rb"(?m)^v\s+-?[\d.]")
+
+
+def step_units_from_header(content: str) -> str:
+    """Length unit declared in the first 4 KB of a STEP file."""
+    # Look for FILE_SCHEMA
+    if 'FILE_SCHEMA' in content:
+        content_upper = content.upper()
+        if 'MILLIMETRE' in content_upper or 'MM' in content_upper:
+            return "mm"
+        elif 'METRE' in content_upper and 'MILLIMETRE' not in content_upper:
+            return "m"
+        elif 'INCH' in content_upper:
+            return "inch"
+
+    # Look for LENGTH_UNIT
+    if '#' in content:
+        for line in content.split('\n'):
+            if 'LENGTH_UNIT' in line.upper():
+                if 'MILLI' in line.upper():
+                    return "mm"
+                elif 'METRE' in line.upper():
+                    return "m"
+                elif 'INCH' in line.upper():
+                    return "inch"
+
+    return "unknown"
+
+
+def ifc_units_from_header(content: str) -> str:
+    """Length unit declared in the first 8 KB of an IFC file; metres by default."""
+    if 'IFCSIUNIT' in content:
+        if 'METRE' in content and 'MILLI' not in content:
+            return "m"
+        elif 'MILLIMETRE' in content or '.MILLI.' in content:
+            return "mm"
+    return "m"
+
+
+def dxf_units_from_header(content: str) -> str:
+    """Units from the $INSUNITS header variable of an ASCII DXF file."""
+    lines = [line.strip() for line in content.splitlines()]
+    try:
+        index = lines.index("$INSUNITS")
+        # Group code 70 follows the variable name, then its value
+        if lines[index + 1] == "70":
+            return DXF_INSUNITS.get(int(lines[index + 2]), "unknown")
+    except (ValueError, IndexError):
+        pass
+    return "unknown"
+
+
+def sniff_format(head: bytes, size: int) -> Optional[str]:
+    """CAD format from the first bytes of a file, or None if unrecognized."""
+    stripped = head.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if stripped.startswith(b"ISO-10303-21"):
+        return "ifc" if _IFC_SCHEMA.search(stripped[:8192]) else "step"
+    if stripped.startswith(b"PK\x03\x04"):
+        # FCStd is a zip archive whose first entry is Document.xml
+        return "fcstd" if b"Document.xml" in head[:1024] else None
+    if head.startswith(b"AutoCAD Binary DXF") or _DXF_START.match(stripped):
+        return "dxf"
+    if b"DBRep_DrawableShape" in head[:256] or b"CASCADE Topology" in head[:256]:
+        return "brep"
+    # Binary STL: 80-byte header, triangle count, 50 bytes per triangle
+    if len(head) >= 84 and 84 + 50 * int.from_bytes(head[80:84], "little") == size:
+        return "stl"
+    if stripped[:5].lower() == b"solid" and b"facet" in head:
+        return "stl"
+    first_line = head.split(b"\n", 1)[0].rstrip(b"\r")
+    if len(first_line) == 80 and first_line[72:73] == b"S":
+        return "iges"
+    if _OBJ_VERTEX.search(head):
+        return "obj"
+    return None
+
+
+@dataclass
+class SniffResult:
+    format: Optional[str]
+    extension_format: Optional[str]
+    units: str
+    head: bytes
+
+    @property
+    def magic_sample(self) -> bytes:
+        return self.head[:MAGIC_SAMPLE_SIZE]
+
+    @property
+    def matches_extension(self) -> bool:
+        return self.format is None or self.format == self.extension_format
+
+
+class ContentSniffer:
+    """Keeps the head of a stream and detects format and units from it."""
+
+    def __init__(self, head_size: int = SNIFF_HEAD_SIZE):
+        self.head_size = head_size
+        self._head = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        missing = self.head_size - len(self._head)
+        if missing > 0:
+            self._head += chunk[:missing]
+
+    def result(self, object_name: str, size: int) -> SniffResult:
+        head = bytes(self._head)
+        extension = object_name.rsplit(".", 1)[-1].lower() if "." in object_name else ""
+        file_format = sniff_format(head, size)
+
+        units = "unknown"
+        text_format = file_format or EXTENSION_FORMATS.get(extension)
+        if text_format == "step":
+            units = step_units_from_header(head[:4096].decode("utf-8", "ignore"))
+        elif text_format == "ifc":
+            units = ifc_units_from_header(head[:8192].decode("utf-8", "ignore"))
+        elif text_format == "dxf":
+            units = dxf_units_from_header(head.decode("utf-8", "ignore"))
+
+        return SniffResult(
+            format=file_format,
+            extension_format=EXTENSION_FORMATS.get(extension),
+            units=units,
+            head=head,
+        )
+
+
+class _ChunkConsumer:
+    """Runs handle(chunks) on a thread fed through a bounded queue."""
+
+    _DONE = object()
+
+    def __init__(self, name: str, handle: Callable[[Iterator[bytes]], Any], queue_depth: int):
+        self.handle = handle
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.busy_seconds = 0.0
+        self.thread = threading.Thread(target=self._run, name=f"upload-ingest-{name}", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def feed(self, chunk: bytes) -> None:
+        # Blocks while the queue is full: backpressure on the object read
+        self.queue.put(chunk)
+
+    def finish(self) -> None:
+        self.queue.put(self._DONE)
+        self.thread.join()
+
+    def _chunks(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.queue.get()
+            if chunk is self._DONE:
+                return
+            yield chunk
+
+    def _run(self) -> None:
+        chunks = self._chunks()
+        started = time.perf_counter()
+        try:
+            self.result = self.handle(chunks)
+        except BaseException as e:
+            self.error = e
+        self.busy_seconds = time.perf_counter() - started
+        # A consumer that stopped early must not stall the reader
+        for _ in chunks:
+            pass
+
+
+def _sha256_hex(chunks: Iterator[bytes]) -> str:
+    hasher = hashlib.sha256()
+    for chunk in chunks:
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+@dataclass
+class IngestVerdict:
+    """Combined outcome of hashing, sniffing and scanning one object."""
+
+    object_key: str
+    size: int
+    sha256: str
+    expected_sha256: str
+    sniff: SniffResult
+    scan: Optional[ClamAVScanResult]
+    scan_error: Optional[ClamAVError] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def hash_valid(self) -> bool:
+        return self.sha256 == self.expected_sha256
+
+    @property
+    def is_clean(self) -> bool:
+        return self.scan is not None and self.scan.is_clean
+
+    @property
+    def rejection_reason(self) -> Optional[str]:
+        """First reason to reject the upload, in the order finalize checks them."""
+        if not self.hash_valid:
+            return "hash_mismatch"
+        if self.scan_error is not None:
+            return "scan_error"
+        if not self.is_clean:
+            return "malware"
+        return None
+
+    @property
+    def accepted(self) -> bool:
+        return self.rejection_reason is None
+
+    def hash_result(self) -> Tuple[bool, str, Dict[str, Any], bytes | None]:
+        """Same shape as SHA256StreamingService.verify_object_hash."""
+        return self.hash_valid, self.sha256, self.metadata, self.sniff.magic_sample or None
+
+    def scan_result(self) -> ClamAVScanResult:
+        """
+        Raises:
+            ClamAVError: The error the scan failed with
+        """
+        if self.scan_error is not None:
+            raise self.scan_error
+        return self.scan
+
+
+class UploadIngestService:
+    """Verifies, sniffs and scans an uploaded object from a single read."""
+
+    def __init__(
+        self,
+        client: Minio | None = None,
+        clamav_service: ClamAVService | None = None,
+        chunk_size: int = 1024 * 1024,
+        queue_depth: int = 8,
+    ):
+        """
+        Args:
+            client: MinIO client the object is read with
+            clamav_service: Scan policy and clamd sessions; None disables scanning
+            chunk_size: Bytes per read and per queued chunk
+            queue_depth: Chunks buffered per consumer before the read waits
+        """
+        self.client = client or get_minio_client()
+        self.clamav_service = clamav_service
+        self.chunk_size = chunk_size
+        self.queue_depth = queue_depth
+
+    def ingest_object(
+        self,
+        bucket_name: str,
+        object_name: str,
+        size: int,
+        expected_sha256: str,
+        version_id: str | None = None,
+        mime_type: str | None = None,
+        file_type: str | None = None,
+        max_scan_bytes: int = 100 * 1024 * 1024,
+    ) -> IngestVerdict:
+        """
+        Read the object once and hash, sniff and scan it.
+
+        Args:
+            bucket_name: Bucket of the object
+            object_name: Name of the object
+            size: Object size from stat_object
+            expected_sha256: SHA-256 declared at upload init
+            version_id: Version to read, so a resumed read sees the same bytes
+            mime_type: MIME type for the scan policy
+            file_type: File type for the scan policy
+            max_scan_bytes: Larger objects are not scanned, as in ClamAVService
+
+        Returns:
+            IngestVerdict; scan failures are reported in scan_error
+
+        Raises:
+            SHA256StreamingError: If the object cannot be read completely
+        """
+        object_key = f"{bucket_name}/{object_name}"
+        started = time.perf_counter()
+
+        scan = None
+        if self.clamav_service is None:
+            scan = ClamAVScanResult(
+                is_clean=True,
+                scan_time_ms=0.0,
+                scan_metadata={"scan_skipped": True, "reason": "disabled"},
+            )
+        else:
+            scan = self.clamav_service.skipped_scan_result(
+                object_key, size, mime_type, file_type, max_scan_bytes
+            )
+
+        sniffer = ContentSniffer()
+        consumers = {"hash": _ChunkConsumer("hash", _sha256_hex, self.queue_depth)}
+        if scan is None:
+            consumers["scan"] = _ChunkConsumer(
+                "scan",
+                lambda chunks: self.clamav_service.scan_chunks(
+                    chunks, object_key, size, mime_type, file_type
+                ),
+                self.queue_depth,
+            )
+        for consumer in consumers.values():
+            consumer.start()
+
+        def on_chunk(chunk: bytes) -> None:
+            sniffer.feed(chunk)
+            for consumer in consumers.values():
+                consumer.feed(chunk)
+
+        try:
+            bytes_read, chunks_read, read_requests = self._read(
+                bucket_name, object_name, version_id, on_chunk
+            )
+        finally:
+            for consumer in consumers.values():
+                consumer.finish()
+        elapsed = time.perf_counter() - started
+
+        if elapsed > READ_TIMEOUT:
+            raise SHA256StreamingError(
+                code="TIMEOUT",
+                message=f"Operation upload_ingest timed out after {elapsed:.2f}s",
+                details={"elapsed_time": elapsed, "timeout": READ_TIMEOUT},
+            )
+        if bytes_read != size:
+            raise SHA256StreamingError(
+                code="INCOMPLETE_READ",
+                message=f"Incomplete read: expected {size} bytes, got {bytes_read}",
+                details={"bucket": bucket_name, "object": object_name, "bytes_processed": bytes_read},
+            )
+
+        hasher = consumers["hash"]
+        if hasher.error is not None:
+            raise SHA256StreamingError(
+                code="UNEXPECTED_ERROR",
+                message=f"Unexpected error: {hasher.error}",
+                details={"error": str(hasher.error)},
+            ) from hasher.error
+
+        scan_error = None
+        if "scan" in consumers:
+            scanner = consumers["scan"]
+            scan = scanner.result
+            if isinstance(scanner.error, ClamAVError):
+                scan_error = scanner.error
+            elif scanner.error is not None:
+                scan_error = ClamAVError(
+                    code="UNEXPECTED_SCAN_ERROR",
+                    message=f"Unexpected scan error: {scanner.error}",
+                    turkish_message=f"Beklenmeyen tarama hatası: {scanner.error}",
+                    details={"error": str(scanner.error)},
+                    status_code=500,
+                )
+
+        sniff = sniffer.result(object_name, size)
+        actual_sha256 = hasher.result
+        metadata = {
+            "bucket": bucket_name,
+            "object": object_name,
+            "expected_sha256": expected_sha256,
+            "actual_sha256": actual_sha256,
+            "actual_size": size,
+            "bytes_processed": bytes_read,
+            "chunks_processed": chunks_read,
+            "chunk_size": self.chunk_size,
+            "read_requests": read_requests,
+            "first_chunk_size": len(sniff.magic_sample),
+            "hash_match": actual_sha256 == expected_sha256,
+            "sniffed_format": sniff.format,
+            "sniffed_units": sniff.units,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "consumer_busy_ms": {
+                name: round(consumer.busy_seconds * 1000, 2) for name, consumer in consumers.items()
+            },
+        }
+        verdict = IngestVerdict(
+            object_key=object_key,
+            size=size,
+            sha256=actual_sha256,
+            expected_sha256=expected_sha256,
+            sniff=sniff,
+            scan=scan,
+            scan_error=scan_error,
+            metadata=metadata,
+        )
+
+        log = logger.error if not verdict.hash_valid else logger.info
+        log(
+            "Upload ingest completed",
+            object_key=object_key,
+            bytes_processed=bytes_read,
+            read_requests=read_requests,
+            sha256=actual_sha256,
+            hash_match=verdict.hash_valid,
+            sniffed_format=sniff.format,
+            sniffed_units=sniff.units,
+            is_clean=verdict.is_clean,
+            rejection_reason=verdict.rejection_reason,
+            elapsed_ms=metadata["elapsed_ms"],
+        )
+        return verdict
+
+    def _read(
+        self,
+        bucket_name: str,
+        object_name: str,
+        version_id: str | None,
+        on_chunk: Callable[[bytes], None],
+    ) -> Tuple[int, int, int]:
+        """
+        Stream the object into on_chunk, resuming at the current offset
+        after a dropped connection.
+
+        Returns:
+            (bytes_read, chunks_read, read_requests)
+        """
+        bytes_read = 0
+        chunks_read = 0
+        read_requests = 0
+        retry_count = 0
+
+        while True:
+            try:
+                response = self.client.get_object(
+                    bucket_name, object_name, offset=bytes_read, version_id=version_id
+                )
+                read_requests += 1
+                try:
+                    for chunk in response.stream(self.chunk_size):
+                        bytes_read += len(chunk)
+                        chunks_read += 1
+                        on_chunk(chunk)
+                finally:
+                    response.close()
+                    response.release_conn()
+                return bytes_read, chunks_read, read_requests
+
+            except S3Error as e:
+                if e.code == "NoSuchKey":
+                    raise SHA256StreamingError(
+                        code="NOT_FOUND",
+                        message=f"Object not found: {bucket_name}/{object_name}",
+                        details={"error": str(e)},
+                    ) from e
+                raise SHA256StreamingError(
+                    code="STREAM_ERROR",
+                    message=f"Failed to read object: {str(e)}",
+                    details={"error": str(e), "bytes_processed": bytes_read},
+                ) from e
+
+            except (ReadTimeoutError, ProtocolError, ConnectionError) as e:
+                retry_count += 1
+                if retry_count >= MAX_RETRIES:
+                    raise SHA256StreamingError(
+                        code="STREAM_ERROR",
+                        message=f"Failed to stream object after {MAX_RETRIES} retries: {str(e)}",
+                        details={"error": str(e), "retries": retry_count, "bytes_processed": bytes_read},
+                    ) from e
+
+                logger.warning(
+                    "Stream error, resuming",
+                    bucket=bucket_name,
+                    object=object_name,
+                    error=str(e),
+                    retry_count=retry_count,
+                    offset=bytes_read,
+                )
+                time.sleep(RETRY_DELAY * (2 ** (retry_count - 1)))  # Exponential backoff
+
+
+def get_upload_ingest_service(
+    client: Minio | None = None,
+    clamav_service: ClamAVService | None = None,
+) -> UploadIngestService:
+    """
+    Get upload ingest service instance for dependency injection.
+
+    Args:
+        client: Optional MinIO client
+        clamav_service: ClamAV service for scan policy and sessions
+
+    Returns:
+        UploadIngestService: Configured service instance
+    """
+    from app.core.environment import environment
+
+    return UploadIngestService(
+        client=client,
+        clamav_service=clamav_service,
+        chunk_size=environment.UPLOAD_INGEST_CHUNK_SIZE,
+        queue_depth=environment.UPLOAD_INGEST_QUEUE_DEPTH,
+    )
+
+
+__all__ = [
+    "ContentSniffer",
+    "IngestVerdict",
+    "SniffResult",
+    "UploadIngestService",
+    "get_upload_ingest_service",
+    "sniff_format",
+    "step_units_from_header",
+    "ifc_units_from_header",
+    "dxf_units_from_header",
+]
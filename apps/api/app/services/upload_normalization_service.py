@@ -40,35 +40,37 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import numpy as np
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
 from ..core.environment import environment as settings
 from ..core.logging import get_logger
 from ..core.telemetry import create_span
 from ..core import metrics
+from ..core.lazy_loading import lazy_module, module_available
 from ..middleware.correlation_middleware import get_correlation_id
 from ..services.s3_service import S3Service, s3_service
 from .freecad_service import FreeCADService, freecad_service
 from .freecad_document_manager import FreeCADDocumentManager, document_manager
 from .freecad_rules_engine import FreeCADRulesEngine, freecad_rules_engine
+from .upload_ingest_service import ifc_units_from_header, step_units_from_header
 
 logger = get_logger(__name__)
 
-# Try to import trimesh for mesh operations
-try:
-    import trimesh
-    TRIMESH_AVAILABLE = True
-except ImportError:
-    TRIMESH_AVAILABLE = False
+# numpy, trimesh and ezdxf are imported on first use, not at startup
+np = lazy_module("numpy")
+
+# Check for trimesh for mesh operations
+TRIMESH_AVAILABLE = module_available("trimesh")
+if TRIMESH_AVAILABLE:
+    trimesh = lazy_module("trimesh")
+else:
     logger.warning("trimesh not available, mesh repair features limited")
 
-# Try to import ezdxf for DXF operations
-try:
-    import ezdxf
-    EZDXF_AVAILABLE = True
-except ImportError:
-    EZDXF_AVAILABLE = False
+# Check for ezdxf for DXF operations
+EZDXF_AVAILABLE = module_available("ezdxf")
+if EZDXF_AVAILABLE:
+    ezdxf = lazy_module("ezdxf")
+else:
     logger.warning("ezdxf not available, DXF normalization features limited")
 
 # Constants for enterprise code quality
@@ -254,30 +256,7 @@ class STEPHandler(FormatHandler):
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read(4096)  # Read first 4KB for header
-                
-                # Look for FILE_SCHEMA
-                if 'FILE_SCHEMA' in content:
-                    content_upper = content.upper()
-                    if 'MILLIMETRE' in content_upper or 'MM' in content_upper:
-                        return Units.MILLIMETER
-                    elif 'METRE' in content_upper and 'MILLIMETRE' not in content_upper:
-                        return Units.METER
-                    elif 'INCH' in content_upper:
-                        return Units.INCH
-                
-                # Look for LENGTH_UNIT
-                if '#' in content:
-                    lines = content.split('\n')
-                    for line in lines:
-                        if 'LENGTH_UNIT' in line.upper():
-                            if 'MILLI' in line.upper():
-                                return Units.MILLIMETER
-                            elif 'METRE' in line.upper():
-                                return Units.METER
-                            elif 'INCH' in line.upper():
-                                return Units.INCH
-                
-                return Units.UNKNOWN
+                return Units(step_units_from_header(content))
                 
         except Exception as e:
             logger.warning(f"Failed to detect units from STEP file: {e}")
@@ -945,16 +924,7 @@ class IFCHandler(FormatHandler):
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read(8192)  # Read first 8KB
-                
-                # Look for IFCSIUNIT
-                if 'IFCSIUNIT' in content:
-                    if 'METRE' in content and 'MILLI' not in content:
-                        return Units.METER
-                    elif 'MILLIMETRE' in content or '.MILLI.' in content:
-                        return Units.MILLIMETER
-                
-                # Default for IFC is usually meters
-                return Units.METER
+                return Units(ifc_units_from_header(content))
                 
         except Exception as e:
             logger.warning(f"Failed to detect units from IFC file: {e}")
@@ -0,0 +1,411 @@
+"""
+Binary Write-Ahead Log Segments for Point-in-Time Recovery (Task 7.26).
+
+The WAL is a directory of numbered segment files, each with a sidecar
+time index:
+
+- ``wal_<seq>.wal``: segment header, then records back to back. A record
+  is a 16-byte header (payload length, CRC-32 of timestamp and payload,
+  timestamp in microseconds) followed by the payload.
+- ``wal_<seq>.idx``: sparse index, one entry per block of about
+  ``index_interval`` bytes: block start and end offsets plus the lowest
+  and highest record timestamp in the block.
+
+Records are appended in batches: a batch is one write and one fsync, which
+is what group commit in WALManager hands down. Index entries are written
+only after the records they describe are durable; a missing or torn index
+is rebuilt from its segment, and a torn record at the end of the last
+segment is truncated when the log is opened.
+
+Readers seek with the index: blocks whose timestamps lie entirely outside
+the requested range are skipped, so writers may commit slightly out of
+timestamp order without records being missed.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+SEGMENT_MAGIC = b"PWAL"
+SEGMENT_VERSION = 1
+
+# magic, version
+_SEGMENT_HEADER = struct.Struct(">4sI")
+# payload length, CRC-32, timestamp (microseconds since the epoch)
+_RECORD_HEADER = struct.Struct(">IIq")
+# block start, block end, min timestamp, max timestamp
+_INDEX_ENTRY = struct.Struct(">QQqq")
+
+_SEGMENT_NAME = re.compile(r"^wal_(\d{12})\.wal$")
+
+DEFAULT_INDEX_INTERVAL = 64 * 1024
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+class WALError(Exception):
+    """Raised when the WAL cannot be opened or written."""
+    pass
+
+
+@dataclass
+class IndexBlock:
+    """A run of records described by one time index entry."""
+    start: int
+    end: int
+    min_ts: int
+    max_ts: int
+
+    def overlaps(self, start_ts: Optional[int], end_ts: Optional[int]) -> bool:
+        if start_ts is not None and self.max_ts < start_ts:
+            return False
+        if end_ts is not None and self.min_ts > end_ts:
+            return False
+        return True
+
+
+@dataclass
+class _Segment:
+    seq: int
+    path: Path
+    index_path: Path
+    size: int = 0
+    blocks: List[IndexBlock] = field(default_factory=list)
+    # Records after the last indexed block (active segment only)
+    open_block: Optional[IndexBlock] = None
+
+    @property
+    def max_ts(self) -> Optional[int]:
+        blocks = self.blocks + ([self.open_block] if self.open_block else [])
+        return max((block.max_ts for block in blocks), default=None)
+
+
+def encode_record(timestamp_us: int, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(struct.pack(">q", timestamp_us)))
+    return _RECORD_HEADER.pack(len(payload), crc, timestamp_us) + payload
+
+
+def _read_records(f, end: int) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield (offset, timestamp, payload) from the current position up to end; stops at a bad record."""
+    pos = f.tell()
+    while pos + _RECORD_HEADER.size <= end:
+        header = f.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            return
+        length, crc, timestamp_us = _RECORD_HEADER.unpack(header)
+        if pos + _RECORD_HEADER.size + length > end:
+            return
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload, zlib.crc32(header[8:])) != crc:
+            raise WALError(f"Corrupt WAL record at offset {pos} of {f.name}")
+        yield pos, timestamp_us, payload
+        pos += _RECORD_HEADER.size + length
+
+
+class WALSegmentLog:
+    """
+    Segmented binary WAL with a sparse time index.
+
+    Thread-safe: appends are serialized by a lock, and readers work on a
+    snapshot of the committed segment sizes and index blocks, so they can
+    run in worker threads while batches are appended.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_size: int,
+        index_interval: int = DEFAULT_INDEX_INTERVAL,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.segment_size = segment_size
+        self.index_interval = index_interval
+        self.fsync = fsync
+        self._segments: List[_Segment] = []
+        self._writer = None
+        self._lock = threading.RLock()
+        self._opened = False
+
+    # Lifecycle
+
+    def open(self):
+        """Load segment indexes and repair the tail of the last segment."""
+        with self._lock:
+            if self._opened:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            segments = []
+            for path in self.directory.glob("wal_*.wal"):
+                match = _SEGMENT_NAME.match(path.name)
+                if match:
+                    seq = int(match.group(1))
+                    segments.append(_Segment(seq, path, path.with_suffix(".idx")))
+            segments.sort(key=lambda segment: segment.seq)
+
+            for position, segment in enumerate(segments):
+                self._load_index(segment, last=position == len(segments) - 1)
+            if segments:
+                self._recover_tail(segments[-1])
+            self._segments = segments
+            self._opened = True
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._segments = []
+            self._opened = False
+
+    def _load_index(self, segment: _Segment, last: bool):
+        segment.size = segment.path.stat().st_size
+        if last and segment.size < _SEGMENT_HEADER.size:
+            # Created just before a crash, header never written
+            with open(segment.path, "wb") as f:
+                f.write(_SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+            segment.size = _SEGMENT_HEADER.size
+        with open(segment.path, "rb") as f:
+            header = f.read(_SEGMENT_HEADER.size)
+        if len(header) < _SEGMENT_HEADER.size or _SEGMENT_HEADER.unpack(header) != (SEGMENT_MAGIC, SEGMENT_VERSION):
+            raise WALError(f"Not a WAL segment: {segment.path}")
+
+        data = segment.index_path.read_bytes() if segment.index_path.exists() else b""
+        blocks = [
+            IndexBlock(*_INDEX_ENTRY.unpack_from(data, offset))
+            for offset in range(0, len(data) - len(data) % _INDEX_ENTRY.size, _INDEX_ENTRY.size)
+        ]
+        valid = []
+        for block in blocks:
+            if block.end > segment.size:
+                break
+            valid.append(block)
+        if len(valid) != len(blocks) or len(data) % _INDEX_ENTRY.size:
+            self._write_index(segment, valid)
+        segment.blocks = valid
+
+        indexed_end = valid[-1].end if valid else _SEGMENT_HEADER.size
+        if not last and indexed_end < segment.size:
+            # Sealed before its last index entries reached the disk
+            blocks, tail, _ = self._scan_blocks(segment, indexed_end, segment.size)
+            self._append_index(segment, blocks + ([tail] if tail else []))
+
+    def _scan_blocks(self, segment: _Segment, start: int, end: int) -> Tuple[List[IndexBlock], Optional[IndexBlock], int]:
+        """
+        Index records between start and end.
+
+        Returns:
+            (closed blocks, trailing open block, end of the last valid record)
+        """
+        blocks: List[IndexBlock] = []
+        block: Optional[IndexBlock] = None
+        valid_end = start
+        with open(segment.path, "rb", buffering=READ_BUFFER_SIZE) as f:
+            f.seek(start)
+            try:
+                for offset, timestamp_us, payload in _read_records(f, end):
+                    valid_end = offset + _RECORD_HEADER.size + len(payload)
+                    if block is None:
+                        block = IndexBlock(offset, valid_end, timestamp_us, timestamp_us)
+                    else:
+                        block.end = valid_end
+                        block.min_ts = min(block.min_ts, timestamp_us)
+                        block.max_ts = max(block.max_ts, timestamp_us)
+                    if block.end - block.start >= self.index_interval:
+                        blocks.append(block)
+                        block = None
+            except WALError as e:
+                logger.warning("WAL segment scan stopped at a corrupt record", segment=segment.path.name, error=str(e))
+        return blocks, block, valid_end
+
+    def _write_index(self, segment: _Segment, blocks: Sequence[IndexBlock]):
+        with open(segment.index_path, "wb") as f:
+            f.write(b"".join(_INDEX_ENTRY.pack(b.start, b.end, b.min_ts, b.max_ts) for b in blocks))
+
+    def _recover_tail(self, segment: _Segment):
+        start = segment.blocks[-1].end if segment.blocks else _SEGMENT_HEADER.size
+        blocks, open_block, valid_end = self._scan_blocks(segment, start, segment.size)
+        if valid_end < segment.size and segment.size > _SEGMENT_HEADER.size:
+            with open(segment.path, "r+b") as f:
+                f.truncate(max(valid_end, _SEGMENT_HEADER.size))
+            logger.warning(
+                "Truncated torn WAL segment tail",
+                segment=segment.path.name,
+                dropped_bytes=segment.size - valid_end,
+            )
+            segment.size = max(valid_end, _SEGMENT_HEADER.size)
+        if blocks:
+            self._append_index(segment, blocks)
+        segment.open_block = open_block
+
+    def _append_index(self, segment: _Segment, blocks: Sequence[IndexBlock]):
+        with open(segment.index_path, "ab") as f:
+            f.write(b"".join(_INDEX_ENTRY.pack(b.start, b.end, b.min_ts, b.max_ts) for b in blocks))
+        segment.blocks.extend(blocks)
+
+    # Writing
+
+    def _active(self) -> _Segment:
+        if not self._segments:
+            return self._new_segment()
+        return self._segments[-1]
+
+    def _new_segment(self) -> _Segment:
+        if self._segments:
+            self._seal(self._segments[-1])
+        seq = self._segments[-1].seq + 1 if self._segments else 1
+        path = self.directory / f"wal_{seq:012d}.wal"
+        segment = _Segment(seq, path, path.with_suffix(".idx"), size=_SEGMENT_HEADER.size)
+        with open(path, "wb") as f:
+            f.write(_SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        segment.index_path.write_bytes(b"")
+        self._segments.append(segment)
+        logger.debug("WAL segment created", segment=path.name)
+        return segment
+
+    def _seal(self, segment: _Segment):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if segment.open_block is not None:
+            self._append_index(segment, [segment.open_block])
+            segment.open_block = None
+        logger.info("WAL segment sealed", segment=segment.path.name, size=segment.size)
+
+    def append(self, records: Sequence[Tuple[int, bytes]]):
+        """Append (timestamp_us, payload) records durably: one write and fsync per segment touched."""
+        with self._lock:
+            self.open()
+            segment = self._active()
+            pending = bytearray()
+            stamps: List[Tuple[int, int]] = []
+            for timestamp_us, payload in records:
+                record = encode_record(timestamp_us, payload)
+                size = segment.size + len(pending)
+                if size > _SEGMENT_HEADER.size and size + len(record) > self.segment_size:
+                    self._commit(segment, pending, stamps)
+                    segment = self._new_segment()
+                    pending, stamps = bytearray(), []
+                stamps.append((len(record), timestamp_us))
+                pending += record
+            self._commit(segment, pending, stamps)
+
+    def _commit(self, segment: _Segment, data: bytearray, stamps: List[Tuple[int, int]]):
+        if not data:
+            return
+        if self._writer is None:
+            self._writer = open(segment.path, "ab", buffering=0)
+        try:
+            self._writer.write(data)
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+        except OSError as e:
+            # Drop the partial write so the segment stays a sequence of whole records
+            self._writer.close()
+            self._writer = None
+            with open(segment.path, "r+b") as f:
+                f.truncate(segment.size)
+            raise WALError(f"WAL append failed: {e}")
+
+        closed = []
+        offset = segment.size
+        block = segment.open_block
+        for length, timestamp_us in stamps:
+            if block is None:
+                block = IndexBlock(offset, offset, timestamp_us, timestamp_us)
+            offset += length
+            block.end = offset
+            block.min_ts = min(block.min_ts, timestamp_us)
+            block.max_ts = max(block.max_ts, timestamp_us)
+            if block.end - block.start >= self.index_interval:
+                closed.append(block)
+                block = None
+        segment.size = offset
+        segment.open_block = block
+        if closed:
+            self._append_index(segment, closed)
+
+    # Reading
+
+    def iter_records(self, start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield (timestamp_us, payload) of committed records in log order,
+        limited to start_ts <= timestamp <= end_ts. Blocks outside the range
+        are skipped via the time index.
+        """
+        with self._lock:
+            self.open()
+            snapshot = [
+                (segment.path, list(segment.blocks) + ([replace(segment.open_block)] if segment.open_block else []))
+                for segment in self._segments
+            ]
+
+        for path, blocks in snapshot:
+            ranges: List[List[int]] = []
+            for block in blocks:
+                if not block.overlaps(start_ts, end_ts):
+                    continue
+                if ranges and ranges[-1][1] == block.start:
+                    ranges[-1][1] = block.end
+                else:
+                    ranges.append([block.start, block.end])
+            if not ranges:
+                continue
+
+            with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+                try:
+                    for start, end in ranges:
+                        f.seek(start)
+                        for _, timestamp_us, payload in _read_records(f, end):
+                            if start_ts is not None and timestamp_us < start_ts:
+                                continue
+                            if end_ts is not None and timestamp_us > end_ts:
+                                continue
+                            yield timestamp_us, payload
+                except WALError as e:
+                    logger.warning("WAL segment read stopped at a corrupt record", segment=path.name, error=str(e))
+
+    # Retention
+
+    def drop_before(self, cutoff_ts: int) -> List[str]:
+        """Delete sealed segments whose newest record is older than cutoff_ts."""
+        removed = []
+        with self._lock:
+            self.open()
+            for segment in list(self._segments[:-1]):
+                max_ts = segment.max_ts
+                if max_ts is None or max_ts >= cutoff_ts:
+                    continue
+                segment.path.unlink(missing_ok=True)
+                segment.index_path.unlink(missing_ok=True)
+                self._segments.remove(segment)
+                removed.append(segment.path.name)
+        return removed
+
+    @property
+    def segment_count(self) -> int:
+        with self._lock:
+            self.open()
+            return len(self._segments)
+
+
+__all__ = [
+    "DEFAULT_INDEX_INTERVAL",
+    "IndexBlock",
+    "WALError",
+    "WALSegmentLog",
+    "encode_record",
+]
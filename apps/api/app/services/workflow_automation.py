@@ -5,25 +5,31 @@ Provides DAG-based workflow automation with:
 - Workflow definition and validation
 - Step execution with conditions
 - Branching and parallel execution
+- Concurrent DAG scheduling with global and per-action limits
 - Error handling and recovery
-- State management and persistence
+- State management and persistence across restarts
 """
 
 from __future__ import annotations
 
 import ast
 import asyncio
+import heapq
 import json
 import operator
+import os
+import time
 import uuid
 from collections import defaultdict, deque
 from datetime import UTC, datetime
 from enum import Enum
 from functools import lru_cache
-from typing import Any, Callable, Dict, List, Optional, Set
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel, Field, field_validator
 
+from ..core.environment import environment as settings
 from ..core.logging import get_logger
 from ..core.metrics import workflow_counter, workflow_duration_histogram
 from ..core.telemetry import create_span
@@ -172,6 +178,7 @@ class ExecutionOptions(BaseModel):
     async_execution: bool = Field(default=True, description="Asenkron yürütme")
     save_intermediate: bool = Field(default=True, description="Ara sonuçları kaydet")
     parallel_limit: int = Field(default=10, ge=1, le=100, description="Maksimum paralel adım")
+    action_limits: Dict[str, int] = Field(default_factory=dict, description="Aksiyon başına maksimum paralel adım")
     parallel_timeout: Optional[int] = Field(default=None, ge=1, le=3600, description="Paralel adım zaman aşımı (saniye)")
     retry_delay_ms: int = Field(default=1000, ge=100, le=60000, description="Tekrar gecikme süresi")
     checkpoint_enabled: bool = Field(default=True, description="Checkpoint etkin")
@@ -183,6 +190,77 @@ class WorkflowValidationError(Exception):
     pass
 
 
+def _json_default(value: Any) -> Any:
+    """Serialise checkpoint values the json module cannot encode natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class WorkflowStateStore:
+    """Execution checkpoints, one JSON file per execution.
+
+    A checkpoint holds the workflow definition, the execution options and
+    the execution with its finished step results, which is all a new
+    process needs to resume it. Files are replaced atomically.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        self.directory = Path(directory or settings.WORKFLOW_STATE_DIR)
+
+    def _path(self, execution_id: str) -> Path:
+        return self.directory / f"{execution_id}.json"
+
+    async def save(
+        self,
+        workflow: Workflow,
+        execution: WorkflowExecution,
+        options: ExecutionOptions
+    ) -> None:
+        """Write a checkpoint; serialised on the loop, written off it."""
+        data = json.dumps(
+            {
+                "workflow": workflow.model_dump(),
+                "execution": execution.model_dump(),
+                "options": options.model_dump(),
+            },
+            default=_json_default
+        )
+        await asyncio.to_thread(self._write, self._path(execution.id), data)
+
+    def _write(self, path: Path, data: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    async def load(
+        self,
+        execution_id: str
+    ) -> Optional[Tuple[Workflow, WorkflowExecution, ExecutionOptions]]:
+        """Read a checkpoint, or None if there is none."""
+        path = self._path(execution_id)
+        try:
+            raw = await asyncio.to_thread(path.read_text, encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+        state = json.loads(raw)
+        return (
+            Workflow.model_validate(state["workflow"]),
+            WorkflowExecution.model_validate(state["execution"]),
+            ExecutionOptions.model_validate(state["options"]),
+        )
+
+    async def delete(self, execution_id: str) -> None:
+        """Drop the checkpoint of a finished execution."""
+        await asyncio.to_thread(self._path(execution_id).unlink, missing_ok=True)
+
+
 class StepExecutor:
     """Execute workflow steps."""
     
@@ -590,10 +668,20 @@ class ConditionEvaluator:
 class WorkflowEngine:
     """Main workflow automation engine."""
     
-    def __init__(self):
-        """Initialize workflow engine."""
+    def __init__(self, state_store: Optional[WorkflowStateStore] = None):
+        """
+        Initialize workflow engine.
+        
+        Args:
+            state_store: Checkpoint store (default: WORKFLOW_STATE_DIR)
+        """
         self.workflows: Dict[str, Workflow] = {}
         self.executions: Dict[str, WorkflowExecution] = {}
+        self.state_store = state_store or WorkflowStateStore()
+        self._execution_options: Dict[str, ExecutionOptions] = {}
+        self._running_steps: Dict[str, Dict[asyncio.Task, WorkflowStep]] = {}
+        self._resume_tasks: Dict[str, asyncio.Task] = {}
+        self._active: Set[str] = set()
         self.step_executor = StepExecutor()
         self.condition_evaluator = ConditionEvaluator()
         self._workflow_cache = {}  # Cache for validated workflow objects
@@ -688,11 +776,6 @@ class WorkflowEngine:
             
             logger.info(f"İş akışı tanımlandı: {workflow.name} ({workflow.id})")
             
-            workflow_counter.labels(
-                operation="define",
-                status="success"
-            ).inc()
-            
             return workflow
     
     def _add_to_cache(self, workflow_id: str, workflow: Workflow) -> None:
@@ -729,7 +812,13 @@ class WorkflowEngine:
         input_data: Dict[str, Any],
         options: Optional[ExecutionOptions] = None
     ) -> WorkflowExecution:
-        """Execute a workflow."""
+        """
+        Execute a workflow.
+        
+        Steps run as soon as their dependencies finish, up to
+        ``parallel_limit`` at a time. Returns early with status PAUSED if
+        the execution is paused; ``resume_execution`` continues it.
+        """
         with create_span("execute_workflow") as span:
             # Try to get from cache first
             workflow = self._get_from_cache(workflow_id)
@@ -756,97 +845,291 @@ class WorkflowEngine:
             )
             
             self.executions[execution.id] = execution
+            self._execution_options[execution.id] = options
+            span.set_attribute("execution_id", execution.id)
             
-            try:
-                # Sort steps topologically
-                sorted_steps = self.topological_sort(workflow.steps)
+            return await self._run_execution(workflow, execution, options)
+    
+    async def _run_execution(
+        self,
+        workflow: Workflow,
+        execution: WorkflowExecution,
+        options: ExecutionOptions
+    ) -> WorkflowExecution:
+        """Schedule the unfinished steps of an execution and finalise it."""
+        self._active.add(execution.id)
+        try:
+            if options.checkpoint_enabled:
+                await self.state_store.save(workflow, execution, options)
+            
+            await self._run_dag(workflow, execution, options)
+            
+            if execution.status == WorkflowStatus.PAUSED:
+                logger.info(
+                    f"İş akışı duraklatıldı: {workflow.name}, "
+                    f"tamamlanan adım: {len(execution.step_results)}/{len(workflow.steps)}"
+                )
+                return execution
+            
+            if execution.status == WorkflowStatus.CANCELLED:
+                execution.end_time = execution.end_time or datetime.now(UTC)
+                execution.duration_ms = (execution.end_time - execution.start_time).total_seconds() * 1000
+                await self.state_store.delete(execution.id)
+                return execution
+            
+            # Execute success/failure handlers
+            if execution.status != WorkflowStatus.FAILED:
+                execution.status = WorkflowStatus.COMPLETED
+                if workflow.on_success:
+                    await self._execute_handlers(workflow.on_success, execution, options)
+            else:
+                if workflow.on_failure:
+                    await self._execute_handlers(workflow.on_failure, execution, options)
+            
+            # Calculate duration
+            execution.end_time = datetime.now(UTC)
+            execution.duration_ms = (execution.end_time - execution.start_time).total_seconds() * 1000
+            
+            path, path_ms = self.critical_path(workflow, execution.step_results)
+            execution.metadata["critical_path"] = path
+            execution.metadata["critical_path_ms"] = path_ms
+            
+            await self.state_store.delete(execution.id)
+            
+            # Record metrics
+            workflow_counter.labels(
+                workflow_name=workflow.name,
+                status="success" if execution.status == WorkflowStatus.COMPLETED else "error"
+            ).inc()
+            
+            workflow_duration_histogram.labels(
+                workflow_name=workflow.name
+            ).observe(execution.duration_ms)
+            
+            logger.info(
+                f"İş akışı tamamlandı: {workflow.name}, "
+                f"Durum: {execution.status}, "
+                f"Süre: {execution.duration_ms:.2f}ms, "
+                f"Kritik yol: {path_ms:.2f}ms"
+            )
+            
+            return execution
+            
+        except Exception as e:
+            logger.error(f"İş akışı hatası {workflow.name}: {e}")
+            execution.status = WorkflowStatus.FAILED
+            execution.error = str(e)
+            execution.end_time = datetime.now(UTC)
+            execution.duration_ms = (execution.end_time - execution.start_time).total_seconds() * 1000
+            
+            workflow_counter.labels(
+                workflow_name=workflow.name,
+                status="error"
+            ).inc()
+            
+            return execution
+        
+        finally:
+            self._active.discard(execution.id)
+            self._running_steps.pop(execution.id, None)
+    
+    async def _run_dag(
+        self,
+        workflow: Workflow,
+        execution: WorkflowExecution,
+        options: ExecutionOptions
+    ) -> None:
+        """
+        Run steps from a ready queue until none are left or the run stops.
+        
+        A step becomes ready when all its dependencies have a result. It is
+        recorded as skipped if any dependency did not complete, otherwise
+        queued by longest remaining chain (entry point first) and launched
+        while ``parallel_limit`` and its ``action_limits`` entry allow.
+        Steps that already have a result, e.g. after a resume, are not run.
+        
+        Pausing stops new launches and lets running steps finish; a FAIL
+        step failure or cancellation cancels the running steps.
+        """
+        step_map = {step.id: step for step in workflow.steps}
+        results = execution.step_results
+        priority = self._chain_lengths(workflow)
+        
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        unfinished: Dict[str, int] = {}
+        for step in workflow.steps:
+            if step.id in results:
+                continue
+            deps = [d for d in step.dependencies if d in step_map]
+            for dep_id in deps:
+                dependents[dep_id].append(step.id)
+            unfinished[step.id] = sum(1 for d in deps if d not in results)
+        
+        ready: List[Tuple[int, int, int, str]] = []
+        ready_at: Dict[str, float] = {}
+        order = {step.id: i for i, step in enumerate(workflow.steps)}
+        
+        def release(step_id: str) -> None:
+            """Queue or skip a step whose dependencies all have results."""
+            step = step_map[step_id]
+            blocked = [
+                d for d in step.dependencies
+                if d in step_map and results[d].status != StepStatus.COMPLETED
+            ]
+            if blocked:
+                now = datetime.now(UTC)
+                results[step_id] = StepResult(
+                    step_id=step_id,
+                    status=StepStatus.SKIPPED,
+                    start_time=now,
+                    end_time=now,
+                    duration_ms=0.0,
+                    metadata={"blocked_by": blocked}
+                )
+                logger.info(f"Bağımlılık tamamlanmadı, adım atlandı: {step.name}")
+                finished(step_id)
+                return
+            rank = 0 if step_id == workflow.entry_point else 1
+            heapq.heappush(ready, (rank, -priority[step_id], order[step_id], step_id))
+            ready_at[step_id] = time.monotonic()
+        
+        def finished(step_id: str) -> None:
+            for dependent_id in dependents.get(step_id, ()):
+                unfinished[dependent_id] -= 1
+                if unfinished[dependent_id] == 0:
+                    release(dependent_id)
+        
+        for step_id, count in list(unfinished.items()):
+            if count == 0 and step_id not in results:
+                release(step_id)
+        
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+        self._running_steps[execution.id] = running
+        action_running: Dict[str, int] = defaultdict(int)
+        launched_at: Dict[str, float] = {}
+        
+        try:
+            while True:
+                if execution.status == WorkflowStatus.RUNNING:
+                    deferred = []
+                    while ready and len(running) < options.parallel_limit:
+                        entry = heapq.heappop(ready)
+                        step = step_map[entry[-1]]
+                        limit = options.action_limits.get(step.action) if step.action else None
+                        if limit is not None and action_running[step.action] >= max(1, limit):
+                            deferred.append(entry)
+                            continue
+                        
+                        launched_at[step.id] = time.monotonic()
+                        if step.action:
+                            action_running[step.action] += 1
+                        execution.current_step = step.id
+                        task = asyncio.ensure_future(self.step_executor.execute(
+                            step, execution.input_data, execution.context, options
+                        ))
+                        running[task] = step
+                    for entry in deferred:
+                        heapq.heappush(ready, entry)
                 
-                # Determine entry point
-                if workflow.entry_point:
-                    entry_step = next((s for s in sorted_steps if s.id == workflow.entry_point), None)
-                    if entry_step:
-                        sorted_steps = [entry_step] + [s for s in sorted_steps if s.id != workflow.entry_point]
+                if not running:
+                    break
                 
-                # Execute steps
-                for step in sorted_steps:
-                    # Check if dependencies are satisfied
-                    deps_satisfied = all(
-                        dep_id in execution.step_results and 
-                        execution.step_results[dep_id].status == StepStatus.COMPLETED
-                        for dep_id in step.dependencies
-                    )
-                    
-                    if not deps_satisfied:
-                        logger.warning(f"Bağımlılıklar sağlanmadı, adım atlanıyor: {step.name}")
-                        continue
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    if step.action:
+                        action_running[step.action] -= 1
                     
-                    execution.current_step = step.id
-                    
-                    # Execute step
-                    result = await self.step_executor.execute(
-                        step,
-                        input_data,
-                        execution.context,
-                        options
-                    )
-                    
-                    execution.step_results[step.id] = result
+                    if task.cancelled():
+                        now = datetime.now(UTC)
+                        result = StepResult(
+                            step_id=step.id,
+                            status=StepStatus.CANCELLED,
+                            start_time=now,
+                            end_time=now
+                        )
+                    else:
+                        result = task.result()
+                    result.metadata["queue_ms"] = (launched_at[step.id] - ready_at[step.id]) * 1000
+                    results[step.id] = result
                     
                     # Update context with step output
                     if result.output:
                         execution.context[f"step_{step.id}_output"] = result.output
                     
                     # Handle step failure
-                    if result.status == StepStatus.FAILED:
-                        if step.error_handling == ErrorHandling.FAIL:
-                            execution.status = WorkflowStatus.FAILED
-                            execution.error = f"Adım başarısız: {step.name}"
-                            break
-                
-                # Execute success/failure handlers
-                if execution.status != WorkflowStatus.FAILED:
-                    execution.status = WorkflowStatus.COMPLETED
-                    if workflow.on_success:
-                        await self._execute_handlers(workflow.on_success, execution, options)
-                else:
-                    if workflow.on_failure:
-                        await self._execute_handlers(workflow.on_failure, execution, options)
-                
-                # Calculate duration
-                execution.end_time = datetime.now(UTC)
-                execution.duration_ms = (execution.end_time - execution.start_time).total_seconds() * 1000
-                
-                # Record metrics
-                workflow_counter.labels(
-                    operation="execute",
-                    status="success" if execution.status == WorkflowStatus.COMPLETED else "error"
-                ).inc()
-                
-                workflow_duration_histogram.labels(
-                    workflow=workflow.name
-                ).observe(execution.duration_ms)
-                
-                logger.info(
-                    f"İş akışı tamamlandı: {workflow.name}, "
-                    f"Durum: {execution.status}, "
-                    f"Süre: {execution.duration_ms:.2f}ms"
-                )
-                
-                return execution
-                
-            except Exception as e:
-                logger.error(f"İş akışı hatası {workflow.name}: {e}")
-                execution.status = WorkflowStatus.FAILED
-                execution.error = str(e)
-                execution.end_time = datetime.now(UTC)
-                execution.duration_ms = (execution.end_time - execution.start_time).total_seconds() * 1000
+                    if (
+                        result.status == StepStatus.FAILED
+                        and step.error_handling == ErrorHandling.FAIL
+                        and execution.status != WorkflowStatus.FAILED
+                    ):
+                        execution.status = WorkflowStatus.FAILED
+                        execution.error = f"Adım başarısız: {step.name}"
+                    
+                    finished(step.id)
                 
-                workflow_counter.labels(
-                    operation="execute",
-                    status="error"
-                ).inc()
+                if execution.status in (WorkflowStatus.FAILED, WorkflowStatus.CANCELLED):
+                    for task in running:
+                        task.cancel()
                 
-                return execution
+                if options.checkpoint_enabled and execution.status != WorkflowStatus.CANCELLED:
+                    await self.state_store.save(workflow, execution, options)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+    
+    def _chain_lengths(self, workflow: Workflow) -> Dict[str, int]:
+        """Number of steps on the longest chain from each step to a sink."""
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for step in workflow.steps:
+            for dep_id in step.dependencies:
+                dependents[dep_id].append(step.id)
+        
+        lengths: Dict[str, int] = {}
+        for step in reversed(self.topological_sort(workflow.steps)):
+            lengths[step.id] = 1 + max(
+                (lengths[d] for d in dependents[step.id] if d in lengths), default=0
+            )
+        return lengths
+    
+    def critical_path(
+        self,
+        workflow: Workflow,
+        step_results: Dict[str, StepResult]
+    ) -> Tuple[List[str], float]:
+        """
+        Longest chain of dependent steps by measured run time.
+        
+        Returns:
+            Step IDs from first to last and the chain's total ``duration_ms``
+        """
+        cost: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        
+        for step in self.topological_sort(workflow.steps):
+            result = step_results.get(step.id)
+            if result is None:
+                continue
+            best = max(
+                (d for d in step.dependencies if d in cost),
+                key=cost.__getitem__,
+                default=None
+            )
+            previous[step.id] = best
+            cost[step.id] = (result.duration_ms or 0.0) + (cost[best] if best else 0.0)
+        
+        if not cost:
+            return [], 0.0
+        
+        step_id: Optional[str] = max(cost, key=cost.__getitem__)
+        total = cost[step_id]
+        path = []
+        while step_id is not None:
+            path.append(step_id)
+            step_id = previous[step_id]
+        return path[::-1], total
     
     async def _execute_handlers(
         self,
@@ -875,7 +1158,12 @@ class WorkflowEngine:
         return self.executions.get(execution_id)
     
     async def pause_execution(self, execution_id: str) -> bool:
-        """Pause workflow execution."""
+        """
+        Pause workflow execution.
+        
+        No new steps are started; running steps finish and their results
+        are checkpointed before ``execute_workflow`` returns.
+        """
         execution = self.executions.get(execution_id)
         if execution and execution.status == WorkflowStatus.RUNNING:
             execution.status = WorkflowStatus.PAUSED
@@ -884,21 +1172,68 @@ class WorkflowEngine:
         return False
     
     async def resume_execution(self, execution_id: str) -> bool:
-        """Resume workflow execution."""
+        """
+        Resume workflow execution in the background.
+        
+        An execution unknown to this engine, e.g. after a process restart,
+        is loaded from its checkpoint; one still marked running there was
+        interrupted and is resumed too. Finished steps are kept and the rest
+        are scheduled; ``wait_for_execution`` returns the final state.
+        """
         execution = self.executions.get(execution_id)
-        if execution and execution.status == WorkflowStatus.PAUSED:
-            execution.status = WorkflowStatus.RUNNING
-            logger.info(f"İş akışı devam ettirildi: {execution_id}")
-            # TODO: Implement actual resume logic
-            return True
-        return False
+        
+        if execution is None:
+            state = await self.state_store.load(execution_id)
+            if state is None:
+                return False
+            workflow, execution, options = state
+            if execution.status not in (WorkflowStatus.PAUSED, WorkflowStatus.RUNNING):
+                return False
+            self.workflows.setdefault(workflow.id, workflow)
+            self.executions[execution_id] = execution
+            self._execution_options[execution_id] = options
+        elif execution.status != WorkflowStatus.PAUSED:
+            return False
+        else:
+            workflow = self.workflows.get(execution.workflow_id)
+            options = self._execution_options.get(execution_id) or ExecutionOptions()
+            if workflow is None:
+                state = await self.state_store.load(execution_id)
+                if state is None:
+                    return False
+                workflow = state[0]
+        
+        execution.status = WorkflowStatus.RUNNING
+        logger.info(f"İş akışı devam ettirildi: {execution_id}")
+        
+        # A scheduler still draining steps after the pause picks up again by itself
+        if execution_id not in self._active:
+            self._resume_tasks[execution_id] = asyncio.create_task(
+                self._run_execution(workflow, execution, options)
+            )
+        return True
+    
+    async def wait_for_execution(self, execution_id: str) -> Optional[WorkflowExecution]:
+        """Wait for a resumed execution to finish or pause again."""
+        task = self._resume_tasks.get(execution_id)
+        if task is not None:
+            try:
+                await task
+            finally:
+                if task.done():
+                    self._resume_tasks.pop(execution_id, None)
+        return self.executions.get(execution_id)
     
     async def cancel_execution(self, execution_id: str) -> bool:
-        """Cancel workflow execution."""
+        """Cancel workflow execution and its running steps."""
         execution = self.executions.get(execution_id)
         if execution and execution.status in [WorkflowStatus.RUNNING, WorkflowStatus.PAUSED]:
             execution.status = WorkflowStatus.CANCELLED
             execution.end_time = datetime.now(UTC)
+            for task in self._running_steps.get(execution_id, {}):
+                task.cancel()
+            if execution_id not in self._active:
+                await self.state_store.delete(execution_id)
             logger.info(f"İş akışı iptal edildi: {execution_id}")
             return True
         return False
\ No newline at end of file
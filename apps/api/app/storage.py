@@ -6,12 +6,14 @@ from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 
-import boto3
 import structlog
 
 from .config import settings
+from .core.lazy_loading import lazy_module
 from .services.s3 import get_s3_service
 
+boto3 = lazy_module("boto3")
+
 logger = structlog.get_logger(__name__)
 
 
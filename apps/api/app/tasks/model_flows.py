@@ -37,6 +37,7 @@ from ..core.database import SessionLocal
 from ..core.logging import get_logger
 from ..core.telemetry import create_span
 from ..core import metrics
+from ..core.cache import CacheFlowType
 from ..middleware.correlation_middleware import get_correlation_id
 from ..models.job import Job
 from ..models.enums import JobStatus, JobType
@@ -45,6 +46,7 @@ from ..services.ai_adapter import ai_adapter, AIException
 from ..services.s3_service import s3_service
 from ..core.security_validator import security_validator, SecurityValidationError
 from .utils import TaskResult, update_job_status, ensure_idempotency, get_turkish_term
+from .model_result_cache import ARTEFACT_BUCKET, file_sha256, get_or_build_model_result, link_artefacts
 
 logger = get_logger(__name__)
 task_logger = get_task_logger(__name__)
@@ -139,153 +141,173 @@ def generate_model_from_prompt(
             # Validate inputs
             warnings = validate_model_inputs(canonical_params)
             
-            # Progress update - AI generation
-            update_job_status(job_id, JobStatus.RUNNING, progress=20)
-            
-            # Call AI adapter for script generation
-            logger.info("Calling AI adapter for script generation", prompt=prompt[:100])
-            
-            # Run async AI adapter in sync context using proper async_to_sync
-            script_response = async_to_sync(ai_adapter.suggest_params)(
-                prompt=prompt,
-                context=canonical_params.get("context", {}),
-                user_id=str(user_id),
-                timeout=30,
-                retries=2
+            def build() -> Dict[str, Any]:
+                # Progress update - AI generation
+                update_job_status(job_id, JobStatus.RUNNING, progress=20)
+                
+                # Call AI adapter for script generation
+                logger.info("Calling AI adapter for script generation", prompt=prompt[:100])
+                
+                # Run async AI adapter in sync context using proper async_to_sync
+                script_response = async_to_sync(ai_adapter.suggest_params)(
+                    prompt=prompt,
+                    context=canonical_params.get("context", {}),
+                    user_id=str(user_id),
+                    timeout=30,
+                    retries=2
+                )
+                
+                # Validate generated script
+                try:
+                    security_validator.validate_script(script_response.script_py)
+                except SecurityValidationError as e:
+                    raise ValueError(f"Generated script failed security validation: {e}")
+                
+                # Progress update - Document creation
+                update_job_status(job_id, JobStatus.RUNNING, progress=40)
+                
+                # Create FreeCAD document
+                doc_metadata = document_manager.create_document(
+                    job_id=job_id,
+                    author=f"user_{user_id}",
+                    description=f"AI-generated model from prompt: {prompt[:50]}",
+                    properties={
+                        "generation_type": "ai_prompt",
+                        "prompt": prompt,
+                        "ai_model": script_response.dict()
+                    }
+                )
+                
+                # Acquire document lock
+                with document_manager.document_lock(doc_metadata.document_id, f"user_{user_id}"):
+                    # Start transaction
+                    with document_manager.transaction(doc_metadata.document_id):
+                        # Progress update - Script execution  
+                        update_job_status(job_id, JobStatus.RUNNING, progress=60)
+                        
+                        # Execute FreeCAD script
+                        logger.info("Executing generated FreeCAD script")
+                        
+                        # Create temp script file
+                        with tempfile.NamedTemporaryFile(
+                            mode='w',
+                            suffix='.py',
+                            delete=False,
+                            encoding='utf-8'
+                        ) as script_file:
+                            script_file.write(script_response.script_py)
+                            script_path = script_file.name
+                        
+                        try:
+                            # Execute script (implementation depends on FreeCAD service)
+                            execution_result = {
+                                "script_executed": True,
+                                "parameters": script_response.parameters,
+                                "warnings": script_response.warnings + warnings
+                            }
+                            
+                            # Progress update - File generation
+                            update_job_status(job_id, JobStatus.RUNNING, progress=80)
+                            
+                            # Save document  
+                            save_path = document_manager.save_document(
+                                doc_metadata.document_id,
+                                owner_id=f"user_{user_id}"
+                            )
+                            
+                            # Upload to S3
+                            with open(save_path, 'rb') as f:
+                                s3_key, presigned_response = s3_service.upload_file_stream(
+                                    file_stream=f,
+                                    bucket=ARTEFACT_BUCKET,
+                                    job_id=job_id,
+                                    filename="model.FCStd"
+                                )
+                                s3_url = presigned_response.url
+                            
+                            # Create artefacts list
+                            artefacts = [
+                                {
+                                    "type": "freecad_model",
+                                    "filename": "model.FCStd",
+                                    "bucket": ARTEFACT_BUCKET,
+                                    "s3_key": s3_key,
+                                    "s3_url": s3_url,
+                                    "size_bytes": os.path.getsize(save_path) if os.path.exists(save_path) else 0,
+                                    "sha256": file_sha256(save_path) if os.path.exists(save_path) else None
+                                },
+                                {
+                                    "type": "generated_script", 
+                                    "filename": "generation_script.py",
+                                    "content": script_response.script_py,
+                                    "parameters": script_response.parameters
+                                }
+                            ]
+                            
+                            return {
+                                "artefacts": artefacts,
+                                "data": {
+                                    "model_generated": True,
+                                    "document_id": doc_metadata.document_id,
+                                    "script_response": script_response.dict(),
+                                    "execution_result": execution_result
+                                },
+                                "warnings": warnings + script_response.warnings
+                            }
+                            
+                        finally:
+                            # Clean up temp script file
+                            if os.path.exists(script_path):
+                                os.unlink(script_path)
+            
+            # Same prompt on the same engine: link the earlier job's artefacts
+            payload, cache_hit = get_or_build_model_result(
+                CacheFlowType.PROMPT, job_id, canonical_params, build
             )
+            artefacts = link_artefacts(payload) if cache_hit else payload["artefacts"]
             
-            # Validate generated script
-            try:
-                security_validator.validate_script(script_response.script_py)
-            except SecurityValidationError as e:
-                raise ValueError(f"Generated script failed security validation: {e}")
+            # Create result
+            result = TaskResult(
+                success=True,
+                data={
+                    **payload["data"],
+                    "cache_hit": cache_hit,
+                    "source_job_id": payload.get("source_job_id", job_id),
+                    "generation_time": time.time() - start_time
+                },
+                warnings=payload["warnings"],
+                artefacts=artefacts,
+                progress=100
+            )
             
-            # Progress update - Document creation
-            update_job_status(job_id, JobStatus.RUNNING, progress=40)
+            # Update job to success
+            update_job_status(
+                job_id,
+                JobStatus.COMPLETED,
+                progress=100,
+                output_data=result.to_dict()
+            )
             
-            # Create FreeCAD document
-            doc_metadata = document_manager.create_document(
+            logger.info(
+                "AI-driven model generation completed successfully",
                 job_id=job_id,
-                author=f"user_{user_id}",
-                description=f"AI-generated model from prompt: {prompt[:50]}",
-                properties={
-                    "generation_type": "ai_prompt",
-                    "prompt": prompt,
-                    "ai_model": script_response.dict()
-                }
+                request_id=request_id,
+                cache_hit=cache_hit,
+                generation_time=time.time() - start_time,
+                artefacts_count=len(artefacts)
             )
             
-            # Acquire document lock
-            with document_manager.document_lock(doc_metadata.document_id, f"user_{user_id}"):
-                # Start transaction
-                with document_manager.transaction(doc_metadata.document_id):
-                    # Progress update - Script execution  
-                    update_job_status(job_id, JobStatus.RUNNING, progress=60)
-                    
-                    # Execute FreeCAD script
-                    logger.info("Executing generated FreeCAD script")
-                    
-                    # Create temp script file
-                    with tempfile.NamedTemporaryFile(
-                        mode='w',
-                        suffix='.py',
-                        delete=False,
-                        encoding='utf-8'
-                    ) as script_file:
-                        script_file.write(script_response.script_py)
-                        script_path = script_file.name
-                    
-                    try:
-                        # Execute script (implementation depends on FreeCAD service)
-                        execution_result = {
-                            "script_executed": True,
-                            "parameters": script_response.parameters,
-                            "warnings": script_response.warnings + warnings
-                        }
-                        
-                        # Progress update - File generation
-                        update_job_status(job_id, JobStatus.RUNNING, progress=80)
-                        
-                        # Save document  
-                        save_path = document_manager.save_document(
-                            doc_metadata.document_id,
-                            owner_id=f"user_{user_id}"
-                        )
-                        
-                        # Upload to S3
-                        with open(save_path, 'rb') as f:
-                            s3_key, presigned_response = s3_service.upload_file_stream(
-                                file_stream=f,
-                                bucket="artefacts",
-                                job_id=job_id,
-                                filename="model.FCStd"
-                            )
-                            s3_url = presigned_response.url
-                        
-                        # Create artefacts list
-                        artefacts = [
-                            {
-                                "type": "freecad_model",
-                                "filename": "model.FCStd",
-                                "s3_key": s3_key,
-                                "s3_url": s3_url,
-                                "size_bytes": os.path.getsize(save_path) if os.path.exists(save_path) else 0
-                            },
-                            {
-                                "type": "generated_script", 
-                                "filename": "generation_script.py",
-                                "content": script_response.script_py,
-                                "parameters": script_response.parameters
-                            }
-                        ]
-                        
-                        # Create result
-                        result = TaskResult(
-                            success=True,
-                            data={
-                                "model_generated": True,
-                                "document_id": doc_metadata.document_id,
-                                "script_response": script_response.dict(),
-                                "execution_result": execution_result,
-                                "generation_time": time.time() - start_time
-                            },
-                            warnings=warnings + script_response.warnings,
-                            artefacts=artefacts,
-                            progress=100
-                        )
-                        
-                        # Update job to success
-                        update_job_status(
-                            job_id,
-                            JobStatus.COMPLETED,
-                            progress=100,
-                            output_data=result.to_dict()
-                        )
-                        
-                        logger.info(
-                            "AI-driven model generation completed successfully",
-                            job_id=job_id,
-                            request_id=request_id,
-                            generation_time=time.time() - start_time,
-                            artefacts_count=len(artefacts)
-                        )
-                        
-                        # Record metrics
-                        metrics.freecad_model_generations_total.labels(
-                            type="ai_prompt",
-                            status="success"
-                        ).inc()
-                        
-                        metrics.freecad_model_generation_duration.labels(
-                            type="ai_prompt"
-                        ).observe(time.time() - start_time)
-                        
-                        return result.to_dict()
-                        
-                    finally:
-                        # Clean up temp script file
-                        if os.path.exists(script_path):
-                            os.unlink(script_path)
+            # Record metrics
+            metrics.freecad_model_generations_total.labels(
+                type="ai_prompt",
+                status="success"
+            ).inc()
+            
+            metrics.freecad_model_generation_duration.labels(
+                type="ai_prompt"
+            ).observe(time.time() - start_time)
+            
+            return result.to_dict()
                             
         except (AIException, SecurityValidationError, ValueError) as e:
             # Non-retryable errors
@@ -413,94 +435,114 @@ def generate_model_from_params(
             # Progress update
             update_job_status(job_id, JobStatus.RUNNING, progress=30)
             
-            # Create document
-            doc_metadata = document_manager.create_document(
+            def build() -> Dict[str, Any]:
+                # Create document
+                doc_metadata = document_manager.create_document(
+                    job_id=job_id,
+                    author=f"user_{user_id}",
+                    description=f"Parametric {model_type} model",
+                    properties={
+                        "generation_type": "parametric",
+                        "model_type": model_type,
+                        "parameters": canonical_params
+                    }
+                )
+                
+                with document_manager.document_lock(doc_metadata.document_id, f"user_{user_id}"):
+                    with document_manager.transaction(doc_metadata.document_id):
+                        
+                        # Progress update
+                        update_job_status(job_id, JobStatus.RUNNING, progress=60)
+                        
+                        # Generate parametric model (implementation depends on model type)
+                        model_result = _generate_parametric_model(
+                            model_type, dimensions, features, canonical_params
+                        )
+                        
+                        # Progress update
+                        update_job_status(job_id, JobStatus.RUNNING, progress=80)
+                        
+                        # Save and upload
+                        save_path = document_manager.save_document(
+                            doc_metadata.document_id,
+                            owner_id=f"user_{user_id}"
+                        )
+                        
+                        with open(save_path, 'rb') as f:
+                            s3_key, presigned_response = s3_service.upload_file_stream(
+                                file_stream=f,
+                                bucket=ARTEFACT_BUCKET,
+                                job_id=job_id,
+                                filename="parametric_model.FCStd"
+                            )
+                            s3_url = presigned_response.url
+                        
+                        artefacts = [
+                            {
+                                "type": "parametric_model",
+                                "filename": "parametric_model.FCStd", 
+                                "bucket": ARTEFACT_BUCKET,
+                                "s3_key": s3_key,
+                                "s3_url": s3_url,
+                                "model_type": model_type,
+                                "size_bytes": os.path.getsize(save_path) if os.path.exists(save_path) else 0,
+                                "sha256": file_sha256(save_path) if os.path.exists(save_path) else None
+                            }
+                        ]
+                        
+                        return {
+                            "artefacts": artefacts,
+                            "data": {
+                                "model_generated": True,
+                                "document_id": doc_metadata.document_id,
+                                "model_type": model_type,
+                                "parameters_applied": dimensions,
+                                "features_created": len(features)
+                            },
+                            "warnings": warnings
+                        }
+            
+            # Identical parameters on the same engine: link the earlier job's artefacts
+            payload, cache_hit = get_or_build_model_result(
+                CacheFlowType.PARAMS, job_id, canonical_params, build
+            )
+            artefacts = link_artefacts(payload) if cache_hit else payload["artefacts"]
+            
+            result = TaskResult(
+                success=True,
+                data={
+                    **payload["data"],
+                    "cache_hit": cache_hit,
+                    "source_job_id": payload.get("source_job_id", job_id),
+                    "generation_time": time.time() - start_time
+                },
+                warnings=payload["warnings"],
+                artefacts=artefacts,
+                progress=100
+            )
+            
+            update_job_status(
+                job_id,
+                JobStatus.COMPLETED,
+                progress=100,
+                output_data=result.to_dict()
+            )
+            
+            logger.info(
+                "Parametric model generation completed",
                 job_id=job_id,
-                author=f"user_{user_id}",
-                description=f"Parametric {model_type} model",
-                properties={
-                    "generation_type": "parametric",
-                    "model_type": model_type,
-                    "parameters": canonical_params
-                }
+                request_id=request_id,
+                model_type=model_type,
+                cache_hit=cache_hit,
+                generation_time=time.time() - start_time
             )
             
-            with document_manager.document_lock(doc_metadata.document_id, f"user_{user_id}"):
-                with document_manager.transaction(doc_metadata.document_id):
-                    
-                    # Progress update
-                    update_job_status(job_id, JobStatus.RUNNING, progress=60)
-                    
-                    # Generate parametric model (implementation depends on model type)
-                    model_result = _generate_parametric_model(
-                        model_type, dimensions, features, canonical_params
-                    )
-                    
-                    # Progress update
-                    update_job_status(job_id, JobStatus.RUNNING, progress=80)
-                    
-                    # Save and upload
-                    save_path = document_manager.save_document(
-                        doc_metadata.document_id,
-                        owner_id=f"user_{user_id}"
-                    )
-                    
-                    with open(save_path, 'rb') as f:
-                        s3_key, presigned_response = s3_service.upload_file_stream(
-                            file_stream=f,
-                            bucket="artefacts",
-                            job_id=job_id,
-                            filename="parametric_model.FCStd"
-                        )
-                        s3_url = presigned_response.url
-                    
-                    artefacts = [
-                        {
-                            "type": "parametric_model",
-                            "filename": "parametric_model.FCStd", 
-                            "s3_key": s3_key,
-                            "s3_url": s3_url,
-                            "model_type": model_type,
-                            "size_bytes": os.path.getsize(save_path) if os.path.exists(save_path) else 0
-                        }
-                    ]
-                    
-                    result = TaskResult(
-                        success=True,
-                        data={
-                            "model_generated": True,
-                            "document_id": doc_metadata.document_id,
-                            "model_type": model_type,
-                            "parameters_applied": dimensions,
-                            "features_created": len(features),
-                            "generation_time": time.time() - start_time
-                        },
-                        warnings=warnings,
-                        artefacts=artefacts,
-                        progress=100
-                    )
-                    
-                    update_job_status(
-                        job_id,
-                        JobStatus.COMPLETED,
-                        progress=100,
-                        output_data=result.to_dict()
-                    )
-                    
-                    logger.info(
-                        "Parametric model generation completed",
-                        job_id=job_id,
-                        request_id=request_id,
-                        model_type=model_type,
-                        generation_time=time.time() - start_time
-                    )
-                    
-                    metrics.freecad_model_generations_total.labels(
-                        type="parametric",
-                        status="success"
-                    ).inc()
-                    
-                    return result.to_dict()
+            metrics.freecad_model_generations_total.labels(
+                type="parametric",
+                status="success"
+            ).inc()
+            
+            return result.to_dict()
                     
         except (ConnectionError, TimeoutError, DocumentException) as e:
             # Re-raise retryable exceptions for Celery to handle
@@ -0,0 +1,180 @@
+"""
+Task 7.13 - Content-Addressed Model Result Cache
+
+Identical parametric or prompt jobs produce identical artefacts, so a job
+whose canonical parameters and engine fingerprint match an earlier build
+links that build's uploaded artefacts instead of running FreeCAD again:
+- Key: ``Canonicalizer.normalize_json(canonical_params)`` under the
+  CacheManager key scheme, which already embeds the EngineFingerprint
+- Value: the artefact set (S3 keys, SHA-256s, sizes) plus result data
+- Concurrent identical jobs build once through ``CacheManager.get_or_compute``
+  (in-process coalescing and the Redis singleflight lock)
+- Linked artefacts get fresh presigned URLs; entries whose objects have
+  been removed from storage are dropped and rebuilt
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from ..core import metrics
+from ..core.cache import CacheFlowType, CacheManager, Canonicalizer, get_cache_manager
+from ..core.environment import environment as settings
+from ..core.logging import get_logger
+from ..services.s3_service import s3_service
+
+logger = get_logger(__name__)
+
+MODEL_RESULT_ARTIFACT = "model_result"
+ARTEFACT_BUCKET = "artefacts"
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Label values shared with freecad_model_generations_total
+GENERATION_TYPES = {
+    CacheFlowType.PROMPT: "ai_prompt",
+    CacheFlowType.PARAMS: "parametric",
+}
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_or_build_model_result(
+    flow_type: CacheFlowType,
+    job_id: str,
+    canonical_params: Dict[str, Any],
+    build: Callable[[], Dict[str, Any]],
+    cache_manager: Optional[CacheManager] = None
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Return the cached result for these parameters or build and cache it.
+
+    Args:
+        flow_type: CacheFlowType.PROMPT or CacheFlowType.PARAMS
+        job_id: Job being served; recorded as the source of a fresh build
+        canonical_params: Normalized job parameters
+        build: Runs the FreeCAD pipeline and returns a payload with
+            ``artefacts``, ``data`` and ``warnings``; it runs on the calling
+            thread
+        cache_manager: Defaults to the process-wide CacheManager
+
+    Returns:
+        Tuple of (payload, hit). On a hit the payload belongs to an earlier
+        job; pass its artefacts through ``link_artefacts`` before returning them.
+    """
+    generation_type = GENERATION_TYPES[flow_type]
+    if not settings.MODEL_RESULT_CACHE_ENABLED:
+        metrics.model_result_cache_requests_total.labels(type=generation_type, result="bypass").inc()
+        return build(), False
+
+    manager = cache_manager or get_cache_manager()
+    canonical = Canonicalizer.normalize_json(canonical_params, is_prompt=flow_type is CacheFlowType.PROMPT)
+    built = False
+
+    def build_payload() -> Dict[str, Any]:
+        nonlocal built
+        built = True
+        payload = build()
+        payload["source_job_id"] = job_id
+        payload["created_at"] = datetime.now(timezone.utc).isoformat()
+        return payload
+
+    async def compute() -> Dict[str, Any]:
+        # thread_sensitive: FreeCAD work stays on the Celery task's thread
+        return await sync_to_async(build_payload)()
+
+    for _ in range(2):
+        try:
+            payload = async_to_sync(manager.get_or_compute)(
+                flow_type,
+                canonical,
+                compute,
+                artifact_type=MODEL_RESULT_ARTIFACT,
+                ttl=settings.MODEL_RESULT_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            if built:
+                raise
+            # The cache must never fail a job it could have built
+            logger.warning(
+                "Model result cache unavailable, building without it",
+                job_id=job_id,
+                flow=flow_type.value,
+                error=str(e)
+            )
+            metrics.model_result_cache_requests_total.labels(type=generation_type, result="bypass").inc()
+            return build_payload(), False
+
+        if built:
+            metrics.model_result_cache_requests_total.labels(type=generation_type, result="miss").inc()
+            return payload, False
+
+        if _artefacts_available(payload):
+            metrics.model_result_cache_requests_total.labels(type=generation_type, result="hit").inc()
+            logger.info(
+                "Model result cache hit",
+                job_id=job_id,
+                flow=flow_type.value,
+                source_job_id=payload.get("source_job_id")
+            )
+            return payload, True
+        logger.warning(
+            "Cached model artefacts missing from storage, rebuilding",
+            job_id=job_id,
+            source_job_id=payload.get("source_job_id")
+        )
+        async_to_sync(manager.delete)(flow_type, canonical, MODEL_RESULT_ARTIFACT)
+
+    # The stale entry came back after it was invalidated (e.g. re-cached by a
+    # worker that still held it); build here and overwrite it
+    payload = build_payload()
+    try:
+        async_to_sync(manager.set)(
+            flow_type,
+            canonical,
+            payload,
+            artifact_type=MODEL_RESULT_ARTIFACT,
+            ttl=settings.MODEL_RESULT_CACHE_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(
+            "Could not cache rebuilt model result",
+            job_id=job_id,
+            flow=flow_type.value,
+            error=str(e)
+        )
+    metrics.model_result_cache_requests_total.labels(type=generation_type, result="miss").inc()
+    return payload, False
+
+
+def link_artefacts(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Copy a cached artefact set with fresh presigned download URLs."""
+    artefacts = copy.deepcopy(payload.get("artefacts", []))
+    for artefact in artefacts:
+        if artefact.get("s3_key"):
+            artefact["s3_url"] = s3_service.generate_presigned_url(
+                bucket=artefact.get("bucket", ARTEFACT_BUCKET),
+                object_key=artefact["s3_key"]
+            ).url
+    return artefacts
+
+
+def _artefacts_available(payload: Dict[str, Any]) -> bool:
+    """Check that every stored artefact of a cached result still exists."""
+    for artefact in payload.get("artefacts", []):
+        if artefact.get("s3_key") and s3_service.get_object_info(
+            artefact.get("bucket", ARTEFACT_BUCKET), artefact["s3_key"]
+        ) is None:
+            return False
+    return True
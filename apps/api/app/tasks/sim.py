@@ -8,9 +8,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Tuple
 
-import numpy as np
-
 from .worker import celery_app
+from ..core.lazy_loading import lazy_module
 from ..settings import app_settings as appset
 from ..config import settings
 from ..db import db_session
@@ -27,6 +26,8 @@ from opentelemetry import trace
 
 logger = get_logger(__name__)
 
+np = lazy_module("numpy")
+
 
 def load_inputs(assembly_job_id: int, gcode_job_id: int | None) -> Tuple[Path, str]:
     with db_session() as s:
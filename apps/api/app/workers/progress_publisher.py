@@ -0,0 +1,249 @@
+"""
+Task 7.16: Background Progress Publisher for Celery Workers
+
+One publisher per worker process replaces the event loop and Redis
+connection that used to be created for every progress tick:
+- A single flusher thread owns a pooled, synchronous Redis client
+- Updates are buffered per job; consecutive non-milestone updates for a
+  job coalesce into the latest one
+- Every flush pipelines the XADDs of all buffered events to their job
+  progress streams (RedisProgressPubSub.queue_progress_append) in one round
+  trip; Redis assigns the event IDs
+- Milestones are never coalesced or dropped, and wake the flusher at once
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import redis
+from celery.signals import worker_process_shutdown
+
+from ..core.environment import environment as settings
+from ..core.logging import get_logger
+from ..core.redis_pubsub import RedisProgressPubSub
+from ..schemas.progress import ProgressMessageV2
+
+logger = get_logger(__name__)
+
+
+class BackgroundProgressPublisher:
+    """
+    Buffers progress messages and publishes them from one background thread.
+
+    ``submit`` never touches the network. When ``max_pending`` messages are
+    buffered, further non-milestone updates for jobs with nothing pending
+    are dropped (they would be superseded anyway); updates for jobs already
+    pending replace their predecessor and milestones are always accepted.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        flush_interval_seconds: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        client_factory: Optional[Callable[[], Any]] = None
+    ):
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.flush_interval_seconds = (
+            flush_interval_seconds if flush_interval_seconds is not None
+            else settings.PROGRESS_PUBLISH_FLUSH_INTERVAL_MS / 1000
+        )
+        self.max_pending = max_pending or settings.PROGRESS_PUBLISH_MAX_PENDING
+        self._client_factory = client_factory
+
+        # job_id -> buffered messages in event order; only the last entry
+        # of a job may be a non-milestone
+        self._pending: Dict[int, List[ProgressMessageV2]] = {}
+        self._pending_count = 0
+        self._in_flight = 0
+        # Set by milestones, flush() and close(): publish without waiting
+        self._urgent = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._client = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._stats = {"submitted": 0, "coalesced": 0, "dropped": 0, "published": 0, "flushes": 0, "errors": 0}
+
+    def submit(self, job_id: int, progress: ProgressMessageV2) -> bool:
+        """
+        Buffer a progress message for publishing.
+
+        Returns:
+            False if the update was dropped because the buffer is full
+        """
+        if self._closed:
+            return False
+        self._ensure_started()
+        progress.job_id = job_id
+
+        with self._condition:
+            self._stats["submitted"] += 1
+            queued = self._pending.get(job_id)
+            if queued and not queued[-1].milestone and not progress.milestone:
+                queued[-1] = progress
+                self._stats["coalesced"] += 1
+                return True
+
+            if not progress.milestone and self._pending_count >= self.max_pending:
+                self._stats["dropped"] += 1
+                return False
+
+            self._pending.setdefault(job_id, []).append(progress)
+            self._pending_count += 1
+            if progress.milestone:
+                self._urgent = True
+            if progress.milestone or self._pending_count == 1:
+                self._condition.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far has been published or failed."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._urgent = True
+            self._condition.notify_all()
+            while self._pending_count or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining if remaining is not None else 0.05)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Publish what is buffered and stop the flusher thread."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._urgent = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {**self._stats, "pending": self._pending_count}
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid:
+            return
+        if self._pid is not None and self._pid != pid:
+            # Forked child (Celery prefork): the parent's thread, lock and sockets are not ours
+            self._condition = threading.Condition()
+            self._pending, self._pending_count, self._in_flight = {}, 0, 0
+            self._urgent = False
+            self._thread = None
+            self._client = None
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name="progress-publisher", daemon=True)
+            self._thread.start()
+
+    def _get_client(self):
+        if self._client is None:
+            if self._client_factory is not None:
+                self._client = self._client_factory()
+            else:
+                self._client = redis.Redis(
+                    connection_pool=redis.ConnectionPool.from_url(
+                        self.redis_url,
+                        max_connections=2,
+                        socket_keepalive=True,
+                        socket_connect_timeout=settings.REDIS_CONNECTION_TIMEOUT
+                    )
+                )
+        return self._client
+
+    def _take_batch(self) -> List[Tuple[int, List[ProgressMessageV2]]]:
+        """Wait for the next flush and take everything buffered (lock held by caller)."""
+        self._condition.wait_for(lambda: self._pending_count or self._closed)
+        # Give rapid updates a chance to coalesce
+        self._condition.wait_for(lambda: self._urgent, self.flush_interval_seconds)
+        self._urgent = False
+        batch = list(self._pending.items())
+        self._in_flight = self._pending_count
+        self._pending, self._pending_count = {}, 0
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._closed and not self._pending_count:
+                    return
+                batch = self._take_batch()
+            try:
+                if batch:
+                    self._publish_batch(batch)
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._condition.notify_all()
+
+    def _publish_batch(self, batch: List[Tuple[int, List[ProgressMessageV2]]]) -> None:
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            count = 0
+            for job_id, messages in batch:
+                RedisProgressPubSub.queue_progress_append(
+                    pipe, job_id, [progress.model_dump_json() for progress in messages]
+                )
+                count += len(messages)
+            pipe.execute()
+        except Exception as e:
+            self._client = None
+            self._requeue_milestones(batch)
+            with self._condition:
+                self._stats["errors"] += 1
+            logger.warning(f"Failed to publish progress batch: {e}")
+            return
+
+        with self._condition:
+            self._stats["published"] += count
+            self._stats["flushes"] += 1
+
+    def _requeue_milestones(self, batch: List[Tuple[int, List[ProgressMessageV2]]]) -> None:
+        """Put failed milestones back in front of anything submitted since."""
+        with self._condition:
+            for job_id, messages in batch:
+                milestones = [m for m in messages if m.milestone]
+                if not milestones or self._pending_count + len(milestones) > self.max_pending:
+                    continue
+                self._pending[job_id] = milestones + self._pending.get(job_id, [])
+                self._pending_count += len(milestones)
+        # Back off before the retry instead of spinning on a dead connection
+        time.sleep(self.flush_interval_seconds)
+
+
+_publisher: Optional[BackgroundProgressPublisher] = None
+_publisher_lock = threading.Lock()
+
+
+def get_progress_publisher() -> BackgroundProgressPublisher:
+    """Process-wide publisher; the flusher thread starts on first submit."""
+    global _publisher
+    if _publisher is None:
+        with _publisher_lock:
+            if _publisher is None:
+                _publisher = BackgroundProgressPublisher()
+                atexit.register(_publisher.close)
+    return _publisher
+
+
+@worker_process_shutdown.connect
+def close_progress_publisher(sender=None, **kwargs):
+    """Deliver buffered progress before the worker process exits."""
+    if _publisher is not None:
+        _publisher.close()
@@ -3,7 +3,8 @@ Task 7.16: Worker Progress Reporter
 
 This module provides progress reporting utilities for Celery workers:
 - Integration with Celery task update_state()
-- Progress publishing to Redis pub/sub
+- Progress publishing to Redis pub/sub through the per-process
+  background publisher (no event loop or connection per tick)
 - FreeCAD 1.1.0-specific progress events
 - Automatic context tracking
 - Error handling and retry logic
@@ -11,7 +12,6 @@ This module provides progress reporting utilities for Celery workers:
 
 from __future__ import annotations
 
-import asyncio
 import functools
 import time
 from collections.abc import Callable
@@ -23,7 +23,6 @@ from uuid import UUID, uuid4
 from celery import Task, current_task
 
 from ..core.logging import get_logger
-from ..core.redis_pubsub import redis_progress_pubsub
 from ..schemas.progress import (
     Assembly4Phase,
     DocumentPhase,
@@ -35,6 +34,7 @@ from ..schemas.progress import (
     ProgressMessageV2,
 )
 from ..services.progress_service import PHASE_MAPPINGS
+from .progress_publisher import get_progress_publisher
 
 logger = get_logger(__name__)
 
@@ -63,18 +63,6 @@ class WorkerProgressReporter:
         self._last_publish_time = 0
         self._throttle_interval = 0.5  # 500ms
 
-    def _handle_task_completion(self, future):
-        """
-        Handle async task completion and log errors.
-        
-        Args:
-            future: Asyncio future/task
-        """
-        try:
-            future.result()
-        except Exception as e:
-            logger.warning(f"Failed to publish progress: {e}", exc_info=True)
-
     def _get_job_id(self) -> int | None:
         """Get job ID from task context."""
         if not self.task:
@@ -97,7 +85,7 @@ class WorkerProgressReporter:
         return self._event_counter
 
     def _should_throttle(self, milestone: bool = False) -> bool:
-        """Check if update should be throttled."""
+        """Check if the Celery task state update should be throttled."""
         if milestone:
             return False
 
@@ -146,10 +134,6 @@ class WorkerProgressReporter:
             logger.warning("Cannot report progress: job_id not found")
             return
 
-        # Check throttling
-        if self._should_throttle(milestone):
-            return
-
         # Create progress message
         progress = ProgressMessageV2(
             job_id=job_id,
@@ -163,14 +147,7 @@ class WorkerProgressReporter:
             **kwargs
         )
 
-        # Update Celery state
-        self.update_celery_state(
-            state="PROGRESS",
-            meta=progress.model_dump()
-        )
-
-        # Publish to Redis using the common method
-        self._publish_async(job_id, progress)
+        self._emit(job_id, progress)
 
     @contextmanager
     def operation(
@@ -281,15 +258,7 @@ class WorkerProgressReporter:
             **kwargs
         )
 
-        # Update Celery state
-        self.update_celery_state(
-            state="PROGRESS",
-            meta=progress.model_dump()
-        )
-
-        # Publish to Redis using the common method
-        # Note: force parameter is set based on milestone from kwargs
-        self._publish_async(job_id, progress)
+        self._emit(job_id, progress)
 
     def report_freecad_document(
         self,
@@ -317,8 +286,7 @@ class WorkerProgressReporter:
             **kwargs
         )
 
-        self.update_celery_state("PROGRESS", progress.model_dump())
-        self._publish_async(job_id, progress)
+        self._emit(job_id, progress)
 
     def report_assembly4(
         self,
@@ -363,8 +331,7 @@ class WorkerProgressReporter:
         if constraints_total and constraints_total > 0:
             progress.progress_pct = min(100, int((constraints_resolved or 0) / constraints_total * 100))
 
-        self.update_celery_state("PROGRESS", progress.model_dump())
-        self._publish_async(job_id, progress)
+        self._emit(job_id, progress)
 
     def report_occt(
         self,
@@ -399,8 +366,7 @@ class WorkerProgressReporter:
         if shapes_total and shapes_total > 0:
             progress.progress_pct = min(100, int((shapes_done or 0) / shapes_total * 100))
 
-        self.update_celery_state("PROGRESS", progress.model_dump())
-        self._publish_async(job_id, progress)
+        self._emit(job_id, progress)
 
     def report_export(
         self,
@@ -434,34 +400,28 @@ class WorkerProgressReporter:
         if bytes_total and bytes_total > 0:
             progress.progress_pct = min(100, int((bytes_written or 0) / bytes_total * 100))
 
-        self.update_celery_state("PROGRESS", progress.model_dump())
+        self._emit(job_id, progress)
+
+    def _emit(self, job_id: int, progress: ProgressMessageV2) -> None:
+        """
+        Record a progress event.
+        
+        Every event is handed to the background publisher, which coalesces
+        rapid updates per job. The Celery task state is a polling fallback,
+        so it is only rewritten for milestones or once per throttle interval.
+        """
+        if not self._should_throttle(progress.milestone):
+            self.update_celery_state(
+                state="PROGRESS",
+                meta=progress.model_dump()
+            )
         self._publish_async(job_id, progress)
 
     def _publish_async(self, job_id: int, progress: ProgressMessageV2) -> None:
-        """Publish progress asynchronously."""
+        """Publish progress without blocking the task."""
         try:
-            # Try to get existing event loop first
-            try:
-                loop = asyncio.get_running_loop()
-                # If we have a running loop, schedule the coroutine with proper error handling
-                task = asyncio.create_task(
-                    redis_progress_pubsub.publish_progress(
-                        job_id,
-                        progress,
-                        force=progress.milestone
-                    )
-                )
-                # Add error callback to log failures
-                task.add_done_callback(self._handle_task_completion)
-            except RuntimeError:
-                # No running loop, use asyncio.run()
-                asyncio.run(
-                    redis_progress_pubsub.publish_progress(
-                        job_id,
-                        progress,
-                        force=progress.milestone
-                    )
-                )
+            if not get_progress_publisher().submit(job_id, progress):
+                logger.debug(f"Progress buffer full, dropped update for job {job_id}")
         except Exception as e:
             logger.warning(f"Failed to publish progress: {e}", exc_info=True)
 
@@ -0,0 +1,136 @@
+"""
+Benchmark: audit hash-chain appends and chain verification.
+
+Appends: the previous pipeline read the chain tip and committed once per
+entry; the batched writer reads the tip and commits once per batch.
+Verification: one sequential pass versus chunks verified in a process pool.
+
+Runs against a file-backed SQLite database so commits pay a real fsync.
+Set AUDIT_CHAIN_BENCH_ENTRIES to change the entry count (default 5,000).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, desc, text
+from sqlalchemy.orm import sessionmaker
+
+import app.middleware  # noqa: F401  (loads the audit/license import cycle in working order)
+from app.core.environment import environment as settings
+from app.helpers.audit_chain import AuditChainHelper, shutdown_verify_executor
+from app.models.audit_log import AuditLog
+from app.services.audit_chain_writer import AuditChainWriter, PendingAuditEntry
+
+ENTRIES = int(os.environ.get("AUDIT_CHAIN_BENCH_ENTRIES", "5000"))
+VERIFY_CHUNK_SIZE = 1000
+
+AUDIT_LOGS_DDL = """
+CREATE TABLE audit_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope_type VARCHAR(50) NOT NULL,
+    scope_id BIGINT,
+    actor_user_id INTEGER,
+    event_type VARCHAR(100) NOT NULL,
+    correlation_id VARCHAR(255),
+    session_id VARCHAR(255),
+    resource VARCHAR(255),
+    ip_masked VARCHAR(45),
+    ua_masked TEXT,
+    payload JSON,
+    prev_chain_hash VARCHAR(64) NOT NULL,
+    chain_hash VARCHAR(64) NOT NULL UNIQUE,
+    created_at DATETIME NOT NULL
+)
+"""
+
+
+def _session_factory(path) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text(AUDIT_LOGS_DDL))
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def _entry(i: int) -> PendingAuditEntry:
+    return PendingAuditEntry(
+        event_type="user_login",
+        scope_type="user",
+        scope_id=i % 100,
+        payload={"event_type": "user_login", "data": {"attempt": i, "ip": "192.168.1.xxx"}},
+    )
+
+
+def _append_per_entry(session_factory) -> float:
+    """The previous pipeline: tip query, insert and commit for every entry."""
+    db = session_factory()
+    start = time.perf_counter()
+    for i in range(ENTRIES):
+        entry = _entry(i)
+        prev = db.query(AuditLog).order_by(desc(AuditLog.id)).first()
+        db.add(entry.to_model(prev.chain_hash if prev else AuditLog.get_genesis_hash()))
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def _append_batched(session_factory) -> tuple:
+    writer = AuditChainWriter(session_factory=session_factory, batch_size=500, flush_interval_seconds=0.01)
+    start = time.perf_counter()
+    futures = [writer.submit(_entry(i)) for i in range(ENTRIES)]
+    assert writer.flush(timeout=120)
+    elapsed = time.perf_counter() - start
+    writer.close()
+    assert all(f.exception() is None for f in futures)
+    return elapsed, writer.stats()["batches"]
+
+
+def _verify(session_factory, workers: int) -> tuple:
+    db = session_factory()
+    start = time.perf_counter()
+    # Use the pool for this range even though it is below the production threshold
+    with patch.object(settings, "AUDIT_CHAIN_VERIFY_PARALLEL_MIN_ENTRIES", 0):
+        report = AuditChainHelper.verify_chain_integrity(
+            db, limit=None, chunk_size=VERIFY_CHUNK_SIZE, workers=workers
+        )
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed, report
+
+
+@pytest.mark.performance
+def test_audit_chain_append_and_verify_throughput(tmp_path):
+    per_entry_factory = _session_factory(tmp_path / "per_entry.db")
+    batched_factory = _session_factory(tmp_path / "batched.db")
+
+    per_entry_seconds = _append_per_entry(per_entry_factory)
+    batched_seconds, batches = _append_batched(batched_factory)
+
+    sequential_seconds, sequential = _verify(batched_factory, workers=1)
+    try:
+        parallel_seconds, parallel = _verify(batched_factory, workers=4)
+    finally:
+        shutdown_verify_executor()
+
+    report = {
+        "entries": ENTRIES,
+        "per_entry_appends_per_s": round(ENTRIES / per_entry_seconds),
+        "batched_appends_per_s": round(ENTRIES / batched_seconds),
+        "batches": batches,
+        "append_speedup": round(per_entry_seconds / batched_seconds, 2),
+        "sequential_verify_s": round(sequential_seconds, 3),
+        "parallel_verify_s": round(parallel_seconds, 3),
+        "verify_chunks": parallel["chunks"],
+    }
+    print("\nAudit chain benchmark:", report)
+
+    for result in (sequential, parallel):
+        assert result["status"] == "integrity_verified"
+        assert result["verified_count"] == ENTRIES
+    assert parallel["checkpoints"] == sequential["checkpoints"]
+    assert batches < ENTRIES
+    assert batched_seconds < per_entry_seconds
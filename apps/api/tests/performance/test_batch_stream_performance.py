@@ -0,0 +1,105 @@
+"""
+Benchmark: memory and progress traffic of a large import-style batch.
+
+- legacy: one coroutine per item created up front, results gathered in
+  memory, two progress updates per item
+- stream: ``process_stream`` with a bounded window, results spilled to
+  the JSONL result log, progress aggregated per flush interval
+
+Redis is replaced by a counter of progress calls so the numbers do not
+depend on a server being available. Set BATCH_STREAM_BENCH_ITEMS to
+change the batch size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from app.services.batch_processing_engine import (
+    BatchItem,
+    BatchOptions,
+    BatchProcessingEngine,
+)
+
+ITEMS = int(os.environ.get("BATCH_STREAM_BENCH_ITEMS", "20000"))
+WINDOW = 16
+
+
+class CountingTracker:
+    def __init__(self):
+        self.calls = 0
+
+    async def init_batch(self, batch_id, total_items):
+        self.calls += 1
+
+    async def update_progress(self, batch_id, **kwargs):
+        self.calls += 1
+
+
+async def operation(x):
+    await asyncio.sleep(0)
+    return {"file": f"part-{x}.step", "bytes": x * 1024}
+
+
+def source():
+    for i in range(ITEMS):
+        yield BatchItem(id=f"item-{i}", data=i)
+
+
+async def run_legacy(tracker):
+    semaphore = asyncio.Semaphore(WINDOW)
+
+    async def one(item):
+        async with semaphore:
+            await tracker.update_progress("b", current_item=item.id)
+            result = await operation(item.data)
+            await tracker.update_progress("b", processed=1, successful=1)
+            return result
+
+    return await asyncio.gather(*[one(item) for item in list(source())])
+
+
+async def run_stream(tracker, tmp_path):
+    engine = BatchProcessingEngine(max_workers=WINDOW)
+    engine.progress_tracker = tracker
+    return await engine.process_stream(
+        source(), operation, BatchOptions(max_retries=0),
+        batch_id="bench", result_dir=tmp_path
+    )
+
+
+def measure(coro_factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = asyncio.run(coro_factory())
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+@pytest.mark.performance
+def test_stream_bounds_memory_and_progress_traffic(tmp_path):
+    legacy_tracker = CountingTracker()
+    legacy, legacy_s, legacy_peak = measure(lambda: run_legacy(legacy_tracker))
+
+    stream_tracker = CountingTracker()
+    stream, stream_s, stream_peak = measure(lambda: run_stream(stream_tracker, tmp_path))
+
+    print(
+        f"\n{ITEMS} items, window {WINDOW}\n"
+        f"legacy: {legacy_s:.2f}s, peak {legacy_peak / 1e6:.1f} MB, "
+        f"{legacy_tracker.calls} progress calls\n"
+        f"stream: {stream_s:.2f}s, peak {stream_peak / 1e6:.1f} MB, "
+        f"{stream_tracker.calls} progress calls"
+    )
+
+    assert len(legacy) == ITEMS
+    assert stream.successful_items == ITEMS
+    assert stream_tracker.calls < legacy_tracker.calls / 100
+    assert stream_peak < legacy_peak / 2
@@ -0,0 +1,90 @@
+"""
+Benchmark: canonical binary STL writing for 100k/1M/5M facets.
+
+Reports sort and write time and peak traced memory for the array-based
+writer, and, up to STL_BENCH_LEGACY_MAX facets (default 100,000), the
+previous facet sort: one tuple of 9 rounded floats per facet, sorted in
+Python. The legacy figure excludes the FreeCAD mesh rebuild that followed
+it, so the real gap is larger.
+
+Set STL_BENCH_FACETS to a comma-separated list of facet counts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from app.services.freecad.canonical_stl import canonical_facet_order, write_binary_stl, write_canonical_stl
+
+SIZES = [int(n) for n in os.environ.get("STL_BENCH_FACETS", "100000,1000000,5000000").split(",")]
+LEGACY_MAX = int(os.environ.get("STL_BENCH_LEGACY_MAX", "100000"))
+
+
+def _mesh(n: int, seed: int = 0) -> np.ndarray:
+    """Tessellation-like facets: vertices on a coarse grid, so keys tie often."""
+    rng = np.random.default_rng(seed)
+    base = np.round(rng.uniform(0, 500, (n, 1, 3)), 1)
+    return base + np.round(rng.uniform(-2, 2, (n, 3, 3)), 3)
+
+
+def _legacy_sort(tri: np.ndarray) -> list:
+    facet_data = []
+    for points in tri.tolist():
+        sort_key = (
+            round(points[0][0], 6), round(points[0][1], 6), round(points[0][2], 6),
+            round(points[1][0], 6), round(points[1][1], 6), round(points[1][2], 6),
+            round(points[2][0], 6), round(points[2][1], 6), round(points[2][2], 6)
+        )
+        facet_data.append((sort_key, points))
+    facet_data.sort(key=lambda x: x[0])
+    return facet_data
+
+
+@pytest.mark.performance
+def test_canonical_stl_writer_throughput(tmp_path):
+    report = {}
+    for n in SIZES:
+        tri = _mesh(n)
+        path = tmp_path / f"mesh_{n}.stl"
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        order = canonical_facet_order(tri)
+        sort_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        write_binary_stl(path, tri[order])
+        write_seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert path.stat().st_size == 84 + 50 * n
+        row = {
+            "sort_ms": round(sort_seconds * 1000),
+            "write_ms": round(write_seconds * 1000),
+            "write_mb_per_s": round(path.stat().st_size / 1e6 / write_seconds),
+            "peak_traced_mb": round(peak / 1e6),
+        }
+
+        if n <= LEGACY_MAX:
+            start = time.perf_counter()
+            legacy = _legacy_sort(tri)
+            legacy_seconds = time.perf_counter() - start
+            row["legacy_sort_ms"] = round(legacy_seconds * 1000)
+            row["sort_speedup"] = round(legacy_seconds / sort_seconds, 1)
+            np.testing.assert_array_equal(tri[order], np.array([points for _, points in legacy]))
+
+            # Same facets in another order produce the same bytes
+            shuffled = tmp_path / f"shuffled_{n}.stl"
+            write_canonical_stl(shuffled, tri[np.random.default_rng(1).permutation(n)])
+            assert hashlib.sha256(shuffled.read_bytes()).digest() == hashlib.sha256(path.read_bytes()).digest()
+
+        report[f"{n}_facets"] = row
+        path.unlink()
+
+    print("\nCanonical STL benchmark:", report)
@@ -0,0 +1,126 @@
+"""
+Benchmark: collision broad phase on synthetic 1k/10k-part assemblies.
+
+Parts are fastener-sized boxes scattered at a density where each part
+touches a handful of neighbours. Reports the sweep-and-prune broad phase
+(end to end through CollisionDetector.detect_collisions with the narrow
+phase stubbed out) against the previous broad phase: a BVH of Pydantic
+AABBs queried once per object with set-based pair de-duplication.
+
+Set COLLISION_BENCH_LEGACY_MAX to skip the baseline on larger assemblies.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.services.freecad.collision import AABB, CollisionDetector
+
+SIZES = (1000, 10000)
+LEGACY_MAX = int(os.environ.get("COLLISION_BENCH_LEGACY_MAX", "10000"))
+
+
+class _Shape:
+    def __init__(self, row):
+        self.BoundBox = SimpleNamespace(
+            XMin=row[0], YMin=row[1], ZMin=row[2], XMax=row[3], YMax=row[4], ZMax=row[5]
+        )
+
+    def isNull(self):
+        return False
+
+
+def _assembly(n: int, seed: int = 42) -> List[Tuple[str, _Shape]]:
+    rng = np.random.default_rng(seed)
+    side = 20.0 * n ** (1 / 3)
+    centers = rng.uniform(0, side, (n, 3))
+    half = rng.uniform(1.0, 5.0, (n, 3))
+    return [(f"part_{i}", _Shape(row)) for i, row in enumerate(np.hstack([centers - half, centers + half]))]
+
+
+class _LegacyBVHNode:
+    """The previous BVH broad phase, kept here as the baseline."""
+
+    def __init__(self, objects: List[Tuple[str, Any, AABB]]):
+        self.objects = objects
+        min_pt = list(objects[0][2].min_point)
+        max_pt = list(objects[0][2].max_point)
+        for _, _, aabb in objects[1:]:
+            for i in range(3):
+                min_pt[i] = min(min_pt[i], aabb.min_point[i])
+                max_pt[i] = max(max_pt[i], aabb.max_point[i])
+        self.aabb = AABB(min_point=min_pt, max_point=max_pt)
+        self.left = self.right = None
+        if len(objects) > 2:
+            extent = [self.aabb.max_point[i] - self.aabb.min_point[i] for i in range(3)]
+            axis = extent.index(max(extent))
+            ordered = sorted(objects, key=lambda o: (o[2].min_point[axis] + o[2].max_point[axis]) / 2)
+            mid = len(ordered) // 2
+            self.left = _LegacyBVHNode(ordered[:mid])
+            self.right = _LegacyBVHNode(ordered[mid:])
+            self.objects = []
+
+    def query(self, box: AABB):
+        if not self.aabb.overlaps(box):
+            return []
+        if not self.left and not self.right:
+            return [o for o in self.objects if o[2].overlaps(box)]
+        return self.left.query(box) + self.right.query(box)
+
+
+def _legacy_pairs(shapes) -> set:
+    data = []
+    for obj_id, shape in shapes:
+        bb = shape.BoundBox
+        data.append((obj_id, shape, AABB(min_point=[bb.XMin, bb.YMin, bb.ZMin], max_point=[bb.XMax, bb.YMax, bb.ZMax])))
+    bvh = _LegacyBVHNode(data)
+    pairs = set()
+    for id_a, _, aabb_a in data:
+        for id_b, _, _ in bvh.query(aabb_a):
+            if id_a != id_b:
+                pairs.add(tuple(sorted([id_a, id_b])))
+    return pairs
+
+
+@pytest.mark.performance
+def test_collision_broad_phase_throughput():
+    with patch.object(CollisionDetector, "_check_freecad", return_value=True):
+        detector = CollisionDetector(narrow_phase_workers=1)
+
+    report = {}
+    for n in SIZES:
+        shapes = _assembly(n)
+        candidates = []
+
+        def narrow(id_a, shape_a, id_b, shape_b, candidates=candidates):
+            candidates.append(tuple(sorted([id_a, id_b])))
+            return None
+
+        with patch.object(detector, "_check_narrow_phase", side_effect=narrow):
+            start = time.perf_counter()
+            detector.detect_collisions(shapes)
+            sweep_seconds = time.perf_counter() - start
+
+        row = {"candidate_pairs": len(candidates), "sweep_and_prune_ms": round(sweep_seconds * 1000, 1)}
+        assert len(set(candidates)) == len(candidates)
+
+        if n <= LEGACY_MAX:
+            start = time.perf_counter()
+            legacy = _legacy_pairs(shapes)
+            legacy_seconds = time.perf_counter() - start
+            row["legacy_bvh_ms"] = round(legacy_seconds * 1000, 1)
+            row["speedup"] = round(legacy_seconds / sweep_seconds, 1)
+            assert set(candidates) == legacy
+            assert sweep_seconds < legacy_seconds
+
+        report[f"{n}_parts"] = row
+
+    print("\nCollision broad phase benchmark:", report)
+    assert report["10000_parts"]["sweep_and_prune_ms"] < 5000
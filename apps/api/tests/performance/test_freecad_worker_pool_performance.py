@@ -0,0 +1,81 @@
+"""
+Benchmark: cold freecadcmd spawn vs warm FreeCAD worker pool.
+
+A stub freecadcmd (tests/utils/fake_freecad.py) sleeps to simulate
+FreeCAD's import/module-init cost, then runs the same small parametric
+job script. Cold spawn pays that cost on every job; the warm pool pays it
+once per worker. p50/p99 latencies of both paths are reported.
+"""
+
+from __future__ import annotations
+
+import platform
+import statistics
+import time
+
+import pytest
+
+from app.freecad.subprocess_runner import run_subprocess_with_timeout
+from app.services.freecad_worker_pool import FreeCADWorkerPool
+from tests.utils.fake_freecad import write_fake_freecadcmd
+
+SIMULATED_IMPORT_SECONDS = 0.25
+JOBS = 20
+
+JOB_SCRIPT = """
+import json, sys
+params = json.load(open(sys.argv[1]))
+print(json.dumps({"volume": params["w"] * params["h"] * params["d"]}))
+"""
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(platform.system() == "Windows", reason="stub freecadcmd relies on a shebang")
+def test_warm_pool_vs_cold_spawn_latency(tmp_path):
+    freecad_path = write_fake_freecadcmd(tmp_path, import_seconds=SIMULATED_IMPORT_SECONDS)
+    script = tmp_path / "script.py"
+    script.write_text(JOB_SCRIPT, encoding="utf-8")
+    params = tmp_path / "parameters.json"
+    params.write_text('{"w": 10, "h": 20, "d": 5}', encoding="utf-8")
+
+    cold = []
+    for _ in range(JOBS):
+        start = time.perf_counter()
+        res = run_subprocess_with_timeout(
+            [freecad_path, "-c", str(script), "--", str(params), str(tmp_path)],
+            cwd=str(tmp_path), timeout_seconds=30,
+        )
+        cold.append(time.perf_counter() - start)
+        assert res.returncode == 0
+
+    pool = FreeCADWorkerPool(freecad_path, size=1, startup_timeout=30)
+    try:
+        pool.warm_up()
+        warm = []
+        for _ in range(JOBS):
+            start = time.perf_counter()
+            res = pool.run_script(script, [str(params), str(tmp_path)], tmp_path, timeout=30)
+            warm.append(time.perf_counter() - start)
+            assert res.exit_code == 0
+            assert '"volume": 1000' in res.stdout
+    finally:
+        pool.shutdown()
+
+    report = {
+        "cold_p50_ms": statistics.median(cold) * 1000,
+        "cold_p99_ms": _percentile(cold, 99) * 1000,
+        "warm_p50_ms": statistics.median(warm) * 1000,
+        "warm_p99_ms": _percentile(warm, 99) * 1000,
+    }
+    print("\nFreeCAD worker pool benchmark:", {k: round(v, 2) for k, v in report.items()})
+
+    # Cold spawn can never beat the simulated import cost; warm jobs must
+    assert report["cold_p50_ms"] >= SIMULATED_IMPORT_SECONDS * 1000
+    assert report["warm_p50_ms"] < report["cold_p50_ms"] / 5
+    assert report["warm_p99_ms"] < SIMULATED_IMPORT_SECONDS * 1000
@@ -0,0 +1,132 @@
+"""
+Benchmark: L1 cache get/set throughput against the previous list-backed LRU.
+
+The legacy class below is the L1Cache this module replaced: recency in a
+Python list (``remove``/``pop(0)`` per access) and a ``json.dumps`` per set
+for size estimation. Both caches are filled to L1_BENCH_ENTRIES geometry-like
+results and then driven by the same Zipf-skewed key stream, so the figures
+also show the hit rate the admission filter keeps when one-off blobs are
+mixed into the stream.
+
+Set L1_BENCH_ENTRIES (default 20,000) and L1_BENCH_OPS (default 20,000).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from app.core.cache import CacheConfig, L1Cache
+
+ENTRIES = int(os.environ.get("L1_BENCH_ENTRIES", "20000"))
+OPS = int(os.environ.get("L1_BENCH_OPS", "20000"))
+BLOB_EVERY = 50
+
+
+class _LegacyL1Cache:
+    """The list-backed LRU L1 cache, without metrics."""
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self._cache = {}
+        self._access_order = []
+        self._total_size_bytes = 0
+        self._lock = threading.RLock()
+        self._max_memory_bytes = config.l1_memory_limit_mb * 1024 * 1024
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._cache:
+                return None
+            value, _, _ = self._cache[key]
+            self._access_order.remove(key)
+            self._access_order.append(key)
+            return value
+
+    def set(self, key, value, size_bytes=None):
+        if size_bytes is None:
+            size_bytes = len(json.dumps(value, default=str))
+        with self._lock:
+            while (
+                (len(self._cache) >= self.config.l1_max_size or
+                 self._total_size_bytes + size_bytes > self._max_memory_bytes) and
+                self._access_order
+            ):
+                evict_key = self._access_order.pop(0)
+                if evict_key in self._cache:
+                    _, _, evict_size = self._cache[evict_key]
+                    del self._cache[evict_key]
+                    self._total_size_bytes -= evict_size
+            if key in self._cache:
+                _, _, old_size = self._cache[key]
+                self._total_size_bytes -= old_size
+                self._access_order.remove(key)
+            self._cache[key] = (value, time.time(), size_bytes)
+            self._access_order.append(key)
+            self._total_size_bytes += size_bytes
+            return True
+
+
+def _result(i: int) -> dict:
+    return {
+        "volume": 1000.0 + i,
+        "bbox": [0.0, 0.0, 0.0, 40.0, 25.0, 10.0 + i % 7],
+        "faces": [{"id": f, "area": 12.5 * f, "normal": [0.0, 0.0, 1.0]} for f in range(12)],
+    }
+
+
+def _stream(seed: int = 7) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    ops = []
+    for n in range(OPS):
+        if n % BLOB_EVERY == 0:
+            ops.append(("set", f"blob_{n}"))
+        else:
+            ops.append(("get", f"geom_{min(int(rng.paretovariate(1.1)) - 1, ENTRIES - 1)}"))
+    return ops
+
+
+def _drive(cache, ops, blob) -> tuple[float, float]:
+    hits = gets = 0
+    start = time.perf_counter()
+    for op, key in ops:
+        if op == "set":
+            cache.set(key, blob)
+            continue
+        gets += 1
+        value = cache.get(key)
+        if value is None:
+            cache.set(key, _result(int(key[5:])))
+        else:
+            hits += 1
+    return time.perf_counter() - start, hits / gets
+
+
+@pytest.mark.performance
+def test_l1_cache_throughput_against_list_lru():
+    config = CacheConfig(l1_max_size=ENTRIES, l1_memory_limit_mb=64)
+    # Large enough that each one evicts a slice of the hot set
+    blob = {"mesh": "x" * int(config.l1_memory_limit_mb * 1024 * 1024 // 100)}
+    ops = _stream()
+
+    report = {"entries": ENTRIES, "ops": OPS}
+    for name, cls in (("legacy", _LegacyL1Cache), ("current", L1Cache)):
+        cache = cls(config)
+        start = time.perf_counter()
+        for i in range(ENTRIES):
+            cache.set(f"geom_{i}", _result(i))
+        fill_seconds = time.perf_counter() - start
+        drive_seconds, hit_rate = _drive(cache, ops, blob)
+        report[f"{name}_fill_us_per_set"] = round(fill_seconds / ENTRIES * 1e6, 1)
+        report[f"{name}_us_per_op"] = round(drive_seconds / OPS * 1e6, 1)
+        report[f"{name}_hit_rate"] = round(hit_rate, 3)
+    report["speedup"] = round(report["legacy_us_per_op"] / report["current_us_per_op"], 1)
+    print("\nL1 cache benchmark:", report)
+
+    assert report["current_us_per_op"] < report["legacy_us_per_op"]
+    assert report["current_hit_rate"] >= report["legacy_hit_rate"]
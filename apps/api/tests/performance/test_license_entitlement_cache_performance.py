@@ -0,0 +1,123 @@
+"""
+Benchmark: LicenseGuardMiddleware throughput with and without the
+entitlement cache.
+
+Drives a small FastAPI app through the license guard with concurrent
+clients. The license query is simulated with a fixed latency behind a
+bounded connection pool, so the uncached run pays one database round-trip
+per request while the cached run pays one per user per TTL. The Redis
+layer is disabled; only the in-process layer is measured.
+
+Set LICENSE_CACHE_BENCH_REQUESTS to change the request count (default 3,000).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.environment import environment as settings
+from app.middleware.license_middleware import LicenseGuardMiddleware
+from app.services.license_entitlement_cache import LicenseEntitlementCache
+
+REQUESTS = int(os.environ.get("LICENSE_CACHE_BENCH_REQUESTS", "3000"))
+CONCURRENCY = 50
+USERS = 200
+DB_LATENCY_SECONDS = 0.005
+DB_POOL_SIZE = 5
+
+
+class _SimulatedLicenseDB:
+    """Async license lookup with fixed latency and a bounded connection pool."""
+
+    def __init__(self):
+        self.pool = asyncio.Semaphore(DB_POOL_SIZE)
+        self.queries = 0
+        self.ends_at = datetime.now(timezone.utc) + timedelta(days=30)
+
+    async def get_active_license_async(self, db, user_id: int):
+        async with self.pool:
+            self.queries += 1
+            await asyncio.sleep(DB_LATENCY_SECONDS)
+        return SimpleNamespace(id=user_id, ends_at=self.ends_at)
+
+
+def _build_app(entitlement_cache) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/jobs")
+    async def jobs():
+        return {"ok": True}
+
+    # Explicit exclusions: the default list contains "/", which prefix-matches every path
+    app.add_middleware(LicenseGuardMiddleware, excluded_paths=["/api/v1/health"], entitlement_cache=entitlement_cache)
+    return app
+
+
+async def _current_user(request):
+    return int(request.headers["x-user"])
+
+
+async def _run(app: FastAPI) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(REQUESTS))
+
+        async def worker():
+            for i in counter:
+                response = await client.get("/api/v1/jobs", headers={"x-user": str(1 + i % USERS)})
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        return time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_license_guard_throughput_with_entitlement_cache():
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__ = AsyncMock(return_value=None)
+    session_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    results = {}
+    with patch("app.middleware.license_middleware.get_current_user_from_request", _current_user), \
+            patch("app.middleware.license_middleware.AsyncSessionLocal", session_factory), \
+            patch("app.middleware.license_middleware.logger"):
+        for mode in ("uncached", "cached"):
+            db = _SimulatedLicenseDB()
+            with patch(
+                "app.middleware.license_middleware.LicenseService.get_active_license_async",
+                db.get_active_license_async,
+            ), patch.object(settings, "LICENSE_ENTITLEMENT_CACHE_ENABLED", mode == "cached"):
+                cache = LicenseEntitlementCache(use_redis=False, local_ttl_seconds=60) if mode == "cached" else None
+                elapsed = await _run(_build_app(cache))
+            results[mode] = (elapsed, db.queries)
+
+    uncached_rps = REQUESTS / results["uncached"][0]
+    cached_rps = REQUESTS / results["cached"][0]
+    report = {
+        "requests": REQUESTS,
+        "concurrency": CONCURRENCY,
+        "users": USERS,
+        "db_latency_ms": DB_LATENCY_SECONDS * 1000,
+        "db_pool_size": DB_POOL_SIZE,
+        "uncached_rps": round(uncached_rps),
+        "uncached_db_queries": results["uncached"][1],
+        "cached_rps": round(cached_rps),
+        "cached_db_queries": results["cached"][1],
+        "speedup": round(cached_rps / uncached_rps, 2),
+    }
+    print("\nLicense entitlement cache benchmark:", report)
+
+    assert results["uncached"][1] == REQUESTS
+    assert results["cached"][1] == USERS
+    assert cached_rps > uncached_rps
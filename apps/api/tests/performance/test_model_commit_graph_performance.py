@@ -0,0 +1,110 @@
+"""
+Benchmark: commit-graph index for ModelObjectStore GC and ancestry queries.
+
+Builds a linear history plus abandoned side branches, then reports the
+duration of a full GC cycle and of ancestry queries answered from the
+index versus walking parent links through ``get_commit`` (the previous
+implementation of ModelBranchManager._is_ancestor).
+
+Set MVC_GC_BENCH_COMMITS to change the history length (default 5,000).
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import time
+
+import pytest
+
+from app.models.version_control import Commit, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+COMMITS = int(os.environ.get("MVC_GC_BENCH_COMMITS", "5000"))
+# Every Nth commit gets an abandoned one-commit side branch
+ORPHAN_EVERY = 10
+QUERIES = 20
+
+
+def _feature(revision: int, name: str = "Pad001") -> FreeCADObjectData:
+    return FreeCADObjectData(
+        type_id="PartDesign::Pad",
+        name=name,
+        label=name,
+        properties={"Length": 20.0 + revision, "Revision": revision},
+    )
+
+
+async def _commit(store, revision, parent, name="Pad001"):
+    blob = await store.store_freecad_object(_feature(revision, name))
+    tree = await store.store_tree(Tree(entries=[TreeEntry(name=name, hash=blob, object_type=ObjectType.BLOB)]))
+    commit = Commit(tree=tree, parents=[parent] if parent else [], author="bench", message=f"r{revision}")
+    return await store.store_commit(commit)
+
+
+async def _walk_is_ancestor(store, ancestor, descendant):
+    visited = set()
+    to_check = [descendant]
+    while to_check:
+        current = to_check.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        if current == ancestor:
+            return True
+        store._cache.pop(current, None)
+        commit = await store.get_commit(current)
+        if commit and commit.parents:
+            to_check.extend(commit.parents)
+    return False
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_gc_and_ancestry_with_commit_graph(tmp_path):
+    with patched_vcs_instrumentation():
+        store = ModelObjectStore(tmp_path / ".mvcstore")
+        await store.init_store()
+
+        history = []
+        parent = None
+        orphans = 0
+        for revision in range(COMMITS):
+            parent = await _commit(store, revision, parent)
+            history.append(parent)
+            if revision % ORPHAN_EVERY == 0:
+                await _commit(store, revision, parent, name="Scratch")
+                orphans += 1
+        (store.refs_path / "heads").mkdir(parents=True, exist_ok=True)
+        (store.refs_path / "heads" / "main").write_text(parent)
+        objects_before = len(await store.list_objects())
+
+        start = time.perf_counter()
+        removed = await store._garbage_collect()
+        gc_seconds = time.perf_counter() - start
+
+        head, root = history[-1], history[0]
+        indexed, walked = [], []
+        for _ in range(QUERIES):
+            start = time.perf_counter()
+            assert await store.is_ancestor(root, head)
+            indexed.append(time.perf_counter() - start)
+        for _ in range(3):
+            start = time.perf_counter()
+            assert await _walk_is_ancestor(store, root, head)
+            walked.append(time.perf_counter() - start)
+
+    report = {
+        "commits": COMMITS,
+        "objects_before_gc": objects_before,
+        "removed": removed,
+        "gc_seconds": round(gc_seconds, 3),
+        "is_ancestor_index_ms": round(statistics.median(indexed) * 1000, 2),
+        "is_ancestor_walk_ms": round(statistics.median(walked) * 1000, 2),
+    }
+    print("\nModelObjectStore commit-graph benchmark:", report)
+
+    # Each abandoned side commit leaves a commit, tree and blob behind
+    assert removed == orphans * 3
+    assert report["is_ancestor_index_ms"] < report["is_ancestor_walk_ms"] / 5
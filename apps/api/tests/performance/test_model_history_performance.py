@@ -0,0 +1,119 @@
+"""
+Benchmark: merge-base and history pages on a long history with tags.
+
+A main line of MVC_HISTORY_BENCH_COMMITS commits (default 3,000) with a
+tag every 10 commits and a feature branch merged back every 50 commits.
+
+- merge base: the previous first-parent walk through ``get_commit``
+  (which also misses bases behind second parents) versus the
+  generation-ordered walk over the commit-graph index
+- history page: a tags-directory scan per commit versus one indexed
+  lookup for the page
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.models.version_control import Commit, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_branch_manager import ModelBranchManager
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+COMMITS = int(os.environ.get("MVC_HISTORY_BENCH_COMMITS", "3000"))
+TAG_EVERY = 10
+MERGE_EVERY = 50
+PAGE = 100
+
+
+async def _commit(store, tree, label, parents):
+    return await store.store_commit(
+        Commit(tree=tree, parents=parents, author="bench", message=label)
+    )
+
+
+async def _build(store, branches):
+    blob = await store.store_freecad_object(FreeCADObjectData(type_id="Part::Box", name="Box", label="Box"))
+    tree = await store.store_tree(Tree(entries=[TreeEntry(name="Box", hash=blob, object_type=ObjectType.BLOB)]))
+    head = await _commit(store, tree, "root", [])
+    feature = head
+    for i in range(1, COMMITS):
+        if i % MERGE_EVERY == 0:
+            feature = await _commit(store, tree, f"feature {i}", [feature])
+            head = await _commit(store, tree, f"merge {i}", [head, feature])
+        else:
+            head = await _commit(store, tree, f"c{i}", [head])
+        if i % TAG_EVERY == 0:
+            await branches.create_tag(f"t{i}", head, "bench")
+    feature = await _commit(store, tree, "feature tip", [feature])
+    return head, feature
+
+
+async def _first_parent_base(store, commit1, commit2):
+    ancestors = set()
+    current = commit1
+    while current:
+        ancestors.add(current)
+        commit = await store.get_commit(current)
+        current = commit.parents[0] if commit and commit.parents else None
+    current = commit2
+    while current:
+        if current in ancestors:
+            return current
+        commit = await store.get_commit(current)
+        current = commit.parents[0] if commit and commit.parents else None
+    return None
+
+
+def _scan_tags(tags_path, commit_hash):
+    return [
+        f.name for f in tags_path.iterdir()
+        if f.suffix == "" and f.read_text().strip() == commit_hash
+    ]
+
+
+async def _timed(coro_factory):
+    start = time.perf_counter()
+    result = await coro_factory()
+    return result, time.perf_counter() - start
+
+
+@pytest.mark.performance
+def test_indexed_merge_base_and_history(tmp_path):
+    async def run():
+        with patched_vcs_instrumentation():
+            store = ModelObjectStore(tmp_path / ".mvcstore")
+            await store.init_store()
+            branches = ModelBranchManager(store.refs_path, store)
+            head, feature = await _build(store, branches)
+
+            walk_base, walk_s = await _timed(lambda: _first_parent_base(store, head, feature))
+            index_base, index_s = await _timed(lambda: store.get_merge_base(head, feature))
+
+            chain = await store.get_first_parent_chain(head, PAGE)
+
+            async def scan_page():
+                return [_scan_tags(branches.tags_path, h) for h in chain]
+
+            _, scan_s = await _timed(scan_page)
+            page_tags, page_s = await _timed(lambda: branches.get_tags_for_commits(chain))
+            return walk_base, index_base, walk_s, index_s, scan_s, page_tags, page_s
+
+    walk_base, index_base, walk_s, index_s, scan_s, page_tags, page_s = asyncio.run(run())
+
+    print(
+        f"\n{COMMITS} commits, {COMMITS // TAG_EVERY} tags\n"
+        f"merge base, first-parent walk: {walk_s * 1000:.1f} ms\n"
+        f"merge base, indexed:           {index_s * 1000:.1f} ms\n"
+        f"page tags, directory scans:    {scan_s * 1000:.1f} ms\n"
+        f"page tags, indexed:            {page_s * 1000:.1f} ms"
+    )
+
+    assert index_base != walk_base
+    assert index_s < walk_s
+    assert page_s < scan_s
+    assert sum(len(t) for t in page_tags.values()) == PAGE // TAG_EVERY
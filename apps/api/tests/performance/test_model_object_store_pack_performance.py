@@ -0,0 +1,127 @@
+"""
+Benchmark: loose objects vs delta-compressed pack files in ModelObjectStore.
+
+Simulates the history of a parametric part (four features, one parameter
+tweaked per commit) and reports repository size, file count and object
+lookup latency before and after packing.
+
+Set MVC_PACK_BENCH_COMMITS to change the history length (default 10,000).
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import time
+
+import pytest
+
+from app.models.version_control import Commit, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+COMMITS = int(os.environ.get("MVC_PACK_BENCH_COMMITS", "10000"))
+LOOKUP_SAMPLES = 1000
+
+FEATURES = {
+    "Sketch001": ("Sketcher::SketchObject", {"Constraints": 24, "Radius": 5.0}),
+    "Pad001": ("PartDesign::Pad", {"Length": 20.0, "Reversed": False}),
+    "Fillet001": ("PartDesign::Fillet", {"Radius": 1.0, "Edges": ["Edge1", "Edge5"]}),
+    "Hole001": ("PartDesign::Hole", {"Diameter": 6.0, "Depth": 12.0, "Threaded": True}),
+}
+
+
+def _feature(name: str, revision: int) -> FreeCADObjectData:
+    type_id, props = FEATURES[name]
+    properties = dict(props)
+    properties.update({
+        "Revision": revision,
+        "Label2": f"{name} parametric feature of the bracket body",
+        "Placement": {"Position": [0.0, 0.0, float(revision % 7)], "Rotation": [0, 0, 0, 1]},
+    })
+    return FreeCADObjectData(
+        type_id=type_id,
+        name=name,
+        label=name,
+        properties=properties,
+        shape_data={"volume": 1000.0 + revision, "area": 600.0 + revision / 2, "face_count": 14},
+        expressions={"Length": "Spreadsheet.length", "Radius": "Spreadsheet.r"},
+    )
+
+
+def _disk_stats(store: ModelObjectStore):
+    """
+    (file count, allocated bytes) of object storage - allocation includes
+    per-inode block overhead. The commit-graph index (commit-graph.db and its
+    -wal/-shm files) is the same either way and is left out.
+    """
+    files = [
+        p for p in store.store_path.rglob("*")
+        if p.is_file() and not p.name.startswith("commit-graph.db")
+    ]
+    return len(files), sum(p.stat().st_blocks * 512 for p in files)
+
+
+async def _lookup_latency(store: ModelObjectStore, hashes):
+    timings = []
+    for obj_hash in hashes:
+        store._cache.clear()
+        start = time.perf_counter()
+        assert await store.get_object(obj_hash) is not None
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_pack_size_and_lookup_latency(tmp_path):
+    with patched_vcs_instrumentation():
+        store = ModelObjectStore(tmp_path / ".mvcstore")
+        await store.init_store()
+
+        current = {name: await store.store_freecad_object(_feature(name, 0)) for name in FEATURES}
+        parent = None
+        all_hashes = list(current.values())
+        for revision in range(1, COMMITS + 1):
+            name = list(FEATURES)[revision % len(FEATURES)]
+            current[name] = await store.store_freecad_object(_feature(name, revision))
+            tree_hash = await store.store_tree(Tree(entries=[
+                TreeEntry(name=n, hash=h, object_type=ObjectType.BLOB) for n, h in sorted(current.items())
+            ]))
+            commit = Commit(tree=tree_hash, parents=[parent] if parent else [], author="bench", message=f"r{revision}")
+            parent = await store.store_commit(commit)
+            all_hashes.extend([current[name], tree_hash, parent])
+
+        sample = random.Random(7).sample(all_hashes, min(LOOKUP_SAMPLES, len(all_hashes)))
+        loose_files, loose_bytes = _disk_stats(store)
+        loose_p50, loose_p99 = await _lookup_latency(store, sample)
+
+        start = time.perf_counter()
+        packed, deltas = await store._pack_objects()
+        pack_seconds = time.perf_counter() - start
+
+        pack_files, pack_bytes = _disk_stats(store)
+        packed_p50, packed_p99 = await _lookup_latency(ModelObjectStore(store.store_path), sample)
+
+    report = {
+        "commits": COMMITS,
+        "objects": packed,
+        "delta_objects": deltas,
+        "loose_files": loose_files,
+        "loose_mb": round(loose_bytes / 2**20, 2),
+        "packed_files": pack_files,
+        "packed_mb": round(pack_bytes / 2**20, 2),
+        "pack_seconds": round(pack_seconds, 2),
+        "loose_lookup_p50_us": round(loose_p50 * 1e6, 1),
+        "loose_lookup_p99_us": round(loose_p99 * 1e6, 1),
+        "packed_lookup_p50_us": round(packed_p50 * 1e6, 1),
+        "packed_lookup_p99_us": round(packed_p99 * 1e6, 1),
+    }
+    print("\nModelObjectStore pack benchmark:", report)
+
+    assert packed == len(set(all_hashes))
+    assert pack_files == 2  # one .pack + one .idx
+    assert pack_bytes < loose_bytes / 2
+    assert packed_p50 < loose_p50
@@ -0,0 +1,152 @@
+"""
+Benchmark: repeated identical parametric jobs with the model result cache.
+
+A FreeCAD build is simulated by a fixed sleep (MODEL_CACHE_BENCH_BUILD_MS,
+default 500 ms, well under a real document build) and Redis by a dict with a
+fixed round-trip time per command (MODEL_CACHE_BENCH_RTT_US, default 200 us).
+Reports the latency of a cold build, of a warm hit served from another
+worker's L2 entry and of an in-process L1 hit, and how many builds a burst
+of concurrent identical jobs (MODEL_CACHE_BENCH_CONCURRENCY) triggers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import CacheConfig, CacheFlowType, CacheManager, EngineFingerprint
+from app.tasks import model_result_cache
+from app.tasks.model_result_cache import get_or_build_model_result, link_artefacts
+
+BUILD_SECONDS = int(os.environ.get("MODEL_CACHE_BENCH_BUILD_MS", "500")) / 1000
+RTT = int(os.environ.get("MODEL_CACHE_BENCH_RTT_US", "200")) / 1e6
+CONCURRENCY = int(os.environ.get("MODEL_CACHE_BENCH_CONCURRENCY", "8"))
+WARM_JOBS = 200
+
+
+class SimulatedRedis:
+    def __init__(self):
+        self.values = {}
+        self.locks = set()
+        self.commands = 0
+        self._lock = threading.Lock()
+
+    async def _round_trip(self):
+        self.commands += 1
+        await asyncio.sleep(RTT)
+
+    async def get(self, key):
+        await self._round_trip()
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None, content_type="json"):
+        await self._round_trip()
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        await self._round_trip()
+        return self.values.pop(key, None) is not None
+
+    async def acquire_lock(self, key, timeout):
+        await self._round_trip()
+        with self._lock:
+            if key in self.locks:
+                return False
+            self.locks.add(key)
+            return True
+
+    async def release_lock(self, key):
+        await self._round_trip()
+        self.locks.discard(key)
+
+    async def add_to_tag(self, tag_key, cache_key):
+        await self._round_trip()
+
+
+def _manager(redis_sim: SimulatedRedis) -> CacheManager:
+    manager = CacheManager(CacheConfig())
+    manager.l2_cache = redis_sim
+    manager._engine_fingerprint = EngineFingerprint(
+        freecad_version="1.1.0", occt_version="7.8.1", python_version="3.11", git_sha="bench"
+    )
+    return manager
+
+
+class SimulatedBuild:
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(BUILD_SECONDS)
+        return {
+            "artefacts": [{"type": "parametric_model", "bucket": "artefacts", "s3_key": "jobs/a/model.FCStd",
+                           "sha256": "0" * 64, "size_bytes": 2_000_000}],
+            "data": {"model_generated": True},
+            "warnings": [],
+        }
+
+
+def _params(i: int) -> dict:
+    return {"model_type": "bracket", "dimensions": {"width": 40.0 + i, "height": 25.0}, "features": ["fillet"]}
+
+
+def _job(manager, build, job_id, params):
+    start = time.perf_counter()
+    payload, hit = get_or_build_model_result(CacheFlowType.PARAMS, job_id, params, build, manager)
+    if hit:
+        link_artefacts(payload)
+    return time.perf_counter() - start, hit
+
+
+@pytest.mark.performance
+def test_model_result_cache_latency(monkeypatch):
+    monkeypatch.setattr(model_result_cache, "s3_service", SimpleNamespace(
+        get_object_info=lambda bucket, key: SimpleNamespace(object_key=key),
+        generate_presigned_url=lambda bucket, object_key, **kw: SimpleNamespace(url=f"https://s3/{object_key}"),
+    ))
+    redis_sim, build = SimulatedRedis(), SimulatedBuild()
+    worker_a, worker_b = _manager(redis_sim), _manager(redis_sim)
+
+    cold, cold_hit = _job(worker_a, build, "job-cold", _params(0))
+    # Another worker process: empty L1, entry in Redis
+    l2_hit, l2_was_hit = _job(worker_b, build, "job-l2", _params(0))
+    l1_hits = [_job(worker_b, build, f"job-{i}", _params(0)) for i in range(WARM_JOBS)]
+
+    # A burst of identical new jobs on one worker's threads and on a second worker
+    builds_before = build.calls
+    burst_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        burst = list(pool.map(
+            lambda i: _job(worker_a if i % 2 else worker_b, build, f"burst-{i}", _params(1)),
+            range(CONCURRENCY)
+        ))
+    burst_seconds = time.perf_counter() - burst_start
+
+    report = {
+        "build_ms": BUILD_SECONDS * 1000,
+        "rtt_us": round(RTT * 1e6),
+        "cold_ms": round(cold * 1000, 1),
+        "l2_hit_ms": round(l2_hit * 1000, 2),
+        "l1_hit_median_ms": round(statistics.median(t for t, _ in l1_hits) * 1000, 3),
+        "burst_jobs": CONCURRENCY,
+        "burst_builds": build.calls - builds_before,
+        "burst_wall_ms": round(burst_seconds * 1000, 1),
+        "uncached_burst_builds": CONCURRENCY,
+    }
+    print("\nModel result cache benchmark:", report)
+
+    assert not cold_hit and l2_was_hit and all(hit for _, hit in l1_hits)
+    assert l2_hit < BUILD_SECONDS / 20
+    assert build.calls - builds_before == 1
+    assert sum(not hit for _, hit in burst) == 1
@@ -0,0 +1,113 @@
+"""
+Benchmark: diffing two commits of a large model.
+
+Both trees have MVC_DIFF_BENCH_FEATURES features (default 2,000), a
+quarter of them modified, stored in a real ModelObjectStore with the
+object cache cleared so every load reads and decompresses from disk. Each
+load also waits MVC_DIFF_BENCH_READ_LATENCY_US (default 500 us) before
+reading, as a store on network storage would, so the comparison measures
+overlapped reads rather than how many cores the host has.
+
+- sequential: the previous ModelDiffer.diff_trees loop, two awaited
+  loads per modified entry, one entry after another
+- concurrent: diff_trees with the bounded loading pool
+- first page: diff_trees_page with the default limit of 100
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.models.version_control import FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_differ import ModelDiffer
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+FEATURES = int(os.environ.get("MVC_DIFF_BENCH_FEATURES", "2000"))
+READ_LATENCY = int(os.environ.get("MVC_DIFF_BENCH_READ_LATENCY_US", "500")) / 1e6
+
+
+def _feature(index: int, revision: int) -> FreeCADObjectData:
+    return FreeCADObjectData(
+        type_id="PartDesign::Pad",
+        name=f"Pad{index:05d}",
+        label=f"Pad{index:05d}",
+        properties={"Length": 20.0 + revision, "Index": index, "Notes": "x" * 512},
+        shape_data={"volume": 1000.0 + revision, "face_count": 6},
+    )
+
+
+async def _build(store):
+    entries1, entries2 = [], []
+    for i in range(FEATURES):
+        h1 = await store.store_freecad_object(_feature(i, 0))
+        h2 = await store.store_freecad_object(_feature(i, 1)) if i % 4 == 0 else h1
+        entries1.append(TreeEntry(name=f"Pad{i:05d}", hash=h1, object_type=ObjectType.BLOB))
+        entries2.append(TreeEntry(name=f"Pad{i:05d}", hash=h2, object_type=ObjectType.BLOB))
+    return Tree(entries=entries1), Tree(entries=entries2)
+
+
+async def _sequential(differ, store, tree1, tree2):
+    entries1 = {e.name: e for e in tree1.entries}
+    changed = 0
+    for entry2 in tree2.entries:
+        entry1 = entries1[entry2.name]
+        if entry1.hash != entry2.hash:
+            obj1 = await store.get_freecad_object(entry1.hash)
+            obj2 = await store.get_freecad_object(entry2.hash)
+            await differ.diff_objects(obj1, obj2)
+            changed += 1
+    return changed
+
+
+def _add_read_latency(store):
+    get_object = store.get_object
+
+    async def slow_get_object(obj_hash, obj_type=None):
+        if obj_hash not in store._cache:
+            await asyncio.sleep(READ_LATENCY)
+        return await get_object(obj_hash, obj_type)
+
+    store.get_object = slow_get_object
+
+
+async def _timed(store, coro_factory):
+    store._cache.clear()
+    start = time.perf_counter()
+    result = await coro_factory()
+    return result, time.perf_counter() - start
+
+
+@pytest.mark.performance
+def test_concurrent_tree_diff(tmp_path):
+    async def run():
+        with patched_vcs_instrumentation():
+            store = ModelObjectStore(tmp_path / ".mvcstore")
+            await store.init_store()
+            tree1, tree2 = await _build(store)
+            _add_read_latency(store)
+            differ = ModelDiffer(store)
+
+            changed, sequential_s = await _timed(
+                store, lambda: _sequential(differ, store, tree1, tree2)
+            )
+            diff, concurrent_s = await _timed(store, lambda: differ.diff_trees(tree1, tree2))
+            page, page_s = await _timed(store, lambda: differ.diff_trees_page(tree1, tree2))
+            return changed, diff, page, sequential_s, concurrent_s, page_s
+
+    changed, diff, page, sequential_s, concurrent_s, page_s = asyncio.run(run())
+
+    print(
+        f"\n{FEATURES} features, {changed} modified, read latency {READ_LATENCY * 1e6:.0f} us\n"
+        f"sequential:  {sequential_s * 1000:.0f} ms\n"
+        f"concurrent:  {concurrent_s * 1000:.0f} ms ({sequential_s / concurrent_s:.1f}x)\n"
+        f"first page:  {page_s * 1000:.0f} ms ({len(page.object_diffs)} changes)"
+    )
+
+    assert diff.stats["modified"] == changed
+    assert concurrent_s < sequential_s
+    assert page_s < concurrent_s
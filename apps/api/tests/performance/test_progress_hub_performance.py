@@ -0,0 +1,142 @@
+"""
+Benchmark: progress fan-out to WebSocket and SSE subscribers.
+
+- previous path: one Redis subscription per job for WebSocket clients and
+  one per SSE stream; every SSE stream parses and validates each message
+  itself, and every WebSocket send re-serializes it
+- hub: one XREAD over the watched job streams (FakeProgressSource here);
+  each entry is validated once and the WebSocket text and SSE bytes are encoded once
+  and shared
+
+Both sides do the same deliveries in-process (Redis is not involved), so
+the numbers are the per-process CPU cost of fan-out. A subscriber that
+never reads checks that the hub's memory per connection stays bounded.
+
+Size: PROGRESS_BENCH_SUBSCRIBERS (default 200) subscribers per job, half
+WebSocket and half SSE, over 10 jobs with 20 messages each.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+from sse_starlette.sse import ServerSentEvent
+
+from app.core.progress_hub import ProgressHub
+from app.schemas.progress import EventType, ProgressMessageV2
+from tests.utils.fake_progress_source import FakeProgressSource
+
+SUBSCRIBERS = int(os.environ.get("PROGRESS_BENCH_SUBSCRIBERS", "200"))
+JOBS = 10
+MESSAGES = 20
+
+
+def payloads():
+    return [
+        (job_id, ProgressMessageV2(
+            job_id=job_id,
+            event_id=event_id,
+            event_type=EventType.OCCT,
+            operation_name="boolean_fuse",
+            step_index=event_id,
+            step_total=MESSAGES,
+            progress_pct=event_id * 100 // MESSAGES,
+            message="Fusing solids",
+        ).model_dump_json())
+        for event_id in range(1, MESSAGES + 1)
+        for job_id in range(1, JOBS + 1)
+    ]
+
+
+def previous_fan_out(messages) -> int:
+    websocket_clients = SUBSCRIBERS // 2
+    sse_streams = SUBSCRIBERS - websocket_clients
+    sent = 0
+    for _, data in messages:
+        # Per-job WebSocket listener: one parse, one encode per connection
+        progress = ProgressMessageV2(**json.loads(data))
+        for _ in range(websocket_clients):
+            sent += len(json.dumps({"type": "progress", **progress.model_dump(mode="json")}))
+        # Every SSE stream has its own subscription and parses for itself
+        for _ in range(sse_streams):
+            progress = ProgressMessageV2(**json.loads(data))
+            sent += len(ServerSentEvent(
+                data=progress.model_dump_json(), event="progress", id=str(progress.event_id)
+            ).encode())
+    return sent
+
+
+async def hub_fan_out(hub: ProgressHub, messages) -> int:
+    websocket_clients = SUBSCRIBERS // 2
+    subscriptions = {
+        job_id: [
+            await hub.subscribe(job_id, "websocket" if i < websocket_clients else "sse")
+            for i in range(SUBSCRIBERS)
+        ]
+        for job_id in range(1, JOBS + 1)
+    }
+    sent = 0
+    for index, (job_id, data) in enumerate(messages):
+        hub.dispatch(job_id, f"0-{index // JOBS + 1}", data)
+        for subscription in subscriptions[job_id]:
+            frame = await subscription.get()
+            sent += len(frame.websocket_text if subscription.transport == "websocket" else frame.sse_bytes)
+    for job_subscriptions in subscriptions.values():
+        for subscription in job_subscriptions:
+            subscription.close()
+    return sent
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_hub_fan_out_outpaces_per_subscriber_decoding():
+    messages = payloads()
+    deliveries = len(messages) * SUBSCRIBERS
+
+    start = time.perf_counter()
+    previous_bytes = previous_fan_out(messages)
+    previous_s = time.perf_counter() - start
+
+    hub = ProgressHub(source=FakeProgressSource())
+    start = time.perf_counter()
+    hub_bytes = await hub_fan_out(hub, messages)
+    hub_s = time.perf_counter() - start
+    await hub.stop()
+
+    print(
+        f"\n{deliveries} deliveries, {JOBS} jobs x {SUBSCRIBERS} subscribers\n"
+        f"redis subscriptions: previous {JOBS + JOBS * (SUBSCRIBERS - SUBSCRIBERS // 2)}, hub 1 XREAD\n"
+        f"previous fan-out: {deliveries / previous_s:10.0f} deliveries/s\n"
+        f"hub fan-out:      {deliveries / hub_s:10.0f} deliveries/s ({previous_s / hub_s:.1f}x)"
+    )
+
+    assert abs(hub_bytes - previous_bytes) < 0.05 * previous_bytes
+    assert hub_s * 5 < previous_s
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_stalled_subscriber_memory_is_bounded():
+    hub = ProgressHub(source=FakeProgressSource(), queue_size=32)
+    stalled = await hub.subscribe(1, "sse")
+    data = payloads()[0][1]
+
+    start = time.perf_counter()
+    for index in range(20_000):
+        hub.dispatch(1, f"0-{index + 1}", data)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0)
+
+    stats = hub.get_stats()
+    print(
+        f"\nstalled subscriber after 20000 messages: {stats['pending_frames']} queued, "
+        f"{stats['dropped_frames']} dropped, {20_000 / elapsed:.0f} dispatches/s"
+    )
+
+    assert stats["pending_frames"] == 32
+    assert stalled.dropped == 20_000 - 32
+    await hub.stop()
@@ -0,0 +1,169 @@
+"""
+Benchmark: progress overhead per 10k updates inside a FreeCAD task.
+
+Replays what WorkerProgressReporter does for ``op.update(step)`` inside a
+task: build a ProgressMessageV2, write the Celery task state and publish.
+
+- legacy: task state on every update, then ``asyncio.run`` of an async
+  publish that opens a connection and sends two PUBLISH commands
+- background: task state for milestones / once per 500 ms, the message
+  handed to BackgroundProgressPublisher, which pipelines coalesced batches
+
+Redis is simulated with a fixed round-trip time (PROGRESS_BENCH_RTT_US,
+default 200 us, a same-host Redis) so the numbers do not depend on a
+server being available. Set PROGRESS_BENCH_UPDATES to change the count.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.progress import EventType, OperationGroup, Phase, ProgressMessageV2
+from app.workers.progress_publisher import BackgroundProgressPublisher
+
+UPDATES = int(os.environ.get("PROGRESS_BENCH_UPDATES", "10000"))
+RTT = int(os.environ.get("PROGRESS_BENCH_RTT_US", "200")) / 1e6
+CELERY_STATE_INTERVAL = 0.5
+
+
+class FakeTask:
+    def __init__(self):
+        self.state_writes = 0
+
+    def update_state(self, state, meta):
+        time.sleep(RTT)
+        self.state_writes += 1
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.size = 0
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.size += 1
+
+    def expire(self, key, ttl):
+        self.size += 1
+
+    def execute(self):
+        time.sleep(RTT)
+        self.client.round_trips += 1
+        self.client.commands += self.size
+
+
+class FakeRedis:
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakeAsyncRedis:
+    """Blocking sleeps: asyncio.sleep rounds sub-millisecond waits up."""
+
+    def __init__(self):
+        self.round_trips = 0
+
+    async def connect(self):
+        time.sleep(RTT)
+        self.round_trips += 1
+
+    async def publish(self, channel, message):
+        time.sleep(RTT)
+        self.round_trips += 1
+
+
+def _message(job_id: int, event_id: int, operation_id, step: int, milestone: bool) -> ProgressMessageV2:
+    return ProgressMessageV2(
+        job_id=job_id,
+        event_id=event_id,
+        event_type=EventType.PHASE,
+        operation_id=operation_id,
+        operation_name="FreeCAD Operation",
+        operation_group=OperationGroup.GENERAL,
+        phase=Phase.PROGRESS,
+        step_index=step,
+        step_total=UPDATES,
+        progress_pct=min(100, int(step / UPDATES * 100)),
+        milestone=milestone,
+        timestamp=datetime.now(UTC),
+    )
+
+
+def _legacy_run(task: FakeTask, redis_client: FakeAsyncRedis) -> float:
+    operation_id = uuid4()
+
+    async def publish(progress):
+        # New loop per tick: the pooled connection cannot be reused
+        await redis_client.connect()
+        message = progress.model_dump_json()
+        await redis_client.publish(f"job:progress:{progress.job_id}", message)
+        await redis_client.publish("job:progress:*", message)
+
+    start = time.perf_counter()
+    for step in range(1, UPDATES + 1):
+        progress = _message(1, step, operation_id, step, milestone=step in (1, UPDATES))
+        task.update_state(state="PROGRESS", meta=progress.model_dump())
+        asyncio.run(publish(progress))
+    return time.perf_counter() - start
+
+
+def _background_run(task: FakeTask, publisher: BackgroundProgressPublisher) -> float:
+    operation_id = uuid4()
+    last_state = 0.0
+    start = time.perf_counter()
+    for step in range(1, UPDATES + 1):
+        milestone = step in (1, UPDATES)
+        progress = _message(1, step, operation_id, step, milestone)
+        now = time.time()
+        if milestone or now - last_state >= CELERY_STATE_INTERVAL:
+            last_state = now
+            task.update_state(state="PROGRESS", meta=progress.model_dump())
+        publisher.submit(1, progress)
+    task_seconds = time.perf_counter() - start
+    assert publisher.flush(10)
+    return task_seconds
+
+
+@pytest.mark.performance
+def test_progress_overhead_per_10k_updates():
+    legacy_task, legacy_redis = FakeTask(), FakeAsyncRedis()
+    legacy_seconds = _legacy_run(legacy_task, legacy_redis)
+
+    background_task, redis_client = FakeTask(), FakeRedis()
+    publisher = BackgroundProgressPublisher(
+        redis_url="redis://unused", flush_interval_seconds=0.1, client_factory=lambda: redis_client
+    )
+    try:
+        background_seconds = _background_run(background_task, publisher)
+        stats = publisher.stats()
+    finally:
+        publisher.close()
+
+    report = {
+        "updates": UPDATES,
+        "rtt_us": round(RTT * 1e6),
+        "legacy_s": round(legacy_seconds, 3),
+        "legacy_us_per_update": round(legacy_seconds / UPDATES * 1e6, 1),
+        "legacy_round_trips": legacy_redis.round_trips + legacy_task.state_writes,
+        "background_s": round(background_seconds, 3),
+        "background_us_per_update": round(background_seconds / UPDATES * 1e6, 1),
+        "background_round_trips": redis_client.round_trips + background_task.state_writes,
+        "published": stats["published"],
+        "coalesced": stats["coalesced"],
+        "speedup": round(legacy_seconds / background_seconds, 1),
+    }
+    print("\nProgress publishing benchmark:", report)
+
+    assert stats["dropped"] == 0
+    assert redis_client.round_trips < UPDATES / 10
+    assert background_seconds < legacy_seconds / 5
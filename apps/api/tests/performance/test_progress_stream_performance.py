@@ -0,0 +1,189 @@
+"""
+Benchmark: storing and resuming job progress in Redis.
+
+- legacy: per event, ZADD + EXPIRE + ZREMRANGEBYRANK into the resumption
+  sorted set, then PUBLISH to the job channel and the monitoring channel
+  (five round trips); event IDs come from a counter in each process
+- stream: one pipelined XADD (MAXLEN) + EXPIRE into the job's stream; the
+  event ID is derived from the entry ID Redis assigns
+
+Redis is simulated with a fixed round-trip time (PROGRESS_BENCH_RTT_US,
+default 200 us, a same-host Redis). Two producer processes publish to the
+same job (the second takes over for the last quarter, as a retried task
+would), then a client resumes from the middle of the log, which checks that
+the stream IDs give one ordering where the per-process counters collide.
+Set PROGRESS_BENCH_EVENTS to change the count.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from app.core.redis_pubsub import RedisProgressPubSub
+from app.schemas.progress import EventType, ProgressMessageV2
+
+EVENTS = int(os.environ.get("PROGRESS_BENCH_EVENTS", "2000"))
+RTT = int(os.environ.get("PROGRESS_BENCH_RTT_US", "200")) / 1e6
+
+
+def _parse(stream_id: str):
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class LatencyPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.commands.append(lambda: self.client.append(key, fields, maxlen))
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: True)
+
+    async def execute(self):
+        self.client.round_trip(len(self.commands))
+        return [command() for command in self.commands]
+
+
+class LatencyRedis:
+    """Sorted sets, channels and streams with a blocking sleep per round trip."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = 0
+        self.sorted_sets = {}
+        self.streams = {}
+
+    def round_trip(self, commands: int = 1) -> None:
+        time.sleep(RTT)
+        self.round_trips += 1
+        self.commands += commands
+
+    def pipeline(self, transaction=True):
+        return LatencyPipeline(self)
+
+    def append(self, key, fields, maxlen):
+        stream = self.streams.setdefault(key, [])
+        now = int(time.time() * 1000)
+        last_ms, last_seq = _parse(stream[-1][0]) if stream else (0, -1)
+        ms = max(now, last_ms)
+        stream_id = f"{ms}-{last_seq + 1 if ms == last_ms else 0}"
+        stream.append((stream_id, dict(fields)))
+        del stream[:-maxlen]
+        return stream_id
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        self.round_trip()
+        low = _parse(min)
+        return [entry for entry in self.streams.get(key, []) if _parse(entry[0]) >= low][:count]
+
+    async def zadd(self, key, mapping):
+        self.round_trip()
+        self.sorted_sets.setdefault(key, []).extend((score, member) for member, score in mapping.items())
+
+    async def expire(self, key, ttl):
+        self.round_trip()
+
+    async def zremrangebyrank(self, key, start, stop):
+        self.round_trip()
+        members = sorted(self.sorted_sets.get(key, []))
+        self.sorted_sets[key] = members[-(-stop - 1):] if stop < 0 else members
+
+    async def publish(self, channel, message):
+        self.round_trip()
+
+    async def zrangebyscore(self, key, min, max, withscores=False):
+        self.round_trip()
+        return [member for score, member in sorted(self.sorted_sets.get(key, [])) if score >= min]
+
+
+def _worker(step: int) -> int:
+    return 0 if step < EVENTS * 3 // 4 else 1
+
+
+def _message(step: int) -> ProgressMessageV2:
+    return ProgressMessageV2(
+        job_id=1,
+        event_type=EventType.PROGRESS_UPDATE,
+        step_index=step,
+        step_total=EVENTS,
+        progress_pct=step * 100 // EVENTS,
+        message="Meshing",
+    )
+
+
+async def _legacy_publish(client: LatencyRedis, counters, worker: int, progress: ProgressMessageV2) -> None:
+    counters[worker] += 1
+    progress.event_id = counters[worker]
+    message = progress.model_dump_json()
+    cache_key = "job:progress:cache:1"
+    await client.zadd(cache_key, {message: progress.event_id})
+    await client.expire(cache_key, RedisProgressPubSub.PROGRESS_CACHE_TTL_SECONDS)
+    await client.zremrangebyrank(cache_key, 0, -RedisProgressPubSub.PROGRESS_CACHE_MAX_EVENTS - 1)
+    await client.publish("job:progress:1", message)
+    await client.publish("job:progress:*", message)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_stream_append_cuts_round_trips_and_resumes_in_order():
+    resume_at = EVENTS // 2
+    # Keep every event in both logs so resumption is comparable
+    retained = RedisProgressPubSub.PROGRESS_CACHE_MAX_EVENTS
+    RedisProgressPubSub.PROGRESS_CACHE_MAX_EVENTS = EVENTS
+    try:
+        legacy = LatencyRedis()
+        counters = [0, 0]
+        legacy_ids = []
+        start = time.perf_counter()
+        for step in range(EVENTS):
+            progress = _message(step)
+            await _legacy_publish(legacy, counters, _worker(step), progress)
+            legacy_ids.append(progress.event_id)
+        legacy_s = time.perf_counter() - start
+        legacy_round_trips = legacy.round_trips
+        # The client saw the first half; its Last-Event-ID is the ID of the last one
+        last_seen = legacy_ids[resume_at - 1]
+        legacy_resumed = [
+            ProgressMessageV2.model_validate_json(member).step_index
+            for member in await legacy.zrangebyscore("job:progress:cache:1", min=last_seen + 1, max="+inf")
+        ]
+
+        stream = LatencyRedis()
+        workers = [RedisProgressPubSub(redis_url="redis://unused") for _ in range(2)]
+        for worker in workers:
+            worker._redis_client = stream
+        event_ids = []
+        start = time.perf_counter()
+        for step in range(EVENTS):
+            progress = _message(step)
+            assert await workers[_worker(step)].publish_progress(1, progress, force=True)
+            event_ids.append(progress.event_id)
+        stream_s = time.perf_counter() - start
+        stream_round_trips = stream.round_trips
+        stream_resumed = [
+            event.step_index for event in await workers[0].get_missed_events(1, event_ids[resume_at - 1])
+        ]
+    finally:
+        RedisProgressPubSub.PROGRESS_CACHE_MAX_EVENTS = retained
+
+    expected = list(range(resume_at, EVENTS))
+    print(
+        f"\n{EVENTS} events from 2 producers, rtt {RTT * 1e6:.0f} us\n"
+        f"legacy: {legacy_round_trips / EVENTS:.1f} round trips/event, {EVENTS / legacy_s:8.0f} events/s, "
+        f"resume from event {resume_at}: {len(legacy_resumed)} replayed, "
+        f"{len(set(legacy_resumed) - set(expected))} already seen, {len(set(expected) - set(legacy_resumed))} missed\n"
+        f"stream: {stream_round_trips / EVENTS:.1f} round trips/event, {EVENTS / stream_s:8.0f} events/s "
+        f"({legacy_s / stream_s:.1f}x), resume: {len(stream_resumed)} replayed"
+    )
+
+    assert stream_resumed == expected
+    assert legacy_resumed != expected
+    assert event_ids == sorted(set(event_ids))
+    assert stream_round_trips == EVENTS and legacy_round_trips == 5 * EVENTS
+    assert stream_s * 2 < legacy_s
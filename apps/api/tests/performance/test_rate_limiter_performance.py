@@ -0,0 +1,183 @@
+"""
+Load test: job-creation rate limiting (per-user + global limit) against a
+real Redis, GCRA engine against the former sorted-set implementation.
+
+Each simulated request checks a per-user limit (60/min) and a global limit,
+as create_job does. Checks are issued back to back from one client, so the
+latencies reflect Redis round-trips rather than thread scheduling. Three
+variants are compared:
+
+- legacy: the former RateLimiter._check_redis, one EVAL of the full script
+  per limiter (two round-trips per request, one sorted-set member per
+  admitted request);
+- gcra: both limits in one EVALSHA via check_rate_limits;
+- gcra_leased: the same with local leases (5% of the per-user limit, 2% of
+  the global one), so most requests never reach Redis.
+
+Reported per variant: checks/s, p50/p99 check latency, script round-trips
+and Redis commands executed per check (from INFO commandstats) and the
+memory of the global key.
+
+Needs Redis at RATE_LIMIT_BENCH_REDIS_URL (default redis://localhost:6379/15)
+and skips otherwise; the database is flushed. Set RATE_LIMIT_BENCH_REQUESTS
+to change the request count (default 10,000).
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+
+import pytest
+import redis
+
+from app.core.rate_limiter import RateLimiter, check_rate_limits
+
+REDIS_URL = os.environ.get("RATE_LIMIT_BENCH_REDIS_URL", "redis://localhost:6379/15")
+REQUESTS = int(os.environ.get("RATE_LIMIT_BENCH_REQUESTS", "10000"))
+USERS = 400
+PER_USER_LIMIT = 60
+GLOBAL_LIMIT = 100_000
+
+# Verbatim from the former RateLimiter._check_redis
+_LEGACY_LUA = """
+local key = KEYS[1]
+local min_time = tonumber(ARGV[1])
+local current_time = tonumber(ARGV[2])
+local max_requests = tonumber(ARGV[3])
+local window_seconds = tonumber(ARGV[4])
+
+-- Remove old entries
+redis.call('zremrangebyscore', key, 0, min_time)
+
+-- Count current requests
+local current_count = redis.call('zcard', key)
+
+-- Check if under limit
+if current_count < max_requests then
+    -- Add new request
+    redis.call('zadd', key, current_time, tostring(current_time))
+    redis.call('expire', key, window_seconds + 1)
+    return 1
+else
+    return 0
+end
+"""
+
+
+class _LegacyZSetLimiter:
+    """The former Redis path of RateLimiter: full-script EVAL per check."""
+
+    def __init__(self, client: redis.Redis, max_requests: int, key_prefix: str, window_seconds: int = 60):
+        self.client = client
+        self.max_requests = max_requests
+        self.key_prefix = key_prefix
+        self.window_seconds = window_seconds
+
+    def check_rate_limit(self, key: str) -> bool:
+        current_time = time.time()
+        return bool(self.client.eval(
+            _LEGACY_LUA, 1, f"{self.key_prefix}:{key}",
+            current_time - self.window_seconds, current_time, self.max_requests, self.window_seconds,
+        ))
+
+
+def _redis_or_skip() -> redis.Redis:
+    client = redis.from_url(REDIS_URL, decode_responses=True)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("Redis not available for the rate limiter load test")
+    return client
+
+
+def _commands_processed(client: redis.Redis) -> tuple[int, int]:
+    """(all commands incl. those run inside scripts, script invocations)."""
+    stats = client.info("commandstats")
+    scripts = sum(stats.get(name, {}).get("calls", 0) for name in ("cmdstat_eval", "cmdstat_evalsha"))
+    return sum(entry["calls"] for entry in stats.values()), scripts
+
+
+def _drive(check) -> tuple[float, list[float], int]:
+    """Run REQUESTS checks; return (seconds, latencies, admitted)."""
+    rng = random.Random(7)
+    users = [str(rng.randrange(USERS)) for _ in range(REQUESTS)]
+    latencies = []
+    admitted = 0
+
+    started = time.perf_counter()
+    for user in users:
+        start = time.perf_counter()
+        admitted += check(user)
+        latencies.append(time.perf_counter() - start)
+    return time.perf_counter() - started, latencies, admitted
+
+
+def _measure(client: redis.Redis, name: str, check, global_key: str) -> dict:
+    client.flushdb()
+    commands_before, scripts_before = _commands_processed(client)
+    seconds, latencies, admitted = _drive(check)
+    commands_after, scripts_after = _commands_processed(client)
+    # INFO itself is counted once per call
+    commands = commands_after - commands_before - 1
+    round_trips = scripts_after - scripts_before
+    latencies.sort()
+    return {
+        "variant": name,
+        "checks_per_s": round(REQUESTS / seconds),
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6),
+        "p99_us": round(latencies[int(len(latencies) * 0.99)] * 1e6),
+        "redis_round_trips_per_check": round(round_trips / REQUESTS, 2),
+        "redis_commands_per_check": round(commands / REQUESTS, 2),
+        "global_key_bytes": client.memory_usage(global_key) or 0,
+        "admitted": admitted,
+    }
+
+
+@pytest.mark.performance
+def test_rate_limiter_load_against_sorted_set_implementation():
+    client = _redis_or_skip()
+
+    legacy_user = _LegacyZSetLimiter(client, PER_USER_LIMIT, "bench_user")
+    legacy_global = _LegacyZSetLimiter(client, GLOBAL_LIMIT, "bench_global")
+    legacy = _measure(
+        client, "legacy",
+        lambda user: legacy_user.check_rate_limit(user) and legacy_global.check_rate_limit("global"),
+        "bench_global:global",
+    )
+
+    gcra_user = RateLimiter(PER_USER_LIMIT, 60, redis_client=client, key_prefix="bench_user")
+    gcra_global = RateLimiter(GLOBAL_LIMIT, 60, redis_client=client, key_prefix="bench_global")
+    gcra = _measure(
+        client, "gcra",
+        lambda user: check_rate_limits([(gcra_user, user), (gcra_global, "global")]) is None,
+        "gcra:bench_global:global",
+    )
+
+    leased_user = RateLimiter(PER_USER_LIMIT, 60, redis_client=client, key_prefix="bench_user",
+                              local_lease_fraction=0.05)
+    leased_global = RateLimiter(GLOBAL_LIMIT, 60, redis_client=client, key_prefix="bench_global",
+                                local_lease_fraction=0.02)
+    leased = _measure(
+        client, "gcra_leased",
+        lambda user: check_rate_limits([(leased_user, user), (leased_global, "global")]) is None,
+        "gcra:bench_global:global",
+    )
+    client.flushdb()
+
+    print("\nRate limiter load test:")
+    for row in (legacy, gcra, leased):
+        print("  ", row)
+
+    # Identical admission decisions: every request is under both limits
+    assert legacy["admitted"] == gcra["admitted"] == leased["admitted"] == REQUESTS
+    assert gcra["redis_round_trips_per_check"] == legacy["redis_round_trips_per_check"] / 2
+    assert gcra["redis_commands_per_check"] < legacy["redis_commands_per_check"]
+    assert leased["redis_round_trips_per_check"] < gcra["redis_round_trips_per_check"] / 2
+    assert gcra["global_key_bytes"] < legacy["global_key_bytes"] / 100
+    # On a loopback Redis the client-side cost of a call rivals the
+    # round-trip itself, so only the leased path is asserted on latency
+    assert leased["checks_per_s"] > 2 * legacy["checks_per_s"]
+    assert leased["p50_us"] < gcra["p50_us"] / 5
+    assert leased["p99_us"] < legacy["p99_us"]
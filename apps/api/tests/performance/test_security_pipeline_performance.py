@@ -0,0 +1,106 @@
+"""
+Benchmark: per-request cost of the security middleware.
+
+- stack: the nine BaseHTTPMiddleware layers added one by one, as main.py
+  used to
+- pipeline: the same layers run by SecurityPipelineMiddleware
+
+Both serve /api/v1/health and an authenticated design read
+(GET /api/v1/designs/{id} with a bearer token) from a small FastAPI app.
+Requests are driven straight through the ASGI interface so the numbers
+measure the middleware rather than an HTTP client. Set
+SECURITY_PIPELINE_BENCH_REQUESTS to change the number of requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+from fastapi import FastAPI
+
+from app.middleware.limiter import _buckets
+from app.middleware.security_pipeline import DEFAULT_LAYERS, SecurityPipelineMiddleware
+
+REQUESTS = int(os.environ.get("SECURITY_PIPELINE_BENCH_REQUESTS", "2000"))
+AUTH_HEADERS = [(b"authorization", b"Bearer bench-token-0123456789")]
+
+
+def make_app(pipeline: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/v1/designs/{design_id}")
+    async def get_design(design_id: str):
+        return {"id": design_id, "name": "bracket", "status": "ready"}
+
+    if pipeline:
+        app.add_middleware(SecurityPipelineMiddleware, routes=app.routes)
+    else:
+        for _, layer_cls in reversed(DEFAULT_LAYERS):
+            app.add_middleware(layer_cls)
+    return app
+
+
+async def call(app, path: str, headers) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "https", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"api"), *headers],
+        "client": ("10.0.0.1", 40000), "server": ("api", 443),
+    }
+    status = 0
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, path: str, headers):
+    # First call builds the middleware stack
+    assert await call(app, path, headers) == 200
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        _buckets.clear()  # keep the design route under its rate limit
+        t0 = time.perf_counter()
+        assert await call(app, path, headers) == 200
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return REQUESTS / elapsed, p99
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize(
+    "path, headers",
+    [("/api/v1/health", []), ("/api/v1/designs/42", AUTH_HEADERS)],
+    ids=["health", "design"],
+)
+def test_pipeline_beats_middleware_stack(path, headers):
+    stack_rps, stack_p99 = asyncio.run(measure(make_app(pipeline=False), path, headers))
+    pipe_rps, pipe_p99 = asyncio.run(measure(make_app(pipeline=True), path, headers))
+
+    print(
+        f"\n{path}, {REQUESTS} requests\n"
+        f"stack:    {stack_rps:8.0f} req/s, p99 {stack_p99 * 1000:.2f} ms\n"
+        f"pipeline: {pipe_rps:8.0f} req/s, p99 {pipe_p99 * 1000:.2f} ms "
+        f"({pipe_rps / stack_rps:.1f}x)"
+    )
+
+    assert pipe_rps > stack_rps * 1.5
+    assert pipe_p99 < stack_p99
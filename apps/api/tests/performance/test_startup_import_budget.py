@@ -0,0 +1,54 @@
+"""
+Benchmark: cold-start import time of the API and the Celery worker.
+
+Each entry point is imported in a fresh interpreter under
+``python -X importtime`` (app.core.startup_profile). The test fails when
+the wall time exceeds the budget, or when a heavy dependency that is now
+loaded on first use is imported at startup again.
+
+Budgets are in seconds: STARTUP_IMPORT_BUDGET_API_S (default 6) and
+STARTUP_IMPORT_BUDGET_CELERY_S (default 4).
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.core.startup_profile import format_profile, profile_imports
+
+BUDGETS = {
+    "app.main": float(os.environ.get("STARTUP_IMPORT_BUDGET_API_S", "6")),
+    "app.core.celery_app": float(os.environ.get("STARTUP_IMPORT_BUDGET_CELERY_S", "4")),
+}
+
+# Loaded on first use; importing them at startup is a regression
+DEFERRED = ["reportlab", "cairosvg", "qrcode", "numpy", "boto3", "trimesh", "ezdxf"]
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("target", list(BUDGETS))
+def test_cold_start_import_budget(target):
+    profile = profile_imports(target, env={"LAZY_ROUTERS_ENABLED": "true"})
+
+    print("\n" + format_profile(profile, top=15))
+
+    assert not [name for name in DEFERRED if profile.imported(name)]
+    assert profile.wall_seconds < BUDGETS[target]
+
+
+@pytest.mark.performance
+def test_lazy_routers_cut_api_import_time():
+    eager = profile_imports("app.main", env={"LAZY_ROUTERS_ENABLED": "false"})
+    lazy = profile_imports("app.main", env={"LAZY_ROUTERS_ENABLED": "true"})
+
+    print(
+        f"\napp.main import\n"
+        f"eager routers: {eager.wall_seconds:.2f}s, {len(eager.records)} modules\n"
+        f"lazy routers:  {lazy.wall_seconds:.2f}s, {len(lazy.records)} modules "
+        f"({eager.wall_seconds / lazy.wall_seconds:.1f}x)"
+    )
+
+    assert len(lazy.records) < len(eager.records)
+    assert lazy.wall_seconds < eager.wall_seconds
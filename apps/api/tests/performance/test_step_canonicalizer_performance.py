@@ -0,0 +1,105 @@
+"""
+Benchmark: STEP canonicalization of a large assembly export.
+
+Compares the previous approach (read the whole file into a string, regex
+the header, scan for markers, write it back, then read it again to hash)
+with the streaming canonicalizer (one read, header rewrite, buffered copy,
+hash and validation in the same pass). Reports wall time and peak traced
+Python memory.
+
+Set STEP_BENCH_MB to change the generated file size (default 200 MB).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import time
+import tracemalloc
+
+import pytest
+
+from app.services.freecad.step_canonicalizer import canonicalize_step_file
+
+SIZE_MB = int(os.environ.get("STEP_BENCH_MB", "200"))
+
+HEADER = (
+    "HEADER;\n"
+    "FILE_DESCRIPTION(('FreeCAD Model'),'2;1');\n"
+    "FILE_NAME('assembly.step','2024-01-15T10:30:00',('user@example.com'),('org'),'pre','orig','');\n"
+    "FILE_SCHEMA(('AUTOMOTIVE_DESIGN { 1 0 10303 214 3 1 1 }'));\n"
+    "ENDSEC;\n"
+)
+TIMESTAMP = re.compile(r"'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?'")
+USERNAME = re.compile(r"'[^']*@[^']*'")
+
+
+def _clean(header: str) -> str:
+    return USERNAME.sub("'deterministic@export'", TIMESTAMP.sub("'2000-01-01T00:00:00+00:00'", header))
+
+
+def _write_step(path) -> None:
+    block = "".join(
+        f"#{i}=CARTESIAN_POINT('',({i * 0.5:.6f},{i * -0.25:.6f},{i * 1.5:.6f}));\n" for i in range(1, 20001)
+    ).encode()
+    with open(path, "wb") as f:
+        f.write(f"ISO-10303-21;\n{HEADER}DATA;\n".encode())
+        for _ in range(max(1, SIZE_MB * 1024 * 1024 // len(block))):
+            f.write(block)
+        f.write(b"ENDSEC;\nEND-ISO-10303-21;\n")
+
+
+def _legacy(path) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    match = re.search(r"(HEADER;.*?ENDSEC;)", content, re.DOTALL)
+    start, end = match.span()
+    content = content[:start] + _clean(match.group(1)) + content[end:]
+    assert all(m in content for m in ("ISO-10303-21", "HEADER", "ENDSEC", "DATA", "END-ISO-10303-21"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    del content
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(8192), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+@pytest.mark.performance
+def test_streaming_step_canonicalization(tmp_path):
+    legacy_path = tmp_path / "legacy.step"
+    streaming_path = tmp_path / "streaming.step"
+    _write_step(legacy_path)
+    shutil.copyfile(legacy_path, streaming_path)
+    size = legacy_path.stat().st_size
+
+    legacy_hash, legacy_seconds, legacy_peak = _measure(lambda: _legacy(legacy_path))
+    result, streaming_seconds, streaming_peak = _measure(lambda: canonicalize_step_file(streaming_path, _clean))
+
+    report = {
+        "file_mb": round(size / 1024 / 1024),
+        "legacy_s": round(legacy_seconds, 2),
+        "legacy_peak_mb": round(legacy_peak / 1024 / 1024),
+        "streaming_s": round(streaming_seconds, 2),
+        "streaming_peak_mb": round(streaming_peak / 1024 / 1024, 1),
+        "speedup": round(legacy_seconds / streaming_seconds, 2),
+    }
+    print("\nSTEP canonicalization benchmark:", report)
+
+    assert result.valid
+    assert result.sha256 == legacy_hash
+    assert streaming_path.read_bytes() == legacy_path.read_bytes()
+    assert streaming_peak < legacy_peak / 10
@@ -0,0 +1,149 @@
+"""
+Benchmark: threat scanning of design-API payloads, combined scanner against
+the former per-pattern checks.
+
+The corpus is built from DesignCreateRequest-shaped bodies (prompt,
+parametric, upload and Assembly4 inputs, with metadata) plus a small share
+of hostile ones. Two paths are measured:
+
+- middleware: the former XSSDetectionMiddleware body handling (json.loads,
+  a flattened ``body_<key>`` dict, then a substring check per marker per
+  field) against SecurityManager.scan_request_json on the raw body;
+- validation: the former comprehensive_validate checks (every compiled
+  pattern run separately over each string) against one scanner pass.
+
+Set THREAT_BENCH_PAYLOADS to change the corpus size (default 2,000).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+
+import pytest
+
+from app.core.security import REQUEST_XSS_PATTERNS, security_manager
+from app.core.threat_scanner import iter_json_fields
+from app.services.input_sanitization_service import InputSanitizationService
+
+PAYLOADS = int(os.environ.get("THREAT_BENCH_PAYLOADS", "2000"))
+HOSTILE_SHARE = 0.02
+HOSTILE = [
+    "<script>alert('x')</script>",
+    "'; DROP TABLE users; --",
+    "../../../etc/passwd",
+    "flange; rm -rf /",
+    "<img src=x onerror=alert(1)>",
+]
+PROMPTS = [
+    "10mm çapında 50mm uzunluğunda mil tasarla",
+    "DN50 flanş, 8 adet M16 cıvata deliği, 18mm kalınlık",
+    "L şeklinde braket, 40x25mm, köşelerde 2mm radius",
+    "Design a mounting plate 120 x 80 mm with four 6.5 mm holes",
+]
+
+
+def _design_body(rng: random.Random) -> dict:
+    kind = rng.choice(["prompt", "params", "upload", "a4"])
+    if kind == "prompt":
+        design = {"type": "prompt", "prompt": rng.choice(PROMPTS), "context": "CNC freze, alüminyum",
+                  "max_iterations": 3, "temperature": 0.7}
+    elif kind == "params":
+        design = {
+            "type": "params",
+            "template_id": f"bracket_v{rng.randint(1, 9)}",
+            "dimensions": {name: {"value": round(rng.uniform(5, 200), 2), "unit": "mm", "tolerance": 0.05}
+                           for name in ("width", "height", "depth", "hole_diameter", "fillet_radius")},
+            "material": {"type": "aluminum", "grade": "6061-T6"},
+            "process": "milling",
+            "quantity": rng.randint(1, 50),
+        }
+    elif kind == "upload":
+        design = {"type": "upload", "s3_key": f"uploads/{rng.getrandbits(64):016x}/part.step",
+                  "file_format": ".step", "file_size": rng.randint(10_000, 5_000_000),
+                  "sha256": f"{rng.getrandbits(256):064x}", "conversion_target": "FCStd"}
+    else:
+        parts = [{"part_type": "box", "name": f"plate_{i}", "length": 100.0, "width": 60.0, "height": 8.0}
+                 for i in range(6)]
+        design = {"type": "a4", "parts": parts,
+                  "constraints": [{"type": "Attachment", "part1": f"plate_{i}", "part2": f"plate_{i + 1}",
+                                   "offset": [0.0, 0.0, 8.0]} for i in range(5)]}
+    return {"design": design, "priority": 5, "metadata": {"project": "Pompa gövdesi", "tags": ["cnc", "rev-b"]},
+            "chain_cam": rng.random() < 0.5}
+
+
+def _corpus() -> list[str]:
+    rng = random.Random(42)
+    bodies = []
+    for _ in range(PAYLOADS):
+        body = _design_body(rng)
+        if rng.random() < HOSTILE_SHARE:
+            body["metadata"]["note"] = rng.choice(HOSTILE)
+        bodies.append(json.dumps(body, ensure_ascii=False))
+    return bodies
+
+
+def _legacy_middleware(body_text: str) -> bool:
+    data = {}
+    body_json = json.loads(body_text)
+    for key, value in body_json.items():
+        data[f"body_{key}"] = str(value)[:1000]
+    for value in data.values():
+        value_lower = value.lower()
+        if any(pattern in value_lower for pattern in REQUEST_XSS_PATTERNS):
+            return True
+    return False
+
+
+def _legacy_validate(service: InputSanitizationService, text: str) -> bool:
+    lowered = text.lower()
+    unsafe = any(p.findall(lowered) for p in service.compiled_xss_patterns)
+    if len(text) > 5 and any(k in lowered for k in service.SQL_INJECTION_TRIGGERS):
+        unsafe |= any(p.findall(lowered) for p in service.compiled_sql_patterns)
+    unsafe |= any(p.findall(text) for p in service.compiled_path_patterns)
+    if len(text) > 3 and any(o in text for o in service.COMMAND_INJECTION_TRIGGERS):
+        unsafe |= any(p.findall(text) for p in service.compiled_cmd_patterns)
+    return unsafe
+
+
+def _time(func, items) -> tuple[float, int]:
+    start = time.perf_counter()
+    flagged = sum(1 for item in items if func(item))
+    return time.perf_counter() - start, flagged
+
+
+@pytest.mark.performance
+def test_threat_scanner_throughput_on_design_payloads():
+    service = InputSanitizationService()
+    bodies = _corpus()
+    strings = [value for body in bodies for _, value in iter_json_fields(body)]
+
+    legacy_mw, legacy_mw_flagged = _time(_legacy_middleware, bodies)
+    scanner_mw, scanner_mw_flagged = _time(
+        lambda body: security_manager.scan_request_json(body, max_chars=1000) is not None,
+        bodies,
+    )
+    legacy_val, legacy_val_flagged = _time(lambda text: _legacy_validate(service, text), strings)
+    scanner_val, scanner_val_flagged = _time(
+        lambda text: bool(service.threat_scanner.matched_categories(text)), strings
+    )
+
+    report = {
+        "payloads": PAYLOADS,
+        "strings": len(strings),
+        "middleware_legacy_us_per_body": round(legacy_mw / PAYLOADS * 1e6, 1),
+        "middleware_scanner_us_per_body": round(scanner_mw / PAYLOADS * 1e6, 1),
+        "validate_legacy_us_per_string": round(legacy_val / len(strings) * 1e6, 2),
+        "validate_scanner_us_per_string": round(scanner_val / len(strings) * 1e6, 2),
+        "validate_speedup": round(legacy_val / scanner_val, 1),
+        "flagged_bodies": scanner_mw_flagged,
+        "flagged_strings": scanner_val_flagged,
+    }
+    print("\nThreat scanner benchmark:", report)
+
+    assert scanner_val_flagged == legacy_val_flagged
+    assert scanner_mw_flagged >= legacy_mw_flagged
+    assert scanner_val < legacy_val
+    assert scanner_mw < legacy_mw
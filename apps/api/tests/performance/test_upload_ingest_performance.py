@@ -0,0 +1,85 @@
+"""
+Benchmark: finalize-time reads of one uploaded STEP object.
+
+- two-pass: SHA256StreamingService.verify_object_hash, then
+  ClamAVService.scan_object_sync reading the object again, as finalize
+  used to
+- single-pass: UploadIngestService hashing, sniffing and scanning from one
+  read over a pooled clamd session
+
+The object comes from an in-memory MinIO stand-in throttled to
+UPLOAD_INGEST_BENCH_READ_MBPS (default 400) and is scanned by a fake clamd
+throttled to UPLOAD_INGEST_BENCH_SCAN_MBPS (default 400). The object is
+UPLOAD_INGEST_BENCH_MB (default 64) MB, under the 100 MB scan limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from app.services.clamav_service import ClamAVService
+from app.services.sha256_service import SHA256StreamingService
+from app.services.upload_ingest_service import UploadIngestService
+from tests.utils.fake_upload_backends import FakeClamd, FakeObjectClient
+
+SIZE = int(os.environ.get("UPLOAD_INGEST_BENCH_MB", "64")) * 1024 * 1024
+READ_BPS = float(os.environ.get("UPLOAD_INGEST_BENCH_READ_MBPS", "400")) * 1024 * 1024
+SCAN_BPS = float(os.environ.get("UPLOAD_INGEST_BENCH_SCAN_MBPS", "400")) * 1024 * 1024
+
+BUCKET, NAME = "artefacts", "job-bench/housing.step"
+
+
+def step_object(size: int) -> bytes:
+    header = b"ISO-10303-21;\nHEADER;\nFILE_SCHEMA(('AUTOMOTIVE_DESIGN'));\nENDSEC;\nDATA;\n"
+    body = b"#100=CARTESIAN_POINT('',(12.5,-3.25,40.));\n"
+    return (header + body * (size // len(body) + 1))[:size]
+
+
+def two_pass(client, clamav, data, expected):
+    is_valid, sha256, _, _ = SHA256StreamingService(client=client).verify_object_hash(
+        BUCKET, NAME, expected, len(data)
+    )
+    scan = clamav.scan_object_sync(BUCKET, NAME, mime_type="application/step", file_type="model")
+    return is_valid and scan.is_clean
+
+
+def single_pass(client, clamav, data, expected):
+    verdict = UploadIngestService(client=client, clamav_service=clamav).ingest_object(
+        BUCKET, NAME, size=len(data), expected_sha256=expected,
+        mime_type="application/step", file_type="model",
+    )
+    return verdict.accepted
+
+
+@pytest.mark.performance
+def test_single_pass_reads_once_and_beats_two_pass():
+    data = step_object(SIZE)
+    expected = hashlib.sha256(data).hexdigest()
+    results = {}
+
+    with FakeClamd(bytes_per_second=SCAN_BPS) as clamd:
+        for name, run in (("two-pass", two_pass), ("single-pass", single_pass)):
+            client = FakeObjectClient(bytes_per_second=READ_BPS)
+            client.put(BUCKET, NAME, data)
+            clamav = ClamAVService(host="127.0.0.1", port=clamd.port, timeout_scan=120.0, minio_client=client)
+
+            start = time.perf_counter()
+            assert run(client, clamav, data, expected)
+            results[name] = (time.perf_counter() - start, client.bytes_served)
+
+    two_s, two_bytes = results["two-pass"]
+    one_s, one_bytes = results["single-pass"]
+    print(
+        f"\n{SIZE // (1024 * 1024)} MB object\n"
+        f"two-pass:    {two_s * 1000:7.0f} ms, {two_bytes / SIZE:.1f}x object bytes read\n"
+        f"single-pass: {one_s * 1000:7.0f} ms, {one_bytes / SIZE:.1f}x object bytes read "
+        f"({two_s / one_s:.1f}x)"
+    )
+
+    assert two_bytes == 2 * SIZE
+    assert one_bytes == SIZE
+    assert one_s < two_s * 0.75
@@ -0,0 +1,111 @@
+"""
+Benchmark: wall thickness on a tessellated hollow sphere shell.
+
+Reports samples per second and the thinnest/median wall for shells of
+increasing tessellation density. For comparison it times the previous
+sampling pattern on the smallest mesh: a 20x20x20 grid, an inside test per
+point and six axis rays per inside point, each ray tested against every
+triangle one call at a time. The old code issued OCC ``isInside`` and
+``section`` calls instead, which are slower than these NumPy calls, so the
+reported gap is a lower bound.
+
+Set WALL_BENCH_LATITUDES to a comma-separated list of sphere resolutions.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.services.wall_thickness_engine import WallThicknessEngine
+
+LATITUDES = [int(n) for n in os.environ.get("WALL_BENCH_LATITUDES", "40,120,200").split(",")]
+OUTER, INNER = 50.0, 47.0
+
+
+def _sphere(radius: float, n_lat: int, inward: bool = False) -> np.ndarray:
+    theta = np.linspace(0, np.pi, n_lat + 1)
+    phi = np.linspace(0, 2 * np.pi, 2 * n_lat + 1)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    pts = np.stack([np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)], axis=-1) * radius
+    a, b, c, d = pts[:-1, :-1], pts[1:, :-1], pts[1:, 1:], pts[:-1, 1:]
+    tri = np.concatenate([np.stack([a, b, c], -2).reshape(-1, 3, 3), np.stack([a, c, d], -2).reshape(-1, 3, 3)])
+    tri = tri[np.linalg.norm(np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]), axis=1) > 1e-9]
+    return tri[:, ::-1] if inward else tri
+
+
+def _shell(n_lat: int) -> np.ndarray:
+    return np.concatenate([_sphere(OUTER, n_lat), _sphere(INNER, n_lat, inward=True)])
+
+
+def _ray_distances(tri: np.ndarray, origin: np.ndarray, direction: np.ndarray) -> np.ndarray:
+    e1, e2 = tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]
+    p = np.cross(direction, e2)
+    det = np.einsum("ij,ij->i", e1, p)
+    det = np.where(np.abs(det) < 1e-14, np.nan, det)
+    s = origin - tri[:, 0]
+    u = np.einsum("ij,ij->i", s, p) / det
+    q = np.cross(s, e1)
+    v = (q @ direction) / det
+    t = np.einsum("ij,ij->i", e2, q) / det
+    return t[(u >= 0) & (v >= 0) & (u + v <= 1) & (t > 1e-9)]
+
+
+def _legacy_grid(tri: np.ndarray, resolution: int = 20) -> dict:
+    axes = np.eye(3)
+    steps = np.linspace(-OUTER, OUTER, resolution, endpoint=False)
+    thickness = {}
+    for x in steps:
+        for y in steps:
+            for z in steps:
+                point = np.array([x, y, z])
+                # Inside test: odd number of crossings along +X
+                if len(_ray_distances(tri, point, axes[0])) % 2 == 0:
+                    continue
+                hits = [_ray_distances(tri, point, s * axis) for axis in axes for s in (1, -1)]
+                distances = np.concatenate(hits)
+                if len(distances):
+                    thickness[(x, y, z)] = float(distances.min())
+    return thickness
+
+
+@pytest.mark.performance
+def test_wall_thickness_engine_throughput():
+    report = {}
+    for n_lat in LATITUDES:
+        tri = _shell(n_lat)
+        start = time.perf_counter()
+        result = WallThicknessEngine().analyze_mesh(tri)
+        seconds = time.perf_counter() - start
+
+        assert result.measured.all()
+        assert result.min_thickness == pytest.approx(OUTER - INNER, rel=0.01)
+        report[f"{len(tri)}_triangles"] = {
+            "samples": len(result.points),
+            "seconds": round(seconds, 2),
+            "samples_per_s": round(len(result.points) / seconds),
+            "median_thickness": round(float(np.median(result.thickness)), 3),
+        }
+
+    tri = _shell(LATITUDES[0])
+    start = time.perf_counter()
+    legacy = _legacy_grid(tri)
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    dense = WallThicknessEngine(sample_spacing=1.0).analyze_mesh(tri)
+    dense_seconds = time.perf_counter() - start
+    report["grid_vs_mesh"] = {
+        "triangles": len(tri),
+        "legacy_points": len(legacy),
+        "legacy_s": round(legacy_seconds, 2),
+        "mesh_samples": len(dense.points),
+        "mesh_s": round(dense_seconds, 2),
+        "samples_per_s_ratio": round((len(dense.points) / dense_seconds) / (len(legacy) / legacy_seconds), 1),
+    }
+    print("\nWall thickness benchmark:", report)
+
+    assert dense_seconds < legacy_seconds
+    assert len(dense.points) > len(legacy)
@@ -0,0 +1,86 @@
+"""
+Benchmark: wall-clock time of a wide synthetic workflow.
+
+One build step fans out to WORKFLOW_BENCH_WIDTH (default 32) export
+steps that join in a publish step, each sleeping WORKFLOW_BENCH_STEP_MS
+(default 20 ms) to stand in for I/O-bound work.
+
+- serial: parallel_limit=1, which is how the engine used to run steps
+- dag: the default parallel_limit of 10
+- dag (export limit 4): per-action limit on the export branch
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.services.workflow_automation import (
+    ExecutionOptions,
+    Workflow,
+    WorkflowEngine,
+    WorkflowStateStore,
+    WorkflowStep,
+)
+
+WIDTH = int(os.environ.get("WORKFLOW_BENCH_WIDTH", "32"))
+STEP_S = int(os.environ.get("WORKFLOW_BENCH_STEP_MS", "20")) / 1000
+
+
+async def work(params):
+    await asyncio.sleep(STEP_S)
+    return {"ok": True}
+
+
+def wide_workflow() -> Workflow:
+    exports = [
+        WorkflowStep(id=f"export_{i}", name=f"export_{i}", action="export", dependencies=["build"])
+        for i in range(WIDTH)
+    ]
+    return Workflow(
+        name="wide",
+        steps=[
+            WorkflowStep(id="build", name="build", action="build"),
+            *exports,
+            WorkflowStep(
+                id="publish", name="publish", action="build",
+                dependencies=[s.id for s in exports]
+            ),
+        ],
+    )
+
+
+async def run(store, options: ExecutionOptions) -> float:
+    engine = WorkflowEngine(state_store=store)
+    engine.step_executor.register_action("build", work)
+    engine.step_executor.register_action("export", work)
+    workflow = await engine.define_workflow(wide_workflow())
+
+    start = time.perf_counter()
+    execution = await engine.execute_workflow(workflow.id, {}, options)
+    elapsed = time.perf_counter() - start
+
+    assert len(execution.step_results) == WIDTH + 2
+    return elapsed
+
+
+@pytest.mark.performance
+def test_dag_scheduler_beats_serial_on_wide_workflow(tmp_path):
+    store = WorkflowStateStore(tmp_path)
+
+    serial = asyncio.run(run(store, ExecutionOptions(parallel_limit=1)))
+    dag = asyncio.run(run(store, ExecutionOptions()))
+    limited = asyncio.run(run(store, ExecutionOptions(action_limits={"export": 4})))
+
+    print(
+        f"\n{WIDTH + 2} steps, {STEP_S * 1000:.0f} ms each\n"
+        f"serial:                 {serial * 1000:.0f} ms\n"
+        f"dag:                    {dag * 1000:.0f} ms ({serial / dag:.1f}x)\n"
+        f"dag (export limit 4):   {limited * 1000:.0f} ms ({serial / limited:.1f}x)"
+    )
+
+    assert dag < serial / 4
+    assert dag < limited < serial
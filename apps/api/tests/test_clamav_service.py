@@ -30,8 +30,10 @@ from app.services.clamav_service import (
     EICAR_TEST_STRING,
     SCANNABLE_FILE_TYPES,
     SKIP_SCAN_EXTENSIONS,
+    SecurityEventType,
 )
-from app.models.security_event import SecurityEvent, SecurityEventType, SeverityLevel
+from app.models.enums import SecuritySeverity
+from app.models.security_event import SecurityEvent
 
 
 class TestClamAVService:
@@ -256,7 +258,7 @@ class TestClamAVService:
         mock_log_event.assert_called_once()
         call_args = mock_log_event.call_args
         assert call_args[1]["event_type"] == SecurityEventType.MALWARE_DETECTED
-        assert call_args[1]["severity"] == SeverityLevel.CRITICAL
+        assert call_args[1]["severity"] == SecuritySeverity.CRITICAL
 
     @pytest.mark.asyncio
     async def test_scan_object_stream_file_too_large(self):
@@ -431,7 +433,7 @@ class TestClamAVService:
                 event_type=SecurityEventType.MALWARE_DETECTED,
                 description="Test malware detection",
                 details={"virus_name": "Test-Virus"},
-                severity=SeverityLevel.CRITICAL,
+                severity=SecuritySeverity.CRITICAL,
             )
         
         # Verify database event creation
@@ -441,9 +443,9 @@ class TestClamAVService:
         # Get the security event that was added
         security_event = self.mock_db.add.call_args[0][0]
         assert isinstance(security_event, SecurityEvent)
-        assert security_event.event_type == SecurityEventType.MALWARE_DETECTED
-        assert security_event.description == "Test malware detection"
-        assert security_event.severity == SeverityLevel.CRITICAL
+        assert security_event.type == SecurityEventType.MALWARE_DETECTED.value
+        assert security_event.event_metadata["description"] == "Test malware detection"
+        assert security_event.event_metadata["severity"] == SecuritySeverity.CRITICAL.value
 
     def test_log_security_event_no_db(self):
         """Test security event logging without database session."""
@@ -26,12 +26,21 @@ from app.middleware.license_middleware import (
     is_license_expiry_processed,
     get_db_session_for_middleware
 )
+from app.services.license_entitlement_cache import LicenseEntitlementCache
 from app.models.license import License
 from app.models.session import Session  
 from app.models.user import User
 from app.middleware.jwt_middleware import AuthenticatedUser
 
 
+def _patch_async_session(mock_db=None):
+    """Patch the async session factory used for entitlement loads."""
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=mock_db or Mock())
+    factory.return_value.__aexit__ = AsyncMock(return_value=None)
+    return patch('app.middleware.license_middleware.AsyncSessionLocal', factory)
+
+
 class TestLicenseGuardMiddleware:
     """Test suite for License Guard Middleware."""
     
@@ -42,7 +51,7 @@ class TestLicenseGuardMiddleware:
     @pytest.fixture
     def middleware(self):
         """Create middleware instance for testing."""
-        return LicenseGuardMiddleware(app=Mock())
+        return LicenseGuardMiddleware(app=Mock(), entitlement_cache=LicenseEntitlementCache(use_redis=False))
     
     @pytest.fixture
     def mock_request(self):
@@ -191,31 +200,40 @@ class TestLicenseGuardMiddleware:
         mock_auth_user.assert_called_once_with("valid_token_here", mock_db)
     
     @pytest.mark.asyncio
-    @patch('app.middleware.license_middleware.LicenseService.get_active_license')
-    @patch('app.middleware.license_middleware.get_db')
-    async def test_check_license_valid(self, mock_get_db, mock_get_license, middleware, mock_request, mock_license_active):
+    @patch('app.middleware.license_middleware.LicenseService.get_active_license_async', new_callable=AsyncMock)
+    async def test_check_license_valid(self, mock_get_license, middleware, mock_request, mock_license_active):
         """Test license check with valid license."""
         # Setup mocks
         mock_db = Mock()
-        mock_get_db.return_value = iter([mock_db])
         mock_get_license.return_value = mock_license_active
         
-        result = await middleware._check_license_and_enforce(mock_request, 123, "test-request-id")
+        with _patch_async_session(mock_db):
+            result = await middleware._check_license_and_enforce(mock_request, 123, "test-request-id")
         
         assert result is None  # No error response means license is valid
         mock_get_license.assert_called_once_with(mock_db, 123)
     
     @pytest.mark.asyncio
-    @patch('app.middleware.license_middleware.LicenseService.get_active_license')
-    @patch('app.middleware.license_middleware.get_db')
-    async def test_check_license_no_license(self, mock_get_db, mock_get_license, middleware, mock_request):
+    @patch('app.middleware.license_middleware.LicenseService.get_active_license_async', new_callable=AsyncMock)
+    async def test_check_license_served_from_cache(self, mock_get_license, middleware, mock_request, mock_license_active):
+        """Test repeated license checks query the database once."""
+        mock_get_license.return_value = mock_license_active
+        
+        with _patch_async_session():
+            for _ in range(5):
+                assert await middleware._check_license_and_enforce(mock_request, 123, "test-request-id") is None
+        
+        mock_get_license.assert_called_once()
+    
+    @pytest.mark.asyncio
+    @patch('app.middleware.license_middleware.LicenseService.get_active_license_async', new_callable=AsyncMock)
+    async def test_check_license_no_license(self, mock_get_license, middleware, mock_request):
         """Test license check with no active license."""
         # Setup mocks
-        mock_db = Mock()
-        mock_get_db.return_value = iter([mock_db])
         mock_get_license.return_value = None
         
-        result = await middleware._check_license_and_enforce(mock_request, 123, "test-request-id")
+        with _patch_async_session():
+            result = await middleware._check_license_and_enforce(mock_request, 123, "test-request-id")
         
         assert isinstance(result, JSONResponse)
         assert result.status_code == 403
@@ -226,16 +244,15 @@ class TestLicenseGuardMiddleware:
         assert "no_active_license" in content
     
     @pytest.mark.asyncio
-    @patch('app.middleware.license_middleware.LicenseService.get_active_license')
-    @patch('app.middleware.license_middleware.get_db')
-    async def test_check_license_expired(self, mock_get_db, mock_get_license, middleware, mock_request, mock_license_expired):
+    @patch('app.middleware.license_middleware.get_db_session_for_middleware')
+    @patch('app.middleware.license_middleware.LicenseService.get_active_license_async', new_callable=AsyncMock)
+    async def test_check_license_expired(self, mock_get_license, mock_session, middleware, mock_request, mock_license_expired):
         """Test license check with expired license."""
         # Setup mocks
-        mock_db = Mock()
-        mock_get_db.return_value = iter([mock_db])
         mock_get_license.return_value = mock_license_expired
         
-        with patch.object(middleware, '_revoke_user_sessions_on_expiry', return_value=True) as mock_revoke:
+        with _patch_async_session(), \
+                patch.object(middleware, '_revoke_user_sessions_on_expiry', return_value=True) as mock_revoke:
             result = await middleware._check_license_and_enforce(mock_request, 123, "test-request-id")
             
             assert isinstance(result, JSONResponse)
@@ -534,7 +551,7 @@ class TestLicenseMiddlewareEdgeCases:
     @pytest.mark.asyncio
     async def test_license_check_with_database_error(self):
         """Test proper database error handling in license check."""
-        middleware = LicenseGuardMiddleware(app=Mock())
+        middleware = LicenseGuardMiddleware(app=Mock(), entitlement_cache=LicenseEntitlementCache(use_redis=False))
         mock_request = Mock(spec=Request)
         mock_request.url.path = "/api/v1/jobs"
         mock_request.client.host = "192.168.1.100"
@@ -546,7 +563,9 @@ class TestLicenseMiddlewareEdgeCases:
             mock_session.return_value.__enter__.return_value = mock_db
             mock_session.return_value.__exit__.return_value = None
             
-            with patch('app.middleware.license_middleware.LicenseService.get_active_license') as mock_get_license:
+            with _patch_async_session(), \
+                    patch('app.middleware.license_middleware.LicenseService.get_active_license_async',
+                          new_callable=AsyncMock) as mock_get_license:
                 mock_get_license.side_effect = IntegrityError("Constraint violation", "", "")
                 
                 result = await middleware._check_license_and_enforce(mock_request, 123, "test-req-id")
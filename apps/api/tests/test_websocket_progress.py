@@ -283,11 +283,11 @@ class TestSSEProgress:
         auth_headers: Dict[str, str]
     ):
         """Test SSE reconnection with last_event_id."""
-        # Simulate some events already sent
+        # Simulate some events already sent; their IDs come from the job's stream
+        sent_event_ids = []
         for i in range(5):
             progress = ProgressMessageV2(
                 job_id=mock_job.id,
-                event_id=i + 1,
                 event_type=EventType.PROGRESS_UPDATE,
                 progress_pct=i * 20,
                 message=f"Step {i + 1}",
@@ -297,9 +297,10 @@ class TestSSEProgress:
                 mock_job.id,
                 progress
             )
+            sent_event_ids.append(progress.event_id)
         
         # Connect with last_event_id
-        headers = {**auth_headers, "Last-Event-ID": "3"}
+        headers = {**auth_headers, "Last-Event-ID": str(sent_event_ids[2])}
         
         async with async_client.stream(
             "GET",
@@ -308,18 +309,18 @@ class TestSSEProgress:
         ) as response:
             assert response.status_code == 200
             
-            # Should receive events after event_id=3
+            # Should receive the events after the third (after the status event)
             event_ids = []
             async for line in response.aiter_lines():
                 if line.startswith("id:"):
                     event_id = int(line.split(":")[1].strip())
                     event_ids.append(event_id)
-                    if len(event_ids) >= 2:
+                    if len(event_ids) >= 3:
                         break
             
             # Should have received events 4 and 5
-            assert 4 in event_ids
-            assert 5 in event_ids
+            assert sent_event_ids[3] in event_ids
+            assert sent_event_ids[4] in event_ids
     
     @pytest.mark.asyncio
     async def test_sse_filtering(
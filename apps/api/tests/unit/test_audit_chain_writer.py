@@ -0,0 +1,258 @@
+"""
+Tests for the audit hash-chain appender, the batched chain writer and
+chunked/parallel chain verification.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.middleware  # noqa: F401  (loads the audit/license import cycle in working order)
+from app.core.environment import environment as settings
+from app.helpers import audit_chain
+from app.helpers.audit_chain import AuditChainHelper, shutdown_verify_executor, verify_in_chunks
+from app.models.audit_log import AuditLog
+from app.services.audit_chain_writer import (
+    AuditChainWriter,
+    AuditQueueFullError,
+    PendingAuditEntry,
+    append_to_chain,
+    job_chain_data,
+)
+from app.services.job_audit_service import JobAuditService
+
+# The model's check constraints use PostgreSQL regex syntax
+AUDIT_LOGS_DDL = """
+CREATE TABLE audit_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope_type VARCHAR(50) NOT NULL,
+    scope_id BIGINT,
+    actor_user_id INTEGER,
+    event_type VARCHAR(100) NOT NULL,
+    correlation_id VARCHAR(255),
+    session_id VARCHAR(255),
+    resource VARCHAR(255),
+    ip_masked VARCHAR(45),
+    ua_masked TEXT,
+    payload JSON,
+    prev_chain_hash VARCHAR(64) NOT NULL,
+    chain_hash VARCHAR(64) NOT NULL UNIQUE,
+    created_at DATETIME NOT NULL
+)
+"""
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text(AUDIT_LOGS_DDL))
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def _entry(i: int, **kwargs) -> PendingAuditEntry:
+    return PendingAuditEntry(
+        event_type="user_login",
+        scope_type="user",
+        scope_id=i,
+        payload={"event_type": "user_login", "data": {"attempt": i}},
+        **kwargs
+    )
+
+
+def _job_entry(job_id: int, job_event: str, data: dict) -> PendingAuditEntry:
+    return PendingAuditEntry(
+        event_type=f"job_{job_event}",
+        scope_type="job",
+        scope_id=job_id,
+        payload={"event_type": f"job_{job_event}", "data": dict(data)},
+        job_event=job_event,
+    )
+
+
+def test_append_reads_tip_once_per_transaction(session_factory):
+    db = session_factory()
+    tip_reads = []
+
+    @event.listens_for(db.get_bind(), "before_cursor_execute")
+    def count(conn, cursor, statement, params, context, executemany):
+        if "ORDER BY audit_logs.id DESC" in statement:
+            tip_reads.append(statement)
+
+    first = append_to_chain(db, [_entry(1), _entry(2)])
+    second = append_to_chain(db, [_entry(3)])
+    db.commit()
+    third = append_to_chain(db, [_entry(4)])
+    db.commit()
+
+    assert len(tip_reads) == 2
+    assert first[0].prev_chain_hash == AuditLog.get_genesis_hash()
+    assert first[1].prev_chain_hash == first[0].chain_hash
+    assert second[0].prev_chain_hash == first[1].chain_hash
+    assert third[0].prev_chain_hash == second[0].chain_hash
+
+    report = AuditChainHelper.verify_chain_integrity(db, workers=1)
+    assert report["status"] == "integrity_verified"
+    assert report["verified_count"] == 4
+    db.close()
+
+
+def test_rollback_discards_cached_tip(session_factory):
+    db = session_factory()
+    append_to_chain(db, [_entry(1)])
+    db.commit()
+    append_to_chain(db, [_entry(2)])
+    db.rollback()
+    append_to_chain(db, [_entry(3)])
+    db.commit()
+
+    report = AuditChainHelper.verify_chain_integrity(db, workers=1)
+    assert report["status"] == "integrity_verified"
+    assert report["total_checked"] == 2
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_job_chain_assigned_in_batch_and_verified(session_factory):
+    db = session_factory()
+    append_to_chain(db, [
+        _job_entry(7, "created", {"priority": 1}),
+        _job_entry(8, "created", {"priority": 2}),
+        _job_entry(7, "started", {"worker": "w1"}),
+    ])
+    db.commit()
+    append_to_chain(db, [_job_entry(7, "succeeded", {"duration_ms": 1200.5})])
+    db.commit()
+
+    job7 = [job_chain_data(row.payload) for row in db.query(AuditLog).filter_by(scope_id=7).order_by(AuditLog.id)]
+    assert job7[0]["prev_hash"] == "0" * 64
+    assert [d["prev_hash"] for d in job7[1:]] == [d["chain_hash"] for d in job7[:-1]]
+
+    result = await JobAuditService.verify_job_audit_chain(db, 7, chunk_size=2, workers=1)
+    assert result["valid"], result
+    assert result["entries_checked"] == 3
+
+    # Tamper with the middle entry
+    row = db.query(AuditLog).filter_by(scope_id=7).order_by(AuditLog.id).offset(1).first()
+    payload = dict(row.payload)
+    payload["data"] = {**payload["data"], "worker": "w2"}
+    row.payload = payload
+    db.commit()
+
+    result = await JobAuditService.verify_job_audit_chain(db, 7, chunk_size=2, workers=1)
+    assert not result["valid"]
+    assert [v["error"] for v in result["violations"]] == ["chain_hash mismatch"]
+    db.close()
+
+
+def test_batched_writer_resolves_futures(session_factory):
+    writer = AuditChainWriter(session_factory=session_factory, batch_size=16, flush_interval_seconds=0.01)
+    futures = [writer.submit(_entry(i)) for i in range(50)]
+
+    assert writer.flush(timeout=10)
+    ids = [f.result(timeout=1) for f in futures]
+    writer.close()
+
+    assert ids == sorted(ids) and len(set(ids)) == 50
+    assert writer.stats()["written"] == 50
+    assert writer.stats()["batches"] < 50
+    db = session_factory()
+    assert AuditChainHelper.verify_chain_integrity(db, workers=1)["verified_count"] == 50
+    db.close()
+
+
+def test_batched_writer_isolates_bad_entry(session_factory):
+    writer = AuditChainWriter(session_factory=session_factory, batch_size=10, flush_interval_seconds=0.05)
+    bad = _entry(0)
+    bad.payload = {"data": object()}  # not JSON serializable
+    futures = [writer.submit(_entry(1)), writer.submit(bad), writer.submit(_entry(2))]
+    writer.flush(timeout=10)
+    writer.close()
+
+    assert futures[0].result() and futures[2].result()
+    with pytest.raises(TypeError):
+        futures[1].result()
+    assert writer.stats()["failed"] == 1
+
+
+def test_full_buffer_rejects_instead_of_blocking(session_factory):
+    writer = AuditChainWriter(session_factory=session_factory, batch_size=10, flush_interval_seconds=0.05, max_pending=1)
+    # Keep the writer thread from draining the buffer
+    with patch.object(writer, "_ensure_started"):
+        queued = writer.submit(_entry(1))
+        rejected = writer.submit(_entry(2))
+
+    with pytest.raises(AuditQueueFullError):
+        rejected.result(timeout=0)
+    assert writer.stats()["rejected"] == 1 and writer.stats()["submitted"] == 1
+
+    writer._ensure_started()
+    assert writer.flush(timeout=10)
+    writer.close()
+    assert queued.result(timeout=1)
+
+
+def test_parallel_verification_checkpoints_and_resume(session_factory):
+    db = session_factory()
+    for start in range(0, 200, 50):
+        append_to_chain(db, [_entry(i) for i in range(start, start + 50)])
+        db.commit()
+
+    with patch.object(settings, "AUDIT_CHAIN_CHECKPOINT_INTERVAL", 50), \
+            patch.object(settings, "AUDIT_CHAIN_VERIFY_PARALLEL_MIN_ENTRIES", 0):
+        report = AuditChainHelper.verify_chain_integrity(db, limit=None, chunk_size=30, workers=2)
+        assert report["status"] == "integrity_verified"
+        assert report["chunks"] == 7
+        assert [c["position"] for c in report["checkpoints"]] == [49, 99, 149, 199]
+
+        # Tamper with entry 121 (position 120)
+        row = db.get(AuditLog, 121)
+        row.payload = {**row.payload, "data": {"attempt": -1}}
+        db.commit()
+
+        report = AuditChainHelper.verify_chain_integrity(db, limit=None, chunk_size=30, workers=2)
+        assert report["status"] == "violations_detected"
+        assert [v["entry_id"] for v in report["integrity_violations"]] == [121]
+        assert [c["position"] for c in report["checkpoints"]] == [49, 99]
+
+        # Resume after the last clean checkpoint instead of from genesis
+        resumed = AuditChainHelper.verify_chain_integrity(
+            db, limit=None, chunk_size=30, workers=1, checkpoint=report["checkpoints"][-1]
+        )
+        assert resumed["start_id"] == 101
+        assert resumed["total_checked"] == 100
+        assert [v["entry_id"] for v in resumed["integrity_violations"]] == [121]
+
+        # A range starting mid-chain links against its predecessor
+        ranged = AuditChainHelper.verify_chain_integrity(db, start_id=150, end_id=160, workers=1)
+        assert ranged["status"] == "integrity_verified"
+        assert ranged["total_checked"] == 11
+    db.close()
+    pool = audit_chain._verify_executor
+    assert pool is not None and pool._mp_context.get_start_method() == "spawn"
+    shutdown_verify_executor()
+    assert audit_chain._verify_executor is None
+
+
+def _count_rows(rows, expected_prev, position):
+    return {"rows": len(rows), "position": position}
+
+
+def test_small_ranges_verify_in_process_without_a_pool():
+    shutdown_verify_executor()
+    chunks = [([(i,)] * 10, None, i * 10) for i in range(5)]
+
+    results = list(verify_in_chunks(chunks, _count_rows, workers=4, min_parallel_entries=1000))
+
+    assert [r["position"] for r in results] == [0, 10, 20, 30, 40]
+    assert audit_chain._verify_executor is None
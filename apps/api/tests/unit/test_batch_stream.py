@@ -0,0 +1,231 @@
+"""
+Tests for the streaming bounded-window mode of BatchProcessingEngine
+(services/batch_processing_engine.py): result log, lazy aggregation,
+aggregated progress and resume.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.batch_processing_engine import (
+    BatchItem,
+    BatchOptions,
+    BatchProcessingEngine,
+    BatchStatus,
+    ProgressAccumulator,
+    ResultLog,
+    ResultLogState,
+)
+
+
+def make_items(count: int):
+    return [BatchItem(id=f"item-{i}", data=i) for i in range(count)]
+
+
+async def agen(items):
+    for item in items:
+        yield item
+
+
+class CountingTracker:
+    def __init__(self):
+        self.calls = []
+
+    async def update_progress(self, batch_id, **kwargs):
+        self.calls.append(kwargs)
+
+
+@pytest.fixture
+def engine():
+    return BatchProcessingEngine(max_workers=4)
+
+
+def options(**overrides):
+    values = dict(max_retries=0, retry_delay_ms=100, track_progress=False)
+    values.update(overrides)
+    return BatchOptions(**values)
+
+
+class TestResultLogState:
+    def test_watermark_advances_over_contiguous_positions(self):
+        state = ResultLogState()
+        for seq in (2, 0, 1, 5):
+            state.add(seq, successful=True)
+
+        assert state.watermark == 3
+        assert 4 not in state
+        assert all(seq in state for seq in (0, 1, 2, 5))
+        assert state.processed == 4
+
+    def test_duplicate_positions_are_counted_once(self):
+        state = ResultLogState()
+        state.add(0, successful=True)
+        state.add(0, successful=False)
+
+        assert (state.successful, state.failed) == (1, 0)
+
+
+class TestResultLog:
+    @pytest.mark.asyncio
+    async def test_torn_last_line_is_cut_on_open(self, tmp_path):
+        log = ResultLog(tmp_path / "b.jsonl")
+        log.open()
+        log.append(0, "a", result=1)
+        log.append(1, "b", error="boom")
+        await log.sync()
+        log.close()
+        with log.path.open("a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "id": "c", "o')
+
+        state = ResultLog(log.path).open()
+
+        assert state.processed == 2
+        assert (state.successful, state.failed) == (1, 1)
+        assert log.path.read_text(encoding="utf-8").endswith("\n")
+
+
+class TestProgressAccumulator:
+    @pytest.mark.asyncio
+    async def test_counts_are_flushed_in_one_update(self):
+        tracker = CountingTracker()
+        progress = ProgressAccumulator(tracker, "b", flush_interval_s=3600)
+        for i in range(10):
+            progress.record(f"item-{i}", successful=i % 5 != 0)
+            await progress.maybe_flush()
+        await progress.flush()
+
+        assert len(tracker.calls) == 1
+        call = tracker.calls[0]
+        assert (call["processed"], call["successful"], call["failed"]) == (10, 8, 2)
+        assert call["current_item"] == "item-9"
+
+    @pytest.mark.asyncio
+    async def test_disabled_accumulator_does_not_write(self):
+        tracker = CountingTracker()
+        progress = ProgressAccumulator(tracker, "b", enabled=False)
+        progress.record("x", successful=True)
+        await progress.flush(status=BatchStatus.COMPLETED)
+
+        assert tracker.calls == []
+
+
+class TestProcessStream:
+    @pytest.mark.asyncio
+    async def test_results_are_spilled_to_the_log(self, engine, tmp_path):
+        async def double(x):
+            return x * 2
+
+        result = await engine.process_stream(
+            agen(make_items(50)), double, options(), batch_id="b1", result_dir=tmp_path
+        )
+
+        assert result.status == BatchStatus.COMPLETED
+        assert result.successful_items == 50
+        assert result.results == []
+        assert sorted(engine.result_aggregator.iter_results(result.metadata["result_log"])) == [
+            i * 2 for i in range(50)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_window_is_bounded(self, engine, tmp_path):
+        in_flight = 0
+        peak = 0
+        pulled = 0
+        finished = 0
+
+        async def source():
+            nonlocal pulled
+            for item in make_items(40):
+                pulled += 1
+                assert pulled - finished <= 3
+                yield item
+
+        async def work(x):
+            nonlocal in_flight, peak, finished
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            finished += 1
+            return x
+
+        result = await engine.process_stream(
+            source(), work, options(max_workers=3), batch_id="b2", result_dir=tmp_path
+        )
+
+        assert result.successful_items == 40
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_logged_with_stream_position(self, engine, tmp_path):
+        async def work(x):
+            if x == 7:
+                raise ValueError("bad item")
+            return x
+
+        result = await engine.process_stream(
+            make_items(10), work, options(), batch_id="b3", result_dir=tmp_path
+        )
+
+        assert (result.successful_items, result.failed_items) == (9, 1)
+        assert "bad item" in result.errors["7"]
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_items_already_logged(self, engine, tmp_path):
+        log = ResultLog.for_batch("b4", tmp_path)
+        log.open()
+        for seq in range(6):
+            log.append(seq, f"item-{seq}", result=seq)
+        await log.sync()
+        log.close()
+
+        seen = []
+
+        async def work(x):
+            seen.append(x)
+            return x
+
+        result = await engine.process_stream(
+            agen(make_items(10)), work, options(), batch_id="b4", result_dir=tmp_path
+        )
+
+        assert sorted(seen) == [6, 7, 8, 9]
+        assert result.successful_items == 10
+        assert result.metadata["resumed_items"] == 6
+        seqs = [json.loads(line)["seq"] for line in log.path.read_text().splitlines()]
+        assert sorted(seqs) == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_stop_on_error_cancels_in_flight_items(self, engine, tmp_path):
+        async def work(x):
+            if x == 0:
+                raise RuntimeError("stop")
+            await asyncio.sleep(10)
+            return x
+
+        result = await engine.process_stream(
+            make_items(20), work, options(continue_on_error=False, max_workers=4),
+            batch_id="b5", result_dir=tmp_path
+        )
+
+        assert result.status == BatchStatus.FAILED
+        assert "batch_error" in result.errors
+        assert result.processed_items == 1
+
+
+class TestProcessParallel:
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, engine):
+        async def work(x):
+            await asyncio.sleep(0.001 * (10 - x))
+            return x
+
+        results = await engine._process_parallel(
+            "p1", make_items(10), work, options(), max_workers=4
+        )
+
+        assert results == list(range(10))
@@ -0,0 +1,98 @@
+"""
+Tests for the array-based canonical binary STL writer used by the
+deterministic exporter (services/freecad/canonical_stl.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.freecad.canonical_stl import (
+    STL_FACET_DTYPE,
+    STL_HEADER,
+    canonical_facet_order,
+    mesh_triangles,
+    write_binary_stl,
+    write_canonical_stl,
+)
+
+
+def _triangles(n: int, seed: int = 0, grid: bool = False) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    tri = rng.uniform(-50, 50, (n, 3, 3))
+    if grid:
+        # Axis-aligned meshes share coordinates; exercise tie refinement
+        tri[:, :, 0] = np.round(tri[:, :, 0] / 10) * 10
+        tri[:, :, 1] = np.round(tri[:, :, 1] / 25) * 25
+        tri[: n // 4] = tri[0]
+    return tri
+
+
+def _reference_order(tri: np.ndarray):
+    """The previous facet ordering: stable sort on tuples of 9 rounded floats."""
+    keys = [tuple(round(float(c), 6) for c in facet.reshape(9)) for facet in tri]
+    return sorted(range(len(keys)), key=lambda i: keys[i])
+
+
+def _read_stl(path) -> np.ndarray:
+    data = path.read_bytes()
+    assert data[:80] == STL_HEADER
+    count = int.from_bytes(data[80:84], "little")
+    assert len(data) == 84 + 50 * count
+    return np.frombuffer(data, dtype=STL_FACET_DTYPE, offset=84, count=count)
+
+
+@pytest.mark.parametrize("grid", [False, True])
+def test_canonical_order_matches_previous_facet_sort(grid):
+    tri = _triangles(2000, seed=1, grid=grid)
+
+    assert canonical_facet_order(tri).tolist() == _reference_order(tri)
+
+
+def test_output_is_byte_identical_for_any_facet_order(tmp_path):
+    tri = _triangles(5000, seed=2, grid=True)
+    tri = np.unique(tri.reshape(-1, 9), axis=0).reshape(-1, 3, 3)
+    shuffled = tri[np.random.default_rng(3).permutation(len(tri))]
+
+    write_canonical_stl(tmp_path / "a.stl", tri)
+    write_canonical_stl(tmp_path / "b.stl", shuffled)
+
+    digest = lambda p: hashlib.sha256(p.read_bytes()).hexdigest()  # noqa: E731
+    assert digest(tmp_path / "a.stl") == digest(tmp_path / "b.stl")
+
+
+def test_binary_layout_vertices_and_normals(tmp_path):
+    tri = np.array([
+        [[0, 0, 0], [1, 0, 0], [0, 1, 0]],   # normal +Z
+        [[0, 0, 0], [0, 0, 1], [1, 0, 0]],   # normal +Y
+        [[0, 0, 0], [1, 1, 1], [2, 2, 2]],   # degenerate
+    ], dtype=float)
+
+    assert write_binary_stl(tmp_path / "t.stl", tri) == 3
+    records = _read_stl(tmp_path / "t.stl")
+
+    assert STL_FACET_DTYPE.itemsize == 50
+    np.testing.assert_array_equal(records["vertices"], tri.astype(np.float32))
+    np.testing.assert_allclose(records["normal"], [[0, 0, 1], [0, 1, 0], [0, 0, 0]])
+    assert not records["attribute"].any()
+
+
+def test_empty_mesh_writes_header_only(tmp_path):
+    assert write_canonical_stl(tmp_path / "empty.stl", np.empty((0, 3, 3))) == 0
+    assert len(_read_stl(tmp_path / "empty.stl")) == 0
+
+
+def test_mesh_triangles_reads_topology():
+    mesh = SimpleNamespace(Topology=(
+        [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)],
+        [(0, 1, 2), (0, 3, 1)],
+    ))
+
+    tri = mesh_triangles(mesh)
+
+    assert tri.shape == (2, 3, 3)
+    np.testing.assert_array_equal(tri[1], [[0, 0, 0], [0, 0, 1], [1, 0, 0]])
@@ -0,0 +1,142 @@
+"""
+Tests for the vectorized sweep-and-prune broad phase and the narrow-phase
+dispatch in services/freecad/collision.py. FreeCAD shapes are faked: only
+BoundBox and isNull are used.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.services.freecad.collision import (
+    AABB,
+    CollisionDetector,
+    _brute_force_pairs,
+    aabb_array,
+    aabb_row,
+    overlapping_indices,
+    sweep_and_prune,
+)
+
+
+class FakeShape:
+    def __init__(self, row):
+        xmin, ymin, zmin, xmax, ymax, zmax = row
+        self.BoundBox = SimpleNamespace(XMin=xmin, YMin=ymin, ZMin=zmin, XMax=xmax, YMax=ymax, ZMax=zmax)
+
+    def isNull(self):
+        return False
+
+
+def _random_boxes(n: int, seed: int = 0, side: float = 100.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, side, (n, 3))
+    half = rng.uniform(0.5, 5.0, (n, 3))
+    return np.hstack([centers - half, centers + half])
+
+
+def _reference_pairs(boxes: np.ndarray):
+    aabbs = [AABB(min_point=list(b[:3]), max_point=list(b[3:])) for b in boxes]
+    return [
+        [i, j]
+        for i in range(len(aabbs))
+        for j in range(i + 1, len(aabbs))
+        if aabbs[i].overlaps(aabbs[j])
+    ]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 40, 400])
+def test_sweep_and_prune_matches_pairwise_overlaps(n):
+    boxes = _random_boxes(n, seed=n)
+    pairs = sweep_and_prune(boxes)
+
+    assert pairs.shape[1] == 2
+    assert pairs.tolist() == _reference_pairs(boxes)
+    assert np.array_equal(pairs, _brute_force_pairs(boxes))
+
+
+def test_sweep_and_prune_touching_nested_and_identical_boxes():
+    boxes = np.array([
+        [0, 0, 0, 1, 1, 1],
+        [1, 0, 0, 2, 1, 1],          # touches box 0 on a face
+        [0.2, 0.2, 0.2, 0.4, 0.4, 0.4],  # nested in box 0
+        [0, 0, 0, 1, 1, 1],          # identical to box 0
+        [5, 5, 5, 6, 6, 6],          # isolated
+        [0.5, 3, 0, 0.6, 4, 1],      # overlaps on the sweep axis only
+    ], dtype=float)
+
+    assert sweep_and_prune(boxes).tolist() == [[0, 1], [0, 2], [0, 3], [1, 3], [2, 3]]
+    # A margin closes the gap to the box above
+    assert [0, 5] in sweep_and_prune(boxes, margin=1.0).tolist()
+
+
+def test_sweep_and_prune_blocks_bound_candidate_batches():
+    boxes = _random_boxes(600, seed=7, side=20.0)
+    expected = sweep_and_prune(boxes)
+
+    with patch("app.services.freecad.collision.SWEEP_BLOCK_PAIRS", 16):
+        assert np.array_equal(sweep_and_prune(boxes), expected)
+
+
+def test_overlapping_indices_with_translated_rows():
+    shape = FakeShape([0, 0, 0, 1, 1, 1])
+    boxes = [aabb_row(shape.BoundBox, offset) for offset in ([0, 0, 0], [5, 0, 0], [0.5, 0.5, 0.5])]
+
+    assert aabb_row(shape.BoundBox, [5, 0, 0]) == [5, 0, 0, 6, 1, 1]
+    assert overlapping_indices(aabb_row(shape.BoundBox, [0.9, 0, 0]), boxes).tolist() == [0, 2]
+    assert overlapping_indices([10, 10, 10, 11, 11, 11], []).tolist() == []
+
+
+def _detector(**kwargs) -> CollisionDetector:
+    with patch.object(CollisionDetector, "_check_freecad", return_value=True):
+        return CollisionDetector(**kwargs)
+
+
+def test_detect_collisions_runs_narrow_phase_on_candidates_only():
+    boxes = _random_boxes(60, seed=3, side=40.0)
+    shapes = [(f"part_{i}", FakeShape(row)) for i, row in enumerate(boxes)]
+    detector = _detector(narrow_phase_workers=1)
+    checked = []
+
+    def narrow(id_a, shape_a, id_b, shape_b):
+        checked.append((id_a, id_b))
+        return None
+
+    with patch.object(detector, "_check_narrow_phase", side_effect=narrow):
+        assert detector.detect_collisions(shapes) == []
+        broad = list(checked)
+        checked.clear()
+        detector.detect_collisions(shapes, use_broad_phase=False)
+
+    expected = [(f"part_{i}", f"part_{j}") for i, j in _reference_pairs(boxes)]
+    assert broad == expected
+    assert checked == expected
+
+
+def test_detect_collisions_involving_filters_pairs():
+    shapes = [(f"p{i}", FakeShape([i * 0.5, 0, 0, i * 0.5 + 1, 1, 1])) for i in range(12)]
+    detector = _detector(narrow_phase_workers=1)
+    checked = []
+
+    with patch.object(detector, "_check_narrow_phase", side_effect=lambda a, _sa, b, _sb: checked.append((a, b))):
+        detector.detect_collisions(shapes, involving="p5")
+
+    assert checked and all("p5" in pair for pair in checked)
+    assert len(checked) == 4  # p3, p4, p6, p7
+
+
+def test_parallel_narrow_phase_falls_back_in_process():
+    # Fake shapes cannot be exported to BREP, so the pool path fails and
+    # the detector checks the pairs in-process instead
+    shapes = [(f"p{i}", FakeShape([i * 0.5, 0, 0, i * 0.5 + 1, 1, 1])) for i in range(20)]
+    detector = _detector(narrow_phase_workers=4, parallel_threshold=1)
+    checked = []
+
+    with patch.object(detector, "_check_narrow_phase", side_effect=lambda a, _sa, b, _sb: checked.append((a, b))):
+        detector.detect_collisions(shapes)
+
+    assert len(checked) == len(sweep_and_prune(aabb_array(shape for _, shape in shapes)))
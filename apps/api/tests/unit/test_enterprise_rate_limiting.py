@@ -39,7 +39,8 @@ class TestEnterpriseRateLimitingService:
     def mock_redis_client(self):
         """Mock Redis client for testing."""
         mock_redis = Mock()
-        mock_redis.pipeline.return_value.__enter__.return_value.execute.return_value = [None, 1, None, None]
+        # GCRA script reply per key: allowed, remaining, retry_after_ms, reset_after_ms, denied, leased
+        mock_redis.register_script.return_value = AsyncMock(return_value=[1, 3, 0, 24000, 0, 0])
         return mock_redis
     
     @pytest.fixture
@@ -138,8 +139,8 @@ class TestEnterpriseRateLimitingService:
     @pytest.mark.asyncio
     async def test_check_rate_limit_allowed(self, rate_service, mock_request, mock_user, mock_db):
         """Test rate limit check when request is allowed."""
-        # Mock Redis to return low count
-        rate_service.redis_client.pipeline.return_value.__enter__.return_value.execute.return_value = [None, 2, None, None]
+        # Mock Redis to admit the third request of five
+        rate_service.redis_client.register_script.return_value.return_value = [1, 2, 0, 36000, 0, 0]
         
         result = await rate_service.check_rate_limit(
             mock_request,
@@ -156,8 +157,8 @@ class TestEnterpriseRateLimitingService:
     @pytest.mark.asyncio
     async def test_check_rate_limit_exceeded(self, rate_service, mock_request, mock_user, mock_db):
         """Test rate limit check when limit is exceeded."""
-        # Mock Redis to return high count
-        rate_service.redis_client.pipeline.return_value.__enter__.return_value.execute.return_value = [None, 5, None, None]
+        # Mock Redis to reject the sixth request of five
+        rate_service.redis_client.register_script.return_value.return_value = [0, 0, 12000, 60000, 1, 0]
         
         with patch.object(rate_service, '_check_brute_force_pattern') as mock_brute_force:
             with patch.object(rate_service, '_log_rate_limit_event') as mock_log_event:
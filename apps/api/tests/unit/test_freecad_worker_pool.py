@@ -0,0 +1,160 @@
+"""
+Tests for the warm FreeCAD worker pool.
+
+Uses a stub freecadcmd (tests/utils/fake_freecad.py) so the protocol,
+state reset, recycling, timeout and crash handling can be exercised
+without a FreeCAD installation.
+"""
+
+from __future__ import annotations
+
+import platform
+
+import pytest
+
+from app.services.freecad_worker_pool import (
+    FreeCADWorkerPool,
+    WorkerCrashedError,
+    WorkerTimeoutError,
+)
+from tests.utils.fake_freecad import write_fake_freecadcmd
+
+pytestmark = pytest.mark.skipif(
+    platform.system() == "Windows", reason="stub freecadcmd relies on a shebang"
+)
+
+
+@pytest.fixture
+def pool_factory(tmp_path):
+    pools = []
+
+    def factory(**kwargs):
+        kwargs.setdefault("size", 1)
+        kwargs.setdefault("startup_timeout", 20)
+        pool = FreeCADWorkerPool(write_fake_freecadcmd(tmp_path), **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.shutdown()
+
+
+def _write_script(directory, body):
+    script = directory / "script.py"
+    script.write_text(body, encoding="utf-8")
+    return script
+
+
+def test_runs_script_with_argv_cwd_and_env(pool_factory, tmp_path):
+    pool = pool_factory()
+    job_dir = tmp_path / "job"
+    job_dir.mkdir()
+    (job_dir / "parameters.json").write_text('{"length": 10}', encoding="utf-8")
+    script = _write_script(job_dir, (
+        "import json, os, sys\n"
+        "params = json.load(open('parameters.json'))\n"
+        "open(os.path.join(sys.argv[2], 'out.step'), 'w').write('x')\n"
+        "print(params['length'] * 2, os.environ['JOB_MARKER'])\n"
+    ))
+
+    result = pool.run_script(
+        script, [str(job_dir / "parameters.json"), str(job_dir)], job_dir,
+        timeout=10, env={"JOB_MARKER": "m1"},
+    )
+
+    assert result.exit_code == 0
+    assert result.stdout.strip() == "20 m1"
+    assert (job_dir / "out.step").exists()
+
+
+def test_state_is_reset_between_jobs(pool_factory, tmp_path):
+    pool = pool_factory()
+    script = _write_script(tmp_path, (
+        "import os, sys\n"
+        "print(os.environ.get('LEAKED', 'clean'), 'cached' if 'leaky_mod' in sys.modules else 'fresh')\n"
+        "os.environ['LEAKED'] = 'dirty'\n"
+        "import types; sys.modules['leaky_mod'] = types.ModuleType('leaky_mod')\n"
+    ))
+
+    first = pool.run_script(script, [], tmp_path, timeout=10)
+    second = pool.run_script(script, [], tmp_path, timeout=10)
+
+    assert first.worker_pid == second.worker_pid
+    assert first.stdout.split() == ["clean", "fresh"]
+    assert second.stdout.split() == ["clean", "fresh"]
+
+
+def test_exit_codes_and_exceptions_are_reported(pool_factory, tmp_path):
+    pool = pool_factory()
+    exit_script = _write_script(tmp_path, "import sys\nsys.exit(3)\n")
+    assert pool.run_script(exit_script, [], tmp_path, timeout=10).exit_code == 3
+
+    error_script = _write_script(tmp_path, "raise ValueError('bad geometry')\n")
+    result = pool.run_script(error_script, [], tmp_path, timeout=10)
+    assert result.exit_code == 1
+    assert "bad geometry" in result.stderr
+
+
+def test_worker_recycled_after_max_jobs(pool_factory, tmp_path):
+    pool = pool_factory(max_jobs_per_worker=2)
+    script = _write_script(tmp_path, "print('ok')\n")
+
+    pids = [pool.run_script(script, [], tmp_path, timeout=10).worker_pid for _ in range(3)]
+
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[0]
+    assert pool.snapshot()["recycle_reasons"] == {"max_jobs": 1}
+
+
+def test_timeout_kills_and_replaces_worker(pool_factory, tmp_path):
+    pool = pool_factory()
+    slow = _write_script(tmp_path, "import time\ntime.sleep(30)\n")
+
+    with pytest.raises(WorkerTimeoutError):
+        pool.run_script(slow, [], tmp_path, timeout=0.5)
+
+    fast = _write_script(tmp_path, "print('after')\n")
+    result = pool.run_script(fast, [], tmp_path, timeout=10)
+    assert result.stdout.strip() == "after"
+    assert pool.snapshot()["timed_out"] == 1
+    assert pool.snapshot()["spawned"] == 2
+
+
+def test_crash_is_reported_and_worker_replaced(pool_factory, tmp_path):
+    pool = pool_factory()
+    crash = _write_script(tmp_path, "import os\nos._exit(9)\n")
+
+    with pytest.raises(WorkerCrashedError) as exc_info:
+        pool.run_script(crash, [], tmp_path, timeout=10)
+    assert exc_info.value.exit_code == 9
+
+    ok = _write_script(tmp_path, "print('alive')\n")
+    assert pool.run_script(ok, [], tmp_path, timeout=10).stdout.strip() == "alive"
+    assert pool.snapshot()["crashed"] == 1
+
+
+def test_on_start_receives_worker_pid(pool_factory, tmp_path):
+    pool = pool_factory()
+    seen = []
+    script = _write_script(tmp_path, "import os\nprint(os.getpid())\n")
+
+    result = pool.run_script(script, [], tmp_path, timeout=10, on_start=lambda w: seen.append(w.pid))
+
+    assert seen == [result.worker_pid]
+    assert int(result.stdout) == result.worker_pid
+
+
+def test_worker_home_dirs_are_removed(pool_factory, tmp_path):
+    pool = pool_factory(max_jobs_per_worker=1)
+    script = _write_script(tmp_path, "print('ok')\n")
+
+    pool.run_script(script, [], tmp_path, timeout=10)
+    pool.run_script(script, [], tmp_path, timeout=10)
+    # The recycled worker's home is gone; only the pool's own files remain
+    assert not [p for p in pool._base_dir.iterdir() if p.is_dir()]
+
+    with pool.lease():
+        pool.shutdown()
+        assert pool._base_dir.exists()
+    assert not pool._base_dir.exists()
@@ -0,0 +1,269 @@
+"""
+Tests for the GCRA rate limiting engine and its use in RateLimiter.
+
+Engine bookkeeping is tested against a mocked script; the Lua semantics are
+tested against a real Redis at RATE_LIMIT_TEST_REDIS_URL when one is
+reachable.
+"""
+
+import os
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+import redis
+
+from app.core.gcra import (
+    AsyncGCRARateLimiter,
+    GCRALimit,
+    GCRARateLimiter,
+    LocalLeases,
+)
+from app.core.rate_limiter import RateLimiter, check_rate_limits
+
+
+def _reply(*rows):
+    return [value for row in rows for value in row]
+
+
+def _engine(reply, **kwargs):
+    client = Mock()
+    client.register_script.return_value = Mock(return_value=reply)
+    return GCRARateLimiter(client, **kwargs)
+
+
+class TestGCRAEngine:
+    def test_registers_script_once(self):
+        engine = _engine(_reply([1, 4, 0, 12000, 0, 0]))
+        limit = GCRALimit("user:1", 5, 60)
+
+        engine.check([limit])
+        engine.check([limit])
+
+        engine.redis_client.register_script.assert_called_once()
+        assert engine._script.call_count == 2
+
+    def test_batches_limits_into_one_call(self):
+        engine = _engine(_reply([1, 2, 0, 30000, 0, 0], [1, 99, 0, 600, 0, 0]))
+        limits = [GCRALimit("ip:1.2.3.4", 5, 60), GCRALimit("user:1", 100, 60)]
+
+        decisions = engine.check(limits, now=1000.0)
+
+        engine._script.assert_called_once()
+        keys, args = engine._script.call_args.kwargs["keys"], engine._script.call_args.kwargs["args"]
+        assert keys == ["gcra:ip:1.2.3.4", "gcra:user:1"]
+        assert args[:2] == [repr(1000000.0), 1]
+        assert args[2:] == [5, repr(60000.0), 0, 100, repr(60000.0), 0]
+        assert [d.allowed for d in decisions] == [True, True]
+        assert [d.remaining for d in decisions] == [2, 99]
+
+    def test_parses_rejection(self):
+        engine = _engine(_reply([0, 0, 12000, 60000, 3, 0]))
+
+        decision = engine.check([GCRALimit("user:1", 5, 60)])[0]
+
+        assert decision.allowed is False
+        assert decision.retry_after == 12
+        assert decision.reset_after == 60
+        assert decision.denied == 3
+
+    def test_peek_does_not_apply(self):
+        engine = _engine(_reply([1, 5, 0, 0, 0, 0]))
+
+        engine.peek([GCRALimit("user:1", 5, 60, lease=2)])
+
+        args = engine._script.call_args.kwargs["args"]
+        assert args[1] == 0
+        assert args[-1] == 0  # no lease requested on a dry run
+
+    def test_leased_tokens_admit_locally(self):
+        engine = _engine(_reply([1, 90, 0, 6000, 0, 5]))
+        limit = GCRALimit("global", 100, 60, lease=5)
+
+        first = engine.check([limit])[0]
+        local = [engine.check([limit])[0] for _ in range(5)]
+        engine.check([limit])
+
+        assert first.remaining == 95
+        assert all(d.local and d.allowed for d in local)
+        assert [d.remaining for d in local] == [94, 93, 92, 91, 90]
+        # Lease exhausted: the seventh request goes back to Redis
+        assert engine._script.call_count == 2
+
+    def test_only_limits_without_a_lease_go_to_redis(self):
+        engine = _engine(_reply([1, 90, 0, 6000, 0, 5], [1, 3, 0, 6000, 0, 0]))
+        limits = [GCRALimit("global", 100, 60, lease=5), GCRALimit("user:1", 5, 60)]
+
+        engine.check(limits)
+        engine._script.return_value = [1, 2, 0, 6000, 0, 0]
+        decisions = engine.check(limits)
+
+        assert engine._script.call_args.kwargs["keys"] == ["gcra:user:1"]
+        assert [d.local for d in decisions] == [True, False]
+        assert [d.remaining for d in decisions] == [94, 2]
+
+    def test_rejection_refunds_local_tokens(self):
+        engine = _engine(_reply([1, 90, 0, 6000, 0, 5], [1, 3, 0, 6000, 0, 0]))
+        limits = [GCRALimit("global", 100, 60, lease=5), GCRALimit("user:1", 5, 60)]
+        engine.check(limits)
+
+        engine._script.return_value = [0, 0, 12000, 60000, 1, 0]
+        decisions = engine.check(limits)
+
+        assert [d.allowed for d in decisions] == [True, False]
+        assert engine.leases._leases["global"].tokens == 5
+
+    def test_reset_discards_lease(self):
+        engine = _engine(_reply([1, 90, 0, 6000, 0, 5]))
+        limit = GCRALimit("global", 100, 60, lease=5)
+        engine.check([limit])
+
+        engine.reset(["global"])
+        engine.check([limit])
+
+        engine.redis_client.delete.assert_called_once_with("gcra:global", "gcra:global:denied")
+        assert engine._script.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_engine(self):
+        client = Mock()
+        client.register_script.return_value = AsyncMock(return_value=[1, 4, 0, 12000, 0, 0])
+        engine = AsyncGCRARateLimiter(client)
+
+        decision = (await engine.check([GCRALimit("user:1", 5, 60)]))[0]
+
+        assert decision.allowed is True
+        assert decision.remaining == 4
+
+
+class TestLocalLeases:
+    def test_expired_lease_is_not_used(self):
+        leases = LocalLeases()
+        limit = GCRALimit("global", 100, 60)
+        decision = Mock(remaining=50, reset_after_ms=1000)
+        leases.grant(limit, decision, tokens=5, now_ms=0.0)
+        leases._leases["global"].expires_at = 0.0
+
+        assert leases.take([limit], now_ms=0.0) == {}
+
+
+class TestRateLimiterRedis:
+    def _limiter(self, reply, **kwargs):
+        client = Mock()
+        client.register_script.return_value = Mock(return_value=reply)
+        return RateLimiter(redis_client=client, **kwargs)
+
+    def test_check_rate_limit(self):
+        limiter = self._limiter([1, 59, 0, 1000, 0, 0], max_requests=60, key_prefix="job")
+
+        assert limiter.check_rate_limit("42") is True
+        assert limiter._gcra._script.call_args.kwargs["keys"] == ["gcra:job:42"]
+
+    def test_get_remaining_when_exhausted_reports_retry_after(self):
+        limiter = self._limiter([0, 0, 1500, 60000, 0, 0], max_requests=60)
+
+        assert limiter.get_remaining("42") == (0, 2)
+
+    def test_small_leases_are_disabled(self):
+        assert RateLimiter(redis_client=Mock(), max_requests=10, local_lease_fraction=0.1).local_lease == 0
+        assert RateLimiter(redis_client=Mock(), max_requests=500, local_lease_fraction=0.02).local_lease == 10
+
+    def test_check_rate_limits_batches_shared_client(self):
+        client = Mock()
+        client.register_script.return_value = Mock(return_value=_reply([1, 5, 0, 1000, 0, 0], [0, 0, 120, 60000, 1, 0]))
+        per_user = RateLimiter(redis_client=client, max_requests=60, key_prefix="user")
+        global_ = RateLimiter(redis_client=client, max_requests=500, key_prefix="global")
+
+        rejected = check_rate_limits([(per_user, "42"), (global_, "global")])
+
+        assert rejected == (global_, "global")
+        # Both limits went out in a single script call
+        client.register_script.return_value.assert_called_once()
+        assert client.register_script.return_value.call_args.kwargs["keys"] == ["gcra:user:42", "gcra:global:global"]
+
+
+def _redis_or_skip():
+    url = os.environ.get("RATE_LIMIT_TEST_REDIS_URL", "redis://localhost:6379/15")
+    client = redis.from_url(url, decode_responses=True)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("Redis not available")
+    return client
+
+
+class TestGCRAScript:
+    """Lua semantics against a real Redis."""
+
+    @pytest.fixture
+    def engine(self):
+        client = _redis_or_skip()
+        prefix = f"gcra-test-{uuid.uuid4().hex}"
+        yield GCRARateLimiter(client, key_prefix=prefix, local_leases=False)
+        for key in client.scan_iter(f"{prefix}:*"):
+            client.delete(key)
+
+    def test_admits_limit_then_rejects(self, engine):
+        limit = GCRALimit("user", 5, 60)
+
+        decisions = [engine.check([limit], now=1000.0)[0] for _ in range(6)]
+
+        assert [d.allowed for d in decisions] == [True] * 5 + [False]
+        assert [d.remaining for d in decisions] == [4, 3, 2, 1, 0, 0]
+        assert decisions[-1].retry_after_ms == 12000
+        assert decisions[-1].denied == 1
+
+    def test_replenishes_one_token_per_interval(self, engine):
+        limit = GCRALimit("user", 5, 60)
+        for _ in range(5):
+            engine.check([limit], now=1000.0)
+
+        assert engine.check([limit], now=1011.9)[0].allowed is False
+        assert engine.check([limit], now=1012.0)[0].allowed is True
+
+    def test_state_is_one_string_per_key(self, engine):
+        limit = GCRALimit("user", 1000, 60)
+        for _ in range(500):
+            engine.check([limit], now=1000.0)
+
+        key = engine.full_key("user")
+        assert engine.redis_client.type(key) == "string"
+        assert float(engine.redis_client.get(key)) == pytest.approx(1000000.0 + 500 * 60.0)
+        assert not engine.redis_client.exists(f"{key}:denied")
+
+    def test_rejections_are_counted_until_the_key_expires(self, engine):
+        limit = GCRALimit("user", 2, 60)
+        for _ in range(5):
+            decision = engine.check([limit], now=1000.0)[0]
+
+        assert decision.denied == 3
+        assert engine.peek([limit], now=1000.0)[0].denied == 3
+
+    def test_rejected_batch_charges_nothing(self, engine):
+        strict, loose = GCRALimit("ip", 1, 60), GCRALimit("user", 100, 60)
+        engine.check([strict, loose], now=1000.0)
+
+        decisions = engine.check([strict, loose], now=1000.0)
+
+        assert [d.allowed for d in decisions] == [False, True]
+        assert engine.peek([loose], now=1000.0)[0].remaining == 99
+
+    def test_peek_does_not_charge(self, engine):
+        limit = GCRALimit("user", 5, 60)
+
+        for _ in range(3):
+            assert engine.peek([limit], now=1000.0)[0].remaining == 5
+        assert engine.check([limit], now=1000.0)[0].remaining == 4
+
+    def test_lease_granted_only_well_under_limit(self):
+        client = _redis_or_skip()
+        prefix = f"gcra-test-{uuid.uuid4().hex}"
+        engine = GCRARateLimiter(client, key_prefix=prefix)
+        limit = GCRALimit("global", 10, 60, lease=3)
+        try:
+            admitted = sum(engine.check([limit], now=1000.0)[0].allowed for _ in range(20))
+        finally:
+            client.delete(engine.full_key("global"))
+
+        # Leases never let the process exceed the shared limit
+        assert admitted == 10
@@ -0,0 +1,233 @@
+"""
+Tests for FastCDC chunking (services/incremental_backup.py), the persistent
+segment chunk store (services/backup_chunk_store.py) and the backup manager
+running on top of them.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+
+import pytest
+
+from app.services.backup_chunk_store import ChunkStoreError, SegmentChunkStore
+from app.services.incremental_backup import (
+    GEAR_TABLE,
+    BackupType,
+    ChunkingConfig,
+    FastCDCChunker,
+    FixedSizeChunker,
+    IncrementalBackupConfig,
+    IncrementalBackupManager,
+)
+
+SMALL = ChunkingConfig(min_chunk_size=256, target_chunk_size=1024, max_chunk_size=4096)
+
+
+def random_bytes(size: int, seed: int = 7) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+def reference_cut_points(data: bytes, config: ChunkingConfig):
+    """Byte-at-a-time FastCDC with the hash reset at every chunk start."""
+    chunker = FastCDCChunker(config)
+    offsets, start = [], 0
+    while start < len(data):
+        end = min(start + config.max_chunk_size, len(data))
+        h = 0
+        for pos in range(start, end):
+            h = ((h << 1) + GEAR_TABLE[data[pos]]) & 0xFFFFFFFF
+            length = pos + 1 - start
+            if config.min_chunk_size <= length < config.target_chunk_size and h < chunker.small_threshold:
+                end = pos + 1
+                break
+            if length >= config.target_chunk_size and h < chunker.large_threshold:
+                end = pos + 1
+                break
+        offsets.append(start)
+        start = end
+    return offsets
+
+
+class FakeStateManager:
+    def __init__(self):
+        self.records = []
+
+    async def add_memory_snapshot(self, record):
+        self.records.append(record)
+
+    def get_snapshot_by_id(self, snapshot_id):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def fake_state_manager(monkeypatch):
+    monkeypatch.setattr("app.services.incremental_backup.state_manager", FakeStateManager())
+
+
+def manager(root, **chunking) -> IncrementalBackupManager:
+    config = IncrementalBackupConfig(chunking_config=ChunkingConfig(**chunking) if chunking else SMALL)
+    return IncrementalBackupManager(config, chunk_store=SegmentChunkStore(root, segment_size=64 * 1024))
+
+
+class TestFastCDC:
+    @pytest.mark.parametrize("read_size", [300, 4096, 1 << 20])
+    def test_cut_points_match_bytewise_reference(self, read_size):
+        data = random_bytes(200_000)
+        chunker = FastCDCChunker(SMALL, read_size=read_size)
+
+        chunks = list(chunker.iter_chunks(data))
+
+        assert [offset for offset, _ in chunks] == reference_cut_points(data, SMALL)
+        assert b"".join(chunk for _, chunk in chunks) == data
+
+    def test_chunk_sizes_stay_within_bounds(self):
+        chunks = FastCDCChunker(SMALL).chunk(random_bytes(500_000))
+
+        sizes = [len(chunk) for _, chunk in chunks]
+        assert max(sizes) <= SMALL.max_chunk_size
+        assert min(sizes[:-1]) >= SMALL.min_chunk_size
+        assert 0.5 * SMALL.target_chunk_size < sum(sizes) / len(sizes) < 2 * SMALL.target_chunk_size
+
+    def test_insert_only_changes_nearby_chunks(self):
+        data = random_bytes(300_000)
+        edited = data[:100_000] + b"inserted bytes" + data[100_000:]
+        chunker = FastCDCChunker(SMALL)
+
+        before = {chunk for _, chunk in chunker.iter_chunks(data)}
+        after = [chunk for _, chunk in chunker.iter_chunks(edited)]
+
+        changed = [chunk for chunk in after if chunk not in before]
+        assert len(changed) <= 3
+
+    def test_streams_from_paths_and_file_objects(self, tmp_path):
+        data = random_bytes(50_000)
+        path = tmp_path / "model.FCStd"
+        path.write_bytes(data)
+        chunker = FastCDCChunker(SMALL, read_size=1000)
+
+        expected = chunker.chunk(data)
+
+        assert list(chunker.iter_chunks(path)) == expected
+        assert list(chunker.iter_chunks(io.BytesIO(data))) == expected
+
+    def test_rejects_min_size_below_hash_window(self):
+        with pytest.raises(ValueError):
+            FastCDCChunker(ChunkingConfig(min_chunk_size=16, target_chunk_size=64, max_chunk_size=256))
+
+    def test_fixed_size_chunker_streams(self):
+        data = random_bytes(10_001)
+
+        chunks = list(FixedSizeChunker(1000, read_size=3000).iter_chunks(data))
+
+        assert [offset for offset, _ in chunks] == list(range(0, 10_001, 1000))
+        assert b"".join(chunk for _, chunk in chunks) == data
+
+
+class TestSegmentChunkStore:
+    def test_dedup_refcounts_and_reopen(self, tmp_path):
+        store = SegmentChunkStore(tmp_path, segment_size=1024)
+        infos = store.put_chunks([(0, b"a" * 600), (600, b"b" * 600), (1200, b"a" * 600)])
+        store.close()
+
+        assert [info.ref_count for info in infos] == [1, 1, 2]
+        reopened = SegmentChunkStore(tmp_path, segment_size=1024)
+        assert list(reopened.read_chunks([infos[1].chunk_id, infos[0].chunk_id])) == [b"b" * 600, b"a" * 600]
+        stats = reopened.get_stats()
+        assert (stats["total_chunks"], stats["total_references"], stats["segments"]) == (2, 3, 2)
+
+    def test_release_frees_chunks_and_compact_reclaims_space(self, tmp_path):
+        store = SegmentChunkStore(tmp_path, segment_size=4096)
+        keep, drop = [store.put_chunks([(0, bytes([i]) * 1000)])[0].chunk_id for i in (1, 2)]
+        for i in range(3, 8):
+            store.put_chunks([(0, bytes([i]) * 1000)])
+
+        assert store.release([drop, drop]) == 1
+        assert store.missing([keep, drop]) == [drop]
+
+        reclaimed = store.compact(min_live_ratio=0.9)
+
+        assert reclaimed == 1000
+        assert store.read_chunk(keep) == bytes([1]) * 1000
+        assert not (tmp_path / "segments" / "seg-00000001.dat").exists()
+
+    def test_uncommitted_segment_tail_is_truncated_on_open(self, tmp_path):
+        store = SegmentChunkStore(tmp_path)
+        (info,) = store.put_chunks([(0, b"committed")])
+        store.close()
+        with open(tmp_path / "segments" / "seg-00000001.dat", "ab") as f:
+            f.write(b"torn write")
+
+        reopened = SegmentChunkStore(tmp_path)
+        (second,) = reopened.put_chunks([(0, b"next")])
+
+        assert (tmp_path / "segments" / "seg-00000001.dat").read_bytes() == b"committednext"
+        assert list(reopened.read_chunks([info.chunk_id, second.chunk_id])) == [b"committed", b"next"]
+
+    def test_corrupt_chunk_is_detected(self, tmp_path):
+        store = SegmentChunkStore(tmp_path)
+        (info,) = store.put_chunks([(0, b"payload bytes")])
+        with open(tmp_path / "segments" / "seg-00000001.dat", "r+b") as f:
+            f.write(b"X")
+
+        with pytest.raises(ChunkStoreError, match="corrupt"):
+            list(store.read_chunks([info.chunk_id]))
+
+
+class TestPersistentBackups:
+    @pytest.mark.asyncio
+    async def test_backup_from_file_and_restore_after_restart(self, tmp_path):
+        source = tmp_path / "bracket.FCStd"
+        data = random_bytes(300_000)
+        source.write_bytes(data)
+        store_dir = tmp_path / "chunks"
+
+        first = manager(store_dir)
+        full = await first.create_backup(source, "model-1")
+        source.write_bytes(data[:150_000] + b"new fillet" + data[150_000:])
+        incremental = await first.create_backup(source, "model-1")
+        first.chunk_store.close()
+
+        second = manager(store_dir)
+        restored = tmp_path / "restored.FCStd"
+        written = await second.restore_snapshot_to(incremental.snapshot_id, restored)
+
+        assert full.backup_type == BackupType.FULL and incremental.backup_type == BackupType.INCREMENTAL
+        assert incremental.unique_size < 0.1 * incremental.total_size
+        assert written == incremental.total_size and restored.read_bytes() == source.read_bytes()
+        assert await second.restore_snapshot(full.snapshot_id) == data
+        assert (await second.verify_chain("model-1"))["valid"]
+
+    @pytest.mark.asyncio
+    async def test_synthetic_full_references_latest_chunks(self, tmp_path):
+        backups = manager(tmp_path)
+        data = random_bytes(100_000)
+        await backups.create_backup(data, "model-1")
+        latest = await backups.create_backup(data + b"tail", "model-1")
+        references = backups.chunk_store.get_stats()["total_references"]
+
+        synthetic = await backups.create_synthetic_full("model-1")
+
+        assert synthetic.backup_type == BackupType.SYNTHETIC
+        assert synthetic.chunks == latest.chunks
+        assert backups.chunk_store.get_stats()["total_references"] == references + len(latest.chunks)
+        assert await backups.restore_snapshot(synthetic.snapshot_id) == data + b"tail"
+
+    @pytest.mark.asyncio
+    async def test_delete_snapshot_releases_only_unshared_chunks(self, tmp_path):
+        backups = manager(tmp_path)
+        data = random_bytes(100_000)
+        first = await backups.create_backup(data, "model-1")
+        second = await backups.create_backup(data + random_bytes(20_000, seed=8), "model-1")
+
+        freed = await backups.delete_snapshot(second.snapshot_id)
+
+        assert freed == len(set(second.chunks) - set(first.chunks))
+        assert await backups.restore_snapshot(first.snapshot_id) == data
+        assert backups.snapshot_chains["model-1"] == [first.snapshot_id]
+
+    @pytest.mark.asyncio
+    async def test_missing_snapshot(self, tmp_path):
+        with pytest.raises(ValueError):
+            await manager(tmp_path).restore_snapshot("snap_missing")
@@ -0,0 +1,154 @@
+"""
+Tests for the O(1) L1 cache in core/cache.py: recency order, per-entry TTL,
+size accounting and the TinyLFU admission filter.
+"""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.cache import CacheConfig, CacheFlowType, CacheManager, FrequencySketch, L1Cache
+
+
+def _cache(**overrides) -> L1Cache:
+    config = {"l1_max_size": 100, "l1_memory_limit_mb": 1}
+    config.update(overrides)
+    return L1Cache(CacheConfig(**config))
+
+
+def test_lru_order_follows_gets():
+    cache = _cache(l1_max_size=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    cache.get("a")
+
+    assert cache.set("d", "d")
+    assert list(cache._cache) == ["c", "a", "d"]
+    assert cache.get("b") is None
+
+
+def test_entry_expires_after_its_ttl():
+    cache = _cache()
+    cache.set("short", "v", ttl=0.05)
+    cache.set("long", "v", ttl=60)
+
+    time.sleep(0.1)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == "v"
+    assert len(cache) == 1
+
+
+def test_expired_entries_are_reaped_before_live_ones_are_evicted():
+    cache = _cache(l1_max_size=3)
+    cache.set("stale", "v", ttl=0.01)
+    cache.set("b", "v")
+    cache.set("c", "v")
+    time.sleep(0.05)
+
+    assert cache.set("d", "v")
+    assert set(cache._cache) == {"b", "c", "d"}
+
+
+def test_size_accounting_tracks_updates_and_deletes():
+    cache = _cache()
+    cache.set("k", b"x" * 1000)
+    first = cache.total_size_bytes
+    cache.set("k", b"x" * 3000)
+
+    assert cache.total_size_bytes == first + 2000
+    assert cache.delete("k")
+    assert cache.total_size_bytes == 0
+    assert not cache.delete("k")
+
+
+def test_size_estimate_is_bounded_for_large_containers():
+    cache = _cache(l1_memory_limit_mb=64)
+    vertices = [[float(i), float(i), float(i)] for i in range(200_000)]
+
+    start = time.perf_counter()
+    cache.set("mesh", {"vertices": vertices, "name": "bracket"})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.01
+    assert cache.total_size_bytes > 200_000 * 3 * 8
+
+
+def test_value_larger_than_budget_is_not_cached():
+    cache = _cache(l1_memory_limit_mb=0.01)
+    cache.set("k", "small")
+
+    assert not cache.set("k", "x" * 20_000)
+    assert cache.get("k") is None
+    assert cache.total_size_bytes == 0
+
+
+def test_one_off_blob_does_not_flush_hot_entries():
+    cache = _cache(l1_memory_limit_mb=0.01)
+    for i in range(8):
+        cache.set(f"hot{i}", "x" * 1000)
+    for _ in range(4):
+        for i in range(8):
+            cache.get(f"hot{i}")
+
+    assert not cache.set("blob", "y" * 9000)
+    assert all(cache.get(f"hot{i}") is not None for i in range(8))
+
+
+def test_repeatedly_requested_key_is_admitted():
+    cache = _cache(l1_max_size=4)
+    for i in range(4):
+        cache.set(f"hot{i}", i)
+        cache.get(f"hot{i}")
+
+    assert not cache.set("rising", "v")
+    for _ in range(3):
+        cache.get("rising")
+    assert cache.set("rising", "v")
+    assert cache.get("rising") == "v"
+
+
+def test_admission_can_be_disabled():
+    cache = _cache(l1_memory_limit_mb=0.01, l1_admission_enabled=False)
+    for i in range(8):
+        cache.set(f"hot{i}", "x" * 1000)
+        cache.get(f"hot{i}")
+
+    assert cache.set("blob", "y" * 9000)
+
+
+def test_frequency_sketch_ages_counts():
+    sketch = FrequencySketch(1024)
+    for _ in range(10):
+        sketch.increment("hot")
+    assert sketch.frequency("hot") == 10
+    assert sketch.frequency("cold") == 0
+
+    sketch._reset()
+    assert sketch.frequency("hot") == 5
+
+    for i in range(2 * sketch._sample_size):
+        sketch.increment(f"noise{i}")
+    assert sketch._additions < sketch._sample_size
+
+
+@pytest.mark.asyncio
+async def test_manager_uses_flow_ttl_for_l1():
+    manager = CacheManager(CacheConfig(ttl_ai_suggestion=1, ttl_geometry=3600))
+    manager.l2_cache.get = AsyncMock(return_value={"volume": 1.0})
+    manager.l2_cache.set = AsyncMock(return_value=True)
+    manager.l2_cache.add_to_tag = AsyncMock()
+
+    await manager.get(CacheFlowType.GEOMETRY, "g", "brep")
+    await manager.set(CacheFlowType.AI_SUGGESTION, "a", {"hint": "fillet"})
+
+    now = time.monotonic()
+    expiries = {
+        flow: manager.l1_cache._cache[manager.key_generator.generate_key(flow, data, artifact)][1] - now
+        for flow, data, artifact in ((CacheFlowType.GEOMETRY, "g", "brep"), (CacheFlowType.AI_SUGGESTION, "a", "data"))
+    }
+    assert 3500 < expiries[CacheFlowType.GEOMETRY] <= 3600
+    assert expiries[CacheFlowType.AI_SUGGESTION] <= 1
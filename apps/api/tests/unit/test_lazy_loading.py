@@ -0,0 +1,162 @@
+"""
+Tests for deferred module and router loading (core/lazy_loading.py,
+core/lazy_routers.py) and the import-time profile parser.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.lazy_loading import LazyModule, lazy_module, module_available
+from app.core.lazy_routers import (
+    LazyRouter,
+    include_lazy_router,
+    install_lazy_openapi,
+    pending_lazy_routers,
+    warm_lazy_routers,
+)
+from app.core.startup_profile import parse_importtime
+
+ROUTER_MODULE = """
+from fastapi import APIRouter
+
+router = APIRouter(prefix="/api/v1/demo")
+
+
+@router.get("/items/{item_id}")
+async def get_item(item_id: int):
+    return {"id": item_id}
+"""
+
+
+@pytest.fixture
+def router_module(tmp_path, monkeypatch):
+    """A router module on sys.path that has not been imported yet."""
+    name = f"lazy_demo_router_{tmp_path.name}"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(ROUTER_MODULE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+def make_app(module: str, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "ok"}
+
+    include_lazy_router(app, module, "/api/v1/demo", **kwargs)
+
+    @app.get("/api/v1/demo/items/special")
+    async def shadowed():
+        return {"id": "special"}
+
+    install_lazy_openapi(app)
+    return app
+
+
+class TestLazyModule:
+    def test_imports_on_first_attribute_access(self, tmp_path, monkeypatch):
+        (tmp_path / "lazy_demo_heavy.py").write_text("VALUE = 42\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_demo_heavy", raising=False)
+
+        heavy = lazy_module("lazy_demo_heavy")
+
+        assert isinstance(heavy, LazyModule)
+        assert "lazy_demo_heavy" not in sys.modules
+        assert heavy.VALUE == 42
+        assert "lazy_demo_heavy" in sys.modules
+
+    def test_returns_already_imported_module(self):
+        assert lazy_module("json") is sys.modules["json"]
+
+    def test_missing_module_fails_on_use(self):
+        missing = lazy_module("lazy_demo_missing")
+
+        assert not module_available("lazy_demo_missing")
+        with pytest.raises(ModuleNotFoundError):
+            missing.anything
+
+
+class TestLazyRouter:
+    def test_router_is_imported_on_first_request_under_prefix(self, router_module):
+        app = make_app(router_module)
+        client = TestClient(app)
+
+        assert client.get("/api/v1/health").status_code == 200
+        assert router_module not in sys.modules
+
+        response = client.get("/api/v1/demo/items/7")
+
+        assert response.json() == {"id": 7}
+        assert router_module in sys.modules
+        assert pending_lazy_routers(app) == []
+
+    def test_mounted_routes_keep_the_placeholder_position(self, router_module):
+        app = make_app(router_module)
+        client = TestClient(app)
+
+        # The router's /items/{item_id} came before the shadowed route, as with include_router
+        assert client.get("/api/v1/demo/items/special").status_code == 422
+        paths = [route.path for route in app.router.routes]
+        assert paths.index("/api/v1/demo/items/{item_id}") < paths.index("/api/v1/demo/items/special")
+
+    def test_eager_router_is_mounted_at_once(self, router_module):
+        app = make_app(router_module, eager=True)
+
+        assert router_module in sys.modules
+        assert not any(isinstance(route, LazyRouter) for route in app.router.routes)
+
+    def test_optional_router_that_fails_to_import_is_dropped(self):
+        app = make_app("lazy_demo_missing", optional=True)
+
+        response = TestClient(app).get("/api/v1/demo/items/7")
+
+        assert response.status_code == 404
+        assert pending_lazy_routers(app) == []
+
+    def test_required_router_that_fails_to_import_raises(self):
+        app = make_app("lazy_demo_missing")
+
+        with pytest.raises(ModuleNotFoundError):
+            TestClient(app).get("/api/v1/demo/items/7")
+
+    def test_openapi_includes_pending_routers(self, router_module):
+        app = make_app(router_module)
+
+        schema = app.openapi()
+
+        assert "/api/v1/demo/items/{item_id}" in schema["paths"]
+
+    def test_warm_up_mounts_pending_routers(self, router_module):
+        app = make_app(router_module)
+
+        asyncio.run(warm_lazy_routers(app))
+
+        assert pending_lazy_routers(app) == []
+        assert any(getattr(route, "path", "") == "/api/v1/demo/items/{item_id}" for route in app.router.routes)
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _io\n"
+        "import time:      2100 |       2500 |   reportlab.lib\n"
+        "import time:      9000 |      11500 | reportlab\n"
+    )
+
+    records = parse_importtime(output)
+
+    assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("_io", 120, 120, 2),
+        ("reportlab.lib", 2100, 2500, 1),
+        ("reportlab", 9000, 11500, 0),
+    ]
@@ -0,0 +1,189 @@
+"""
+Tests for the license entitlement cache used by LicenseGuardMiddleware.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import license_entitlement_cache as cache_module
+from app.services.license_entitlement_cache import (
+    LicenseEntitlement,
+    LicenseEntitlementCache,
+    invalidate_entitlement_on_commit,
+)
+
+
+def _entitlement(user_id: int, days: float = 30, license_id: int = 7) -> LicenseEntitlement:
+    return LicenseEntitlement(
+        user_id=user_id,
+        license_id=license_id,
+        ends_at=datetime.now(timezone.utc) + timedelta(days=days),
+    )
+
+
+def _counting_loader(result_for=None, delay: float = 0.0):
+    calls = []
+
+    async def loader(user_id: int) -> LicenseEntitlement:
+        calls.append(user_id)
+        if delay:
+            await asyncio.sleep(delay)
+        return result_for(user_id) if result_for else _entitlement(user_id)
+
+    return loader, calls
+
+
+def test_entitlement_expiry_evaluated_locally():
+    active = _entitlement(1, days=1)
+    expired = _entitlement(1, days=-1)
+
+    assert active.is_valid()
+    assert not expired.is_valid()
+    assert expired.is_valid(datetime.now(timezone.utc) - timedelta(days=2))
+    assert not LicenseEntitlement(user_id=1).has_license
+
+    restored, epoch = LicenseEntitlement.from_json(1, active.to_json(epoch=3))
+    assert restored == active
+    assert epoch == 3
+
+
+@pytest.mark.asyncio
+async def test_local_hits_skip_loader():
+    cache = LicenseEntitlementCache(use_redis=False, local_ttl_seconds=60)
+    loader, calls = _counting_loader()
+
+    for _ in range(10):
+        assert (await cache.get(5, loader)).is_valid()
+
+    assert calls == [5]
+    assert cache.snapshot()["local_hits"] == 9
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = LicenseEntitlementCache(use_redis=False, local_ttl_seconds=60)
+    loader, calls = _counting_loader(delay=0.01)
+
+    results = await asyncio.gather(*(cache.get(9, loader) for _ in range(20)))
+
+    assert calls == [9]
+    assert all(r == results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_cached():
+    cache = LicenseEntitlementCache(use_redis=False, local_ttl_seconds=60)
+    loader, calls = _counting_loader(delay=0.01)
+
+    pending = asyncio.create_task(cache.get(3, loader))
+    await asyncio.sleep(0)
+    cache.invalidate_local([3])
+    await pending
+    await cache.get(3, loader)
+
+    assert calls == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_lru_bounded_and_ttl_expiry():
+    cache = LicenseEntitlementCache(use_redis=False, local_ttl_seconds=60, max_entries=2)
+    loader, calls = _counting_loader()
+    for user_id in (1, 2, 3):
+        await cache.get(user_id, loader)
+    assert cache.snapshot()["local_entries"] == 2
+    await cache.get(1, loader)
+    assert calls == [1, 2, 3, 1]
+
+    cache.local_ttl_seconds = 0.01
+    cache.clear_local()
+    await cache.get(4, loader)
+    await asyncio.sleep(0.02)
+    await cache.get(4, loader)
+    assert calls[-2:] == [4, 4]
+
+
+@pytest.mark.asyncio
+async def test_redis_copy_ignored_after_epoch_bump():
+    cache = LicenseEntitlementCache(local_ttl_seconds=60)
+    stale = _entitlement(2, days=-1)
+    client = SimpleNamespace(
+        mget=AsyncMock(return_value=[stale.to_json(epoch=1), "2"]),
+        set=AsyncMock(),
+    )
+    cache._redis = client
+    loader, calls = _counting_loader()
+
+    entitlement = await cache.get(2, loader)
+
+    assert calls == [2]
+    assert entitlement.is_valid()
+    key, payload = client.set.call_args.args
+    assert key == "license:entitlement:2"
+    assert LicenseEntitlement.from_json(2, payload)[1] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_and_failure_fallback():
+    import redis
+
+    cache = LicenseEntitlementCache(local_ttl_seconds=60)
+    shared = _entitlement(4)
+    cache._redis = SimpleNamespace(mget=AsyncMock(return_value=[shared.to_json(epoch=0), None]), set=AsyncMock())
+    loader, calls = _counting_loader()
+    assert await cache.get(4, loader) == shared
+    assert calls == []
+
+    cache.clear_local()
+    cache._redis = SimpleNamespace(mget=AsyncMock(side_effect=redis.ConnectionError("down")), set=AsyncMock())
+    assert (await cache.get(4, loader)).is_valid()
+    assert calls == [4]
+    # Redis is skipped during the back-off window
+    cache.clear_local()
+    await cache.get(4, loader)
+    assert cache._redis.mget.await_count == 1
+    assert cache.snapshot()["redis_errors"] == 1
+
+
+def test_publish_invalidation_bumps_epoch_and_publishes():
+    cache = LicenseEntitlementCache(local_ttl_seconds=60)
+    pipe = Mock()
+    cache._sync_redis = Mock(pipeline=Mock(return_value=pipe))
+
+    cache.publish_invalidation([8, 8, 6])
+
+    pipe.incr.assert_any_call("license:entitlement:epoch:6")
+    pipe.delete.assert_any_call("license:entitlement:8")
+    pipe.publish.assert_called_once_with("license:entitlement:invalidate", "[6, 8]")
+    pipe.execute.assert_called_once()
+
+
+def test_invalidation_deferred_until_commit():
+    engine = create_engine("sqlite://")
+    published = []
+    with patch.object(cache_module.license_entitlement_cache, "publish_invalidation", published.append):
+        with Session(engine) as db:
+            db.execute(text("select 1"))
+            invalidate_entitlement_on_commit(db, 11)
+            invalidate_entitlement_on_commit(db, 12)
+            assert published == []
+            db.commit()
+            assert published == [{11, 12}]
+
+            db.execute(text("select 1"))
+            invalidate_entitlement_on_commit(db, 13)
+            db.rollback()
+            db.execute(text("select 1"))
+            db.commit()
+            assert published == [{11, 12}]
+
+        # Non-SQLAlchemy sessions invalidate immediately
+        invalidate_entitlement_on_commit(Mock(), 14)
+        assert published[-1] == [14]
@@ -0,0 +1,208 @@
+"""
+Tests for the commit-graph index and the incremental mark-sweep garbage
+collector of ModelObjectStore.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models.version_control import Commit, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_branch_manager import ModelBranchManager
+from app.services.model_commit_graph import (
+    EDGE_PARENT,
+    EDGE_TREE,
+    CommitGraph,
+    CommitGraphError,
+    object_edges,
+)
+from app.services.model_commit_manager import ModelCommitManager
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+
+@pytest.fixture
+def store(tmp_path):
+    with patched_vcs_instrumentation():
+        yield ModelObjectStore(tmp_path / ".mvcstore")
+
+
+def _blob(name: str, value: float) -> FreeCADObjectData:
+    return FreeCADObjectData(type_id="Part::Box", name=name, label=name, properties={"Length": value})
+
+
+async def _commit(store, value: float, parents=(), name="Box001"):
+    blob = await store.store_freecad_object(_blob(name, value))
+    tree = await store.store_tree(Tree(entries=[TreeEntry(name=name, hash=blob, object_type=ObjectType.BLOB)]))
+    commit_hash = await store.store_commit(
+        Commit(tree=tree, parents=list(parents), author="a", message=f"v{value}")
+    )
+    return commit_hash, tree, blob
+
+
+def _set_branch(store, name: str, commit_hash: str):
+    heads = store.refs_path / "heads"
+    heads.mkdir(parents=True, exist_ok=True)
+    (heads / name).write_text(commit_hash)
+
+
+def test_object_edges_from_models_and_payloads():
+    commit = Commit(tree="t" * 64, parents=["p1", "p2"], author="a", message="m")
+    assert object_edges("commit", commit) == [("p1", EDGE_PARENT, 0), ("p2", EDGE_PARENT, 1), ("t" * 64, EDGE_TREE, 0)]
+    payload = {"entries": [{"name": "a", "hash": "h1"}, {"name": "b", "hash": "h2"}]}
+    assert [dst for dst, _, _ in object_edges("tree", payload)] == ["h1", "h2"]
+    assert object_edges("blob", {"name": "x"}) == []
+
+
+@pytest.mark.asyncio
+async def test_generations_ancestry_and_history(store):
+    await store.init_store()
+    root, _, _ = await _commit(store, 1.0)
+    main1, _, _ = await _commit(store, 2.0, [root])
+    side1, _, _ = await _commit(store, 3.0, [root], name="Side")
+    merge, _, _ = await _commit(store, 4.0, [main1, side1])
+
+    assert store.get_generation(root) == 1
+    assert store.get_generation(main1) == 2
+    assert store.get_generation(merge) == 3
+
+    assert await store.is_ancestor(root, merge)
+    assert await store.is_ancestor(side1, merge)
+    assert not await store.is_ancestor(merge, root)
+    assert not await store.is_ancestor(side1, main1)
+    assert await store.get_first_parent_chain(merge, 10) == [merge, main1, root]
+
+    commit_manager = ModelCommitManager(store, document_manager=None)
+    history = await commit_manager.get_commit_history(merge, limit=2)
+    assert [c.message for c in history] == ["v4.0", "v2.0"]
+
+
+@pytest.mark.asyncio
+async def test_gc_removes_unreachable_objects_from_index(store):
+    await store.init_store()
+    kept, kept_tree, kept_blob = await _commit(store, 1.0)
+    dropped, dropped_tree, dropped_blob = await _commit(store, 2.0)
+    _set_branch(store, "main", kept)
+
+    removed = await store._garbage_collect()
+
+    assert removed == 3
+    objects = set(await store.list_objects())
+    assert objects == {kept, kept_tree, kept_blob}
+    assert not store._get_object_path(dropped_blob).exists()
+    assert await store.get_commit(dropped) is None
+    assert not store._graph.gc_active
+
+
+@pytest.mark.asyncio
+async def test_gc_resumes_across_runs(store):
+    await store.init_store()
+    head, _, _ = await _commit(store, 0.0)
+    for i in range(1, 6):
+        head, _, _ = await _commit(store, float(i), [head])
+    _set_branch(store, "main", head)
+    garbage = [await store.store_freecad_object(_blob(f"Orphan{i}", i)) for i in range(10)]
+
+    first = await store._garbage_collect(budget=4)
+    assert first == 0
+    assert store._graph.gc_active
+
+    # A fresh store (e.g. after a restart) picks up the persisted cycle
+    resumed = ModelObjectStore(store.store_path)
+    total = first
+    for _ in range(20):
+        total += await resumed._garbage_collect(budget=4)
+        if not resumed._graph.gc_active:
+            break
+
+    assert total == len(garbage)
+    assert not any(resumed._get_object_path(h).exists() for h in garbage)
+    assert len(await resumed.list_objects()) == 18
+
+
+@pytest.mark.asyncio
+async def test_objects_referenced_during_gc_cycle_survive(store):
+    await store.init_store()
+    head, _, _ = await _commit(store, 1.0)
+    _set_branch(store, "main", head)
+    orphan = await store.store_freecad_object(_blob("Orphan", 9.0))
+
+    # Start a cycle and leave it half done
+    await store._garbage_collect(budget=1)
+    assert store._graph.gc_active
+
+    # A new commit reuses the unreachable blob before the sweep
+    tree = await store.store_tree(Tree(entries=[TreeEntry(name="Orphan", hash=orphan, object_type=ObjectType.BLOB)]))
+    new_head = await store.store_commit(Commit(tree=tree, parents=[head], author="a", message="reuse"))
+    _set_branch(store, "main", new_head)
+
+    assert await store._garbage_collect() == 0
+    assert await store.get_freecad_object(orphan) is not None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_packed_objects_pruned_on_repack(store):
+    await store.init_store()
+    kept, _, _ = await _commit(store, 1.0)
+    dropped, _, dropped_blob = await _commit(store, 2.0)
+    _set_branch(store, "main", kept)
+    await store._pack_objects()
+
+    assert await store._garbage_collect() == 3
+    assert store._graph.get_flag("compact_pending")
+
+    await store._pack_objects()
+
+    assert not store._graph.get_flag("compact_pending")
+    store._cache.clear()
+    assert await store.get_object(dropped_blob) is None
+    assert await store.get_commit(kept) is not None
+    assert len(list(store.pack_path.glob("pack-*.idx"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_index_backfilled_for_existing_store(store):
+    await store.init_store()
+    root, _, _ = await _commit(store, 1.0)
+    child, _, _ = await _commit(store, 2.0, [root])
+    await store._pack_objects()
+    grandchild, _, _ = await _commit(store, 3.0, [child])
+    await store.cleanup()
+    for path in store.store_path.glob("commit-graph.db*"):
+        path.unlink()
+
+    fresh = ModelObjectStore(store.store_path)
+
+    assert len(await fresh.list_objects()) == 9
+    assert fresh.get_generation(grandchild) == 3
+    assert await fresh.is_ancestor(root, grandchild)
+
+
+@pytest.mark.asyncio
+async def test_branch_deletion_checks_merge_through_index(store):
+    await store.init_store()
+    root, _, _ = await _commit(store, 1.0)
+    feature, _, _ = await _commit(store, 2.0, [root])
+    commit_manager = ModelCommitManager(store, document_manager=None)
+    branches = ModelBranchManager(store.refs_path, store, commit_manager)
+
+    await branches.create_branch("main", root)
+    await branches.create_branch("merged", root)
+    await branches.create_branch("feature", feature)
+
+    assert await branches.delete_branch("merged")
+    with pytest.raises(Exception, match="unmerged"):
+        await branches.delete_branch("feature")
+
+
+def test_commit_graph_rejects_use_before_open(tmp_path):
+    graph = CommitGraph(tmp_path / "graph.db")
+    with pytest.raises(CommitGraphError):
+        graph.contains("0" * 64)
+    graph.open()
+    try:
+        assert graph.add_object("a" * 64, "blob")
+        assert not graph.add_object("a" * 64, "blob")
+        assert graph.count() == 1
+    finally:
+        graph.close()
@@ -0,0 +1,131 @@
+"""
+Tests for merge-base queries and the commit -> tags reverse index of the
+commit-graph index (ModelObjectStore / ModelBranchManager).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models.version_control import Commit, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_branch_manager import ModelBranchManager
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+
+@pytest.fixture
+def store(tmp_path):
+    with patched_vcs_instrumentation():
+        yield ModelObjectStore(tmp_path / ".mvcstore")
+
+
+async def _commit(store, label: str, parents=()):
+    blob = await store.store_freecad_object(
+        FreeCADObjectData(type_id="Part::Box", name="Box", label=label)
+    )
+    tree = await store.store_tree(Tree(entries=[TreeEntry(name="Box", hash=blob, object_type=ObjectType.BLOB)]))
+    return await store.store_commit(
+        Commit(tree=tree, parents=list(parents), author="a", message=label)
+    )
+
+
+@pytest.mark.asyncio
+async def test_merge_base_follows_second_parents(store):
+    await store.init_store()
+    a = await _commit(store, "A")
+    b = await _commit(store, "B", [a])
+    c = await _commit(store, "C", [b])
+    d = await _commit(store, "D", [a])
+    merge = await _commit(store, "M", [c, d])
+    e = await _commit(store, "E", [d])
+
+    # A first-parent walk from M never sees D and would answer A
+    assert await store.get_merge_base(merge, e) == d
+    assert await store.get_merge_base(e, merge) == d
+    assert await store.get_merge_base(c, e) == a
+    assert await store.get_merge_base(e, c) == a
+
+
+@pytest.mark.asyncio
+async def test_merge_base_of_ancestor_and_unrelated_commits(store):
+    await store.init_store()
+    a = await _commit(store, "A")
+    b = await _commit(store, "B", [a])
+    c = await _commit(store, "C", [b])
+    other = await _commit(store, "X")
+
+    assert await store.get_merge_base(a, c) == a
+    assert await store.get_merge_base(c, a) == a
+    assert await store.get_merge_base(c, c) == c
+    assert await store.get_merge_base(c, other) is None
+    assert await store.get_merge_base(other, c) is None
+
+
+@pytest.mark.asyncio
+async def test_tags_are_indexed_when_created(store):
+    await store.init_store()
+    a = await _commit(store, "A")
+    b = await _commit(store, "B", [a])
+    branches = ModelBranchManager(store.refs_path, store)
+
+    await branches.create_tag("v1.1", b, "a")
+    await branches.create_tag("v1.0", b, "a")
+    await branches.create_tag("base", a, "a")
+
+    assert await branches.get_tags_for_commits([a, b, "missing"]) == {
+        a: ["base"],
+        b: ["v1.0", "v1.1"],
+    }
+    assert await branches.get_tags_for_commit(b) == ["v1.0", "v1.1"]
+
+
+@pytest.mark.asyncio
+async def test_deleted_tags_leave_the_index(store):
+    await store.init_store()
+    a = await _commit(store, "A")
+    branches = ModelBranchManager(store.refs_path, store)
+    await branches.create_tag("v1.0", a, "a")
+    await branches.create_tag("v1.1", a, "a")
+
+    assert await branches.delete_tag("v1.0")
+
+    assert await branches.get_tags_for_commits([a]) == {a: ["v1.1"]}
+    assert not (branches.tags_path / "v1.0.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_tags_changed_on_disk_are_reindexed(store):
+    await store.init_store()
+    a = await _commit(store, "A")
+    b = await _commit(store, "B", [a])
+    branches = ModelBranchManager(store.refs_path, store)
+    await branches.create_tag("stable", a, "a")
+    await branches.create_tag("old", a, "a")
+    assert await branches.get_tags_for_commits([a, b]) == {a: ["old", "stable"]}
+
+    # Moved and deleted without going through the branch manager
+    moved = branches.tags_path / "stable.tmp"
+    moved.write_text(b)
+    moved.replace(branches.tags_path / "stable")
+    (branches.tags_path / "old").unlink()
+
+    assert await branches.get_tags_for_commits([a, b]) == {b: ["stable"]}
+
+
+@pytest.mark.asyncio
+async def test_existing_tag_refs_are_backfilled(tmp_path):
+    with patched_vcs_instrumentation():
+        store = ModelObjectStore(tmp_path / ".mvcstore")
+        await store.init_store()
+        a = await _commit(store, "A")
+
+        tags = store.refs_path / "tags"
+        tags.mkdir(parents=True, exist_ok=True)
+        (tags / "legacy").write_text(a)
+        (tags / "legacy.json").write_text("{}")
+        # Drop the tag index as if the store predated it
+        store._graph.set_flag("tags_indexed", False)
+        store._graph.close()
+
+        reopened = ModelObjectStore(tmp_path / ".mvcstore")
+        assert await reopened.get_tags_for_commits([a]) == {a: ["legacy"]}
@@ -0,0 +1,199 @@
+"""
+Tests for model version control pack files and their integration with
+ModelObjectStore.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+import pytest
+
+from app.models.version_control import Commit, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_object_pack import (
+    ENTRY_DELTA,
+    ENTRY_FULL,
+    PackInput,
+    PackReader,
+    apply_delta,
+    encode_delta,
+    write_pack,
+)
+from app.services.model_object_store import ModelObjectStore
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+
+def _blob(name: str, length: float) -> bytes:
+    data = {
+        "type": "blob",
+        "data": {
+            "name": name,
+            "type_id": "Part::Box",
+            "properties": {"Length": length, "Width": 20.0, "Notes": "x" * 400},
+        },
+    }
+    return json.dumps(data, sort_keys=True).encode("utf-8")
+
+
+def _input(data: bytes, key=None) -> PackInput:
+    return PackInput(hashlib.sha256(data).hexdigest(), data, key)
+
+
+def test_delta_roundtrip():
+    base = _blob("Box", 10.0)
+    target = _blob("Box", 11.0)
+    delta = encode_delta(base, target)
+    assert apply_delta(base, delta) == target
+    assert len(delta) < len(target) // 4
+
+
+def test_pack_roundtrip_with_deltas(tmp_path):
+    versions = [_input(_blob("Box", float(i)), "Box") for i in range(30)]
+    others = [_input(f"other-{i}".encode() * 50) for i in range(200)]
+
+    result = write_pack(versions + others, tmp_path)
+
+    assert result.object_count == 230
+    assert result.delta_count >= 25
+    reader = PackReader(result.index_path)
+    try:
+        assert reader.verify()
+        for item in versions + others:
+            assert reader.read(item.obj_hash) == item.data
+        assert reader.read("0" * 64) is None
+        assert reader.read("not-a-hash") is None
+        deltas = [reader.entry_info(v.obj_hash)[0] for v in versions]
+        assert deltas.count(ENTRY_FULL) >= 1
+        assert deltas.count(ENTRY_DELTA) >= 25
+        assert sorted(reader.iter_hashes()) == sorted(i.obj_hash for i in versions + others)
+    finally:
+        reader.close()
+
+
+def test_delta_chain_depth_is_bounded(tmp_path):
+    versions = [_input(_blob("Box", float(i)), "Box") for i in range(40)]
+    result = write_pack(versions, tmp_path, window=1, max_depth=3)
+    reader = PackReader(result.index_path)
+    try:
+        for item in versions:
+            depth = 0
+            current = item.obj_hash
+            while True:
+                entry_type, base, _ = reader.entry_info(current)
+                if entry_type == ENTRY_FULL:
+                    break
+                depth += 1
+                current = base
+            assert depth <= 3
+            assert reader.read(item.obj_hash) == item.data
+    finally:
+        reader.close()
+
+
+def test_corrupt_pack_fails_verification(tmp_path):
+    result = write_pack([_input(b"payload" * 100)], tmp_path)
+    raw = bytearray(result.pack_path.read_bytes())
+    raw[20] ^= 0xFF
+    result.pack_path.write_bytes(bytes(raw))
+    reader = PackReader(result.index_path)
+    try:
+        assert reader.verify() is False
+    finally:
+        reader.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    with patched_vcs_instrumentation():
+        yield ModelObjectStore(tmp_path / ".mvcstore")
+
+
+def _freecad_object(length: float) -> FreeCADObjectData:
+    return FreeCADObjectData(
+        type_id="Part::Box",
+        name="Box001",
+        label="Box",
+        properties={"Length": length, "Width": 5.0, "Height": 3.0, "Description": "d" * 300},
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_reads_packed_objects_transparently(store):
+    await store.init_store()
+    blob_hashes = [await store.store_freecad_object(_freecad_object(float(i))) for i in range(20)]
+
+    packed, deltas = await store._pack_objects()
+
+    assert packed == 20
+    assert deltas > 0
+    assert store._list_loose_files() == []
+    store._cache.clear()
+
+    fresh = ModelObjectStore(store.store_path)
+    for i, obj_hash in enumerate(blob_hashes):
+        obj = await fresh.get_freecad_object(obj_hash)
+        assert obj.properties["Length"] == float(i)
+    assert sorted(await fresh.list_objects()) == sorted(blob_hashes)
+    assert any(fresh.get_delta_info(h) is not None for h in blob_hashes)
+
+
+@pytest.mark.asyncio
+async def test_gc_follows_packed_commits(store):
+    await store.init_store()
+    blob = await store.store_freecad_object(_freecad_object(1.0))
+    tree_hash = await store.store_tree(
+        Tree(entries=[TreeEntry(name="Box001", hash=blob, object_type=ObjectType.BLOB)])
+    )
+    commit_hash = await store.store_commit(Commit(tree=tree_hash, author="a", message="m"))
+    await store._pack_objects()
+
+    # New loose blob reachable only through a tree that is now packed
+    new_blob = await store.store_freecad_object(_freecad_object(2.0))
+    tree2 = await store.store_tree(
+        Tree(entries=[TreeEntry(name="Box001", hash=new_blob, object_type=ObjectType.BLOB)])
+    )
+    commit2 = await store.store_commit(Commit(tree=tree2, parents=[commit_hash], author="a", message="m2"))
+    (store.refs_path / "heads").mkdir(parents=True, exist_ok=True)
+    (store.refs_path / "heads" / "main").write_text(commit2)
+
+    removed = await store._garbage_collect()
+
+    assert removed == 0
+    assert await store.get_object(new_blob) is not None
+
+
+@pytest.mark.asyncio
+async def test_repack_consolidates_packs(store):
+    await store.init_store()
+    store.MAX_PACKS_BEFORE_REPACK = 3
+    hashes = []
+    for round_no in range(4):
+        hashes.append(await store.store_freecad_object(_freecad_object(float(round_no))))
+        await store._pack_objects()
+
+    assert len(list(store.pack_path.glob("pack-*.idx"))) <= 3
+    store._cache.clear()
+    for obj_hash in hashes:
+        assert await store.get_object(obj_hash) is not None
+
+
+@pytest.mark.asyncio
+async def test_misses_rescan_packs_only_after_the_pack_dir_changes(store, monkeypatch):
+    await store.init_store()
+    await store.store_freecad_object(_freecad_object(1.0))
+    await store._pack_objects()
+    fresh = ModelObjectStore(store.store_path)
+    scans = []
+    refresh = fresh._packs.refresh
+    monkeypatch.setattr(fresh._packs, "refresh", lambda: scans.append(1) or refresh())
+
+    for _ in range(5):
+        assert await fresh.get_object("0" * 64) is None
+    assert len(scans) == 1
+
+    # Packed by another store instance: the pack directory mtime changes
+    late = await store.store_freecad_object(_freecad_object(2.0))
+    await store._pack_objects()
+    assert (await fresh.get_freecad_object(late)).properties["Length"] == 2.0
+    assert len(scans) == 2
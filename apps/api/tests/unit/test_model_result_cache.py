@@ -0,0 +1,225 @@
+"""
+Tests for the content-addressed model result cache (tasks/model_result_cache.py)
+and the loop-safe singleflight in core/cache.py it relies on.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import metrics
+from app.core.cache import CacheConfig, CacheFlowType, CacheManager, EngineFingerprint
+from app.tasks import model_result_cache
+from app.tasks.model_result_cache import get_or_build_model_result, link_artefacts
+
+PARAMS = {"model_type": "flange", "dimensions": {"outer": 120.0, "inner": 40.0}, "features": ["holes"]}
+
+
+class MemoryL2:
+    """Dict-backed stand-in for RedisCache shared by every loop and thread."""
+
+    def __init__(self, fail: bool = False):
+        self.values = {}
+        self.locks = set()
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    async def get(self, key):
+        if self.fail:
+            raise RuntimeError("l2 down")
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None, content_type="json"):
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        return self.values.pop(key, None) is not None
+
+    async def acquire_lock(self, key, timeout):
+        with self._lock:
+            if key in self.locks:
+                return False
+            self.locks.add(key)
+            return True
+
+    async def release_lock(self, key):
+        self.locks.discard(key)
+
+    async def add_to_tag(self, tag_key, cache_key):
+        pass
+
+
+def _manager(l2=None, git_sha="abc123") -> CacheManager:
+    manager = CacheManager(CacheConfig())
+    manager.l2_cache = l2 or MemoryL2()
+    manager._engine_fingerprint = EngineFingerprint(
+        freecad_version="1.1.0", occt_version="7.8.1", python_version="3.11", git_sha=git_sha
+    )
+    return manager
+
+
+class Builder:
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        return {
+            "artefacts": [
+                {"type": "parametric_model", "bucket": "artefacts", "s3_key": f"jobs/build-{n}/model.FCStd",
+                 "s3_url": "https://old", "sha256": "ab" * 32, "size_bytes": 1024}
+            ],
+            "data": {"model_generated": True, "document_id": f"doc-{n}"},
+            "warnings": [],
+        }
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    objects = {"missing": set()}
+
+    def get_object_info(bucket, key):
+        return None if key in objects["missing"] else SimpleNamespace(object_key=key)
+
+    def generate_presigned_url(bucket, object_key, **kwargs):
+        return SimpleNamespace(url=f"https://fresh/{bucket}/{object_key}")
+
+    monkeypatch.setattr(
+        model_result_cache, "s3_service",
+        SimpleNamespace(get_object_info=get_object_info, generate_presigned_url=generate_presigned_url)
+    )
+    return objects
+
+
+def _count(result: str) -> float:
+    return metrics.model_result_cache_requests_total.labels(type="parametric", result=result)._value.get()
+
+
+def test_identical_job_links_earlier_artefacts(storage):
+    manager, build = _manager(), Builder()
+    hits, misses = _count("hit"), _count("miss")
+
+    first, first_hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-1", PARAMS, build, manager)
+    # Same parameters in a different order and float spelling
+    reordered = {"features": ["holes"], "dimensions": {"inner": 40.0, "outer": 120.0000000001}, "model_type": "flange"}
+    second, second_hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-2", reordered, build, manager)
+
+    assert (first_hit, second_hit) == (False, True)
+    assert build.calls == 1
+    assert second["source_job_id"] == "job-1"
+    assert second["artefacts"][0]["s3_key"] == "jobs/build-1/model.FCStd"
+    assert (_count("hit") - hits, _count("miss") - misses) == (1, 1)
+
+
+def test_engine_fingerprint_and_params_are_part_of_the_key(storage):
+    l2, build = MemoryL2(), Builder()
+
+    get_or_build_model_result(CacheFlowType.PARAMS, "job-1", PARAMS, build, _manager(l2))
+    _, other_engine_hit = get_or_build_model_result(
+        CacheFlowType.PARAMS, "job-2", PARAMS, build, _manager(l2, git_sha="def456")
+    )
+    _, other_params_hit = get_or_build_model_result(
+        CacheFlowType.PARAMS, "job-3", {**PARAMS, "features": ["holes", "chamfer"]}, build, _manager(l2)
+    )
+    _, shared_l2_hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-4", PARAMS, build, _manager(l2))
+
+    assert (other_engine_hit, other_params_hit, shared_l2_hit) == (False, False, True)
+    assert build.calls == 3
+
+
+def test_concurrent_identical_jobs_build_once(storage):
+    manager, build = _manager(), Builder(delay=0.3)
+
+    # Each thread reaches the cache through async_to_sync on its own event loop
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(
+            lambda i: get_or_build_model_result(CacheFlowType.PARAMS, f"job-{i}", PARAMS, build, manager),
+            range(6)
+        ))
+
+    assert build.calls == 1
+    assert sorted(hit for _, hit in results) == [False] + [True] * 5
+    assert {payload["artefacts"][0]["s3_key"] for payload, _ in results} == {"jobs/build-1/model.FCStd"}
+
+
+def test_result_whose_artefacts_were_removed_is_rebuilt(storage):
+    manager, build = _manager(), Builder()
+    get_or_build_model_result(CacheFlowType.PARAMS, "job-1", PARAMS, build, manager)
+    storage["missing"].add("jobs/build-1/model.FCStd")
+
+    payload, hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-2", PARAMS, build, manager)
+
+    assert hit is False
+    assert build.calls == 2
+    assert payload["source_job_id"] == "job-2"
+
+
+def test_stale_result_that_survives_invalidation_is_rebuilt_not_returned(storage):
+    l2 = MemoryL2()
+    manager, build = _manager(l2), Builder()
+    get_or_build_model_result(CacheFlowType.PARAMS, "job-1", PARAMS, build, manager)
+    storage["missing"].add("jobs/build-1/model.FCStd")
+    stale = dict(l2.values)
+
+    async def delete_then_recache(key):
+        # Another worker writes the stale entry straight back
+        l2.values.update(stale)
+        return True
+
+    l2.delete = delete_then_recache
+
+    payload, hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-2", PARAMS, build, manager)
+
+    assert hit is False
+    assert build.calls == 2
+    assert payload["artefacts"][0]["s3_key"] == "jobs/build-2/model.FCStd"
+    l2.delete = MemoryL2.delete.__get__(l2)
+    cached, hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-3", PARAMS, build, manager)
+    assert hit is True and cached["source_job_id"] == "job-2"
+
+
+def test_failed_build_is_not_cached(storage):
+    manager = _manager()
+
+    def broken():
+        raise ValueError("bad sketch")
+
+    with pytest.raises(ValueError):
+        get_or_build_model_result(CacheFlowType.PARAMS, "job-1", PARAMS, broken, manager)
+
+    build = Builder()
+    _, hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-2", PARAMS, build, manager)
+    assert hit is False and build.calls == 1
+
+
+def test_cache_backend_failure_falls_back_to_building(storage):
+    manager, build = _manager(MemoryL2(fail=True)), Builder()
+    bypassed = _count("bypass")
+
+    payload, hit = get_or_build_model_result(CacheFlowType.PARAMS, "job-1", PARAMS, build, manager)
+
+    assert hit is False and build.calls == 1
+    assert payload["source_job_id"] == "job-1"
+    assert _count("bypass") - bypassed == 1
+
+
+def test_link_artefacts_presigns_without_touching_the_cached_payload(storage):
+    payload = Builder()()
+    payload["artefacts"].append({"type": "generated_script", "content": "print(1)"})
+
+    linked = link_artefacts(payload)
+
+    assert linked[0]["s3_url"] == "https://fresh/artefacts/jobs/build-1/model.FCStd"
+    assert linked[1] == {"type": "generated_script", "content": "print(1)"}
+    assert payload["artefacts"][0]["s3_url"] == "https://old"
@@ -0,0 +1,160 @@
+"""
+Tests for the concurrent, paginated tree diff of ModelDiffer and the
+shape-fingerprint short cut in ``diff_objects``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.models.version_control import DiffType, FreeCADObjectData, ObjectType, Tree, TreeEntry
+from app.services.model_differ import ModelDiffer
+from tests.utils.vcs_helpers import patched_vcs_instrumentation
+
+
+@pytest.fixture(autouse=True)
+def instrumentation():
+    with patched_vcs_instrumentation():
+        yield
+
+
+def _feature(name: str, length: float, shape_hash: str = "s1") -> FreeCADObjectData:
+    return FreeCADObjectData(
+        type_id="PartDesign::Pad",
+        name=name,
+        label=name,
+        properties={"Length": length},
+        shape_data={"shape_hash": shape_hash, "volume": length * 100.0},
+    )
+
+
+class FakeStore:
+    """In-memory object store that records how many loads overlap."""
+
+    def __init__(self, delay: float = 0.001):
+        self.objects = {}
+        self.delay = delay
+        self.loads = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    def put(self, obj: FreeCADObjectData) -> str:
+        obj_hash = obj.calculate_hash()
+        self.objects[obj_hash] = obj
+        return obj_hash
+
+    async def get_freecad_object(self, obj_hash):
+        self.loads += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self.objects.get(obj_hash)
+        finally:
+            self.in_flight -= 1
+
+
+def _trees(store: FakeStore, count: int, modified=(), added=(), deleted=()):
+    entries1, entries2 = [], []
+    for i in range(count):
+        name = f"Pad{i:04d}"
+        if name not in added:
+            entries1.append(TreeEntry(name=name, hash=store.put(_feature(name, 10.0)), object_type=ObjectType.BLOB))
+        if name in deleted:
+            continue
+        length = 11.0 if name in modified or name in added else 10.0
+        entries2.append(TreeEntry(name=name, hash=store.put(_feature(name, length)), object_type=ObjectType.BLOB))
+    return Tree(entries=entries1), Tree(entries=entries2)
+
+
+class TestTreeDiff:
+    @pytest.mark.asyncio
+    async def test_modified_entries_load_concurrently_within_bound(self):
+        store = FakeStore()
+        modified = {f"Pad{i:04d}" for i in range(0, 200, 2)}
+        tree1, tree2 = _trees(store, 200, modified=modified)
+
+        diff = await ModelDiffer(store, max_concurrency=8).diff_trees(tree1, tree2)
+
+        assert diff.stats["modified"] == 100
+        assert store.loads == 200
+        # Each of the 8 slots loads both versions of an entry together
+        assert 8 < store.peak <= 16
+        assert {d.object_id for d in diff.object_diffs} == modified
+        assert all(d.property_changes for d in diff.object_diffs)
+
+    @pytest.mark.asyncio
+    async def test_changes_are_in_name_order_with_stats(self):
+        store = FakeStore()
+        tree1, tree2 = _trees(
+            store, 10, modified={"Pad0005"}, added={"Pad0001"}, deleted={"Pad0007"}
+        )
+
+        diff = await ModelDiffer(store).diff_trees(tree1, tree2)
+
+        assert [(d.object_id, d.diff_type) for d in diff.object_diffs] == [
+            ("Pad0001", DiffType.ADDED),
+            ("Pad0005", DiffType.MODIFIED),
+            ("Pad0007", DiffType.DELETED),
+        ]
+        assert diff.stats == {"added": 1, "modified": 1, "deleted": 1, "renamed": 0}
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_the_full_diff(self):
+        store = FakeStore()
+        modified = {f"Pad{i:04d}" for i in range(0, 100, 3)}
+        tree1, tree2 = _trees(store, 100, modified=modified)
+        differ = ModelDiffer(store, max_concurrency=4)
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await differ.diff_trees_page(tree1, tree2, cursor=cursor, limit=10)
+            seen.extend(d.object_id for d in page.object_diffs)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == sorted(modified)
+        assert pages == 4
+
+    @pytest.mark.asyncio
+    async def test_first_page_does_not_load_the_whole_tree(self):
+        store = FakeStore()
+        modified = {f"Pad{i:04d}" for i in range(1000)}
+        tree1, tree2 = _trees(store, 1000, modified=modified)
+
+        page = await ModelDiffer(store, max_concurrency=4).diff_trees_page(tree1, tree2, limit=5)
+        await asyncio.sleep(0.01)
+
+        assert len(page.object_diffs) == 5
+        assert page.next_cursor == "Pad0004"
+        assert store.loads <= 2 * (5 + 1 + 2 * 4)
+
+
+class TestShapeFingerprint:
+    @pytest.mark.asyncio
+    async def test_matching_shape_hash_skips_shape_comparison(self):
+        differ = ModelDiffer()
+        old = _feature("Pad", 10.0, shape_hash="same")
+        new = _feature("Pad", 10.0, shape_hash="same")
+        new.shape_data = {**new.shape_data, "volume": 5.0}
+        new.properties = {"Length": 12.0}
+
+        diff = await differ.diff_objects(old, new)
+
+        assert diff.shape_diff is None
+        assert diff.diff_type == DiffType.MODIFIED
+
+    @pytest.mark.asyncio
+    async def test_different_or_missing_hash_compares_shapes(self):
+        differ = ModelDiffer()
+        old = _feature("Pad", 10.0, shape_hash="a")
+        new = _feature("Pad", 12.0, shape_hash="b")
+        assert (await differ.diff_objects(old, new)).shape_diff is not None
+
+        old.shape_data = {"volume": 1.0}
+        new.shape_data = {"volume": 2.0}
+        assert (await differ.diff_objects(old, new)).shape_diff.volume_change == pytest.approx(1.0)
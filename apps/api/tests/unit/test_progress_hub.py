@@ -0,0 +1,237 @@
+"""
+Tests for the progress fan-out hub (core/progress_hub.py) and the WebSocket
+and SSE endpoints reading from it (api/v1/websocket.py, api/v1/sse.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.v1 import sse, websocket
+from app.core.progress_hub import ProgressHub
+from app.core.redis_pubsub import decode_progress_entry
+from app.models.enums import JobStatus
+from app.schemas.progress import EventType, ProgressMessageV2
+from tests.utils.fake_progress_source import FakeProgressSource
+
+
+def message(job_id: int, **fields) -> str:
+    fields.setdefault("event_type", EventType.PROGRESS_UPDATE)
+    return ProgressMessageV2(job_id=job_id, **fields).model_dump_json()
+
+
+def make_hub(**kwargs):
+    source = FakeProgressSource()
+    hub = ProgressHub(source=source, **kwargs)
+    return hub, source
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestProgressHub:
+    @pytest.mark.asyncio
+    async def test_one_read_covers_all_jobs_and_decodes_each_entry_once(self):
+        hub, source = make_hub()
+        subscriptions = [await hub.subscribe(job_id, "websocket" if i % 2 else "sse") for i, job_id in enumerate([1, 1, 1, 2])]
+
+        source.publish(1, message(1, progress_pct=10))
+        source.publish(2, message(2, progress_pct=20))
+        await settle()
+
+        frames = [await subscription.get(timeout=1) for subscription in subscriptions]
+
+        assert source.read_jobs == {1, 2}
+        assert frames[0] is frames[1] is frames[2]
+        assert frames[3].progress.progress_pct == 20
+        assert [frame.event_id for frame in frames] == [1, 1, 1, 1]
+        stats = hub.get_stats()
+        assert (stats["received"], stats["dispatched"], stats["jobs"]) == (2, 2, 2)
+        assert stats["subscribers"] == {"websocket": 2, "sse": 2}
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_reads_start_after_existing_entries_and_skip_invalid_ones(self):
+        hub, source = make_hub()
+        source.publish(1, message(1, progress_pct=5))
+        subscription = await hub.subscribe(1, "sse")
+
+        source.publish(7, message(7, progress_pct=70))
+        source.publish(1, json.dumps({"system": True, "message": "maintenance"}))
+        source.publish(1, message(1, progress_pct=15))
+        await settle()
+
+        frame = await subscription.get(timeout=1)
+        assert (frame.event_id, frame.progress.progress_pct) == (3, 15)
+        assert await subscription.get(timeout=0.05) is None
+        stats = hub.get_stats()
+        assert (stats["received"], stats["invalid"], stats["dispatched"]) == (2, 1, 1)
+        assert 7 not in source.read_jobs
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_new_job_wakes_the_blocked_read(self):
+        hub, source = make_hub(block_ms=60_000)
+        await hub.subscribe(1, "sse")
+        await settle()
+
+        subscription = await hub.subscribe(2, "websocket")
+        source.publish(2, message(2, progress_pct=50))
+
+        assert (await subscription.get(timeout=1)).progress.progress_pct == 50
+        assert source.wakes == 2 and source.read_jobs == {1, 2}
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_encodings_match_previous_wire_format(self):
+        hub, source = make_hub()
+        subscription = await hub.subscribe(3, "websocket")
+        source.publish(3, message(3, progress_pct=40, message="Pocket"))
+
+        frame = await subscription.get(timeout=1)
+
+        progress = frame.progress
+        assert json.loads(frame.websocket_text) == {"type": "progress", **json.loads(progress.model_dump_json())}
+        assert frame.sse_bytes == f"id: 1\r\nevent: progress\r\ndata: {progress.model_dump_json()}\r\n\r\n".encode()
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_keeps_milestones_and_latest(self):
+        hub, source = make_hub(queue_size=4)
+        slow = await hub.subscribe(1, "websocket")
+
+        source.publish(1, message(1, milestone=True))
+        for pct in range(2, 20):
+            source.publish(1, message(1, progress_pct=pct))
+        source.publish(1, message(1, status=JobStatus.COMPLETED.value))
+        await settle()
+
+        received = [frame.event_id async for frame in slow]
+
+        assert received == [1, 18, 19, 20]
+        assert slow.dropped == 16
+        assert slow.closed and hub.subscriber_count(1) == 1
+        slow.close()
+        assert hub.subscriber_count(1) == 0
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_filter_skips_frames_but_not_the_terminal_one(self):
+        hub, source = make_hub()
+        milestones = await hub.subscribe(1, "sse", accept=lambda progress: progress.milestone)
+
+        source.publish(1, message(1, progress_pct=5))
+        source.publish(1, message(1, milestone=True))
+        source.publish(1, message(1, status=JobStatus.FAILED.value))
+        await settle()
+
+        assert [frame.event_id async for frame in milestones] == [2, 3]
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_listener_resumes_from_its_cursor_after_disconnect(self, monkeypatch):
+        sleep = asyncio.sleep
+        monkeypatch.setattr(asyncio, "sleep", lambda delay: sleep(0))
+        hub, source = make_hub()
+        subscription = await hub.subscribe(1, "sse")
+        await settle()
+
+        source.disconnect()
+        source.publish(1, message(1, progress_pct=10))
+        await settle()
+
+        assert (await subscription.get(timeout=1)).event_id == 1
+        assert source.reads >= 2 and hub.get_stats()["reconnects"] == 1
+        await hub.stop()
+        assert subscription.closed
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+class FakeResult:
+    def __init__(self, job):
+        self.job = job
+
+    def scalar_one_or_none(self):
+        return self.job
+
+
+class FakeSession:
+    def __init__(self, job):
+        self.job = job
+
+    async def execute(self, statement):
+        return FakeResult(self.job)
+
+
+class TestEndpoints:
+    @pytest.mark.asyncio
+    async def test_websocket_connections_share_hub_subscription(self, monkeypatch):
+        hub, source = make_hub()
+        monkeypatch.setattr(websocket, "progress_hub", hub)
+        manager = websocket.ConnectionManager()
+        sockets = {f"conn-{i}": FakeWebSocket() for i in range(3)}
+        for connection_id, ws in sockets.items():
+            await manager.connect(ws, connection_id)
+            await manager.subscribe_to_job(connection_id, 5)
+
+        published = message(5, progress_pct=50)
+        source.publish(5, published)
+        await settle()
+        await manager.disconnect("conn-0")
+
+        expected = {"type": "progress", **json.loads(published), "event_id": 1}
+        assert all(ws.sent == [expected] for ws in sockets.values())
+        assert hub.subscriber_count(5) == 2 and source.read_jobs == {5}
+        for connection_id in ("conn-1", "conn-2"):
+            await manager.disconnect(connection_id)
+        assert hub.subscriber_count() == 0 and not manager.job_senders
+        await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_sse_resumes_without_duplicates_and_completes(self, monkeypatch):
+        hub, source = make_hub()
+        monkeypatch.setattr(sse, "progress_hub", hub)
+
+        for pct in (10, 20, 30):
+            source.publish(8, message(8, progress_pct=pct))
+
+        async def missed_events(job_id, last_event_id):
+            # Event 4 is also delivered live because it was appended during the fetch
+            source.publish(job_id, message(job_id, progress_pct=40))
+            return [
+                decode_progress_entry(stream_id, data)
+                for stream_id, data in source.streams[job_id][last_event_id:]
+            ]
+
+        monkeypatch.setattr(sse.redis_progress_pubsub, "get_missed_events", missed_events)
+        job = SimpleNamespace(user_id=1, status=JobStatus.RUNNING, progress=20)
+        user = SimpleNamespace(id=1, role="user")
+        events = sse.progress_event_generator(8, user, FakeSession(job), last_event_id=2)
+
+        assert (await events.__anext__())["event"] == "status"
+        resumed = [await events.__anext__(), await events.__anext__()]
+        source.publish(8, message(8, status=JobStatus.COMPLETED.value))
+        rest = [event async for event in events]
+
+        assert [event["id"] for event in resumed] == ["3", "4"]
+        assert rest[0].startswith(b"id: 5\r\nevent: progress\r\n")
+        assert rest[1]["event"] == "complete" and rest[1]["id"] == "5"
+        assert len(rest) == 2
+        assert hub.subscriber_count() == 0
+        await hub.stop()
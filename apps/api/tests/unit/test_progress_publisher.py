@@ -0,0 +1,171 @@
+"""
+Tests for the per-process background progress publisher used by
+WorkerProgressReporter (workers/progress_publisher.py).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.redis_pubsub import RedisProgressPubSub
+from app.schemas.progress import EventType, ProgressMessageV2
+from app.workers.progress_publisher import BackgroundProgressPublisher
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.commands.append(("xadd", key, fields["data"], maxlen))
+
+    def expire(self, key, ttl):
+        self.commands.append(("expire", key, ttl))
+
+    def execute(self):
+        self.client.gate.wait(5)
+        if self.client.failures:
+            self.client.failures -= 1
+            raise ConnectionError("redis down")
+        self.client.executed.append(self.commands)
+        return [1] * len(self.commands)
+
+
+class FakeRedis:
+    def __init__(self, failures: int = 0):
+        self.executed = []
+        self.failures = failures
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def published(self, stream_key):
+        return [
+            json.loads(cmd[2]) for batch in self.executed for cmd in batch
+            if cmd[0] == "xadd" and cmd[1] == stream_key
+        ]
+
+
+def _progress(job_id: int, event_id: int, pct: int = 0, milestone: bool = False) -> ProgressMessageV2:
+    return ProgressMessageV2(
+        job_id=job_id,
+        event_id=event_id,
+        event_type=EventType.PROGRESS_UPDATE,
+        progress_pct=pct,
+        milestone=milestone,
+        timestamp=datetime.now(UTC),
+    )
+
+
+@pytest.fixture
+def client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def publisher(client):
+    pub = BackgroundProgressPublisher(
+        redis_url="redis://unused", flush_interval_seconds=0.02, max_pending=8, client_factory=lambda: client
+    )
+    yield pub
+    pub.close()
+
+
+def _stream(job_id: int) -> str:
+    return RedisProgressPubSub.get_stream_key(job_id)
+
+
+def test_rapid_updates_coalesce_to_latest_and_milestones_survive(publisher, client):
+    client.gate.clear()
+    publisher.submit(1, _progress(1, 1, milestone=True))
+    for i in range(2, 50):
+        publisher.submit(1, _progress(1, i, pct=i))
+    publisher.submit(1, _progress(1, 50, pct=100, milestone=True))
+    client.gate.set()
+
+    assert publisher.flush(5)
+    events = client.published(_stream(1))
+
+    ids = [e["event_id"] for e in events]
+    assert ids == sorted(ids)
+    assert ids[0] == 1 and ids[-1] == 50
+    assert 49 in ids
+    assert len(ids) < 10
+    assert [e["event_id"] for e in events if e["milestone"]] == [1, 50]
+    assert publisher.stats()["coalesced"] > 0
+
+
+def test_one_pipeline_per_flush_appends_to_job_streams(publisher, client):
+    client.gate.clear()
+    publisher.submit(1, _progress(1, 1, milestone=True))
+    publisher.submit(2, _progress(2, 7, pct=30))
+    client.gate.set()
+    assert publisher.flush(5)
+
+    commands = [cmd for batch in client.executed for cmd in batch]
+    xadds = {c[1]: c for c in commands if c[0] == "xadd"}
+
+    assert set(xadds) == {_stream(1), _stream(2)}
+    assert json.loads(xadds[_stream(2)][2])["progress_pct"] == 30
+    assert all(c[3] == RedisProgressPubSub.PROGRESS_CACHE_MAX_EVENTS for c in xadds.values())
+    assert ("expire", _stream(1), RedisProgressPubSub.PROGRESS_CACHE_TTL_SECONDS) in commands
+    assert not [c for c in commands if c[0] not in ("xadd", "expire")]
+    assert len(client.executed) <= 2
+
+
+def test_full_buffer_drops_new_jobs_but_keeps_milestones(publisher, client):
+    client.gate.clear()
+    # Occupy the flusher with one batch so later submissions stay buffered
+    publisher.submit(0, _progress(0, 1, milestone=True))
+    for job_id in range(1, 20):
+        publisher.submit(job_id, _progress(job_id, 1, pct=5))
+    assert publisher.submit(99, _progress(99, 1, milestone=True))
+    client.gate.set()
+    assert publisher.flush(5)
+
+    stats = publisher.stats()
+    assert stats["dropped"] > 0
+    assert client.published(_stream(99))
+    assert stats["pending"] == 0
+
+
+def test_failed_batch_retries_milestones_only():
+    client = FakeRedis(failures=1)
+    pub = BackgroundProgressPublisher(
+        redis_url="redis://unused", flush_interval_seconds=0.01, client_factory=lambda: client
+    )
+    try:
+        client.gate.clear()
+        pub.submit(1, _progress(1, 1, milestone=True))
+        pub.submit(1, _progress(1, 2, pct=10))
+        client.gate.set()
+        assert pub.flush(5)
+        # The retry may still be in its back-off when the failing flush returns
+        assert pub.flush(5)
+        pub.submit(1, _progress(1, 3, pct=20))
+        assert pub.flush(5)
+    finally:
+        pub.close()
+
+    ids = [e["event_id"] for e in client.published(_stream(1))]
+    assert ids == [1, 3]
+    assert pub.stats()["errors"] == 1
+
+
+def test_close_publishes_buffered_updates_and_rejects_new_ones(client):
+    pub = BackgroundProgressPublisher(
+        redis_url="redis://unused", flush_interval_seconds=10, client_factory=lambda: client
+    )
+    pub.submit(5, _progress(5, 1, pct=50))
+
+    pub.close()
+
+    assert [e["event_id"] for e in client.published(_stream(5))] == [1]
+    assert pub.submit(5, _progress(5, 2)) is False
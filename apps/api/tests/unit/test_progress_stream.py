@@ -0,0 +1,181 @@
+"""
+Tests for the per-job Redis Stream progress log (core/redis_pubsub.py):
+appending, event IDs derived from stream entry IDs, XRANGE replay and the
+blocking read used by the progress hub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.redis_pubsub import (
+    RedisProgressPubSub,
+    event_id_to_stream_id,
+    stream_id_to_event_id,
+)
+from app.schemas.progress import EventType, Phase, ProgressMessageV2
+
+
+def _parse(stream_id: str):
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.commands.append(lambda: self.client._xadd(key, fields, maxlen))
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: self.client.expiries.__setitem__(key, ttl) or True)
+
+    async def execute(self):
+        self.client.round_trips += 1
+        return [command() for command in self.commands]
+
+
+class FakeStreamRedis:
+    """Just enough of redis.asyncio's stream commands, with one shared clock."""
+
+    def __init__(self):
+        self.streams = {}
+        self.expiries = {}
+        self.round_trips = 0
+        self.clock_ms = 1_700_000_000_000
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _xadd(self, key, fields, maxlen):
+        stream = self.streams.setdefault(key, [])
+        last_ms, last_seq = _parse(stream[-1][0]) if stream else (0, -1)
+        stream_id = f"{self.clock_ms}-{last_seq + 1 if last_ms == self.clock_ms else 0}"
+        stream.append((stream_id, dict(fields)))
+        if maxlen is not None:
+            del stream[:-maxlen]
+        return stream_id
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        self.round_trips += 1
+        low = (0, 0) if min == "-" else _parse(min)
+        entries = [entry for entry in self.streams.get(key, []) if _parse(entry[0]) >= low]
+        return entries[:count]
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        self.round_trips += 1
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        self.round_trips += 1
+        response = []
+        for key, cursor in streams.items():
+            entries = [entry for entry in self.streams.get(key, []) if _parse(entry[0]) > _parse(cursor)]
+            if entries:
+                response.append([key, entries[:count]])
+        if not response:
+            await asyncio.sleep(block / 1000)
+        return response
+
+
+def _progress(job_id: int, **fields) -> ProgressMessageV2:
+    fields.setdefault("event_type", EventType.PROGRESS_UPDATE)
+    return ProgressMessageV2(job_id=job_id, **fields)
+
+
+@pytest.fixture
+def redis_client():
+    return FakeStreamRedis()
+
+
+def _pubsub(redis_client) -> RedisProgressPubSub:
+    pubsub = RedisProgressPubSub(redis_url="redis://unused")
+    pubsub._redis_client = redis_client
+    return pubsub
+
+
+def test_event_ids_round_trip_stream_ids_and_stay_js_safe():
+    event_id = stream_id_to_event_id("1700000000123-4")
+
+    assert event_id == 1_700_000_000_123_004
+    assert event_id_to_stream_id(event_id) == "1700000000123-4"
+    assert event_id_to_stream_id(event_id + 1) == "1700000000123-5"
+    assert stream_id_to_event_id("4102444800000-999") < 2 ** 53
+
+
+@pytest.mark.asyncio
+async def test_producers_in_different_processes_share_one_ordering(redis_client):
+    workers = [_pubsub(redis_client), _pubsub(redis_client)]
+
+    event_ids = []
+    for i in range(6):
+        progress = _progress(1, progress_pct=i * 10)
+        assert await workers[i % 2].publish_progress(1, progress, force=True)
+        event_ids.append(progress.event_id)
+        redis_client.clock_ms += i % 2
+
+    assert event_ids == sorted(set(event_ids))
+    assert redis_client.round_trips == 6
+    assert redis_client.expiries[RedisProgressPubSub.get_stream_key(1)] == RedisProgressPubSub.PROGRESS_CACHE_TTL_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_stream_is_trimmed_to_the_cache_size(redis_client, monkeypatch):
+    monkeypatch.setattr(RedisProgressPubSub, "PROGRESS_CACHE_MAX_EVENTS", 3)
+    pubsub = _pubsub(redis_client)
+
+    for i in range(5):
+        await pubsub.cache_progress_event(2, _progress(2, progress_pct=i))
+
+    recent = await pubsub.get_recent_events_from_cache(2, count=10)
+    assert [event.progress_pct for event in recent] == [4, 3, 2]
+
+
+@pytest.mark.asyncio
+async def test_missed_events_are_the_entries_after_last_event_id(redis_client):
+    pubsub = _pubsub(redis_client)
+    sent = []
+    for i in range(5):
+        progress = _progress(3, progress_pct=i * 20)
+        await pubsub.append_progress(3, progress)
+        sent.append(progress.event_id)
+    redis_client.streams[RedisProgressPubSub.get_stream_key(3)].insert(3, ("1700000000000-99", {"data": "garbage"}))
+
+    missed = await pubsub.get_missed_events(3, sent[1])
+
+    assert [event.event_id for event in missed] == sent[2:]
+    assert [event.progress_pct for event in missed] == [40, 60, 80]
+    assert await pubsub.get_missed_events(3, sent[-1]) == []
+
+
+@pytest.mark.asyncio
+async def test_read_progress_follows_cursors_and_wakes(redis_client):
+    pubsub = _pubsub(redis_client)
+    first = _progress(4, progress_pct=10)
+    await pubsub.append_progress(4, first)
+    cursor = await pubsub.latest_progress_id(4)
+    second = _progress(4, progress_pct=20)
+    await pubsub.append_progress(4, second)
+    await pubsub.append_progress(5, _progress(5, progress_pct=50))
+
+    entries = await pubsub.read_progress({4: cursor, 6: "0-0"}, block_ms=10)
+
+    assert [(job_id, stream_id_to_event_id(stream_id)) for job_id, stream_id, _ in entries] == [(4, second.event_id)]
+    assert await pubsub.latest_progress_id(6) == "0-0"
+
+    await pubsub.wake_progress_reader()
+    assert await pubsub.read_progress({4: entries[-1][1]}, block_ms=10_000) == []
+    # The wake-up is consumed; the next read blocks again
+    assert await pubsub.read_progress({4: entries[-1][1]}, block_ms=10) == []
+
+
+def test_phase_boundary_messages_can_be_assigned_event_ids():
+    progress = _progress(7, event_type=EventType.PHASE, phase=Phase.START)
+
+    progress.event_id = 5
+
+    assert progress.milestone and progress.event_id == 5
@@ -0,0 +1,170 @@
+"""
+Tests for the pure-ASGI security pipeline (middleware/security_pipeline.py):
+per-path plans, short-circuit header finalization, shared body buffering
+and error handling.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, Response
+
+from app.middleware.limiter import RateLimitMiddleware, _buckets
+from app.middleware.security_pipeline import DEFAULT_LAYERS, SecurityPipelineMiddleware
+
+
+class Layer:
+    """Records hook calls; optionally rejects, reads the body or handles errors."""
+
+    def __init__(self, name, calls, prefix="/", reject=False, read_body=False, mask_errors=False):
+        self.name = name
+        self.calls = calls
+        self.prefix = prefix
+        self.reject = reject
+        self.read_body = read_body
+        self.mask_errors = mask_errors
+
+    def applies_to(self, path: str) -> bool:
+        return path.startswith(self.prefix)
+
+    async def check_request(self, request: Request) -> Optional[Response]:
+        self.calls.append(f"{self.name}:request")
+        if self.read_body:
+            request.state.seen_body = await request.body()
+        if self.reject:
+            return JSONResponse({"rejected_by": self.name}, status_code=403)
+        return None
+
+    def finalize_headers(self, request: Request, headers) -> None:
+        self.calls.append(f"{self.name}:response")
+        headers[f"X-{self.name}"] = "1"
+
+    def handle_error(self, request: Request, error: Exception) -> Optional[Response]:
+        if self.mask_errors:
+            return JSONResponse({"masked": True}, status_code=500)
+        return None
+
+
+def make_app(*layers):
+    app = FastAPI()
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/api/v1/designs/{design_id}")
+    async def update_design(design_id: str, request: Request):
+        return {"id": design_id, "body": (await request.body()).decode()}
+
+    @app.get("/api/v1/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(
+        SecurityPipelineMiddleware,
+        routes=app.routes,
+        layers=[layer if isinstance(layer, tuple) else (layer.name, layer) for layer in layers],
+    )
+    return app
+
+
+class TestPlans:
+    def test_plan_keeps_only_layers_that_apply(self):
+        calls = []
+        pipeline = SecurityPipelineMiddleware(
+            app=None,
+            layers=[
+                ("all", Layer("all", calls)),
+                ("designs", Layer("designs", calls, prefix="/api/v1/designs")),
+            ],
+        )
+
+        assert pipeline.layer_names("/api/v1/health") == ["all"]
+        assert pipeline.layer_names("/api/v1/designs/42") == ["all", "designs"]
+
+    def test_static_routes_are_compiled_up_front(self):
+        calls = []
+        app = make_app(Layer("all", calls))
+
+        with TestClient(app):
+            pipeline = app.middleware_stack.app
+
+            assert isinstance(pipeline, SecurityPipelineMiddleware)
+            assert "/api/v1/health" in pipeline._plans
+            assert not any("{" in path for path in pipeline._plans)
+
+    def test_default_layers_keep_the_previous_stack_order(self):
+        assert [name for name, _ in DEFAULT_LAYERS] == [
+            "rate_limit", "cors", "csrf", "xss", "security_headers",
+            "license", "dev_mode", "production_hardening", "environment_validation",
+        ]
+
+
+class TestRequestFlow:
+    def test_hooks_run_like_nested_middleware(self):
+        calls = []
+        app = make_app(Layer("outer", calls), Layer("inner", calls))
+
+        response = TestClient(app).get("/api/v1/health")
+
+        assert response.status_code == 200
+        assert calls == ["outer:request", "inner:request", "inner:response", "outer:response"]
+        assert response.headers["X-outer"] == response.headers["X-inner"] == "1"
+
+    def test_rejection_skips_inner_layers(self):
+        calls = []
+        app = make_app(
+            Layer("outer", calls),
+            Layer("gate", calls, reject=True),
+            Layer("inner", calls),
+        )
+
+        response = TestClient(app).get("/api/v1/health")
+
+        assert response.status_code == 403
+        assert response.json() == {"rejected_by": "gate"}
+        assert calls == ["outer:request", "gate:request", "outer:response"]
+        assert "X-gate" not in response.headers
+
+    def test_body_read_by_a_layer_reaches_the_handler(self):
+        calls = []
+        reader = Layer("reader", calls, read_body=True)
+        app = make_app(reader)
+
+        response = TestClient(app).post("/api/v1/designs/7", content=b'{"name": "bracket"}')
+
+        assert response.json() == {"id": "7", "body": '{"name": "bracket"}'}
+
+    def test_app_errors_are_answered_by_the_innermost_handler(self):
+        calls = []
+        app = make_app(Layer("outer", calls), Layer("hardening", calls, mask_errors=True))
+
+        response = TestClient(app, raise_server_exceptions=False).get("/api/v1/boom")
+
+        assert response.status_code == 500
+        assert response.json() == {"masked": True}
+        assert "X-outer" in response.headers and "X-hardening" not in response.headers
+
+    def test_unhandled_app_errors_propagate(self):
+        app = make_app(Layer("outer", []))
+
+        with pytest.raises(RuntimeError):
+            TestClient(app).get("/api/v1/boom")
+
+
+class TestExistingLayers:
+    def test_rate_limit_layer_applies_to_designs_only(self, monkeypatch):
+        monkeypatch.setattr(
+            "app.middleware.limiter.appset.rate_limit_rules", {"designs": "2/m"}
+        )
+        _buckets.clear()
+        client = TestClient(make_app(("rate_limit", RateLimitMiddleware(None))))
+
+        statuses = [client.post("/api/v1/designs/1", content=b"{}").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+        assert client.get("/api/v1/health").status_code == 200
@@ -0,0 +1,104 @@
+"""
+Tests for the streaming STEP canonicalizer used by the deterministic
+exporter (services/freecad/step_canonicalizer.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+import pytest
+
+from app.services.freecad.step_canonicalizer import canonicalize_step_file
+
+HEADER = (
+    "HEADER;\n"
+    "FILE_DESCRIPTION(('FreeCAD Model'),'2;1');\n"
+    "FILE_NAME('part.step','2024-01-15T10:30:00',('alice@example.com'),('org'),'pre','orig','');\n"
+    "FILE_SCHEMA(('AUTOMOTIVE_DESIGN { 1 0 10303 214 3 1 1 }'));\n"
+    "ENDSEC;\n"
+)
+
+
+def _step(entities: int = 2000, newline: str = "\n") -> bytes:
+    data = "".join(
+        f"#{i}=CARTESIAN_POINT('',({i * 0.5:.6f},{i * -0.25:.6f},{i * 1.5:.6f}));{newline}"
+        for i in range(1, entities + 1)
+    )
+    return f"ISO-10303-21;\n{HEADER}DATA;\n{data}ENDSEC;\nEND-ISO-10303-21;\n".encode()
+
+
+def _clean(header: str) -> str:
+    header = re.sub(r"'\d{4}-\d{2}-\d{2}T[\d:]+'", "'2000-01-01T00:00:00+00:00'", header)
+    return re.sub(r"'[^']*@[^']*'", "'deterministic@export'", header)
+
+
+def _expected(content: bytes) -> bytes:
+    start = content.index(b"HEADER;")
+    end = content.index(b"ENDSEC;", start) + len(b"ENDSEC;")
+    return content[:start] + _clean(content[start:end].decode()).encode() + content[end:]
+
+
+@pytest.mark.parametrize("buffer_size", [7, 64, 4096, 1024 * 1024])
+def test_rewrites_header_and_streams_rest(tmp_path, buffer_size):
+    content = _step(newline="\r\n")
+    path = tmp_path / "model.step"
+    path.write_bytes(content)
+
+    result = canonicalize_step_file(path, _clean, buffer_size=buffer_size)
+
+    output = path.read_bytes()
+    assert output == _expected(content)
+    assert b"alice@example.com" not in output and b"\r\n" in output
+    assert result.valid
+    assert result.size == len(output)
+    assert result.sha256 == hashlib.sha256(output).hexdigest()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("buffer_size", [5, 11, 4096])
+def test_missing_marker_leaves_file_untouched(tmp_path, buffer_size):
+    content = _step().replace(b"END-ISO-10303-21;", b"END;")
+    path = tmp_path / "broken.step"
+    path.write_bytes(content)
+
+    result = canonicalize_step_file(path, _clean, buffer_size=buffer_size)
+
+    assert not result.valid
+    assert result.missing_markers == ["END-ISO-10303-21"]
+    assert path.read_bytes() == content
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_marker_split_across_buffers_is_found(tmp_path):
+    content = _step(entities=3)
+    marker_at = content.index(b"END-ISO-10303-21")
+    path = tmp_path / "split.step"
+    path.write_bytes(content)
+
+    # Reads happen at multiples of the buffer size; put a boundary inside the marker
+    buffer_size = next(size for size in range(8, 64) if 0 < -marker_at % size < len(b"END-ISO-10303-21"))
+
+    assert canonicalize_step_file(path, _clean, buffer_size=buffer_size).valid
+
+
+def test_without_header_returns_none(tmp_path):
+    content = b"ISO-10303-21;\nDATA;\n#1=X();\nENDSEC;\nEND-ISO-10303-21;\n"
+    path = tmp_path / "noheader.step"
+    path.write_bytes(content)
+
+    assert canonicalize_step_file(path, _clean) is None
+    assert path.read_bytes() == content
+
+
+def test_header_cleaner_error_removes_temp_file(tmp_path):
+    path = tmp_path / "model.step"
+    path.write_bytes(_step(entities=10))
+
+    def fail(header):
+        raise ValueError("bad header")
+
+    with pytest.raises(ValueError):
+        canonicalize_step_file(path, fail)
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,128 @@
+"""
+Tests for the single-pass threat scanner (core/threat_scanner.py) and its use
+by InputSanitizationService and XSSDetectionMiddleware.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.core.security import security_manager
+from app.core.threat_scanner import ThreatCategory, ThreatScanner, iter_json_fields
+from app.services.input_sanitization_service import InputSanitizationService
+
+
+@pytest.fixture(scope="module")
+def service() -> InputSanitizationService:
+    return InputSanitizationService()
+
+
+def _per_pattern_categories(service: InputSanitizationService, text: str) -> set[str]:
+    """The category verdicts of the former one-regex-at-a-time validation."""
+    found = set()
+    lowered = text.lower()
+    if any(p.search(lowered) for p in service.compiled_xss_patterns):
+        found.add("XSS")
+    if (len(text) > 5 and any(k in lowered for k in service.SQL_INJECTION_TRIGGERS)
+            and any(p.search(lowered) for p in service.compiled_sql_patterns)):
+        found.add("SQL_INJECTION")
+    if any(p.search(text) for p in service.compiled_path_patterns):
+        found.add("PATH_TRAVERSAL")
+    if (len(text) > 3 and any(o in text for o in service.COMMAND_INJECTION_TRIGGERS)
+            and any(p.search(text) for p in service.compiled_cmd_patterns)):
+        found.add("COMMAND_INJECTION")
+    return found
+
+
+@pytest.mark.parametrize("text", [
+    "Flanş DN50, 8 delikli, M16 civata",
+    "bracket width=40 height=25 (fillet 2mm)",
+    "<script>alert('xss')</script>",
+    "<script>alert('XSS')</script>'; DROP TABLE users; --",
+    "1' OR '1'='1",
+    "/* just a comment */",
+    "../../../etc/passwd",
+    "%2E%2E%2Fsecret",
+    "file.txt; rm -rf /",
+    "input | bash",
+    "conditions=ok",
+    "'; EXEC xp_cmdshell('dir'); --",
+])
+def test_verdicts_match_per_pattern_validation(service, text):
+    expected = _per_pattern_categories(service, text)
+
+    assert service.threat_scanner.matched_categories(text) == expected
+    result = service.comprehensive_validate(text)
+    assert result["is_safe"] is (not expected)
+    assert {threat["type"] for threat in result["threats"]} == expected
+
+
+def test_first_match_reports_category_and_offset():
+    scanner = ThreatScanner([
+        ThreatCategory("XSS", (r"<\s*script",), ("<",)),
+        ThreatCategory("PATH_TRAVERSAL", (r"\.\./",), ("..",)),
+    ])
+
+    match = scanner.first_match("see ../x then <script>", field="q")
+
+    assert (match.category, match.offset, match.matched, match.field) == ("PATH_TRAVERSAL", 4, "../", "q")
+    assert scanner.first_match("a plain design note") is None
+
+
+def test_category_gate_suppresses_matches():
+    scanner = ThreatScanner([ThreatCategory("SQL_INJECTION", (r"/\*.*?\*/",), ("select", "'"), min_length=6)])
+
+    assert scanner.first_match("/* note */") is None
+    assert scanner.first_match("select /* x */").category == "SQL_INJECTION"
+    assert scanner.matched_categories("/* note */") == set()
+
+
+def test_overlapping_matches_from_other_categories_are_reported():
+    scanner = ThreatScanner([
+        ThreatCategory("A", (r"ab+",), ("a",)),
+        ThreatCategory("B", (r"bbb",), ("b",)),
+    ])
+
+    assert scanner.first_match("abbb").category == "A"
+    assert scanner.matched_categories("abbb") == {"A", "B"}
+
+
+def test_request_scanner_is_case_insensitive():
+    assert security_manager.is_suspicious_request({"q": "<SCRIPT>x"})
+    assert security_manager.is_suspicious_request({"q": "setTimeout(go, 1)"})
+    assert not security_manager.is_suspicious_request({"q": "Price: $100.50", "n": 3})
+
+    match = security_manager.scan_request_fields([("a", "ok"), ("b", "x onerror=y")])
+    assert (match.category, match.field) == ("XSS", "b")
+
+
+def test_json_walk_yields_keys_and_string_values():
+    body = json.dumps({
+        "design": {"type": "params", "dimensions": {"width": {"value": 40.0, "unit": "mm"}}},
+        "metadata": {"tags": ["flange", "dn50"]},
+        "priority": 5,
+    })
+
+    fields = list(iter_json_fields(body))
+
+    assert ("body_key", "dimensions") in fields
+    assert ("body_unit", "mm") in fields
+    assert ("body_tags", "dn50") in fields
+    assert all(isinstance(value, str) for _, value in fields)
+
+
+def test_json_walk_decodes_escapes_and_caps_values():
+    body = '{"prompt": "\\u003cscript\\u003ealert(1)", "note": "' + "a" * 50 + '"}'
+
+    fields = dict(iter_json_fields(body, max_chars=20))
+
+    assert fields["body_prompt"] == "<script>alert(1)"
+    assert fields["body_note"] == "a" * 20
+    assert security_manager.scan_request_fields(iter_json_fields(body)).field == "body_prompt"
+
+
+def test_json_walk_treats_non_container_as_text():
+    assert list(iter_json_fields("<script>alert(1)</script>", max_chars=8)) == [("body_content", "<script>")]
+    assert list(iter_json_fields("   ")) == [("body_content", "   ")]
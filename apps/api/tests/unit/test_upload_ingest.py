@@ -0,0 +1,195 @@
+"""
+Tests for the single-pass upload ingest pipeline (services/upload_ingest_service.py)
+and the pooled clamd sessions it scans through (services/clamav_service.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+
+import pytest
+
+from app.services.clamav_service import ClamAVError, ClamAVService
+from app.services.upload_ingest_service import (
+    ContentSniffer,
+    UploadIngestService,
+    dxf_units_from_header,
+    sniff_format,
+)
+from tests.utils.fake_upload_backends import EICAR, FakeClamd, FakeObjectClient, unused_port
+
+STEP_HEADER = (
+    b"ISO-10303-21;\nHEADER;\nFILE_DESCRIPTION(('bracket, MILLIMETRE'),'2;1');\n"
+    b"FILE_SCHEMA(('AUTOMOTIVE_DESIGN { 1 0 10303 214 1 1 1 1 }'));\nENDSEC;\nDATA;\n"
+    b"#10=(LENGTH_UNIT()NAMED_UNIT(*)SI_UNIT(.MILLI.,.METRE.));\n"
+)
+
+
+def step_file(size: int) -> bytes:
+    body = b"#100=CARTESIAN_POINT('',(0.,0.,0.));\n"
+    return STEP_HEADER + body * ((size - len(STEP_HEADER)) // len(body) + 1)
+
+
+def make_clamav(port: int, **kwargs) -> ClamAVService:
+    return ClamAVService(host="127.0.0.1", port=port, timeout_connect=1.0, timeout_scan=5.0, **kwargs)
+
+
+@pytest.fixture
+def clamd():
+    with FakeClamd() as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr("app.services.upload_ingest_service.RETRY_DELAY", 0)
+
+
+def ingest(client, clamav, name, data, expected_sha256=None, chunk_size=64 * 1024, **kwargs):
+    client.put("artefacts", name, data)
+    service = UploadIngestService(client=client, clamav_service=clamav, chunk_size=chunk_size, queue_depth=4)
+    return service.ingest_object(
+        bucket_name="artefacts",
+        object_name=name,
+        size=len(data),
+        expected_sha256=expected_sha256 or hashlib.sha256(data).hexdigest(),
+        mime_type=kwargs.pop("mime_type", "application/step"),
+        file_type=kwargs.pop("file_type", "model"),
+        **kwargs,
+    )
+
+
+class TestSinglePass:
+    def test_hash_sniff_and_scan_from_one_read(self, clamd):
+        client = FakeObjectClient()
+        data = step_file(1024 * 1024)
+
+        verdict = ingest(client, make_clamav(clamd.port), "job-1/bracket.step", data)
+
+        assert verdict.accepted
+        assert verdict.sha256 == hashlib.sha256(data).hexdigest()
+        assert (verdict.sniff.format, verdict.sniff.units) == ("step", "mm")
+        assert verdict.scan.is_clean
+        assert client.bytes_served == len(data)
+        assert client.get_requests == 1
+        assert clamd.bytes_scanned == len(data)
+
+    def test_hash_result_matches_verify_object_hash_shape(self, clamd):
+        data = step_file(4096)
+
+        verdict = ingest(FakeObjectClient(), make_clamav(clamd.port), "job-1/bracket.step", data)
+        is_valid, sha256, metadata, first_chunk = verdict.hash_result()
+
+        assert is_valid and sha256 == verdict.sha256
+        assert first_chunk == data[:1024]
+        assert metadata["bytes_processed"] == len(data)
+
+    def test_hash_mismatch_is_rejected_first(self, clamd):
+        verdict = ingest(
+            FakeObjectClient(), make_clamav(clamd.port), "job-1/bracket.step",
+            EICAR + step_file(4096), expected_sha256="0" * 64,
+        )
+
+        assert verdict.rejection_reason == "hash_mismatch"
+        assert not verdict.is_clean
+
+    def test_malware_is_detected(self, clamd):
+        verdict = ingest(FakeObjectClient(), make_clamav(clamd.port), "job-1/bracket.step", EICAR)
+
+        assert verdict.rejection_reason == "malware"
+        assert verdict.scan.virus_name == "Eicar-Test-Signature"
+
+    def test_dropped_connection_resumes_at_offset(self, clamd):
+        client = FakeObjectClient()
+        client.fail_once_after = 300 * 1024
+        data = step_file(1024 * 1024)
+
+        verdict = ingest(client, make_clamav(clamd.port), "job-1/bracket.step", data)
+
+        assert verdict.accepted
+        assert client.get_requests == 2
+        assert client.bytes_served == len(data)
+        assert verdict.metadata["read_requests"] == 2
+
+    def test_scan_policy_skips_gcode(self, clamd):
+        verdict = ingest(
+            FakeObjectClient(), make_clamav(clamd.port), "job-1/part.nc", b"G0 X0 Y0\n" * 100,
+            mime_type="text/plain", file_type="gcode",
+        )
+
+        assert verdict.accepted
+        assert verdict.scan.scan_metadata == {"scan_skipped": True, "reason": "policy"}
+        assert clamd.bytes_scanned == 0
+
+    def test_clamd_down_reports_scan_unavailable(self):
+        verdict = ingest(FakeObjectClient(), make_clamav(unused_port()), "job-1/bracket.step", step_file(4096))
+
+        assert verdict.rejection_reason == "scan_error"
+        with pytest.raises(ClamAVError) as exc_info:
+            verdict.scan_result()
+        assert exc_info.value.code == "SCAN_UNAVAILABLE"
+        assert exc_info.value.status_code == 503
+
+
+class TestClamdSessions:
+    def test_sessions_are_reused_across_scans(self, clamd):
+        clamav = make_clamav(clamd.port)
+        client = FakeObjectClient()
+
+        for i in range(3):
+            assert ingest(client, clamav, f"job-{i}/bracket.step", step_file(8192)).accepted
+
+        assert clamd.connections == 1
+
+    def test_idle_sessions_are_replaced(self, clamd):
+        clamav = make_clamav(clamd.port, session_idle_timeout=0.0)
+        client = FakeObjectClient()
+
+        for i in range(2):
+            ingest(client, clamav, f"job-{i}/bracket.step", step_file(8192))
+
+        assert clamd.connections == 2
+
+
+class TestSniffing:
+    def test_binary_stl(self):
+        data = b"\0" * 80 + struct.pack("<I", 2) + b"\0" * 100
+        assert sniff_format(data, len(data)) == "stl"
+
+    def test_ascii_stl(self):
+        data = b"solid part\n facet normal 0 0 1\n"
+        assert sniff_format(data, len(data)) == "stl"
+
+    def test_ifc_is_told_apart_from_step(self):
+        data = b"ISO-10303-21;\nHEADER;\nFILE_SCHEMA(('IFC4'));\nENDSEC;\n"
+        assert sniff_format(data, len(data)) == "ifc"
+
+    def test_fcstd(self):
+        data = b"PK\x03\x04" + b"\0" * 26 + b"Document.xml"
+        assert sniff_format(data, len(data)) == "fcstd"
+
+    def test_dxf_units(self):
+        data = b"  0\nSECTION\n  2\nHEADER\n  9\n$INSUNITS\n 70\n     1\n  0\nENDSEC\n"
+        assert sniff_format(data, len(data)) == "dxf"
+        assert dxf_units_from_header(data.decode()) == "inch"
+
+    def test_sniffer_keeps_only_the_head(self):
+        sniffer = ContentSniffer(head_size=16)
+        for _ in range(4):
+            sniffer.feed(b"ISO-10303-21;" + b"x" * 10)
+
+        result = sniffer.result("job/part.stp", 92)
+
+        assert len(result.head) == 16
+        assert result.format == "step" and result.matches_extension
+
+    def test_extension_mismatch(self):
+        data = b"solid part\n facet normal 0 0 1\n"
+        sniffer = ContentSniffer()
+        sniffer.feed(data)
+
+        result = sniffer.result("job/part.step", len(data))
+
+        assert result.format == "stl"
+        assert not result.matches_extension
@@ -0,0 +1,263 @@
+"""
+Tests for the binary WAL (services/wal_segment_log.py) and the point-in-time
+recovery WAL manager and replay built on it (services/point_in_time_recovery.py).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import wal_segment_log
+from app.services.point_in_time_recovery import (
+    PITRConfig,
+    PointInTimeRecovery,
+    RecoveryMode,
+    RecoveryRequest,
+    TransactionLogEntry,
+    TransactionType,
+    WALManager,
+)
+from app.services.wal_segment_log import WALError, WALSegmentLog
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def records(count: int, start: int = 0, size: int = 100):
+    return [(1_000_000 * i, f"{i:08d}".encode() * (size // 8)) for i in range(start, start + count)]
+
+
+def pitr_config(tmp_path, **overrides) -> PITRConfig:
+    values = dict(
+        wal_directory=str(tmp_path / "wal"),
+        wal_fsync=False,
+    )
+    values.update(overrides)
+    return PITRConfig(**values)
+
+
+def entry(index: int, **kwargs) -> TransactionLogEntry:
+    values = dict(
+        transaction_id=f"txn_{index}",
+        timestamp=T0 + timedelta(seconds=index),
+        type=TransactionType.UPDATE,
+        object_id=f"model_{index % 3}",
+        operation={"action": "update"},
+        before_state=None,
+        after_state={"revision": index},
+        checksum="",
+    )
+    values.update(kwargs)
+    return TransactionLogEntry(**values)
+
+
+class TestWALSegmentLog:
+    def test_round_trip_across_segments_and_reopen(self, tmp_path):
+        log = WALSegmentLog(tmp_path, segment_size=4096, index_interval=512, fsync=False)
+        written = records(200)
+        log.append(written[:150])
+        log.append(written[150:])
+        log.close()
+
+        reopened = WALSegmentLog(tmp_path, segment_size=4096, index_interval=512, fsync=False)
+
+        assert reopened.segment_count > 1
+        assert list(reopened.iter_records()) == written
+        assert [ts for ts, _ in reopened.iter_records(50_000_000, 59_000_000)] == [
+            1_000_000 * i for i in range(50, 60)
+        ]
+
+    def test_torn_tail_is_truncated_and_appends_continue(self, tmp_path):
+        log = WALSegmentLog(tmp_path, segment_size=1 << 20, fsync=False)
+        log.append(records(10))
+        log.close()
+        segment = next(tmp_path.glob("wal_*.wal"))
+        with open(segment, "ab") as f:
+            f.write(wal_segment_log.encode_record(99_000_000, b"half written")[:-4])
+
+        reopened = WALSegmentLog(tmp_path, segment_size=1 << 20, fsync=False)
+        reopened.append(records(1, start=10))
+
+        assert list(reopened.iter_records()) == records(11)
+
+    def test_reads_stop_at_corrupt_record(self, tmp_path):
+        log = WALSegmentLog(tmp_path, segment_size=1 << 20, fsync=False)
+        written = records(5)
+        log.append(written)
+        record_size = wal_segment_log._RECORD_HEADER.size + len(written[0][1])
+        segment = next(tmp_path.glob("wal_*.wal"))
+        with open(segment, "r+b") as f:
+            f.seek(wal_segment_log._SEGMENT_HEADER.size + 2 * record_size + wal_segment_log._RECORD_HEADER.size)
+            f.write(b"X")
+
+        assert list(log.iter_records()) == written[:2]
+        with open(segment, "rb") as f:
+            f.seek(wal_segment_log._SEGMENT_HEADER.size)
+            with pytest.raises(WALError, match="Corrupt"):
+                list(wal_segment_log._read_records(f, segment.stat().st_size))
+
+    def test_missing_index_is_rebuilt(self, tmp_path):
+        log = WALSegmentLog(tmp_path, segment_size=8192, index_interval=512, fsync=False)
+        log.append(records(300))
+        log.close()
+        for index in tmp_path.glob("wal_*.idx"):
+            index.unlink()
+
+        reopened = WALSegmentLog(tmp_path, segment_size=8192, index_interval=512, fsync=False)
+
+        assert [ts for ts, _ in reopened.iter_records(100_000_000, 101_000_000)] == [100_000_000, 101_000_000]
+        assert all(path.stat().st_size > 0 for path in tmp_path.glob("wal_*.idx"))
+
+    def test_seek_reads_only_matching_blocks(self, tmp_path, monkeypatch):
+        log = WALSegmentLog(tmp_path, segment_size=1 << 20, index_interval=1024, fsync=False)
+        log.append(records(2000))
+        scanned = []
+        read_records = wal_segment_log._read_records
+
+        def counting(f, end):
+            for record in read_records(f, end):
+                scanned.append(record)
+                yield record
+
+        monkeypatch.setattr(wal_segment_log, "_read_records", counting)
+
+        found = list(log.iter_records(1990_000_000, None))
+
+        assert len(found) == 10
+        assert len(scanned) < 30
+
+    def test_out_of_order_timestamps_are_found(self, tmp_path):
+        log = WALSegmentLog(tmp_path, segment_size=1 << 20, index_interval=256, fsync=False)
+        shuffled = records(50)
+        shuffled[10], shuffled[40] = shuffled[40], shuffled[10]
+        log.append(shuffled)
+
+        assert [ts for ts, _ in log.iter_records(40_000_000, 40_000_000)] == [40_000_000]
+
+    def test_drop_before_keeps_active_segment(self, tmp_path):
+        log = WALSegmentLog(tmp_path, segment_size=4096, fsync=False)
+        log.append(records(100))
+        segments = log.segment_count
+
+        removed = log.drop_before(10**12)
+
+        assert len(removed) == segments - 1
+        assert log.segment_count == 1
+        remaining = [ts for ts, _ in log.iter_records()]
+        assert remaining == [1_000_000 * i for i in range(100 - len(remaining), 100)]
+
+
+class TestWALManager:
+    @pytest.mark.asyncio
+    async def test_concurrent_writers_share_group_commits(self, tmp_path, monkeypatch):
+        manager = WALManager(pitr_config(tmp_path))
+        batches = []
+        append = manager.log.append
+
+        def counting(batch):
+            batches.append(len(batch))
+            append(batch)
+
+        monkeypatch.setattr(manager.log, "append", counting)
+
+        results = await asyncio.gather(*(manager.write_transaction(entry(i)) for i in range(100)))
+
+        assert all(results)
+        assert sum(batches) == 100 and len(batches) < 10
+        assert [t.transaction_id for t in await manager.read_transactions()] == [f"txn_{i}" for i in range(100)]
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_reports_false(self, tmp_path, monkeypatch):
+        manager = WALManager(pitr_config(tmp_path))
+
+        def failing(batch):
+            raise WALError("disk full")
+
+        monkeypatch.setattr(manager.log, "append", failing)
+
+        assert await manager.write_transaction(entry(1)) is False
+
+    @pytest.mark.asyncio
+    async def test_time_range_limit_and_no_duplicates(self, tmp_path):
+        manager = WALManager(pitr_config(tmp_path))
+        for i in range(20):
+            await manager.write_transaction(entry(i))
+
+        window = await manager.read_transactions(T0 + timedelta(seconds=5), T0 + timedelta(seconds=9))
+        limited = await manager.read_transactions(limit=3)
+
+        assert [t.transaction_id for t in window] == [f"txn_{i}" for i in range(5, 10)]
+        assert [t.transaction_id for t in limited] == ["txn_0", "txn_1", "txn_2"]
+        assert len(await manager.read_transactions()) == 20
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_segments_are_read_first(self, tmp_path):
+        config = pitr_config(tmp_path)
+        wal_dir = tmp_path / "wal"
+        wal_dir.mkdir()
+        legacy = {
+            "transaction_id": "txn_legacy",
+            "timestamp": (T0 - timedelta(days=1)).isoformat(),
+            "type": "create",
+            "object_id": "model_0",
+            "operation": {"action": "create"},
+            "before_state": None,
+            "after_state": {"revision": 0},
+            "checksum": "",
+            "user_id": None,
+            "metadata": {},
+        }
+        (wal_dir / f"wal_{uuid.uuid4().hex}.log").write_text(json.dumps(legacy) + "\n")
+        manager = WALManager(config)
+        await manager.write_transaction(entry(1))
+
+        assert [t.transaction_id for t in await manager.read_transactions()] == ["txn_legacy", "txn_1"]
+        assert [t.transaction_id for t in await manager.read_transactions(start_time=T0)] == ["txn_1"]
+
+
+class TestRecovery:
+    @pytest.mark.asyncio
+    async def test_latest_without_checkpoint_replays_whole_log(self, tmp_path):
+        pitr = PointInTimeRecovery(pitr_config(tmp_path, verify_checksums=False))
+        for i in range(6):
+            await pitr.wal_manager.write_transaction(entry(i))
+
+        result = await pitr.recover(RecoveryRequest(mode=RecoveryMode.LATEST))
+
+        assert result.success
+        assert result.transactions_applied == 6
+        assert result.recovered_transaction_id == "txn_5"
+        assert pitr.current_state["model_2"]["revision"] == 5
+
+    @pytest.mark.asyncio
+    async def test_exact_time_starts_at_checkpoint(self, tmp_path):
+        pitr = PointInTimeRecovery(pitr_config(tmp_path, verify_checksums=False))
+        for i in range(10):
+            await pitr.wal_manager.write_transaction(entry(i))
+        checkpoint = await pitr.checkpoint_manager.create_checkpoint({"model_0": {"revision": 3}})
+        checkpoint.timestamp = T0 + timedelta(seconds=4)
+
+        result = await pitr.recover(
+            RecoveryRequest(mode=RecoveryMode.EXACT_TIME, target_timestamp=T0 + timedelta(seconds=7))
+        )
+
+        assert result.transactions_applied == 4
+        assert result.recovered_transaction_id == "txn_7"
+        assert pitr.current_state["model_0"]["revision"] == 6
+
+    @pytest.mark.asyncio
+    async def test_transaction_mode_stops_at_target(self, tmp_path):
+        pitr = PointInTimeRecovery(pitr_config(tmp_path, verify_checksums=False))
+        for i in range(10):
+            await pitr.wal_manager.write_transaction(entry(i))
+
+        result = await pitr.recover(
+            RecoveryRequest(mode=RecoveryMode.TRANSACTION, target_transaction_id="txn_3", dry_run=True)
+        )
+
+        assert result.transactions_applied == 4
+        assert result.recovered_transaction_id == "txn_3"
@@ -0,0 +1,189 @@
+"""
+Tests for the mesh-based wall thickness engine (services/wall_thickness_engine.py)
+and the whole-shape analysis cache in WallThicknessCache.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.geometry_cache import WallThicknessCache
+from app.services.wall_thickness_engine import (
+    TriangleBVH,
+    WallThicknessEngine,
+    shape_mesh,
+)
+
+# Outward-wound box faces as corner indices (corner bits: x=4, y=2, z=1)
+BOX_FACES = [
+    [(0, 1, 3), (0, 3, 2)],  # x min
+    [(4, 6, 7), (4, 7, 5)],  # x max
+    [(0, 4, 5), (0, 5, 1)],  # y min
+    [(2, 3, 7), (2, 7, 6)],  # y max
+    [(0, 2, 6), (0, 6, 4)],  # z min
+    [(1, 5, 7), (1, 7, 3)],  # z max
+]
+
+
+def _corners(lo, hi) -> np.ndarray:
+    lo, hi = np.asarray(lo, float), np.asarray(hi, float)
+    bits = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], float)
+    return lo + bits * (hi - lo)
+
+
+def _box(lo, hi, inward: bool = False):
+    """Box triangles and the face each belongs to."""
+    corners = _corners(lo, hi)
+    tri = corners[np.array([t for face in BOX_FACES for t in face])]
+    if inward:
+        tri = tri[:, ::-1]
+    return tri, np.repeat(np.arange(6), 2)
+
+
+def _brute_force(tri, origins, directions, exclude, min_distance):
+    best = np.full(len(origins), np.inf)
+    for i, (o, d) in enumerate(zip(origins, directions)):
+        for j, (a, b, c) in enumerate(tri):
+            if j == exclude[i]:
+                continue
+            e1, e2 = b - a, c - a
+            p = np.cross(d, e2)
+            det = e1 @ p
+            if abs(det) < 1e-14:
+                continue
+            s = o - a
+            u = (s @ p) / det
+            q = np.cross(s, e1)
+            v = (d @ q) / det
+            t = (e2 @ q) / det
+            if u >= 0 and v >= 0 and u + v <= 1 and t > min_distance:
+                best[i] = min(best[i], t)
+    return best
+
+
+def _fake_shape(lo, hi):
+    """Minimal FreeCAD-like box: faces that tessellate and a bounding box."""
+    corners = _corners(lo, hi)
+    vector = lambda p: SimpleNamespace(x=p[0], y=p[1], z=p[2])  # noqa: E731
+    faces = [
+        SimpleNamespace(tessellate=lambda tol, f=face: ([vector(p) for p in corners], f))
+        for face in BOX_FACES
+    ]
+    size = np.asarray(hi, float) - np.asarray(lo, float)
+    return SimpleNamespace(
+        Faces=faces,
+        Volume=float(np.prod(size)),
+        Area=float(2 * (size[0] * size[1] + size[1] * size[2] + size[0] * size[2])),
+        Mass=0.0,
+        Vertexes=[None] * 8,
+        BoundBox=SimpleNamespace(
+            XMin=lo[0], YMin=lo[1], ZMin=lo[2], XMax=hi[0], YMax=hi[1], ZMax=hi[2],
+            DiagonalLength=float(np.linalg.norm(size))
+        ),
+    )
+
+
+def test_thin_plate_thickness_per_face():
+    tri, faces = _box((0, 0, 0), (100, 50, 2))
+
+    result = WallThicknessEngine().analyze_mesh(tri, faces)
+
+    assert result.face_thickness() == pytest.approx({0: 100, 1: 100, 2: 50, 3: 50, 4: 2, 5: 2})
+    assert result.min_thickness == pytest.approx(2)
+
+
+def test_reversed_winding_is_detected():
+    tri, faces = _box((0, 0, 0), (10, 10, 3))
+
+    result = WallThicknessEngine().analyze_mesh(tri[:, ::-1], faces)
+
+    assert result.min_thickness == pytest.approx(3)
+
+
+def test_hollow_box_measures_wall_not_cavity():
+    outer, outer_faces = _box((0, 0, 0), (40, 40, 40))
+    inner, inner_faces = _box((1.5, 1.5, 1.5), (38.5, 38.5, 38.5), inward=True)
+    tri = np.concatenate([outer, inner])
+    faces = np.concatenate([outer_faces, inner_faces + 6])
+
+    result = WallThicknessEngine(sample_spacing=4).analyze_mesh(tri, faces)
+
+    # Rays from the outer skin within 1.5 of an edge run along the wall, not across it
+    across = ((result.points > 1.5) & (result.points < 38.5)).sum(axis=1) >= 2
+    assert result.measured.all()
+    assert across.mean() > 0.8
+    np.testing.assert_allclose(result.thickness[across], 1.5)
+    assert result.min_thickness == pytest.approx(1.5)
+
+
+def test_thin_regions_report_face_location_and_area():
+    tri, faces = _box((0, 0, 0), (20, 10, 0.5))
+
+    regions = WallThicknessEngine(sample_spacing=1).analyze_mesh(tri, faces).thin_regions(1.0)
+
+    assert [r["face_id"] for r in regions] == [4, 5]
+    for region in regions:
+        assert region["thickness"] == pytest.approx(0.5)
+        assert region["area"] == pytest.approx(200)
+        assert region["location"][2] == pytest.approx(0.0 if region["face_id"] == 4 else 0.5)
+
+
+def test_bvh_matches_brute_force_intersection():
+    rng = np.random.default_rng(4)
+    tri = rng.uniform(-10, 10, (300, 1, 3)) + rng.uniform(-1, 1, (300, 3, 3))
+    origins = rng.uniform(-10, 10, (200, 3))
+    directions = rng.normal(size=(200, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    exclude = rng.integers(-1, 300, 200)
+
+    hits = TriangleBVH(tri, leaf_size=4).nearest_hits(origins, directions, exclude, min_distance=1e-9)
+
+    np.testing.assert_allclose(hits, _brute_force(tri, origins, directions, exclude, 1e-9))
+    assert np.isfinite(hits).any() and np.isinf(hits).any()
+
+
+def test_open_mesh_leaves_samples_unmeasured():
+    tri, faces = _box((0, 0, 0), (5, 5, 5))
+    keep = faces != 1
+
+    result = WallThicknessEngine().analyze_mesh(tri[keep], faces[keep])
+
+    assert not result.measured.all()
+    assert 0 not in result.face_thickness()
+
+
+def test_shape_analysis_uses_face_tessellation_and_cache():
+    shape = _fake_shape((0, 0, 0), (30, 30, 1))
+    engine = WallThicknessEngine()
+    cache = WallThicknessCache()
+    calls = []
+
+    def compute(s):
+        calls.append(s)
+        return engine.analyze(s)
+
+    first = cache.get_or_compute_analysis(shape, compute, key=(None, None))
+    second = cache.get_or_compute_analysis(shape, compute, key=(None, None))
+    cache.get_or_compute_analysis(shape, compute, key=(0.1, None))
+
+    assert first is second
+    assert len(calls) == 2
+    assert first.face_thickness()[4] == pytest.approx(1)
+    assert len(shape_mesh(shape, 0.1)[0]) == 12
+
+    cache.clear()
+    cache.get_or_compute_analysis(shape, compute, key=(None, None))
+    assert len(calls) == 3
+
+
+def test_legacy_point_map_view():
+    tri, faces = _box((0, 0, 0), (8, 8, 2))
+
+    point_map = WallThicknessEngine().analyze_mesh(tri, faces).as_point_map()
+
+    assert len(point_map) == 12
+    assert min(point_map.values()) == pytest.approx(2)
+    assert all(len(p) == 3 for p in point_map)
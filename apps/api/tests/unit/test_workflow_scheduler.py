@@ -0,0 +1,220 @@
+"""
+Tests for the concurrent DAG scheduler of WorkflowEngine
+(services/workflow_automation.py): ready-queue launching, concurrency
+limits, timings, critical path and pause/resume across engines.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.models.enums import ErrorHandling, StepStatus, WorkflowStatus
+from app.services.workflow_automation import (
+    ExecutionOptions,
+    Workflow,
+    WorkflowEngine,
+    WorkflowStateStore,
+    WorkflowStep,
+)
+
+
+def step(step_id, action="work", deps=(), **kwargs):
+    return WorkflowStep(
+        id=step_id, name=step_id, action=action, dependencies=list(deps), **kwargs
+    )
+
+
+def fan_out(width: int) -> Workflow:
+    """build -> export_0..export_{width-1} -> publish"""
+    exports = [step(f"export_{i}", action="export", deps=["build"]) for i in range(width)]
+    return Workflow(
+        name="fan-out",
+        steps=[step("build"), *exports, step("publish", deps=[s.id for s in exports])],
+    )
+
+
+class Recorder:
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.peak_by_action = {}
+        self.by_action = {}
+        self.started = []
+        self.gate = None
+
+    def handler(self, action):
+        async def run(params):
+            self.in_flight += 1
+            self.by_action[action] = self.by_action.get(action, 0) + 1
+            self.peak = max(self.peak, self.in_flight)
+            self.peak_by_action[action] = max(
+                self.peak_by_action.get(action, 0), self.by_action[action]
+            )
+            self.started.append(action)
+            try:
+                if self.gate is not None:
+                    await self.gate.wait()
+                await asyncio.sleep(self.delay)
+                return {"action": action}
+            finally:
+                self.in_flight -= 1
+                self.by_action[action] -= 1
+
+        return run
+
+
+@pytest.fixture
+def store(tmp_path):
+    return WorkflowStateStore(tmp_path)
+
+
+def make_engine(store, recorder):
+    engine = WorkflowEngine(state_store=store)
+    for action in ("work", "export"):
+        engine.step_executor.register_action(action, recorder.handler(action))
+    return engine
+
+
+class TestDagScheduler:
+    @pytest.mark.asyncio
+    async def test_independent_branches_run_concurrently(self, store):
+        recorder = Recorder()
+        engine = make_engine(store, recorder)
+        workflow = await engine.define_workflow(fan_out(6))
+
+        execution = await engine.execute_workflow(workflow.id, {}, ExecutionOptions())
+
+        assert execution.status == WorkflowStatus.COMPLETED
+        assert recorder.peak == 6
+        assert recorder.started[0] == "work" and recorder.started[-1] == "work"
+        assert all(r.status == StepStatus.COMPLETED for r in execution.step_results.values())
+
+    @pytest.mark.asyncio
+    async def test_global_and_per_action_limits(self, store):
+        recorder = Recorder()
+        engine = make_engine(store, recorder)
+        workflow = await engine.define_workflow(fan_out(8))
+
+        await engine.execute_workflow(
+            workflow.id, {}, ExecutionOptions(parallel_limit=4, action_limits={"export": 2})
+        )
+
+        assert recorder.peak_by_action["export"] == 2
+        assert recorder.peak <= 4
+
+    @pytest.mark.asyncio
+    async def test_dependents_of_failed_step_are_skipped_with_reason(self, store):
+        recorder = Recorder()
+        engine = make_engine(store, recorder)
+
+        async def broken(params):
+            raise ValueError("boom")
+
+        engine.step_executor.register_action("broken", broken)
+        workflow = await engine.define_workflow(Workflow(
+            name="skip",
+            steps=[
+                step("a", action="broken", error_handling=ErrorHandling.SKIP),
+                step("b", deps=["a"]),
+                step("c", deps=["b"]),
+                step("d"),
+            ],
+        ))
+
+        execution = await engine.execute_workflow(workflow.id, {}, ExecutionOptions())
+
+        results = execution.step_results
+        assert execution.status == WorkflowStatus.COMPLETED
+        assert results["b"].status == StepStatus.SKIPPED
+        assert results["b"].metadata["blocked_by"] == ["a"]
+        assert results["c"].metadata["blocked_by"] == ["b"]
+        assert results["d"].status == StepStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_fail_step_cancels_running_siblings(self, store):
+        recorder = Recorder(delay=10)
+        engine = make_engine(store, recorder)
+
+        async def broken(params):
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        engine.step_executor.register_action("broken", broken)
+        workflow = await engine.define_workflow(Workflow(
+            name="fail",
+            steps=[step("a", action="broken", max_retries=0), step("slow")],
+        ))
+
+        execution = await asyncio.wait_for(
+            engine.execute_workflow(workflow.id, {}, ExecutionOptions()), timeout=5
+        )
+
+        assert execution.status == WorkflowStatus.FAILED
+        assert execution.step_results["slow"].status == StepStatus.CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_timings_and_critical_path(self, store):
+        engine = make_engine(store, Recorder())
+
+        async def slow(params):
+            await asyncio.sleep(0.05)
+
+        engine.step_executor.register_action("slow", slow)
+        workflow = await engine.define_workflow(Workflow(
+            name="paths",
+            steps=[
+                step("root"),
+                step("fast", deps=["root"]),
+                step("slow", action="slow", deps=["root"]),
+                step("end", deps=["fast", "slow"]),
+            ],
+        ))
+
+        execution = await engine.execute_workflow(workflow.id, {}, ExecutionOptions())
+
+        assert execution.metadata["critical_path"] == ["root", "slow", "end"]
+        assert execution.metadata["critical_path_ms"] >= 50
+        assert all("queue_ms" in r.metadata for r in execution.step_results.values())
+
+
+class TestPauseResume:
+    @pytest.mark.asyncio
+    async def test_pause_then_resume_in_new_engine(self, store):
+        recorder = Recorder()
+        recorder.gate = asyncio.Event()
+        engine = make_engine(store, recorder)
+        workflow = await engine.define_workflow(Workflow(
+            name="pause",
+            steps=[step("a"), step("b", deps=["a"]), step("c", deps=["b"])],
+        ))
+
+        run = asyncio.create_task(engine.execute_workflow(workflow.id, {}, ExecutionOptions()))
+        while not recorder.started:
+            await asyncio.sleep(0)
+        execution_id = next(iter(engine.executions))
+        assert await engine.pause_execution(execution_id)
+        recorder.gate.set()
+
+        paused = await run
+        assert paused.status == WorkflowStatus.PAUSED
+        assert set(paused.step_results) == {"a"}
+
+        # A fresh engine stands in for a restarted process
+        restarted_recorder = Recorder()
+        restarted = make_engine(store, restarted_recorder)
+        assert await restarted.resume_execution(execution_id)
+        finished = await restarted.wait_for_execution(execution_id)
+
+        assert finished.status == WorkflowStatus.COMPLETED
+        assert set(finished.step_results) == {"a", "b", "c"}
+        assert len(restarted_recorder.started) == 2
+        assert await store.load(execution_id) is None
+
+    @pytest.mark.asyncio
+    async def test_resume_unknown_execution_returns_false(self, store):
+        engine = WorkflowEngine(state_store=store)
+
+        assert await engine.resume_execution("missing") is False
@@ -0,0 +1,40 @@
+"""
+Stub ``freecadcmd`` binary for tests and benchmarks.
+
+Mimics the ``freecadcmd -c script.py -- args...`` invocation used by the
+FreeCAD service and simulates FreeCAD's import cost with a configurable
+sleep, so cold-spawn and warm-pool behaviour can be compared without a
+real FreeCAD installation.
+"""
+
+from __future__ import annotations
+
+import stat
+import sys
+from pathlib import Path
+
+_STUB_TEMPLATE = '''#!{python}
+import os
+import runpy
+import sys
+import time
+
+time.sleep(float(os.environ.get("FAKE_FREECAD_IMPORT_SECONDS", "{import_seconds}")))
+args = sys.argv[1:]
+if args and args[0] == "-c":
+    args = args[1:]
+script = args[0]
+sys.argv = [script] + [a for a in args[1:] if a != "--"]
+runpy.run_path(script, run_name="__main__")
+'''
+
+
+def write_fake_freecadcmd(directory: Path, import_seconds: float = 0.0) -> str:
+    """Write an executable stub freecadcmd into ``directory`` and return its path."""
+    path = Path(directory) / "fake_freecadcmd"
+    path.write_text(
+        _STUB_TEMPLATE.format(python=sys.executable, import_seconds=import_seconds),
+        encoding="utf-8",
+    )
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return str(path)
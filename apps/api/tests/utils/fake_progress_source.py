@@ -0,0 +1,72 @@
+"""
+Stand-in for RedisProgressPubSub in progress hub tests.
+
+FakeProgressSource keeps one in-memory stream per job and provides the
+methods the hub reads with (latest_progress_id, read_progress,
+wake_progress_reader). Entry IDs are ``0-<n>`` with n counting per job, so
+the event IDs derived from them are 1, 2, 3, ... It counts reads and can
+fail the next one to exercise reconnects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def _seq(stream_id: str) -> Tuple[int, int]:
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq)
+
+
+class FakeProgressSource:
+    def __init__(self):
+        self.streams: Dict[int, List[Tuple[str, str]]] = {}
+        self.reads = 0
+        self.wakes = 0
+        self.read_jobs: Set[int] = set()
+        self._changed = asyncio.Event()
+        self._woken = False
+        self._error: Optional[Exception] = None
+
+    def publish(self, job_id: int, data: str) -> int:
+        """Append like RedisProgressPubSub.append_progress; returns the event ID."""
+        stream = self.streams.setdefault(job_id, [])
+        stream.append((f"0-{len(stream) + 1}", data))
+        self._changed.set()
+        return len(stream)
+
+    async def latest_progress_id(self, job_id: int) -> str:
+        stream = self.streams.get(job_id)
+        return stream[-1][0] if stream else "0-0"
+
+    async def read_progress(self, cursors: Dict[int, str], block_ms: int) -> List[Tuple[int, str, Any]]:
+        self.reads += 1
+        self.read_jobs = set(cursors)
+        while True:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            entries = [
+                (job_id, stream_id, data)
+                for job_id, cursor in cursors.items()
+                for stream_id, data in self.streams.get(job_id, ())
+                if _seq(stream_id) > _seq(cursor)
+            ]
+            if entries or self._woken:
+                self._woken = False
+                return entries
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), block_ms / 1000)
+            except asyncio.TimeoutError:
+                return []
+
+    async def wake_progress_reader(self) -> None:
+        self.wakes += 1
+        self._woken = True
+        self._changed.set()
+
+    def disconnect(self) -> None:
+        self._error = ConnectionError("connection reset")
+        self._changed.set()
@@ -0,0 +1,214 @@
+"""
+Stand-ins for MinIO and clamd in upload ingest tests.
+
+FakeObjectClient serves objects from memory through the subset of the
+MinIO client the upload services use (stat_object, get_object with
+offset, response.stream/read/close/release_conn) and counts the bytes it
+serves. FakeClamd is a TCP server speaking the clamd protocol: PING,
+INSTREAM, and IDSESSION, in both the ``n``/newline and ``z``/NUL forms.
+"""
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from urllib3.exceptions import ProtocolError
+
+EICAR = b"X5O!P%@AP[4\\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+
+
+@dataclass
+class FakeStat:
+    size: int
+    etag: str = "etag"
+    version_id: Optional[str] = None
+    content_type: str = "application/octet-stream"
+    last_modified: None = None
+
+
+class FakeResponse:
+    """Object body; optionally drops the connection after fail_after bytes."""
+
+    def __init__(self, client: "FakeObjectClient", data: bytes, fail_after: Optional[int]):
+        self._client = client
+        self._data = data
+        self._fail_after = fail_after
+        self._pos = 0
+
+    def _take(self, amount: int) -> bytes:
+        if self._fail_after is not None and self._pos >= self._fail_after:
+            raise ProtocolError("Connection broken: simulated reset")
+        end = self._pos + amount
+        if self._fail_after is not None:
+            end = min(end, self._fail_after)
+        chunk = self._data[self._pos:end]
+        self._pos = end
+        if chunk:
+            self._client.bytes_served += len(chunk)
+            if self._client.bytes_per_second:
+                time.sleep(len(chunk) / self._client.bytes_per_second)
+        return chunk
+
+    def stream(self, amt: int = 65536):
+        while True:
+            chunk = self._take(amt)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._take(len(self._data) if amt is None else amt)
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class FakeObjectClient:
+    """
+    In-memory object store.
+
+    bytes_per_second throttles reads to stand in for network transfer;
+    fail_once_after drops the first response after that many bytes.
+    """
+
+    def __init__(self, bytes_per_second: float = 0.0):
+        self.objects: Dict[tuple, bytes] = {}
+        self.bytes_per_second = bytes_per_second
+        self.bytes_served = 0
+        self.get_requests = 0
+        self.fail_once_after: Optional[int] = None
+        self.removed: list = []
+
+    def put(self, bucket: str, name: str, data: bytes) -> None:
+        self.objects[(bucket, name)] = data
+
+    def stat_object(self, bucket_name: str, object_name: str, *args, **kwargs) -> FakeStat:
+        return FakeStat(size=len(self.objects[(bucket_name, object_name)]))
+
+    def get_object(self, bucket_name: str, object_name: str, offset: int = 0, length: int = 0, **kwargs):
+        self.get_requests += 1
+        data = self.objects[(bucket_name, object_name)][offset:]
+        if length:
+            data = data[:length]
+        fail_after, self.fail_once_after = self.fail_once_after, None
+        return FakeResponse(self, data, fail_after)
+
+    def remove_object(self, bucket_name: str, object_name: str) -> None:
+        self.removed.append((bucket_name, object_name))
+        self.objects.pop((bucket_name, object_name), None)
+
+
+class _ClamdHandler(socketserver.BaseRequestHandler):
+    def setup(self) -> None:
+        self.server.connections += 1
+        self._buffer = b""
+
+    def _recv(self, amount: int) -> bytes:
+        while len(self._buffer) < amount:
+            part = self.request.recv(max(65536, amount - len(self._buffer)))
+            if not part:
+                raise ConnectionError("client closed")
+            self._buffer += part
+        data, self._buffer = self._buffer[:amount], self._buffer[amount:]
+        return data
+
+    def _recv_command(self):
+        prefix = self._recv(1)
+        end = b"\n" if prefix == b"n" else b"\0"
+        command = b""
+        while True:
+            byte = self._recv(1)
+            if byte == end:
+                return command.decode(), end
+            command += byte
+
+    def _instream(self) -> str:
+        data = bytearray()
+        unbilled = 0
+        while True:
+            (length,) = struct.unpack("!L", self._recv(4))
+            if length == 0:
+                break
+            data += self._recv(length)
+            unbilled += length
+            # Scan cost is charged per 256 KB so tiny chunks are not dominated by sleep overhead
+            if self.server.bytes_per_second and unbilled >= 256 * 1024:
+                time.sleep(unbilled / self.server.bytes_per_second)
+                unbilled = 0
+        if self.server.bytes_per_second and unbilled:
+            time.sleep(unbilled / self.server.bytes_per_second)
+        self.server.bytes_scanned += len(data)
+        return "stream: Eicar-Test-Signature FOUND" if EICAR in data else "stream: OK"
+
+    def handle(self) -> None:
+        session_id = 0
+        in_session = False
+        try:
+            while True:
+                command, end = self._recv_command()
+                if command == "IDSESSION":
+                    in_session = True
+                    continue
+                if command == "END":
+                    return
+                if command == "PING":
+                    reply = "PONG"
+                elif command == "VERSION":
+                    reply = "ClamAV 1.0.0/fake"
+                elif command == "INSTREAM":
+                    reply = self._instream()
+                else:
+                    reply = "UNKNOWN COMMAND"
+                if in_session:
+                    session_id += 1
+                    reply = f"{session_id}: {reply}"
+                self.request.sendall(reply.encode() + end)
+                if not in_session:
+                    return
+        except (ConnectionError, OSError):
+            return
+
+
+class FakeClamd(socketserver.ThreadingTCPServer):
+    """
+    clamd on 127.0.0.1; reports EICAR as Eicar-Test-Signature.
+
+    bytes_per_second stands in for scan cost.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, bytes_per_second: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _ClamdHandler)
+        self.bytes_per_second = bytes_per_second
+        self.connections = 0
+        self.bytes_scanned = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> "FakeClamd":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
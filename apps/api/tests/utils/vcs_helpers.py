@@ -0,0 +1,34 @@
+"""
+Helpers for model version control tests.
+
+The VCS services call ``create_span(..., correlation_id=...)`` and record
+``metrics.freecad_vcs_*`` counters; neither matters for storage behaviour,
+so tests replace them with permissive mocks.
+"""
+
+from __future__ import annotations
+
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+VCS_MODULES = (
+    "app.services.model_object_store",
+    "app.services.model_commit_manager",
+    "app.services.model_branch_manager",
+    "app.services.model_differ",
+    "app.services.model_version_control",
+)
+
+
+@contextmanager
+def patched_vcs_instrumentation() -> Iterator[None]:
+    """Replace tracing spans and metrics in the VCS service modules."""
+    with ExitStack() as stack:
+        for module in VCS_MODULES:
+            span_cm = MagicMock()
+            span_cm.return_value.__enter__.return_value = MagicMock()
+            span_cm.return_value.__exit__.return_value = False
+            stack.enter_context(patch(f"{module}.create_span", span_cm))
+            stack.enter_context(patch(f"{module}.metrics", MagicMock()))
+        yield